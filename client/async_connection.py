@@ -0,0 +1,271 @@
+"""
+Salamander ALM
+Copyright (c) 2016  Djuro Drljaca
+
+This Python module is free software; you can redistribute it and/or modify it under the terms of the
+GNU General Public License as published by the Free Software Foundation; either version 2 of the
+License, or (at your option) any later version.
+
+This Python module is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License along with this library. If
+not, see <http://www.gnu.org/licenses/>.
+"""
+
+import asyncio
+import concurrent.futures
+import connection
+import requests
+from typing import Any, Awaitable, Callable, Iterable, List, Optional
+
+
+class AsyncConnection(object):
+    """
+    Asynchronous (asyncio) connection to the server
+
+    It has the same login and session token semantics as the synchronous connection
+    (connection.Connection) which is used internally. The requests are executed in a thread pool and
+    share the pool of keep-alive connections to the server, max number of concurrent requests is
+    limited by the "max_concurrency" parameter.
+
+    Unlike the synchronous connection the methods return the response message directly instead of
+    storing it as the last response message, so multiple requests can be awaited at the same time:
+
+        conn = AsyncConnection(max_concurrency=32)
+        await conn.login("https://salamander_alm.example.com:443/api",
+                         "user",
+                         {"password": "password"})
+        users = await conn.fan_out(conn.read_user_by_id, user_ids)
+        await conn.close()
+    """
+
+    def __init__(self,
+                 max_concurrency=32,
+                 max_retries=3,
+                 backoff_factor=0.1,
+                 response_format=connection.ResponseFormat.Json):
+        """
+        Constructor
+
+        :param max_concurrency: Max number of concurrent requests (and open connections)
+        :param max_retries:     Max number of retries of an idempotent request (0 to disable)
+        :param backoff_factor:  Base delay between the retries (in seconds), the delay is doubled
+                                with each retry
+        :param response_format: Requested format of the response data
+        """
+        self._maxConcurrency = max_concurrency
+        self._connection = connection.Connection(pool_size=max_concurrency,
+                                                 max_retries=max_retries,
+                                                 backoff_factor=backoff_factor,
+                                                 response_format=response_format)
+        self._executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=max_concurrency,
+            thread_name_prefix="AsyncConnection")
+
+    def is_logged_in(self) -> bool:
+        """
+        Check if logged in
+
+        :return: Success or failure
+        """
+        return self._connection.is_logged_in()
+
+    async def login(self,
+                    base_url: str,
+                    user_name: str,
+                    authentication_parameters: dict,
+                    certificate_verification=connection.CertificateVerification.Enabled) -> bool:
+        """
+        Log in to the server
+
+        :param base_url:                    URL of the REST API
+                                            (example: https://salamander_alm.example.com:443/api)
+        :param user_name:                   User name
+        :param authentication_parameters:   Authentication parameters
+        :param certificate_verification:    Enable or disable certificate verification
+
+        :return:    Success or failure
+        """
+        return await self._run(self._connection.login,
+                               base_url,
+                               user_name,
+                               authentication_parameters,
+                               certificate_verification)
+
+    async def logout(self) -> bool:
+        """
+        Log out of the server
+
+        :return: Success or failure
+        """
+        return await self._run(self._connection.logout)
+
+    async def close(self) -> None:
+        """
+        Log out of the server (if needed), close all open connections and stop the thread pool
+        """
+        await self._run(self._connection.close)
+        self._executor.shutdown(wait=False)
+
+    def statistics(self) -> dict:
+        """
+        Get connection statistics
+
+        :return:    Connection statistics (see connection.Connection.statistics())
+        """
+        return self._connection.statistics()
+
+    async def call_delete_method(self,
+                                 relative_url: str,
+                                 parameters=None) -> Optional[requests.Response]:
+        """
+        Call DELETE method on the server
+
+        :param relative_url:    Relative part of URL
+        :param parameters:      Parameters that should be added to the URL (dictionary)
+
+        :return:    Response message (or "None" in case of an error)
+        """
+        return await self._run(self._connection.send_request, "DELETE", relative_url, parameters)
+
+    async def call_get_method(self,
+                              relative_url: str,
+                              parameters=None) -> Optional[requests.Response]:
+        """
+        Call GET method on the server
+
+        :param relative_url:    Relative part of URL
+        :param parameters:      Parameters that should be added to the URL (dictionary)
+
+        :return:    Response message (or "None" in case of an error)
+        """
+        return await self._run(self._connection.send_request, "GET", relative_url, parameters)
+
+    async def call_post_method(self,
+                               relative_url: str,
+                               data=None) -> Optional[requests.Response]:
+        """
+        Call POST method on the server
+
+        :param relative_url:    Relative part of URL
+        :param data:            Request data (will be converted to json)
+
+        :return:    Response message (or "None" in case of an error)
+        """
+        return await self._run(self._connection.send_request, "POST", relative_url, None, data)
+
+    async def call_put_method(self,
+                              relative_url: str,
+                              data=None) -> Optional[requests.Response]:
+        """
+        Call PUT method on the server
+
+        :param relative_url:    Relative part of URL
+        :param data:            Request data (will be converted to json)
+
+        :return:    Response message (or "None" in case of an error)
+        """
+        return await self._run(self._connection.send_request, "PUT", relative_url, None, data)
+
+    async def read_data(self, relative_url: str, parameters=None) -> Optional[Any]:
+        """
+        Call GET method on the server and decode the returned data
+
+        :param relative_url:    Relative part of URL
+        :param parameters:      Parameters that should be added to the URL (dictionary)
+
+        :return:    Decoded data (or "None" in case of an error)
+        """
+        response = await self.call_get_method(relative_url, parameters)
+
+        if (response is None) or (response.status_code != 200):
+            return None
+
+        return connection.Connection.decode_response(response)
+
+    async def read_user_by_id(self, user_id: int) -> Optional[dict]:
+        """
+        Read a user
+
+        :param user_id: ID of the user
+
+        :return:    User (or "None" in case of an error)
+        """
+        return await self.read_data("/usermanagement/user", {"user_id": user_id})
+
+    async def read_users_by_ids(self, user_ids: Iterable[int], limit=None) -> List[Optional[dict]]:
+        """
+        Read multiple users concurrently
+
+        :param user_ids:    IDs of the users
+        :param limit:       Max number of concurrent requests ("None" for "max_concurrency")
+
+        :return:    Users (in the same order as the user IDs, "None" for users that could not be
+                    read)
+        """
+        return await self.fan_out(self.read_user_by_id, user_ids, limit)
+
+    async def search(self, text_list: Iterable[str], limit=None) -> List[Optional[list]]:
+        """
+        Execute multiple searches concurrently
+
+        :param text_list:   Texts to search for
+        :param limit:       Max number of concurrent requests ("None" for "max_concurrency")
+
+        :return:    Search results for each of the texts ("None" for failed searches)
+        """
+        return await self.fan_out(
+            lambda text: self.read_data("/searchmanagement/search", {"text": text}),
+            text_list,
+            limit)
+
+    async def fan_out(self,
+                      function: Callable[[Any], Awaitable[Any]],
+                      items: Iterable[Any],
+                      limit=None) -> List[Any]:
+        """
+        Call an asynchronous function for each item with a limited number of concurrent calls
+
+        :param function:    Asynchronous function that is called with a single item
+        :param items:       Items
+        :param limit:       Max number of concurrent calls ("None" for "max_concurrency")
+
+        :return:    Results of the function calls (in the same order as the items)
+
+        Note: If one of the calls raises an exception the remaining calls are cancelled and the
+        exception is propagated.
+        """
+        if limit is None:
+            limit = self._maxConcurrency
+
+        if limit < 1:
+            raise ValueError("Limit must be positive")
+
+        semaphore = asyncio.Semaphore(limit)
+
+        async def call(item: Any) -> Any:
+            async with semaphore:
+                return await function(item)
+
+        tasks = [asyncio.ensure_future(call(item)) for item in items]
+
+        try:
+            return await asyncio.gather(*tasks)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+
+            raise
+
+    async def _run(self, function: Callable, *args) -> Any:
+        """
+        Run a blocking function in the thread pool
+
+        :param function:    Function
+        :param args:        Arguments of the function
+
+        :return:    Result of the function
+        """
+        return await asyncio.get_running_loop().run_in_executor(self._executor, function, *args)
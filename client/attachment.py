@@ -0,0 +1,121 @@
+"""
+Salamander ALM
+Copyright (c) 2016  Djuro Drljaca
+
+This Python module is free software; you can redistribute it and/or modify it under the terms of the
+GNU General Public License as published by the Free Software Foundation; either version 2 of the
+License, or (at your option) any later version.
+
+This Python module is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License along with this library. If
+not, see <http://www.gnu.org/licenses/>.
+"""
+
+from connection import Connection
+import os
+import requests
+from typing import Optional
+
+
+class AttachmentTransfer(object):
+    """
+    Upload and download of the attachments of artifacts
+
+    Files are streamed in both directions so they are never held in memory as a whole. An
+    interrupted download can be resumed (only the missing part of the file is requested with a
+    Range header).
+    """
+
+    # Size of the chunks in which the downloaded content is written to the file (in bytes)
+    chunk_size = 64 * 1024
+
+    def __init__(self, connection: Connection):
+        """
+        Constructor
+
+        :param connection:  Connection to the server (must be logged in)
+        """
+        self._connection = connection
+
+    def upload(self, artifact_id: int, file_path: str) -> Optional[int]:
+        """
+        Upload a file as a new attachment of the artifact
+
+        :param artifact_id: ID of the artifact
+        :param file_path:   Path to the file
+
+        :return:    ID of the new attachment (or "None" if the upload failed)
+        """
+        with open(file_path, "rb") as file:
+            response = self._connection.send_content(
+                "POST",
+                "/attachmentmanagement/attachment",
+                {"artifact_id": artifact_id,
+                 "file_name": os.path.basename(file_path)},
+                file)
+
+        if (response is None) or (response.status_code != 200):
+            return None
+
+        return Connection.decode_response(response)["attachment_id"]
+
+    def download(self,
+                 attachment_id: int,
+                 file_path: str,
+                 revision_id=None,
+                 resume=False) -> bool:
+        """
+        Download the content of the attachment to a file
+
+        :param attachment_id:   ID of the attachment
+        :param file_path:       Path to the file
+        :param revision_id:     Revision of the attachment ("None" for the current revision)
+        :param resume:          Resume a previously interrupted download (content is appended to
+                                the existing file)
+
+        :return:    Success or failure
+        """
+        parameters = {"attachment_id": attachment_id}
+
+        if revision_id is not None:
+            parameters["revision_id"] = revision_id
+
+        headers = dict()
+        offset = 0
+
+        if resume and os.path.exists(file_path):
+            offset = os.path.getsize(file_path)
+            headers["Range"] = "bytes={0}-".format(offset)
+
+        response = self._connection.stream_request("/attachmentmanagement/attachment_content",
+                                                   parameters,
+                                                   headers)
+
+        if response is None:
+            return False
+
+        try:
+            if response.status_code == 416:
+                # Requested range is not satisfiable, the file could already be complete
+                return response.headers.get("Content-Range") == "bytes */{0}".format(offset)
+
+            if response.status_code == 200:
+                # Server sent the whole content
+                mode = "wb"
+            elif (response.status_code == 206) and (offset > 0):
+                mode = "ab"
+            else:
+                return False
+
+            with open(file_path, mode) as file:
+                for chunk in response.iter_content(AttachmentTransfer.chunk_size):
+                    file.write(chunk)
+        except requests.RequestException:
+            return False
+        finally:
+            response.close()
+
+        return True
@@ -17,9 +17,25 @@ not, see <http://www.gnu.org/licenses/>.
 import enum
 import json
 import requests
+import requests.adapters
 from requests.packages.urllib3.exceptions import InsecureRequestWarning
+from requests.packages.urllib3.util.retry import Retry
+from response_cache import ResponseCache
+import threading
+import time
 import urllib.parse
-from typing import Optional
+from typing import Any, Optional
+
+# Optional decoders, each of them is used only if it is installed
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
 
 
 class CertificateVerification(enum.Enum):
@@ -30,6 +46,14 @@ class CertificateVerification(enum.Enum):
     Enabled = 1
 
 
+class ResponseFormat(enum.Enum):
+    """
+    Requested format of the response data
+    """
+    Json = 0
+    MessagePack = 1
+
+
 class Connection(object):
     """
     Connection to the server.
@@ -62,11 +86,41 @@ class Connection(object):
     * parameters:   {"limit": 10, "offset": 50}
     * full URL:     "https://salamander_alm.example.com:443/api/projectmanagement/projects?
                      limit=10&offset=50"
+
+    All requests are sent through a single HTTP session which keeps a pool of open (keep-alive)
+    connections to the server, so a TCP (and TLS) handshake is only needed for the first request.
+    Idempotent requests (DELETE, GET, PUT) are retried with an exponential backoff in case of a
+    connection error or when the server is temporarily unavailable (HTTP status 502, 503 or 504).
+
+    With a response cache (see response_cache.ResponseCache) the GET responses are revalidated with
+    their ETag and the server only needs to send the content if it was modified.
+
+    Responses are compressed by the server (gzip or, if the "brotli" package is installed, brotli).
+    Response data can also be requested in the MessagePack format (needs the "msgpack" package),
+    use "decode_response" to decode the response data regardless of its format.
     """
 
-    def __init__(self):
+    # HTTP methods that are safe to be retried
+    _idempotentMethods = frozenset(["DELETE", "GET", "HEAD", "OPTIONS", "PUT"])
+
+    # HTTP status codes that indicate that the server is temporarily unavailable
+    _retryStatusCodes = frozenset([502, 503, 504])
+
+    def __init__(self,
+                 pool_size=10,
+                 max_retries=3,
+                 backoff_factor=0.1,
+                 cache: Optional[ResponseCache] = None,
+                 response_format=ResponseFormat.Json):
         """
         Constructor
+
+        :param pool_size:       Max number of open (keep-alive) connections to the server
+        :param max_retries:     Max number of retries of an idempotent request (0 to disable)
+        :param backoff_factor:  Base delay between the retries (in seconds), the delay is doubled
+                                with each retry
+        :param cache:           Cache for GET responses ("None" to disable caching)
+        :param response_format: Requested format of the response data
         """
         self._isLoggedIn = False
         self._baseUrl = ""
@@ -77,8 +131,67 @@ class Connection(object):
 
         requests.packages.urllib3.disable_warnings(InsecureRequestWarning)
 
+        # HTTP session with a connection pool
+        retry = Retry(total=max_retries,
+                      backoff_factor=backoff_factor,
+                      allowed_methods=Connection._idempotentMethods,
+                      status_forcelist=Connection._retryStatusCodes,
+                      raise_on_status=False)
+        self._adapter = requests.adapters.HTTPAdapter(pool_connections=1,
+                                                      pool_maxsize=pool_size,
+                                                      max_retries=retry)
+
+        self._session = requests.Session()
+        self._session.headers["Accept-Encoding"] = "gzip, deflate"
+        self._session.headers["Accept"] = "application/json"
+
+        if brotli is not None:
+            self._session.headers["Accept-Encoding"] = "br, gzip, deflate"
+
+        if response_format == ResponseFormat.MessagePack:
+            if msgpack is None:
+                raise ValueError("MessagePack format needs the \"msgpack\" package")
+
+            self._session.headers["Accept"] = "application/msgpack, application/json;q=0.5"
+        self._session.headers["Connection"] = "keep-alive"
+        self._session.mount("http://", self._adapter)
+        self._session.mount("https://", self._adapter)
+
+        self._cache = cache
+        self._statistics = _ConnectionStatistics()
+
         self._clear()
 
+    def close(self) -> None:
+        """
+        Log out of the server (if needed) and close all open connections
+        """
+        self.logout()
+
+        self._statistics.add_closed_connections(self._opened_connection_count())
+        self._session.close()
+
+    def statistics(self) -> dict:
+        """
+        Get connection statistics
+
+        :return:    Connection statistics
+
+        Returned dictionary contains items:
+
+        - request_count:        number of sent requests (without retries)
+        - failed_request_count: number of requests that failed without a response from the server
+        - retry_count:          number of retries
+        - connection_count:     number of opened connections (TCP handshakes)
+        - cache_hit_count:      number of GET requests answered from the response cache
+        - received_bytes:       number of received bytes (decompressed content)
+        - total_duration:       total duration of all requests (in seconds)
+        """
+        statistics = self._statistics.to_dict()
+        statistics["connection_count"] += self._opened_connection_count()
+
+        return statistics
+
     def is_logged_in(self):
         """
         Check if logged in
@@ -116,9 +229,12 @@ class Connection(object):
         data = {"user_name": user_name, "authentication_parameters": authentication_parameters}
         verify_certificate = (certificate_verification == CertificateVerification.Enabled)
 
-        response = requests.post(url, json=data, verify=verify_certificate)
+        response = self._send("POST", url, json=data, verify=verify_certificate)
         self._lastResponseMessage = response
 
+        if response is None:
+            return False
+
         # parse response
         success = self._loginToken.parse(response)
 
@@ -185,11 +301,15 @@ class Connection(object):
         # Call the DELETE method
         url = self._create_full_url(relative_url, parameters)
 
-        self._lastResponseMessage = requests.delete(url,
-                                                    headers=self._authenticationHeaders,
-                                                    verify=self._verifyCertificate)
+        self._lastResponseMessage = self._send("DELETE",
+                                               url,
+                                               headers=self._authenticationHeaders,
+                                               verify=self._verifyCertificate)
 
         # Check for success
+        if self._lastResponseMessage is None:
+            return False
+
         if self._lastResponseMessage.status_code in success_status_codes:
             return True
         else:
@@ -224,11 +344,15 @@ class Connection(object):
         # Call the GET method
         url = self._create_full_url(relative_url, parameters)
 
-        self._lastResponseMessage = requests.get(url,
-                                                 headers=self._authenticationHeaders,
-                                                 verify=self._verifyCertificate)
+        self._lastResponseMessage = self._send("GET",
+                                               url,
+                                               headers=self._authenticationHeaders,
+                                               verify=self._verifyCertificate)
 
         # Check for success
+        if self._lastResponseMessage is None:
+            return False
+
         if self._lastResponseMessage.status_code in success_status_codes:
             return True
         else:
@@ -263,18 +387,188 @@ class Connection(object):
         # Call the POST method
         url = self._create_full_url(relative_url)
 
-        self._lastResponseMessage = requests.post(url,
-                                                  json=data,
-                                                  headers=self._authenticationHeaders,
-                                                  verify=self._verifyCertificate)
+        self._lastResponseMessage = self._send("POST",
+                                               url,
+                                               json=data,
+                                               headers=self._authenticationHeaders,
+                                               verify=self._verifyCertificate)
+
+        # Check for success
+        if self._lastResponseMessage is None:
+            return False
+
+        if self._lastResponseMessage.status_code in success_status_codes:
+            return True
+        else:
+            return False
+
+    def call_put_method(self,
+                        relative_url: str,
+                        data=None,
+                        success_status_codes=list([200])) -> bool:
+        """
+        Call PUT method on the server
+
+        :param relative_url:            Relative part of URL
+        :param data:                    Request data (will be converted to json)
+        :param success_status_codes:    List of HTTP status codes that represent 'success'
+
+        :return:    Success or failure
+
+        Note: Do not forget to add the leading '/' in the relative URL!
+        """
+        # Clear last response message
+        self._lastResponseMessage = None
+
+        # Check if logged in
+        if not self.is_logged_in():
+            return False
+
+        # Check for leading '/' in the relative URL
+        if not relative_url.startswith("/"):
+            return False
+
+        # Call the PUT method
+        url = self._create_full_url(relative_url)
+
+        self._lastResponseMessage = self._send("PUT",
+                                               url,
+                                               json=data,
+                                               headers=self._authenticationHeaders,
+                                               verify=self._verifyCertificate)
 
         # Check for success
+        if self._lastResponseMessage is None:
+            return False
+
         if self._lastResponseMessage.status_code in success_status_codes:
             return True
         else:
             return False
 
-    # TODO: create PUT method?
+    def send_request(self,
+                     method: str,
+                     relative_url: str,
+                     parameters=None,
+                     data=None) -> Optional[requests.Response]:
+        """
+        Send a request to the server and return its response message
+
+        :param method:          HTTP method (DELETE, GET, POST, PUT)
+        :param relative_url:    Relative part of URL
+        :param parameters:      Parameters that should be added to the URL (dictionary)
+        :param data:            Request data (will be converted to json)
+
+        :return:    Response message (or "None" if not logged in or if no response was received from
+                    the server)
+
+        Note: Unlike the "call_*_method" methods this method does not change the last response
+        message so it can be called from multiple threads at the same time.
+        """
+        # Check if logged in
+        if not self.is_logged_in():
+            return None
+
+        # Check for leading '/' in the relative URL
+        if not relative_url.startswith("/"):
+            return None
+
+        url = self._create_full_url(relative_url, parameters)
+
+        return self._send(method,
+                          url,
+                          json=data,
+                          headers=self._authenticationHeaders,
+                          verify=self._verifyCertificate)
+
+    def stream_request(self,
+                       relative_url: str,
+                       parameters=None,
+                       headers=None) -> Optional[requests.Response]:
+        """
+        Send a GET request to the server and return its response message without reading its
+        content (the content can then be processed in chunks, for example with "iter_lines")
+
+        :param relative_url:    Relative part of URL
+        :param parameters:      Parameters that should be added to the URL (dictionary)
+        :param headers:         Additional request headers (dictionary)
+
+        :return:    Response message (or "None" if not logged in or if no response was received from
+                    the server)
+
+        Note: Streamed responses bypass the response cache and their content is not counted in the
+        received bytes statistics. Response must be closed after its content is processed!
+        """
+        # Check if logged in
+        if not self.is_logged_in():
+            return None
+
+        # Check for leading '/' in the relative URL
+        if not relative_url.startswith("/"):
+            return None
+
+        url = self._create_full_url(relative_url, parameters)
+        request_headers = dict(self._authenticationHeaders)
+
+        if headers is not None:
+            request_headers.update(headers)
+
+        return self._send("GET",
+                          url,
+                          headers=request_headers,
+                          verify=self._verifyCertificate,
+                          stream=True)
+
+    def send_content(self,
+                     method: str,
+                     relative_url: str,
+                     parameters=None,
+                     content=None) -> Optional[requests.Response]:
+        """
+        Send a request with raw content to the server and return its response message
+
+        :param method:          HTTP method (POST, PUT)
+        :param relative_url:    Relative part of URL
+        :param parameters:      Parameters that should be added to the URL (dictionary)
+        :param content:         Request content (bytes or a file object opened in binary mode)
+
+        :return:    Response message (or "None" if not logged in or if no response was received from
+                    the server)
+
+        Note: Content of a file object is streamed to the server in chunks, so large files are
+        never held in memory as a whole.
+        """
+        # Check if logged in
+        if not self.is_logged_in():
+            return None
+
+        # Check for leading '/' in the relative URL
+        if not relative_url.startswith("/"):
+            return None
+
+        url = self._create_full_url(relative_url, parameters)
+        headers = dict(self._authenticationHeaders)
+        headers["Content-Type"] = "application/octet-stream"
+
+        return self._send(method,
+                          url,
+                          data=content,
+                          headers=headers,
+                          verify=self._verifyCertificate)
+
+    @staticmethod
+    def decode_response(response: requests.Response) -> Any:
+        """
+        Decode the response data (JSON or MessagePack)
+
+        :param response:    Response message
+
+        :return:    Decoded data
+        """
+        if response.headers.get("Content-Type", "").startswith("application/msgpack"):
+            return msgpack.unpackb(response.content)
+
+        return json.loads(response.text)
 
     @property
     def last_response_message(self) -> Optional[requests.Response]:
@@ -305,6 +599,95 @@ class Connection(object):
 
         return url
 
+    def _send(self, method: str, url: str, **kwargs) -> Optional[requests.Response]:
+        """
+        Send a request through the HTTP session and update the connection statistics
+
+        :param method:  HTTP method
+        :param url:     Full URL
+        :param kwargs:  Additional arguments for the request (see "requests.Session.request")
+
+        :return:    Response message (or "None" if no response was received from the server)
+        """
+        # Streamed content is read by the caller so it can neither be cached nor counted
+        streamed = kwargs.get("stream", False)
+
+        # Revalidate the cached response
+        cache_entry = None
+
+        if (self._cache is not None) and (method == "GET") and (not streamed):
+            cache_entry = self._cache.get(url)
+
+            if cache_entry is not None:
+                headers = dict(kwargs.get("headers") or dict())
+                headers["If-None-Match"] = cache_entry["etag"]
+                kwargs["headers"] = headers
+
+        start = time.perf_counter()
+
+        try:
+            response = self._session.request(method, url, **kwargs)
+        except requests.RequestException:
+            self._statistics.add_request(time.perf_counter() - start, None, 0)
+            return None
+
+        retry_count = 0
+
+        if response.raw.retries is not None:
+            retry_count = len(response.raw.retries.history)
+
+        received_bytes = 0
+
+        if not streamed:
+            received_bytes = len(response.content)
+
+        self._statistics.add_request(time.perf_counter() - start, received_bytes, retry_count)
+
+        # Update the cache
+        if (self._cache is not None) and (method == "GET") and (not streamed):
+            etag = response.headers.get("ETag")
+
+            if (response.status_code == 304) and (cache_entry is not None):
+                self._statistics.add_cache_hit()
+                response = Connection._create_cached_response(response, cache_entry)
+            elif (response.status_code == 200) and (etag is not None):
+                self._cache.put(url, etag, response.status_code, response.headers, response.content)
+
+        return response
+
+    @staticmethod
+    def _create_cached_response(response: requests.Response,
+                                cache_entry: dict) -> requests.Response:
+        """
+        Create a response message from a cached response
+
+        :param response:    "304 Not Modified" response message from the server
+        :param cache_entry: Cached response
+
+        :return:    Response message with the cached content
+        """
+        cached_response = requests.Response()
+        cached_response.status_code = cache_entry["status_code"]
+        cached_response.headers = requests.structures.CaseInsensitiveDict(cache_entry["headers"])
+        cached_response.headers.update(response.headers)
+        cached_response._content = cache_entry["content"]
+        cached_response.encoding = response.encoding
+        cached_response.url = response.url
+        cached_response.request = response.request
+        cached_response.elapsed = response.elapsed
+
+        return cached_response
+
+    def _opened_connection_count(self) -> int:
+        """
+        Get number of connections that were opened by the connection pools of the HTTP session
+
+        :return:    Number of opened connections
+        """
+        pools = self._adapter.poolmanager.pools
+
+        return sum(pools[key].num_connections for key in pools.keys())
+
     def _clear(self):
         """
         Clear all members
@@ -339,10 +722,78 @@ class _LoginToken(object):
         if response.status_code != 200:
             return False
 
-        response_data = json.loads(response.text)
+        response_data = Connection.decode_response(response)
 
         # Save login token
         token = response_data["session_token"]
 
         self.token = token
         return True
+
+
+class _ConnectionStatistics(object):
+    """
+    Connection statistics
+    """
+
+    def __init__(self):
+        """
+        Constructor
+        """
+        self._lock = threading.Lock()
+        self._requestCount = 0
+        self._failedRequestCount = 0
+        self._retryCount = 0
+        self._receivedBytes = 0
+        self._totalDuration = 0.0
+        self._closedConnectionCount = 0
+        self._cacheHitCount = 0
+
+    def add_request(self, duration: float, received_bytes: Optional[int], retry_count: int):
+        """
+        Add a request to the statistics
+
+        :param duration:        Duration of the request (in seconds)
+        :param received_bytes:  Number of received bytes ("None" if no response was received)
+        :param retry_count:     Number of retries
+        """
+        with self._lock:
+            self._requestCount += 1
+            self._retryCount += retry_count
+            self._totalDuration += duration
+
+            if received_bytes is None:
+                self._failedRequestCount += 1
+            else:
+                self._receivedBytes += received_bytes
+
+    def add_closed_connections(self, connection_count: int):
+        """
+        Add connections that were opened by connection pools which are now closed
+
+        :param connection_count:    Number of connections
+        """
+        with self._lock:
+            self._closedConnectionCount += connection_count
+
+    def add_cache_hit(self):
+        """
+        Add a GET request that was answered from the response cache
+        """
+        with self._lock:
+            self._cacheHitCount += 1
+
+    def to_dict(self) -> dict:
+        """
+        Get the statistics as a dictionary
+
+        :return:    Statistics
+        """
+        with self._lock:
+            return {"request_count": self._requestCount,
+                    "failed_request_count": self._failedRequestCount,
+                    "retry_count": self._retryCount,
+                    "received_bytes": self._receivedBytes,
+                    "connection_count": self._closedConnectionCount,
+                    "cache_hit_count": self._cacheHitCount,
+                    "total_duration": self._totalDuration}
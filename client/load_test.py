@@ -0,0 +1,556 @@
+"""
+Salamander ALM
+Copyright (c) 2016  Djuro Drljaca
+
+This Python module is free software; you can redistribute it and/or modify it under the terms of the
+GNU General Public License as published by the Free Software Foundation; either version 2 of the
+License, or (at your option) any later version.
+
+This Python module is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License along with this library. If
+not, see <http://www.gnu.org/licenses/>.
+
+Load test harness for the REST API
+
+Each virtual user runs a scenario in a loop with its own client connection (connection.Connection)
+so the TCP connection to the server is kept alive between the requests (like a real client would
+do). The number of virtual users is increased in stages (concurrency ramp) and for each stage the
+throughput, latency percentiles and error rate are reported.
+
+Scenarios:
+
+- login_storm:  log in and log out in a loop
+- read_heavy:   log in once, then read users and search in a loop
+- mixed:        mostly reads with occasional log in and log out, creation of comments and
+                uploads of attachments (writes need an artifact: with "--start-server" one is
+                created, otherwise it must be specified with "--artifact-id")
+
+Usage (from the "client" directory):
+
+    python load_test.py --scenario read_heavy --ramp 1,2,4,8 --stage-duration 10
+        [--url http://127.0.0.1:5000/api] [--start-server] [--output results.json]
+"""
+
+import argparse
+import connection
+import json
+import math
+import os
+import random
+import requests
+import signal
+import subprocess
+import sys
+import threading
+import time
+from typing import Callable, List, Optional
+
+
+class LoadTestStatistics(object):
+    """
+    Thread-safe collection of the request durations and errors of a load test stage
+    """
+
+    def __init__(self):
+        """
+        Constructor
+        """
+        self.__lock = threading.Lock()
+        self.__durations = dict()
+        self.__errors = dict()
+
+    def record(self, name: str, duration: float, success: bool) -> None:
+        """
+        Records a request
+
+        :param name:        Name of the request (e.g. "login")
+        :param duration:    Duration of the request (in seconds)
+        :param success:     Success or failure of the request
+        """
+        with self.__lock:
+            self.__durations.setdefault(name, list()).append(duration)
+
+            if not success:
+                self.__errors[name] = self.__errors.get(name, 0) + 1
+
+    def summary(self, elapsed_time: float) -> dict:
+        """
+        Creates a summary of all recorded requests
+
+        :param elapsed_time:    Duration of the stage (in seconds)
+
+        :return:    Summary
+
+        Returned dictionary contains items:
+
+        - total:        summary of all requests
+        - requests:     dictionary with a summary of each request name
+
+        Each summary contains items "count", "errors", "error_rate", "rps" (requests per second) and
+        "p50", "p90", "p99", "max" (in milliseconds).
+        """
+        with self.__lock:
+            durations = {name: list(values) for name, values in self.__durations.items()}
+            errors = dict(self.__errors)
+
+        all_durations = [x for values in durations.values() for x in values]
+
+        return {"total": LoadTestStatistics.__summarize(all_durations,
+                                                        sum(errors.values()),
+                                                        elapsed_time),
+                "requests": {name: LoadTestStatistics.__summarize(values,
+                                                                  errors.get(name, 0),
+                                                                  elapsed_time)
+                             for name, values in sorted(durations.items())}}
+
+    @staticmethod
+    def __summarize(durations: List[float], error_count: int, elapsed_time: float) -> dict:
+        """
+        Summarizes the durations of requests
+
+        :param durations:       Request durations (in seconds)
+        :param error_count:     Number of failed requests
+        :param elapsed_time:    Duration of the stage (in seconds)
+
+        :return:    Summary
+        """
+        count = len(durations)
+        sorted_durations = sorted(durations)
+
+        def percentile(fraction: float) -> float:
+            if count == 0:
+                return 0.0
+
+            rank = max(1, int(math.ceil(fraction * count)))
+            return sorted_durations[rank - 1] * 1000.0
+
+        return {"count": count,
+                "errors": error_count,
+                "error_rate": (error_count / count) if count > 0 else 0.0,
+                "rps": (count / elapsed_time) if elapsed_time > 0.0 else 0.0,
+                "p50": percentile(0.50),
+                "p90": percentile(0.90),
+                "p99": percentile(0.99),
+                "max": (sorted_durations[-1] * 1000.0) if count > 0 else 0.0}
+
+
+class VirtualUser(object):
+    """
+    Client of a single virtual user
+
+    All requests go through the same client connection (HTTP keep-alive). Retries are disabled so
+    that the errors are reported as they happen.
+    """
+
+    def __init__(self,
+                 base_url: str,
+                 user_name: str,
+                 authentication_parameters: dict,
+                 statistics: LoadTestStatistics,
+                 random_generator: random.Random,
+                 verify_certificate=True,
+                 artifact_id: Optional[int] = None):
+        """
+        Constructor
+
+        :param base_url:                    URL of the REST API
+        :param user_name:                   User name
+        :param authentication_parameters:   Authentication parameters
+        :param statistics:                  Statistics of the load test stage
+        :param random_generator:            Random number generator of the virtual user
+        :param verify_certificate:          Enable or disable certificate verification
+        :param artifact_id:                 ID of the artifact for the write requests ("None" to
+                                            disable the write requests)
+        """
+        self.base_url = base_url
+        self.user_name = user_name
+        self.authentication_parameters = authentication_parameters
+        self.statistics = statistics
+        self.random = random_generator
+        self.artifact_id = artifact_id
+
+        if verify_certificate:
+            self.__certificate_verification = connection.CertificateVerification.Enabled
+        else:
+            self.__certificate_verification = connection.CertificateVerification.Disabled
+
+        self.__connection = connection.Connection(pool_size=1, max_retries=0)
+
+    def close(self) -> None:
+        """
+        Logs out (if needed) and closes the connection
+        """
+        if self.is_logged_in():
+            self.logout()
+
+        self.__connection.close()
+
+    def is_logged_in(self) -> bool:
+        """
+        Checks if the virtual user is logged in
+
+        :return:    Success or failure
+        """
+        return self.__connection.is_logged_in()
+
+    def login(self) -> bool:
+        """
+        Logs in the virtual user
+
+        :return:    Success or failure
+        """
+        start = time.perf_counter()
+        success = self.__connection.login(self.base_url,
+                                          self.user_name,
+                                          self.authentication_parameters,
+                                          self.__certificate_verification)
+        self.statistics.record("login", time.perf_counter() - start, success)
+
+        return success
+
+    def logout(self) -> bool:
+        """
+        Logs out the virtual user
+
+        :return:    Success or failure
+        """
+        start = time.perf_counter()
+        success = self.__connection.logout()
+        self.statistics.record("logout", time.perf_counter() - start, success)
+
+        return success
+
+    def get(self, name: str, relative_url: str, parameters=None) -> bool:
+        """
+        Calls GET method on the server and records its duration
+
+        :param name:            Name of the request in the statistics
+        :param relative_url:    Relative part of URL (with the leading '/')
+        :param parameters:      Parameters that should be added to the URL (dictionary)
+
+        :return:    Success or failure
+        """
+        start = time.perf_counter()
+        success = self.__connection.call_get_method(relative_url, parameters)
+        self.statistics.record(name, time.perf_counter() - start, success)
+
+        return success
+
+    def post(self, name: str, relative_url: str, data: dict) -> bool:
+        """
+        Calls POST method on the server and records its duration
+
+        :param name:            Name of the request in the statistics
+        :param relative_url:    Relative part of URL (with the leading '/')
+        :param data:            Request data (will be converted to json)
+
+        :return:    Success or failure
+        """
+        start = time.perf_counter()
+        success = self.__connection.call_post_method(relative_url, data)
+        self.statistics.record(name, time.perf_counter() - start, success)
+
+        return success
+
+    def upload(self, name: str, relative_url: str, parameters: dict, content: bytes) -> bool:
+        """
+        Sends content to the server with POST method and records its duration
+
+        :param name:            Name of the request in the statistics
+        :param relative_url:    Relative part of URL (with the leading '/')
+        :param parameters:      Parameters that should be added to the URL (dictionary)
+        :param content:         Request content
+
+        :return:    Success or failure
+        """
+        start = time.perf_counter()
+        response = self.__connection.send_content("POST", relative_url, parameters, content)
+        success = (response is not None) and (response.status_code == 200)
+        self.statistics.record(name, time.perf_counter() - start, success)
+
+        return success
+
+    def connection_statistics(self) -> dict:
+        """
+        Reads statistics of the virtual user's connection
+
+        :return:    Connection statistics (see connection.Connection.statistics())
+        """
+        return self.__connection.statistics()
+
+
+def scenario_login_storm(user: VirtualUser) -> None:
+    """
+    Logs in and logs out
+
+    :param user:    Virtual user
+    """
+    if user.login():
+        user.logout()
+
+
+def scenario_read_heavy(user: VirtualUser) -> None:
+    """
+    Reads users and searches (logs in only if needed)
+
+    :param user:    Virtual user
+    """
+    if (not user.is_logged_in()) and (not user.login()):
+        return
+
+    read_random(user)
+
+
+def read_random(user: VirtualUser) -> None:
+    """
+    Reads users or searches (randomly selected)
+
+    :param user:    Virtual user
+    """
+    operation = user.random.random()
+
+    if operation < 0.3:
+        user.get("read_current_user", "/usermanagement/user")
+    elif operation < 0.6:
+        user.get("read_user_by_user_name",
+                 "/usermanagement/user",
+                 {"user_name": user.user_name})
+    elif operation < 0.8:
+        user.get("search_users",
+                 "/usermanagement/user",
+                 {"search": user.user_name[:user.random.randint(1, 3)]})
+    else:
+        user.get("search",
+                 "/searchmanagement/search",
+                 {"text": user.random.choice(["project", "tracker", "test", "a"])})
+
+
+def scenario_mixed(user: VirtualUser) -> None:
+    """
+    Mostly reads with occasional log in and log out, creation of comments and uploads of
+    attachments
+
+    :param user:    Virtual user
+
+    NOTE:   Without an artifact only the reads, log ins and log outs are executed!
+    """
+    if user.is_logged_in() and (user.random.random() < 0.1):
+        user.logout()
+
+    if (not user.is_logged_in()) and (not user.login()):
+        return
+
+    operation = user.random.random()
+
+    if (user.artifact_id is None) or (operation < 0.6):
+        read_random(user)
+    elif operation < 0.8:
+        user.get("read_comments", "/artifactmanagement/comment", {"artifact_id": user.artifact_id})
+    elif operation < 0.95:
+        user.post("create_comment",
+                  "/artifactmanagement/comment",
+                  {"artifact_id": user.artifact_id,
+                   "text": "Load test comment {0}".format(user.random.randint(0, 1000000))})
+    else:
+        user.upload("create_attachment",
+                    "/attachmentmanagement/attachment",
+                    {"artifact_id": user.artifact_id, "file_name": "load_test.txt"},
+                    bytes(user.random.getrandbits(8) for i in range(1024)))
+
+
+SCENARIOS = {"login_storm": scenario_login_storm,
+             "read_heavy": scenario_read_heavy,
+             "mixed": scenario_mixed}
+
+
+def run_stage(arguments, scenario: Callable[[VirtualUser], None], user_count: int) -> dict:
+    """
+    Runs a single load test stage
+
+    :param arguments:   Command line arguments
+    :param scenario:    Scenario that is executed by the virtual users
+    :param user_count:  Number of concurrent virtual users
+
+    :return:    Summary of the stage (see LoadTestStatistics.summary()) with an additional item
+                "connection_count" (number of opened connections to the server)
+    """
+    statistics = LoadTestStatistics()
+    stop_event = threading.Event()
+    connection_counts = list()
+
+    def run_virtual_user(index: int) -> None:
+        user = VirtualUser(arguments.url,
+                           arguments.user,
+                           {"password": arguments.password},
+                           statistics,
+                           random.Random(arguments.seed + index),
+                           not arguments.no_verify,
+                           arguments.artifact_id)
+
+        try:
+            while not stop_event.is_set():
+                scenario(user)
+        finally:
+            user.close()
+            connection_counts.append(user.connection_statistics()["connection_count"])
+
+    threads = [threading.Thread(target=run_virtual_user, args=(index,), daemon=True)
+               for index in range(user_count)]
+
+    start = time.perf_counter()
+
+    for thread in threads:
+        thread.start()
+
+    stop_event.wait(arguments.stage_duration)
+    stop_event.set()
+    elapsed_time = time.perf_counter() - start
+
+    for thread in threads:
+        thread.join()
+
+    summary = statistics.summary(elapsed_time)
+    summary["connection_count"] = sum(connection_counts)
+
+    return summary
+
+
+# Creates the data needed by the write requests (the REST API can't create artifacts)
+CREATE_ARTIFACT_SCRIPT = """
+from artifactmanagement.artifact_management import ArtifactManagementInterface
+from database.database import DatabaseInterface
+from plugins.database.sqlite.database import DatabaseSqlite
+from projectmanagement.project_management import ProjectManagementInterface
+from trackermanagement.tracker_management import TrackerManagementInterface
+
+DatabaseInterface.load_database_plugin(DatabaseSqlite("database.db"))
+project_id = ProjectManagementInterface.create_project(1, "load_test", "Load test", "")
+tracker_id = TrackerManagementInterface.create_tracker(1, project_id, "load_test", "Load test", "")
+print(ArtifactManagementInterface.create_artifact(1, tracker_id, dict()))
+"""
+
+
+def start_server(base_url: str) -> subprocess.Popen:
+    """
+    Starts a local server and waits until it accepts requests
+
+    :param base_url:    URL of the REST API
+
+    :return:    Server process
+    """
+    server_directory = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "server")
+    server_instance = subprocess.Popen([sys.executable, "salamander_alm.py"],
+                                       cwd=server_directory)
+
+    for i in range(100):
+        try:
+            requests.get(base_url + "/usermanagement/user", timeout=1.0)
+            return server_instance
+        except requests.ConnectionError:
+            time.sleep(0.1)
+
+    server_instance.kill()
+    raise RuntimeError("Server did not start")
+
+
+def create_artifact() -> int:
+    """
+    Creates an artifact (with its project and tracker) in the database of the local server
+
+    :return:    Artifact ID
+    """
+    server_directory = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "server")
+    output = subprocess.check_output([sys.executable, "-c", CREATE_ARTIFACT_SCRIPT],
+                                     cwd=server_directory)
+
+    return int(output.decode("utf-8").split()[-1])
+
+
+def print_stage(user_count: int, summary: dict) -> None:
+    """
+    Prints the summary of a load test stage
+
+    :param user_count:  Number of concurrent virtual users
+    :param summary:     Summary of the stage
+    """
+    print("Virtual users: {0}, opened connections: {1}".format(user_count,
+                                                              summary["connection_count"]))
+
+    rows = list(summary["requests"].items()) + [("total", summary["total"])]
+
+    for name, result in rows:
+        print("    {0:<24} {1:8.1f} rps    p50: {2:8.2f} ms    p90: {3:8.2f} ms    "
+              "p99: {4:8.2f} ms    errors: {5:6.2%}".format(name,
+                                                           result["rps"],
+                                                           result["p50"],
+                                                           result["p90"],
+                                                           result["p99"],
+                                                           result["error_rate"]))
+
+
+if __name__ == '__main__':
+    # Description is the part of the module docstring that follows the license header
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n", 4)[4],
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default="http://127.0.0.1:5000/api", help="URL of the REST API")
+    parser.add_argument("--user", default="administrator", help="User name")
+    parser.add_argument("--password", default="administrator", help="Password")
+    parser.add_argument("--scenario", choices=sorted(SCENARIOS.keys()), default="read_heavy",
+                        help="Scenario executed by the virtual users")
+    parser.add_argument("--ramp", default="1,2,4,8",
+                        help="Comma separated numbers of concurrent virtual users for each stage")
+    parser.add_argument("--stage-duration", type=float, default=10.0,
+                        help="Duration of each stage (in seconds)")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for the virtual users")
+    parser.add_argument("--no-verify", action="store_true",
+                        help="Disable certificate verification")
+    parser.add_argument("--start-server", action="store_true",
+                        help="Start a local server for the duration of the load test")
+    parser.add_argument("--output", default=None, help="Path to the JSON file for the results")
+    parser.add_argument("--artifact-id", type=int, default=None,
+                        help="ID of the artifact for the write requests of the mixed scenario")
+    arguments = parser.parse_args()
+
+    try:
+        ramp = [int(x) for x in arguments.ramp.split(",")]
+    except ValueError:
+        parser.error("Invalid ramp")
+
+    if min(ramp) < 1:
+        parser.error("Number of virtual users must be positive")
+
+    server_instance = None
+
+    if arguments.start_server:
+        server_instance = start_server(arguments.url)
+
+    try:
+        if (server_instance is not None) and (arguments.artifact_id is None):
+            arguments.artifact_id = create_artifact()
+
+        stages = list()
+
+        for user_count in ramp:
+            summary = run_stage(arguments, SCENARIOS[arguments.scenario], user_count)
+            print_stage(user_count, summary)
+            stages.append({"virtual_users": user_count, "summary": summary})
+    finally:
+        if server_instance is not None:
+            server_instance.send_signal(signal.SIGINT)
+
+            try:
+                server_instance.wait(5.0)
+            except subprocess.TimeoutExpired:
+                server_instance.kill()
+
+    if arguments.output is not None:
+        with open(arguments.output, "w") as output_file:
+            json.dump({"url": arguments.url,
+                       "scenario": arguments.scenario,
+                       "stage_duration": arguments.stage_duration,
+                       "stages": stages},
+                      output_file,
+                      indent=4)
@@ -0,0 +1,189 @@
+"""
+Salamander ALM
+Copyright (c) 2016  Djuro Drljaca
+
+This Python module is free software; you can redistribute it and/or modify it under the terms of the
+GNU General Public License as published by the Free Software Foundation; either version 2 of the
+License, or (at your option) any later version.
+
+This Python module is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License along with this library. If
+not, see <http://www.gnu.org/licenses/>.
+"""
+
+import base64
+import collections
+import hashlib
+import json
+import os
+import threading
+from typing import Optional
+
+
+class ResponseCache(object):
+    """
+    Cache of GET responses that have an ETag
+
+    The cached responses are revalidated with the server on each request (If-None-Match header).
+    If the response was not modified the server answers with "304 Not Modified" without content and
+    the cached content is used.
+
+    The most recently used responses are held in memory. Optionally all cached responses are also
+    stored in a directory so they can be reused by other processes and after a restart.
+    """
+
+    def __init__(self, max_entries=1000, directory: Optional[str] = None):
+        """
+        Constructor
+
+        :param max_entries: Max number of responses held in memory
+        :param directory:   Directory for storing the cached responses ("None" for in-memory cache)
+        """
+        self._maxEntries = max_entries
+        self._directory = directory
+        self._entries = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)
+
+    def get(self, url: str) -> Optional[dict]:
+        """
+        Get a cached response
+
+        :param url: Full URL of the request
+
+        :return:    Cached response (or "None" if the response is not cached)
+
+        Returned dictionary contains items:
+
+        - etag
+        - status_code
+        - headers
+        - content
+        """
+        with self._lock:
+            entry = self._entries.get(url)
+
+            if entry is not None:
+                self._entries.move_to_end(url)
+                return entry
+
+        entry = self._read_file(url)
+
+        if entry is not None:
+            self._add_entry(url, entry)
+
+        return entry
+
+    def put(self, url: str, etag: str, status_code: int, headers: dict, content: bytes) -> None:
+        """
+        Add a response to the cache
+
+        :param url:         Full URL of the request
+        :param etag:        ETag of the response (as sent by the server, with quotes)
+        :param status_code: HTTP status code of the response
+        :param headers:     Headers of the response
+        :param content:     Content of the response
+        """
+        entry = {"etag": etag,
+                 "status_code": status_code,
+                 "headers": dict(headers),
+                 "content": content}
+
+        self._add_entry(url, entry)
+        self._write_file(url, entry)
+
+    def clear(self) -> None:
+        """
+        Remove all responses from the cache (also from the directory)
+        """
+        with self._lock:
+            self._entries.clear()
+
+        if self._directory is not None:
+            for file_name in os.listdir(self._directory):
+                if file_name.endswith(".json"):
+                    os.remove(os.path.join(self._directory, file_name))
+
+    def _add_entry(self, url: str, entry: dict) -> None:
+        """
+        Add a response to the in-memory cache and remove the least recently used responses
+
+        :param url:     Full URL of the request
+        :param entry:   Cached response
+        """
+        with self._lock:
+            self._entries[url] = entry
+            self._entries.move_to_end(url)
+
+            while len(self._entries) > self._maxEntries:
+                self._entries.popitem(last=False)
+
+    def _file_path(self, url: str) -> str:
+        """
+        Create path to the file of a cached response
+
+        :param url: Full URL of the request
+
+        :return:    Path to the file
+        """
+        file_name = hashlib.sha256(url.encode("utf-8")).hexdigest() + ".json"
+        return os.path.join(self._directory, file_name)
+
+    def _read_file(self, url: str) -> Optional[dict]:
+        """
+        Read a cached response from the directory
+
+        :param url: Full URL of the request
+
+        :return:    Cached response (or "None" if the response is not stored)
+        """
+        if self._directory is None:
+            return None
+
+        try:
+            with open(self._file_path(url), "r") as cache_file:
+                data = json.load(cache_file)
+        except (OSError, ValueError):
+            return None
+
+        # Check for a hash collision
+        if data.get("url") != url:
+            return None
+
+        return {"etag": data["etag"],
+                "status_code": data["status_code"],
+                "headers": data["headers"],
+                "content": base64.b64decode(data["content"])}
+
+    def _write_file(self, url: str, entry: dict) -> None:
+        """
+        Store a cached response in the directory
+
+        :param url:     Full URL of the request
+        :param entry:   Cached response
+        """
+        if self._directory is None:
+            return
+
+        file_path = self._file_path(url)
+        temporary_file_path = "{0}.{1}.tmp".format(file_path, threading.get_ident())
+
+        try:
+            with open(temporary_file_path, "w") as cache_file:
+                json.dump({"url": url,
+                           "etag": entry["etag"],
+                           "status_code": entry["status_code"],
+                           "headers": entry["headers"],
+                           "content": base64.b64encode(entry["content"]).decode("ascii")},
+                          cache_file)
+
+            # Replace the old file atomically so other processes never read a partial file
+            os.replace(temporary_file_path, file_path)
+        except OSError:
+            # Cache is only an optimization, the response is still held in memory
+            pass
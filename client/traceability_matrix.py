@@ -0,0 +1,176 @@
+"""
+Salamander ALM
+Copyright (c) 2016  Djuro Drljaca
+
+This Python module is free software; you can redistribute it and/or modify it under the terms of the
+GNU General Public License as published by the Free Software Foundation; either version 2 of the
+License, or (at your option) any later version.
+
+This Python module is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License along with this library. If
+not, see <http://www.gnu.org/licenses/>.
+"""
+
+from connection import Connection
+import json
+import requests
+from typing import Iterator, Optional
+
+
+class TraceabilityMatrix(object):
+    """
+    Export of the traceability matrix between two trackers
+
+    The matrix is streamed from the server so only a small part of it is held in memory at once,
+    even for trackers with tens of thousands of artifacts. Each row of the matrix contains the
+    artifact ID, the linked artifact ID and the link ID (the last two are "None" for artifacts
+    without links).
+    """
+
+    # Size of the chunks in which the streamed content is read (in bytes)
+    chunk_size = 64 * 1024
+
+    def __init__(self, connection: Connection):
+        """
+        Constructor
+
+        :param connection:  Connection to the server (must be logged in)
+        """
+        self._connection = connection
+        self._revisionId = None
+
+    @property
+    def revision_id(self) -> Optional[int]:
+        """
+        Get the revision from which the last matrix was read
+
+        :return:    Revision ID (or "None" if no matrix was read yet)
+
+        Note: This revision can be used to repeat the export with exactly the same content.
+        """
+        return self._revisionId
+
+    def iterate(self,
+                tracker_id: int,
+                linked_tracker_id: int,
+                direction="downstream",
+                revision_id=None) -> Optional[Iterator[dict]]:
+        """
+        Iterate over the rows of the traceability matrix
+
+        :param tracker_id:          ID of the tracker
+        :param linked_tracker_id:   ID of the linked tracker
+        :param direction:           Direction of the links ("downstream" or "upstream")
+        :param revision_id:         Revision of the matrix ("None" for the current revision)
+
+        :return:    Iterator over the rows ordered by the artifact ID and the linked artifact ID (or
+                    "None" if the request failed)
+
+        Each dictionary returned by the iterator contains items:
+
+        - artifact_id
+        - linked_artifact_id
+        - link_id
+        """
+        response = self._send(tracker_id, linked_tracker_id, direction, revision_id, "ndjson")
+
+        if response is None:
+            return None
+
+        return TraceabilityMatrix._iterate_rows(response)
+
+    def export(self,
+               file_path: str,
+               tracker_id: int,
+               linked_tracker_id: int,
+               direction="downstream",
+               revision_id=None,
+               export_format="csv") -> bool:
+        """
+        Export the traceability matrix to a file
+
+        :param file_path:           Path to the file
+        :param tracker_id:          ID of the tracker
+        :param linked_tracker_id:   ID of the linked tracker
+        :param direction:           Direction of the links ("downstream" or "upstream")
+        :param revision_id:         Revision of the matrix ("None" for the current revision)
+        :param export_format:       Format of the file ("csv" or "ndjson")
+
+        :return:    Success or failure
+        """
+        response = self._send(tracker_id,
+                              linked_tracker_id,
+                              direction,
+                              revision_id,
+                              export_format)
+
+        if response is None:
+            return False
+
+        try:
+            with open(file_path, "wb") as file:
+                for chunk in response.iter_content(TraceabilityMatrix.chunk_size):
+                    file.write(chunk)
+        except requests.RequestException:
+            return False
+        finally:
+            response.close()
+
+        return True
+
+    def _send(self,
+              tracker_id: int,
+              linked_tracker_id: int,
+              direction: str,
+              revision_id: Optional[int],
+              export_format: str) -> Optional[requests.Response]:
+        """
+        Send the export request to the server
+
+        :param tracker_id:          ID of the tracker
+        :param linked_tracker_id:   ID of the linked tracker
+        :param direction:           Direction of the links
+        :param revision_id:         Revision of the matrix ("None" for the current revision)
+        :param export_format:       Format of the response
+
+        :return:    Streamed response message (or "None" if the request failed)
+        """
+        parameters = {"tracker_id": tracker_id,
+                      "linked_tracker_id": linked_tracker_id,
+                      "direction": direction,
+                      "format": export_format}
+
+        if revision_id is not None:
+            parameters["revision_id"] = revision_id
+
+        response = self._connection.stream_request("/artifactmanagement/traceability_matrix",
+                                                   parameters)
+
+        if response is None:
+            return None
+
+        if response.status_code != 200:
+            response.close()
+            return None
+
+        self._revisionId = int(response.headers["SALM-Revision-Id"])
+        return response
+
+    @staticmethod
+    def _iterate_rows(response: requests.Response) -> Iterator[dict]:
+        """
+        Decode the rows of a streamed NDJSON response
+
+        :param response:    Streamed response message
+
+        :return:    Iterator over the rows
+        """
+        try:
+            for line in response.iter_lines(TraceabilityMatrix.chunk_size):
+                if len(line) > 0:
+                    yield json.loads(line)
+        finally:
+            response.close()
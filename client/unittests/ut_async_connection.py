@@ -0,0 +1,111 @@
+"""
+Salamander ALM
+Copyright (c) 2016  Djuro Drljaca
+
+This Python module is free software; you can redistribute it and/or modify it under the terms of the
+GNU General Public License as published by the Free Software Foundation; either version 2 of the
+License, or (at your option) any later version.
+
+This Python module is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License along with this library. If
+not, see <http://www.gnu.org/licenses/>.
+"""
+
+import async_connection
+import asyncio
+import signal
+import subprocess
+import sys
+import time
+import unittest
+
+
+class AsyncConnection(unittest.TestCase):
+    def setUp(self):
+        self.__admin_user_id = 1
+        self.__server_instance = subprocess.Popen([sys.executable, "../../server/salamander_alm.py"])
+
+        if self.__server_instance is not None:
+            time.sleep(2.0)
+
+    def tearDown(self):
+        if self.__server_instance is not None:
+            self.__server_instance.send_signal(signal.SIGINT)
+            self.__server_instance.wait(1.0)
+
+            if self.__server_instance.returncode is None:
+                self.__server_instance.kill()
+
+    # Tests ----------------------------------------------------------------------------------------
+
+    def test_login_logout(self):
+        async def run():
+            conn = async_connection.AsyncConnection()
+
+            self.assertTrue(await conn.login("http://127.0.0.1:5000/api",
+                                             "administrator",
+                                             {"password": "administrator"}))
+            self.assertTrue(conn.is_logged_in())
+
+            response = await conn.call_get_method("/usermanagement/user")
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.json()["user_name"], "administrator")
+
+            self.assertTrue(await conn.logout())
+            self.assertFalse(conn.is_logged_in())
+            self.assertIsNone(await conn.call_get_method("/usermanagement/user"))
+
+            await conn.close()
+
+        asyncio.run(run())
+
+    def test_login_failure(self):
+        async def run():
+            conn = async_connection.AsyncConnection()
+
+            self.assertFalse(await conn.login("http://127.0.0.1:5000/api",
+                                              "administrator",
+                                              {"password": "xyz"}))
+            self.assertFalse(conn.is_logged_in())
+
+            await conn.close()
+
+        asyncio.run(run())
+
+    def test_fan_out(self):
+        async def run():
+            conn = async_connection.AsyncConnection(max_concurrency=4)
+
+            self.assertTrue(await conn.login("http://127.0.0.1:5000/api",
+                                             "administrator",
+                                             {"password": "administrator"}))
+
+            # Read the same user multiple times and a non-existing user
+            user_ids = [self.__admin_user_id] * 20 + [999]
+            users = await conn.read_users_by_ids(user_ids)
+
+            self.assertEqual(len(users), len(user_ids))
+
+            for user in users[:-1]:
+                self.assertEqual(user["id"], self.__admin_user_id)
+                self.assertEqual(user["user_name"], "administrator")
+
+            self.assertIsNone(users[-1])
+
+            # Number of open connections is limited by the max concurrency
+            self.assertLessEqual(conn.statistics()["connection_count"], 4)
+
+            # Invalid limit
+            with self.assertRaises(ValueError):
+                await conn.fan_out(conn.read_user_by_id, user_ids, 0)
+
+            await conn.close()
+
+        asyncio.run(run())
+
+
+if __name__ == '__main__':
+    unittest.main()
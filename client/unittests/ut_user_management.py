@@ -18,9 +18,12 @@ import connection
 import json
 import requests
 import requests.packages
+import response_cache
+import shutil
 import signal
 import subprocess
 import sys
+import tempfile
 import time
 import unittest
 
@@ -231,5 +234,68 @@ class UserManagement(unittest.TestCase):
         self.assertFalse(success)
 
 
+    def test_connection_reuse(self):
+        conn = connection.Connection()
+
+        # First log in
+        success = conn.login("http://127.0.0.1:5000/api",
+                             "administrator",
+                             {"password": "administrator"})
+        self.assertTrue(success)
+
+        # And then read the current user multiple times
+        for i in range(3):
+            success = conn.call_get_method("/usermanagement/user")
+            self.assertTrue(success)
+
+        # All requests must be sent through the same (keep-alive) connection
+        statistics = conn.statistics()
+        self.assertEqual(statistics["request_count"], 4)
+        self.assertEqual(statistics["failed_request_count"], 0)
+        self.assertEqual(statistics["connection_count"], 1)
+
+        conn.close()
+        self.assertFalse(conn.is_logged_in())
+        self.assertEqual(conn.statistics()["connection_count"], 1)
+
+    def test_response_cache(self):
+        cache_directory = tempfile.mkdtemp()
+        conn = connection.Connection(cache=response_cache.ResponseCache(directory=cache_directory))
+
+        # First log in
+        success = conn.login("http://127.0.0.1:5000/api",
+                             "administrator",
+                             {"password": "administrator"})
+        self.assertTrue(success)
+
+        # Read the current user twice, second response must be taken from the cache
+        for i in range(2):
+            success = conn.call_get_method("/usermanagement/user")
+            self.assertTrue(success)
+
+            user = json.loads(conn.last_response_message.text)
+            self.assertEqual(user["id"], self.__admin_user_id)
+            self.assertEqual(user["user_name"], "administrator")
+
+        self.assertEqual(conn.statistics()["cache_hit_count"], 1)
+        conn.close()
+
+        # Stored responses can be used by a new connection
+        conn = connection.Connection(cache=response_cache.ResponseCache(directory=cache_directory))
+
+        success = conn.login("http://127.0.0.1:5000/api",
+                             "administrator",
+                             {"password": "administrator"})
+        self.assertTrue(success)
+
+        success = conn.call_get_method("/usermanagement/user")
+        self.assertTrue(success)
+        self.assertEqual(json.loads(conn.last_response_message.text)["id"],
+                         self.__admin_user_id)
+        self.assertEqual(conn.statistics()["cache_hit_count"], 1)
+
+        conn.close()
+        shutil.rmtree(cache_directory)
+
 if __name__ == '__main__':
     unittest.main()
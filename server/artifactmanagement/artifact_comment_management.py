@@ -0,0 +1,433 @@
+"""
+Salamander ALM
+Copyright (c) 2016  Djuro Drljaca
+
+This Python module is free software; you can redistribute it and/or modify it under the terms of the
+GNU General Public License as published by the Free Software Foundation; either version 2 of the
+License, or (at your option) any later version.
+
+This Python module is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License along with this library. If
+not, see <http://www.gnu.org/licenses/>.
+"""
+
+from database.connection import Connection
+from database.database import DatabaseInterface
+import datetime
+from typing import List, Optional
+
+
+class ArtifactCommentManagementInterface(object):
+    """
+    Artifact comment management
+
+    Each edit of a comment is stored as a new version of the comment (previous versions are never
+    modified) so the complete history of a comment stays available. The current version of the
+    active comments is also kept in a separate index by the database so the comment thread of an
+    artifact is read one page at a time without reading the history of its comments.
+
+    Dependencies:
+
+    - DatabaseInterface
+    """
+
+    # Default number of comments in a page of a comment thread
+    default_page_size = 20
+
+    # Max number of comments in a page of a comment thread
+    max_page_size = 200
+
+    def __init__(self):
+        """
+        Constructor is disabled!
+        """
+        raise RuntimeError()
+
+    @staticmethod
+    def read_comments(artifact_id: int,
+                      before_comment_id: Optional[int] = None,
+                      page_size: Optional[int] = None) -> List[dict]:
+        """
+        Reads a page of the comment thread of the artifact (current version of its active comments)
+
+        :param artifact_id:         ID of the artifact
+        :param before_comment_id:   ID of the last comment of the previous page ("None" for the
+                                    first page)
+        :param page_size:           Max number of comments in the page ("None" for default page
+                                    size)
+
+        :return:    Comments ordered from the newest to the oldest one
+
+        Each dictionary in the returned list contains items:
+
+        - id
+        - artifact_id
+        - created_on
+        - created_by
+        - text
+        - revision_id
+        - modified_on
+        - modified_by
+
+        NOTE:   The next page is read by passing the ID of the last comment in the page as
+                "before_comment_id". Pages are stable even if new comments are created in the
+                meantime.
+        """
+        if page_size is None:
+            page_size = ArtifactCommentManagementInterface.default_page_size
+
+        if (page_size < 1) or (page_size > ArtifactCommentManagementInterface.max_page_size):
+            return list()
+
+        connection = DatabaseInterface.create_connection()
+
+        return DatabaseInterface.tables().artifact_comment_current.read_comments(connection,
+                                                                                 artifact_id,
+                                                                                 before_comment_id,
+                                                                                 page_size)
+
+    @staticmethod
+    def read_comment_count(artifact_id: int) -> int:
+        """
+        Reads the number of active comments of the artifact
+
+        :param artifact_id: ID of the artifact
+
+        :return:    Number of comments
+        """
+        connection = DatabaseInterface.create_connection()
+
+        return DatabaseInterface.tables().artifact_comment_current.read_comment_count(connection,
+                                                                                      artifact_id)
+
+    @staticmethod
+    def read_comment_by_id(comment_id: int, max_revision_id=None) -> Optional[dict]:
+        """
+        Reads the comment (active or inactive) that matches the search parameters
+
+        :param comment_id:      ID of the comment
+        :param max_revision_id: Maximum revision ID for the search ("None" for latest revision)
+
+        :return:    Comment information object
+
+        Returned dictionary contains items:
+
+        - id
+        - artifact_id
+        - created_on
+        - created_by
+        - text
+        - active
+        - revision_id
+        - modified_on
+        - modified_by
+        """
+        connection = DatabaseInterface.create_connection()
+
+        if max_revision_id is None:
+            max_revision_id = DatabaseInterface.tables().revision.read_current_revision_id(
+                connection)
+
+        comment = None
+
+        if max_revision_id is not None:
+            comment = ArtifactCommentManagementInterface.__read_comment_by_id(connection,
+                                                                              comment_id,
+                                                                              max_revision_id)
+
+        return comment
+
+    @staticmethod
+    def read_comment_history(comment_id: int) -> List[dict]:
+        """
+        Reads all versions of the comment
+
+        :param comment_id:  ID of the comment
+
+        :return:    Versions of the comment ordered from the original to the latest version
+
+        Each dictionary in the returned list contains items:
+
+        - text
+        - active
+        - revision_id
+        - modified_on
+        - modified_by
+        """
+        connection = DatabaseInterface.create_connection()
+
+        history = list()
+
+        for information in DatabaseInterface.tables().artifact_comment_information.read_history(
+                connection,
+                comment_id):
+            history.append({"text": information["text"],
+                            "active": information["active"],
+                            "revision_id": information["revision_id"],
+                            "modified_on": information["modified_on"],
+                            "modified_by": information["modified_by"]})
+
+        return history
+
+    @staticmethod
+    def create_comment(requested_by_user: int, artifact_id: int, text: str) -> Optional[int]:
+        """
+        Creates a new comment of an active artifact
+
+        :param requested_by_user:   ID of the user that requested creation of the new comment
+        :param artifact_id:         ID of the artifact
+        :param text:                Text of the comment
+
+        :return:    Comment ID of the new comment
+        """
+        if len(text) == 0:
+            return None
+
+        comment_id = None
+        connection = DatabaseInterface.create_connection()
+
+        try:
+            success = connection.begin_transaction(write=True)
+
+            # Start a new revision
+            revision_id = None
+            timestamp = datetime.datetime.utcnow()
+
+            if success:
+                revision_id = DatabaseInterface.tables().revision.insert_row(connection,
+                                                                             timestamp,
+                                                                             requested_by_user)
+
+                if revision_id is None:
+                    success = False
+
+            # Check if the artifact is active
+            if success:
+                success = ArtifactCommentManagementInterface.__is_artifact_active(connection,
+                                                                                  artifact_id,
+                                                                                  revision_id)
+
+            # Create the comment
+            if success:
+                comment_id = DatabaseInterface.tables().artifact_comment.insert_row(
+                    connection,
+                    artifact_id,
+                    timestamp,
+                    requested_by_user)
+
+                if comment_id is None:
+                    success = False
+
+            if success:
+                information_id = DatabaseInterface.tables().artifact_comment_information.insert_row(
+                    connection,
+                    comment_id,
+                    text,
+                    True,
+                    revision_id)
+
+                if information_id is None:
+                    success = False
+
+            if success:
+                connection.commit_transaction()
+            else:
+                connection.rollback_transaction()
+                comment_id = None
+        except:
+            connection.rollback_transaction()
+            raise
+
+        return comment_id
+
+    @staticmethod
+    def update_comment(requested_by_user: int,
+                       comment_id: int,
+                       text: str,
+                       expected_revision_id=None) -> bool:
+        """
+        Updates the text of an active comment
+
+        :param requested_by_user:       ID of the user that requested modification of the comment
+        :param comment_id:              ID of the comment
+        :param text:                    New text of the comment
+        :param expected_revision_id:    Revision ID of the comment that the modification is based
+                                        on (optional)
+
+        :return:    Success or failure
+
+        NOTE:   Previous text stays available in the history of the comment!
+        """
+        if len(text) == 0:
+            return False
+
+        return ArtifactCommentManagementInterface.__update_comment_information(requested_by_user,
+                                                                               comment_id,
+                                                                               text,
+                                                                               True,
+                                                                               expected_revision_id)
+
+    @staticmethod
+    def delete_comment(requested_by_user: int, comment_id: int, expected_revision_id=None) -> bool:
+        """
+        Deletes (deactivates) an active comment
+
+        :param requested_by_user:       ID of the user that requested deletion of the comment
+        :param comment_id:              ID of the comment
+        :param expected_revision_id:    Revision ID of the comment that the deletion is based on
+                                        (optional)
+
+        :return:    Success or failure
+        """
+        return ArtifactCommentManagementInterface.__update_comment_information(requested_by_user,
+                                                                               comment_id,
+                                                                               None,
+                                                                               False,
+                                                                               expected_revision_id)
+
+    @staticmethod
+    def __update_comment_information(requested_by_user: int,
+                                     comment_id: int,
+                                     text: Optional[str],
+                                     active: bool,
+                                     expected_revision_id: Optional[int]) -> bool:
+        """
+        Adds a new version to an active comment
+
+        :param requested_by_user:       ID of the user that requested modification of the comment
+        :param comment_id:              ID of the comment
+        :param text:                    New text ("None" to keep the current text)
+        :param active:                  New state of the comment (active or inactive)
+        :param expected_revision_id:    Revision ID of the comment that the modification is based
+                                        on (optional)
+
+        :return:    Success or failure
+
+        NOTE:   If the expected revision ID is specified the modification fails in case the comment
+                was modified in a later revision!
+        """
+        connection = DatabaseInterface.create_connection()
+
+        try:
+            success = connection.begin_transaction(write=True)
+
+            # Start a new revision
+            revision_id = None
+
+            if success:
+                revision_id = DatabaseInterface.tables().revision.insert_row(
+                    connection,
+                    datetime.datetime.utcnow(),
+                    requested_by_user)
+
+                if revision_id is None:
+                    success = False
+
+            # Check if the comment and its artifact are active
+            comment = None
+
+            if success:
+                comment = ArtifactCommentManagementInterface.__read_comment_by_id(connection,
+                                                                                  comment_id,
+                                                                                  revision_id)
+
+                if (comment is None) or (not comment["active"]):
+                    # Error, invalid comment
+                    success = False
+                elif ((expected_revision_id is not None) and
+                        (comment["revision_id"] != expected_revision_id)):
+                    # Error, comment was modified after the expected revision
+                    success = False
+
+            if success:
+                success = ArtifactCommentManagementInterface.__is_artifact_active(
+                    connection,
+                    comment["artifact_id"],
+                    revision_id)
+
+            # Add the new comment information
+            if success:
+                if text is None:
+                    text = comment["text"]
+
+                information_id = DatabaseInterface.tables().artifact_comment_information.insert_row(
+                    connection,
+                    comment_id,
+                    text,
+                    active,
+                    revision_id)
+
+                if information_id is None:
+                    success = False
+
+            if success:
+                connection.commit_transaction()
+            else:
+                connection.rollback_transaction()
+        except:
+            connection.rollback_transaction()
+            raise
+
+        return success
+
+    @staticmethod
+    def __read_comment_by_id(connection: Connection,
+                             comment_id: int,
+                             max_revision_id: int) -> Optional[dict]:
+        """
+        Reads the comment (active or inactive) that matches the search parameters
+
+        :param connection:      Database connection
+        :param comment_id:      ID of the comment
+        :param max_revision_id: Maximum revision ID for the search
+
+        :return:    Comment information object (see "read_comment_by_id")
+        """
+        comment = DatabaseInterface.tables().artifact_comment.read_comment(connection, comment_id)
+
+        if comment is None:
+            return None
+
+        information = DatabaseInterface.tables().artifact_comment_information.read_information(
+            connection,
+            comment_id,
+            max_revision_id)
+
+        if information is None:
+            return None
+
+        return {"id": comment["id"],
+                "artifact_id": comment["artifact_id"],
+                "created_on": comment["created_on"],
+                "created_by": comment["created_by"],
+                "text": information["text"],
+                "active": information["active"],
+                "revision_id": information["revision_id"],
+                "modified_on": information["modified_on"],
+                "modified_by": information["modified_by"]}
+
+    @staticmethod
+    def __is_artifact_active(connection: Connection, artifact_id: int, revision_id: int) -> bool:
+        """
+        Checks if the artifact is active
+
+        :param connection:  Database connection
+        :param artifact_id: ID of the artifact
+        :param revision_id: Revision ID
+
+        :return:    True if the artifact is active
+
+        NOTE:   Comments of a locked artifact can still be created and modified.
+        """
+        artifact = DatabaseInterface.tables().artifact_information.read_information(connection,
+                                                                                   artifact_id,
+                                                                                   revision_id)
+
+        if artifact is None:
+            # Error, artifact was not found
+            return False
+
+        return artifact["active"]
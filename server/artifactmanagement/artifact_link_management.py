@@ -0,0 +1,440 @@
+"""
+Salamander ALM
+Copyright (c) 2016  Djuro Drljaca
+
+This Python module is free software; you can redistribute it and/or modify it under the terms of the
+GNU General Public License as published by the Free Software Foundation; either version 2 of the
+License, or (at your option) any later version.
+
+This Python module is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License along with this library. If
+not, see <http://www.gnu.org/licenses/>.
+"""
+
+from database.connection import Connection
+from database.database import DatabaseInterface
+from database.tables.artifact_link import LinkDirection
+from database.tables.tracker_information import TrackerSelection
+import datetime
+from typing import Iterator, List, Optional
+
+
+class ArtifactLinkManagementInterface(object):
+    """
+    Artifact link management
+
+    Links are directed (from the source to the target artifact) and they must not form a cycle so
+    the traceability queries (all artifacts that are downstream or upstream of an artifact) can be
+    answered from the transitive closure of the links.
+
+    Dependencies:
+
+    - DatabaseInterface
+    """
+
+    # Number of artifacts of the tracker whose links are read from the database at once
+    matrix_chunk_size = 1000
+
+    def __init__(self):
+        """
+        Constructor is disabled!
+        """
+        raise RuntimeError()
+
+    @staticmethod
+    def read_links(artifact_id: int,
+                   direction=LinkDirection.Downstream,
+                   max_revision_id=None) -> List[dict]:
+        """
+        Reads all active links of the specified artifact
+
+        :param artifact_id:     ID of the artifact
+        :param direction:       Read links to the target artifacts (downstream) or links from the
+                                source artifacts (upstream)
+        :param max_revision_id: Maximum revision ID for the search ("None" for latest revision)
+
+        :return:    Links ordered by the ID of the linked artifact
+
+        Each dictionary in the returned list contains items:
+
+        - id
+        - source_artifact_id
+        - target_artifact_id
+        - revision_id
+        """
+        connection = DatabaseInterface.create_connection()
+
+        if max_revision_id is None:
+            max_revision_id = DatabaseInterface.tables().revision.read_current_revision_id(
+                connection)
+
+        links = list()
+
+        if max_revision_id is not None:
+            links = DatabaseInterface.tables().artifact_link_information.read_links(
+                connection,
+                artifact_id,
+                direction,
+                max_revision_id)
+
+        return links
+
+    @staticmethod
+    def read_traced_artifact_ids(artifact_id: int,
+                                 direction=LinkDirection.Downstream,
+                                 tracker_id=None) -> List[int]:
+        """
+        Reads IDs of all active artifacts that are transitively linked from (downstream) or to
+        (upstream) the specified artifact in the current revision
+
+        :param artifact_id: ID of the artifact
+        :param direction:   Follow the links downstream or upstream
+        :param tracker_id:  Only artifacts of this tracker are returned ("None" for all trackers)
+
+        :return:    List of artifact IDs (in ascending order)
+        """
+        connection = DatabaseInterface.create_connection()
+
+        return DatabaseInterface.tables().artifact_link_closure.read_reachable_artifact_ids(
+            connection,
+            artifact_id,
+            direction,
+            tracker_id)
+
+    @staticmethod
+    def read_path(source_artifact_id: int, target_artifact_id: int) -> Optional[List[int]]:
+        """
+        Reads a path of active links from the source to the target artifact in the current revision
+
+        :param source_artifact_id:  ID of the source artifact
+        :param target_artifact_id:  ID of the target artifact
+
+        :return:    IDs of the artifacts on the path (including the source and the target artifact)
+                    or "None" if the target artifact is not reachable
+
+        NOTE:   If there are multiple paths only one of them is returned (not necessarily the
+                shortest one)!
+        """
+        connection = DatabaseInterface.create_connection()
+        artifact_link_closure = DatabaseInterface.tables().artifact_link_closure
+
+        if not artifact_link_closure.is_reachable(connection,
+                                                  source_artifact_id,
+                                                  target_artifact_id):
+            return None
+
+        # Each step is a single query that selects a directly linked artifact from which the target
+        # artifact is still reachable
+        path = [source_artifact_id]
+
+        while path[-1] != target_artifact_id:
+            next_artifact_id = artifact_link_closure.read_next_artifact_id(connection,
+                                                                           path[-1],
+                                                                           target_artifact_id)
+
+            if (next_artifact_id is None) or (next_artifact_id in path):
+                # Error, links were modified in the meantime
+                return None
+
+            path.append(next_artifact_id)
+
+        return path
+
+    @staticmethod
+    def read_coverage_matrix(tracker_id: int,
+                             covering_tracker_id: int,
+                             direction=LinkDirection.Downstream) -> dict:
+        """
+        Reads the coverage matrix of the active artifacts of a tracker by the active artifacts of
+        another tracker (for example requirements covered by test cases) in the current revision
+
+        :param tracker_id:          ID of the tracker
+        :param covering_tracker_id: ID of the covering tracker
+        :param direction:           Follow the links downstream or upstream
+
+        :return:    Coverage matrix
+
+        Returned dictionary contains a sorted list of IDs of the covering artifacts that are
+        transitively linked to the artifact (key is the artifact ID). List is empty if the artifact
+        is not covered.
+        """
+        connection = DatabaseInterface.create_connection()
+
+        coverage = DatabaseInterface.tables().artifact_link_closure.read_coverage(
+            connection,
+            tracker_id,
+            covering_tracker_id,
+            direction)
+
+        matrix = dict()
+
+        for item in coverage:
+            covering_artifact_ids = matrix.setdefault(item["artifact_id"], list())
+
+            if item["covering_artifact_id"] is not None:
+                covering_artifact_ids.append(item["covering_artifact_id"])
+
+        return matrix
+
+    @staticmethod
+    def iterate_traceability_matrix(tracker_id: int,
+                                    linked_tracker_id: int,
+                                    direction=LinkDirection.Downstream,
+                                    max_revision_id=None) -> Optional[Iterator[dict]]:
+        """
+        Iterates over the traceability matrix between the active artifacts of a tracker and the
+        active artifacts of another tracker (direct links only) in the specified revision
+
+        :param tracker_id:          ID of the tracker
+        :param linked_tracker_id:   ID of the linked tracker
+        :param direction:           Read links to the target artifacts (downstream) or links from
+                                    the source artifacts (upstream)
+        :param max_revision_id:     Maximum revision ID for the search ("None" for latest revision)
+
+        :return:    Iterator over the cells of the matrix ordered by the artifact ID and the linked
+                    artifact ID ("None" if the revision or one of the trackers does not exist)
+
+        Each dictionary returned by the iterator contains items:
+
+        - artifact_id
+        - linked_artifact_id ("None" if the artifact has no links)
+        - link_id ("None" if the artifact has no links)
+
+        Only the links of "matrix_chunk_size" artifacts are held in memory at once so even the
+        matrix of very large trackers can be streamed. All chunks are read from the same revision
+        so the matrix stays consistent even if the links are modified while it is being read.
+        """
+        connection = DatabaseInterface.create_connection()
+
+        # Check parameters
+        if max_revision_id is None:
+            max_revision_id = DatabaseInterface.tables().revision.read_current_revision_id(
+                connection)
+
+            if max_revision_id is None:
+                return None
+        elif DatabaseInterface.tables().revision.read_revision(connection,
+                                                               max_revision_id) is None:
+            return None
+
+        for item in [tracker_id, linked_tracker_id]:
+            trackers = DatabaseInterface.tables().tracker_information.read_information(
+                connection,
+                "tracker_id",
+                item,
+                TrackerSelection.All,
+                max_revision_id)
+
+            if len(trackers) == 0:
+                return None
+
+        return ArtifactLinkManagementInterface.__iterate_matrix_chunks(connection,
+                                                                       tracker_id,
+                                                                       linked_tracker_id,
+                                                                       direction,
+                                                                       max_revision_id)
+
+    @staticmethod
+    def create_link(requested_by_user: int,
+                    source_artifact_id: int,
+                    target_artifact_id: int) -> Optional[int]:
+        """
+        Creates a link from the source to the target artifact (or activates an inactive link
+        between them)
+
+        :param requested_by_user:   ID of the user that requested creation of the link
+        :param source_artifact_id:  ID of the source artifact
+        :param target_artifact_id:  ID of the target artifact
+
+        :return:    Link ID ("None" if both artifacts are not active, if the link already exists or
+                    if it would create a cycle)
+        """
+        link_id = None
+        connection = DatabaseInterface.create_connection()
+
+        try:
+            success = connection.begin_transaction(write=True)
+
+            # Start a new revision
+            revision_id = None
+
+            if success:
+                revision_id = DatabaseInterface.tables().revision.insert_row(
+                    connection,
+                    datetime.datetime.utcnow(),
+                    requested_by_user)
+
+                if revision_id is None:
+                    success = False
+
+            # Check if both artifacts are active
+            if success:
+                if source_artifact_id == target_artifact_id:
+                    # Error, link to itself
+                    success = False
+
+            if success:
+                for artifact_id in [source_artifact_id, target_artifact_id]:
+                    artifact = DatabaseInterface.tables().artifact_information.read_information(
+                        connection,
+                        artifact_id,
+                        revision_id)
+
+                    if (artifact is None) or (not artifact["active"]):
+                        # Error, invalid artifact
+                        success = False
+
+            # Check if the link would create a cycle
+            if success:
+                if DatabaseInterface.tables().artifact_link_closure.is_reachable(
+                        connection,
+                        target_artifact_id,
+                        source_artifact_id):
+                    # Error, cycle
+                    success = False
+
+            # Find the link (only an inactive link can be activated) or create it
+            if success:
+                link_id = DatabaseInterface.tables().artifact_link.read_link_id(connection,
+                                                                                source_artifact_id,
+                                                                                target_artifact_id)
+
+                if link_id is None:
+                    link_id = DatabaseInterface.tables().artifact_link.insert_row(
+                        connection,
+                        source_artifact_id,
+                        target_artifact_id)
+
+                    if link_id is None:
+                        success = False
+                else:
+                    link = DatabaseInterface.tables().artifact_link_information.read_information(
+                        connection,
+                        link_id,
+                        revision_id)
+
+                    if (link is not None) and link["active"]:
+                        # Error, link already exists
+                        success = False
+
+            # Activate the link (transitive closure is updated by the database)
+            if success:
+                link_information_id = \
+                    DatabaseInterface.tables().artifact_link_information.insert_row(connection,
+                                                                                    link_id,
+                                                                                    True,
+                                                                                    revision_id)
+
+                if link_information_id is None:
+                    success = False
+
+            if success:
+                connection.commit_transaction()
+            else:
+                connection.rollback_transaction()
+                link_id = None
+        except:
+            connection.rollback_transaction()
+            raise
+
+        return link_id
+
+    @staticmethod
+    def delete_link(requested_by_user: int, link_id: int) -> bool:
+        """
+        Deletes (deactivates) an active link
+
+        :param requested_by_user:   ID of the user that requested deletion of the link
+        :param link_id:             ID of the link
+
+        :return:    Success or failure
+        """
+        connection = DatabaseInterface.create_connection()
+
+        try:
+            success = connection.begin_transaction(write=True)
+
+            # Start a new revision
+            revision_id = None
+
+            if success:
+                revision_id = DatabaseInterface.tables().revision.insert_row(
+                    connection,
+                    datetime.datetime.utcnow(),
+                    requested_by_user)
+
+                if revision_id is None:
+                    success = False
+
+            # Check if the link is active
+            if success:
+                link = DatabaseInterface.tables().artifact_link_information.read_information(
+                    connection,
+                    link_id,
+                    revision_id)
+
+                if (link is None) or (not link["active"]):
+                    # Error, invalid link
+                    success = False
+
+            # Deactivate the link (transitive closure is updated by the database)
+            if success:
+                link_information_id = \
+                    DatabaseInterface.tables().artifact_link_information.insert_row(connection,
+                                                                                    link_id,
+                                                                                    False,
+                                                                                    revision_id)
+
+                if link_information_id is None:
+                    success = False
+
+            if success:
+                connection.commit_transaction()
+            else:
+                connection.rollback_transaction()
+        except:
+            connection.rollback_transaction()
+            raise
+
+        return success
+
+    @staticmethod
+    def __iterate_matrix_chunks(connection: Connection,
+                                tracker_id: int,
+                                linked_tracker_id: int,
+                                direction: LinkDirection,
+                                max_revision_id: int) -> Iterator[dict]:
+        """
+        Reads the traceability matrix chunk by chunk
+
+        :param connection:          Database connection
+        :param tracker_id:          ID of the tracker
+        :param linked_tracker_id:   ID of the linked tracker
+        :param direction:           Read links downstream or upstream
+        :param max_revision_id:     Maximum revision ID for the search
+
+        :return:    Iterator over the cells of the matrix
+        """
+        artifact_link_information = DatabaseInterface.tables().artifact_link_information
+        chunk_size = ArtifactLinkManagementInterface.matrix_chunk_size
+        after_artifact_id = 0
+
+        while True:
+            links = artifact_link_information.read_tracker_links(connection,
+                                                                 tracker_id,
+                                                                 linked_tracker_id,
+                                                                 direction,
+                                                                 after_artifact_id,
+                                                                 chunk_size,
+                                                                 max_revision_id)
+
+            if len(links) == 0:
+                break
+
+            for link in links:
+                yield link
+
+            after_artifact_id = links[-1]["artifact_id"]
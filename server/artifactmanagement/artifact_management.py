@@ -0,0 +1,545 @@
+"""
+Salamander ALM
+Copyright (c) 2016  Djuro Drljaca
+
+This Python module is free software; you can redistribute it and/or modify it under the terms of the
+GNU General Public License as published by the Free Software Foundation; either version 2 of the
+License, or (at your option) any later version.
+
+This Python module is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License along with this library. If
+not, see <http://www.gnu.org/licenses/>.
+"""
+
+from database.connection import Connection
+from database.database import DatabaseInterface
+from database.tables.artifact_information import ArtifactSelection
+from database.tables.tracker_field_information import TrackerFieldSelection
+import datetime
+from typing import List, Optional
+
+
+class ArtifactManagementInterface(object):
+    """
+    Artifact management
+
+    Dependencies:
+
+    - DatabaseInterface
+    """
+
+    def __init__(self):
+        """
+        Constructor is disabled!
+        """
+        raise RuntimeError()
+
+    @staticmethod
+    def read_all_artifact_ids(tracker_id: int,
+                              artifact_selection=ArtifactSelection.Active,
+                              max_revision_id=None) -> List[int]:
+        """
+        Reads all artifact IDs from the database
+
+        :param tracker_id:          ID of the tracker
+        :param artifact_selection:  Search for active, inactive or all artifacts
+        :param max_revision_id:     Maximum revision ID for the search ("None" for latest revision)
+
+        :return:    List of artifact IDs
+        """
+        connection = DatabaseInterface.create_connection()
+
+        if max_revision_id is None:
+            max_revision_id = DatabaseInterface.tables().revision.read_current_revision_id(
+                connection)
+
+        # Reads all artifact IDs from the database
+        artifacts = None
+
+        if max_revision_id is not None:
+            artifacts = DatabaseInterface.tables().artifact_information.read_all_artifact_ids(
+                connection,
+                tracker_id,
+                artifact_selection,
+                max_revision_id)
+
+        return artifacts
+
+    @staticmethod
+    def read_artifact_by_id(artifact_id: int, max_revision_id=None) -> Optional[dict]:
+        """
+        Reads an artifact (active or inactive) that matches the specified artifact ID
+
+        :param artifact_id:     ID of the artifact
+        :param max_revision_id: Maximum revision ID for the search ("None" for latest revision)
+
+        :return:    Artifact object
+
+        Returned dictionary contains items:
+
+        - id
+        - tracker_id
+        - created_on
+        - created_by
+        - locked
+        - active
+        - revision_id
+        - fields
+
+        Item "fields" contains a dictionary with field values of the artifact (key is the tracker
+        field ID).
+        """
+        connection = DatabaseInterface.create_connection()
+
+        if max_revision_id is None:
+            max_revision_id = DatabaseInterface.tables().revision.read_current_revision_id(
+                connection)
+
+        # Read an artifact that matches the specified artifact ID
+        artifact = None
+
+        if max_revision_id is not None:
+            artifact = ArtifactManagementInterface.__read_artifact_by_id(connection,
+                                                                         artifact_id,
+                                                                         max_revision_id)
+
+        return artifact
+
+    @staticmethod
+    def read_artifacts_information(artifact_ids: List[int], max_revision_id=None) -> List[dict]:
+        """
+        Reads the information (without field values) of all of the specified artifacts
+
+        :param artifact_ids:    List of artifact IDs
+        :param max_revision_id: Maximum revision ID for the search ("None" for latest revision)
+
+        :return:    Artifact information of all artifacts that were found
+
+        Each dictionary in the returned list contains items:
+
+        - id
+        - locked
+        - active
+        - revision_id
+        """
+        connection = DatabaseInterface.create_connection()
+
+        if max_revision_id is None:
+            max_revision_id = DatabaseInterface.tables().revision.read_current_revision_id(
+                connection)
+
+        # Read the latest information of all artifacts at once
+        artifacts = list()
+
+        if max_revision_id is not None:
+            artifact_information_list = \
+                DatabaseInterface.tables().artifact_information.read_information_by_artifact_ids(
+                    connection,
+                    artifact_ids,
+                    max_revision_id)
+
+            for artifact_information in artifact_information_list:
+                artifacts.append({"id": artifact_information["artifact_id"],
+                                  "locked": artifact_information["locked"],
+                                  "active": artifact_information["active"],
+                                  "revision_id": artifact_information["revision_id"]})
+
+        return artifacts
+
+    @staticmethod
+    def create_artifact(requested_by_user: int,
+                        tracker_id: int,
+                        fields: dict) -> Optional[int]:
+        """
+        Creates a new artifact
+
+        :param requested_by_user:   ID of the user that requested creation of the new artifact
+        :param tracker_id:          ID of the tracker
+        :param fields:              Artifact's field values (key is the tracker field ID)
+
+        :return:    Artifact ID of the new artifact
+        """
+        artifact_id = None
+        connection = DatabaseInterface.create_connection()
+
+        try:
+            success = connection.begin_transaction(write=True)
+
+            # Start a new revision
+            revision_id = None
+            timestamp = datetime.datetime.utcnow()
+
+            if success:
+                revision_id = DatabaseInterface.tables().revision.insert_row(connection,
+                                                                             timestamp,
+                                                                             requested_by_user)
+
+                if revision_id is None:
+                    success = False
+
+            # Check if the fields are valid for the tracker
+            if success:
+                success = ArtifactManagementInterface.__validate_fields(connection,
+                                                                        tracker_id,
+                                                                        fields,
+                                                                        revision_id)
+
+            # Create the artifact
+            if success:
+                artifact_id = DatabaseInterface.tables().artifact.insert_row(connection,
+                                                                             tracker_id,
+                                                                             timestamp,
+                                                                             requested_by_user)
+
+                if artifact_id is None:
+                    success = False
+
+            # Add artifact information and field values to the artifact
+            if success:
+                success = ArtifactManagementInterface.__insert_artifact_information(connection,
+                                                                                    artifact_id,
+                                                                                    fields,
+                                                                                    False,
+                                                                                    True,
+                                                                                    revision_id)
+
+            if success:
+                connection.commit_transaction()
+            else:
+                connection.rollback_transaction()
+                artifact_id = None
+        except:
+            connection.rollback_transaction()
+            raise
+
+        return artifact_id
+
+    @staticmethod
+    def update_artifact_information(requested_by_user: int,
+                                    artifact_to_modify: int,
+                                    fields: dict,
+                                    locked: bool,
+                                    active: bool,
+                                    expected_revision_id=None) -> bool:
+        """
+        Updates artifact's information
+
+        :param requested_by_user:       ID of the user that requested modification of the artifact
+        :param artifact_to_modify:      ID of the artifact that should be modified
+        :param fields:                  Artifact's new field values (key is the tracker field ID)
+        :param locked:                  Artifact's new lock state (locked or unlocked)
+        :param active:                  Artifact's new state (active or inactive)
+        :param expected_revision_id:    Revision ID of the artifact that the modification is based
+                                        on (optional)
+
+        :return:    Success or failure
+
+        NOTE:   A locked artifact can only be unlocked, all other modifications are rejected until
+                the lock is released!
+
+        NOTE:   If the expected revision ID is specified the update fails in case the artifact was
+                modified in a later revision!
+        """
+        connection = DatabaseInterface.create_connection()
+
+        try:
+            success = connection.begin_transaction(write=True)
+
+            # Start a new revision
+            revision_id = None
+
+            if success:
+                revision_id = DatabaseInterface.tables().revision.insert_row(
+                    connection,
+                    datetime.datetime.utcnow(),
+                    requested_by_user)
+
+                if revision_id is None:
+                    success = False
+
+            # Read artifact
+            artifact = None
+
+            if success:
+                artifact = ArtifactManagementInterface.__read_artifact_by_id(connection,
+                                                                             artifact_to_modify,
+                                                                             revision_id)
+
+                if artifact is None:
+                    success = False
+                elif artifact["locked"] and (locked or
+                                             (fields != artifact["fields"]) or
+                                             (active != artifact["active"])):
+                    # Error, artifact is locked and the modification is not just an unlock
+                    success = False
+                elif ((expected_revision_id is not None) and
+                        (artifact["revision_id"] != expected_revision_id)):
+                    # Error, artifact was modified after the expected revision
+                    success = False
+
+            # Check if the fields are valid for the tracker
+            if success:
+                success = ArtifactManagementInterface.__validate_fields(connection,
+                                                                        artifact["tracker_id"],
+                                                                        fields,
+                                                                        revision_id)
+
+            # Update artifact's information in the new revision
+            if success:
+                success = ArtifactManagementInterface.__insert_artifact_information(
+                    connection,
+                    artifact_to_modify,
+                    fields,
+                    locked,
+                    active,
+                    revision_id)
+
+            if success:
+                connection.commit_transaction()
+            else:
+                connection.rollback_transaction()
+        except:
+            connection.rollback_transaction()
+            raise
+
+        return success
+
+    @staticmethod
+    def activate_artifact(requested_by_user: int, artifact_id: int) -> bool:
+        """
+        Activates an inactive artifact
+
+        :param requested_by_user:   ID of the user that requested modification of the artifact
+        :param artifact_id:         ID of the artifact that should be activated
+
+        :return:    Success or failure
+        """
+        return ArtifactManagementInterface.__update_artifact_state(requested_by_user,
+                                                                   artifact_id,
+                                                                   True)
+
+    @staticmethod
+    def deactivate_artifact(requested_by_user: int, artifact_id: int) -> bool:
+        """
+        Deactivates an active artifact
+
+        :param requested_by_user:   ID of the user that requested modification of the artifact
+        :param artifact_id:         ID of the artifact that should be deactivated
+
+        :return:    Success or failure
+        """
+        return ArtifactManagementInterface.__update_artifact_state(requested_by_user,
+                                                                   artifact_id,
+                                                                   False)
+
+    @staticmethod
+    def __update_artifact_state(requested_by_user: int, artifact_id: int, active: bool) -> bool:
+        """
+        Changes the state of an artifact (active or inactive)
+
+        :param requested_by_user:   ID of the user that requested modification of the artifact
+        :param artifact_id:         ID of the artifact that should be modified
+        :param active:              Artifact's new state (active or inactive)
+
+        :return:    Success or failure
+        """
+        connection = DatabaseInterface.create_connection()
+
+        try:
+            success = connection.begin_transaction(write=True)
+
+            # Start a new revision
+            revision_id = None
+
+            if success:
+                revision_id = DatabaseInterface.tables().revision.insert_row(
+                    connection,
+                    datetime.datetime.utcnow(),
+                    requested_by_user)
+
+                if revision_id is None:
+                    success = False
+
+            # Read artifact
+            artifact = None
+
+            if success:
+                artifact = ArtifactManagementInterface.__read_artifact_by_id(connection,
+                                                                             artifact_id,
+                                                                             revision_id)
+
+                if artifact is None:
+                    success = False
+                elif artifact["locked"]:
+                    # Error, artifact is locked
+                    success = False
+                elif artifact["active"] == active:
+                    # Error, artifact is already in the requested state
+                    success = False
+
+            # Write the new state of the artifact (field values are carried over)
+            if success:
+                success = ArtifactManagementInterface.__insert_artifact_information(
+                    connection,
+                    artifact_id,
+                    artifact["fields"],
+                    artifact["locked"],
+                    active,
+                    revision_id)
+
+            if success:
+                connection.commit_transaction()
+            else:
+                connection.rollback_transaction()
+        except:
+            connection.rollback_transaction()
+            raise
+
+        return success
+
+    @staticmethod
+    def __read_artifact_by_id(connection: Connection,
+                              artifact_id: int,
+                              max_revision_id: int) -> Optional[dict]:
+        """
+        Reads an artifact (active or inactive) that matches the search parameters
+
+        :param connection:      Database connection
+        :param artifact_id:     ID of the artifact
+        :param max_revision_id: Maximum revision ID for the search
+
+        :return:    Artifact object
+
+        Returned dictionary contains items:
+
+        - id
+        - tracker_id
+        - created_on
+        - created_by
+        - locked
+        - active
+        - revision_id
+        - fields
+        """
+        # Read the artifact with all of its field values in a single query
+        raw_artifact = DatabaseInterface.tables().artifact_information.read_artifact(
+            connection,
+            artifact_id,
+            max_revision_id)
+
+        artifact = None
+
+        if raw_artifact is not None:
+            artifact = ArtifactManagementInterface.__parse_artifact(raw_artifact)
+
+        return artifact
+
+    @staticmethod
+    def __validate_fields(connection: Connection,
+                          tracker_id: int,
+                          fields: dict,
+                          max_revision_id: int) -> bool:
+        """
+        Checks if all of the fields belong to the active fields of the specified tracker
+
+        :param connection:      Database connection
+        :param tracker_id:      ID of the tracker
+        :param fields:          Field values (key is the tracker field ID)
+        :param max_revision_id: Maximum revision ID for the search
+
+        :return:    Success or failure
+        """
+        tracker_field_ids = \
+            DatabaseInterface.tables().tracker_field_information.read_all_tracker_field_ids(
+                connection,
+                tracker_id,
+                TrackerFieldSelection.Active,
+                max_revision_id)
+
+        if tracker_field_ids is None:
+            return False
+
+        for tracker_field_id in fields.keys():
+            if tracker_field_id not in tracker_field_ids:
+                # Error, invalid field
+                return False
+
+        return True
+
+    @staticmethod
+    def __insert_artifact_information(connection: Connection,
+                                      artifact_id: int,
+                                      fields: dict,
+                                      locked: bool,
+                                      active: bool,
+                                      revision_id: int) -> bool:
+        """
+        Inserts artifact information and all of its field values in the specified revision
+
+        :param connection:  Database connection
+        :param artifact_id: ID of the artifact
+        :param fields:      Field values (key is the tracker field ID)
+        :param locked:      Lock state of the artifact (locked or unlocked)
+        :param active:      State of the artifact (active or inactive)
+        :param revision_id: Revision ID
+
+        :return:    Success or failure
+        """
+        artifact_information_id = DatabaseInterface.tables().artifact_information.insert_row(
+            connection,
+            artifact_id,
+            locked,
+            active,
+            revision_id)
+
+        if artifact_information_id is None:
+            return False
+
+        # Insert all field values at once
+        return DatabaseInterface.tables().artifact_field_value.insert_rows(connection,
+                                                                           artifact_information_id,
+                                                                           fields)
+
+    @staticmethod
+    def __parse_artifact(raw_artifact: dict) -> dict:
+        """
+        Parse raw artifact object and convert it to an artifact object
+
+        :param raw_artifact:    Artifact
+
+        :return:    Artifact object
+
+        Input (raw) dictionary contains items:
+
+        - artifact_id
+        - tracker_id
+        - created_on
+        - created_by
+        - artifact_information_id
+        - locked
+        - active
+        - revision_id
+        - fields
+
+        Returned dictionary contains items:
+
+        - id
+        - tracker_id
+        - created_on
+        - created_by
+        - locked
+        - active
+        - revision_id
+        - fields
+        """
+        return {"id": raw_artifact["artifact_id"],
+                "tracker_id": raw_artifact["tracker_id"],
+                "created_on": raw_artifact["created_on"],
+                "created_by": raw_artifact["created_by"],
+                "locked": raw_artifact["locked"],
+                "active": raw_artifact["active"],
+                "revision_id": raw_artifact["revision_id"],
+                "fields": raw_artifact["fields"]}
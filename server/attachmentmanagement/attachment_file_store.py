@@ -0,0 +1,152 @@
+"""
+Salamander ALM
+Copyright (c) 2016  Djuro Drljaca
+
+This Python module is free software; you can redistribute it and/or modify it under the terms of the
+GNU General Public License as published by the Free Software Foundation; either version 2 of the
+License, or (at your option) any later version.
+
+This Python module is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License along with this library. If
+not, see <http://www.gnu.org/licenses/>.
+"""
+
+import hashlib
+import os
+import re
+import tempfile
+from typing import BinaryIO, Optional
+
+
+class AttachmentFileStore(object):
+    """
+    Content-addressed store for the content of the attachments
+
+    Each content is stored in a file on the local disk which is named after the SHA-256 of the
+    content, so the same content is stored only once no matter how many attachments (or revisions
+    of an attachment) refer to it. Files are never modified after they are stored.
+
+    Layout of the directory:
+
+    - "objects/<first two characters of the hash>/<hash>": stored content
+    - "tmp/": content that is still being received
+    """
+
+    # Number of bytes that are read from the input stream at once
+    chunk_size = 64 * 1024
+
+    __content_hash_pattern = re.compile("^[0-9a-f]{64}$")
+
+    def __init__(self, directory: str):
+        """
+        Constructor
+
+        :param directory:   Directory for the stored content (created if it does not exist, a
+                            relative path is resolved against the current working directory)
+        """
+        directory = os.path.abspath(directory)
+        self.__objects_directory = os.path.join(directory, "objects")
+        self.__temporary_directory = os.path.join(directory, "tmp")
+
+        os.makedirs(self.__objects_directory, exist_ok=True)
+        os.makedirs(self.__temporary_directory, exist_ok=True)
+
+    def store(self, stream: BinaryIO, max_size: Optional[int] = None) -> Optional[dict]:
+        """
+        Stores the content that is read from the stream
+
+        :param stream:      Input stream (only its "read" method is used)
+        :param max_size:    Max size of the content in bytes ("None" for no limit)
+
+        :return:    Stored content ("None" if the content is larger than the max size)
+
+        Returned dictionary contains items:
+
+        - content_hash
+        - size
+
+        Content is read in chunks and written to a temporary file while its hash is computed, so
+        the whole content is never held in memory. The temporary file is then atomically renamed
+        to its content-addressed path (or simply deleted if the same content is already stored).
+        """
+        file_descriptor, temporary_path = tempfile.mkstemp(dir=self.__temporary_directory)
+        content_hash = hashlib.sha256()
+        size = 0
+        too_large = False
+
+        try:
+            with os.fdopen(file_descriptor, "wb") as file:
+                while True:
+                    chunk = stream.read(AttachmentFileStore.chunk_size)
+
+                    if not chunk:
+                        break
+
+                    size += len(chunk)
+
+                    if (max_size is not None) and (size > max_size):
+                        too_large = True
+                        break
+
+                    content_hash.update(chunk)
+                    file.write(chunk)
+
+                # Content must be on the disk before it is referenced from the database
+                if not too_large:
+                    file.flush()
+                    os.fsync(file.fileno())
+
+            if too_large:
+                # Error, content is too large
+                os.remove(temporary_path)
+                return None
+
+            content_hash = content_hash.hexdigest()
+            file_path = self.file_path(content_hash)
+
+            if os.path.exists(file_path):
+                os.remove(temporary_path)
+            else:
+                os.makedirs(os.path.dirname(file_path), exist_ok=True)
+                os.replace(temporary_path, file_path)
+        except:
+            if os.path.exists(temporary_path):
+                os.remove(temporary_path)
+
+            raise
+
+        return {"content_hash": content_hash,
+                "size": size}
+
+    def file_path(self, content_hash: str) -> Optional[str]:
+        """
+        Gets the path to the file with the specified content
+
+        :param content_hash:    SHA-256 of the content (hex encoded)
+
+        :return:    Path to the file ("None" if the content hash is not valid)
+
+        NOTE:   File does not necessarily exist!
+        """
+        if AttachmentFileStore.__content_hash_pattern.match(content_hash) is None:
+            return None
+
+        return os.path.join(self.__objects_directory, content_hash[:2], content_hash)
+
+    def exists(self, content_hash: str) -> bool:
+        """
+        Checks if the content is stored
+
+        :param content_hash:    SHA-256 of the content (hex encoded)
+
+        :return:    True if the content is stored
+        """
+        file_path = self.file_path(content_hash)
+
+        if file_path is None:
+            return False
+
+        return os.path.isfile(file_path)
@@ -0,0 +1,473 @@
+"""
+Salamander ALM
+Copyright (c) 2016  Djuro Drljaca
+
+This Python module is free software; you can redistribute it and/or modify it under the terms of the
+GNU General Public License as published by the Free Software Foundation; either version 2 of the
+License, or (at your option) any later version.
+
+This Python module is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License along with this library. If
+not, see <http://www.gnu.org/licenses/>.
+"""
+
+from attachmentmanagement.attachment_file_store import AttachmentFileStore
+from database.connection import Connection
+from database.database import DatabaseInterface
+import datetime
+from typing import BinaryIO, List, Optional
+
+
+class AttachmentManagementInterface(object):
+    """
+    Attachment management
+
+    Content of the attachments is stored outside of the database in a content-addressed file store,
+    only the metadata (file name, content hash and size) is stored in the database and revisioned.
+    Content is stored before the transaction is started so a slow upload does not block other
+    writers.
+
+    Dependencies:
+
+    - DatabaseInterface
+    - AttachmentFileStore
+    """
+
+    # Max size of the content of an attachment (in bytes)
+    max_file_size = 100 * 1024 * 1024
+
+    # Max length of the file name of an attachment
+    max_file_name_length = 255
+
+    __file_store = None     # AttachmentFileStore instance
+
+    def __init__(self):
+        """
+        Constructor is disabled!
+        """
+        raise RuntimeError()
+
+    @staticmethod
+    def load_file_store(file_store: AttachmentFileStore) -> None:
+        """
+        Load the file store for the content of the attachments
+
+        :param file_store:  File store
+        """
+        if not isinstance(file_store, AttachmentFileStore):
+            raise AttributeError()
+
+        AttachmentManagementInterface.__file_store = file_store
+
+    @staticmethod
+    def read_attachment_by_id(attachment_id: int, max_revision_id=None) -> Optional[dict]:
+        """
+        Reads the attachment (active or inactive) that matches the search parameters
+
+        :param attachment_id:   ID of the attachment
+        :param max_revision_id: Maximum revision ID for the search ("None" for latest revision)
+
+        :return:    Attachment information object
+
+        Returned dictionary contains items:
+
+        - id
+        - artifact_id
+        - created_on
+        - created_by
+        - file_name
+        - content_hash
+        - size
+        - active
+        - revision_id
+        """
+        connection = DatabaseInterface.create_connection()
+
+        if max_revision_id is None:
+            max_revision_id = DatabaseInterface.tables().revision.read_current_revision_id(
+                connection)
+
+        attachment = None
+
+        if max_revision_id is not None:
+            attachment = AttachmentManagementInterface.__read_attachment_by_id(connection,
+                                                                               attachment_id,
+                                                                               max_revision_id)
+
+        return attachment
+
+    @staticmethod
+    def read_attachments(artifact_id: int, max_revision_id=None) -> List[dict]:
+        """
+        Reads all active attachments of the artifact
+
+        :param artifact_id:     ID of the artifact
+        :param max_revision_id: Maximum revision ID for the search ("None" for latest revision)
+
+        :return:    Attachments ordered by their ID
+
+        Each dictionary in the returned list contains items:
+
+        - id
+        - file_name
+        - content_hash
+        - size
+        - revision_id
+        """
+        connection = DatabaseInterface.create_connection()
+
+        if max_revision_id is None:
+            max_revision_id = DatabaseInterface.tables().revision.read_current_revision_id(
+                connection)
+
+        attachments = list()
+
+        if max_revision_id is not None:
+            for information in DatabaseInterface.tables().attachment_information.read_attachments(
+                    connection,
+                    artifact_id,
+                    max_revision_id):
+                attachments.append({"id": information["attachment_id"],
+                                    "file_name": information["file_name"],
+                                    "content_hash": information["content_hash"],
+                                    "size": information["size"],
+                                    "revision_id": information["revision_id"]})
+
+        return attachments
+
+    @staticmethod
+    def read_content_file_path(content_hash: str) -> Optional[str]:
+        """
+        Reads the path to the file with the content of an attachment
+
+        :param content_hash:    SHA-256 of the content (hex encoded)
+
+        :return:    Path to the file ("None" if the content is not stored)
+
+        NOTE:   The file must only be read, it is shared by all attachments with the same content!
+        """
+        file_store = AttachmentManagementInterface.__file_store
+
+        if (file_store is None) or (not file_store.exists(content_hash)):
+            return None
+
+        return file_store.file_path(content_hash)
+
+    @staticmethod
+    def create_attachment(requested_by_user: int,
+                          artifact_id: int,
+                          file_name: str,
+                          stream: BinaryIO) -> Optional[int]:
+        """
+        Creates a new attachment of an active artifact
+
+        :param requested_by_user:   ID of the user that requested creation of the new attachment
+        :param artifact_id:         ID of the artifact
+        :param file_name:           File name of the attachment
+        :param stream:              Input stream with the content of the attachment
+
+        :return:    Attachment ID of the new attachment
+        """
+        if not AttachmentManagementInterface.__is_file_name_valid(file_name):
+            return None
+
+        content = AttachmentManagementInterface.__store_content(stream)
+
+        if content is None:
+            return None
+
+        attachment_id = None
+        connection = DatabaseInterface.create_connection()
+
+        try:
+            success = connection.begin_transaction(write=True)
+
+            # Start a new revision
+            revision_id = None
+            timestamp = datetime.datetime.utcnow()
+
+            if success:
+                revision_id = DatabaseInterface.tables().revision.insert_row(connection,
+                                                                             timestamp,
+                                                                             requested_by_user)
+
+                if revision_id is None:
+                    success = False
+
+            # Check if the artifact can be modified
+            if success:
+                success = AttachmentManagementInterface.__is_artifact_modifiable(connection,
+                                                                                 artifact_id,
+                                                                                 revision_id)
+
+            # Create the attachment
+            if success:
+                attachment_id = DatabaseInterface.tables().attachment.insert_row(
+                    connection,
+                    artifact_id,
+                    timestamp,
+                    requested_by_user)
+
+                if attachment_id is None:
+                    success = False
+
+            if success:
+                information_id = DatabaseInterface.tables().attachment_information.insert_row(
+                    connection,
+                    attachment_id,
+                    file_name,
+                    content["content_hash"],
+                    content["size"],
+                    True,
+                    revision_id)
+
+                if information_id is None:
+                    success = False
+
+            if success:
+                connection.commit_transaction()
+            else:
+                connection.rollback_transaction()
+                attachment_id = None
+        except:
+            connection.rollback_transaction()
+            raise
+
+        return attachment_id
+
+    @staticmethod
+    def update_attachment(requested_by_user: int,
+                          attachment_id: int,
+                          file_name: str,
+                          stream: Optional[BinaryIO] = None) -> bool:
+        """
+        Updates an active attachment (its file name and optionally its content)
+
+        :param requested_by_user:   ID of the user that requested modification of the attachment
+        :param attachment_id:       ID of the attachment
+        :param file_name:           New file name of the attachment
+        :param stream:              Input stream with the new content of the attachment ("None" to
+                                    keep the current content)
+
+        :return:    Success or failure
+
+        NOTE:   Previous content stays available in the previous revisions of the attachment!
+        """
+        if not AttachmentManagementInterface.__is_file_name_valid(file_name):
+            return False
+
+        content = None
+
+        if stream is not None:
+            content = AttachmentManagementInterface.__store_content(stream)
+
+            if content is None:
+                return False
+
+        return AttachmentManagementInterface.__update_attachment_information(requested_by_user,
+                                                                             attachment_id,
+                                                                             file_name,
+                                                                             content,
+                                                                             True)
+
+    @staticmethod
+    def delete_attachment(requested_by_user: int, attachment_id: int) -> bool:
+        """
+        Deletes (deactivates) an active attachment
+
+        :param requested_by_user:   ID of the user that requested deletion of the attachment
+        :param attachment_id:       ID of the attachment
+
+        :return:    Success or failure
+
+        NOTE:   Content is not deleted from the file store because it is still referenced by the
+                previous revisions of the attachment!
+        """
+        return AttachmentManagementInterface.__update_attachment_information(requested_by_user,
+                                                                             attachment_id,
+                                                                             None,
+                                                                             None,
+                                                                             False)
+
+    @staticmethod
+    def __update_attachment_information(requested_by_user: int,
+                                        attachment_id: int,
+                                        file_name: Optional[str],
+                                        content: Optional[dict],
+                                        active: bool) -> bool:
+        """
+        Adds new information to an active attachment
+
+        :param requested_by_user:   ID of the user that requested modification of the attachment
+        :param attachment_id:       ID of the attachment
+        :param file_name:           New file name ("None" to keep the current file name)
+        :param content:             New content ("None" to keep the current content)
+        :param active:              New state of the attachment (active or inactive)
+
+        :return:    Success or failure
+        """
+        connection = DatabaseInterface.create_connection()
+
+        try:
+            success = connection.begin_transaction(write=True)
+
+            # Start a new revision
+            revision_id = None
+
+            if success:
+                revision_id = DatabaseInterface.tables().revision.insert_row(
+                    connection,
+                    datetime.datetime.utcnow(),
+                    requested_by_user)
+
+                if revision_id is None:
+                    success = False
+
+            # Check if the attachment is active and if its artifact can be modified
+            attachment = None
+
+            if success:
+                attachment = AttachmentManagementInterface.__read_attachment_by_id(connection,
+                                                                                   attachment_id,
+                                                                                   revision_id)
+
+                if (attachment is None) or (not attachment["active"]):
+                    # Error, invalid attachment
+                    success = False
+
+            if success:
+                success = AttachmentManagementInterface.__is_artifact_modifiable(
+                    connection,
+                    attachment["artifact_id"],
+                    revision_id)
+
+            # Add the new attachment information
+            if success:
+                if file_name is None:
+                    file_name = attachment["file_name"]
+
+                if content is None:
+                    content = attachment
+
+                information_id = DatabaseInterface.tables().attachment_information.insert_row(
+                    connection,
+                    attachment_id,
+                    file_name,
+                    content["content_hash"],
+                    content["size"],
+                    active,
+                    revision_id)
+
+                if information_id is None:
+                    success = False
+
+            if success:
+                connection.commit_transaction()
+            else:
+                connection.rollback_transaction()
+        except:
+            connection.rollback_transaction()
+            raise
+
+        return success
+
+    @staticmethod
+    def __read_attachment_by_id(connection: Connection,
+                                attachment_id: int,
+                                max_revision_id: int) -> Optional[dict]:
+        """
+        Reads the attachment (active or inactive) that matches the search parameters
+
+        :param connection:      Database connection
+        :param attachment_id:   ID of the attachment
+        :param max_revision_id: Maximum revision ID for the search
+
+        :return:    Attachment information object (see "read_attachment_by_id")
+        """
+        attachment = DatabaseInterface.tables().attachment.read_attachment(connection,
+                                                                           attachment_id)
+
+        if attachment is None:
+            return None
+
+        information = DatabaseInterface.tables().attachment_information.read_information(
+            connection,
+            attachment_id,
+            max_revision_id)
+
+        if information is None:
+            return None
+
+        return {"id": attachment["id"],
+                "artifact_id": attachment["artifact_id"],
+                "created_on": attachment["created_on"],
+                "created_by": attachment["created_by"],
+                "file_name": information["file_name"],
+                "content_hash": information["content_hash"],
+                "size": information["size"],
+                "active": information["active"],
+                "revision_id": information["revision_id"]}
+
+    @staticmethod
+    def __is_artifact_modifiable(connection: Connection,
+                                 artifact_id: int,
+                                 revision_id: int) -> bool:
+        """
+        Checks if the attachments of the artifact can be modified (artifact is active and unlocked)
+
+        :param connection:  Database connection
+        :param artifact_id: ID of the artifact
+        :param revision_id: Revision ID
+
+        :return:    True if the attachments can be modified
+        """
+        artifact = DatabaseInterface.tables().artifact_information.read_information(connection,
+                                                                                   artifact_id,
+                                                                                   revision_id)
+
+        if artifact is None:
+            # Error, artifact was not found
+            return False
+
+        return artifact["active"] and (not artifact["locked"])
+
+    @staticmethod
+    def __is_file_name_valid(file_name: str) -> bool:
+        """
+        Checks if the file name is valid
+
+        :param file_name:   File name
+
+        :return:    True if the file name is valid
+        """
+        if ((len(file_name) == 0) or
+                (len(file_name) > AttachmentManagementInterface.max_file_name_length)):
+            return False
+
+        # File name must not contain a path
+        return ("/" not in file_name) and ("\\" not in file_name)
+
+    @staticmethod
+    def __store_content(stream: BinaryIO) -> Optional[dict]:
+        """
+        Stores the content in the file store
+
+        :param stream:  Input stream with the content
+
+        :return:    Stored content ("None" if the file store is not loaded or if the content is too
+                    large)
+
+        Returned dictionary contains items:
+
+        - content_hash
+        - size
+        """
+        file_store = AttachmentManagementInterface.__file_store
+
+        if file_store is None:
+            return None
+
+        return file_store.store(stream, AttachmentManagementInterface.max_file_size)
@@ -14,6 +14,8 @@ You should have received a copy of the GNU Lesser General Public License along w
 not, see <http://www.gnu.org/licenses/>.
 """
 
+from metrics.request_statistics import RequestStatistics
+import time
 from typing import Optional
 
 
@@ -95,8 +97,10 @@ class AuthenticationInterface(object):
             authentication_type)
 
         if authentication_method is not None:
+            start = time.perf_counter()
             success = authentication_method.authenticate(input_authentication_parameters,
                                                          reference_authentication_parameters)
+            RequestStatistics.add_timing("authentication", time.perf_counter() - start)
 
         return success
 
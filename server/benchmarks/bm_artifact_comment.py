@@ -0,0 +1,191 @@
+"""
+Salamander ALM
+Copyright (c) 2016  Djuro Drljaca
+
+This Python module is free software; you can redistribute it and/or modify it under the terms of the
+GNU General Public License as published by the Free Software Foundation; either version 2 of the
+License, or (at your option) any later version.
+
+This Python module is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License along with this library. If
+not, see <http://www.gnu.org/licenses/>.
+
+Benchmark for artifact comment threads (pages of the current version of the comments)
+
+Usage (from the "server" directory):
+
+    python -m benchmarks.bm_artifact_comment [--comments 100000] [--versions 5] [--repeat 20]
+"""
+
+from artifactmanagement.artifact_comment_management import ArtifactCommentManagementInterface
+from artifactmanagement.artifact_management import ArtifactManagementInterface
+from authentication.authentication import AuthenticationInterface
+from authentication.basic_authentication_method import AuthenticationMethodBasic
+from database.database import DatabaseInterface
+from database.datatypes import datetime_to_string
+from plugins.database.sqlite.connection import ConnectionSqlite
+from plugins.database.sqlite.database import DatabaseSqlite
+from projectmanagement.project_management import ProjectManagementInterface
+from trackermanagement.tracker_management import TrackerManagementInterface
+import argparse
+import datetime
+import os
+import statistics
+import tempfile
+import time
+from typing import Callable
+
+
+def populate_database(artifact_id: int, comment_count: int, version_count: int) -> None:
+    """
+    Populates the database with comments of the artifact, each comment is edited multiple times
+    and every tenth comment is deleted
+
+    :param artifact_id:     ID of the artifact
+    :param comment_count:   Number of comments
+    :param version_count:   Number of versions of each comment
+    """
+    connection = DatabaseInterface.create_connection()
+    native_connection = connection.native_connection
+    timestamp = datetime_to_string(datetime.datetime.utcnow())
+    chunk_size = 10000
+
+    connection.begin_transaction()
+
+    first_comment_id = native_connection.execute(
+        "SELECT IFNULL(MAX(id), 0) + 1 FROM artifact_comment").fetchone()[0]
+
+    native_connection.executemany(
+        "INSERT INTO artifact_comment (id, artifact_id, created_on, created_by)\n"
+        "VALUES (?, ?, ?, 1)",
+        ((first_comment_id + i, artifact_id, timestamp) for i in range(comment_count)))
+
+    # Each version of the comments is created in its own revision (versions of the comments are
+    # interleaved in the table just like they would be in a real database)
+    for version in range(version_count):
+        revision_id = native_connection.execute(
+            "INSERT INTO revision (id, timestamp, user_id) VALUES (NULL, :timestamp, 1)",
+            {"timestamp": timestamp}).lastrowid
+
+        for chunk_start in range(0, comment_count, chunk_size):
+            indexes = range(chunk_start, min(chunk_start + chunk_size, comment_count))
+
+            native_connection.executemany(
+                "INSERT INTO artifact_comment_information\n"
+                "   (id, artifact_comment_id, text, active, revision_id)\n"
+                "VALUES (NULL, ?, ?, ?, ?)",
+                ((first_comment_id + i,
+                  "Comment {0}, version {1}: {2}".format(i, version, "lorem ipsum " * 20),
+                  0 if ((version == (version_count - 1)) and (i % 10 == 0)) else 1,
+                  revision_id) for i in indexes))
+
+    connection.commit_transaction()
+    native_connection.execute("ANALYZE")
+
+
+def measure(function: Callable[[], None], repeat: int) -> dict:
+    """
+    Measures the execution time of the function
+
+    :param function:    Function to measure
+    :param repeat:      Number of repetitions
+
+    :return:    Median and maximum execution time in milliseconds
+    """
+    durations = list()
+
+    for i in range(repeat):
+        start = time.perf_counter()
+        function()
+        durations.append((time.perf_counter() - start) * 1000.0)
+
+    return {"median": statistics.median(durations), "max": max(durations)}
+
+
+if __name__ == '__main__':
+    # Description is the part of the module docstring that follows the license header
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n", 4)[4],
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--comments", type=int, default=100000, help="Number of comments")
+    parser.add_argument("--versions", type=int, default=5, help="Number of versions per comment")
+    parser.add_argument("--page-size", type=int, default=20, help="Number of comments per page")
+    parser.add_argument("--repeat", type=int, default=20, help="Number of repetitions")
+    arguments = parser.parse_args()
+
+    # Authentication is needed for creating the default administrator
+    AuthenticationInterface.remove_all_authentication_methods()
+    AuthenticationInterface.add_authentication_method(AuthenticationMethodBasic())
+
+    # Populating the database is expected to exceed the slow query threshold
+    ConnectionSqlite.set_slow_query_threshold(None)
+
+    database_file_path = os.path.join(tempfile.mkdtemp(), "benchmark.db")
+
+    DatabaseInterface.load_database_plugin(DatabaseSqlite(database_file_path))
+    DatabaseInterface.create_new_database()
+
+    admin_user_id = 1
+    project_id = ProjectManagementInterface.create_project(admin_user_id,
+                                                           "benchmark",
+                                                           "Benchmark",
+                                                           "Comment benchmark")
+    tracker_id = TrackerManagementInterface.create_tracker(admin_user_id,
+                                                           project_id,
+                                                           "benchmark",
+                                                           "Benchmark",
+                                                           "Comment benchmark")
+    artifact_id = ArtifactManagementInterface.create_artifact(admin_user_id, tracker_id, dict())
+
+    start_time = time.perf_counter()
+    populate_database(artifact_id, arguments.comments, arguments.versions)
+    populate_duration = time.perf_counter() - start_time
+
+    plan = DatabaseInterface.create_connection().native_connection.execute(
+        "EXPLAIN QUERY PLAN\n"
+        "SELECT artifact_comment_information_id FROM artifact_comment_current\n"
+        "WHERE ((artifact_id = 1) AND (artifact_comment_id < 1000))\n"
+        "ORDER BY artifact_comment_id DESC LIMIT 20").fetchall()
+
+    print("Comments: {0} with {1} versions each (created in {2:.1f} s), page size: {3}".format(
+        arguments.comments,
+        arguments.versions,
+        populate_duration,
+        arguments.page_size))
+    print("    Query plan: {0}".format(plan[0][-1]))
+
+    # Find the start of the last page
+    last_page_before_comment_id = None
+    comment_count = ArtifactCommentManagementInterface.read_comment_count(artifact_id)
+    page = ArtifactCommentManagementInterface.read_comments(artifact_id,
+                                                            None,
+                                                            comment_count - arguments.page_size)
+
+    if len(page) > 0:
+        last_page_before_comment_id = page[-1]["id"]
+
+    results = [
+        ("Comment count", lambda: ArtifactCommentManagementInterface.read_comment_count(
+            artifact_id)),
+        ("First page", lambda: ArtifactCommentManagementInterface.read_comments(
+            artifact_id,
+            None,
+            arguments.page_size)),
+        ("Last page", lambda: ArtifactCommentManagementInterface.read_comments(
+            artifact_id,
+            last_page_before_comment_id,
+            arguments.page_size)),
+        ("Artifact", lambda: ArtifactManagementInterface.read_artifact_by_id(artifact_id)),
+        ("Comment history", lambda: ArtifactCommentManagementInterface.read_comment_history(
+            arguments.comments // 2))]
+
+    for name, function in results:
+        result = measure(function, arguments.repeat)
+
+        print("    {0:<30} median: {1:8.3f} ms    max: {2:8.3f} ms".format(name,
+                                                                         result["median"],
+                                                                         result["max"]))
+
+    os.remove(database_file_path)
@@ -0,0 +1,177 @@
+"""
+Salamander ALM
+Copyright (c) 2016  Djuro Drljaca
+
+This Python module is free software; you can redistribute it and/or modify it under the terms of the
+GNU General Public License as published by the Free Software Foundation; either version 2 of the
+License, or (at your option) any later version.
+
+This Python module is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License along with this library. If
+not, see <http://www.gnu.org/licenses/>.
+
+Benchmark for reading the latest artifact information from artifacts with a long history
+
+Usage (from the "server" directory):
+
+    python -m benchmarks.bm_artifact_information [--revisions 1000 10000 100000] [--repeat 200]
+"""
+
+from authentication.authentication import AuthenticationInterface
+from authentication.basic_authentication_method import AuthenticationMethodBasic
+from database.database import DatabaseInterface
+from database.datatypes import datetime_to_string
+from plugins.database.sqlite.database import DatabaseSqlite
+import argparse
+import datetime
+import os
+import statistics
+import tempfile
+import time
+from typing import Callable, List
+
+
+def populate_database(revisions_per_artifact: int, artifact_count: int) -> List[int]:
+    """
+    Populates the database with artifacts where each artifact has the specified number of revisions
+
+    :param revisions_per_artifact:  Number of revisions of each artifact
+    :param artifact_count:          Number of artifacts
+
+    :return:    List of artifact IDs
+    """
+    connection = DatabaseInterface.create_connection()
+    native_connection = connection.native_connection
+    timestamp = datetime_to_string(datetime.datetime.utcnow())
+
+    connection.begin_transaction()
+
+    native_connection.execute("INSERT INTO project (id) VALUES (NULL)")
+    native_connection.execute("INSERT INTO tracker (id, project_id) VALUES (NULL, 1)")
+
+    artifact_ids = list()
+
+    for i in range(artifact_count):
+        cursor = native_connection.execute(
+            "INSERT INTO artifact (id, tracker_id, created_on, created_by)\n"
+            "VALUES (NULL, 1, :timestamp, 1)",
+            {"timestamp": timestamp})
+        artifact_ids.append(cursor.lastrowid)
+
+    # Revisions of the artifacts are interleaved (as they would be in a real database)
+    for i in range(revisions_per_artifact):
+        cursor = native_connection.execute(
+            "INSERT INTO revision (id, timestamp, user_id) VALUES (NULL, :timestamp, 1)",
+            {"timestamp": timestamp})
+        revision_id = cursor.lastrowid
+
+        native_connection.executemany(
+            "INSERT INTO artifact_information (id, artifact_id, locked, active, revision_id)\n"
+            "VALUES (NULL, :artifact_id, 0, :active, :revision_id)",
+            [{"artifact_id": artifact_id,
+              "active": (i % 2),
+              "revision_id": revision_id} for artifact_id in artifact_ids])
+
+    connection.commit_transaction()
+    return artifact_ids
+
+
+def measure(function: Callable[[], None], repeat: int) -> dict:
+    """
+    Measures the execution time of the function
+
+    :param function:    Function to measure
+    :param repeat:      Number of repetitions
+
+    :return:    Median and maximum execution time in milliseconds
+    """
+    durations = list()
+
+    for i in range(repeat):
+        start = time.perf_counter()
+        function()
+        durations.append((time.perf_counter() - start) * 1000.0)
+
+    return {"median": statistics.median(durations), "max": max(durations)}
+
+
+def run_benchmark(revisions_per_artifact: int, artifact_count: int, repeat: int) -> None:
+    """
+    Runs the benchmark for the specified number of revisions per artifact
+
+    :param revisions_per_artifact:  Number of revisions of each artifact
+    :param artifact_count:          Number of artifacts
+    :param repeat:                  Number of repetitions of each measurement
+    """
+    database_file_path = os.path.join(tempfile.mkdtemp(), "benchmark.db")
+
+    DatabaseInterface.load_database_plugin(DatabaseSqlite(database_file_path))
+    DatabaseInterface.create_new_database()
+
+    artifact_ids = populate_database(revisions_per_artifact, artifact_count)
+
+    connection = DatabaseInterface.create_connection()
+    table = DatabaseInterface.tables().artifact_information
+    max_revision_id = DatabaseInterface.tables().revision.read_current_revision_id(connection)
+    middle_revision_id = max_revision_id // 2
+
+    # Check that the latest revision is returned
+    information = table.read_information(connection, artifact_ids[0], max_revision_id)
+
+    if information["revision_id"] != max_revision_id:
+        raise RuntimeError("Latest artifact information was not returned")
+
+    plan = connection.native_connection.execute(
+        "EXPLAIN QUERY PLAN\n"
+        "SELECT id FROM artifact_information\n"
+        "WHERE ((artifact_id = 1) AND (revision_id <= 1))\n"
+        "ORDER BY revision_id DESC LIMIT 1").fetchall()
+
+    results = [
+        ("read_information (latest)",
+         measure(lambda: table.read_information(connection, artifact_ids[0], max_revision_id),
+                 repeat)),
+        ("read_information (middle)",
+         measure(lambda: table.read_information(connection, artifact_ids[0], middle_revision_id),
+                 repeat)),
+        ("read_artifact (latest)",
+         measure(lambda: table.read_artifact(connection, artifact_ids[0], max_revision_id),
+                 repeat)),
+        ("read_information_by_artifact_ids ({0})".format(len(artifact_ids)),
+         measure(lambda: table.read_information_by_artifact_ids(connection,
+                                                                artifact_ids,
+                                                                max_revision_id),
+                 max(1, repeat // 10)))
+    ]
+
+    print("Revisions per artifact: {0}, artifacts: {1}".format(revisions_per_artifact,
+                                                              artifact_count))
+    print("    Query plan: {0}".format(plan[0][-1]))
+
+    for name, result in results:
+        print("    {0:<45} median: {1:8.3f} ms    max: {2:8.3f} ms".format(name,
+                                                                          result["median"],
+                                                                          result["max"]))
+
+    os.remove(database_file_path)
+
+
+if __name__ == '__main__':
+    # Description is the part of the module docstring that follows the license header
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n", 4)[4],
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--revisions", type=int, nargs="+", default=[1000, 10000, 100000],
+                        help="Number of revisions per artifact")
+    parser.add_argument("--artifacts", type=int, default=10, help="Number of artifacts")
+    parser.add_argument("--repeat", type=int, default=200, help="Number of repetitions")
+    arguments = parser.parse_args()
+
+    # Authentication is needed for creating the default administrator
+    AuthenticationInterface.remove_all_authentication_methods()
+    AuthenticationInterface.add_authentication_method(AuthenticationMethodBasic())
+
+    for revisions in arguments.revisions:
+        run_benchmark(revisions, arguments.artifacts, arguments.repeat)
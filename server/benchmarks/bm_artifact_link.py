@@ -0,0 +1,256 @@
+"""
+Salamander ALM
+Copyright (c) 2016  Djuro Drljaca
+
+This Python module is free software; you can redistribute it and/or modify it under the terms of the
+GNU General Public License as published by the Free Software Foundation; either version 2 of the
+License, or (at your option) any later version.
+
+This Python module is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License along with this library. If
+not, see <http://www.gnu.org/licenses/>.
+
+Benchmark for traceability queries on a graph of linked artifacts
+
+The graph has three levels (requirements, specifications and test cases in the ratio 1:3:6), each
+specification is linked from one or two requirements and each test case from one or two
+specifications.
+
+Usage (from the "server" directory):
+
+    python -m benchmarks.bm_artifact_link [--artifacts 100000] [--repeat 100]
+"""
+
+from artifactmanagement.artifact_link_management import ArtifactLinkManagementInterface
+from authentication.authentication import AuthenticationInterface
+from authentication.basic_authentication_method import AuthenticationMethodBasic
+from database.database import DatabaseInterface
+from database.datatypes import datetime_to_string
+from database.tables.artifact_link import LinkDirection
+from plugins.database.sqlite.connection import ConnectionSqlite
+from plugins.database.sqlite.database import DatabaseSqlite
+import argparse
+import datetime
+import itertools
+import os
+import random
+import statistics
+import tempfile
+import time
+from typing import Callable, List
+
+
+def populate_database(artifact_count: int) -> List[List[int]]:
+    """
+    Populates the database with three trackers of linked artifacts
+
+    :param artifact_count:  Total number of artifacts
+
+    :return:    Artifact IDs of each level (requirements, specifications and test cases)
+    """
+    connection = DatabaseInterface.create_connection()
+    native_connection = connection.native_connection
+    timestamp = datetime_to_string(datetime.datetime.utcnow())
+    random_generator = random.Random(0)
+
+    connection.begin_transaction()
+
+    native_connection.execute("INSERT INTO project (id) VALUES (NULL)")
+
+    revision_id = native_connection.execute(
+        "INSERT INTO revision (id, timestamp, user_id) VALUES (NULL, :timestamp, 1)",
+        {"timestamp": timestamp}).lastrowid
+
+    levels = list()
+
+    for tracker_index, level_size in enumerate([artifact_count // 10,
+                                                (artifact_count * 3) // 10,
+                                                (artifact_count * 6) // 10]):
+        tracker_id = native_connection.execute(
+            "INSERT INTO tracker (id, project_id) VALUES (NULL, 1)").lastrowid
+
+        artifact_ids = list()
+
+        for i in range(level_size):
+            artifact_id = native_connection.execute(
+                "INSERT INTO artifact (id, tracker_id, created_on, created_by)\n"
+                "VALUES (NULL, :tracker_id, :timestamp, 1)",
+                {"tracker_id": tracker_id, "timestamp": timestamp}).lastrowid
+            artifact_ids.append(artifact_id)
+
+        native_connection.executemany(
+            "INSERT INTO artifact_information (id, artifact_id, locked, active, revision_id)\n"
+            "VALUES (NULL, :artifact_id, 0, 1, :revision_id)",
+            ({"artifact_id": x, "revision_id": revision_id} for x in artifact_ids))
+
+        levels.append(artifact_ids)
+
+    # Each artifact of the lower level is linked from one or two artifacts of the upper level
+    for upper_level, lower_level in [(levels[0], levels[1]), (levels[1], levels[2])]:
+        for artifact_id in lower_level:
+            for source_artifact_id in random_generator.sample(upper_level,
+                                                              random_generator.randint(1, 2)):
+                link_id = native_connection.execute(
+                    "INSERT INTO artifact_link (id, source_artifact_id, target_artifact_id)\n"
+                    "VALUES (NULL, :source_artifact_id, :target_artifact_id)",
+                    {"source_artifact_id": source_artifact_id,
+                     "target_artifact_id": artifact_id}).lastrowid
+
+                native_connection.execute(
+                    "INSERT INTO artifact_link_information\n"
+                    "   (id, artifact_link_id, active, revision_id)\n"
+                    "VALUES (NULL, :link_id, 1, :revision_id)",
+                    {"link_id": link_id, "revision_id": revision_id})
+
+    connection.commit_transaction()
+    native_connection.execute("ANALYZE")
+
+    return levels
+
+
+def read_downstream_link_by_link(artifact_id: int) -> List[int]:
+    """
+    Reads IDs of all downstream artifacts by following the links one by one (for comparison)
+
+    :param artifact_id: ID of the artifact
+
+    :return:    List of artifact IDs
+    """
+    reachable = set()
+    pending = [artifact_id]
+
+    while len(pending) > 0:
+        for link in ArtifactLinkManagementInterface.read_links(pending.pop()):
+            if link["target_artifact_id"] not in reachable:
+                reachable.add(link["target_artifact_id"])
+                pending.append(link["target_artifact_id"])
+
+    return sorted(reachable)
+
+
+def measure(function: Callable[[], None], repeat: int) -> dict:
+    """
+    Measures the execution time of the function
+
+    :param function:    Function to measure
+    :param repeat:      Number of repetitions
+
+    :return:    Median and maximum execution time in milliseconds
+    """
+    durations = list()
+
+    for i in range(repeat):
+        start = time.perf_counter()
+        function()
+        durations.append((time.perf_counter() - start) * 1000.0)
+
+    return {"median": statistics.median(durations), "max": max(durations)}
+
+
+if __name__ == '__main__':
+    # Description is the part of the module docstring that follows the license header
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n", 4)[4],
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--artifacts", type=int, default=100000, help="Number of artifacts")
+    parser.add_argument("--repeat", type=int, default=100, help="Number of repetitions")
+    arguments = parser.parse_args()
+
+    # Authentication is needed for creating the default administrator
+    AuthenticationInterface.remove_all_authentication_methods()
+    AuthenticationInterface.add_authentication_method(AuthenticationMethodBasic())
+
+    # Coverage matrix is expected to exceed the slow query threshold
+    ConnectionSqlite.set_slow_query_threshold(None)
+
+    database_file_path = os.path.join(tempfile.mkdtemp(), "benchmark.db")
+
+    DatabaseInterface.load_database_plugin(DatabaseSqlite(database_file_path))
+    DatabaseInterface.create_new_database()
+
+    start_time = time.perf_counter()
+    requirements, specifications, test_cases = populate_database(arguments.artifacts)
+    populate_duration = time.perf_counter() - start_time
+
+    connection = DatabaseInterface.create_connection()
+    link_count = connection.native_connection.execute(
+        "SELECT COUNT(*) FROM artifact_link").fetchone()[0]
+    closure_count = connection.native_connection.execute(
+        "SELECT COUNT(*) FROM artifact_link_closure").fetchone()[0]
+
+    print("Artifacts: {0}, links: {1}, closure rows: {2} (created in {3:.1f} s)".format(
+        arguments.artifacts, link_count, closure_count, populate_duration))
+
+    # Each measurement cycles through a sample of the artifacts (up to 100 of them)
+    sample_generator = random.Random(1)
+
+    def sample(artifact_ids: List[int]) -> List[int]:
+        return sample_generator.sample(artifact_ids, min(100, len(artifact_ids)))
+
+    sampled_requirements = itertools.cycle(sample(requirements))
+    sampled_test_cases = itertools.cycle(sample(test_cases))
+    requirement_tracker_id, test_tracker_id = [
+        connection.native_connection.execute("SELECT tracker_id FROM artifact WHERE (id = :id)",
+                                             {"id": x}).fetchone()[0]
+        for x in [requirements[0], test_cases[0]]]
+
+    # Path from a requirement to one of its test cases
+    paths = list()
+
+    for requirement_id in sample(requirements):
+        traced_test_cases = ArtifactLinkManagementInterface.read_traced_artifact_ids(
+            requirement_id,
+            LinkDirection.Downstream,
+            test_tracker_id)
+
+        if len(traced_test_cases) > 0:
+            paths.append((requirement_id, traced_test_cases[-1]))
+
+    sampled_paths = itertools.cycle(paths)
+
+    # Links that are created and deleted again (each one changes the closure of many artifacts)
+    sampled_links = itertools.cycle([(x, y) for x, y in zip(sample(requirements),
+                                                             sample(test_cases))])
+
+    def create_and_delete_link():
+        source_artifact_id, target_artifact_id = next(sampled_links)
+        link_id = ArtifactLinkManagementInterface.create_link(1,
+                                                              source_artifact_id,
+                                                              target_artifact_id)
+
+        if link_id is not None:
+            ArtifactLinkManagementInterface.delete_link(1, link_id)
+
+    results = [
+        ("downstream (closure)",
+         measure(lambda: ArtifactLinkManagementInterface.read_traced_artifact_ids(
+             next(sampled_requirements)), arguments.repeat)),
+        ("downstream (link by link)",
+         measure(lambda: read_downstream_link_by_link(next(sampled_requirements)),
+                 arguments.repeat)),
+        ("downstream test cases (closure)",
+         measure(lambda: ArtifactLinkManagementInterface.read_traced_artifact_ids(
+             next(sampled_requirements), LinkDirection.Downstream, test_tracker_id),
+             arguments.repeat)),
+        ("upstream (closure)",
+         measure(lambda: ArtifactLinkManagementInterface.read_traced_artifact_ids(
+             next(sampled_test_cases), LinkDirection.Upstream), arguments.repeat)),
+        ("path",
+         measure(lambda: ArtifactLinkManagementInterface.read_path(*next(sampled_paths)),
+                 arguments.repeat)),
+        ("create and delete link",
+         measure(create_and_delete_link, arguments.repeat)),
+        ("coverage matrix ({0} x {1})".format(len(requirements), len(test_cases)),
+         measure(lambda: ArtifactLinkManagementInterface.read_coverage_matrix(
+             requirement_tracker_id,
+             test_tracker_id), max(1, arguments.repeat // 20)))
+    ]
+
+    for name, result in results:
+        print("    {0:<45} median: {1:9.3f} ms    max: {2:9.3f} ms".format(name,
+                                                                          result["median"],
+                                                                          result["max"]))
+
+    os.remove(database_file_path)
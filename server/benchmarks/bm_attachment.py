@@ -0,0 +1,210 @@
+"""
+Salamander ALM
+Copyright (c) 2016  Djuro Drljaca
+
+This Python module is free software; you can redistribute it and/or modify it under the terms of the
+GNU General Public License as published by the Free Software Foundation; either version 2 of the
+License, or (at your option) any later version.
+
+This Python module is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License along with this library. If
+not, see <http://www.gnu.org/licenses/>.
+
+Benchmark for uploading and downloading attachments through the REST API
+
+Content is generated and consumed in chunks, so the peak memory usage shows how much of the file is
+held in memory by the server.
+
+Usage (from the "server" directory):
+
+    python -m benchmarks.bm_attachment [--size 200] [--uploads 3]
+"""
+
+from artifactmanagement.artifact_management import ArtifactManagementInterface
+from attachmentmanagement.attachment_file_store import AttachmentFileStore
+from attachmentmanagement.attachment_management import AttachmentManagementInterface
+from authentication.authentication import AuthenticationInterface
+from authentication.basic_authentication_method import AuthenticationMethodBasic
+from database.database import DatabaseInterface
+from plugins.database.sqlite.database import DatabaseSqlite
+from projectmanagement.project_management import ProjectManagementInterface
+import argparse
+import os
+import rest_api
+import shutil
+import tempfile
+import time
+from trackermanagement.tracker_management import TrackerManagementInterface
+import tracemalloc
+from typing import Callable
+
+
+class GeneratedContent(object):
+    """
+    Seekable input stream with generated content of the specified size (generated chunk by chunk)
+    """
+
+    def __init__(self, size: int, seed: int):
+        """
+        Constructor
+
+        :param size:    Size of the content in bytes
+        :param seed:    Seed (same seed generates the same content)
+        """
+        self.__size = size
+        self.__position = 0
+        self.__block = (seed.to_bytes(8, "little") * 8192)
+
+    def read(self, size=-1) -> bytes:
+        """
+        Reads the next chunk of the content
+
+        :param size:    Max size of the chunk
+
+        :return:    Chunk of the content (empty at the end of the content)
+        """
+        if (size < 0) or (size > len(self.__block)):
+            size = len(self.__block)
+
+        size = min(size, self.__size - self.__position)
+        self.__position += size
+
+        return self.__block[:size]
+
+    def seek(self, offset: int, whence=os.SEEK_SET) -> int:
+        """
+        Changes the position in the stream
+
+        :param offset:  Offset
+        :param whence:  Offset is relative to the start, current position or end of the stream
+
+        :return:    New position
+        """
+        if whence == os.SEEK_CUR:
+            offset += self.__position
+        elif whence == os.SEEK_END:
+            offset += self.__size
+
+        self.__position = max(0, min(offset, self.__size))
+        return self.__position
+
+    def tell(self) -> int:
+        """
+        Gets the position in the stream
+
+        :return:    Position
+        """
+        return self.__position
+
+
+def measure(function: Callable[[], int]) -> dict:
+    """
+    Measures the execution time and the peak memory usage of the function
+
+    :param function:    Function to measure (returns the number of transferred bytes)
+
+    :return:    Duration in seconds, throughput in MiB/s and peak memory usage in MiB
+    """
+    tracemalloc.start()
+    start = time.perf_counter()
+    byte_count = function()
+    duration = time.perf_counter() - start
+    peak_memory = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    return {"duration": duration,
+            "throughput": byte_count / (1024.0 * 1024.0) / duration,
+            "peak_memory": peak_memory / (1024.0 * 1024.0)}
+
+
+if __name__ == '__main__':
+    # Description is the part of the module docstring that follows the license header
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n", 4)[4],
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size", type=int, default=200, help="Size of each file in MiB")
+    parser.add_argument("--uploads", type=int, default=3,
+                        help="Number of uploads (all but the first one have the same content)")
+    arguments = parser.parse_args()
+
+    file_size = arguments.size * 1024 * 1024
+
+    # Authentication is needed for creating the default administrator
+    AuthenticationInterface.remove_all_authentication_methods()
+    AuthenticationInterface.add_authentication_method(AuthenticationMethodBasic())
+
+    directory = tempfile.mkdtemp()
+
+    DatabaseInterface.load_database_plugin(DatabaseSqlite(os.path.join(directory, "benchmark.db")))
+    DatabaseInterface.create_new_database()
+
+    AttachmentManagementInterface.max_file_size = file_size
+    AttachmentManagementInterface.load_file_store(
+        AttachmentFileStore(os.path.join(directory, "attachments")))
+
+    project_id = ProjectManagementInterface.create_project(1, "test", "Test", "")
+    tracker_id = TrackerManagementInterface.create_tracker(1, project_id, "test", "Test", "")
+    artifact_id = ArtifactManagementInterface.create_artifact(1, tracker_id, dict())
+
+    client = rest_api.app.test_client()
+    token = client.post("/api/usermanagement/login",
+                        json={"user_name": "administrator",
+                              "authentication_parameters": {
+                                  "password": "administrator"}}).get_json()["session_token"]
+    headers = {"SALM-Session-Token": token}
+    attachment_ids = list()
+
+    def upload(seed: int) -> int:
+        response = client.post("/api/attachmentmanagement/attachment",
+                               query_string={"artifact_id": artifact_id,
+                                             "file_name": "file{0}.bin".format(seed)},
+                               input_stream=GeneratedContent(file_size, seed),
+                               headers=headers)
+        attachment_ids.append(response.get_json()["attachment_id"])
+        return file_size
+
+    def download(range_header=None) -> int:
+        request_headers = dict(headers)
+
+        if range_header is not None:
+            request_headers["Range"] = range_header
+
+        response = client.get("/api/attachmentmanagement/attachment_content",
+                              query_string={"attachment_id": attachment_ids[0]},
+                              headers=request_headers,
+                              buffered=False)
+        byte_count = 0
+
+        for chunk in response.response:
+            byte_count += len(chunk)
+
+        response.close()
+        return byte_count
+
+    results = [("upload", measure(lambda: upload(1)))]
+
+    for i in range(1, arguments.uploads):
+        results.append(("upload (deduplicated)", measure(lambda: upload(1))))
+
+    results += [
+        ("download", measure(download)),
+        ("download (second half, Range)",
+         measure(lambda: download("bytes={0}-".format(file_size // 2))))
+    ]
+
+    object_count = sum(len(files) for path, directories, files in
+                       os.walk(os.path.join(directory, "attachments", "objects")))
+    print("Files: {0} x {1} MiB, stored objects: {2}".format(arguments.uploads,
+                                                             arguments.size,
+                                                             object_count))
+
+    for name, result in results:
+        print("    {0:<35} {1:8.3f} s    {2:9.1f} MiB/s    peak memory: {3:8.2f} MiB".format(
+            name,
+            result["duration"],
+            result["throughput"],
+            result["peak_memory"]))
+
+    shutil.rmtree(directory)
@@ -0,0 +1,748 @@
+"""
+Salamander ALM
+Copyright (c) 2016  Djuro Drljaca
+
+This Python module is free software; you can redistribute it and/or modify it under the terms of the
+GNU General Public License as published by the Free Software Foundation; either version 2 of the
+License, or (at your option) any later version.
+
+This Python module is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License along with this library. If
+not, see <http://www.gnu.org/licenses/>.
+
+Benchmark suite for the user, project, tracker and tracker field management interfaces
+
+A synthetic dataset is generated first (see "benchmarks.dataset"), then each public method of the
+management interfaces is executed repeatedly and its throughput, latency percentiles and number of
+executed database statements are measured. The results can be written to a JSON file and compared
+with the results of a previous run (baseline). The exit code is 1 if a method is slower than in the
+baseline by more than the allowed regression.
+
+Usage (from the "server" directory):
+
+    python -m benchmarks.bm_management_interfaces [--users 100] [--projects 10]
+        [--trackers 5] [--fields 10] [--revisions 3] [--iterations 200] [--batch 20]
+        [--method <filter>]
+        [--output results.json] [--baseline baseline.json] [--max-regression 0.2]
+"""
+
+from authentication.authentication import AuthenticationInterface
+from authentication.basic_authentication_method import AuthenticationMethodBasic
+from benchmarks import dataset
+from database.database import DatabaseInterface
+from database.tables.project_information import ProjectSelection
+from database.tables.tracker_field_information import TrackerFieldSelection
+from database.tables.tracker_information import TrackerSelection
+from database.tables.user import UserSelection
+from metrics.request_statistics import RequestStatistics
+from plugins.database.sqlite.database import DatabaseSqlite
+from projectmanagement.project_management import ProjectManagementInterface
+from trackermanagement.tracker_field_management import TrackerFieldManagementInterface
+from trackermanagement.tracker_management import TrackerManagementInterface
+from usermanagement.user_management import UserManagementInterface
+import argparse
+import datetime
+import inspect
+import json
+import math
+import os
+import platform
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+from typing import Callable, List, Optional
+
+
+# Methods that only change the configuration of an interface and are therefore not measured
+CONFIGURATION_METHODS = {"UserManagementInterface.set_session_token_timeouts",
+                         "UserManagementInterface.enable_signed_session_tokens"}
+
+# Interfaces that are measured by this benchmark
+INTERFACES = [UserManagementInterface,
+              ProjectManagementInterface,
+              TrackerManagementInterface,
+              TrackerFieldManagementInterface]
+
+
+class BenchmarkCase(object):
+    """
+    A single measured method of a management interface
+    """
+
+    def __init__(self,
+                 interface: type,
+                 method_name: str,
+                 function: Callable[[int, object], object],
+                 prepare: Optional[Callable[[int], object]] = None,
+                 variant: Optional[str] = None):
+        """
+        Constructor
+
+        :param interface:   Management interface
+        :param method_name: Name of the measured method
+        :param function:    Function that calls the method, it gets the iteration index and the
+                            value returned by the "prepare" function
+        :param prepare:     Function that is called (without measuring it) before each call of the
+                            "function", it gets the iteration index
+        :param variant:     Description of the variant of the case (e.g. repeated single calls for
+                            comparison with a bulk method), it is appended to the name
+        """
+        self.name = "{0}.{1}".format(interface.__name__, method_name)
+
+        if variant is not None:
+            self.name += " ({0})".format(variant)
+        self.function = function
+        self.prepare = prepare
+
+
+def public_method_names(interface: type) -> List[str]:
+    """
+    Reads names of all public methods of the interface
+
+    :param interface:   Management interface
+
+    :return:    Method names (qualified with the interface name)
+    """
+    return ["{0}.{1}".format(interface.__name__, name)
+            for name, _ in inspect.getmembers(interface, inspect.isfunction)
+            if not name.startswith("_")]
+
+
+def create_cases(admin_user_id: int, data: dict, arguments) -> List[BenchmarkCase]:
+    """
+    Creates benchmark cases for all public methods of the management interfaces
+
+    :param admin_user_id:   ID of the administrator
+    :param data:            Generated dataset
+    :param arguments:       Command line arguments
+
+    :return:    Benchmark cases
+    """
+    random_generator = random.Random(arguments.seed)
+    connection = DatabaseInterface.create_connection()
+    cases = list()
+
+    # Each iteration picks a random object from the dataset (same sequence in each run)
+    def pick(values: list, count: int) -> List[int]:
+        return [random_generator.randrange(len(values)) for _ in range(count)]
+
+    user_indexes = pick(data["user_ids"], arguments.iterations)
+    project_indexes = pick(data["project_ids"], arguments.iterations)
+    tracker_indexes = pick(data["tracker_ids"], arguments.iterations)
+    field_indexes = pick(data["tracker_field_ids"], arguments.iterations)
+
+    def user_id(i: int) -> int:
+        return data["user_ids"][user_indexes[i]]
+
+    def user_name(i: int) -> str:
+        return dataset.user_name(user_indexes[i])
+
+    def project_id(i: int) -> int:
+        return data["project_ids"][project_indexes[i]]
+
+    def project_short_name(i: int) -> str:
+        return dataset.project_short_name(project_indexes[i])
+
+    def tracker_id(i: int) -> int:
+        return data["tracker_ids"][tracker_indexes[i]]
+
+    def tracker_short_name(i: int) -> str:
+        index = tracker_indexes[i]
+        return dataset.tracker_short_name(index // arguments.trackers, index % arguments.trackers)
+
+    def tracker_field_id(i: int) -> int:
+        return data["tracker_field_ids"][field_indexes[i]]
+
+    def tracker_field_name(i: int) -> str:
+        index = field_indexes[i]
+        tracker_index = index // arguments.fields
+        return dataset.tracker_field_name(tracker_index // arguments.trackers,
+                                          tracker_index % arguments.trackers,
+                                          index % arguments.fields)
+
+    def in_transaction(function: Callable[[], object]) -> object:
+        connection.begin_transaction()
+        result = function()
+        connection.commit_transaction()
+        return result
+
+    # Names of the objects that are created by the benchmark
+    def new_name(prefix: str, i: int) -> str:
+        return "{0}_bm{1}".format(prefix, i)
+
+    # Bulk methods get a batch of objects (a different batch in each iteration) and are compared
+    # with the same number of calls of the single object method
+    def batch(values: list, i: int) -> list:
+        count = min(arguments.batch, len(values))
+        first = (i * count) % len(values)
+        return [values[(first + x) % len(values)] for x in range(count)]
+
+    def single_calls(function: Callable[[object], object], values: list) -> bool:
+        return all([function(x) for x in values])
+
+    def add_bulk_cases(interface: type,
+                       bulk_method_name: str,
+                       bulk_function: Callable[[list], object],
+                       single_method_name: str,
+                       single_function: Callable[[object], object],
+                       prepare: Callable[[list], object],
+                       values: list) -> None:
+        cases.append(BenchmarkCase(
+            interface, bulk_method_name,
+            lambda i, _: bulk_function(batch(values, i)),
+            lambda i: prepare(batch(values, i))))
+        cases.append(BenchmarkCase(
+            interface, single_method_name,
+            lambda i, _: single_calls(single_function, batch(values, i)),
+            lambda i: prepare(batch(values, i)),
+            "x{0} single calls".format(min(arguments.batch, len(values)))))
+
+    # User management
+    users = UserManagementInterface
+
+    cases.append(BenchmarkCase(
+        users, "read_all_user_ids",
+        lambda i, _: users.read_all_user_ids(UserSelection.Active)))
+    cases.append(BenchmarkCase(
+        users, "read_user_by_id",
+        lambda i, _: users.read_user_by_id(connection, user_id(i))))
+    cases.append(BenchmarkCase(
+        users, "read_user_by_user_name",
+        lambda i, _: users.read_user_by_user_name(connection, user_name(i))))
+    cases.append(BenchmarkCase(
+        users, "read_users_by_user_name",
+        lambda i, _: users.read_users_by_user_name(connection, user_name(i))))
+    cases.append(BenchmarkCase(
+        users, "read_user_by_display_name",
+        lambda i, display_name: users.read_user_by_display_name(connection, display_name),
+        lambda i: users.read_user_by_id(connection, user_id(i))["display_name"]))
+    cases.append(BenchmarkCase(
+        users, "read_users_by_display_name",
+        lambda i, display_name: users.read_users_by_display_name(connection, display_name),
+        lambda i: users.read_user_by_id(connection, user_id(i))["display_name"]))
+    cases.append(BenchmarkCase(
+        users, "search_users",
+        lambda i, _: users.search_users(connection, user_name(i)[:5])))
+    cases.append(BenchmarkCase(
+        users, "create_user",
+        lambda i, _: users.create_user(new_name("user", i),
+                                           new_name("User", i),
+                                           "{0}@example.com".format(new_name("user", i)),
+                                           "benchmark",
+                                           {"password": "benchmark"})))
+    cases.append(BenchmarkCase(
+        users, "update_user_information",
+        lambda i, _: users.update_user_information(
+            user_id(i),
+            user_name(i),
+            "User {0} (benchmark {1})".format(user_indexes[i], i),
+            "{0}@example.com".format(user_name(i)),
+            True)))
+    cases.append(BenchmarkCase(
+        users, "deactivate_user",
+        lambda i, _: users.deactivate_user(user_id(i)),
+        lambda i: users.activate_user(user_id(i))))
+    cases.append(BenchmarkCase(
+        users, "activate_user",
+        lambda i, _: users.activate_user(user_id(i)),
+        lambda i: users.deactivate_user(user_id(i))))
+    add_bulk_cases(users,
+                   "deactivate_users", users.deactivate_users,
+                   "deactivate_user", users.deactivate_user,
+                   users.activate_users,
+                   data["user_ids"])
+    add_bulk_cases(users,
+                   "activate_users", users.activate_users,
+                   "activate_user", users.activate_user,
+                   users.deactivate_users,
+                   data["user_ids"])
+    cases.append(BenchmarkCase(
+        users, "read_user_authentication",
+        lambda i, _: users.read_user_authentication(user_id(i))))
+    cases.append(BenchmarkCase(
+        users, "authenticate_user",
+        lambda i, _: users.authenticate_user(connection,
+                                                 user_name(i),
+                                                 {"password": user_name(i)})))
+    cases.append(BenchmarkCase(
+        users, "update_user_authentication",
+        lambda i, _: users.update_user_authentication(user_id(i),
+                                                          "benchmark",
+                                                          {"password": user_name(i)})))
+    cases.append(BenchmarkCase(
+        users, "create_session_token",
+        lambda i, _: in_transaction(lambda: users.create_session_token(connection,
+                                                                           user_id(i)))))
+    cases.append(BenchmarkCase(
+        users, "read_session_token",
+        lambda i, token: in_transaction(lambda: users.read_session_token(connection, token)),
+        lambda i: in_transaction(lambda: users.create_session_token(connection, user_id(i)))))
+    cases.append(BenchmarkCase(
+        users, "delete_session_token",
+        lambda i, token: in_transaction(lambda: users.delete_session_token(connection,
+                                                                               token)),
+        lambda i: in_transaction(lambda: users.create_session_token(connection, user_id(i)))))
+    cases.append(BenchmarkCase(
+        users, "prune_expired_session_tokens",
+        lambda i, _: users.prune_expired_session_tokens()))
+
+    # Revocations of signed session tokens (one for each of the users, the method returns nothing)
+    def apply_session_token_revocations(revocations: List[dict]) -> bool:
+        users.apply_session_token_revocations(revocations)
+        return True
+
+    revoked_on = datetime.datetime.utcnow()
+    revocations = [{"user_id": x,
+                    "token_id": "bm{0}".format(x),
+                    "revoked_on": revoked_on,
+                    "expires_on": revoked_on + datetime.timedelta(hours=12)}
+                   for x in data["user_ids"]]
+
+    add_bulk_cases(users,
+                   "apply_session_token_revocations", apply_session_token_revocations,
+                   "apply_session_token_revocations",
+                   lambda x: apply_session_token_revocations([x]),
+                   lambda _: None,
+                   revocations)
+
+    # Project management
+    projects = ProjectManagementInterface
+
+    cases.append(BenchmarkCase(
+        projects, "read_all_project_ids",
+        lambda i, _: projects.read_all_project_ids(ProjectSelection.Active)))
+    cases.append(BenchmarkCase(
+        projects, "read_project_by_id",
+        lambda i, _: projects.read_project_by_id(project_id(i))))
+    cases.append(BenchmarkCase(
+        projects, "read_project_by_short_name",
+        lambda i, _: projects.read_project_by_short_name(project_short_name(i))))
+    cases.append(BenchmarkCase(
+        projects, "read_projects_by_short_name",
+        lambda i, _: projects.read_projects_by_short_name(project_short_name(i))))
+    cases.append(BenchmarkCase(
+        projects, "read_project_by_full_name",
+        lambda i, _: projects.read_project_by_full_name(
+            "Project {0}".format(project_indexes[i]))))
+    cases.append(BenchmarkCase(
+        projects, "read_projects_by_full_name",
+        lambda i, _: projects.read_projects_by_full_name(
+            "Project {0}".format(project_indexes[i]))))
+    cases.append(BenchmarkCase(
+        projects, "create_project",
+        lambda i, _: projects.create_project(admin_user_id,
+                                              new_name("p", i),
+                                              new_name("Project", i),
+                                              "Benchmark project")))
+    cases.append(BenchmarkCase(
+        projects, "update_project_information",
+        lambda i, _: projects.update_project_information(
+            admin_user_id,
+            project_id(i),
+            project_short_name(i),
+            "Project {0}".format(project_indexes[i]),
+            "Description of project {0} (benchmark {1})".format(project_indexes[i], i),
+            True)))
+    cases.append(BenchmarkCase(
+        projects, "deactivate_project",
+        lambda i, _: projects.deactivate_project(admin_user_id, project_id(i)),
+        lambda i: projects.activate_project(admin_user_id, project_id(i))))
+    cases.append(BenchmarkCase(
+        projects, "activate_project",
+        lambda i, _: projects.activate_project(admin_user_id, project_id(i)),
+        lambda i: projects.deactivate_project(admin_user_id, project_id(i))))
+    add_bulk_cases(projects,
+                   "deactivate_projects", lambda x: projects.deactivate_projects(admin_user_id, x),
+                   "deactivate_project", lambda x: projects.deactivate_project(admin_user_id, x),
+                   lambda x: projects.activate_projects(admin_user_id, x),
+                   data["project_ids"])
+    add_bulk_cases(projects,
+                   "activate_projects", lambda x: projects.activate_projects(admin_user_id, x),
+                   "activate_project", lambda x: projects.activate_project(admin_user_id, x),
+                   lambda x: projects.deactivate_projects(admin_user_id, x),
+                   data["project_ids"])
+
+    # Tracker management
+    trackers = TrackerManagementInterface
+
+    cases.append(BenchmarkCase(
+        trackers, "read_all_tracker_ids",
+        lambda i, _: trackers.read_all_tracker_ids(project_id(i), TrackerSelection.Active)))
+    cases.append(BenchmarkCase(
+        trackers, "read_tracker_by_id",
+        lambda i, _: trackers.read_tracker_by_id(tracker_id(i))))
+    cases.append(BenchmarkCase(
+        trackers, "read_tracker_by_short_name",
+        lambda i, _: trackers.read_tracker_by_short_name(tracker_short_name(i))))
+    cases.append(BenchmarkCase(
+        trackers, "read_trackers_by_short_name",
+        lambda i, _: trackers.read_trackers_by_short_name(tracker_short_name(i))))
+    cases.append(BenchmarkCase(
+        trackers, "read_tracker_by_full_name",
+        lambda i, full_name: trackers.read_tracker_by_full_name(full_name),
+        lambda i: trackers.read_tracker_by_id(tracker_id(i))["full_name"]))
+    cases.append(BenchmarkCase(
+        trackers, "read_trackers_by_full_name",
+        lambda i, full_name: trackers.read_trackers_by_full_name(full_name),
+        lambda i: trackers.read_tracker_by_id(tracker_id(i))["full_name"]))
+    cases.append(BenchmarkCase(
+        trackers, "create_tracker",
+        lambda i, _: trackers.create_tracker(admin_user_id,
+                                              project_id(i),
+                                              new_name("t", i),
+                                              new_name("Tracker", i),
+                                              "Benchmark tracker")))
+    cases.append(BenchmarkCase(
+        trackers, "update_tracker_information",
+        lambda i, tracker: trackers.update_tracker_information(
+            admin_user_id,
+            tracker_id(i),
+            tracker["short_name"],
+            tracker["full_name"],
+            "Description of tracker {0} (benchmark {1})".format(tracker["short_name"], i),
+            True),
+        lambda i: trackers.read_tracker_by_id(tracker_id(i))))
+    cases.append(BenchmarkCase(
+        trackers, "deactivate_tracker",
+        lambda i, _: trackers.deactivate_tracker(admin_user_id, tracker_id(i)),
+        lambda i: trackers.activate_tracker(admin_user_id, tracker_id(i))))
+    cases.append(BenchmarkCase(
+        trackers, "activate_tracker",
+        lambda i, _: trackers.activate_tracker(admin_user_id, tracker_id(i)),
+        lambda i: trackers.deactivate_tracker(admin_user_id, tracker_id(i))))
+    add_bulk_cases(trackers,
+                   "deactivate_trackers", lambda x: trackers.deactivate_trackers(admin_user_id, x),
+                   "deactivate_tracker", lambda x: trackers.deactivate_tracker(admin_user_id, x),
+                   lambda x: trackers.activate_trackers(admin_user_id, x),
+                   data["tracker_ids"])
+    add_bulk_cases(trackers,
+                   "activate_trackers", lambda x: trackers.activate_trackers(admin_user_id, x),
+                   "activate_tracker", lambda x: trackers.activate_tracker(admin_user_id, x),
+                   lambda x: trackers.deactivate_trackers(admin_user_id, x),
+                   data["tracker_ids"])
+
+    # Tracker field management
+    tracker_fields = TrackerFieldManagementInterface
+
+    cases.append(BenchmarkCase(
+        tracker_fields, "read_all_tracker_field_ids",
+        lambda i, _: tracker_fields.read_all_tracker_field_ids(tracker_id(i),
+                                                          TrackerFieldSelection.Active)))
+    cases.append(BenchmarkCase(
+        tracker_fields, "read_tracker_field_by_id",
+        lambda i, _: tracker_fields.read_tracker_field_by_id(tracker_field_id(i))))
+    cases.append(BenchmarkCase(
+        tracker_fields, "read_tracker_field_by_name",
+        lambda i, _: tracker_fields.read_tracker_field_by_name(tracker_field_name(i))))
+    cases.append(BenchmarkCase(
+        tracker_fields, "read_tracker_fields_by_name",
+        lambda i, _: tracker_fields.read_tracker_fields_by_name(tracker_field_name(i))))
+    cases.append(BenchmarkCase(
+        tracker_fields, "read_tracker_field_by_display_name",
+        lambda i, _: tracker_fields.read_tracker_field_by_display_name(
+            "Field {0}".format(tracker_field_name(i)))))
+    cases.append(BenchmarkCase(
+        tracker_fields, "read_tracker_fields_by_display_name",
+        lambda i, _: tracker_fields.read_tracker_fields_by_display_name(
+            "Field {0}".format(tracker_field_name(i)))))
+    cases.append(BenchmarkCase(
+        tracker_fields, "create_tracker_field",
+        lambda i, _: tracker_fields.create_tracker_field(admin_user_id,
+                                                    tracker_id(i),
+                                                    new_name("f", i),
+                                                    new_name("Field", i),
+                                                    "Benchmark field",
+                                                    "text",
+                                                    False)))
+    cases.append(BenchmarkCase(
+        tracker_fields, "create_tracker_fields",
+        lambda i, _: tracker_fields.create_tracker_fields(
+            admin_user_id,
+            tracker_id(i),
+            [{"name": new_name("fs{0}".format(x), i),
+              "display_name": new_name("Fields {0}".format(x), i),
+              "description": "Benchmark field",
+              "field_type": "text",
+              "required": False} for x in range(arguments.fields)])))
+    cases.append(BenchmarkCase(
+        tracker_fields, "update_tracker_field_information",
+        lambda i, _: tracker_fields.update_tracker_field_information(
+            admin_user_id,
+            tracker_field_id(i),
+            tracker_field_name(i),
+            "Field {0}".format(tracker_field_name(i)),
+            "Description of field {0} (benchmark {1})".format(tracker_field_name(i), i),
+            "text",
+            False,
+            True)))
+    cases.append(BenchmarkCase(
+        tracker_fields, "deactivate_tracker_field",
+        lambda i, _: tracker_fields.deactivate_tracker_field(admin_user_id, tracker_field_id(i)),
+        lambda i: tracker_fields.activate_tracker_field(admin_user_id, tracker_field_id(i))))
+    cases.append(BenchmarkCase(
+        tracker_fields, "activate_tracker_field",
+        lambda i, _: tracker_fields.activate_tracker_field(admin_user_id, tracker_field_id(i)),
+        lambda i: tracker_fields.deactivate_tracker_field(admin_user_id, tracker_field_id(i))))
+    add_bulk_cases(tracker_fields,
+                   "deactivate_tracker_fields",
+                   lambda x: tracker_fields.deactivate_tracker_fields(admin_user_id, x),
+                   "deactivate_tracker_field",
+                   lambda x: tracker_fields.deactivate_tracker_field(admin_user_id, x),
+                   lambda x: tracker_fields.activate_tracker_fields(admin_user_id, x),
+                   data["tracker_field_ids"])
+    add_bulk_cases(tracker_fields,
+                   "activate_tracker_fields",
+                   lambda x: tracker_fields.activate_tracker_fields(admin_user_id, x),
+                   "activate_tracker_field",
+                   lambda x: tracker_fields.activate_tracker_field(admin_user_id, x),
+                   lambda x: tracker_fields.deactivate_tracker_fields(admin_user_id, x),
+                   data["tracker_field_ids"])
+
+    return cases
+
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    """
+    Calculates a percentile with the "nearest rank" method
+
+    :param sorted_values:   Sorted list of values
+    :param fraction:        Percentile as a fraction (e.g. 0.99)
+
+    :return:    Percentile
+    """
+    rank = max(1, int(math.ceil(fraction * len(sorted_values))))
+    return sorted_values[rank - 1]
+
+
+def measure(case: BenchmarkCase, iterations: int) -> dict:
+    """
+    Measures the execution time of a benchmark case
+
+    :param case:        Benchmark case
+    :param iterations:  Number of iterations
+
+    :return:    Results
+
+    Returned dictionary contains items:
+
+    - iterations
+    - failures (number of calls that returned "None" or "False")
+    - throughput (calls per second)
+    - mean, p50, p99 and max (in milliseconds)
+    - queries (mean number of executed database statements per call)
+    """
+    durations = list()
+    failures = 0
+    query_count = 0
+
+    for i in range(iterations):
+        prepared = None
+
+        if case.prepare is not None:
+            prepared = case.prepare(i)
+
+        RequestStatistics.begin()
+        start = time.perf_counter()
+        result = case.function(i, prepared)
+        durations.append(time.perf_counter() - start)
+        query_count += RequestStatistics.end()["database_query_count"]
+
+        if (result is None) or (result is False):
+            failures += 1
+
+    durations.sort()
+    total_duration = sum(durations)
+
+    return {"iterations": iterations,
+            "failures": failures,
+            "throughput": (iterations / total_duration) if total_duration > 0.0 else 0.0,
+            "mean": total_duration / iterations * 1000.0,
+            "p50": percentile(durations, 0.50) * 1000.0,
+            "p99": percentile(durations, 0.99) * 1000.0,
+            "max": durations[-1] * 1000.0,
+            "queries": query_count / iterations}
+
+
+def compare_with_baseline(results: dict, baseline: dict, max_regression: float) -> List[str]:
+    """
+    Compares the results with the baseline and adds the relative change to each result
+
+    :param results:         Results of the benchmark cases
+    :param baseline:        Results of the baseline run
+    :param max_regression:  Max allowed relative increase of the p50 and p99 latency (e.g. 0.2)
+
+    :return:    Names of the benchmark cases with a regression
+    """
+    regressions = list()
+
+    for name, result in results.items():
+        baseline_result = baseline.get(name)
+
+        if baseline_result is None:
+            continue
+
+        result["baseline"] = dict()
+        regression = False
+
+        if "queries" in baseline_result:
+            result["baseline"]["queries"] = baseline_result["queries"]
+
+        for key in ["p50", "p99"]:
+            if baseline_result[key] > 0.0:
+                change = (result[key] - baseline_result[key]) / baseline_result[key]
+                result["baseline"][key] = baseline_result[key]
+                result["baseline"][key + "_change"] = change
+
+                if change > max_regression:
+                    regression = True
+
+        if regression:
+            regressions.append(name)
+
+    return regressions
+
+
+if __name__ == '__main__':
+    # Description is the part of the module docstring that follows the license header
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n", 4)[4],
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=100, help="Number of users")
+    parser.add_argument("--projects", type=int, default=10, help="Number of projects")
+    parser.add_argument("--trackers", type=int, default=5, help="Number of trackers per project")
+    parser.add_argument("--fields", type=int, default=10, help="Number of fields per tracker")
+    parser.add_argument("--revisions", type=int, default=3,
+                        help="Number of revisions of each object")
+    parser.add_argument("--iterations", type=int, default=200,
+                        help="Number of measured calls of each method")
+    parser.add_argument("--batch", type=int, default=20,
+                        help="Number of objects in a single call of the bulk methods")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for selection of the objects")
+    parser.add_argument("--method", default=None,
+                        help="Measure only the methods that contain the specified text")
+    parser.add_argument("--output", default=None, help="Path to the JSON file for the results")
+    parser.add_argument("--baseline", default=None,
+                        help="Path to the JSON file with the results of the baseline run")
+    parser.add_argument("--max-regression", type=float, default=0.2,
+                        help="Max allowed relative increase of the p50 and p99 latency")
+    arguments = parser.parse_args()
+
+    if min(arguments.users, arguments.projects, arguments.trackers, arguments.fields,
+           arguments.revisions, arguments.batch) < 1:
+        parser.error("Dataset parameters must be positive")
+
+    # Authentication
+    AuthenticationInterface.remove_all_authentication_methods()
+    AuthenticationInterface.add_authentication_method(AuthenticationMethodBasic())
+    AuthenticationInterface.add_authentication_method(dataset.AuthenticationMethodBenchmark())
+
+    # Database
+    database_file_path = os.path.join(tempfile.mkdtemp(), "benchmark.db")
+
+    DatabaseInterface.load_database_plugin(DatabaseSqlite(database_file_path))
+    DatabaseInterface.create_new_database()
+
+    admin_user_id = UserManagementInterface.read_user_by_user_name(
+        DatabaseInterface.create_connection(),
+        "administrator")["id"]
+
+    start = time.perf_counter()
+    data = dataset.generate_dataset(admin_user_id,
+                                    arguments.users,
+                                    arguments.projects,
+                                    arguments.trackers,
+                                    arguments.fields,
+                                    arguments.revisions)
+
+    print("Dataset: {0} users, {1} projects, {2} trackers, {3} tracker fields, {4} revisions "
+          "per object (generated in {5:.1f} s)".format(len(data["user_ids"]),
+                                                       len(data["project_ids"]),
+                                                       len(data["tracker_ids"]),
+                                                       len(data["tracker_field_ids"]),
+                                                       arguments.revisions,
+                                                       time.perf_counter() - start))
+
+    cases = create_cases(admin_user_id, data, arguments)
+
+    # Every public method needs to be covered by a benchmark case
+    case_names = {case.name for case in cases}
+    uncovered = [name
+                 for interface in INTERFACES
+                 for name in public_method_names(interface)
+                 if (name not in case_names) and (name not in CONFIGURATION_METHODS)]
+
+    if len(uncovered) > 0:
+        print("Methods without a benchmark case: {0}".format(", ".join(uncovered)))
+
+    # Measure
+    results = dict()
+
+    for case in cases:
+        if (arguments.method is not None) and (arguments.method not in case.name):
+            continue
+
+        results[case.name] = measure(case, arguments.iterations)
+
+    # Compare with the baseline
+    regressions = list()
+
+    if arguments.baseline is not None:
+        with open(arguments.baseline) as baseline_file:
+            regressions = compare_with_baseline(results,
+                                                json.load(baseline_file)["results"],
+                                                arguments.max_regression)
+
+    # Print results
+    for name, result in results.items():
+        line = "{0:<76} {1:9.1f} /s    p50: {2:8.3f} ms    p99: {3:8.3f} ms".format(
+            name,
+            result["throughput"],
+            result["p50"],
+            result["p99"])
+
+        line += "    queries: {0:5.1f}".format(result["queries"])
+
+        if "baseline" in result:
+            line += "    p50: {0:+6.1%}    p99: {1:+6.1%}".format(
+                result["baseline"].get("p50_change", 0.0),
+                result["baseline"].get("p99_change", 0.0))
+
+            if "queries" in result["baseline"]:
+                line += "    queries: {0:+5.1f}".format(result["queries"] -
+                                                        result["baseline"]["queries"])
+
+        if result["failures"] > 0:
+            line += "    failures: {0}".format(result["failures"])
+
+        print(line)
+
+    # Write results
+    if arguments.output is not None:
+        with open(arguments.output, "w") as output_file:
+            json.dump({"created_on": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+                       "environment": {"python": sys.version,
+                                       "sqlite": sqlite3.sqlite_version,
+                                       "platform": platform.platform()},
+                       "parameters": {"users": arguments.users,
+                                      "projects": arguments.projects,
+                                      "trackers": arguments.trackers,
+                                      "fields": arguments.fields,
+                                      "revisions": arguments.revisions,
+                                      "iterations": arguments.iterations,
+                                      "seed": arguments.seed},
+                       "results": results},
+                      output_file,
+                      indent=4,
+                      sort_keys=True)
+
+    os.remove(database_file_path)
+
+    if len(regressions) > 0:
+        print("Regressions (more than {0:.0%} slower than the baseline): {1}".format(
+            arguments.max_regression,
+            ", ".join(regressions)))
+        sys.exit(1)
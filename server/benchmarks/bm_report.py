@@ -0,0 +1,235 @@
+"""
+Salamander ALM
+Copyright (c) 2016  Djuro Drljaca
+
+This Python module is free software; you can redistribute it and/or modify it under the terms of the
+GNU General Public License as published by the Free Software Foundation; either version 2 of the
+License, or (at your option) any later version.
+
+This Python module is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License along with this library. If
+not, see <http://www.gnu.org/licenses/>.
+
+Benchmark for tracker reports (filtered and paginated lists of artifacts)
+
+Usage (from the "server" directory):
+
+    python -m benchmarks.bm_report [--artifacts 1000000] [--page-size 100] [--repeat 20]
+"""
+
+from authentication.authentication import AuthenticationInterface
+from authentication.basic_authentication_method import AuthenticationMethodBasic
+from database.database import DatabaseInterface
+from database.datatypes import datetime_to_string
+from plugins.database.sqlite.connection import ConnectionSqlite
+from plugins.database.sqlite.database import DatabaseSqlite
+from projectmanagement.project_management import ProjectManagementInterface
+from reportmanagement.report_management import ReportManagementInterface
+from trackermanagement.tracker_management import TrackerManagementInterface
+from trackermanagement.tracker_field_management import TrackerFieldManagementInterface
+import argparse
+import datetime
+import os
+import random
+import statistics
+import tempfile
+import time
+from typing import Callable
+
+
+STATUSES = ["new", "open", "in_progress", "resolved", "closed"]
+
+
+def create_tracker() -> dict:
+    """
+    Creates a tracker with a text, an integer and a real field
+
+    :return:    Tracker ID and IDs of its fields (key is the field name)
+    """
+    admin_user_id = 1
+    project_id = ProjectManagementInterface.create_project(admin_user_id,
+                                                           "benchmark",
+                                                           "Benchmark",
+                                                           "Report benchmark")
+    tracker_id = TrackerManagementInterface.create_tracker(admin_user_id,
+                                                           project_id,
+                                                           "benchmark",
+                                                           "Benchmark",
+                                                           "Report benchmark")
+    tracker_field_ids = dict()
+
+    for name, field_type in [("title", "text"),
+                             ("status", "text"),
+                             ("priority", "integer"),
+                             ("estimate", "real")]:
+        tracker_field_ids[name] = TrackerFieldManagementInterface.create_tracker_field(
+            admin_user_id,
+            tracker_id,
+            name,
+            name.capitalize(),
+            "",
+            field_type,
+            False)
+
+    return {"tracker_id": tracker_id, "tracker_field_ids": tracker_field_ids}
+
+
+def populate_database(tracker: dict, artifact_count: int) -> None:
+    """
+    Populates the database with artifacts (all of them are created in a single revision)
+
+    :param tracker:         Tracker ID and IDs of its fields
+    :param artifact_count:  Number of artifacts
+    """
+    connection = DatabaseInterface.create_connection()
+    native_connection = connection.native_connection
+    timestamp = datetime_to_string(datetime.datetime.utcnow())
+    random_generator = random.Random(0)
+    tracker_field_ids = tracker["tracker_field_ids"]
+    chunk_size = 10000
+
+    connection.begin_transaction()
+
+    revision_id = native_connection.execute(
+        "INSERT INTO revision (id, timestamp, user_id) VALUES (NULL, :timestamp, 1)",
+        {"timestamp": timestamp}).lastrowid
+
+    first_artifact_id = native_connection.execute(
+        "SELECT IFNULL(MAX(id), 0) + 1 FROM artifact").fetchone()[0]
+    first_information_id = native_connection.execute(
+        "SELECT IFNULL(MAX(id), 0) + 1 FROM artifact_information").fetchone()[0]
+
+    for chunk_start in range(0, artifact_count, chunk_size):
+        indexes = range(chunk_start, min(chunk_start + chunk_size, artifact_count))
+
+        native_connection.executemany(
+            "INSERT INTO artifact (id, tracker_id, created_on, created_by)\n"
+            "VALUES (:id, :tracker_id, :timestamp, 1)",
+            ({"id": first_artifact_id + i,
+              "tracker_id": tracker["tracker_id"],
+              "timestamp": timestamp} for i in indexes))
+
+        native_connection.executemany(
+            "INSERT INTO artifact_information (id, artifact_id, locked, active, revision_id)\n"
+            "VALUES (:id, :artifact_id, 0, 1, :revision_id)",
+            ({"id": first_information_id + i,
+              "artifact_id": first_artifact_id + i,
+              "revision_id": revision_id} for i in indexes))
+
+        field_values = list()
+
+        for i in indexes:
+            artifact_information_id = first_information_id + i
+
+            field_values.extend([
+                (artifact_information_id, tracker_field_ids["title"], "Artifact {0}".format(i)),
+                (artifact_information_id, tracker_field_ids["status"],
+                 random_generator.choice(STATUSES)),
+                (artifact_information_id, tracker_field_ids["priority"],
+                 random_generator.randrange(5)),
+                (artifact_information_id, tracker_field_ids["estimate"],
+                 round(random_generator.uniform(0.0, 100.0), 2))])
+
+        native_connection.executemany(
+            "INSERT INTO artifact_field_value\n"
+            "   (id, artifact_information_id, tracker_field_id, value)\n"
+            "VALUES (NULL, ?, ?, ?)",
+            field_values)
+
+    connection.commit_transaction()
+    native_connection.execute("ANALYZE")
+
+
+def measure(function: Callable[[], None], repeat: int) -> dict:
+    """
+    Measures the execution time of the function
+
+    :param function:    Function to measure
+    :param repeat:      Number of repetitions
+
+    :return:    Median and maximum execution time in milliseconds
+    """
+    durations = list()
+
+    for i in range(repeat):
+        start = time.perf_counter()
+        function()
+        durations.append((time.perf_counter() - start) * 1000.0)
+
+    return {"median": statistics.median(durations), "max": max(durations)}
+
+
+if __name__ == '__main__':
+    # Description is the part of the module docstring that follows the license header
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n", 4)[4],
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--artifacts", type=int, default=1000000, help="Number of artifacts")
+    parser.add_argument("--page-size", type=int, default=100, help="Number of artifacts per page")
+    parser.add_argument("--repeat", type=int, default=20, help="Number of repetitions")
+    arguments = parser.parse_args()
+
+    # Authentication is needed for creating the default administrator
+    AuthenticationInterface.remove_all_authentication_methods()
+    AuthenticationInterface.add_authentication_method(AuthenticationMethodBasic())
+
+    # Most of the measured queries are expected to exceed the slow query threshold
+    ConnectionSqlite.set_slow_query_threshold(None)
+
+    database_file_path = os.path.join(tempfile.mkdtemp(), "benchmark.db")
+
+    DatabaseInterface.load_database_plugin(DatabaseSqlite(database_file_path))
+    DatabaseInterface.create_new_database()
+
+    tracker = create_tracker()
+
+    start_time = time.perf_counter()
+    populate_database(tracker, arguments.artifacts)
+    populate_duration = time.perf_counter() - start_time
+
+    tracker_id = tracker["tracker_id"]
+    connection = DatabaseInterface.create_connection()
+
+    plan = connection.native_connection.execute(
+        "EXPLAIN QUERY PLAN\n"
+        "SELECT artifact_id FROM artifact_report_value\n"
+        "WHERE ((tracker_field_id = 1) AND (value_number >= 1) AND (artifact_id > 0))").fetchall()
+
+    print("Artifacts: {0} (created in {1:.1f} s), page size: {2}".format(arguments.artifacts,
+                                                                         populate_duration,
+                                                                         arguments.page_size))
+    print("    Query plan: {0}".format(plan[0][-1]))
+
+    for filter_expression in ["",
+                              "title = 'Artifact 123456'",
+                              "estimate > 99.5",
+                              "priority = 3",
+                              "status = 'open' AND priority >= 3",
+                              "status = 'closed' OR priority = 0",
+                              "priority = 1 AND NOT status = 'open'",
+                              "NOT status = 'closed'"]:
+        first_page = measure(
+            lambda: ReportManagementInterface.read_report(tracker_id,
+                                                          filter_expression,
+                                                          0,
+                                                          arguments.page_size),
+            arguments.repeat)
+
+        # Stream the whole report (second page onwards uses the ID of the last artifact)
+        start_time = time.perf_counter()
+        result_count = sum(1 for x in ReportManagementInterface.iterate_report(
+            tracker_id,
+            filter_expression,
+            ReportManagementInterface.max_limit))
+        stream_duration = time.perf_counter() - start_time
+
+        print("    {0:<40} results: {1:8}    first page median: {2:8.3f} ms    max: {3:8.3f} ms"
+              "    all pages: {4:8.3f} s".format("\"{0}\"".format(filter_expression),
+                                                 result_count,
+                                                 first_page["median"],
+                                                 first_page["max"],
+                                                 stream_duration))
+
+    os.remove(database_file_path)
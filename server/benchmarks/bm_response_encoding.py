@@ -0,0 +1,190 @@
+"""
+Salamander ALM
+Copyright (c) 2016  Djuro Drljaca
+
+This Python module is free software; you can redistribute it and/or modify it under the terms of the
+GNU General Public License as published by the Free Software Foundation; either version 2 of the
+License, or (at your option) any later version.
+
+This Python module is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License along with this library. If
+not, see <http://www.gnu.org/licenses/>.
+
+Benchmark for the encoding (format and compression) of REST API responses
+
+First the encoders are measured on a large payload (list of users), then the throughput of a REST
+API request (user search) is measured for each combination of the Accept and Accept-Encoding
+headers. Optional encoders (orjson, msgpack, cbor2, brotli) are measured only if they are installed.
+
+Usage (from the "server" directory):
+
+    python -m benchmarks.bm_response_encoding [--payload-users 10000] [--users 10000]
+        [--requests 500]
+"""
+
+from authentication.authentication import AuthenticationInterface
+from authentication.basic_authentication_method import AuthenticationMethodBasic
+from benchmarks.bm_user_search import populate_database
+from database.database import DatabaseInterface
+from plugins.database.sqlite.database import DatabaseSqlite
+import argparse
+import flask.json.provider
+import os
+import rest_api
+from rest_api import response_encoding
+from rest_api.response_encoding import ResponseEncoding
+import statistics
+import tempfile
+import time
+from typing import Callable
+
+
+def create_payload(user_count: int) -> list:
+    """
+    Creates a payload similar to a list of users returned by the REST API
+
+    :param user_count:  Number of users
+
+    :return:    Payload
+    """
+    return [{"id": i,
+             "user_name": "user{0}".format(i),
+             "display_name": "User {0}".format(i),
+             "email": "user{0}@example.com".format(i),
+             "active": (i % 10) != 0} for i in range(user_count)]
+
+
+def measure(function: Callable[[], bytes], repeat: int) -> dict:
+    """
+    Measures the execution time of the function
+
+    :param function:    Function that returns the encoded data
+    :param repeat:      Number of repetitions
+
+    :return:    Median execution time in milliseconds and size of the encoded data
+    """
+    durations = list()
+    data = b""
+
+    for i in range(repeat):
+        start = time.perf_counter()
+        data = function()
+        durations.append((time.perf_counter() - start) * 1000.0)
+
+    return {"median": statistics.median(durations), "size": len(data)}
+
+
+def measure_encoders(payload: list, repeat: int) -> None:
+    """
+    Measures the encoders and compression methods on the payload
+
+    :param payload: Payload
+    :param repeat:  Number of repetitions
+    """
+    default_provider = flask.json.provider.DefaultJSONProvider(rest_api.app)
+
+    encoders = [("json", lambda: default_provider.dumps(payload,
+                                                        separators=(",", ":")).encode("utf-8"))]
+
+    if response_encoding.orjson is not None:
+        encoders.append(("orjson", lambda: rest_api.app.json.dumps(payload).encode("utf-8")))
+
+    if response_encoding.msgpack is not None:
+        encoders.append(("msgpack", lambda: response_encoding.msgpack.packb(payload)))
+
+    if response_encoding.cbor2 is not None:
+        encoders.append(("cbor", lambda: response_encoding.cbor2.dumps(payload)))
+
+    print("Encoders ({0} users):".format(len(payload)))
+
+    for name, encoder in encoders:
+        data = encoder()
+        results = [(name, measure(encoder, repeat))]
+
+        for encoding in ResponseEncoding.available_encodings():
+            result = measure(lambda: ResponseEncoding.compress(data, encoding), repeat)
+            results.append(("{0} + {1}".format(name, encoding), result))
+
+        for result_name, result in results:
+            print("    {0:<20} size: {1:10} B    median: {2:8.3f} ms".format(result_name,
+                                                                           result["size"],
+                                                                           result["median"]))
+
+
+def measure_requests(request_count: int) -> None:
+    """
+    Measures the throughput of the REST API for each response encoding
+
+    :param request_count:   Number of requests for each encoding
+    """
+    client = rest_api.app.test_client()
+    response = client.post("/api/usermanagement/login",
+                           json={"user_name": "administrator",
+                                 "authentication_parameters": {"password": "administrator"}})
+    token = response.get_json()["session_token"]
+
+    # Warm up the database cache
+    for i in range(request_count):
+        client.get("/api/usermanagement/user",
+                   query_string={"search": "user{0}".format(i % 10), "limit": 100},
+                   headers={"SALM-Session-Token": token})
+
+    print("REST API (user search, {0} requests):".format(request_count))
+
+    for mimetype in ResponseEncoding.available_mimetypes():
+        for encoding in ["identity"] + ResponseEncoding.available_encodings():
+            headers = {"SALM-Session-Token": token,
+                       "Accept": mimetype,
+                       "Accept-Encoding": encoding}
+            size = 0
+
+            start = time.perf_counter()
+
+            for i in range(request_count):
+                response = client.get("/api/usermanagement/user",
+                                      query_string={"search": "user{0}".format(i % 10),
+                                                    "limit": 100},
+                                      headers=headers)
+                size += len(response.data)
+
+            duration = time.perf_counter() - start
+
+            print("    {0:<20} {1:<10} {2:8.1f} requests/s    average size: {3:8.0f} B".format(
+                mimetype,
+                encoding,
+                request_count / duration,
+                size / request_count))
+
+
+if __name__ == '__main__':
+    # Description is the part of the module docstring that follows the license header
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n", 4)[4],
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--payload-users", type=int, default=10000,
+                        help="Number of users in the encoded payload")
+    parser.add_argument("--users", type=int, default=10000, help="Number of users in the database")
+    parser.add_argument("--requests", type=int, default=500,
+                        help="Number of REST API requests for each encoding")
+    parser.add_argument("--repeat", type=int, default=20, help="Number of repetitions")
+    arguments = parser.parse_args()
+
+    measure_encoders(create_payload(arguments.payload_users), arguments.repeat)
+
+    # Authentication
+    AuthenticationInterface.remove_all_authentication_methods()
+    AuthenticationInterface.add_authentication_method(AuthenticationMethodBasic())
+
+    # Database
+    database_file_path = os.path.join(tempfile.mkdtemp(), "benchmark.db")
+
+    DatabaseInterface.load_database_plugin(DatabaseSqlite(database_file_path))
+    DatabaseInterface.create_new_database()
+
+    populate_database(arguments.users)
+
+    measure_requests(arguments.requests)
+
+    os.remove(database_file_path)
@@ -0,0 +1,144 @@
+"""
+Salamander ALM
+Copyright (c) 2016  Djuro Drljaca
+
+This Python module is free software; you can redistribute it and/or modify it under the terms of the
+GNU General Public License as published by the Free Software Foundation; either version 2 of the
+License, or (at your option) any later version.
+
+This Python module is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License along with this library. If
+not, see <http://www.gnu.org/licenses/>.
+
+Benchmark for the creation of session tokens (login)
+
+The current implementation (insert and retry on a collision) is compared to the previous one
+(collision check with a SELECT before the INSERT and an extra index on the "token" column).
+
+Usage (from the "server" directory):
+
+    python -m benchmarks.bm_session_token [--logins 10000]
+"""
+
+from authentication.authentication import AuthenticationInterface
+from authentication.basic_authentication_method import AuthenticationMethodBasic
+from database.database import DatabaseInterface
+from database.datatypes import datetime_to_string
+from plugins.database.sqlite.database import DatabaseSqlite
+from usermanagement.user_management import UserManagementInterface
+import argparse
+import datetime
+import os
+import tempfile
+import time
+import uuid
+
+
+def create_session_token_legacy(connection, user_id: int) -> str:
+    """
+    Creates a session token the way it was done before (for comparison)
+
+    :param connection:  Database connection
+    :param user_id:     ID of the user
+
+    :return:    Token value
+    """
+    token = None
+
+    for i in range(10):
+        random_uuid = uuid.uuid4()
+
+        row = connection.native_connection.execute(
+            "SELECT id FROM session_token WHERE (token = :token)",
+            {"token": random_uuid.hex}).fetchone()
+
+        if row is None:
+            token = random_uuid.hex
+            break
+
+    created_on = datetime.datetime.utcnow()
+
+    connection.native_connection.execute(
+        "INSERT INTO session_token (id, user_id, created_on, expires_on, last_used_on, token)\n"
+        "VALUES (NULL, :user_id, :created_on, :expires_on, :created_on, :token)",
+        {"user_id": user_id,
+         "created_on": datetime_to_string(created_on),
+         "expires_on": datetime_to_string(created_on + datetime.timedelta(hours=12)),
+         "token": token})
+
+    return token
+
+
+def run_benchmark(name: str, create_session_token, legacy_index: bool, login_count: int) -> None:
+    """
+    Runs the benchmark
+
+    :param name:                    Name of the benchmark
+    :param create_session_token:    Function that creates a session token
+    :param legacy_index:            Create the extra index on the "token" column
+    :param login_count:             Number of logins
+    """
+    database_file_path = os.path.join(tempfile.mkdtemp(), "benchmark.db")
+
+    DatabaseInterface.load_database_plugin(DatabaseSqlite(database_file_path))
+    DatabaseInterface.create_new_database()
+
+    connection = DatabaseInterface.create_connection()
+
+    if legacy_index:
+        connection.native_connection.execute(
+            "CREATE INDEX session_token_ix_token ON session_token (token)")
+
+    index_count = len(connection.native_connection.execute(
+        "PRAGMA index_list(session_token)").fetchall())
+
+    # Count the executed statements
+    statements = list()
+    connection.native_connection.set_trace_callback(statements.append)
+
+    start = time.perf_counter()
+
+    for i in range(login_count):
+        connection.begin_transaction()
+        create_session_token(connection, 1)
+        connection.commit_transaction()
+
+    duration = time.perf_counter() - start
+
+    connection.native_connection.set_trace_callback(None)
+
+    # BEGIN and COMMIT are not counted
+    statement_count = len([x for x in statements if x not in ["BEGIN", "COMMIT"]])
+    page_count = connection.native_connection.execute("PRAGMA page_count").fetchone()[0]
+
+    print("{0}".format(name))
+    print("    statements per login:      {0:.2f}".format(statement_count / login_count))
+    print("    indexes on session_token:  {0}".format(index_count))
+    print("    database pages:            {0}".format(page_count))
+    print("    time per login:            {0:.3f} ms".format(duration * 1000.0 / login_count))
+
+    os.remove(database_file_path)
+
+
+if __name__ == '__main__':
+    # Description is the part of the module docstring that follows the license header
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n", 4)[4],
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--logins", type=int, default=10000, help="Number of logins")
+    arguments = parser.parse_args()
+
+    # Authentication is needed for creating the default administrator
+    AuthenticationInterface.remove_all_authentication_methods()
+    AuthenticationInterface.add_authentication_method(AuthenticationMethodBasic())
+
+    run_benchmark("Legacy (SELECT + INSERT, extra index)",
+                  create_session_token_legacy,
+                  True,
+                  arguments.logins)
+    run_benchmark("Current (INSERT, retry on collision)",
+                  UserManagementInterface.create_session_token,
+                  False,
+                  arguments.logins)
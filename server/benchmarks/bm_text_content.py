@@ -0,0 +1,305 @@
+"""
+Salamander ALM
+Copyright (c) 2016  Djuro Drljaca
+
+This Python module is free software; you can redistribute it and/or modify it under the terms of the
+GNU General Public License as published by the Free Software Foundation; either version 2 of the
+License, or (at your option) any later version.
+
+This Python module is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License along with this library. If
+not, see <http://www.gnu.org/licenses/>.
+
+Benchmark for the storage of descriptions (deduplicated and compressed text content) compared to
+descriptions stored in each revision of the "*_information" tables
+
+Usage (from the "server" directory):
+
+    python -m benchmarks.bm_text_content [--projects 200] [--revisions 50] [--repeat 200]
+"""
+
+from authentication.authentication import AuthenticationInterface
+from authentication.basic_authentication_method import AuthenticationMethodBasic
+from database.database import DatabaseInterface
+from plugins.database.sqlite.connection import ConnectionSqlite
+from plugins.database.sqlite.database import DatabaseSqlite
+from database.tables.project_information import ProjectSelection
+from projectmanagement.project_management import ProjectManagementInterface
+import argparse
+import os
+import random
+import sqlite3
+import statistics
+import tempfile
+import time
+from typing import Callable
+
+
+def create_description(random_generator: random.Random, word_count: int) -> str:
+    """
+    Creates a description made of random words
+
+    :param random_generator:    Random number generator
+    :param word_count:          Number of words
+
+    :return:    Description
+    """
+    vocabulary = ["requirement", "system", "shall", "user", "interface", "data", "report",
+                  "artifact", "tracker", "project", "field", "value", "the", "a", "of", "to",
+                  "and", "in", "with", "for", "must", "be", "able", "each", "revision", "link",
+                  "test", "case", "verified", "by", "review", "status", "priority", "release"]
+    words = [random_generator.choice(vocabulary) for i in range(word_count)]
+
+    return " ".join(words) + "."
+
+
+def populate_database(project_count: int, revision_count: int, word_count: int) -> None:
+    """
+    Populates the database with projects, each project is deactivated and activated multiple times
+    and every tenth revision also changes its description
+
+    :param project_count:   Number of projects
+    :param revision_count:  Number of revisions of each project
+    :param word_count:      Number of words in a description
+    """
+    admin_user_id = 1
+    random_generator = random.Random(0)
+    project_ids = list()
+
+    for index in range(project_count):
+        project_ids.append(ProjectManagementInterface.create_project(
+            admin_user_id,
+            "project{0}".format(index),
+            "Project {0}".format(index),
+            create_description(random_generator, word_count)))
+
+    for revision in range(1, revision_count):
+        for project_id in project_ids:
+            if revision % 10 == 0:
+                project = ProjectManagementInterface.read_project_by_id(project_id)
+                ProjectManagementInterface.update_project_information(
+                    admin_user_id,
+                    project_id,
+                    project["short_name"],
+                    project["full_name"],
+                    project["description"] + " " + create_description(random_generator, 10),
+                    True)
+            elif revision % 2 == 1:
+                ProjectManagementInterface.deactivate_project(admin_user_id, project_id)
+            else:
+                ProjectManagementInterface.activate_project(admin_user_id, project_id)
+
+
+def create_inline_database(database_file_path: str) -> sqlite3.Connection:
+    """
+    Creates a database with all of the project information where descriptions are stored in each
+    revision (for comparison)
+
+    :param database_file_path:  Database file path
+
+    :return:    Connection to the database
+    """
+    connection = sqlite3.connect(database_file_path)
+    connection.row_factory = sqlite3.Row
+    connection.execute(
+        "CREATE TABLE project_information (\n"
+        "    id          INTEGER PRIMARY KEY AUTOINCREMENT NOT NULL,\n"
+        "    project_id  INTEGER NOT NULL,\n"
+        "    short_name  TEXT    NOT NULL,\n"
+        "    full_name   TEXT    NOT NULL,\n"
+        "    description TEXT,\n"
+        "    active      BOOLEAN NOT NULL,\n"
+        "    revision_id INTEGER NOT NULL\n"
+        ")")
+    connection.execute("CREATE INDEX project_information_ix_project_id\n"
+                       "ON project_information (project_id)")
+
+    # State rows (activation and deactivation) don't contain the other attributes so they are
+    # taken from the latest row with the attributes
+    rows = DatabaseInterface.create_connection().execute(
+        "SELECT PI.id, PI.project_id, PA.short_name, PA.full_name,\n"
+        "       text_content_decode(TC.content) AS description, PI.active, PI.revision_id\n"
+        "FROM project_information AS PI\n"
+        "INNER JOIN project_information AS PA\n"
+        "    ON (PA.id = (\n"
+        "        SELECT PA2.id\n"
+        "        FROM project_information AS PA2\n"
+        "        WHERE ((PA2.project_id = PI.project_id) AND\n"
+        "               (PA2.short_name IS NOT NULL) AND\n"
+        "               (PA2.revision_id <= PI.revision_id))\n"
+        "        ORDER BY PA2.revision_id DESC\n"
+        "        LIMIT 1\n"
+        "    ))\n"
+        "LEFT OUTER JOIN text_content AS TC\n"
+        "    ON (TC.id = PA.description_id)").fetchall()
+
+    connection.executemany("INSERT INTO project_information VALUES (?, ?, ?, ?, ?, ?, ?)",
+                           [tuple(row) for row in rows])
+    connection.commit()
+    connection.execute("VACUUM")
+
+    return connection
+
+
+def read_inline_project(connection: sqlite3.Connection, project_id: int) -> dict:
+    """
+    Reads the latest project information from the database created with "create_inline_database"
+
+    :param connection:  Connection to the database
+    :param project_id:  ID of the project
+
+    :return:    Project information
+    """
+    row = connection.execute(
+        "SELECT project_id, short_name, full_name, description, active, revision_id\n"
+        "FROM (\n"
+        "    SELECT PI1.project_id, PI1.short_name, PI1.full_name, PI1.description, PI1.active,\n"
+        "           PI1.revision_id\n"
+        "    FROM project_information AS PI1\n"
+        "    WHERE (PI1.revision_id = (\n"
+        "                SELECT MAX(PI2.revision_id)\n"
+        "                FROM project_information AS PI2\n"
+        "                WHERE (PI2.project_id = PI1.project_id)\n"
+        "           ))\n"
+        ")\n"
+        "WHERE (project_id = :project_id)",
+        {"project_id": project_id}).fetchone()
+
+    return dict(row)
+
+
+def database_size(connection: sqlite3.Connection) -> int:
+    """
+    Reads the size of the database
+
+    :param connection:  Connection to the database
+
+    :return:    Size of the database in bytes
+    """
+    page_count = connection.execute("PRAGMA page_count").fetchone()[0]
+    page_size = connection.execute("PRAGMA page_size").fetchone()[0]
+
+    return page_count * page_size
+
+
+def table_size(connection: sqlite3.Connection, table_names: list) -> int:
+    """
+    Reads the size of the tables (including their indexes)
+
+    :param connection:  Connection to the database
+    :param table_names: Names of the tables
+
+    :return:    Size of the tables in bytes
+    """
+    return connection.execute(
+        "SELECT SUM(pgsize)\n"
+        "FROM dbstat\n"
+        "WHERE (name IN (\n"
+        "    SELECT name\n"
+        "    FROM sqlite_master\n"
+        "    WHERE (tbl_name IN ({0}))\n"
+        "))".format(", ".join(["'{0}'".format(x) for x in table_names]))).fetchone()[0]
+
+
+def measure(function: Callable[[], None], repeat: int) -> dict:
+    """
+    Measures the execution time of the function
+
+    :param function:    Function to measure
+    :param repeat:      Number of repetitions
+
+    :return:    Median and maximum execution time in milliseconds
+    """
+    durations = list()
+
+    for i in range(repeat):
+        start = time.perf_counter()
+        function()
+        durations.append((time.perf_counter() - start) * 1000.0)
+
+    return {"median": statistics.median(durations), "max": max(durations)}
+
+
+if __name__ == '__main__':
+    # Description is the part of the module docstring that follows the license header
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n", 4)[4],
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--projects", type=int, default=200, help="Number of projects")
+    parser.add_argument("--revisions", type=int, default=50, help="Number of revisions per project")
+    parser.add_argument("--words", type=int, default=600, help="Number of words in a description")
+    parser.add_argument("--repeat", type=int, default=200, help="Number of repetitions")
+    arguments = parser.parse_args()
+
+    # Authentication is needed for creating the default administrator
+    AuthenticationInterface.remove_all_authentication_methods()
+    AuthenticationInterface.add_authentication_method(AuthenticationMethodBasic())
+
+    # Reads of the database with inline descriptions are expected to exceed the slow query
+    # threshold
+    ConnectionSqlite.set_slow_query_threshold(None)
+
+    directory = tempfile.mkdtemp()
+    database_file_path = os.path.join(directory, "benchmark.db")
+    inline_database_file_path = os.path.join(directory, "benchmark_inline.db")
+
+    DatabaseInterface.load_database_plugin(DatabaseSqlite(database_file_path))
+    DatabaseInterface.create_new_database()
+
+    start_time = time.perf_counter()
+    populate_database(arguments.projects, arguments.revisions, arguments.words)
+    populate_duration = time.perf_counter() - start_time
+
+    native_connection = DatabaseInterface.create_connection().native_connection
+    native_connection.execute("VACUUM")
+    inline_connection = create_inline_database(inline_database_file_path)
+
+    text_count = native_connection.execute("SELECT COUNT(*) FROM text_content").fetchone()[0]
+
+    print("Projects: {0} with {1} revisions each (created in {2:.1f} s), stored descriptions: "
+          "{3}".format(arguments.projects, arguments.revisions, populate_duration, text_count))
+
+    sizes = [("Inline descriptions",
+              database_size(inline_connection),
+              table_size(inline_connection, ["project_information"])),
+             ("Text content",
+              database_size(native_connection),
+              table_size(native_connection, ["project_information", "text_content"]))]
+
+    for name, size, information_size in sizes:
+        print("    {0:<30} database: {1:10.2f} MiB    project information: {2:10.2f} MiB".format(
+            name,
+            size / (1024.0 * 1024.0),
+            information_size / (1024.0 * 1024.0)))
+
+    project_id = arguments.projects // 2
+    expected_description = ProjectManagementInterface.read_project_by_id(project_id)["description"]
+    assert read_inline_project(inline_connection, project_id)["description"] == \
+        expected_description
+
+    # Both layouts are read with a single query on an already open connection
+    connection = DatabaseInterface.create_connection()
+    max_revision_id = DatabaseInterface.tables().revision.read_current_revision_id(connection)
+
+    results = [
+        ("Inline descriptions", lambda: read_inline_project(inline_connection, project_id)),
+        ("Text content",
+         lambda: DatabaseInterface.tables().project_information.read_information(
+             connection,
+             "project_id",
+             project_id,
+             ProjectSelection.All,
+             max_revision_id))]
+
+    for name, function in results:
+        result = measure(function, arguments.repeat)
+
+        print("    {0:<30} read median: {1:8.3f} ms    max: {2:8.3f} ms".format(name,
+                                                                              result["median"],
+                                                                              result["max"]))
+
+    inline_connection.close()
+    os.remove(inline_database_file_path)
+    os.remove(database_file_path)
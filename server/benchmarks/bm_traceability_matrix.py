@@ -0,0 +1,268 @@
+"""
+Salamander ALM
+Copyright (c) 2016  Djuro Drljaca
+
+This Python module is free software; you can redistribute it and/or modify it under the terms of the
+GNU General Public License as published by the Free Software Foundation; either version 2 of the
+License, or (at your option) any later version.
+
+This Python module is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License along with this library. If
+not, see <http://www.gnu.org/licenses/>.
+
+Benchmark for the export of the traceability matrix between two trackers
+
+Both trackers have the same number of artifacts and the matrix is sparse: each artifact of the
+first tracker is linked to zero to three artifacts of the second tracker. In a second revision a
+part of the links is deleted and a part of the artifacts is deactivated, so the export of the
+first revision must resolve the state of each link and artifact at that revision.
+
+Usage (from the "server" directory):
+
+    python -m benchmarks.bm_traceability_matrix [--artifacts 50000]
+"""
+
+from artifactmanagement.artifact_link_management import ArtifactLinkManagementInterface
+from authentication.authentication import AuthenticationInterface
+from authentication.basic_authentication_method import AuthenticationMethodBasic
+from database.database import DatabaseInterface
+from database.datatypes import datetime_to_string
+from database.tables.artifact_information import ArtifactSelection
+from plugins.database.sqlite.connection import ConnectionSqlite
+from plugins.database.sqlite.database import DatabaseSqlite
+import argparse
+import datetime
+import os
+import random
+import rest_api
+import tempfile
+import time
+import tracemalloc
+from typing import Callable, Tuple
+
+
+def populate_database(artifact_count: int) -> Tuple[int, int, int]:
+    """
+    Populates the database with two trackers of linked artifacts
+
+    :param artifact_count:  Number of artifacts in each tracker
+
+    :return:    IDs of both trackers and ID of the first revision
+    """
+    connection = DatabaseInterface.create_connection()
+    native_connection = connection.native_connection
+    timestamp = datetime_to_string(datetime.datetime.utcnow())
+    random_generator = random.Random(0)
+
+    connection.begin_transaction()
+
+    native_connection.execute("INSERT INTO project (id) VALUES (NULL)")
+
+    revision_ids = [native_connection.execute(
+        "INSERT INTO revision (id, timestamp, user_id) VALUES (NULL, :timestamp, 1)",
+        {"timestamp": timestamp}).lastrowid for i in range(2)]
+
+    tracker_ids = list()
+    levels = list()
+
+    for tracker_index in range(2):
+        tracker_id = native_connection.execute(
+            "INSERT INTO tracker (id, project_id) VALUES (NULL, 1)").lastrowid
+
+        native_connection.execute(
+            "INSERT INTO tracker_information\n"
+            "   (id, tracker_id, short_name, full_name, active, revision_id)\n"
+            "VALUES (NULL, :tracker_id, :name, :name, 1, :revision_id)",
+            {"tracker_id": tracker_id,
+             "name": "tracker{0}".format(tracker_index),
+             "revision_id": revision_ids[0]})
+
+        artifact_ids = list()
+
+        for i in range(artifact_count):
+            artifact_id = native_connection.execute(
+                "INSERT INTO artifact (id, tracker_id, created_on, created_by)\n"
+                "VALUES (NULL, :tracker_id, :timestamp, 1)",
+                {"tracker_id": tracker_id, "timestamp": timestamp}).lastrowid
+            artifact_ids.append(artifact_id)
+
+        native_connection.executemany(
+            "INSERT INTO artifact_information (id, artifact_id, locked, active, revision_id)\n"
+            "VALUES (NULL, :artifact_id, 0, 1, :revision_id)",
+            ({"artifact_id": x, "revision_id": revision_ids[0]} for x in artifact_ids))
+
+        tracker_ids.append(tracker_id)
+        levels.append(artifact_ids)
+
+    # Sparse links from the first to the second tracker
+    link_ids = list()
+
+    for source_artifact_id in levels[0]:
+        for target_artifact_id in random_generator.sample(levels[1], random_generator.randint(0,
+                                                                                             3)):
+            link_id = native_connection.execute(
+                "INSERT INTO artifact_link (id, source_artifact_id, target_artifact_id)\n"
+                "VALUES (NULL, :source_artifact_id, :target_artifact_id)",
+                {"source_artifact_id": source_artifact_id,
+                 "target_artifact_id": target_artifact_id}).lastrowid
+            link_ids.append(link_id)
+
+    native_connection.executemany(
+        "INSERT INTO artifact_link_information (id, artifact_link_id, active, revision_id)\n"
+        "VALUES (NULL, :link_id, 1, :revision_id)",
+        ({"link_id": x, "revision_id": revision_ids[0]} for x in link_ids))
+
+    # Second revision: 10% of the links are deleted and 5% of the artifacts are deactivated
+    native_connection.executemany(
+        "INSERT INTO artifact_link_information (id, artifact_link_id, active, revision_id)\n"
+        "VALUES (NULL, :link_id, 0, :revision_id)",
+        ({"link_id": x, "revision_id": revision_ids[1]}
+         for x in random_generator.sample(link_ids, len(link_ids) // 10)))
+
+    native_connection.executemany(
+        "INSERT INTO artifact_information (id, artifact_id, locked, active, revision_id)\n"
+        "VALUES (NULL, :artifact_id, 0, 0, :revision_id)",
+        ({"artifact_id": x, "revision_id": revision_ids[1]}
+         for x in random_generator.sample(levels[0] + levels[1], artifact_count // 10)))
+
+    connection.commit_transaction()
+    native_connection.execute("ANALYZE")
+
+    return tracker_ids[0], tracker_ids[1], revision_ids[0]
+
+
+def read_matrix_artifact_by_artifact(tracker_id: int, linked_tracker_id: int) -> int:
+    """
+    Reads the traceability matrix (current revision) with one query per artifact (for comparison)
+
+    :param tracker_id:          ID of the tracker
+    :param linked_tracker_id:   ID of the linked tracker
+
+    :return:    Number of matrix cells
+    """
+    connection = DatabaseInterface.create_connection()
+    artifact_information = DatabaseInterface.tables().artifact_information
+    revision_id = DatabaseInterface.tables().revision.read_current_revision_id(connection)
+
+    linked_artifact_ids = set(artifact_information.read_all_artifact_ids(connection,
+                                                                        linked_tracker_id,
+                                                                        ArtifactSelection.Active,
+                                                                        revision_id))
+    cell_count = 0
+
+    for artifact_id in artifact_information.read_all_artifact_ids(connection,
+                                                                  tracker_id,
+                                                                  ArtifactSelection.Active,
+                                                                  revision_id):
+        links = [x for x in ArtifactLinkManagementInterface.read_links(artifact_id)
+                 if x["target_artifact_id"] in linked_artifact_ids]
+        cell_count += max(1, len(links))
+
+    return cell_count
+
+
+def measure(function: Callable[[], int]) -> dict:
+    """
+    Measures the execution time and the peak memory usage of the function
+
+    :param function:    Function to measure (returns the number of processed matrix cells)
+
+    :return:    Duration in seconds, peak memory usage in MiB and number of matrix cells
+    """
+    tracemalloc.start()
+    start = time.perf_counter()
+    cell_count = function()
+    duration = time.perf_counter() - start
+    peak_memory = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    return {"duration": duration,
+            "peak_memory": peak_memory / (1024.0 * 1024.0),
+            "cells": cell_count}
+
+
+if __name__ == '__main__':
+    # Description is the part of the module docstring that follows the license header
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n", 4)[4],
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--artifacts", type=int, default=50000,
+                        help="Number of artifacts in each tracker")
+    arguments = parser.parse_args()
+
+    # Authentication is needed for creating the default administrator
+    AuthenticationInterface.remove_all_authentication_methods()
+    AuthenticationInterface.add_authentication_method(AuthenticationMethodBasic())
+
+    # Export of the whole matrix is expected to exceed the slow query threshold
+    ConnectionSqlite.set_slow_query_threshold(None)
+
+    database_file_path = os.path.join(tempfile.mkdtemp(), "benchmark.db")
+
+    DatabaseInterface.load_database_plugin(DatabaseSqlite(database_file_path))
+    DatabaseInterface.create_new_database()
+
+    start_time = time.perf_counter()
+    tracker_id, linked_tracker_id, first_revision_id = populate_database(arguments.artifacts)
+    populate_duration = time.perf_counter() - start_time
+
+    connection = DatabaseInterface.create_connection()
+    link_count = connection.native_connection.execute(
+        "SELECT COUNT(*) FROM artifact_link").fetchone()[0]
+
+    print("Matrix: {0} x {0} artifacts, links: {1} (created in {2:.1f} s)".format(
+        arguments.artifacts, link_count, populate_duration))
+
+    def count_cells(revision_id=None) -> int:
+        cells = ArtifactLinkManagementInterface.iterate_traceability_matrix(
+            tracker_id,
+            linked_tracker_id,
+            max_revision_id=revision_id)
+        return sum(1 for x in cells)
+
+    # Export through the REST API, the streamed response is consumed chunk by chunk
+    client = rest_api.app.test_client()
+    token = client.post("/api/usermanagement/login",
+                        json={"user_name": "administrator",
+                              "authentication_parameters": {
+                                  "password": "administrator"}}).get_json()["session_token"]
+
+    def export_matrix(export_format: str) -> int:
+        response = client.get("/api/artifactmanagement/traceability_matrix",
+                              query_string={"tracker_id": tracker_id,
+                                            "linked_tracker_id": linked_tracker_id,
+                                            "format": export_format},
+                              headers={"SALM-Session-Token": token},
+                              buffered=False)
+        line_count = 0
+
+        for chunk in response.response:
+            line_count += chunk.count(b"\n")
+
+        response.close()
+
+        if export_format == "csv":
+            # Header row
+            line_count -= 1
+
+        return line_count
+
+    results = [
+        ("iterator (current revision)", measure(count_cells)),
+        ("iterator (first revision)", measure(lambda: count_cells(first_revision_id))),
+        ("REST API, CSV", measure(lambda: export_matrix("csv"))),
+        ("REST API, NDJSON", measure(lambda: export_matrix("ndjson"))),
+        ("artifact by artifact (for comparison)",
+         measure(lambda: read_matrix_artifact_by_artifact(tracker_id, linked_tracker_id)))
+    ]
+
+    for name, result in results:
+        print("    {0:<40} {1:9.3f} s    peak memory: {2:8.2f} MiB    cells: {3}".format(
+            name,
+            result["duration"],
+            result["peak_memory"],
+            result["cells"]))
+
+    os.remove(database_file_path)
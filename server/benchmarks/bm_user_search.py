@@ -0,0 +1,118 @@
+"""
+Salamander ALM
+Copyright (c) 2016  Djuro Drljaca
+
+This Python module is free software; you can redistribute it and/or modify it under the terms of the
+GNU General Public License as published by the Free Software Foundation; either version 2 of the
+License, or (at your option) any later version.
+
+This Python module is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License along with this library. If
+not, see <http://www.gnu.org/licenses/>.
+
+Benchmark for the prefix search in the user directory
+
+Usage (from the "server" directory):
+
+    python -m benchmarks.bm_user_search [--users 100000] [--limit 10] [--repeat 200]
+"""
+
+from authentication.authentication import AuthenticationInterface
+from authentication.basic_authentication_method import AuthenticationMethodBasic
+from database.database import DatabaseInterface
+from plugins.database.sqlite.database import DatabaseSqlite
+from usermanagement.user_management import UserManagementInterface
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+from typing import Callable
+
+
+def populate_database(user_count: int) -> None:
+    """
+    Populates the database with users
+
+    :param user_count:  Number of users
+    """
+    connection = DatabaseInterface.create_connection()
+    random_generator = random.Random(0)
+    first_names = ["Ana", "Boris", "Cecilia", "Dragan", "Eva", "Filip", "Goran", "Helena"]
+    last_names = ["Horvat", "Kovac", "Babic", "Maric", "Juric", "Novak", "Knezevic", "Vukovic"]
+
+    connection.begin_transaction()
+
+    connection.native_connection.executemany(
+        "INSERT INTO user (id, user_name, display_name, email, active)\n"
+        "VALUES (NULL, :user_name, :display_name, :email, :active)",
+        ({"user_name": "user{0}".format(i),
+          "display_name": "{0} {1} {2}".format(random_generator.choice(first_names),
+                                               random_generator.choice(last_names),
+                                               i),
+          "email": "user{0}@example.com".format(i),
+          "active": (i % 10) != 0} for i in range(user_count)))
+
+    connection.commit_transaction()
+
+
+def measure(function: Callable[[], None], repeat: int) -> dict:
+    """
+    Measures the execution time of the function
+
+    :param function:    Function to measure
+    :param repeat:      Number of repetitions
+
+    :return:    Median and maximum execution time in milliseconds
+    """
+    durations = list()
+
+    for i in range(repeat):
+        start = time.perf_counter()
+        function()
+        durations.append((time.perf_counter() - start) * 1000.0)
+
+    return {"median": statistics.median(durations), "max": max(durations)}
+
+
+if __name__ == '__main__':
+    # Description is the part of the module docstring that follows the license header
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n", 4)[4],
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=100000, help="Number of users")
+    parser.add_argument("--limit", type=int, default=10, help="Max number of returned users")
+    parser.add_argument("--repeat", type=int, default=200, help="Number of repetitions")
+    arguments = parser.parse_args()
+
+    # Authentication is needed for creating the default administrator
+    AuthenticationInterface.remove_all_authentication_methods()
+    AuthenticationInterface.add_authentication_method(AuthenticationMethodBasic())
+
+    database_file_path = os.path.join(tempfile.mkdtemp(), "benchmark.db")
+
+    DatabaseInterface.load_database_plugin(DatabaseSqlite(database_file_path))
+    DatabaseInterface.create_new_database()
+
+    populate_database(arguments.users)
+
+    connection = DatabaseInterface.create_connection()
+
+    print("Users: {0}, limit: {1}".format(arguments.users, arguments.limit))
+
+    for text in ["u", "USER9", "user12345", "eva", "helena vuk", "USER5@EX", "nomatch"]:
+        result_count = len(UserManagementInterface.search_users(connection, text, arguments.limit))
+        result = measure(
+            lambda: UserManagementInterface.search_users(connection, text, arguments.limit),
+            arguments.repeat)
+
+        print("    {0:<20} results: {1:3}    median: {2:8.3f} ms    max: {3:8.3f} ms".format(
+            "\"{0}\"".format(text),
+            result_count,
+            result["median"],
+            result["max"]))
+
+    os.remove(database_file_path)
@@ -0,0 +1,266 @@
+"""
+Salamander ALM
+Copyright (c) 2016  Djuro Drljaca
+
+This Python module is free software; you can redistribute it and/or modify it under the terms of the
+GNU General Public License as published by the Free Software Foundation; either version 2 of the
+License, or (at your option) any later version.
+
+This Python module is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License along with this library. If
+not, see <http://www.gnu.org/licenses/>.
+
+Generator of synthetic datasets for benchmarks
+
+All objects are created through the management interfaces so the generated database has the same
+structure (revisions, history rows, search index) as a database of a real deployment. The generated
+names are deterministic so a dataset with the same parameters can be recreated at any time.
+"""
+
+from authentication.authentication import AuthenticationMethod
+from projectmanagement.project_management import ProjectManagementInterface
+from trackermanagement.tracker_field_management import TrackerFieldManagementInterface
+from trackermanagement.tracker_management import TrackerManagementInterface
+from usermanagement.user_management import UserManagementInterface
+from typing import Optional
+
+
+class AuthenticationMethodBenchmark(AuthenticationMethod):
+    """
+    Authentication method for the users of a synthetic dataset
+
+    The password is stored as-is. This keeps the cost of password hashing (which is intentionally
+    slow) out of the dataset generation and out of the measured database operations.
+    """
+
+    def __init__(self):
+        """
+        Constructor
+        """
+        AuthenticationMethod.__init__(self)
+
+    def authentication_type(self) -> str:
+        """
+        Returns the supported authentication type
+
+        :return:    Supported authentication type
+        """
+        return "benchmark"
+
+    def authenticate(self,
+                     input_authentication_parameters: dict,
+                     reference_authentication_parameters: dict) -> bool:
+        """
+        Authenticate
+
+        :param input_authentication_parameters:     Input authentication parameters
+        :param reference_authentication_parameters: Reference authentication parameters
+
+        :return:    Success or failure
+        """
+        if ("password" not in input_authentication_parameters.keys()) or \
+                ("password" not in reference_authentication_parameters.keys()):
+            return False
+
+        return (input_authentication_parameters["password"] ==
+                reference_authentication_parameters["password"])
+
+    def generate_reference_authentication_parameters(
+            self,
+            input_authentication_parameters: dict) -> Optional[dict]:
+        """
+        Generate reference authentication parameters that can be used for authentication
+
+        :param input_authentication_parameters: Input authentication parameters
+
+        :return:    Reference authentication parameters
+        """
+        if "password" not in input_authentication_parameters.keys():
+            return None
+
+        return {"password": input_authentication_parameters["password"]}
+
+
+def user_name(user_index: int) -> str:
+    """
+    Generates user name of a user in the dataset
+
+    :param user_index:  Index of the user
+
+    :return:    User name
+    """
+    return "user{0}".format(user_index)
+
+
+def project_short_name(project_index: int) -> str:
+    """
+    Generates short name of a project in the dataset
+
+    :param project_index:   Index of the project
+
+    :return:    Short name
+    """
+    return "p{0}".format(project_index)
+
+
+def tracker_short_name(project_index: int, tracker_index: int) -> str:
+    """
+    Generates short name of a tracker in the dataset
+
+    :param project_index:   Index of the project
+    :param tracker_index:   Index of the tracker in the project
+
+    :return:    Short name
+    """
+    return "p{0}t{1}".format(project_index, tracker_index)
+
+
+def tracker_field_name(project_index: int, tracker_index: int, field_index: int) -> str:
+    """
+    Generates name of a tracker field in the dataset
+
+    :param project_index:   Index of the project
+    :param tracker_index:   Index of the tracker in the project
+    :param field_index:     Index of the field in the tracker
+
+    :return:    Name
+    """
+    return "p{0}t{1}f{2}".format(project_index, tracker_index, field_index)
+
+
+def generate_dataset(requested_by_user: int,
+                     user_count: int,
+                     project_count: int,
+                     trackers_per_project: int,
+                     fields_per_tracker: int,
+                     revisions_per_object: int) -> dict:
+    """
+    Generates a synthetic dataset in the currently loaded database
+
+    :param requested_by_user:       ID of the user that creates the projects, trackers and fields
+    :param user_count:              Number of users
+    :param project_count:           Number of projects
+    :param trackers_per_project:    Number of trackers in each project
+    :param fields_per_tracker:      Number of fields in each tracker
+    :param revisions_per_object:    Number of revisions of each project, tracker and field (the
+                                    first revision is created with the object, each additional
+                                    revision updates its description)
+
+    :return:    IDs of the generated objects
+
+    Returned dictionary contains items:
+
+    - user_ids
+    - project_ids
+    - tracker_ids
+    - tracker_field_ids
+
+    Note: "benchmark" authentication method (AuthenticationMethodBenchmark) needs to be loaded
+    before the dataset is generated, password of each user is the same as its user name.
+    """
+    dataset = {"user_ids": list(),
+               "project_ids": list(),
+               "tracker_ids": list(),
+               "tracker_field_ids": list()}
+
+    # Users
+    for user_index in range(user_count):
+        name = user_name(user_index)
+        user_id = UserManagementInterface.create_user(name,
+                                                      "User {0}".format(user_index),
+                                                      "{0}@example.com".format(name),
+                                                      "benchmark",
+                                                      {"password": name})
+
+        if user_id is None:
+            raise RuntimeError("Failed to create user: {0}".format(name))
+
+        for revision in range(1, revisions_per_object):
+            UserManagementInterface.update_user_information(
+                user_id,
+                name,
+                "User {0} ({1})".format(user_index, revision),
+                "{0}@example.com".format(name),
+                True)
+
+        dataset["user_ids"].append(user_id)
+
+    # Projects, trackers and tracker fields
+    for project_index in range(project_count):
+        short_name = project_short_name(project_index)
+        project_id = ProjectManagementInterface.create_project(
+            requested_by_user,
+            short_name,
+            "Project {0}".format(project_index),
+            "Description of project {0}".format(project_index))
+
+        if project_id is None:
+            raise RuntimeError("Failed to create project: {0}".format(short_name))
+
+        for revision in range(1, revisions_per_object):
+            ProjectManagementInterface.update_project_information(
+                requested_by_user,
+                project_id,
+                short_name,
+                "Project {0}".format(project_index),
+                "Description of project {0} ({1})".format(project_index, revision),
+                True)
+
+        dataset["project_ids"].append(project_id)
+
+        for tracker_index in range(trackers_per_project):
+            short_name = tracker_short_name(project_index, tracker_index)
+            full_name = "Tracker {0}.{1}".format(project_index, tracker_index)
+            tracker_id = TrackerManagementInterface.create_tracker(
+                requested_by_user,
+                project_id,
+                short_name,
+                full_name,
+                "Description of tracker {0}".format(short_name))
+
+            if tracker_id is None:
+                raise RuntimeError("Failed to create tracker: {0}".format(short_name))
+
+            for revision in range(1, revisions_per_object):
+                TrackerManagementInterface.update_tracker_information(
+                    requested_by_user,
+                    tracker_id,
+                    short_name,
+                    full_name,
+                    "Description of tracker {0} ({1})".format(short_name, revision),
+                    True)
+
+            dataset["tracker_ids"].append(tracker_id)
+
+            for field_index in range(fields_per_tracker):
+                name = tracker_field_name(project_index, tracker_index, field_index)
+                display_name = "Field {0}".format(name)
+                tracker_field_id = TrackerFieldManagementInterface.create_tracker_field(
+                    requested_by_user,
+                    tracker_id,
+                    name,
+                    display_name,
+                    "Description of field {0}".format(name),
+                    "text",
+                    False)
+
+                if tracker_field_id is None:
+                    raise RuntimeError("Failed to create tracker field: {0}".format(name))
+
+                for revision in range(1, revisions_per_object):
+                    TrackerFieldManagementInterface.update_tracker_field_information(
+                        requested_by_user,
+                        tracker_field_id,
+                        name,
+                        display_name,
+                        "Description of field {0} ({1})".format(name, revision),
+                        "text",
+                        False,
+                        True)
+
+                dataset["tracker_field_ids"].append(tracker_field_id)
+
+    return dataset
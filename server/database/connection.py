@@ -41,10 +41,14 @@ class Connection(object):
         """
         raise NotImplementedError()
 
-    def begin_transaction(self) -> bool:
+    def begin_transaction(self, write=False) -> bool:
         """
         Begins a transaction
 
+        :param write:   Transaction writes to the database (the database is locked for writing at
+                        the start of the transaction so concurrent writers wait for each other
+                        instead of failing)
+
         :return:    Success or failure
         """
         raise NotImplementedError()
@@ -20,13 +20,31 @@ from database.tables.user import UserTable, UserSelection
 from database.tables.user_authentication import UserAuthenticationTable
 from database.tables.user_authentication_parameter import UserAuthenticationParameterTable
 from database.tables.session_token import SessionTokenTable
+from database.tables.session_token_revocation import SessionTokenRevocationTable
 from database.tables.revision import RevisionTable
+from database.tables.text_content import TextContentTable
 from database.tables.project import ProjectTable
 from database.tables.project_information import ProjectInformationTable
+from database.tables.project_current import ProjectCurrentTable
 from database.tables.tracker import TrackerTable
 from database.tables.tracker_field import TrackerFieldTable
 from database.tables.tracker_field_information import TrackerFieldInformationTable
+from database.tables.tracker_field_current import TrackerFieldCurrentTable
 from database.tables.tracker_information import TrackerInformationTable
+from database.tables.tracker_current import TrackerCurrentTable
+from database.tables.artifact import ArtifactTable
+from database.tables.artifact_information import ArtifactInformationTable
+from database.tables.artifact_field_value import ArtifactFieldValueTable
+from database.tables.artifact_report import ArtifactReportTable
+from database.tables.artifact_link import ArtifactLinkTable
+from database.tables.artifact_link_information import ArtifactLinkInformationTable
+from database.tables.artifact_link_closure import ArtifactLinkClosureTable
+from database.tables.artifact_comment import ArtifactCommentTable
+from database.tables.artifact_comment_information import ArtifactCommentInformationTable
+from database.tables.artifact_comment_current import ArtifactCommentCurrentTable
+from database.tables.attachment import AttachmentTable
+from database.tables.attachment_information import AttachmentInformationTable
+from database.tables.search_index import SearchIndexTable
 import datetime
 from typing import Optional
 
@@ -45,17 +63,41 @@ class Tables(object):
         self.user_authentication_parameter = UserAuthenticationParameterTable()
 
         self.session_token = SessionTokenTable()
+        self.session_token_revocation = SessionTokenRevocationTable()
 
         self.revision = RevisionTable()
 
+        self.text_content = TextContentTable()
+
         self.project = ProjectTable()
         self.project_information = ProjectInformationTable()
+        self.project_current = ProjectCurrentTable()
 
         self.tracker = TrackerTable()
         self.tracker_information = TrackerInformationTable()
+        self.tracker_current = TrackerCurrentTable()
 
         self.tracker_field = TrackerFieldTable()
         self.tracker_field_information = TrackerFieldInformationTable()
+        self.tracker_field_current = TrackerFieldCurrentTable()
+
+        self.artifact = ArtifactTable()
+        self.artifact_information = ArtifactInformationTable()
+        self.artifact_field_value = ArtifactFieldValueTable()
+        self.artifact_report = ArtifactReportTable()
+
+        self.artifact_link = ArtifactLinkTable()
+        self.artifact_link_information = ArtifactLinkInformationTable()
+        self.artifact_link_closure = ArtifactLinkClosureTable()
+
+        self.artifact_comment = ArtifactCommentTable()
+        self.artifact_comment_information = ArtifactCommentInformationTable()
+        self.artifact_comment_current = ArtifactCommentCurrentTable()
+
+        self.attachment = AttachmentTable()
+        self.attachment_information = AttachmentInformationTable()
+
+        self.search_index = SearchIndexTable()
 
 
 class Database(object):
@@ -112,7 +154,7 @@ class Database(object):
             connection = self.create_connection()
 
             try:
-                connection.begin_transaction()
+                connection.begin_transaction(write=True)
 
                 if success:
                     self.__create_all_tables(connection)
@@ -136,6 +178,14 @@ class Database(object):
 
         return success
 
+    def upgrade_database(self) -> bool:
+        """
+        Upgrades an existing database to the latest version of the database schema
+
+        :return:    Success or failure
+        """
+        raise NotImplementedError()
+
     def create_connection(self) -> Optional[Connection]:
         """
         Creates a new database connection
@@ -164,17 +214,49 @@ class Database(object):
         self.__tables.user_authentication_parameter.create(connection)
 
         self.__tables.session_token.create(connection)
+        self.__tables.session_token_revocation.create(connection)
 
         self.__tables.revision.create(connection)
 
+        # Text content must be created before the tables that reference it
+        self.__tables.text_content.create(connection)
+
         self.__tables.project.create(connection)
         self.__tables.project_information.create(connection)
+        self.__tables.project_current.create(connection)
 
         self.__tables.tracker.create(connection)
         self.__tables.tracker_information.create(connection)
+        self.__tables.tracker_current.create(connection)
 
         self.__tables.tracker_field.create(connection)
         self.__tables.tracker_field_information.create(connection)
+        self.__tables.tracker_field_current.create(connection)
+
+        self.__tables.artifact.create(connection)
+        self.__tables.artifact_information.create(connection)
+        self.__tables.artifact_field_value.create(connection)
+
+        # Artifact report must be created after all of the artifact tables
+        self.__tables.artifact_report.create(connection)
+
+        self.__tables.artifact_link.create(connection)
+        self.__tables.artifact_link_information.create(connection)
+
+        # Link closure must be created after the link tables and the artifact report
+        self.__tables.artifact_link_closure.create(connection)
+
+        self.__tables.artifact_comment.create(connection)
+        self.__tables.artifact_comment_information.create(connection)
+
+        # Current comments must be created after the comment tables
+        self.__tables.artifact_comment_current.create(connection)
+
+        self.__tables.attachment.create(connection)
+        self.__tables.attachment_information.create(connection)
+
+        # Search index must be created after all of the tables that it indexes
+        self.__tables.search_index.create(connection)
 
     def __create_default_system_users(self, connection: Connection) -> bool:
         """
@@ -333,6 +415,15 @@ class DatabaseInterface(object):
         """
         return DatabaseInterface.__database_object.create_new_database()
 
+    @staticmethod
+    def upgrade_database() -> bool:
+        """
+        Upgrades an existing database to the latest version of the database schema
+
+        :return:    Success or failure
+        """
+        return DatabaseInterface.__database_object.upgrade_database()
+
     @staticmethod
     def create_connection() -> Optional[Connection]:
         """
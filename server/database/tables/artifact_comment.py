@@ -0,0 +1,85 @@
+"""
+Salamander ALM
+Copyright (c) 2016  Djuro Drljaca
+
+This Python module is free software; you can redistribute it and/or modify it under the terms of the
+GNU General Public License as published by the Free Software Foundation; either version 2 of the
+License, or (at your option) any later version.
+
+This Python module is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License along with this library. If
+not, see <http://www.gnu.org/licenses/>.
+"""
+
+from database.connection import Connection
+from database.table import Table
+import datetime
+from typing import Optional
+
+
+class ArtifactCommentTable(Table):
+    """
+    Base class for "artifact_comment" table
+
+    Table's columns:
+
+    - id:           int
+    - artifact_id:  int, references artifact.id
+    - created_on:   datetime
+    - created_by:   int, references user.id
+
+    Text and state (active or inactive) of the comment in each revision are stored in the
+    "artifact_comment_information" table.
+    """
+
+    def __init__(self):
+        """
+        Constructor
+        """
+        Table.__init__(self)
+
+    def create(self, connection: Connection) -> None:
+        """
+        Creates the table
+
+        :param connection:  Database connection
+        """
+        raise NotImplementedError()
+
+    def read_comment(self, connection: Connection, comment_id: int) -> Optional[dict]:
+        """
+        Reads the comment from the database
+
+        :param connection:  Database connection
+        :param comment_id:  ID of the comment
+
+        :return:    Comment
+
+        Returned dictionary contains items:
+
+        - id
+        - artifact_id
+        - created_on
+        - created_by
+        """
+        raise NotImplementedError()
+
+    def insert_row(self,
+                   connection: Connection,
+                   artifact_id: int,
+                   created_on: datetime.datetime,
+                   created_by: int) -> Optional[int]:
+        """
+        Inserts a new row in the table
+
+        :param connection:  Database connection
+        :param artifact_id: ID of the artifact
+        :param created_on:  Timestamp when comment was created
+        :param created_by:  ID of the user that created the comment
+
+        :return:    ID of the newly created row
+        """
+        raise NotImplementedError()
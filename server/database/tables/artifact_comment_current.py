@@ -0,0 +1,92 @@
+"""
+Salamander ALM
+Copyright (c) 2016  Djuro Drljaca
+
+This Python module is free software; you can redistribute it and/or modify it under the terms of the
+GNU General Public License as published by the Free Software Foundation; either version 2 of the
+License, or (at your option) any later version.
+
+This Python module is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License along with this library. If
+not, see <http://www.gnu.org/licenses/>.
+"""
+
+from database.connection import Connection
+from database.table import Table
+from typing import List, Optional
+
+
+class ArtifactCommentCurrentTable(Table):
+    """
+    Base class for "artifact_comment_current" table
+
+    Table's columns:
+
+    - artifact_id:                      int, references artifact.id
+    - artifact_comment_id:              int, references artifact_comment.id
+    - artifact_comment_information_id:  int, references artifact_comment_information.id
+
+    Table contains the current version of each active comment, grouped by the artifact. It is
+    maintained by the database (rows are never written directly) so the comment thread of an
+    artifact can be read without searching the history of its comments.
+    """
+
+    def __init__(self):
+        """
+        Constructor
+        """
+        Table.__init__(self)
+
+    def create(self, connection: Connection) -> None:
+        """
+        Creates the table
+
+        :param connection:  Database connection
+
+        NOTE:   Table must be created after the "artifact_comment" and
+                "artifact_comment_information" tables!
+        """
+        raise NotImplementedError()
+
+    def read_comments(self,
+                      connection: Connection,
+                      artifact_id: int,
+                      before_comment_id: Optional[int],
+                      limit: int) -> List[dict]:
+        """
+        Reads the current version of the active comments of the artifact, newest first
+
+        :param connection:          Database connection
+        :param artifact_id:         ID of the artifact
+        :param before_comment_id:   Only comments with a smaller ID are returned ("None" to start
+                                    with the newest comment)
+        :param limit:               Max number of returned comments
+
+        :return:    Comments ordered by their ID (descending)
+
+        Each dictionary in the returned list contains items:
+
+        - id
+        - artifact_id
+        - created_on
+        - created_by
+        - text
+        - revision_id
+        - modified_on
+        - modified_by
+        """
+        raise NotImplementedError()
+
+    def read_comment_count(self, connection: Connection, artifact_id: int) -> int:
+        """
+        Reads the number of active comments of the artifact
+
+        :param connection:  Database connection
+        :param artifact_id: ID of the artifact
+
+        :return:    Number of comments
+        """
+        raise NotImplementedError()
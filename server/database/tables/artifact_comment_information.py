@@ -0,0 +1,115 @@
+"""
+Salamander ALM
+Copyright (c) 2016  Djuro Drljaca
+
+This Python module is free software; you can redistribute it and/or modify it under the terms of the
+GNU General Public License as published by the Free Software Foundation; either version 2 of the
+License, or (at your option) any later version.
+
+This Python module is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License along with this library. If
+not, see <http://www.gnu.org/licenses/>.
+"""
+
+from database.connection import Connection
+from database.table import Table
+from typing import List, Optional
+
+
+class ArtifactCommentInformationTable(Table):
+    """
+    Base class for "artifact_comment_information" table
+
+    Table's columns:
+
+    - id:                   int
+    - artifact_comment_id:  int, references artifact_comment.id
+    - text:                 str
+    - active:               bool
+    - revision_id:          int, references revision.id
+
+    Rows are never modified, each edit of a comment adds a new row so all versions of the comment
+    remain available.
+    """
+
+    def __init__(self):
+        """
+        Constructor
+        """
+        Table.__init__(self)
+
+    def create(self, connection: Connection) -> None:
+        """
+        Creates the table
+
+        :param connection:  Database connection
+        """
+        raise NotImplementedError()
+
+    def read_information(self,
+                         connection: Connection,
+                         artifact_comment_id: int,
+                         max_revision_id: int) -> Optional[dict]:
+        """
+        Reads comment information for the specified comment and max revision
+
+        :param connection:          Database connection
+        :param artifact_comment_id: ID of the comment
+        :param max_revision_id:     Maximum revision ID for the search
+
+        :return:    Comment information
+
+        Returned dictionary contains items:
+
+        - id
+        - artifact_comment_id
+        - text
+        - active
+        - revision_id
+        - modified_on
+        - modified_by
+        """
+        raise NotImplementedError()
+
+    def read_history(self, connection: Connection, artifact_comment_id: int) -> List[dict]:
+        """
+        Reads all versions of the comment
+
+        :param connection:          Database connection
+        :param artifact_comment_id: ID of the comment
+
+        :return:    Comment information ordered from the original to the latest version
+
+        Each dictionary in the returned list contains items:
+
+        - id
+        - artifact_comment_id
+        - text
+        - active
+        - revision_id
+        - modified_on
+        - modified_by
+        """
+        raise NotImplementedError()
+
+    def insert_row(self,
+                   connection: Connection,
+                   artifact_comment_id: int,
+                   text: str,
+                   active: bool,
+                   revision_id: int) -> Optional[int]:
+        """
+        Inserts a new row in the table
+
+        :param connection:          Database connection
+        :param artifact_comment_id: ID of the comment
+        :param text:                Text of the comment
+        :param active:              State of the comment (active or inactive)
+        :param revision_id:         Revision ID
+
+        :return:    ID of the newly created row
+        """
+        raise NotImplementedError()
@@ -0,0 +1,84 @@
+"""
+Salamander ALM
+Copyright (c) 2016  Djuro Drljaca
+
+This Python module is free software; you can redistribute it and/or modify it under the terms of the
+GNU General Public License as published by the Free Software Foundation; either version 2 of the
+License, or (at your option) any later version.
+
+This Python module is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License along with this library. If
+not, see <http://www.gnu.org/licenses/>.
+"""
+
+from database.connection import Connection
+from database.table import Table
+from typing import Optional
+
+
+class ArtifactFieldValueTable(Table):
+    """
+    Base class for "artifact_field_value" table
+
+    Table's columns:
+
+    - id:                       int
+    - artifact_information_id:  int, references artifact_information.id
+    - tracker_field_id:         int, references tracker_field.id
+    - value:                    Any
+
+    Field values are grouped per artifact revision: each "artifact_information" row owns the
+    complete set of custom field values of the artifact in that revision.
+    """
+
+    def __init__(self):
+        """
+        Constructor
+        """
+        Table.__init__(self)
+
+    def create(self, connection: Connection) -> None:
+        """
+        Creates the table
+
+        :param connection:  Database connection
+        """
+        raise NotImplementedError()
+
+    def read_field_values(self,
+                          connection: Connection,
+                          artifact_information_id: int) -> Optional[dict]:
+        """
+        Reads all field values of the specified artifact information
+
+        :param connection:              Database connection
+        :param artifact_information_id: ID of the artifact information
+
+        :return:    Field values
+
+        Returned dictionary contains the field values of the artifact (key is the tracker field ID).
+
+        Example of a returned dictionary:
+
+        {1: "Title of the artifact",
+         2: 42}
+        """
+        raise NotImplementedError()
+
+    def insert_rows(self,
+                    connection: Connection,
+                    artifact_information_id: int,
+                    field_values: dict) -> bool:
+        """
+        Inserts new rows in the table
+
+        :param connection:              Database connection
+        :param artifact_information_id: ID of the artifact information
+        :param field_values:            Field values (key is the tracker field ID)
+
+        :return:    Success or failure
+        """
+        raise NotImplementedError()
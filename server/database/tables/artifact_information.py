@@ -95,6 +95,61 @@ class ArtifactInformationTable(Table):
         """
         raise NotImplementedError()
 
+    def read_information_by_artifact_ids(self,
+                                         connection: Connection,
+                                         artifact_ids: List[int],
+                                         max_revision_id: int) -> List[dict]:
+        """
+        Reads artifact information for all of the specified artifacts and max revision
+
+        :param connection:      Database connection
+        :param artifact_ids:    List of artifact IDs
+        :param max_revision_id: Maximum revision ID for the search
+
+        :return:    Artifact information of all artifacts that were found (in the same order as in
+                    the list of artifact IDs)
+
+        Each dictionary in the returned list contains items:
+
+        - id
+        - artifact_id
+        - locked
+        - active
+        - revision_id
+        """
+        raise NotImplementedError()
+
+    def read_artifact(self,
+                      connection: Connection,
+                      artifact_id: int,
+                      max_revision_id: int) -> Optional[dict]:
+        """
+        Reads the complete artifact (fixed and custom fields) for the specified artifact and max
+        revision
+
+        :param connection:      Database connection
+        :param artifact_id:     Artifact ID
+        :param max_revision_id: Maximum revision ID for the search
+
+        :return:    Artifact
+
+        Returned dictionary contains items:
+
+        - artifact_id
+        - tracker_id
+        - created_on
+        - created_by
+        - artifact_information_id
+        - locked
+        - active
+        - revision_id
+        - fields
+
+        Item "fields" contains a dictionary with field values of the artifact (key is the tracker
+        field ID).
+        """
+        raise NotImplementedError()
+
     def insert_row(self,
                    connection: Connection,
                    artifact_id: int,
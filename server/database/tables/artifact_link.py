@@ -0,0 +1,104 @@
+"""
+Salamander ALM
+Copyright (c) 2016  Djuro Drljaca
+
+This Python module is free software; you can redistribute it and/or modify it under the terms of the
+GNU General Public License as published by the Free Software Foundation; either version 2 of the
+License, or (at your option) any later version.
+
+This Python module is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License along with this library. If
+not, see <http://www.gnu.org/licenses/>.
+"""
+
+from database.connection import Connection
+from database.table import Table
+import enum
+from typing import Optional
+
+
+class LinkDirection(enum.Enum):
+    """
+    Direction of links between artifacts
+    """
+    Downstream = 1      # From the source artifact to the target artifacts
+    Upstream = 2        # From the target artifact to the source artifacts
+
+
+class ArtifactLinkTable(Table):
+    """
+    Base class for "artifact_link" table
+
+    Table's columns:
+
+    - id:                   int
+    - source_artifact_id:   int, references artifact.id
+    - target_artifact_id:   int, references artifact.id
+
+    There is at most one link between the same source and target artifact, its state (active or
+    inactive) in each revision is stored in the "artifact_link_information" table.
+    """
+
+    def __init__(self):
+        """
+        Constructor
+        """
+        Table.__init__(self)
+
+    def create(self, connection: Connection) -> None:
+        """
+        Creates the table
+
+        :param connection:  Database connection
+        """
+        raise NotImplementedError()
+
+    def read_link(self, connection: Connection, link_id: int) -> Optional[dict]:
+        """
+        Reads the link from the database
+
+        :param connection:  Database connection
+        :param link_id:     ID of the link
+
+        :return:    Link
+
+        Returned dictionary contains items:
+
+        - id
+        - source_artifact_id
+        - target_artifact_id
+        """
+        raise NotImplementedError()
+
+    def read_link_id(self,
+                     connection: Connection,
+                     source_artifact_id: int,
+                     target_artifact_id: int) -> Optional[int]:
+        """
+        Reads the ID of the link between the specified artifacts
+
+        :param connection:          Database connection
+        :param source_artifact_id:  ID of the source artifact
+        :param target_artifact_id:  ID of the target artifact
+
+        :return:    Link ID
+        """
+        raise NotImplementedError()
+
+    def insert_row(self,
+                   connection: Connection,
+                   source_artifact_id: int,
+                   target_artifact_id: int) -> Optional[int]:
+        """
+        Inserts a new row in the table
+
+        :param connection:          Database connection
+        :param source_artifact_id:  ID of the source artifact
+        :param target_artifact_id:  ID of the target artifact
+
+        :return:    ID of the newly created row
+        """
+        raise NotImplementedError()
@@ -0,0 +1,125 @@
+"""
+Salamander ALM
+Copyright (c) 2016  Djuro Drljaca
+
+This Python module is free software; you can redistribute it and/or modify it under the terms of the
+GNU General Public License as published by the Free Software Foundation; either version 2 of the
+License, or (at your option) any later version.
+
+This Python module is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License along with this library. If
+not, see <http://www.gnu.org/licenses/>.
+"""
+
+from database.connection import Connection
+from database.table import Table
+from database.tables.artifact_link import LinkDirection
+from typing import List, Optional
+
+
+class ArtifactLinkClosureTable(Table):
+    """
+    Base class for "artifact_link_closure" table
+
+    Table's columns:
+
+    - ancestor_artifact_id:     int, references artifact.id
+    - descendant_artifact_id:   int, references artifact.id
+    - path_count:               int, number of different paths from the ancestor to the descendant
+
+    The table contains the transitive closure of the active links (in the current revision), so
+    the artifacts that are reachable from an artifact are found with a single index seek. It is kept
+    up to date by the database itself whenever the state of a link changes.
+
+    NOTE:   Links must not form a cycle!
+    """
+
+    def __init__(self):
+        """
+        Constructor
+        """
+        Table.__init__(self)
+
+    def create(self, connection: Connection) -> None:
+        """
+        Creates the table
+
+        :param connection:  Database connection
+
+        NOTE:   This table must be created after the link tables and the artifact report table!
+        """
+        raise NotImplementedError()
+
+    def is_reachable(self,
+                     connection: Connection,
+                     source_artifact_id: int,
+                     target_artifact_id: int) -> bool:
+        """
+        Checks if there is a path of active links from the source to the target artifact
+
+        :param connection:          Database connection
+        :param source_artifact_id:  ID of the source artifact
+        :param target_artifact_id:  ID of the target artifact
+
+        :return:    True if the target artifact is reachable from the source artifact
+        """
+        raise NotImplementedError()
+
+    def read_reachable_artifact_ids(self,
+                                    connection: Connection,
+                                    artifact_id: int,
+                                    direction: LinkDirection,
+                                    tracker_id: Optional[int]) -> List[int]:
+        """
+        Reads IDs of all active artifacts that are reachable from the specified artifact
+
+        :param connection:  Database connection
+        :param artifact_id: ID of the artifact
+        :param direction:   Follow the links downstream or upstream
+        :param tracker_id:  Only artifacts of this tracker are returned ("None" for all trackers)
+
+        :return:    List of artifact IDs (in ascending order)
+        """
+        raise NotImplementedError()
+
+    def read_next_artifact_id(self,
+                              connection: Connection,
+                              artifact_id: int,
+                              target_artifact_id: int) -> Optional[int]:
+        """
+        Reads the ID of an artifact that is directly linked from the specified artifact and that
+        is on a path to the target artifact
+
+        :param connection:          Database connection
+        :param artifact_id:         ID of the artifact
+        :param target_artifact_id:  ID of the target artifact
+
+        :return:    Artifact ID ("None" if the target is not reachable)
+        """
+        raise NotImplementedError()
+
+    def read_coverage(self,
+                      connection: Connection,
+                      tracker_id: int,
+                      covering_tracker_id: int,
+                      direction: LinkDirection) -> List[dict]:
+        """
+        Reads all pairs of active artifacts of the tracker and the reachable active artifacts of
+        the covering tracker
+
+        :param connection:          Database connection
+        :param tracker_id:          ID of the tracker
+        :param covering_tracker_id: ID of the covering tracker
+        :param direction:           Follow the links downstream or upstream
+
+        :return:    Artifact pairs ordered by the artifact IDs
+
+        Each dictionary in the returned list contains items:
+
+        - artifact_id
+        - covering_artifact_id ("None" if the artifact is not covered)
+        """
+        raise NotImplementedError()
@@ -0,0 +1,142 @@
+"""
+Salamander ALM
+Copyright (c) 2016  Djuro Drljaca
+
+This Python module is free software; you can redistribute it and/or modify it under the terms of the
+GNU General Public License as published by the Free Software Foundation; either version 2 of the
+License, or (at your option) any later version.
+
+This Python module is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License along with this library. If
+not, see <http://www.gnu.org/licenses/>.
+"""
+
+from database.connection import Connection
+from database.table import Table
+from database.tables.artifact_link import LinkDirection
+from typing import List, Optional
+
+
+class ArtifactLinkInformationTable(Table):
+    """
+    Base class for "artifact_link_information" table
+
+    Table's columns:
+
+    - id:               int
+    - artifact_link_id: int, references artifact_link.id
+    - active:           bool
+    - revision_id:      int, references revision.id
+    """
+
+    def __init__(self):
+        """
+        Constructor
+        """
+        Table.__init__(self)
+
+    def create(self, connection: Connection) -> None:
+        """
+        Creates the table
+
+        :param connection:  Database connection
+        """
+        raise NotImplementedError()
+
+    def read_information(self,
+                         connection: Connection,
+                         artifact_link_id: int,
+                         max_revision_id: int) -> Optional[dict]:
+        """
+        Reads link information for the specified link and max revision
+
+        :param connection:          Database connection
+        :param artifact_link_id:    ID of the link
+        :param max_revision_id:     Maximum revision ID for the search
+
+        :return:    Link information
+
+        Returned dictionary contains items:
+
+        - id
+        - artifact_link_id
+        - active
+        - revision_id
+        """
+        raise NotImplementedError()
+
+    def read_links(self,
+                   connection: Connection,
+                   artifact_id: int,
+                   direction: LinkDirection,
+                   max_revision_id: int) -> List[dict]:
+        """
+        Reads all active links of the specified artifact
+
+        :param connection:      Database connection
+        :param artifact_id:     ID of the artifact
+        :param direction:       Read links to the target artifacts (downstream) or links from the
+                                source artifacts (upstream)
+        :param max_revision_id: Maximum revision ID for the search
+
+        :return:    Links ordered by the ID of the linked artifact
+
+        Each dictionary in the returned list contains items:
+
+        - id
+        - source_artifact_id
+        - target_artifact_id
+        - revision_id
+        """
+        raise NotImplementedError()
+
+    def read_tracker_links(self,
+                           connection: Connection,
+                           tracker_id: int,
+                           linked_tracker_id: int,
+                           direction: LinkDirection,
+                           after_artifact_id: int,
+                           artifact_count: int,
+                           max_revision_id: int) -> List[dict]:
+        """
+        Reads the active links between the active artifacts of the tracker and the active artifacts
+        of the linked tracker
+
+        :param connection:          Database connection
+        :param tracker_id:          ID of the tracker
+        :param linked_tracker_id:   ID of the linked tracker
+        :param direction:           Read links to the target artifacts (downstream) or links from
+                                    the source artifacts (upstream)
+        :param after_artifact_id:   Only artifacts with a greater ID are returned (for pagination)
+        :param artifact_count:      Max number of artifacts of the tracker that are returned
+        :param max_revision_id:     Maximum revision ID for the search
+
+        :return:    Links ordered by the artifact ID and the linked artifact ID
+
+        Each dictionary in the returned list contains items:
+
+        - artifact_id
+        - linked_artifact_id ("None" if the artifact has no links)
+        - link_id ("None" if the artifact has no links)
+        """
+        raise NotImplementedError()
+
+    def insert_row(self,
+                   connection: Connection,
+                   artifact_link_id: int,
+                   active: bool,
+                   revision_id: int) -> Optional[int]:
+        """
+        Inserts a new row in the table
+
+        :param connection:          Database connection
+        :param artifact_link_id:    ID of the link
+        :param active:              State of the link (active or inactive)
+        :param revision_id:         Revision ID
+
+        :return:    ID of the newly created row
+        """
+        raise NotImplementedError()
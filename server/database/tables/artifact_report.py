@@ -0,0 +1,177 @@
+"""
+Salamander ALM
+Copyright (c) 2016  Djuro Drljaca
+
+This Python module is free software; you can redistribute it and/or modify it under the terms of the
+GNU General Public License as published by the Free Software Foundation; either version 2 of the
+License, or (at your option) any later version.
+
+This Python module is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License along with this library. If
+not, see <http://www.gnu.org/licenses/>.
+"""
+
+from database.connection import Connection
+from database.table import Table
+import enum
+from typing import Any, List, Optional
+
+
+class ComparisonOperator(enum.Enum):
+    """
+    Comparison operator in a report filter
+    """
+    Equal = "="
+    NotEqual = "!="
+    Less = "<"
+    LessOrEqual = "<="
+    Greater = ">"
+    GreaterOrEqual = ">="
+
+
+class ReportFilter(object):
+    """
+    Base class for a node of a compiled report filter
+    """
+    pass
+
+
+class ReportFilterComparison(ReportFilter):
+    """
+    Comparison of a tracker field value with a constant value
+    """
+
+    def __init__(self, tracker_field_id: int, operator: ComparisonOperator, value: Any):
+        """
+        Constructor
+
+        :param tracker_field_id:    ID of the tracker field
+        :param operator:            Comparison operator
+        :param value:               Value to compare with (int, float, bool or str)
+        """
+        self.tracker_field_id = tracker_field_id
+        self.operator = operator
+        self.value = value
+
+
+class ReportFilterAnd(ReportFilter):
+    """
+    Logical conjunction of report filters
+    """
+
+    def __init__(self, operands: List[ReportFilter]):
+        """
+        Constructor
+
+        :param operands:    Report filters that all have to match
+        """
+        self.operands = operands
+
+
+class ReportFilterOr(ReportFilter):
+    """
+    Logical disjunction of report filters
+    """
+
+    def __init__(self, operands: List[ReportFilter]):
+        """
+        Constructor
+
+        :param operands:    Report filters where at least one has to match
+        """
+        self.operands = operands
+
+
+class ReportFilterNot(ReportFilter):
+    """
+    Logical negation of a report filter
+    """
+
+    def __init__(self, operand: ReportFilter):
+        """
+        Constructor
+
+        :param operand: Report filter that must not match
+        """
+        self.operand = operand
+
+
+class ArtifactReportTable(Table):
+    """
+    Base class for "artifact_report" table
+
+    The table contains the current (latest) state of all artifacts and their field values in a form
+    that is suitable for filtering:
+
+    - one row per artifact with its tracker, latest artifact information and its state
+    - one row per field value of the latest artifact information where the value is stored in a
+      column of its own type (number or text) so that comparisons can be answered with index seeks
+
+    The table is kept up to date by the database itself whenever a new row is inserted in the
+    "artifact_information" or "artifact_field_value" table.
+    """
+
+    def __init__(self):
+        """
+        Constructor
+        """
+        Table.__init__(self)
+
+    def create(self, connection: Connection) -> None:
+        """
+        Creates the table
+
+        :param connection:  Database connection
+
+        NOTE:   This table must be created after all of the artifact tables!
+        """
+        raise NotImplementedError()
+
+    def read_artifact_ids(self,
+                          connection: Connection,
+                          tracker_id: int,
+                          report_filter: Optional[ReportFilter],
+                          after_artifact_id: int,
+                          limit: int) -> List[int]:
+        """
+        Reads IDs of active artifacts of the specified tracker that match the report filter
+
+        :param connection:          Database connection
+        :param tracker_id:          ID of the tracker
+        :param report_filter:       Report filter ("None" to match all artifacts)
+        :param after_artifact_id:   Only artifacts with a greater ID are returned (for pagination)
+        :param limit:               Max number of returned artifact IDs
+
+        :return:    List of artifact IDs (in ascending order)
+
+        Comparison only matches field values of the same type as the compared value (numbers are
+        compared with numbers and text with text) and a negated filter also matches artifacts that
+        don't have a value for the field.
+        """
+        raise NotImplementedError()
+
+    def read_artifacts(self, connection: Connection, artifact_ids: List[int]) -> List[dict]:
+        """
+        Reads the current state of the specified artifacts together with their field values
+
+        :param connection:      Database connection
+        :param artifact_ids:    List of artifact IDs
+
+        :return:    Artifacts that were found (in the same order as in the list of artifact IDs)
+
+        Each dictionary in the returned list contains items:
+
+        - artifact_id
+        - tracker_id
+        - locked
+        - active
+        - revision_id
+        - fields
+
+        Item "fields" contains a dictionary with field values of the artifact (key is the tracker
+        field ID).
+        """
+        raise NotImplementedError()
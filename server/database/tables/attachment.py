@@ -0,0 +1,85 @@
+"""
+Salamander ALM
+Copyright (c) 2016  Djuro Drljaca
+
+This Python module is free software; you can redistribute it and/or modify it under the terms of the
+GNU General Public License as published by the Free Software Foundation; either version 2 of the
+License, or (at your option) any later version.
+
+This Python module is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License along with this library. If
+not, see <http://www.gnu.org/licenses/>.
+"""
+
+from database.connection import Connection
+from database.table import Table
+import datetime
+from typing import Optional
+
+
+class AttachmentTable(Table):
+    """
+    Base class for "attachment" table
+
+    Table's columns:
+
+    - id:           int
+    - artifact_id:  int, references artifact.id
+    - created_on:   datetime
+    - created_by:   int, references user.id
+
+    Content of the attachment is not stored in the database, its file name, content hash and state
+    (active or inactive) in each revision are stored in the "attachment_information" table.
+    """
+
+    def __init__(self):
+        """
+        Constructor
+        """
+        Table.__init__(self)
+
+    def create(self, connection: Connection) -> None:
+        """
+        Creates the table
+
+        :param connection:  Database connection
+        """
+        raise NotImplementedError()
+
+    def read_attachment(self, connection: Connection, attachment_id: int) -> Optional[dict]:
+        """
+        Reads the attachment from the database
+
+        :param connection:      Database connection
+        :param attachment_id:   ID of the attachment
+
+        :return:    Attachment
+
+        Returned dictionary contains items:
+
+        - id
+        - artifact_id
+        - created_on
+        - created_by
+        """
+        raise NotImplementedError()
+
+    def insert_row(self,
+                   connection: Connection,
+                   artifact_id: int,
+                   created_on: datetime.datetime,
+                   created_by: int) -> Optional[int]:
+        """
+        Inserts a new row in the table
+
+        :param connection:  Database connection
+        :param artifact_id: ID of the artifact
+        :param created_on:  Timestamp when attachment was created
+        :param created_by:  ID of the user that created the attachment
+
+        :return:    ID of the newly created row
+        """
+        raise NotImplementedError()
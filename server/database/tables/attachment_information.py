@@ -0,0 +1,122 @@
+"""
+Salamander ALM
+Copyright (c) 2016  Djuro Drljaca
+
+This Python module is free software; you can redistribute it and/or modify it under the terms of the
+GNU General Public License as published by the Free Software Foundation; either version 2 of the
+License, or (at your option) any later version.
+
+This Python module is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License along with this library. If
+not, see <http://www.gnu.org/licenses/>.
+"""
+
+from database.connection import Connection
+from database.table import Table
+from typing import List, Optional
+
+
+class AttachmentInformationTable(Table):
+    """
+    Base class for "attachment_information" table
+
+    Table's columns:
+
+    - id:               int
+    - attachment_id:    int, references attachment.id
+    - file_name:        str
+    - content_hash:     str (SHA-256 of the content, hex encoded)
+    - size:             int
+    - active:           bool
+    - revision_id:      int, references revision.id
+    """
+
+    def __init__(self):
+        """
+        Constructor
+        """
+        Table.__init__(self)
+
+    def create(self, connection: Connection) -> None:
+        """
+        Creates the table
+
+        :param connection:  Database connection
+        """
+        raise NotImplementedError()
+
+    def read_information(self,
+                         connection: Connection,
+                         attachment_id: int,
+                         max_revision_id: int) -> Optional[dict]:
+        """
+        Reads attachment information for the specified attachment and max revision
+
+        :param connection:      Database connection
+        :param attachment_id:   ID of the attachment
+        :param max_revision_id: Maximum revision ID for the search
+
+        :return:    Attachment information
+
+        Returned dictionary contains items:
+
+        - id
+        - attachment_id
+        - file_name
+        - content_hash
+        - size
+        - active
+        - revision_id
+        """
+        raise NotImplementedError()
+
+    def read_attachments(self,
+                         connection: Connection,
+                         artifact_id: int,
+                         max_revision_id: int) -> List[dict]:
+        """
+        Reads information of all active attachments of the artifact in the specified revision
+
+        :param connection:      Database connection
+        :param artifact_id:     ID of the artifact
+        :param max_revision_id: Maximum revision ID for the search
+
+        :return:    Attachment information ordered by the attachment ID
+
+        Each dictionary in the returned list contains items:
+
+        - id
+        - attachment_id
+        - file_name
+        - content_hash
+        - size
+        - active
+        - revision_id
+        """
+        raise NotImplementedError()
+
+    def insert_row(self,
+                   connection: Connection,
+                   attachment_id: int,
+                   file_name: str,
+                   content_hash: str,
+                   size: int,
+                   active: bool,
+                   revision_id: int) -> Optional[int]:
+        """
+        Inserts a new row in the table
+
+        :param connection:      Database connection
+        :param attachment_id:   ID of the attachment
+        :param file_name:       File name of the attachment
+        :param content_hash:    SHA-256 of the content (hex encoded)
+        :param size:            Size of the content (in bytes)
+        :param active:          State of the attachment (active or inactive)
+        :param revision_id:     Revision ID
+
+        :return:    ID of the newly created row
+        """
+        raise NotImplementedError()
@@ -17,7 +17,7 @@ not, see <http://www.gnu.org/licenses/>.
 from database.connection import Connection
 from database.table import Table
 import enum
-from typing import Any, List, Optional
+from typing import Any, Dict, List, Optional
 
 
 class ProjectSelection(enum.Enum):
@@ -35,13 +35,16 @@ class ProjectInformationTable(Table):
 
     Table's columns:
 
-    - id:           int
-    - project_id:   int, references project.id
-    - short_name:   str
-    - full_name:    str
-    - description:  Optional[str]
-    - active:       bool
-    - revision_id:  int, references revision.id
+    - id:               int
+    - project_id:       int, references project.id
+    - short_name:       Optional[str]
+    - full_name:        Optional[str]
+    - description_id:   Optional[int], references text_content.id
+    - active:           bool
+    - revision_id:      int, references revision.id
+
+    Rows that only change the state of the project (see "insert_state_row") contain only the
+    "active" attribute, all of the other attributes of the project are left unchanged.
     """
 
     def __init__(self):
@@ -115,18 +118,84 @@ class ProjectInformationTable(Table):
                    full_name: str,
                    description: str,
                    active: bool,
-                   revision_id: int) -> Optional[int]:
+                   revision_id: int,
+                   expected_revision_id: Optional[int] = None) -> Optional[int]:
         """
         Inserts a new row in the table
 
+        :param connection:           Database connection
+        :param project_id:           ID of the project
+        :param short_name:           Project short name
+        :param full_name:            Project full name
+        :param description:          Project description
+        :param active:               State of the project (active or inactive)
+        :param revision_id:          Revision ID
+        :param expected_revision_id: Expected revision ID of the latest row (optional)
+
+        :return:    ID of the newly created row
+
+        NOTE:   If the expected revision ID is specified the row is inserted only if the latest
+                row of the project is still from the expected revision!
+        """
+        raise NotImplementedError()
+
+    def insert_state_row(self,
+                         connection: Connection,
+                         project_id: int,
+                         active: bool,
+                         revision_id: int) -> Optional[int]:
+        """
+        Inserts a new row in the table that only changes the state of the project (all of the other
+        attributes of the project are unchanged)
+
         :param connection:  Database connection
         :param project_id:  ID of the project
-        :param short_name:  Project short name
-        :param full_name:   Project full name
-        :param description: Project description
-        :param active:      State of the project (active or inactive)
+        :param active:      New state of the project (active or inactive)
         :param revision_id: Revision ID
 
         :return:    ID of the newly created row
+
+        NOTE:   The row is inserted only if the project exists and its latest state is different
+                from the new state!
+        """
+        raise NotImplementedError()
+
+    def read_states(self,
+                    connection: Connection,
+                    project_ids: List[int],
+                    max_revision_id: int) -> Dict[int, bool]:
+        """
+        Reads the latest state of all of the specified projects for the max revision
+
+        :param connection:      Database connection
+        :param project_ids:     List of project IDs
+        :param max_revision_id: Maximum revision ID for the search
+
+        :return:    State (active or inactive) of each of the projects that were found (key is the
+                    project ID)
+        """
+        raise NotImplementedError()
+
+    def insert_state_rows(self,
+                          connection: Connection,
+                          project_ids: List[int],
+                          active: bool,
+                          revision_id: int) -> List[int]:
+        """
+        Inserts new rows in the table that only change the state of the projects (all of the other
+        attributes of the projects are unchanged)
+
+        :param connection:      Database connection
+        :param project_ids:     List of project IDs
+        :param active:          New state of the projects (active or inactive)
+        :param revision_id:     Revision ID
+
+        :return:    IDs of the projects whose rows were inserted
+
+        NOTE:   Unlike "insert_state_row" this does not check the existence or the latest state of
+                the projects!
+
+        NOTE:   Rows that violate a constraint (for example names that are already used by an
+                active project) are not inserted, the other rows are still inserted!
         """
         raise NotImplementedError()
@@ -0,0 +1,88 @@
+"""
+Salamander ALM
+Copyright (c) 2016  Djuro Drljaca
+
+This Python module is free software; you can redistribute it and/or modify it under the terms of the
+GNU General Public License as published by the Free Software Foundation; either version 2 of the
+License, or (at your option) any later version.
+
+This Python module is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License along with this library. If
+not, see <http://www.gnu.org/licenses/>.
+"""
+
+from database.connection import Connection
+from database.table import Table
+import enum
+from typing import List, Optional
+
+
+class SearchObjectType(enum.Enum):
+    """
+    Type of an object in the search index
+    """
+    Project = "project"
+    Tracker = "tracker"
+    TrackerField = "tracker_field"
+    Artifact = "artifact"
+
+
+class SearchIndexTable(Table):
+    """
+    Base class for "search_index" table
+
+    The search index contains the text of the current (latest) revision of all active projects,
+    trackers, tracker fields and artifacts:
+
+    - title:    names of the object (short and full name, or name and display name)
+    - body:     description of the object (or text field values in case of an artifact)
+
+    The index is kept up to date by the database itself whenever a new row is inserted in one of
+    the "*_information" tables (or "artifact_field_value" table).
+    """
+
+    def __init__(self):
+        """
+        Constructor
+        """
+        Table.__init__(self)
+
+    def create(self, connection: Connection) -> None:
+        """
+        Creates the table
+
+        :param connection:  Database connection
+
+        NOTE:   This table must be created after all of the tables that it indexes!
+        """
+        raise NotImplementedError()
+
+    def search(self,
+               connection: Connection,
+               keywords: List[str],
+               object_types: Optional[List[SearchObjectType]],
+               limit: int,
+               offset: int) -> List[dict]:
+        """
+        Searches the index for objects that contain all of the keywords
+
+        :param connection:      Database connection
+        :param keywords:        Keywords to search for (each keyword matches as a prefix of a word)
+        :param object_types:    Object types to search for ("None" for all object types)
+        :param limit:           Max number of returned results
+        :param offset:          Number of results to skip
+
+        :return:    Search results ordered by relevance (best match first)
+
+        Each dictionary in the returned list contains items:
+
+        - object_type
+        - object_id
+        - title
+        - snippet
+        - rank
+        """
+        raise NotImplementedError()
@@ -29,6 +29,8 @@ class SessionTokenTable(Table):
     - id:           int
     - user_id:      int, references user.id
     - created_on:   datetime
+    - expires_on:   datetime
+    - last_used_on: datetime
     - token:        str
     """
 
@@ -60,6 +62,8 @@ class SessionTokenTable(Table):
         - id
         - user_id
         - created_on
+        - expires_on
+        - last_used_on
         - token
         """
         raise NotImplementedError()
@@ -68,6 +72,7 @@ class SessionTokenTable(Table):
                    connection: Connection,
                    user_id: int,
                    created_on: datetime.datetime,
+                   expires_on: datetime.datetime,
                    token: str) -> Optional[int]:
         """
         Inserts a new row in the table
@@ -75,9 +80,26 @@ class SessionTokenTable(Table):
         :param connection:  Database connection
         :param user_id:     ID of the user
         :param created_on:  Timestamp when the token was created
+        :param expires_on:  Timestamp when the token expires
         :param token:       Session token
 
         :return:    ID of the newly created row
+
+        NOTE:   Token's "last used on" timestamp is initialized to the "created on" timestamp.
+        """
+        raise NotImplementedError()
+
+    def update_last_used_on(self, connection: Connection, last_used_on: dict) -> bool:
+        """
+        Updates the "last used on" timestamps of the specified tokens
+
+        :param connection:      Database connection
+        :param last_used_on:    Timestamps of the last use (key is the session token)
+
+        :return:    Success or failure
+
+        NOTE:   Timestamp of a token is updated only if it is newer than the stored one. Nothing is
+                updated if the database is currently locked by another writer!
         """
         raise NotImplementedError()
 
@@ -115,3 +137,21 @@ class SessionTokenTable(Table):
         :param timestamp:   Timestamp
         """
         raise NotImplementedError()
+
+    def delete_expired_rows(self,
+                            connection: Connection,
+                            timestamp: datetime.datetime,
+                            idle_timestamp: Optional[datetime.datetime],
+                            max_row_count: int) -> int:
+        """
+        Removes the rows of the tokens that have expired or were idle for too long
+
+        :param connection:      Database connection
+        :param timestamp:       Tokens that expire before this timestamp are removed
+        :param idle_timestamp:  Tokens that were last used before this timestamp are removed
+                                ("None" to disable the idle timeout)
+        :param max_row_count:   Max number of rows to remove
+
+        :return:    Number of removed rows
+        """
+        raise NotImplementedError()
@@ -0,0 +1,120 @@
+"""
+Salamander ALM
+Copyright (c) 2016  Djuro Drljaca
+
+This Python module is free software; you can redistribute it and/or modify it under the terms of the
+GNU General Public License as published by the Free Software Foundation; either version 2 of the
+License, or (at your option) any later version.
+
+This Python module is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License along with this library. If
+not, see <http://www.gnu.org/licenses/>.
+"""
+
+from database.connection import Connection
+from database.table import Table
+import datetime
+from typing import List, Optional
+
+
+class SessionTokenRevocationTable(Table):
+    """
+    Base class for "session_token_revocation" table
+
+    Table's columns:
+
+    - id:           int
+    - user_id:      int, references user.id
+    - token_id:     Optional[str]
+    - revoked_on:   datetime
+    - expires_on:   datetime
+
+    A row either revokes a single signed session token (identified by its token ID) or, if the
+    token ID is not set, all signed session tokens of the user that were created up to the
+    "revoked on" timestamp. A row is needed only until all of the tokens that it revokes expire.
+    """
+
+    def __init__(self):
+        """
+        Constructor
+        """
+        Table.__init__(self)
+
+    def create(self, connection: Connection) -> None:
+        """
+        Creates the table
+
+        :param connection:  Database connection
+        """
+        raise NotImplementedError()
+
+    def read_rows(self, connection: Connection, timestamp: datetime.datetime) -> List[dict]:
+        """
+        Reads all revocations that have not expired before the specified timestamp
+
+        :param connection:  Database connection
+        :param timestamp:   Timestamp
+
+        :return:    List of revocations
+
+        Each dictionary in the returned list contains items:
+
+        - id
+        - user_id
+        - token_id
+        - revoked_on
+        - expires_on
+        """
+        raise NotImplementedError()
+
+    def read_rows_after(self, connection: Connection, row_id: int) -> List[dict]:
+        """
+        Reads all revocations that were added after the specified row
+
+        :param connection:  Database connection
+        :param row_id:      ID of the last row that was already read ("0" to read all rows)
+
+        :return:    List of revocations (ordered by their row IDs)
+
+        Each dictionary in the returned list contains items:
+
+        - id
+        - user_id
+        - token_id
+        - revoked_on
+        - expires_on
+        """
+        raise NotImplementedError()
+
+    def insert_row(self,
+                   connection: Connection,
+                   user_id: int,
+                   token_id: Optional[str],
+                   revoked_on: datetime.datetime,
+                   expires_on: datetime.datetime) -> Optional[int]:
+        """
+        Inserts a new row in the table
+
+        :param connection:  Database connection
+        :param user_id:     ID of the user
+        :param token_id:    ID of the revoked token ("None" to revoke all tokens of the user)
+        :param revoked_on:  Timestamp of the revocation
+        :param expires_on:  Timestamp after which the revocation is not needed anymore
+
+        :return:    ID of the newly created row
+        """
+        raise NotImplementedError()
+
+    def delete_expired_rows(self, connection: Connection, timestamp: datetime.datetime) -> int:
+        """
+        Removes the rows that expire before the specified timestamp
+
+        :param connection:  Database connection
+        :param timestamp:   Timestamp
+
+        :return:    Number of removed rows
+        """
+        raise NotImplementedError()
@@ -0,0 +1,71 @@
+"""
+Salamander ALM
+Copyright (c) 2016  Djuro Drljaca
+
+This Python module is free software; you can redistribute it and/or modify it under the terms of the
+GNU General Public License as published by the Free Software Foundation; either version 2 of the
+License, or (at your option) any later version.
+
+This Python module is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License along with this library. If
+not, see <http://www.gnu.org/licenses/>.
+"""
+
+from database.connection import Connection
+from database.table import Table
+from typing import Optional
+
+
+class TextContentTable(Table):
+    """
+    Base class for "text_content" table
+
+    Table's columns:
+
+    - id:       int
+    - hash:     str (SHA-256 of the text, hex encoded)
+    - content:  encoded text
+
+    Table stores long texts (e.g. descriptions) of the "*_information" tables. Each distinct text is
+    stored only once so a new revision that doesn't change the text (e.g. activation or
+    deactivation of a project) only references the already stored text.
+    """
+
+    def __init__(self):
+        """
+        Constructor
+        """
+        Table.__init__(self)
+
+    def create(self, connection: Connection) -> None:
+        """
+        Creates the table
+
+        :param connection:  Database connection
+        """
+        raise NotImplementedError()
+
+    def read_text(self, connection: Connection, text_content_id: int) -> Optional[str]:
+        """
+        Reads the text from the database
+
+        :param connection:      Database connection
+        :param text_content_id: ID of the text
+
+        :return:    Text
+        """
+        raise NotImplementedError()
+
+    def insert_text(self, connection: Connection, text: str) -> Optional[int]:
+        """
+        Inserts the text in the table if it is not stored yet
+
+        :param connection:  Database connection
+        :param text:        Text
+
+        :return:    ID of the row with the text (newly created or already existing)
+        """
+        raise NotImplementedError()
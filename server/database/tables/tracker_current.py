@@ -0,0 +1,50 @@
+"""
+Salamander ALM
+Copyright (c) 2016  Djuro Drljaca
+
+This Python module is free software; you can redistribute it and/or modify it under the terms of the
+GNU General Public License as published by the Free Software Foundation; either version 2 of the
+License, or (at your option) any later version.
+
+This Python module is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License along with this library. If
+not, see <http://www.gnu.org/licenses/>.
+"""
+
+from database.connection import Connection
+from database.table import Table
+
+
+class TrackerCurrentTable(Table):
+    """
+    Base class for "tracker_current" table
+
+    Table's columns:
+
+    - tracker_id: int, references tracker.id
+    - short_name: str
+    - full_name:  str
+
+    Table contains the current short name and full name of each active tracker. It is maintained by
+    the database (rows are never written directly) and both columns are unique so an active tracker
+    can not get the same short name or full name as another active tracker.
+    """
+
+    def __init__(self):
+        """
+        Constructor
+        """
+        Table.__init__(self)
+
+    def create(self, connection: Connection) -> None:
+        """
+        Creates the table
+
+        :param connection:  Database connection
+
+        NOTE:   Table must be created after the "tracker_information" table!
+        """
+        raise NotImplementedError()
@@ -0,0 +1,50 @@
+"""
+Salamander ALM
+Copyright (c) 2016  Djuro Drljaca
+
+This Python module is free software; you can redistribute it and/or modify it under the terms of the
+GNU General Public License as published by the Free Software Foundation; either version 2 of the
+License, or (at your option) any later version.
+
+This Python module is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License along with this library. If
+not, see <http://www.gnu.org/licenses/>.
+"""
+
+from database.connection import Connection
+from database.table import Table
+
+
+class TrackerFieldCurrentTable(Table):
+    """
+    Base class for "tracker_field_current" table
+
+    Table's columns:
+
+    - tracker_field_id: int, references tracker_field.id
+    - name:             str
+    - display_name:     str
+
+    Table contains the current name and display name of each active tracker field. It is maintained
+    by the database (rows are never written directly) and both columns are unique so an active
+    tracker field can not get the same name or display name as another active tracker field.
+    """
+
+    def __init__(self):
+        """
+        Constructor
+        """
+        Table.__init__(self)
+
+    def create(self, connection: Connection) -> None:
+        """
+        Creates the table
+
+        :param connection:  Database connection
+
+        NOTE:   Table must be created after the "tracker_field_information" table!
+        """
+        raise NotImplementedError()
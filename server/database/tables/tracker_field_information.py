@@ -17,7 +17,7 @@ not, see <http://www.gnu.org/licenses/>.
 from database.connection import Connection
 from database.table import Table
 import enum
-from typing import Any, List, Optional
+from typing import Any, Dict, List, Optional
 
 
 class TrackerFieldSelection(enum.Enum):
@@ -37,13 +37,16 @@ class TrackerFieldInformationTable(Table):
 
     - id:               int
     - tracker_field_id: int, references tracker_field.id
-    - name:             str
-    - display_name:     str
-    - description:      Optional[str]
-    - field_type:       str
-    - required:         bool
+    - name:             Optional[str]
+    - display_name:     Optional[str]
+    - description_id:   Optional[int], references text_content.id
+    - field_type:       Optional[str]
+    - required:         Optional[bool]
     - active:           bool
     - revision_id:      int, references revision.id
+
+    Rows that only change the state of the tracker field (see "insert_state_row") contain only the
+    "active" attribute, all of the other attributes of the tracker field are left unchanged.
     """
 
     def __init__(self):
@@ -124,20 +127,86 @@ class TrackerFieldInformationTable(Table):
                    field_type: str,
                    required: bool,
                    active: bool,
-                   revision_id: int) -> Optional[int]:
+                   revision_id: int,
+                   expected_revision_id: Optional[int] = None) -> Optional[int]:
         """
         Inserts a new row in the table
 
+        :param connection:           Database connection
+        :param tracker_field_id:     ID of the tracker field
+        :param name:                 Tracker field name
+        :param display_name:         Tracker field display name
+        :param description:          Tracker field description
+        :param field_type:           Tracker field type
+        :param required:             Necessity of the tracker field (required or not)
+        :param active:               State of the tracker field (active or inactive)
+        :param revision_id:          Revision ID
+        :param expected_revision_id: Expected revision ID of the latest row (optional)
+
+        :return:    ID of the newly created row
+
+        NOTE:   If the expected revision ID is specified the row is inserted only if the latest
+                row of the tracker field is still from the expected revision!
+        """
+        raise NotImplementedError()
+
+    def insert_state_row(self,
+                         connection: Connection,
+                         tracker_field_id: int,
+                         active: bool,
+                         revision_id: int) -> Optional[int]:
+        """
+        Inserts a new row in the table that only changes the state of the tracker field (all of the
+        other attributes of the tracker field are unchanged)
+
         :param connection:          Database connection
         :param tracker_field_id:    ID of the tracker field
-        :param name:                Tracker field name
-        :param display_name:        Tracker field display name
-        :param description:         Tracker field description
-        :param field_type:          Tracker field type
-        :param required:            Necessity of the tracker field (required or not)
-        :param active:              State of the tracker field (active or inactive)
+        :param active:              New state of the tracker field (active or inactive)
         :param revision_id:         Revision ID
 
         :return:    ID of the newly created row
+
+        NOTE:   The row is inserted only if the tracker field exists and its latest state is
+                different from the new state!
+        """
+        raise NotImplementedError()
+
+    def read_states(self,
+                    connection: Connection,
+                    tracker_field_ids: List[int],
+                    max_revision_id: int) -> Dict[int, bool]:
+        """
+        Reads the latest state of all of the specified tracker fields for the max revision
+
+        :param connection:          Database connection
+        :param tracker_field_ids:   List of tracker field IDs
+        :param max_revision_id:     Maximum revision ID for the search
+
+        :return:    State (active or inactive) of each of the tracker fields that were found (key is
+                    the tracker field ID)
+        """
+        raise NotImplementedError()
+
+    def insert_state_rows(self,
+                          connection: Connection,
+                          tracker_field_ids: List[int],
+                          active: bool,
+                          revision_id: int) -> List[int]:
+        """
+        Inserts new rows in the table that only change the state of the tracker fields (all of the
+        other attributes of the tracker fields are unchanged)
+
+        :param connection:          Database connection
+        :param tracker_field_ids:   List of tracker field IDs
+        :param active:              New state of the tracker fields (active or inactive)
+        :param revision_id:         Revision ID
+
+        :return:    IDs of the tracker fields whose rows were inserted
+
+        NOTE:   Unlike "insert_state_row" this does not check the existence or the latest state of
+                the tracker fields!
+
+        NOTE:   Rows that violate a constraint (for example names that are already used by an
+                active tracker field) are not inserted, the other rows are still inserted!
         """
         raise NotImplementedError()
@@ -17,7 +17,7 @@ not, see <http://www.gnu.org/licenses/>.
 from database.connection import Connection
 from database.table import Table
 import enum
-from typing import Any, List, Optional
+from typing import Any, Dict, List, Optional
 
 
 class UserSelection(enum.Enum):
@@ -99,6 +99,34 @@ class UserTable(Table):
         """
         raise NotImplementedError()
 
+    def search_users(self,
+                     connection: Connection,
+                     text: str,
+                     user_selection: UserSelection,
+                     limit: int) -> List[dict]:
+        """
+        Searches for users whose user name, display name or email starts with the specified text
+
+        :param connection:      Database connection
+        :param text:            Text to search for (case-insensitive prefix)
+        :param user_selection:  Search for active, inactive or all users
+        :param limit:           Max number of returned users
+
+        :return:    User information of the matching users (ordered by user name)
+
+        Each dictionary in the returned list contains items:
+
+        - id
+        - user_name
+        - display_name
+        - email
+        - active
+
+        NOTE:   First "limit" matches are taken from each of the searched columns (in the order of
+                that column) and then the combined result is ordered by user name.
+        """
+        raise NotImplementedError()
+
     def insert_row(self,
                    connection: Connection,
                    user_name: str,
@@ -138,3 +166,32 @@ class UserTable(Table):
         :return:    Success or failure
         """
         raise NotImplementedError()
+
+    def read_states(self,
+                    connection: Connection,
+                    user_ids: List[int]) -> Dict[int, bool]:
+        """
+        Reads the state of all of the specified users
+
+        :param connection:  Database connection
+        :param user_ids:    List of user IDs
+
+        :return:    State (active or inactive) of each of the users that were found (key is the
+                    user ID)
+        """
+        raise NotImplementedError()
+
+    def update_states(self,
+                      connection: Connection,
+                      user_ids: List[int],
+                      active: bool) -> bool:
+        """
+        Updates the state of all of the specified users
+
+        :param connection:  Database connection
+        :param user_ids:    List of user IDs
+        :param active:      Users' new state (active or inactive)
+
+        :return:    Success or failure
+        """
+        raise NotImplementedError()
@@ -0,0 +1,330 @@
+"""
+Salamander ALM
+Copyright (c) 2016  Djuro Drljaca
+
+This Python module is free software; you can redistribute it and/or modify it under the terms of the
+GNU General Public License as published by the Free Software Foundation; either version 2 of the
+License, or (at your option) any later version.
+
+This Python module is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License along with this library. If
+not, see <http://www.gnu.org/licenses/>.
+"""
+
+import bisect
+import json
+import threading
+from typing import List, Optional
+
+
+class MetricsRegistry(object):
+    """
+    In-process registry of metrics (counters, gauges and histograms)
+
+    Each metric is identified by its name and labels. Content of the registry can be exported as
+    JSON or in Prometheus text exposition format.
+
+    Number of series (label combinations) of each metric is limited. Updates of new series over the
+    limit are dropped and counted in the "metrics_dropped_updates_total" counter (labeled by the
+    metric name).
+    """
+
+    # Default histogram buckets (upper bounds) for latencies in seconds
+    default_latency_buckets = [0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+                               0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0]
+
+    def __init__(self, max_series_per_metric=10000):
+        """
+        Constructor
+
+        :param max_series_per_metric:   Max number of series of a single metric
+        """
+        self.__lock = threading.Lock()
+        self.__max_series_per_metric = max_series_per_metric
+        self.__counters = dict()        # Key: (name, labels), value: float
+        self.__gauges = dict()          # Key: (name, labels), value: float
+        self.__histograms = dict()      # Key: (name, labels), value: dictionary with histogram data
+        self.__series_counts = dict()   # Key: name, value: number of series of the metric
+        self.__help = dict()            # Key: name, value: description of the metric
+
+    def describe(self, name: str, description: str) -> None:
+        """
+        Sets the description of a metric
+
+        :param name:        Name of the metric
+        :param description: Description of the metric
+        """
+        with self.__lock:
+            self.__help[name] = description
+
+    def increment_counter(self, name: str, labels: dict, value=1.0) -> None:
+        """
+        Increments a counter
+
+        :param name:    Name of the metric
+        :param labels:  Labels of the metric
+        :param value:   Value to add to the counter
+        """
+        key = (name, MetricsRegistry.__labels_key(labels))
+
+        with self.__lock:
+            if self.__add_series(self.__counters, key):
+                self.__counters[key] = self.__counters.get(key, 0.0) + value
+
+    def set_gauge(self, name: str, labels: dict, value: float) -> None:
+        """
+        Sets the value of a gauge
+
+        :param name:    Name of the metric
+        :param labels:  Labels of the metric
+        :param value:   New value of the gauge
+        """
+        key = (name, MetricsRegistry.__labels_key(labels))
+
+        with self.__lock:
+            if self.__add_series(self.__gauges, key):
+                self.__gauges[key] = value
+
+    def observe_histogram(self,
+                          name: str,
+                          labels: dict,
+                          value: float,
+                          buckets: Optional[List[float]] = None) -> None:
+        """
+        Adds an observation to a histogram
+
+        :param name:    Name of the metric
+        :param labels:  Labels of the metric
+        :param value:   Observed value
+        :param buckets: Upper bounds of the histogram buckets (only used when the histogram is
+                        created, "None" for default latency buckets)
+        """
+        key = (name, MetricsRegistry.__labels_key(labels))
+
+        with self.__lock:
+            histogram = self.__histograms.get(key)
+
+            if histogram is None:
+                if not self.__add_series(self.__histograms, key):
+                    return
+
+                if buckets is None:
+                    buckets = MetricsRegistry.default_latency_buckets
+
+                histogram = {"buckets": list(buckets),
+                             "bucket_counts": [0] * (len(buckets) + 1),
+                             "count": 0,
+                             "sum": 0.0}
+                self.__histograms[key] = histogram
+
+            histogram["bucket_counts"][bisect.bisect_left(histogram["buckets"], value)] += 1
+            histogram["count"] += 1
+            histogram["sum"] += value
+
+    def reset(self) -> None:
+        """
+        Removes all metrics from the registry
+        """
+        with self.__lock:
+            self.__counters = dict()
+            self.__gauges = dict()
+            self.__histograms = dict()
+            self.__series_counts = dict()
+
+    def to_dict(self) -> dict:
+        """
+        Exports the metrics as a dictionary
+
+        :return:    Metrics
+
+        Returned dictionary contains items:
+
+        - counters:     list of dictionaries with items "name", "labels" and "value"
+        - gauges:       list of dictionaries with items "name", "labels" and "value"
+        - histograms:   list of dictionaries with items "name", "labels", "count", "sum" and
+                        "buckets" (list of [upper bound, cumulative count] pairs, the last upper
+                        bound is "+Inf")
+        """
+        with self.__lock:
+            counters = [{"name": name, "labels": dict(labels), "value": value}
+                        for (name, labels), value in sorted(self.__counters.items())]
+
+            gauges = [{"name": name, "labels": dict(labels), "value": value}
+                      for (name, labels), value in sorted(self.__gauges.items())]
+
+            histograms = list()
+
+            for (name, labels), histogram in sorted(self.__histograms.items()):
+                histograms.append({"name": name,
+                                   "labels": dict(labels),
+                                   "count": histogram["count"],
+                                   "sum": histogram["sum"],
+                                   "buckets": MetricsRegistry.__cumulative_buckets(histogram)})
+
+        return {"counters": counters, "gauges": gauges, "histograms": histograms}
+
+    def to_json(self) -> str:
+        """
+        Exports the metrics as a JSON document
+
+        :return:    JSON document (see to_dict() for the structure)
+        """
+        return json.dumps(self.to_dict(), indent=2)
+
+    def to_prometheus(self) -> str:
+        """
+        Exports the metrics in Prometheus text exposition format
+
+        :return:    Metrics in Prometheus text format
+        """
+        metrics = self.to_dict()
+
+        with self.__lock:
+            descriptions = dict(self.__help)
+
+        lines = list()
+        described_names = set()
+
+        def add_header(metric_name: str, metric_type: str) -> None:
+            if metric_name not in described_names:
+                described_names.add(metric_name)
+
+                if metric_name in descriptions:
+                    lines.append("# HELP {0} {1}".format(
+                        metric_name,
+                        descriptions[metric_name].replace("\\", "\\\\").replace("\n", "\\n")))
+
+                lines.append("# TYPE {0} {1}".format(metric_name, metric_type))
+
+        for counter in metrics["counters"]:
+            add_header(counter["name"], "counter")
+            lines.append("{0}{1} {2}".format(counter["name"],
+                                             MetricsRegistry.__format_labels(counter["labels"]),
+                                             repr(float(counter["value"]))))
+
+        for gauge in metrics["gauges"]:
+            add_header(gauge["name"], "gauge")
+            lines.append("{0}{1} {2}".format(gauge["name"],
+                                             MetricsRegistry.__format_labels(gauge["labels"]),
+                                             repr(float(gauge["value"]))))
+
+        for histogram in metrics["histograms"]:
+            add_header(histogram["name"], "histogram")
+
+            for upper_bound, count in histogram["buckets"]:
+                labels = dict(histogram["labels"])
+                labels["le"] = upper_bound if isinstance(upper_bound, str) else repr(upper_bound)
+
+                lines.append("{0}_bucket{1} {2}".format(histogram["name"],
+                                                        MetricsRegistry.__format_labels(labels),
+                                                        count))
+
+            labels = MetricsRegistry.__format_labels(histogram["labels"])
+            lines.append("{0}_sum{1} {2}".format(histogram["name"],
+                                                 labels,
+                                                 repr(float(histogram["sum"]))))
+            lines.append("{0}_count{1} {2}".format(histogram["name"], labels, histogram["count"]))
+
+        return "\n".join(lines) + "\n"
+
+    def __add_series(self, series: dict, key: tuple) -> bool:
+        """
+        Checks if the series can be updated and counts the new series
+
+        :param series:  Series of the same type of metric
+        :param key:     Key of the series (name and labels)
+
+        :return:    Success (series exists or was added) or failure (too many series)
+
+        NOTE: the registry's lock needs to be held while calling this method!
+        """
+        if key in series:
+            return True
+
+        name = key[0]
+        series_count = self.__series_counts.get(name, 0)
+
+        if series_count < self.__max_series_per_metric:
+            self.__series_counts[name] = series_count + 1
+            return True
+
+        # Too many series, the update is dropped
+        dropped_key = ("metrics_dropped_updates_total", (("metric", name),))
+        self.__counters[dropped_key] = self.__counters.get(dropped_key, 0.0) + 1.0
+        return False
+
+    @staticmethod
+    def __labels_key(labels: dict) -> tuple:
+        """
+        Converts the labels to a hashable key
+
+        :param labels:  Labels
+
+        :return:    Labels key
+        """
+        return tuple(sorted((str(name), str(value)) for name, value in labels.items()))
+
+    @staticmethod
+    def __cumulative_buckets(histogram: dict) -> list:
+        """
+        Calculates cumulative bucket counts of a histogram
+
+        :param histogram:   Histogram data
+
+        :return:    List of [upper bound, cumulative count] pairs
+        """
+        buckets = list()
+        cumulative_count = 0
+
+        for upper_bound, count in zip(histogram["buckets"] + ["+Inf"],
+                                      histogram["bucket_counts"]):
+            cumulative_count += count
+            buckets.append([upper_bound, cumulative_count])
+
+        return buckets
+
+    @staticmethod
+    def __format_labels(labels: dict) -> str:
+        """
+        Formats the labels in Prometheus text format
+
+        :param labels:  Labels
+
+        :return:    Formatted labels
+        """
+        if len(labels) == 0:
+            return ""
+
+        items = list()
+
+        for name, value in sorted(labels.items()):
+            value = str(value).replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+            items.append("{0}=\"{1}\"".format(name, value))
+
+        return "{" + ",".join(items) + "}"
+
+
+class MetricsInterface(object):
+    """
+    Interface to the application's metrics registry (singleton)
+    """
+
+    __registry = MetricsRegistry()
+
+    def __init__(self):
+        """
+        Constructor is disabled!
+        """
+        raise RuntimeError()
+
+    @staticmethod
+    def registry() -> MetricsRegistry:
+        """
+        Get the metrics registry
+
+        :return:    Metrics registry
+        """
+        return MetricsInterface.__registry
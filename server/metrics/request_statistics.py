@@ -0,0 +1,87 @@
+"""
+Salamander ALM
+Copyright (c) 2016  Djuro Drljaca
+
+This Python module is free software; you can redistribute it and/or modify it under the terms of the
+GNU General Public License as published by the Free Software Foundation; either version 2 of the
+License, or (at your option) any later version.
+
+This Python module is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License along with this library. If
+not, see <http://www.gnu.org/licenses/>.
+"""
+
+import threading
+from typing import Optional
+
+
+class RequestStatistics(object):
+    """
+    Statistics of the request that is currently processed by the calling thread
+
+    Parts of the application record their timings (e.g. database queries or authentication) and
+    they are collected only while a request is active on the thread.
+    """
+
+    __local = threading.local()
+
+    def __init__(self):
+        """
+        Constructor is disabled!
+        """
+        raise RuntimeError()
+
+    @staticmethod
+    def begin() -> None:
+        """
+        Begins collecting statistics of a request on the calling thread
+        """
+        RequestStatistics.__local.statistics = {"database_duration": 0.0,
+                                                "database_query_count": 0,
+                                                "timings": dict()}
+
+    @staticmethod
+    def end() -> Optional[dict]:
+        """
+        Ends collecting statistics of a request on the calling thread
+
+        :return:    Collected statistics ("None" if collection was not active)
+
+        Returned dictionary contains items:
+
+        - database_duration (in seconds)
+        - database_query_count
+        - timings (dictionary with total duration in seconds for each timing name)
+        """
+        statistics = getattr(RequestStatistics.__local, "statistics", None)
+        RequestStatistics.__local.statistics = None
+        return statistics
+
+    @staticmethod
+    def add_database_query(duration: float) -> None:
+        """
+        Records an executed database query
+
+        :param duration:    Duration of the query (in seconds)
+        """
+        statistics = getattr(RequestStatistics.__local, "statistics", None)
+
+        if statistics is not None:
+            statistics["database_duration"] += duration
+            statistics["database_query_count"] += 1
+
+    @staticmethod
+    def add_timing(name: str, duration: float) -> None:
+        """
+        Records duration of a named part of the request (e.g. "authentication")
+
+        :param name:        Name of the timing
+        :param duration:    Duration (in seconds)
+        """
+        statistics = getattr(RequestStatistics.__local, "statistics", None)
+
+        if statistics is not None:
+            statistics["timings"][name] = statistics["timings"].get(name, 0.0) + duration
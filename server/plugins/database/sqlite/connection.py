@@ -15,13 +15,140 @@ not, see <http://www.gnu.org/licenses/>.
 """
 
 from database.connection import Connection
+import hashlib
+import logging
+from metrics.metrics_registry import MetricsInterface
+from metrics.request_statistics import RequestStatistics
+import re
 import sqlite3
+import sys
+import time
+from typing import Any, Iterator, List, Optional, Tuple, Union
+
+# Max number of IDs that are bound to a single query
+_max_ids_per_query = 500
+
+
+class _InstrumentedCursor(object):
+    """
+    Cursor of an executed SQL statement that returns rows
+
+    Result rows are counted while they are fetched from the native cursor. The metrics of the
+    statement are recorded once all of the rows are fetched or when the cursor is released.
+    """
+
+    def __init__(self, cursor: sqlite3.Cursor, method: str, sql: str, duration: float):
+        """
+        Constructor
+
+        :param cursor:      Native cursor
+        :param method:      Name of the method that executed the statement
+        :param sql:         SQL statement
+        :param duration:    Duration of the statement execution (in seconds)
+        """
+        self.__cursor = cursor
+        self.__method = method
+        self.__sql = sql
+        self.__duration = duration
+        self.__row_count = 0
+        self.__recorded = False
+
+    def __del__(self):
+        """
+        Destructor
+        """
+        self.__record()
+
+    def __iter__(self):
+        """
+        Iterates over the remaining result rows
+        """
+        row = self.fetchone()
+
+        while row is not None:
+            yield row
+            row = self.fetchone()
+
+    @property
+    def rowcount(self) -> int:
+        """
+        Gets the number of modified rows
+
+        :return:    Number of modified rows
+        """
+        return self.__cursor.rowcount
+
+    @property
+    def lastrowid(self) -> Optional[int]:
+        """
+        Gets the ID of the last inserted row
+
+        :return:    Row ID
+        """
+        return self.__cursor.lastrowid
+
+    def fetchone(self) -> Optional[sqlite3.Row]:
+        """
+        Fetches the next result row
+
+        :return:    Result row or "None" if there are no more rows
+        """
+        start = time.perf_counter()
+        row = self.__cursor.fetchone()
+        self.__duration += time.perf_counter() - start
+
+        if row is None:
+            self.__record()
+        else:
+            self.__row_count += 1
+
+        return row
+
+    def fetchall(self) -> List[sqlite3.Row]:
+        """
+        Fetches all of the remaining result rows
+
+        :return:    Result rows
+        """
+        start = time.perf_counter()
+        rows = self.__cursor.fetchall()
+        self.__duration += time.perf_counter() - start
+
+        self.__row_count += len(rows)
+        self.__record()
+        return rows
+
+    def __record(self) -> None:
+        """
+        Records the metrics of the statement (only once)
+        """
+        if not self.__recorded:
+            self.__recorded = True
+            RequestStatistics.add_database_query(self.__duration)
+            ConnectionSqlite._record_statement(self.__method,
+                                               self.__sql,
+                                               self.__duration,
+                                               self.__row_count)
 
 
 class ConnectionSqlite(Connection):
     """
     SQLite database connection
+
+    Statements executed with execute() and executemany() are instrumented: for each statement shape
+    (SQL with normalized parameter lists and numeric literals) and calling method (e.g.
+    "TrackerFieldInformationTableSqlite.read_information") the latency histogram, call count and
+    row count are recorded in the metrics registry. Statements slower than the slow query threshold
+    are also logged.
     """
+
+    __instrumentation_enabled = True
+    __slow_query_threshold = 0.1        # In seconds ("None" to disable the slow query log)
+    __statement_shapes = dict()         # Cache of statement shapes (key is the SQL statement)
+    __statement_ids = set()             # IDs of the statement shapes that are used as labels
+    __max_statement_shape_count = 1000  # Max number of cached statement shapes and statement IDs
+    __logger = logging.getLogger(__name__)
+
     def __init__(self, native_connection: sqlite3.Connection):
         """
         Constructor
@@ -30,8 +157,11 @@ class ConnectionSqlite(Connection):
         """
         Connection.__init__(self)
 
-        # Disable automatic transactions and save the connection object
-        native_connection.isolation_level = None
+        # Disable automatic transactions and save the connection object (NOTE: setting the isolation
+        # level commits the active transaction so it is only set if needed)
+        if native_connection.isolation_level is not None:
+            native_connection.isolation_level = None
+
         self.__native_connection = native_connection
         self.__in_transaction = False
 
@@ -59,16 +189,27 @@ class ConnectionSqlite(Connection):
         """
         return self.__in_transaction
 
-    def begin_transaction(self) -> bool:
+    def begin_transaction(self, write=False) -> bool:
         """
         Begins a transaction
 
+        :param write:   Transaction writes to the database
+
         :return:    Success or failure
+
+        NOTE:   A write transaction acquires the write lock at its start ("BEGIN IMMEDIATE"). A
+                deferred transaction that first reads and then writes can fail immediately with
+                "database is locked" if another connection is writing at the same time, because
+                waiting for the lock could result in a deadlock.
         """
         if self.__in_transaction:
             return False
 
-        self.native_connection.execute("BEGIN")
+        if write:
+            self.execute("BEGIN IMMEDIATE")
+        else:
+            self.execute("BEGIN")
+
         self.__in_transaction = True
         return True
 
@@ -81,7 +222,7 @@ class ConnectionSqlite(Connection):
         if not self.__in_transaction:
             return False
 
-        self.native_connection.execute("COMMIT")
+        self.execute("COMMIT")
         self.__in_transaction = False
         return True
 
@@ -94,6 +235,194 @@ class ConnectionSqlite(Connection):
         if not self.__in_transaction:
             return False
 
-        self.native_connection.execute("ROLLBACK")
+        self.execute("ROLLBACK")
         self.__in_transaction = False
         return True
+
+    @staticmethod
+    def enable_instrumentation(enabled: bool) -> None:
+        """
+        Enables or disables instrumentation of the executed statements
+
+        :param enabled: Enable or disable instrumentation
+        """
+        ConnectionSqlite.__instrumentation_enabled = enabled
+
+    @staticmethod
+    def set_slow_query_threshold(threshold: Optional[float]) -> None:
+        """
+        Sets the threshold for the slow query log
+
+        :param threshold:   Threshold in seconds ("None" to disable the slow query log)
+        """
+        ConnectionSqlite.__slow_query_threshold = threshold
+
+    def execute(self, sql: str, parameters: Any = ()) -> Union[sqlite3.Cursor,
+                                                                _InstrumentedCursor]:
+        """
+        Executes an SQL statement
+
+        :param sql:         SQL statement
+        :param parameters:  Parameters of the statement
+
+        :return:    Cursor with the result of the statement
+
+        NOTE:   If instrumentation is enabled the result rows of a statement are counted while they
+                are fetched from the returned cursor and the recorded duration also includes the
+                fetching of the rows!
+        """
+        start = time.perf_counter()
+        cursor = self.__native_connection.execute(sql, parameters)
+        duration = time.perf_counter() - start
+
+        if not ConnectionSqlite.__instrumentation_enabled:
+            RequestStatistics.add_database_query(duration)
+            return cursor
+
+        method = ConnectionSqlite.__calling_method(sys._getframe(1))
+
+        if cursor.description is not None:
+            # Statement returns rows
+            return _InstrumentedCursor(cursor, method, sql, duration)
+
+        RequestStatistics.add_database_query(duration)
+        ConnectionSqlite._record_statement(method, sql, duration, max(cursor.rowcount, 0))
+        return cursor
+
+    def executemany(self, sql: str, parameters: Any) -> sqlite3.Cursor:
+        """
+        Executes an SQL statement for each of the parameter sets
+
+        :param sql:         SQL statement
+        :param parameters:  Sequence of parameter sets
+
+        :return:    Cursor with the result of the statement
+        """
+        start = time.perf_counter()
+        cursor = self.__native_connection.executemany(sql, parameters)
+        duration = time.perf_counter() - start
+
+        RequestStatistics.add_database_query(duration)
+
+        if ConnectionSqlite.__instrumentation_enabled:
+            ConnectionSqlite._record_statement(
+                ConnectionSqlite.__calling_method(sys._getframe(1)),
+                sql,
+                duration,
+                max(cursor.rowcount, 0))
+
+        return cursor
+
+    @staticmethod
+    def __calling_method(frame) -> str:
+        """
+        Gets the name of the method that executed a statement
+
+        :param frame:   Stack frame of the method that executed the statement
+
+        :return:    Method name (e.g. "TrackerFieldInformationTableSqlite.read_information")
+        """
+        code = frame.f_code
+        return getattr(code, "co_qualname", code.co_name)
+
+    @staticmethod
+    def _record_statement(method: str, sql: str, duration: float, row_count: int) -> None:
+        """
+        Records the metrics of an executed statement
+
+        :param method:      Name of the method that executed the statement
+        :param sql:         SQL statement
+        :param duration:    Duration of the statement (in seconds)
+        :param row_count:   Number of result or modified rows
+        """
+        statement_id, statement_shape = ConnectionSqlite.__statement_shape(sql)
+        statement_ids = ConnectionSqlite.__statement_ids
+        registry = MetricsInterface.registry()
+
+        if ((statement_id in statement_ids) or
+                (len(statement_ids) < ConnectionSqlite.__max_statement_shape_count)):
+            statement_ids.add(statement_id)
+            registry.set_gauge("salm_db_statement_info",
+                               {"statement": statement_id, "sql": statement_shape},
+                               1)
+        else:
+            # Too many statement shapes, the metrics of new ones are recorded in a shared series
+            statement_id = "other"
+
+        labels = {"method": method, "statement": statement_id}
+
+        registry.observe_histogram("salm_db_query_duration_seconds", labels, duration)
+        registry.increment_counter("salm_db_queries_total", labels)
+        registry.increment_counter("salm_db_query_rows_total", labels, row_count)
+
+        threshold = ConnectionSqlite.__slow_query_threshold
+
+        if (threshold is not None) and (duration >= threshold):
+            ConnectionSqlite.__logger.warning("Slow query (%.3f ms) in %s: %s",
+                                              duration * 1000.0,
+                                              method,
+                                              statement_shape)
+
+    @staticmethod
+    def __statement_shape(sql: str) -> tuple:
+        """
+        Calculates the shape of the SQL statement
+
+        :param sql: SQL statement
+
+        :return:    Statement ID (short hash of the shape) and the statement shape
+        """
+        shape = ConnectionSqlite.__statement_shapes.get(sql)
+
+        if shape is None:
+            # Normalize whitespace, numbered parameters (e.g. ":artifact_id_12"), lists of such
+            # parameters and numeric literals
+            statement_shape = " ".join(sql.split())
+            statement_shape = re.sub(r"(:\w+?)_\d+\b", r"\1_N", statement_shape)
+            statement_shape = re.sub(r"(\(:\w+_N\)|:\w+_N)(?:, \1)+", r"\1, ...", statement_shape)
+            statement_shape = re.sub(r"(?<![\w:.])\d+(\.\d+)?(?![\w])", "?", statement_shape)
+
+            statement_id = hashlib.sha1(statement_shape.encode("utf-8")).hexdigest()[:12]
+            shape = (statement_id, statement_shape)
+
+            statement_shapes = ConnectionSqlite.__statement_shapes
+
+            if len(statement_shapes) < ConnectionSqlite.__max_statement_shape_count:
+                statement_shapes[sql] = shape
+
+        return shape
+
+
+def id_list_chunks(ids: List[int],
+                   parameter_prefix: str,
+                   parameters: Optional[dict] = None,
+                   row_values=True) -> Iterator[Tuple[str, dict]]:
+    """
+    Splits a list of IDs into chunks that can be bound to a single query
+
+    :param ids:                 List of IDs
+    :param parameter_prefix:    Prefix of the parameter names (e.g. "artifact_id")
+    :param parameters:          Parameters that are common to all chunks
+    :param row_values:          Format the list as row values for a "VALUES" clause (e.g.
+                                "(:artifact_id_0), (:artifact_id_1)") or as a plain list for an
+                                "IN" operator (e.g. ":user_id_0, :user_id_1")
+
+    :return:    Formatted list of parameter names and query parameters of each chunk
+
+    NOTE: chunks are needed to stay below the limit of SQL parameters (SQLite's default limit of
+    host parameters in older versions is 999).
+    """
+    for chunk_start in range(0, len(ids), _max_ids_per_query):
+        chunk_parameters = dict() if parameters is None else dict(parameters)
+        values = list()
+
+        for index, id_value in enumerate(ids[chunk_start:(chunk_start + _max_ids_per_query)]):
+            parameter_name = "{0}_{1}".format(parameter_prefix, index)
+            chunk_parameters[parameter_name] = id_value
+
+            if row_values:
+                values.append("(:{0})".format(parameter_name))
+            else:
+                values.append(":{0}".format(parameter_name))
+
+        yield ", ".join(values), chunk_parameters
@@ -22,14 +22,37 @@ from plugins.database.sqlite.tables.user_authentication import UserAuthenticatio
 from plugins.database.sqlite.tables.user_authentication_parameter \
     import UserAuthenticationParameterTableSqlite
 from plugins.database.sqlite.tables.session_token import SessionTokenTableSqlite
+from plugins.database.sqlite.tables.session_token_revocation import \
+    SessionTokenRevocationTableSqlite
 from plugins.database.sqlite.tables.revision import RevisionTableSqlite
+from plugins.database.sqlite.tables.text_content import TextContentTableSqlite
 from plugins.database.sqlite.tables.project import ProjectTableSqlite
 from plugins.database.sqlite.tables.project_information import ProjectInformationTableSqlite
+from plugins.database.sqlite.tables.project_current import ProjectCurrentTableSqlite
 from plugins.database.sqlite.tables.tracker import TrackerTableSqlite
 from plugins.database.sqlite.tables.tracker_field import TrackerFieldTableSqlite
 from plugins.database.sqlite.tables.tracker_field_information import \
     TrackerFieldInformationTableSqlite
+from plugins.database.sqlite.tables.tracker_field_current import TrackerFieldCurrentTableSqlite
 from plugins.database.sqlite.tables.tracker_information import TrackerInformationTableSqlite
+from plugins.database.sqlite.tables.tracker_current import TrackerCurrentTableSqlite
+from plugins.database.sqlite.tables.artifact import ArtifactTableSqlite
+from plugins.database.sqlite.tables.artifact_information import ArtifactInformationTableSqlite
+from plugins.database.sqlite.tables.artifact_field_value import ArtifactFieldValueTableSqlite
+from plugins.database.sqlite.tables.artifact_report import ArtifactReportTableSqlite
+from plugins.database.sqlite.tables.artifact_link import ArtifactLinkTableSqlite
+from plugins.database.sqlite.tables.artifact_link_information import \
+    ArtifactLinkInformationTableSqlite
+from plugins.database.sqlite.tables.artifact_link_closure import ArtifactLinkClosureTableSqlite
+from plugins.database.sqlite.tables.artifact_comment import ArtifactCommentTableSqlite
+from plugins.database.sqlite.tables.artifact_comment_information import \
+    ArtifactCommentInformationTableSqlite
+from plugins.database.sqlite.tables.artifact_comment_current import \
+    ArtifactCommentCurrentTableSqlite
+from plugins.database.sqlite.tables.attachment import AttachmentTableSqlite
+from plugins.database.sqlite.tables.attachment_information import \
+    AttachmentInformationTableSqlite
+from plugins.database.sqlite.tables.search_index import SearchIndexTableSqlite
 import sqlite3
 from typing import Any, Optional
 
@@ -52,17 +75,38 @@ class DatabaseSqlite(Database):
         tables.user_authentication_parameter = UserAuthenticationParameterTableSqlite()
 
         tables.session_token = SessionTokenTableSqlite()
+        tables.session_token_revocation = SessionTokenRevocationTableSqlite()
 
         tables.revision = RevisionTableSqlite()
 
+        tables.text_content = TextContentTableSqlite()
+
         tables.project = ProjectTableSqlite()
-        tables.project_information = ProjectInformationTableSqlite()
+        tables.project_information = ProjectInformationTableSqlite(tables.text_content)
+        tables.project_current = ProjectCurrentTableSqlite()
 
         tables.tracker = TrackerTableSqlite()
-        tables.tracker_information = TrackerInformationTableSqlite()
+        tables.tracker_information = TrackerInformationTableSqlite(tables.text_content)
+        tables.tracker_current = TrackerCurrentTableSqlite()
 
         tables.tracker_field = TrackerFieldTableSqlite()
-        tables.tracker_field_information = TrackerFieldInformationTableSqlite()
+        tables.tracker_field_information = TrackerFieldInformationTableSqlite(tables.text_content)
+        tables.tracker_field_current = TrackerFieldCurrentTableSqlite()
+
+        tables.artifact = ArtifactTableSqlite()
+        tables.artifact_information = ArtifactInformationTableSqlite()
+        tables.artifact_field_value = ArtifactFieldValueTableSqlite()
+        tables.artifact_report = ArtifactReportTableSqlite()
+        tables.artifact_link = ArtifactLinkTableSqlite()
+        tables.artifact_link_information = ArtifactLinkInformationTableSqlite()
+        tables.artifact_link_closure = ArtifactLinkClosureTableSqlite()
+        tables.artifact_comment = ArtifactCommentTableSqlite()
+        tables.artifact_comment_information = ArtifactCommentInformationTableSqlite()
+        tables.artifact_comment_current = ArtifactCommentCurrentTableSqlite()
+        tables.attachment = AttachmentTableSqlite()
+        tables.attachment_information = AttachmentInformationTableSqlite()
+
+        tables.search_index = SearchIndexTableSqlite()
 
         Database.__init__(self, tables)
 
@@ -70,7 +114,14 @@ class DatabaseSqlite(Database):
 
         self.__application_id = 0x53414c4d  # HEX for "SALM"
         self.__encoding = "\"UTF-8\""
-        self.__user_version = 1             # Version of the database file
+        self.__user_version = 5             # Version of the database file
+        self.__busy_timeout = 30000         # Max time for waiting on a locked database (in ms)
+
+        # Migrations of the database schema (key is the version that is migrated from)
+        self.__migrations = {1: self.__migrate_from_version_1,
+                             2: self.__migrate_from_version_2,
+                             3: self.__migrate_from_version_3,
+                             4: self.__migrate_from_version_4}
 
     def __del__(self):
         """
@@ -100,9 +151,55 @@ class DatabaseSqlite(Database):
 
         # Set non-persistent PRAGMA values
         DatabaseSqlite.__update_pragma(connection, "foreign_keys", 1)
+        DatabaseSqlite.__update_pragma(connection, "busy_timeout", self.__busy_timeout)
+
+        TextContentTableSqlite.register_functions(connection)
 
         return ConnectionSqlite(connection)
 
+    def upgrade_database(self) -> bool:
+        """
+        Upgrades an existing database to the latest version of the database schema
+
+        :return:    Success or failure
+
+        Each migration step is executed in its own transaction together with the update of the
+        database file's version.
+        """
+        connection = sqlite3.connect(self.__database_file_path)
+        connection.isolation_level = None
+        connection.row_factory = sqlite3.Row
+        TextContentTableSqlite.register_functions(connection)
+
+        try:
+            version = DatabaseSqlite.__read_pragma(connection, "user_version")
+
+            if version > self.__user_version:
+                # Error, database was created by a newer version of the application
+                return False
+
+            while version < self.__user_version:
+                migration = self.__migrations.get(version)
+
+                if migration is None:
+                    # Error, migration from this version is not supported
+                    return False
+
+                try:
+                    connection.execute("BEGIN")
+                    migration(connection)
+                    DatabaseSqlite.__update_pragma(connection, "user_version", version + 1)
+                    connection.execute("COMMIT")
+                except:
+                    connection.execute("ROLLBACK")
+                    raise
+
+                version += 1
+        finally:
+            connection.close()
+
+        return True
+
     def _create_database(self) -> bool:
         """
         Creates an empty database if needed
@@ -127,6 +224,322 @@ class DatabaseSqlite(Database):
         connection.close()
         return True
 
+    def __migrate_from_version_1(self, connection: sqlite3.Connection) -> None:
+        """
+        Migrates the database from version 1 to version 2
+
+        :param connection:  Database connection
+
+        Changes:
+
+        - Table "session_token" is recreated with the new "expires_on" and "last_used_on" columns
+          (without the "session_token_ix_token" index, UNIQUE constraint of "token" column already
+          creates an index) and new table "session_token_revocation" is created
+        - Indexes "user_ix_email" and the case-insensitive indexes of the user directory are created
+        - New tables "artifact", "artifact_information" and "artifact_field_value" are created
+        - Search index is created and filled with the active projects, trackers and tracker fields
+
+        NOTE:   Existing session tokens are discarded (the users need to log in again)!
+
+        NOTE:   Triggers of the search index are created in the latest version and they are
+                recreated by the migration from version 2 (which makes them valid).
+        """
+        tables = self.tables()
+        connection_sqlite = ConnectionSqlite(connection)
+
+        connection.execute("DROP TABLE session_token")
+        tables.session_token.create(connection_sqlite)
+        tables.session_token_revocation.create(connection_sqlite)
+
+        for index_name, column_expression in [("user_ix_email", "email"),
+                                              ("user_ix_user_name_nocase",
+                                               "user_name COLLATE NOCASE"),
+                                              ("user_ix_display_name_nocase",
+                                               "display_name COLLATE NOCASE"),
+                                              ("user_ix_email_nocase", "email COLLATE NOCASE")]:
+            connection.execute(
+                "CREATE INDEX {0} ON user (\n"
+                "    {1}\n"
+                ")".format(index_name, column_expression))
+
+        tables.artifact.create(connection_sqlite)
+        tables.artifact_information.create(connection_sqlite)
+        tables.artifact_field_value.create(connection_sqlite)
+
+        tables.search_index.create(connection_sqlite)
+
+        # Each active object is indexed with its latest attributes (row ID encodes the object type,
+        # see "search_index" table)
+        for table_name, id_column_name, title_expression, object_type_code in [
+                ("project_information", "project_id", "I.short_name || ' ' || I.full_name", 0),
+                ("tracker_information", "tracker_id", "I.short_name || ' ' || I.full_name", 1),
+                ("tracker_field_information", "tracker_field_id", "I.name || ' ' || I.display_name",
+                 2)]:
+            connection.execute(
+                "INSERT INTO search_index\n"
+                "   (rowid,\n"
+                "    title,\n"
+                "    body)\n"
+                "SELECT (I.{1} * 4 + {3}),\n"
+                "       {2},\n"
+                "       I.description\n"
+                "FROM {0} AS I\n"
+                "WHERE ((I.id = (\n"
+                "            SELECT I2.id\n"
+                "            FROM {0} AS I2\n"
+                "            WHERE (I2.{1} = I.{1})\n"
+                "            ORDER BY I2.revision_id DESC\n"
+                "            LIMIT 1\n"
+                "        )) AND\n"
+                "       (I.active = 1))".format(table_name,
+                                               id_column_name,
+                                               title_expression,
+                                               object_type_code))
+
+    def __migrate_from_version_2(self, connection: sqlite3.Connection) -> None:
+        """
+        Migrates the database from version 2 to version 3
+
+        :param connection:  Database connection
+
+        Changes:
+
+        - Tables that were added while the database file was still at version 2 are created if they
+          don't exist yet: "artifact_report" (filled from the artifact tables), "artifact_link*",
+          "artifact_comment*" and "attachment*" tables and index "artifact_ix_tracker_id"
+        - Descriptions of projects, trackers and tracker fields are moved to the new "text_content"
+          table ("description" column is replaced by the "description_id" column) and the search
+          index triggers of these tables are recreated
+        """
+        tables = self.tables()
+        connection_sqlite = ConnectionSqlite(connection)
+
+        # Tables that were added without a change of the version exist only in the databases that
+        # were created after they were added
+        existing_names = {row[0] for row in connection.execute(
+            "SELECT name\n"
+            "FROM sqlite_master").fetchall()}
+
+        if "artifact_report" not in existing_names:
+            tables.artifact_report.create(connection_sqlite)
+            self.__fill_artifact_report(connection)
+
+        for table_name, table in [
+                ("artifact_link", tables.artifact_link),
+                ("artifact_link_information", tables.artifact_link_information),
+                ("artifact_link_closure", tables.artifact_link_closure),
+                ("artifact_comment", tables.artifact_comment),
+                ("artifact_comment_information", tables.artifact_comment_information),
+                ("artifact_comment_current", tables.artifact_comment_current),
+                ("attachment", tables.attachment),
+                ("attachment_information", tables.attachment_information)]:
+            if table_name not in existing_names:
+                table.create(connection_sqlite)
+
+        connection.execute(
+            "CREATE INDEX IF NOT EXISTS artifact_ix_tracker_id\n"
+            "ON artifact (\n"
+            "    tracker_id\n"
+            ")")
+
+        tables.text_content.create(connection_sqlite)
+
+        # Triggers of the search index reference the "description" column
+        for table_name in ["project_information",
+                           "tracker_information",
+                           "tracker_field_information",
+                           "artifact_information",
+                           "artifact_field_value"]:
+            connection.execute("DROP TRIGGER IF EXISTS search_index_tr_{0}".format(table_name))
+
+        for table_name in ["project_information",
+                           "tracker_information",
+                           "tracker_field_information"]:
+            connection.execute(
+                "ALTER TABLE {0}\n"
+                "ADD COLUMN description_id INTEGER REFERENCES text_content (id)".format(table_name))
+
+            descriptions = [row[0] for row in connection.execute(
+                "SELECT DISTINCT description\n"
+                "FROM {0}\n"
+                "WHERE (description IS NOT NULL)".format(table_name)).fetchall()]
+
+            for description in descriptions:
+                connection.execute(
+                    "UPDATE {0}\n"
+                    "SET description_id = :description_id\n"
+                    "WHERE (description = :description)".format(table_name),
+                    {"description_id": tables.text_content.insert_text(connection_sqlite,
+                                                                       description),
+                     "description": description})
+
+            connection.execute("ALTER TABLE {0} DROP COLUMN description".format(table_name))
+
+        tables.search_index.create_triggers(connection_sqlite)
+
+    def __migrate_from_version_3(self, connection: sqlite3.Connection) -> None:
+        """
+        Migrates the database from version 3 to version 4
+
+        :param connection:  Database connection
+
+        Changes:
+
+        - Tables "project_information", "tracker_information" and "tracker_field_information" are
+          recreated so that they can also contain rows that only change the state of the object
+          (attribute columns are nullable and the tables have new indexes) and the search index
+          triggers of these tables are recreated
+        """
+        tables = self.tables()
+        connection_sqlite = ConnectionSqlite(connection)
+
+        # Triggers of the search index need to read the attributes from a different row
+        for table_name in ["project_information",
+                           "tracker_information",
+                           "tracker_field_information",
+                           "artifact_information",
+                           "artifact_field_value"]:
+            connection.execute("DROP TRIGGER IF EXISTS search_index_tr_{0}".format(table_name))
+
+        for table_name, table in [("project_information", tables.project_information),
+                                  ("tracker_information", tables.tracker_information),
+                                  ("tracker_field_information", tables.tracker_field_information)]:
+            # Index names are reused by the new table
+            index_names = [row[0] for row in connection.execute(
+                "SELECT name\n"
+                "FROM sqlite_master\n"
+                "WHERE ((type = 'index') AND\n"
+                "       (tbl_name = :table_name) AND\n"
+                "       (sql IS NOT NULL))",
+                {"table_name": table_name}).fetchall()]
+
+            for index_name in index_names:
+                connection.execute("DROP INDEX {0}".format(index_name))
+
+            connection.execute("ALTER TABLE {0} RENAME TO {0}_v3".format(table_name))
+            table.create(connection_sqlite)
+
+            # Order of the columns in the old table is different (it was changed by the previous
+            # migration)
+            column_names = ", ".join([row["name"] for row in connection.execute(
+                "PRAGMA table_info({0})".format(table_name)).fetchall()])
+
+            connection.execute(
+                "INSERT INTO {0} ({1})\n"
+                "SELECT {1}\n"
+                "FROM {0}_v3".format(table_name, column_names))
+
+            connection.execute("DROP TABLE {0}_v3".format(table_name))
+
+        tables.search_index.create_triggers(connection_sqlite)
+
+    def __migrate_from_version_4(self, connection: sqlite3.Connection) -> None:
+        """
+        Migrates the database from version 4 to version 5
+
+        :param connection:  Database connection
+
+        Changes:
+
+        - New tables "project_current", "tracker_current" and "tracker_field_current" (current
+          names of the active objects with unique indexes) are created and filled from the
+          information tables
+
+        NOTE:   Previous versions checked the uniqueness of the names only before an update so
+                active objects with the same name could exist. Only the object with the lowest ID
+                keeps such a name in the new table, the name of the other objects needs to be
+                changed before they can be modified.
+        """
+        tables = self.tables()
+        connection_sqlite = ConnectionSqlite(connection)
+
+        for table_name, table, id_column_name, attribute_names in [
+                ("project", tables.project_current, "project_id", ["short_name", "full_name"]),
+                ("tracker", tables.tracker_current, "tracker_id", ["short_name", "full_name"]),
+                ("tracker_field", tables.tracker_field_current, "tracker_field_id",
+                 ["name", "display_name"])]:
+            table.create(connection_sqlite)
+
+            # Attributes are taken from the latest row that contains them and the state from the
+            # latest row of each object
+            connection.execute(
+                "INSERT OR IGNORE INTO {0}_current\n"
+                "   ({1},\n"
+                "    {2},\n"
+                "    {3})\n"
+                "SELECT A.{1},\n"
+                "       A.{2},\n"
+                "       A.{3}\n"
+                "FROM {0}_information AS A\n"
+                "INNER JOIN {0}_information AS S\n"
+                "    ON (S.id = (\n"
+                "            SELECT S2.id\n"
+                "            FROM {0}_information AS S2\n"
+                "            WHERE (S2.{1} = A.{1})\n"
+                "            ORDER BY S2.revision_id DESC\n"
+                "            LIMIT 1\n"
+                "       ))\n"
+                "WHERE ((A.id = (\n"
+                "            SELECT A2.id\n"
+                "            FROM {0}_information AS A2\n"
+                "            WHERE ((A2.{1} = A.{1}) AND\n"
+                "                   (A2.{2} IS NOT NULL))\n"
+                "            ORDER BY A2.revision_id DESC\n"
+                "            LIMIT 1\n"
+                "        )) AND\n"
+                "       (S.active = 1))\n"
+                "ORDER BY A.{1}".format(table_name,
+                                       id_column_name,
+                                       attribute_names[0],
+                                       attribute_names[1]))
+
+    @staticmethod
+    def __fill_artifact_report(connection: sqlite3.Connection) -> None:
+        """
+        Fills the "artifact_report" and "artifact_report_value" tables from the artifact tables
+
+        :param connection:  Database connection
+
+        Tables get the same content as if they were maintained by their triggers from the start:
+        the latest information of each artifact and its field values.
+        """
+        connection.execute(
+            "INSERT INTO artifact_report\n"
+            "   (artifact_id,\n"
+            "    tracker_id,\n"
+            "    artifact_information_id,\n"
+            "    locked,\n"
+            "    active,\n"
+            "    revision_id)\n"
+            "SELECT A.id,\n"
+            "       A.tracker_id,\n"
+            "       AI.id,\n"
+            "       AI.locked,\n"
+            "       AI.active,\n"
+            "       AI.revision_id\n"
+            "FROM artifact AS A\n"
+            "INNER JOIN artifact_information AS AI\n"
+            "    ON (AI.id = (\n"
+            "            SELECT MAX(AI2.id)\n"
+            "            FROM artifact_information AS AI2\n"
+            "            WHERE (AI2.artifact_id = A.id)\n"
+            "       ))")
+
+        connection.execute(
+            "INSERT INTO artifact_report_value\n"
+            "   (artifact_id,\n"
+            "    tracker_field_id,\n"
+            "    value_number,\n"
+            "    value_text)\n"
+            "SELECT AR.artifact_id,\n"
+            "       AFV.tracker_field_id,\n"
+            "       (CASE WHEN (typeof(AFV.value) = 'text') THEN NULL ELSE AFV.value END),\n"
+            "       (CASE WHEN (typeof(AFV.value) = 'text') THEN AFV.value ELSE NULL END)\n"
+            "FROM artifact_report AS AR\n"
+            "INNER JOIN artifact_field_value AS AFV\n"
+            "    ON (AFV.artifact_information_id = AR.artifact_information_id)\n"
+            "WHERE (typeof(AFV.value) IN ('integer', 'real', 'text'))")
+
     @staticmethod
     def __read_pragma(connection: sqlite3.Connection, name: str) -> Any:
         """
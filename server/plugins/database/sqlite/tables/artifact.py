@@ -46,7 +46,7 @@ class ArtifactTableSqlite(ArtifactTable):
 
         :param connection:  Database connection
         """
-        connection.native_connection.execute(
+        connection.execute(
             "CREATE TABLE artifact (\n"
             "    id          INTEGER PRIMARY KEY AUTOINCREMENT\n"
             "                        NOT NULL,\n"
@@ -58,6 +58,13 @@ class ArtifactTableSqlite(ArtifactTable):
             "                        NOT NULL\n"
             ")")
 
+        # Artifacts of a tracker are found with an index seek (already ordered by their ID)
+        connection.execute(
+            "CREATE INDEX artifact_ix_tracker_id\n"
+            "ON artifact (\n"
+            "    tracker_id\n"
+            ")")
+
     def read_all_ids(self, connection: ConnectionSqlite, tracker_id: int) -> List[int]:
         """
         Reads IDs of all artifacts in the database that belong to the specified tracker
@@ -67,7 +74,7 @@ class ArtifactTableSqlite(ArtifactTable):
 
         :return:    List of artifact IDs
         """
-        cursor = connection.native_connection.execute(
+        cursor = connection.execute(
             "SELECT id\n"
             "FROM artifact\n"
             "WHERE (tracker_id = :tracker_id)",
@@ -96,12 +103,12 @@ class ArtifactTableSqlite(ArtifactTable):
         - created_on
         - created_by
         """
-        cursor = connection.native_connection.execute(
+        cursor = connection.execute(
             "SELECT id,\n"
             "       tracker_id,\n"
             "       created_on,\n"
             "       created_by\n"
-            "FROM revision\n"
+            "FROM artifact\n"
             "WHERE (id = :id)",
             {"id": artifact_id})
 
@@ -116,7 +123,6 @@ class ArtifactTableSqlite(ArtifactTable):
 
         return artifact
 
-
     def insert_row(self,
                    connection: ConnectionSqlite,
                    tracker_id: int,
@@ -133,7 +139,7 @@ class ArtifactTableSqlite(ArtifactTable):
         :return:    ID of the newly created row
         """
         try:
-            cursor = connection.native_connection.execute(
+            cursor = connection.execute(
                 "INSERT INTO artifact\n"
                 "   (id,\n"
                 "    tracker_id,\n"
@@ -0,0 +1,132 @@
+"""
+Salamander ALM
+Copyright (c) 2016  Djuro Drljaca
+
+This Python module is free software; you can redistribute it and/or modify it under the terms of the
+GNU General Public License as published by the Free Software Foundation; either version 2 of the
+License, or (at your option) any later version.
+
+This Python module is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License along with this library. If
+not, see <http://www.gnu.org/licenses/>.
+"""
+
+from plugins.database.sqlite.connection import ConnectionSqlite
+from database.datatypes import datetime_from_string, datetime_to_string
+from database.tables.artifact_comment import ArtifactCommentTable
+import datetime
+import sqlite3
+from typing import Optional
+
+
+class ArtifactCommentTableSqlite(ArtifactCommentTable):
+    """
+    Implementation of "artifact_comment" table for SQLite database
+
+    Table's columns:
+
+    - id:           int
+    - artifact_id:  int, references artifact.id
+    - created_on:   datetime
+    - created_by:   int, references user.id
+    """
+
+    def __init__(self):
+        """
+        Constructor
+        """
+        ArtifactCommentTable.__init__(self)
+
+    def create(self, connection: ConnectionSqlite) -> None:
+        """
+        Creates the table
+
+        :param connection:  Database connection
+        """
+        connection.execute(
+            "CREATE TABLE artifact_comment (\n"
+            "    id          INTEGER PRIMARY KEY AUTOINCREMENT\n"
+            "                        NOT NULL,\n"
+            "    artifact_id INTEGER REFERENCES artifact (id)\n"
+            "                        NOT NULL,\n"
+            "    created_on  TEXT    NOT NULL\n"
+            "                        CHECK (length(created_on) >= 23),\n"
+            "    created_by  INTEGER REFERENCES user (id)\n"
+            "                        NOT NULL\n"
+            ")")
+
+    def read_comment(self, connection: ConnectionSqlite, comment_id: int) -> Optional[dict]:
+        """
+        Reads the comment from the database
+
+        :param connection:  Database connection
+        :param comment_id:  ID of the comment
+
+        :return:    Comment
+
+        Returned dictionary contains items:
+
+        - id
+        - artifact_id
+        - created_on
+        - created_by
+        """
+        cursor = connection.execute(
+            "SELECT id,\n"
+            "       artifact_id,\n"
+            "       created_on,\n"
+            "       created_by\n"
+            "FROM artifact_comment\n"
+            "WHERE (id = :id)",
+            {"id": comment_id})
+
+        comment = None
+        row = cursor.fetchone()
+
+        if row is not None:
+            comment = {"id": row["id"],
+                       "artifact_id": row["artifact_id"],
+                       "created_on": datetime_from_string(row["created_on"]),
+                       "created_by": row["created_by"]}
+
+        return comment
+
+    def insert_row(self,
+                   connection: ConnectionSqlite,
+                   artifact_id: int,
+                   created_on: datetime.datetime,
+                   created_by: int) -> Optional[int]:
+        """
+        Inserts a new row in the table
+
+        :param connection:  Database connection
+        :param artifact_id: ID of the artifact
+        :param created_on:  Timestamp when comment was created
+        :param created_by:  ID of the user that created the comment
+
+        :return:    ID of the newly created row
+        """
+        try:
+            cursor = connection.execute(
+                "INSERT INTO artifact_comment\n"
+                "   (id,\n"
+                "    artifact_id,\n"
+                "    created_on,\n"
+                "    created_by)\n"
+                "VALUES (NULL,\n"
+                "        :artifact_id,\n"
+                "        :created_on,\n"
+                "        :created_by)",
+                {"artifact_id": artifact_id,
+                 "created_on": datetime_to_string(created_on),
+                 "created_by": created_by})
+
+            row_id = cursor.lastrowid
+        except sqlite3.IntegrityError:
+            # Error occurred
+            row_id = None
+
+        return row_id
@@ -0,0 +1,191 @@
+"""
+Salamander ALM
+Copyright (c) 2016  Djuro Drljaca
+
+This Python module is free software; you can redistribute it and/or modify it under the terms of the
+GNU General Public License as published by the Free Software Foundation; either version 2 of the
+License, or (at your option) any later version.
+
+This Python module is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License along with this library. If
+not, see <http://www.gnu.org/licenses/>.
+"""
+
+from plugins.database.sqlite.connection import ConnectionSqlite
+from database.datatypes import datetime_from_string
+from database.tables.artifact_comment_current import ArtifactCommentCurrentTable
+from typing import List, Optional
+
+
+class ArtifactCommentCurrentTableSqlite(ArtifactCommentCurrentTable):
+    """
+    Implementation of "artifact_comment_current" table for SQLite database
+
+    Table's columns:
+
+    - artifact_id:                      int, references artifact.id
+    - artifact_comment_id:              int, references artifact_comment.id
+    - artifact_comment_information_id:  int, references artifact_comment_information.id
+
+    Table is maintained with triggers: a new comment information of an active comment replaces
+    the row of the comment and a new comment information of an inactive comment removes it.
+
+    Primary key is ordered by the artifact and the comment so a page of a comment thread is read
+    with a single index range scan (in either direction) regardless of the number of comments and
+    their versions.
+    """
+
+    def __init__(self):
+        """
+        Constructor
+        """
+        ArtifactCommentCurrentTable.__init__(self)
+
+    def create(self, connection: ConnectionSqlite) -> None:
+        """
+        Creates the table
+
+        :param connection:  Database connection
+
+        NOTE:   Table must be created after the "artifact_comment" and
+                "artifact_comment_information" tables!
+        """
+        connection.execute(
+            "CREATE TABLE artifact_comment_current (\n"
+            "    artifact_id         INTEGER REFERENCES artifact (id)\n"
+            "                                NOT NULL,\n"
+            "    artifact_comment_id INTEGER REFERENCES artifact_comment (id)\n"
+            "                                NOT NULL,\n"
+            "    artifact_comment_information_id\n"
+            "                        INTEGER REFERENCES artifact_comment_information (id)\n"
+            "                                NOT NULL,\n"
+            "    PRIMARY KEY (\n"
+            "        artifact_id,\n"
+            "        artifact_comment_id\n"
+            "    )\n"
+            ") WITHOUT ROWID")
+
+        connection.execute(
+            "CREATE TRIGGER artifact_comment_current_tr_active\n"
+            "AFTER INSERT ON artifact_comment_information\n"
+            "WHEN (NEW.active = 1)\n"
+            "BEGIN\n"
+            "    INSERT OR REPLACE INTO artifact_comment_current\n"
+            "       (artifact_id,\n"
+            "        artifact_comment_id,\n"
+            "        artifact_comment_information_id)\n"
+            "    SELECT AC.artifact_id,\n"
+            "           AC.id,\n"
+            "           NEW.id\n"
+            "    FROM artifact_comment AS AC\n"
+            "    WHERE (AC.id = NEW.artifact_comment_id);\n"
+            "END")
+
+        connection.execute(
+            "CREATE TRIGGER artifact_comment_current_tr_inactive\n"
+            "AFTER INSERT ON artifact_comment_information\n"
+            "WHEN (NEW.active = 0)\n"
+            "BEGIN\n"
+            "    DELETE FROM artifact_comment_current\n"
+            "    WHERE ((artifact_id = (\n"
+            "                SELECT AC.artifact_id\n"
+            "                FROM artifact_comment AS AC\n"
+            "                WHERE (AC.id = NEW.artifact_comment_id)\n"
+            "            )) AND\n"
+            "           (artifact_comment_id = NEW.artifact_comment_id));\n"
+            "END")
+
+    def read_comments(self,
+                      connection: ConnectionSqlite,
+                      artifact_id: int,
+                      before_comment_id: Optional[int],
+                      limit: int) -> List[dict]:
+        """
+        Reads the current version of the active comments of the artifact, newest first
+
+        :param connection:          Database connection
+        :param artifact_id:         ID of the artifact
+        :param before_comment_id:   Only comments with a smaller ID are returned ("None" to start
+                                    with the newest comment)
+        :param limit:               Max number of returned comments
+
+        :return:    Comments ordered by their ID (descending)
+
+        Each dictionary in the returned list contains items:
+
+        - id
+        - artifact_id
+        - created_on
+        - created_by
+        - text
+        - revision_id
+        - modified_on
+        - modified_by
+        """
+        parameters = {"artifact_id": artifact_id,
+                      "limit": limit}
+
+        if before_comment_id is None:
+            condition = "(ACC.artifact_id = :artifact_id)"
+        else:
+            condition = ("((ACC.artifact_id = :artifact_id) AND\n"
+                         "       (ACC.artifact_comment_id < :before_comment_id))")
+            parameters["before_comment_id"] = before_comment_id
+
+        # Keyset pagination: the page starts with an index seek to the last comment of the
+        # previous page and only the rows of the page are read and joined
+        cursor = connection.execute(
+            "SELECT AC.id,\n"
+            "       AC.artifact_id,\n"
+            "       AC.created_on,\n"
+            "       AC.created_by,\n"
+            "       ACI.text,\n"
+            "       ACI.revision_id,\n"
+            "       R.timestamp AS modified_on,\n"
+            "       R.user_id AS modified_by\n"
+            "FROM artifact_comment_current AS ACC\n"
+            "INNER JOIN artifact_comment AS AC\n"
+            "    ON (AC.id = ACC.artifact_comment_id)\n"
+            "INNER JOIN artifact_comment_information AS ACI\n"
+            "    ON (ACI.id = ACC.artifact_comment_information_id)\n"
+            "INNER JOIN revision AS R\n"
+            "    ON (R.id = ACI.revision_id)\n"
+            "WHERE {0}\n"
+            "ORDER BY ACC.artifact_comment_id DESC\n"
+            "LIMIT :limit".format(condition),
+            parameters)
+
+        # Process result
+        comments = list()
+
+        for row in cursor.fetchall():
+            comments.append({"id": row["id"],
+                             "artifact_id": row["artifact_id"],
+                             "created_on": datetime_from_string(row["created_on"]),
+                             "created_by": row["created_by"],
+                             "text": row["text"],
+                             "revision_id": row["revision_id"],
+                             "modified_on": datetime_from_string(row["modified_on"]),
+                             "modified_by": row["modified_by"]})
+
+        return comments
+
+    def read_comment_count(self, connection: ConnectionSqlite, artifact_id: int) -> int:
+        """
+        Reads the number of active comments of the artifact
+
+        :param connection:  Database connection
+        :param artifact_id: ID of the artifact
+
+        :return:    Number of comments
+        """
+        cursor = connection.execute(
+            "SELECT COUNT(*)\n"
+            "FROM artifact_comment_current\n"
+            "WHERE (artifact_id = :artifact_id)",
+            {"artifact_id": artifact_id})
+
+        return cursor.fetchone()[0]
@@ -0,0 +1,226 @@
+"""
+Salamander ALM
+Copyright (c) 2016  Djuro Drljaca
+
+This Python module is free software; you can redistribute it and/or modify it under the terms of the
+GNU General Public License as published by the Free Software Foundation; either version 2 of the
+License, or (at your option) any later version.
+
+This Python module is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License along with this library. If
+not, see <http://www.gnu.org/licenses/>.
+"""
+
+from plugins.database.sqlite.connection import ConnectionSqlite
+from database.datatypes import datetime_from_string
+from database.tables.artifact_comment_information import ArtifactCommentInformationTable
+import sqlite3
+from typing import List, Optional
+
+
+class ArtifactCommentInformationTableSqlite(ArtifactCommentInformationTable):
+    """
+    Implementation of "artifact_comment_information" table for SQLite database
+
+    Table's columns:
+
+    - id:                   int
+    - artifact_comment_id:  int, references artifact_comment.id
+    - text:                 str
+    - active:               bool
+    - revision_id:          int, references revision.id
+    """
+
+    def __init__(self):
+        """
+        Constructor
+        """
+        ArtifactCommentInformationTable.__init__(self)
+
+    def create(self, connection: ConnectionSqlite) -> None:
+        """
+        Creates the table
+
+        :param connection:  Database connection
+        """
+        connection.execute(
+            "CREATE TABLE artifact_comment_information (\n"
+            "    id                  INTEGER PRIMARY KEY AUTOINCREMENT\n"
+            "                                NOT NULL,\n"
+            "    artifact_comment_id INTEGER REFERENCES artifact_comment (id)\n"
+            "                                NOT NULL,\n"
+            "    text                TEXT    NOT NULL\n"
+            "                                CHECK (length(text) > 0),\n"
+            "    active              BOOLEAN NOT NULL\n"
+            "                                CHECK ( (active = 0) OR\n"
+            "                                        (active = 1) ),\n"
+            "    revision_id         INTEGER REFERENCES revision (id)\n"
+            "                                NOT NULL\n"
+            ")")
+
+        # Composite index allows the latest revision of a comment to be found with an index seek
+        connection.execute(
+            "CREATE INDEX artifact_comment_information_ix_artifact_comment_id_revision_id\n"
+            "ON artifact_comment_information (\n"
+            "    artifact_comment_id,\n"
+            "    revision_id\n"
+            ")")
+
+    def read_information(self,
+                         connection: ConnectionSqlite,
+                         artifact_comment_id: int,
+                         max_revision_id: int) -> Optional[dict]:
+        """
+        Reads comment information for the specified comment and max revision
+
+        :param connection:          Database connection
+        :param artifact_comment_id: ID of the comment
+        :param max_revision_id:     Maximum revision ID for the search
+
+        :return:    Comment information
+
+        Returned dictionary contains items:
+
+        - id
+        - artifact_comment_id
+        - text
+        - active
+        - revision_id
+        - modified_on
+        - modified_by
+        """
+        # Read the latest comment information (index seek on "artifact_comment_id" and
+        # "revision_id")
+        cursor = connection.execute(
+            "SELECT ACI.id,\n"
+            "       ACI.artifact_comment_id,\n"
+            "       ACI.text,\n"
+            "       ACI.active,\n"
+            "       ACI.revision_id,\n"
+            "       R.timestamp AS modified_on,\n"
+            "       R.user_id AS modified_by\n"
+            "FROM artifact_comment_information AS ACI\n"
+            "INNER JOIN revision AS R\n"
+            "    ON (R.id = ACI.revision_id)\n"
+            "WHERE ((ACI.artifact_comment_id = :artifact_comment_id) AND\n"
+            "       (ACI.revision_id <= :max_revision_id))\n"
+            "ORDER BY ACI.revision_id DESC\n"
+            "LIMIT 1",
+            {"artifact_comment_id": artifact_comment_id,
+             "max_revision_id": max_revision_id})
+
+        # Process result
+        information = None
+        row = cursor.fetchone()
+
+        if row is not None:
+            information = self.__create_information(row)
+
+        return information
+
+    def read_history(self,
+                     connection: ConnectionSqlite,
+                     artifact_comment_id: int) -> List[dict]:
+        """
+        Reads all versions of the comment
+
+        :param connection:          Database connection
+        :param artifact_comment_id: ID of the comment
+
+        :return:    Comment information ordered from the original to the latest version
+
+        Each dictionary in the returned list contains items:
+
+        - id
+        - artifact_comment_id
+        - text
+        - active
+        - revision_id
+        - modified_on
+        - modified_by
+        """
+        cursor = connection.execute(
+            "SELECT ACI.id,\n"
+            "       ACI.artifact_comment_id,\n"
+            "       ACI.text,\n"
+            "       ACI.active,\n"
+            "       ACI.revision_id,\n"
+            "       R.timestamp AS modified_on,\n"
+            "       R.user_id AS modified_by\n"
+            "FROM artifact_comment_information AS ACI\n"
+            "INNER JOIN revision AS R\n"
+            "    ON (R.id = ACI.revision_id)\n"
+            "WHERE (ACI.artifact_comment_id = :artifact_comment_id)\n"
+            "ORDER BY ACI.revision_id ASC",
+            {"artifact_comment_id": artifact_comment_id})
+
+        # Process result
+        history = list()
+
+        for row in cursor.fetchall():
+            history.append(self.__create_information(row))
+
+        return history
+
+    def insert_row(self,
+                   connection: ConnectionSqlite,
+                   artifact_comment_id: int,
+                   text: str,
+                   active: bool,
+                   revision_id: int) -> Optional[int]:
+        """
+        Inserts a new row in the table
+
+        :param connection:          Database connection
+        :param artifact_comment_id: ID of the comment
+        :param text:                Text of the comment
+        :param active:              State of the comment (active or inactive)
+        :param revision_id:         Revision ID
+
+        :return:    ID of the newly created row
+        """
+        try:
+            cursor = connection.execute(
+                "INSERT INTO artifact_comment_information\n"
+                "   (id,\n"
+                "    artifact_comment_id,\n"
+                "    text,\n"
+                "    active,\n"
+                "    revision_id)\n"
+                "VALUES (NULL,\n"
+                "        :artifact_comment_id,\n"
+                "        :text,\n"
+                "        :active,\n"
+                "        :revision_id)",
+                {"artifact_comment_id": artifact_comment_id,
+                 "text": text,
+                 "active": active,
+                 "revision_id": revision_id})
+
+            row_id = cursor.lastrowid
+        except sqlite3.IntegrityError:
+            # Error occurred
+            row_id = None
+
+        return row_id
+
+    @staticmethod
+    def __create_information(row: sqlite3.Row) -> dict:
+        """
+        Creates comment information from the row
+
+        :param row: Row from the "artifact_comment_information" table joined with the "revision"
+                    table
+
+        :return:    Comment information
+        """
+        return {"id": row["id"],
+                "artifact_comment_id": row["artifact_comment_id"],
+                "text": row["text"],
+                "active": bool(row["active"]),
+                "revision_id": row["revision_id"],
+                "modified_on": datetime_from_string(row["modified_on"]),
+                "modified_by": row["modified_by"]}
@@ -0,0 +1,145 @@
+"""
+Salamander ALM
+Copyright (c) 2016  Djuro Drljaca
+
+This Python module is free software; you can redistribute it and/or modify it under the terms of the
+GNU General Public License as published by the Free Software Foundation; either version 2 of the
+License, or (at your option) any later version.
+
+This Python module is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License along with this library. If
+not, see <http://www.gnu.org/licenses/>.
+"""
+
+from plugins.database.sqlite.connection import ConnectionSqlite
+from database.tables.artifact_field_value import ArtifactFieldValueTable
+import sqlite3
+from typing import Optional
+
+
+class ArtifactFieldValueTableSqlite(ArtifactFieldValueTable):
+    """
+    Implementation of "artifact_field_value" table for SQLite database
+
+    Table's columns:
+
+    - id:                       int
+    - artifact_information_id:  int, references artifact_information.id
+    - tracker_field_id:         int, references tracker_field.id
+    - value:                    Any
+    """
+
+    def __init__(self):
+        """
+        Constructor
+        """
+        ArtifactFieldValueTable.__init__(self)
+
+    def create(self, connection: ConnectionSqlite) -> None:
+        """
+        Creates the table
+
+        :param connection:  Database connection
+        """
+        # NOTE: "value" column is intentionally declared without a type so that values keep the
+        #       storage class they were written with (no type affinity is applied to them)
+        connection.execute(
+            "CREATE TABLE artifact_field_value (\n"
+            "    id                      INTEGER PRIMARY KEY AUTOINCREMENT\n"
+            "                                    NOT NULL,\n"
+            "    artifact_information_id INTEGER REFERENCES artifact_information (id)\n"
+            "                                    NOT NULL,\n"
+            "    tracker_field_id        INTEGER REFERENCES tracker_field (id)\n"
+            "                                    NOT NULL,\n"
+            "    value\n"
+            ")")
+
+        connection.execute(
+            "CREATE UNIQUE INDEX artifact_field_value_ix_artifact_information_id\n"
+            "ON artifact_field_value (\n"
+            "    artifact_information_id,\n"
+            "    tracker_field_id\n"
+            ")")
+
+    def read_field_values(self,
+                          connection: ConnectionSqlite,
+                          artifact_information_id: int) -> Optional[dict]:
+        """
+        Reads all field values of the specified artifact information
+
+        :param connection:              Database connection
+        :param artifact_information_id: ID of the artifact information
+
+        :return:    Field values
+
+        Returned dictionary contains the field values of the artifact (key is the tracker field ID).
+
+        Example of a returned dictionary:
+
+        {1: "Title of the artifact",
+         2: 42}
+        """
+        cursor = connection.execute(
+            "SELECT tracker_field_id,\n"
+            "       value\n"
+            "FROM artifact_field_value\n"
+            "WHERE (artifact_information_id = :artifact_information_id)",
+            {"artifact_information_id": artifact_information_id})
+
+        # Process result
+        field_values = dict()
+
+        for row in cursor.fetchall():
+            field_values[row["tracker_field_id"]] = row["value"]
+
+        return field_values
+
+    def insert_rows(self,
+                    connection: ConnectionSqlite,
+                    artifact_information_id: int,
+                    field_values: dict) -> bool:
+        """
+        Inserts new rows in the table
+
+        :param connection:              Database connection
+        :param artifact_information_id: ID of the artifact information
+        :param field_values:            Field values (key is the tracker field ID)
+
+        :return:    Success or failure
+        """
+        if len(field_values) == 0:
+            # Nothing to insert
+            return True
+
+        success = False
+        value_array = list()
+
+        for tracker_field_id in field_values.keys():
+            value_item = {"artifact_information_id": artifact_information_id,
+                          "tracker_field_id": tracker_field_id,
+                          "value": field_values[tracker_field_id]}
+            value_array.append(value_item)
+
+        try:
+            cursor = connection.executemany(
+                "INSERT INTO artifact_field_value\n"
+                "   (id,\n"
+                "    artifact_information_id,\n"
+                "    tracker_field_id,\n"
+                "    value)\n"
+                "VALUES (NULL,\n"
+                "        :artifact_information_id,\n"
+                "        :tracker_field_id,\n"
+                "        :value)",
+                value_array)
+
+            if cursor.rowcount == len(value_array):
+                success = True
+        except sqlite3.IntegrityError:
+            # Error occurred
+            success = False
+
+        return success
@@ -14,7 +14,8 @@ You should have received a copy of the GNU Lesser General Public License along w
 not, see <http://www.gnu.org/licenses/>.
 """
 
-from plugins.database.sqlite.connection import ConnectionSqlite
+from plugins.database.sqlite.connection import ConnectionSqlite, id_list_chunks
+from database.datatypes import datetime_from_string
 from database.tables.artifact_information import ArtifactInformationTable, ArtifactSelection
 import sqlite3
 from typing import Any, List, Optional
@@ -47,7 +48,7 @@ class ArtifactInformationTableSqlite(ArtifactInformationTable):
 
         :param connection:  Database connection
         """
-        connection.native_connection.execute(
+        connection.execute(
             "CREATE TABLE artifact_information (\n"
             "    id          INTEGER PRIMARY KEY AUTOINCREMENT\n"
             "                        NOT NULL,\n"
@@ -63,10 +64,12 @@ class ArtifactInformationTableSqlite(ArtifactInformationTable):
             "                        NOT NULL\n"
             ")")
 
-        connection.native_connection.execute(
-            "CREATE INDEX artifact_information_ix_artifact_id\n"
+        # Composite index allows the latest revision of an artifact to be found with an index seek
+        connection.execute(
+            "CREATE INDEX artifact_information_ix_artifact_id_revision_id\n"
             "ON artifact_information (\n"
-            "    artifact_id\n"
+            "    artifact_id,\n"
+            "    revision_id\n"
             ")")
 
     def read_all_artifact_ids(self,
@@ -110,8 +113,8 @@ class ArtifactInformationTableSqlite(ArtifactInformationTable):
         else:
             query += "WHERE (A.tracker_id = :tracker_id)"
 
-        cursor = connection.native_connection.execute(query, {"tracker_id": tracker_id,
-                                                              "max_revision_id": max_revision_id})
+        cursor = connection.execute(query, {"tracker_id": tracker_id,
+                                            "max_revision_id": max_revision_id})
 
         # Process result
         artifacts = list()
@@ -143,8 +146,8 @@ class ArtifactInformationTableSqlite(ArtifactInformationTable):
         - active
         - revision_id
         """
-        # Read the users that match the search attribute
-        cursor = connection.native_connection.execute(
+        # Read the latest artifact information (index seek on "artifact_id" and "revision_id")
+        cursor = connection.execute(
             "SELECT AI1.id,\n"
             "       AI1.artifact_id,\n"
             "       AI1.locked,\n"
@@ -152,7 +155,9 @@ class ArtifactInformationTableSqlite(ArtifactInformationTable):
             "       AI1.revision_id\n"
             "FROM artifact_information AS AI1\n"
             "WHERE ((AI1.artifact_id = :artifact_id) AND\n"
-            "       (AI1.revision_id <= :max_revision_id))\n",
+            "       (AI1.revision_id <= :max_revision_id))\n"
+            "ORDER BY AI1.revision_id DESC\n"
+            "LIMIT 1",
             {"artifact_id": artifact_id,
              "max_revision_id": max_revision_id})
 
@@ -169,6 +174,152 @@ class ArtifactInformationTableSqlite(ArtifactInformationTable):
 
         return artifact
 
+    def read_information_by_artifact_ids(self,
+                                         connection: ConnectionSqlite,
+                                         artifact_ids: List[int],
+                                         max_revision_id: int) -> List[dict]:
+        """
+        Reads artifact information for all of the specified artifacts and max revision
+
+        :param connection:      Database connection
+        :param artifact_ids:    List of artifact IDs
+        :param max_revision_id: Maximum revision ID for the search
+
+        :return:    Artifact information of all artifacts that were found (in the same order as in
+                    the list of artifact IDs)
+
+        Each dictionary in the returned list contains items:
+
+        - id
+        - artifact_id
+        - locked
+        - active
+        - revision_id
+        """
+        information_by_artifact_id = dict()
+
+        # Read the artifact information in chunks to stay below the limit of SQL parameters
+        for values, parameters in id_list_chunks(artifact_ids,
+                                                 "artifact_id",
+                                                 {"max_revision_id": max_revision_id}):
+            # For each of the requested artifacts the ID of the latest artifact information is found
+            # with an index seek on "artifact_id" and "revision_id"
+            query = (
+                "SELECT AI.id,\n"
+                "       AI.artifact_id,\n"
+                "       AI.locked,\n"
+                "       AI.active,\n"
+                "       AI.revision_id\n"
+                "FROM (\n"
+                "    SELECT column1 AS artifact_id\n"
+                "    FROM (VALUES {0})\n"
+                ") AS ID\n"
+                "INNER JOIN artifact_information AS AI\n"
+                "    ON (AI.id = (\n"
+                "            SELECT AI2.id\n"
+                "            FROM artifact_information AS AI2\n"
+                "            WHERE ((AI2.artifact_id = ID.artifact_id) AND\n"
+                "                   (AI2.revision_id <= :max_revision_id))\n"
+                "            ORDER BY AI2.revision_id DESC\n"
+                "            LIMIT 1\n"
+                "       ))"
+            ).format(values)
+
+            cursor = connection.execute(query, parameters)
+
+            for row in cursor.fetchall():
+                information_by_artifact_id[row["artifact_id"]] = {
+                    "id": row["id"],
+                    "artifact_id": row["artifact_id"],
+                    "locked": bool(row["locked"]),
+                    "active": bool(row["active"]),
+                    "revision_id": row["revision_id"]}
+
+        # Process result
+        artifacts = list()
+
+        for artifact_id in artifact_ids:
+            if artifact_id in information_by_artifact_id:
+                artifacts.append(information_by_artifact_id[artifact_id])
+
+        return artifacts
+
+    def read_artifact(self,
+                      connection: ConnectionSqlite,
+                      artifact_id: int,
+                      max_revision_id: int) -> Optional[dict]:
+        """
+        Reads the complete artifact (fixed and custom fields) for the specified artifact and max
+        revision
+
+        :param connection:      Database connection
+        :param artifact_id:     Artifact ID
+        :param max_revision_id: Maximum revision ID for the search
+
+        :return:    Artifact
+
+        Returned dictionary contains items:
+
+        - artifact_id
+        - tracker_id
+        - created_on
+        - created_by
+        - artifact_information_id
+        - locked
+        - active
+        - revision_id
+        - fields
+
+        Item "fields" contains a dictionary with field values of the artifact (key is the tracker
+        field ID).
+        """
+        # Read the artifact together with all of its field values (one row per field value)
+        cursor = connection.execute(
+            "SELECT A.id AS artifact_id,\n"
+            "       A.tracker_id,\n"
+            "       A.created_on,\n"
+            "       A.created_by,\n"
+            "       AI.id AS artifact_information_id,\n"
+            "       AI.locked,\n"
+            "       AI.active,\n"
+            "       AI.revision_id,\n"
+            "       AFV.tracker_field_id,\n"
+            "       AFV.value\n"
+            "FROM artifact AS A\n"
+            "INNER JOIN artifact_information AS AI\n"
+            "    ON (AI.artifact_id = A.id)\n"
+            "LEFT OUTER JOIN artifact_field_value AS AFV\n"
+            "    ON (AFV.artifact_information_id = AI.id)\n"
+            "WHERE ((A.id = :artifact_id) AND\n"
+            "       (AI.revision_id = (\n"
+            "            SELECT MAX(AI2.revision_id)\n"
+            "            FROM artifact_information AS AI2\n"
+            "            WHERE ((AI2.artifact_id = A.id) AND\n"
+            "                   (AI2.revision_id <= :max_revision_id))\n"
+            "       )))",
+            {"artifact_id": artifact_id,
+             "max_revision_id": max_revision_id})
+
+        # Process result
+        artifact = None
+
+        for row in cursor.fetchall():
+            if artifact is None:
+                artifact = {"artifact_id": row["artifact_id"],
+                            "tracker_id": row["tracker_id"],
+                            "created_on": datetime_from_string(row["created_on"]),
+                            "created_by": row["created_by"],
+                            "artifact_information_id": row["artifact_information_id"],
+                            "locked": bool(row["locked"]),
+                            "active": bool(row["active"]),
+                            "revision_id": row["revision_id"],
+                            "fields": dict()}
+
+            if row["tracker_field_id"] is not None:
+                artifact["fields"][row["tracker_field_id"]] = row["value"]
+
+        return artifact
+
     def insert_row(self,
                    connection: ConnectionSqlite,
                    artifact_id: int,
@@ -187,7 +338,7 @@ class ArtifactInformationTableSqlite(ArtifactInformationTable):
         :return:    ID of the newly created row
         """
         try:
-            cursor = connection.native_connection.execute(
+            cursor = connection.execute(
                 "INSERT INTO artifact_information\n"
                 "   (id,\n"
                 "    artifact_id,\n"
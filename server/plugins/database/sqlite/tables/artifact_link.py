@@ -0,0 +1,163 @@
+"""
+Salamander ALM
+Copyright (c) 2016  Djuro Drljaca
+
+This Python module is free software; you can redistribute it and/or modify it under the terms of the
+GNU General Public License as published by the Free Software Foundation; either version 2 of the
+License, or (at your option) any later version.
+
+This Python module is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License along with this library. If
+not, see <http://www.gnu.org/licenses/>.
+"""
+
+from plugins.database.sqlite.connection import ConnectionSqlite
+from database.tables.artifact_link import ArtifactLinkTable
+import sqlite3
+from typing import Optional
+
+
+class ArtifactLinkTableSqlite(ArtifactLinkTable):
+    """
+    Implementation of "artifact_link" table for SQLite database
+
+    Table's columns:
+
+    - id:                   int
+    - source_artifact_id:   int, references artifact.id
+    - target_artifact_id:   int, references artifact.id
+    """
+
+    def __init__(self):
+        """
+        Constructor
+        """
+        ArtifactLinkTable.__init__(self)
+
+    def create(self, connection: ConnectionSqlite) -> None:
+        """
+        Creates the table
+
+        :param connection:  Database connection
+        """
+        connection.execute(
+            "CREATE TABLE artifact_link (\n"
+            "    id                 INTEGER PRIMARY KEY AUTOINCREMENT\n"
+            "                               NOT NULL,\n"
+            "    source_artifact_id INTEGER REFERENCES artifact (id)\n"
+            "                               NOT NULL,\n"
+            "    target_artifact_id INTEGER REFERENCES artifact (id)\n"
+            "                               NOT NULL\n"
+            ")")
+
+        # Links of an artifact are found with an index seek in both directions
+        connection.execute(
+            "CREATE UNIQUE INDEX artifact_link_ix_source_artifact_id_target_artifact_id\n"
+            "ON artifact_link (\n"
+            "    source_artifact_id,\n"
+            "    target_artifact_id\n"
+            ")")
+
+        connection.execute(
+            "CREATE INDEX artifact_link_ix_target_artifact_id_source_artifact_id\n"
+            "ON artifact_link (\n"
+            "    target_artifact_id,\n"
+            "    source_artifact_id\n"
+            ")")
+
+    def read_link(self, connection: ConnectionSqlite, link_id: int) -> Optional[dict]:
+        """
+        Reads the link from the database
+
+        :param connection:  Database connection
+        :param link_id:     ID of the link
+
+        :return:    Link
+
+        Returned dictionary contains items:
+
+        - id
+        - source_artifact_id
+        - target_artifact_id
+        """
+        cursor = connection.execute(
+            "SELECT id,\n"
+            "       source_artifact_id,\n"
+            "       target_artifact_id\n"
+            "FROM artifact_link\n"
+            "WHERE (id = :id)",
+            {"id": link_id})
+
+        link = None
+        row = cursor.fetchone()
+
+        if row is not None:
+            link = {"id": row["id"],
+                    "source_artifact_id": row["source_artifact_id"],
+                    "target_artifact_id": row["target_artifact_id"]}
+
+        return link
+
+    def read_link_id(self,
+                     connection: ConnectionSqlite,
+                     source_artifact_id: int,
+                     target_artifact_id: int) -> Optional[int]:
+        """
+        Reads the ID of the link between the specified artifacts
+
+        :param connection:          Database connection
+        :param source_artifact_id:  ID of the source artifact
+        :param target_artifact_id:  ID of the target artifact
+
+        :return:    Link ID
+        """
+        cursor = connection.execute(
+            "SELECT id\n"
+            "FROM artifact_link\n"
+            "WHERE ((source_artifact_id = :source_artifact_id) AND\n"
+            "       (target_artifact_id = :target_artifact_id))",
+            {"source_artifact_id": source_artifact_id,
+             "target_artifact_id": target_artifact_id})
+
+        link_id = None
+        row = cursor.fetchone()
+
+        if row is not None:
+            link_id = row[0]
+
+        return link_id
+
+    def insert_row(self,
+                   connection: ConnectionSqlite,
+                   source_artifact_id: int,
+                   target_artifact_id: int) -> Optional[int]:
+        """
+        Inserts a new row in the table
+
+        :param connection:          Database connection
+        :param source_artifact_id:  ID of the source artifact
+        :param target_artifact_id:  ID of the target artifact
+
+        :return:    ID of the newly created row
+        """
+        try:
+            cursor = connection.execute(
+                "INSERT INTO artifact_link\n"
+                "   (id,\n"
+                "    source_artifact_id,\n"
+                "    target_artifact_id)\n"
+                "VALUES (NULL,\n"
+                "        :source_artifact_id,\n"
+                "        :target_artifact_id)",
+                {"source_artifact_id": source_artifact_id,
+                 "target_artifact_id": target_artifact_id})
+
+            row_id = cursor.lastrowid
+        except sqlite3.IntegrityError:
+            # Error occurred
+            row_id = None
+
+        return row_id
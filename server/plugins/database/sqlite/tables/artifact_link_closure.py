@@ -0,0 +1,314 @@
+"""
+Salamander ALM
+Copyright (c) 2016  Djuro Drljaca
+
+This Python module is free software; you can redistribute it and/or modify it under the terms of the
+GNU General Public License as published by the Free Software Foundation; either version 2 of the
+License, or (at your option) any later version.
+
+This Python module is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License along with this library. If
+not, see <http://www.gnu.org/licenses/>.
+"""
+
+from plugins.database.sqlite.connection import ConnectionSqlite
+from database.tables.artifact_link import LinkDirection
+from database.tables.artifact_link_closure import ArtifactLinkClosureTable
+from typing import List, Optional
+
+
+class ArtifactLinkClosureTableSqlite(ArtifactLinkClosureTable):
+    """
+    Implementation of "artifact_link_closure" table for SQLite database
+
+    Table's columns:
+
+    - ancestor_artifact_id:     int, references artifact.id
+    - descendant_artifact_id:   int, references artifact.id
+    - path_count:               int, number of different paths from the ancestor to the descendant
+
+    The table is maintained with a trigger on the "artifact_link_information" table. When a link
+    from artifact S to artifact T is activated each ancestor A of S (including S) and each
+    descendant D of T (including T) gets "paths(A, S) * paths(T, D)" new paths, when the link is
+    deactivated the same number of paths is removed and the pairs without a path are deleted. This
+    is only exact if the links don't form a cycle.
+    """
+
+    def __init__(self):
+        """
+        Constructor
+        """
+        ArtifactLinkClosureTable.__init__(self)
+
+    def create(self, connection: ConnectionSqlite) -> None:
+        """
+        Creates the table
+
+        :param connection:  Database connection
+
+        NOTE:   This table must be created after the link tables and the artifact report table!
+        """
+        connection.execute(
+            "CREATE TABLE artifact_link_closure (\n"
+            "    ancestor_artifact_id   INTEGER REFERENCES artifact (id)\n"
+            "                                   NOT NULL,\n"
+            "    descendant_artifact_id INTEGER REFERENCES artifact (id)\n"
+            "                                   NOT NULL,\n"
+            "    path_count             INTEGER NOT NULL,\n"
+            "    PRIMARY KEY (\n"
+            "        ancestor_artifact_id,\n"
+            "        descendant_artifact_id\n"
+            "    )\n"
+            ") WITHOUT ROWID")
+
+        # Ancestors of an artifact are found with an index seek (the index also covers the number
+        # of paths which is needed for maintaining the table)
+        connection.execute(
+            "CREATE INDEX artifact_link_closure_ix_descendant_artifact_id\n"
+            "ON artifact_link_closure (\n"
+            "    descendant_artifact_id,\n"
+            "    ancestor_artifact_id,\n"
+            "    path_count\n"
+            ")")
+
+        # Pairs without a path are found without a table scan (the index is empty most of the time)
+        connection.execute(
+            "CREATE INDEX artifact_link_closure_ix_path_count\n"
+            "ON artifact_link_closure (\n"
+            "    path_count\n"
+            ")\n"
+            "WHERE (path_count = 0)")
+
+        # The trigger only fires if the state of the link has actually changed
+        connection.execute(
+            "CREATE TRIGGER artifact_link_closure_tr_artifact_link_information\n"
+            "AFTER INSERT ON artifact_link_information\n"
+            "WHEN (NEW.active <> IFNULL((\n"
+            "          SELECT ALI.active\n"
+            "          FROM artifact_link_information AS ALI\n"
+            "          WHERE ((ALI.artifact_link_id = NEW.artifact_link_id) AND\n"
+            "                 (ALI.id <> NEW.id))\n"
+            "          ORDER BY ALI.revision_id DESC, ALI.id DESC\n"
+            "          LIMIT 1\n"
+            "      ), 0))\n"
+            "BEGIN\n"
+            "    INSERT INTO artifact_link_closure\n"
+            "       (ancestor_artifact_id,\n"
+            "        descendant_artifact_id,\n"
+            "        path_count)\n"
+            "    SELECT A.artifact_id,\n"
+            "           D.artifact_id,\n"
+            "           (A.path_count * D.path_count *\n"
+            "            (CASE WHEN (NEW.active = 1) THEN 1 ELSE -1 END))\n"
+            "    FROM (\n"
+            "        SELECT C.ancestor_artifact_id AS artifact_id,\n"
+            "               C.path_count\n"
+            "        FROM artifact_link AS AL\n"
+            "        INNER JOIN artifact_link_closure AS C\n"
+            "            ON (C.descendant_artifact_id = AL.source_artifact_id)\n"
+            "        WHERE (AL.id = NEW.artifact_link_id)\n"
+            "        UNION ALL\n"
+            "        SELECT source_artifact_id,\n"
+            "               1\n"
+            "        FROM artifact_link\n"
+            "        WHERE (id = NEW.artifact_link_id)\n"
+            "    ) AS A\n"
+            "    CROSS JOIN (\n"
+            "        SELECT C.descendant_artifact_id AS artifact_id,\n"
+            "               C.path_count\n"
+            "        FROM artifact_link AS AL\n"
+            "        INNER JOIN artifact_link_closure AS C\n"
+            "            ON (C.ancestor_artifact_id = AL.target_artifact_id)\n"
+            "        WHERE (AL.id = NEW.artifact_link_id)\n"
+            "        UNION ALL\n"
+            "        SELECT target_artifact_id,\n"
+            "               1\n"
+            "        FROM artifact_link\n"
+            "        WHERE (id = NEW.artifact_link_id)\n"
+            "    ) AS D\n"
+            "    WHERE 1\n"
+            "    ON CONFLICT (ancestor_artifact_id, descendant_artifact_id)\n"
+            "    DO UPDATE SET path_count = (path_count + excluded.path_count);\n"
+            "\n"
+            "    DELETE FROM artifact_link_closure\n"
+            "    WHERE (path_count = 0);\n"
+            "END")
+
+    def is_reachable(self,
+                     connection: ConnectionSqlite,
+                     source_artifact_id: int,
+                     target_artifact_id: int) -> bool:
+        """
+        Checks if there is a path of active links from the source to the target artifact
+
+        :param connection:          Database connection
+        :param source_artifact_id:  ID of the source artifact
+        :param target_artifact_id:  ID of the target artifact
+
+        :return:    True if the target artifact is reachable from the source artifact
+        """
+        cursor = connection.execute(
+            "SELECT 1\n"
+            "FROM artifact_link_closure\n"
+            "WHERE ((ancestor_artifact_id = :source_artifact_id) AND\n"
+            "       (descendant_artifact_id = :target_artifact_id))",
+            {"source_artifact_id": source_artifact_id,
+             "target_artifact_id": target_artifact_id})
+
+        return cursor.fetchone() is not None
+
+    def read_reachable_artifact_ids(self,
+                                    connection: ConnectionSqlite,
+                                    artifact_id: int,
+                                    direction: LinkDirection,
+                                    tracker_id: Optional[int]) -> List[int]:
+        """
+        Reads IDs of all active artifacts that are reachable from the specified artifact
+
+        :param connection:  Database connection
+        :param artifact_id: ID of the artifact
+        :param direction:   Follow the links downstream or upstream
+        :param tracker_id:  Only artifacts of this tracker are returned ("None" for all trackers)
+
+        :return:    List of artifact IDs (in ascending order)
+        """
+        artifact_column, reachable_column = self.__closure_columns(direction)
+
+        query = (
+            "SELECT C.{1}\n"
+            "FROM artifact_link_closure AS C\n"
+            "INNER JOIN artifact_report AS R\n"
+            "    ON (R.artifact_id = C.{1})\n"
+            "WHERE ((C.{0} = :artifact_id) AND\n"
+            "       (R.active = 1)"
+        ).format(artifact_column, reachable_column)
+
+        if tracker_id is not None:
+            query += " AND\n       (R.tracker_id = :tracker_id)"
+
+        query += ")\nORDER BY C.{0}".format(reachable_column)
+
+        cursor = connection.execute(query, {"artifact_id": artifact_id,
+                                            "tracker_id": tracker_id})
+
+        artifact_ids = list()
+
+        for row in cursor.fetchall():
+            artifact_ids.append(row[0])
+
+        return artifact_ids
+
+    def read_next_artifact_id(self,
+                              connection: ConnectionSqlite,
+                              artifact_id: int,
+                              target_artifact_id: int) -> Optional[int]:
+        """
+        Reads the ID of an artifact that is directly linked from the specified artifact and that
+        is on a path to the target artifact
+
+        :param connection:          Database connection
+        :param artifact_id:         ID of the artifact
+        :param target_artifact_id:  ID of the target artifact
+
+        :return:    Artifact ID ("None" if the target is not reachable)
+        """
+        # Direct link to the target artifact is preferred
+        cursor = connection.execute(
+            "SELECT AL.target_artifact_id\n"
+            "FROM artifact_link AS AL\n"
+            "WHERE ((AL.source_artifact_id = :artifact_id) AND\n"
+            "       ((AL.target_artifact_id = :target_artifact_id) OR\n"
+            "        EXISTS (\n"
+            "            SELECT 1\n"
+            "            FROM artifact_link_closure AS C\n"
+            "            WHERE ((C.ancestor_artifact_id = AL.target_artifact_id) AND\n"
+            "                   (C.descendant_artifact_id = :target_artifact_id))\n"
+            "        )) AND\n"
+            "       ((\n"
+            "            SELECT ALI.active\n"
+            "            FROM artifact_link_information AS ALI\n"
+            "            WHERE (ALI.artifact_link_id = AL.id)\n"
+            "            ORDER BY ALI.revision_id DESC\n"
+            "            LIMIT 1\n"
+            "        ) = 1))\n"
+            "ORDER BY (AL.target_artifact_id = :target_artifact_id) DESC,\n"
+            "         AL.target_artifact_id\n"
+            "LIMIT 1",
+            {"artifact_id": artifact_id,
+             "target_artifact_id": target_artifact_id})
+
+        next_artifact_id = None
+        row = cursor.fetchone()
+
+        if row is not None:
+            next_artifact_id = row[0]
+
+        return next_artifact_id
+
+    def read_coverage(self,
+                      connection: ConnectionSqlite,
+                      tracker_id: int,
+                      covering_tracker_id: int,
+                      direction: LinkDirection) -> List[dict]:
+        """
+        Reads all pairs of active artifacts of the tracker and the reachable active artifacts of
+        the covering tracker
+
+        :param connection:          Database connection
+        :param tracker_id:          ID of the tracker
+        :param covering_tracker_id: ID of the covering tracker
+        :param direction:           Follow the links downstream or upstream
+
+        :return:    Artifact pairs ordered by the artifact IDs
+
+        Each dictionary in the returned list contains items:
+
+        - artifact_id
+        - covering_artifact_id ("None" if the artifact is not covered)
+        """
+        artifact_column, reachable_column = self.__closure_columns(direction)
+
+        # For each artifact of the tracker the reachable artifacts are found with an index seek
+        cursor = connection.execute(
+            "SELECT R.artifact_id,\n"
+            "       CR.artifact_id AS covering_artifact_id\n"
+            "FROM artifact_report AS R\n"
+            "LEFT OUTER JOIN (\n"
+            "    artifact_link_closure AS C\n"
+            "    INNER JOIN artifact_report AS CR\n"
+            "        ON ((CR.artifact_id = C.{1}) AND\n"
+            "            (CR.tracker_id = :covering_tracker_id) AND\n"
+            "            (CR.active = 1))\n"
+            ")\n"
+            "    ON (C.{0} = R.artifact_id)\n"
+            "WHERE ((R.tracker_id = :tracker_id) AND\n"
+            "       (R.active = 1))\n"
+            "ORDER BY R.artifact_id,\n"
+            "         CR.artifact_id".format(artifact_column, reachable_column),
+            {"tracker_id": tracker_id,
+             "covering_tracker_id": covering_tracker_id})
+
+        coverage = list()
+
+        for row in cursor.fetchall():
+            coverage.append({"artifact_id": row["artifact_id"],
+                             "covering_artifact_id": row["covering_artifact_id"]})
+
+        return coverage
+
+    @staticmethod
+    def __closure_columns(direction: LinkDirection) -> tuple:
+        """
+        Selects the columns of the closure table for the specified direction
+
+        :param direction:   Follow the links downstream or upstream
+
+        :return:    Column of the starting artifact and column of the reachable artifacts
+        """
+        if direction == LinkDirection.Downstream:
+            return "ancestor_artifact_id", "descendant_artifact_id"
+
+        return "descendant_artifact_id", "ancestor_artifact_id"
@@ -0,0 +1,311 @@
+"""
+Salamander ALM
+Copyright (c) 2016  Djuro Drljaca
+
+This Python module is free software; you can redistribute it and/or modify it under the terms of the
+GNU General Public License as published by the Free Software Foundation; either version 2 of the
+License, or (at your option) any later version.
+
+This Python module is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License along with this library. If
+not, see <http://www.gnu.org/licenses/>.
+"""
+
+from plugins.database.sqlite.connection import ConnectionSqlite
+from database.tables.artifact_link import LinkDirection
+from database.tables.artifact_link_information import ArtifactLinkInformationTable
+import sqlite3
+from typing import List, Optional
+
+
+class ArtifactLinkInformationTableSqlite(ArtifactLinkInformationTable):
+    """
+    Implementation of "artifact_link_information" table for SQLite database
+
+    Table's columns:
+
+    - id:               int
+    - artifact_link_id: int, references artifact_link.id
+    - active:           bool
+    - revision_id:      int, references revision.id
+    """
+
+    def __init__(self):
+        """
+        Constructor
+        """
+        ArtifactLinkInformationTable.__init__(self)
+
+    def create(self, connection: ConnectionSqlite) -> None:
+        """
+        Creates the table
+
+        :param connection:  Database connection
+        """
+        connection.execute(
+            "CREATE TABLE artifact_link_information (\n"
+            "    id               INTEGER PRIMARY KEY AUTOINCREMENT\n"
+            "                             NOT NULL,\n"
+            "    artifact_link_id INTEGER REFERENCES artifact_link (id)\n"
+            "                             NOT NULL,\n"
+            "    active           BOOLEAN NOT NULL\n"
+            "                             CHECK ( (active = 0) OR\n"
+            "                                     (active = 1) ),\n"
+            "    revision_id      INTEGER REFERENCES revision (id)\n"
+            "                             NOT NULL\n"
+            ")")
+
+        # Composite index allows the latest revision of a link to be found with an index seek
+        connection.execute(
+            "CREATE INDEX artifact_link_information_ix_artifact_link_id_revision_id\n"
+            "ON artifact_link_information (\n"
+            "    artifact_link_id,\n"
+            "    revision_id\n"
+            ")")
+
+    def read_information(self,
+                         connection: ConnectionSqlite,
+                         artifact_link_id: int,
+                         max_revision_id: int) -> Optional[dict]:
+        """
+        Reads link information for the specified link and max revision
+
+        :param connection:          Database connection
+        :param artifact_link_id:    ID of the link
+        :param max_revision_id:     Maximum revision ID for the search
+
+        :return:    Link information
+
+        Returned dictionary contains items:
+
+        - id
+        - artifact_link_id
+        - active
+        - revision_id
+        """
+        cursor = connection.execute(
+            "SELECT id,\n"
+            "       artifact_link_id,\n"
+            "       active,\n"
+            "       revision_id\n"
+            "FROM artifact_link_information\n"
+            "WHERE ((artifact_link_id = :artifact_link_id) AND\n"
+            "       (revision_id <= :max_revision_id))\n"
+            "ORDER BY revision_id DESC\n"
+            "LIMIT 1",
+            {"artifact_link_id": artifact_link_id,
+             "max_revision_id": max_revision_id})
+
+        information = None
+        row = cursor.fetchone()
+
+        if row is not None:
+            information = {"id": row["id"],
+                           "artifact_link_id": row["artifact_link_id"],
+                           "active": bool(row["active"]),
+                           "revision_id": row["revision_id"]}
+
+        return information
+
+    def read_links(self,
+                   connection: ConnectionSqlite,
+                   artifact_id: int,
+                   direction: LinkDirection,
+                   max_revision_id: int) -> List[dict]:
+        """
+        Reads all active links of the specified artifact
+
+        :param connection:      Database connection
+        :param artifact_id:     ID of the artifact
+        :param direction:       Read links to the target artifacts (downstream) or links from the
+                                source artifacts (upstream)
+        :param max_revision_id: Maximum revision ID for the search
+
+        :return:    Links ordered by the ID of the linked artifact
+
+        Each dictionary in the returned list contains items:
+
+        - id
+        - source_artifact_id
+        - target_artifact_id
+        - revision_id
+        """
+        if direction == LinkDirection.Downstream:
+            artifact_column = "source_artifact_id"
+            linked_artifact_column = "target_artifact_id"
+        else:
+            artifact_column = "target_artifact_id"
+            linked_artifact_column = "source_artifact_id"
+
+        # Links are found with an index seek on the artifact and the latest information of each
+        # link with an index seek on "artifact_link_id" and "revision_id"
+        cursor = connection.execute(
+            "SELECT AL.id,\n"
+            "       AL.source_artifact_id,\n"
+            "       AL.target_artifact_id,\n"
+            "       ALI.revision_id\n"
+            "FROM artifact_link AS AL\n"
+            "INNER JOIN artifact_link_information AS ALI\n"
+            "    ON (ALI.id = (\n"
+            "            SELECT ALI2.id\n"
+            "            FROM artifact_link_information AS ALI2\n"
+            "            WHERE ((ALI2.artifact_link_id = AL.id) AND\n"
+            "                   (ALI2.revision_id <= :max_revision_id))\n"
+            "            ORDER BY ALI2.revision_id DESC\n"
+            "            LIMIT 1\n"
+            "       ))\n"
+            "WHERE ((AL.{0} = :artifact_id) AND\n"
+            "       (ALI.active = 1))\n"
+            "ORDER BY AL.{1}".format(artifact_column, linked_artifact_column),
+            {"artifact_id": artifact_id,
+             "max_revision_id": max_revision_id})
+
+        links = list()
+
+        for row in cursor.fetchall():
+            links.append({"id": row["id"],
+                          "source_artifact_id": row["source_artifact_id"],
+                          "target_artifact_id": row["target_artifact_id"],
+                          "revision_id": row["revision_id"]})
+
+        return links
+
+    def read_tracker_links(self,
+                           connection: ConnectionSqlite,
+                           tracker_id: int,
+                           linked_tracker_id: int,
+                           direction: LinkDirection,
+                           after_artifact_id: int,
+                           artifact_count: int,
+                           max_revision_id: int) -> List[dict]:
+        """
+        Reads the active links between the active artifacts of the tracker and the active artifacts
+        of the linked tracker
+
+        :param connection:          Database connection
+        :param tracker_id:          ID of the tracker
+        :param linked_tracker_id:   ID of the linked tracker
+        :param direction:           Read links to the target artifacts (downstream) or links from
+                                    the source artifacts (upstream)
+        :param after_artifact_id:   Only artifacts with a greater ID are returned (for pagination)
+        :param artifact_count:      Max number of artifacts of the tracker that are returned
+        :param max_revision_id:     Maximum revision ID for the search
+
+        :return:    Links ordered by the artifact ID and the linked artifact ID
+
+        Each dictionary in the returned list contains items:
+
+        - artifact_id
+        - linked_artifact_id ("None" if the artifact has no links)
+        - link_id ("None" if the artifact has no links)
+        """
+        if direction == LinkDirection.Downstream:
+            artifact_column = "source_artifact_id"
+            linked_artifact_column = "target_artifact_id"
+        else:
+            artifact_column = "target_artifact_id"
+            linked_artifact_column = "source_artifact_id"
+
+        # A chunk of active artifacts of the tracker is found with an index seek on "tracker_id",
+        # their links with an index seek on the artifact and the state of each link and linked
+        # artifact in the requested revision with an index seek on their ID and "revision_id"
+        cursor = connection.execute(
+            "SELECT A.id AS artifact_id,\n"
+            "       AL.{1} AS linked_artifact_id,\n"
+            "       AL.id AS link_id\n"
+            "FROM (\n"
+            "    SELECT A1.id\n"
+            "    FROM artifact AS A1\n"
+            "    WHERE ((A1.tracker_id = :tracker_id) AND\n"
+            "           (A1.id > :after_artifact_id) AND\n"
+            "           ((\n"
+            "                SELECT AI.active\n"
+            "                FROM artifact_information AS AI\n"
+            "                WHERE ((AI.artifact_id = A1.id) AND\n"
+            "                       (AI.revision_id <= :max_revision_id))\n"
+            "                ORDER BY AI.revision_id DESC\n"
+            "                LIMIT 1\n"
+            "            ) = 1))\n"
+            "    ORDER BY A1.id\n"
+            "    LIMIT :artifact_count\n"
+            ") AS A\n"
+            "LEFT OUTER JOIN artifact_link AS AL\n"
+            "    ON ((AL.{0} = A.id) AND\n"
+            "        EXISTS (\n"
+            "            SELECT 1\n"
+            "            FROM artifact AS LA\n"
+            "            WHERE ((LA.id = AL.{1}) AND\n"
+            "                   (LA.tracker_id = :linked_tracker_id))\n"
+            "        ) AND\n"
+            "        ((\n"
+            "             SELECT ALI.active\n"
+            "             FROM artifact_link_information AS ALI\n"
+            "             WHERE ((ALI.artifact_link_id = AL.id) AND\n"
+            "                    (ALI.revision_id <= :max_revision_id))\n"
+            "             ORDER BY ALI.revision_id DESC\n"
+            "             LIMIT 1\n"
+            "         ) = 1) AND\n"
+            "        ((\n"
+            "             SELECT AI.active\n"
+            "             FROM artifact_information AS AI\n"
+            "             WHERE ((AI.artifact_id = AL.{1}) AND\n"
+            "                    (AI.revision_id <= :max_revision_id))\n"
+            "             ORDER BY AI.revision_id DESC\n"
+            "             LIMIT 1\n"
+            "         ) = 1))\n"
+            "ORDER BY A.id,\n"
+            "         AL.{1}".format(artifact_column, linked_artifact_column),
+            {"tracker_id": tracker_id,
+             "linked_tracker_id": linked_tracker_id,
+             "after_artifact_id": after_artifact_id,
+             "artifact_count": artifact_count,
+             "max_revision_id": max_revision_id})
+
+        links = list()
+
+        for row in cursor.fetchall():
+            links.append({"artifact_id": row["artifact_id"],
+                          "linked_artifact_id": row["linked_artifact_id"],
+                          "link_id": row["link_id"]})
+
+        return links
+
+    def insert_row(self,
+                   connection: ConnectionSqlite,
+                   artifact_link_id: int,
+                   active: bool,
+                   revision_id: int) -> Optional[int]:
+        """
+        Inserts a new row in the table
+
+        :param connection:          Database connection
+        :param artifact_link_id:    ID of the link
+        :param active:              State of the link (active or inactive)
+        :param revision_id:         Revision ID
+
+        :return:    ID of the newly created row
+        """
+        try:
+            cursor = connection.execute(
+                "INSERT INTO artifact_link_information\n"
+                "   (id,\n"
+                "    artifact_link_id,\n"
+                "    active,\n"
+                "    revision_id)\n"
+                "VALUES (NULL,\n"
+                "        :artifact_link_id,\n"
+                "        :active,\n"
+                "        :revision_id)",
+                {"artifact_link_id": artifact_link_id,
+                 "active": active,
+                 "revision_id": revision_id})
+
+            row_id = cursor.lastrowid
+        except sqlite3.IntegrityError:
+            # Error occurred
+            row_id = None
+
+        return row_id
@@ -0,0 +1,399 @@
+"""
+Salamander ALM
+Copyright (c) 2016  Djuro Drljaca
+
+This Python module is free software; you can redistribute it and/or modify it under the terms of the
+GNU General Public License as published by the Free Software Foundation; either version 2 of the
+License, or (at your option) any later version.
+
+This Python module is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License along with this library. If
+not, see <http://www.gnu.org/licenses/>.
+"""
+
+from plugins.database.sqlite.connection import ConnectionSqlite, id_list_chunks
+from database.tables.artifact_report import ArtifactReportTable, ComparisonOperator, \
+    ReportFilter, ReportFilterAnd, ReportFilterComparison, ReportFilterNot, ReportFilterOr
+from typing import List, Optional
+
+
+class ArtifactReportTableSqlite(ArtifactReportTable):
+    """
+    Implementation of "artifact_report" table for SQLite database
+
+    The report is stored in two tables:
+
+    "artifact_report" table's columns:
+
+    - artifact_id:              int, references artifact.id
+    - tracker_id:               int, references tracker.id
+    - artifact_information_id:  int, references artifact_information.id (latest revision)
+    - locked:                   bool
+    - active:                   bool
+    - revision_id:              int, references revision.id
+
+    "artifact_report_value" table's columns:
+
+    - artifact_id:      int, references artifact.id
+    - tracker_field_id: int, references tracker_field.id
+    - value_number:     int or float, value of the field if it is a number (or bool)
+    - value_text:       str, value of the field if it is a text
+
+    Both tables are maintained with triggers: a new artifact information replaces the row of the
+    artifact and removes its old field values, the field values that are inserted after it are
+    copied to the typed value columns.
+
+    A report filter is compiled to a single query where each comparison is an index range scan on
+    "tracker_field_id" and the typed value column, and the logical operators are translated to the
+    compound operators (INTERSECT, UNION and EXCEPT) on the matching artifact IDs.
+    """
+
+    def __init__(self):
+        """
+        Constructor
+        """
+        ArtifactReportTable.__init__(self)
+
+        self.__sql_operators = {ComparisonOperator.Equal: "=",
+                                ComparisonOperator.NotEqual: "<>",
+                                ComparisonOperator.Less: "<",
+                                ComparisonOperator.LessOrEqual: "<=",
+                                ComparisonOperator.Greater: ">",
+                                ComparisonOperator.GreaterOrEqual: ">="}
+
+    def create(self, connection: ConnectionSqlite) -> None:
+        """
+        Creates the table
+
+        :param connection:  Database connection
+
+        NOTE:   This table must be created after all of the artifact tables!
+        """
+        connection.execute(
+            "CREATE TABLE artifact_report (\n"
+            "    artifact_id             INTEGER PRIMARY KEY\n"
+            "                                    REFERENCES artifact (id)\n"
+            "                                    NOT NULL,\n"
+            "    tracker_id              INTEGER REFERENCES tracker (id)\n"
+            "                                    NOT NULL,\n"
+            "    artifact_information_id INTEGER REFERENCES artifact_information (id)\n"
+            "                                    NOT NULL,\n"
+            "    locked                  BOOLEAN NOT NULL,\n"
+            "    active                  BOOLEAN NOT NULL,\n"
+            "    revision_id             INTEGER REFERENCES revision (id)\n"
+            "                                    NOT NULL\n"
+            ")")
+
+        # Active artifacts of a tracker are found with an index seek (already ordered by their ID)
+        connection.execute(
+            "CREATE INDEX artifact_report_ix_tracker_id_active\n"
+            "ON artifact_report (\n"
+            "    tracker_id,\n"
+            "    active\n"
+            ")")
+
+        # NOTE: "value_number" column has a numeric affinity so that integer and real values can
+        #       be compared with each other
+        connection.execute(
+            "CREATE TABLE artifact_report_value (\n"
+            "    artifact_id      INTEGER REFERENCES artifact (id)\n"
+            "                             NOT NULL,\n"
+            "    tracker_field_id INTEGER REFERENCES tracker_field (id)\n"
+            "                             NOT NULL,\n"
+            "    value_number     NUMERIC,\n"
+            "    value_text       TEXT,\n"
+            "    PRIMARY KEY (\n"
+            "        artifact_id,\n"
+            "        tracker_field_id\n"
+            "    )\n"
+            ") WITHOUT ROWID")
+
+        # Partial indexes (one per value type) contain the artifact ID (primary key) so the
+        # matching artifacts are read from the index alone
+        connection.execute(
+            "CREATE INDEX artifact_report_value_ix_value_number\n"
+            "ON artifact_report_value (\n"
+            "    tracker_field_id,\n"
+            "    value_number\n"
+            ")\n"
+            "WHERE (value_number IS NOT NULL)")
+
+        connection.execute(
+            "CREATE INDEX artifact_report_value_ix_value_text\n"
+            "ON artifact_report_value (\n"
+            "    tracker_field_id,\n"
+            "    value_text\n"
+            ")\n"
+            "WHERE (value_text IS NOT NULL)")
+
+        connection.execute(
+            "CREATE TRIGGER artifact_report_tr_artifact_information\n"
+            "AFTER INSERT ON artifact_information\n"
+            "BEGIN\n"
+            "    DELETE FROM artifact_report_value\n"
+            "    WHERE (artifact_id = NEW.artifact_id);\n"
+            "\n"
+            "    INSERT OR REPLACE INTO artifact_report\n"
+            "       (artifact_id,\n"
+            "        tracker_id,\n"
+            "        artifact_information_id,\n"
+            "        locked,\n"
+            "        active,\n"
+            "        revision_id)\n"
+            "    SELECT A.id,\n"
+            "           A.tracker_id,\n"
+            "           NEW.id,\n"
+            "           NEW.locked,\n"
+            "           NEW.active,\n"
+            "           NEW.revision_id\n"
+            "    FROM artifact AS A\n"
+            "    WHERE (A.id = NEW.artifact_id);\n"
+            "END")
+
+        connection.execute(
+            "CREATE TRIGGER artifact_report_tr_artifact_field_value\n"
+            "AFTER INSERT ON artifact_field_value\n"
+            "WHEN (typeof(NEW.value) IN ('integer', 'real', 'text'))\n"
+            "BEGIN\n"
+            "    INSERT OR REPLACE INTO artifact_report_value\n"
+            "       (artifact_id,\n"
+            "        tracker_field_id,\n"
+            "        value_number,\n"
+            "        value_text)\n"
+            "    SELECT AI.artifact_id,\n"
+            "           NEW.tracker_field_id,\n"
+            "           (CASE WHEN (typeof(NEW.value) = 'text') THEN NULL ELSE NEW.value END),\n"
+            "           (CASE WHEN (typeof(NEW.value) = 'text') THEN NEW.value ELSE NULL END)\n"
+            "    FROM artifact_information AS AI\n"
+            "    WHERE (AI.id = NEW.artifact_information_id);\n"
+            "END")
+
+    def read_artifact_ids(self,
+                          connection: ConnectionSqlite,
+                          tracker_id: int,
+                          report_filter: Optional[ReportFilter],
+                          after_artifact_id: int,
+                          limit: int) -> List[int]:
+        """
+        Reads IDs of active artifacts of the specified tracker that match the report filter
+
+        :param connection:          Database connection
+        :param tracker_id:          ID of the tracker
+        :param report_filter:       Report filter ("None" to match all artifacts)
+        :param after_artifact_id:   Only artifacts with a greater ID are returned (for pagination)
+        :param limit:               Max number of returned artifact IDs
+
+        :return:    List of artifact IDs (in ascending order)
+
+        Comparison only matches field values of the same type as the compared value (numbers are
+        compared with numbers and text with text) and a negated filter also matches artifacts that
+        don't have a value for the field.
+        """
+        parameters = {"tracker_id": tracker_id,
+                      "after_artifact_id": after_artifact_id,
+                      "limit": limit}
+
+        query = (
+            "SELECT R.artifact_id\n"
+            "FROM artifact_report AS R\n"
+            "WHERE ((R.tracker_id = :tracker_id) AND\n"
+            "       (R.active = 1) AND\n"
+            "       (R.artifact_id > :after_artifact_id)"
+        )
+
+        if report_filter is not None:
+            query += " AND\n       (R.artifact_id IN (\n{0}\n       ))".format(
+                self.__compile_filter(report_filter, parameters))
+
+        query += (")\n"
+                  "ORDER BY R.artifact_id\n"
+                  "LIMIT :limit")
+
+        cursor = connection.execute(query, parameters)
+
+        # Process result
+        artifact_ids = list()
+
+        for row in cursor.fetchall():
+            artifact_ids.append(row[0])
+
+        return artifact_ids
+
+    def read_artifacts(self, connection: ConnectionSqlite, artifact_ids: List[int]) -> List[dict]:
+        """
+        Reads the current state of the specified artifacts together with their field values
+
+        :param connection:      Database connection
+        :param artifact_ids:    List of artifact IDs
+
+        :return:    Artifacts that were found (in the same order as in the list of artifact IDs)
+
+        Each dictionary in the returned list contains items:
+
+        - artifact_id
+        - tracker_id
+        - locked
+        - active
+        - revision_id
+        - fields
+
+        Item "fields" contains a dictionary with field values of the artifact (key is the tracker
+        field ID).
+        """
+        artifacts_by_id = dict()
+
+        # Read the artifacts in chunks to stay below the limit of SQL parameters
+        for values, parameters in id_list_chunks(artifact_ids, "artifact_id"):
+            # Field values are read from the original table so that they keep their original type
+            query = (
+                "SELECT R.artifact_id,\n"
+                "       R.tracker_id,\n"
+                "       R.locked,\n"
+                "       R.active,\n"
+                "       R.revision_id,\n"
+                "       AFV.tracker_field_id,\n"
+                "       AFV.value\n"
+                "FROM (\n"
+                "    SELECT column1 AS artifact_id\n"
+                "    FROM (VALUES {0})\n"
+                ") AS ID\n"
+                "INNER JOIN artifact_report AS R\n"
+                "    ON (R.artifact_id = ID.artifact_id)\n"
+                "LEFT OUTER JOIN artifact_field_value AS AFV\n"
+                "    ON (AFV.artifact_information_id = R.artifact_information_id)"
+            ).format(values)
+
+            cursor = connection.execute(query, parameters)
+
+            for row in cursor.fetchall():
+                artifact = artifacts_by_id.get(row["artifact_id"])
+
+                if artifact is None:
+                    artifact = {"artifact_id": row["artifact_id"],
+                                "tracker_id": row["tracker_id"],
+                                "locked": bool(row["locked"]),
+                                "active": bool(row["active"]),
+                                "revision_id": row["revision_id"],
+                                "fields": dict()}
+                    artifacts_by_id[row["artifact_id"]] = artifact
+
+                if row["tracker_field_id"] is not None:
+                    artifact["fields"][row["tracker_field_id"]] = row["value"]
+
+        # Process result
+        artifacts = list()
+
+        for artifact_id in artifact_ids:
+            if artifact_id in artifacts_by_id:
+                artifacts.append(artifacts_by_id[artifact_id])
+
+        return artifacts
+
+    def __compile_filter(self, report_filter: ReportFilter, parameters: dict) -> str:
+        """
+        Compiles the report filter to a query that selects the IDs of the matching artifacts
+
+        :param report_filter:   Report filter
+        :param parameters:      Query parameters (parameters of the compiled filter are added to it)
+
+        :return:    Query (a simple or a compound select statement)
+        """
+        if isinstance(report_filter, ReportFilterComparison):
+            return self.__compile_comparison(report_filter, parameters)
+
+        if isinstance(report_filter, ReportFilterNot):
+            return "{0}\nEXCEPT\n{1}".format(
+                self.__all_artifacts_query(),
+                self.__compile_operand(report_filter.operand, parameters))
+
+        if isinstance(report_filter, ReportFilterOr):
+            return "\nUNION\n".join([self.__compile_operand(x, parameters)
+                                     for x in report_filter.operands])
+
+        if isinstance(report_filter, ReportFilterAnd):
+            # Negated operands are subtracted from the intersection of the other operands so that
+            # all artifacts of the tracker only need to be read if all of the operands are negated
+            included = [x for x in report_filter.operands if not isinstance(x, ReportFilterNot)]
+            excluded = [x.operand for x in report_filter.operands if isinstance(x, ReportFilterNot)]
+
+            if len(included) == 0:
+                query = self.__all_artifacts_query()
+            else:
+                query = "\nINTERSECT\n".join([self.__compile_operand(x, parameters)
+                                              for x in included])
+
+            for operand in excluded:
+                query += "\nEXCEPT\n{0}".format(self.__compile_operand(operand, parameters))
+
+            return query
+
+        raise ValueError("Unsupported report filter: {0}".format(type(report_filter).__name__))
+
+    def __compile_operand(self, report_filter: ReportFilter, parameters: dict) -> str:
+        """
+        Compiles the report filter to a query that can be used as an operand of a compound operator
+
+        :param report_filter:   Report filter
+        :param parameters:      Query parameters (parameters of the compiled filter are added to it)
+
+        :return:    Query (a simple select statement)
+        """
+        query = self.__compile_filter(report_filter, parameters)
+
+        if isinstance(report_filter, ReportFilterComparison):
+            return query
+
+        # Compound operators in SQLite are evaluated from left to right so a compound operand must
+        # be wrapped in a subquery
+        return "SELECT artifact_id\nFROM (\n{0}\n)".format(query)
+
+    def __compile_comparison(self,
+                             comparison: ReportFilterComparison,
+                             parameters: dict) -> str:
+        """
+        Compiles the comparison to a query that selects the IDs of the matching artifacts
+
+        :param comparison:  Comparison
+        :param parameters:  Query parameters (parameters of the comparison are added to it)
+
+        :return:    Query (index range scan on the tracker field ID and the typed value column)
+        """
+        if isinstance(comparison.value, str):
+            value_column = "value_text"
+            value = comparison.value
+        elif isinstance(comparison.value, (bool, int, float)):
+            value_column = "value_number"
+            value = comparison.value
+        else:
+            raise ValueError("Unsupported value type: {0}".format(type(comparison.value).__name__))
+
+        tracker_field_id_parameter = "p{0}".format(len(parameters))
+        parameters[tracker_field_id_parameter] = comparison.tracker_field_id
+
+        value_parameter = "p{0}".format(len(parameters))
+        parameters[value_parameter] = value
+
+        return ("SELECT artifact_id\n"
+                "FROM artifact_report_value\n"
+                "WHERE ((tracker_field_id = :{0}) AND\n"
+                "       ({1} {2} :{3}) AND\n"
+                "       (artifact_id > :after_artifact_id))").format(
+            tracker_field_id_parameter,
+            value_column,
+            self.__sql_operators[comparison.operator],
+            value_parameter)
+
+    @staticmethod
+    def __all_artifacts_query() -> str:
+        """
+        Creates a query that selects the IDs of all artifacts of the tracker
+
+        :return:    Query (a simple select statement)
+        """
+        return ("SELECT artifact_id\n"
+                "FROM artifact_report\n"
+                "WHERE ((tracker_id = :tracker_id) AND\n"
+                "       (artifact_id > :after_artifact_id))")
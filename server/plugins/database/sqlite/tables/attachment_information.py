@@ -0,0 +1,248 @@
+"""
+Salamander ALM
+Copyright (c) 2016  Djuro Drljaca
+
+This Python module is free software; you can redistribute it and/or modify it under the terms of the
+GNU General Public License as published by the Free Software Foundation; either version 2 of the
+License, or (at your option) any later version.
+
+This Python module is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License along with this library. If
+not, see <http://www.gnu.org/licenses/>.
+"""
+
+from plugins.database.sqlite.connection import ConnectionSqlite
+from database.tables.attachment_information import AttachmentInformationTable
+import sqlite3
+from typing import List, Optional
+
+
+class AttachmentInformationTableSqlite(AttachmentInformationTable):
+    """
+    Implementation of "attachment_information" table for SQLite database
+
+    Table's columns:
+
+    - id:               int
+    - attachment_id:    int, references attachment.id
+    - file_name:        str
+    - content_hash:     str (SHA-256 of the content, hex encoded)
+    - size:             int
+    - active:           bool
+    - revision_id:      int, references revision.id
+    """
+
+    def __init__(self):
+        """
+        Constructor
+        """
+        AttachmentInformationTable.__init__(self)
+
+    def create(self, connection: ConnectionSqlite) -> None:
+        """
+        Creates the table
+
+        :param connection:  Database connection
+        """
+        connection.execute(
+            "CREATE TABLE attachment_information (\n"
+            "    id            INTEGER PRIMARY KEY AUTOINCREMENT\n"
+            "                          NOT NULL,\n"
+            "    attachment_id INTEGER REFERENCES attachment (id)\n"
+            "                          NOT NULL,\n"
+            "    file_name     TEXT    NOT NULL\n"
+            "                          CHECK (length(file_name) > 0),\n"
+            "    content_hash  TEXT    NOT NULL\n"
+            "                          CHECK (length(content_hash) = 64),\n"
+            "    size          INTEGER NOT NULL\n"
+            "                          CHECK (size >= 0),\n"
+            "    active        BOOLEAN NOT NULL\n"
+            "                          CHECK ( (active = 0) OR\n"
+            "                                  (active = 1) ),\n"
+            "    revision_id   INTEGER REFERENCES revision (id)\n"
+            "                          NOT NULL\n"
+            ")")
+
+        # Composite index allows the latest revision of an attachment to be found with an index
+        # seek
+        connection.execute(
+            "CREATE INDEX attachment_information_ix_attachment_id_revision_id\n"
+            "ON attachment_information (\n"
+            "    attachment_id,\n"
+            "    revision_id\n"
+            ")")
+
+    def read_information(self,
+                         connection: ConnectionSqlite,
+                         attachment_id: int,
+                         max_revision_id: int) -> Optional[dict]:
+        """
+        Reads attachment information for the specified attachment and max revision
+
+        :param connection:      Database connection
+        :param attachment_id:   ID of the attachment
+        :param max_revision_id: Maximum revision ID for the search
+
+        :return:    Attachment information
+
+        Returned dictionary contains items:
+
+        - id
+        - attachment_id
+        - file_name
+        - content_hash
+        - size
+        - active
+        - revision_id
+        """
+        cursor = connection.execute(
+            "SELECT id,\n"
+            "       attachment_id,\n"
+            "       file_name,\n"
+            "       content_hash,\n"
+            "       size,\n"
+            "       active,\n"
+            "       revision_id\n"
+            "FROM attachment_information\n"
+            "WHERE ((attachment_id = :attachment_id) AND\n"
+            "       (revision_id <= :max_revision_id))\n"
+            "ORDER BY revision_id DESC\n"
+            "LIMIT 1",
+            {"attachment_id": attachment_id,
+             "max_revision_id": max_revision_id})
+
+        information = None
+        row = cursor.fetchone()
+
+        if row is not None:
+            information = AttachmentInformationTableSqlite.__create_information(row)
+
+        return information
+
+    def read_attachments(self,
+                         connection: ConnectionSqlite,
+                         artifact_id: int,
+                         max_revision_id: int) -> List[dict]:
+        """
+        Reads information of all active attachments of the artifact in the specified revision
+
+        :param connection:      Database connection
+        :param artifact_id:     ID of the artifact
+        :param max_revision_id: Maximum revision ID for the search
+
+        :return:    Attachment information ordered by the attachment ID
+
+        Each dictionary in the returned list contains items:
+
+        - id
+        - attachment_id
+        - file_name
+        - content_hash
+        - size
+        - active
+        - revision_id
+        """
+        # Attachments are found with an index seek on "artifact_id" and the latest information of
+        # each attachment with an index seek on "attachment_id" and "revision_id"
+        cursor = connection.execute(
+            "SELECT ATI.id,\n"
+            "       ATI.attachment_id,\n"
+            "       ATI.file_name,\n"
+            "       ATI.content_hash,\n"
+            "       ATI.size,\n"
+            "       ATI.active,\n"
+            "       ATI.revision_id\n"
+            "FROM attachment AS AT\n"
+            "INNER JOIN attachment_information AS ATI\n"
+            "    ON (ATI.id = (\n"
+            "            SELECT ATI2.id\n"
+            "            FROM attachment_information AS ATI2\n"
+            "            WHERE ((ATI2.attachment_id = AT.id) AND\n"
+            "                   (ATI2.revision_id <= :max_revision_id))\n"
+            "            ORDER BY ATI2.revision_id DESC\n"
+            "            LIMIT 1\n"
+            "       ))\n"
+            "WHERE ((AT.artifact_id = :artifact_id) AND\n"
+            "       (ATI.active = 1))\n"
+            "ORDER BY AT.id",
+            {"artifact_id": artifact_id,
+             "max_revision_id": max_revision_id})
+
+        attachments = list()
+
+        for row in cursor.fetchall():
+            attachments.append(AttachmentInformationTableSqlite.__create_information(row))
+
+        return attachments
+
+    def insert_row(self,
+                   connection: ConnectionSqlite,
+                   attachment_id: int,
+                   file_name: str,
+                   content_hash: str,
+                   size: int,
+                   active: bool,
+                   revision_id: int) -> Optional[int]:
+        """
+        Inserts a new row in the table
+
+        :param connection:      Database connection
+        :param attachment_id:   ID of the attachment
+        :param file_name:       File name of the attachment
+        :param content_hash:    SHA-256 of the content (hex encoded)
+        :param size:            Size of the content (in bytes)
+        :param active:          State of the attachment (active or inactive)
+        :param revision_id:     Revision ID
+
+        :return:    ID of the newly created row
+        """
+        try:
+            cursor = connection.execute(
+                "INSERT INTO attachment_information\n"
+                "   (id,\n"
+                "    attachment_id,\n"
+                "    file_name,\n"
+                "    content_hash,\n"
+                "    size,\n"
+                "    active,\n"
+                "    revision_id)\n"
+                "VALUES (NULL,\n"
+                "        :attachment_id,\n"
+                "        :file_name,\n"
+                "        :content_hash,\n"
+                "        :size,\n"
+                "        :active,\n"
+                "        :revision_id)",
+                {"attachment_id": attachment_id,
+                 "file_name": file_name,
+                 "content_hash": content_hash,
+                 "size": size,
+                 "active": active,
+                 "revision_id": revision_id})
+
+            row_id = cursor.lastrowid
+        except sqlite3.IntegrityError:
+            # Error occurred
+            row_id = None
+
+        return row_id
+
+    @staticmethod
+    def __create_information(row: sqlite3.Row) -> dict:
+        """
+        Creates attachment information from a row of the table
+
+        :param row: Row of the table
+
+        :return:    Attachment information
+        """
+        return {"id": row["id"],
+                "attachment_id": row["attachment_id"],
+                "file_name": row["file_name"],
+                "content_hash": row["content_hash"],
+                "size": row["size"],
+                "active": bool(row["active"]),
+                "revision_id": row["revision_id"]}
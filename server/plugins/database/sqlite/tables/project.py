@@ -40,7 +40,7 @@ class ProjectTableSqlite(ProjectTable):
 
         :param connection:  Database connection
         """
-        connection.native_connection.execute(
+        connection.execute(
             "CREATE TABLE project (\n"
             "    id INTEGER PRIMARY KEY AUTOINCREMENT\n"
             "               NOT NULL\n"
@@ -54,7 +54,7 @@ class ProjectTableSqlite(ProjectTable):
 
         :return:    List of project IDs
         """
-        cursor = connection.native_connection.execute(
+        cursor = connection.execute(
             "SELECT id\n"
             "FROM project")
 
@@ -73,7 +73,7 @@ class ProjectTableSqlite(ProjectTable):
 
         :return:    ID of the newly created row
         """
-        cursor = connection.native_connection.execute(
+        cursor = connection.execute(
             "INSERT INTO project\n"
             "   (id)\n"
             "VALUES (NULL)")
@@ -0,0 +1,108 @@
+"""
+Salamander ALM
+Copyright (c) 2016  Djuro Drljaca
+
+This Python module is free software; you can redistribute it and/or modify it under the terms of the
+GNU General Public License as published by the Free Software Foundation; either version 2 of the
+License, or (at your option) any later version.
+
+This Python module is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License along with this library. If
+not, see <http://www.gnu.org/licenses/>.
+"""
+
+from plugins.database.sqlite.connection import ConnectionSqlite
+from database.tables.project_current import ProjectCurrentTable
+
+
+class ProjectCurrentTableSqlite(ProjectCurrentTable):
+    """
+    Implementation of "project_current" table for SQLite database
+
+    Table's columns:
+
+    - project_id: int, references project.id
+    - short_name: str
+    - full_name:  str
+
+    Table is maintained with triggers: a new project information of an active project replaces the
+    row of the project (attributes are taken from the latest row that contains them) and a new
+    project information of an inactive project removes it.
+
+    Unique indexes on "short_name" and "full_name" make the trigger fail with an integrity error if
+    an active project would get the same short name or full name as another active project, so the
+    insert of such project information is rejected by the database.
+    """
+
+    def __init__(self):
+        """
+        Constructor
+        """
+        ProjectCurrentTable.__init__(self)
+
+    def create(self, connection: ConnectionSqlite) -> None:
+        """
+        Creates the table
+
+        :param connection:  Database connection
+
+        NOTE:   Table must be created after the "project_information" table!
+        """
+        connection.execute(
+            "CREATE TABLE project_current (\n"
+            "    project_id  INTEGER PRIMARY KEY REFERENCES project (id)\n"
+            "                        NOT NULL,\n"
+            "    short_name  TEXT    NOT NULL,\n"
+            "    full_name   TEXT    NOT NULL\n"
+            ")")
+
+        connection.execute(
+            "CREATE UNIQUE INDEX project_current_ix_short_name ON project_current (\n"
+            "    short_name\n"
+            ")")
+
+        connection.execute(
+            "CREATE UNIQUE INDEX project_current_ix_full_name ON project_current (\n"
+            "    full_name\n"
+            ")")
+
+        # Attributes of the project are read from its latest row that contains them (index seek on
+        # "project_id" and "revision_id"). The old row of the project is deleted first so that its
+        # own attributes do not conflict with the new ones.
+        connection.execute(
+            "CREATE TRIGGER project_current_tr_active\n"
+            "AFTER INSERT ON project_information\n"
+            "WHEN (NEW.active = 1)\n"
+            "BEGIN\n"
+            "    DELETE FROM project_current\n"
+            "    WHERE (project_id = NEW.project_id);\n"
+            "\n"
+            "    INSERT INTO project_current\n"
+            "       (project_id,\n"
+            "        short_name,\n"
+            "        full_name)\n"
+            "    SELECT PI.project_id,\n"
+            "           PI.short_name,\n"
+            "           PI.full_name\n"
+            "    FROM project_information AS PI\n"
+            "    WHERE (PI.id = (\n"
+            "                SELECT PI2.id\n"
+            "                FROM project_information AS PI2\n"
+            "                WHERE ((PI2.project_id = NEW.project_id) AND\n"
+            "                       (PI2.short_name IS NOT NULL))\n"
+            "                ORDER BY PI2.revision_id DESC\n"
+            "                LIMIT 1\n"
+            "           ));\n"
+            "END")
+
+        connection.execute(
+            "CREATE TRIGGER project_current_tr_inactive\n"
+            "AFTER INSERT ON project_information\n"
+            "WHEN (NEW.active = 0)\n"
+            "BEGIN\n"
+            "    DELETE FROM project_current\n"
+            "    WHERE (project_id = NEW.project_id);\n"
+            "END")
@@ -14,10 +14,11 @@ You should have received a copy of the GNU Lesser General Public License along w
 not, see <http://www.gnu.org/licenses/>.
 """
 
-from plugins.database.sqlite.connection import ConnectionSqlite
+from plugins.database.sqlite.connection import ConnectionSqlite, id_list_chunks
+from plugins.database.sqlite.tables.text_content import TextContentTableSqlite
 from database.tables.project_information import ProjectInformationTable, ProjectSelection
 import sqlite3
-from typing import Any, List, Optional
+from typing import Any, Dict, List, Optional
 
 
 class ProjectInformationTableSqlite(ProjectInformationTable):
@@ -26,56 +27,80 @@ class ProjectInformationTableSqlite(ProjectInformationTable):
 
     Table's columns:
 
-    - id:           int
-    - project_id:   int, references project.id
-    - short_name:   str
-    - full_name:    str
-    - description:  Optional[str]
-    - active:       bool
-    - revision_id:  int, references revision.id
+    - id:               int
+    - project_id:       int, references project.id
+    - short_name:       Optional[str]
+    - full_name:        Optional[str]
+    - description_id:   Optional[int], references text_content.id
+    - active:           bool
+    - revision_id:      int, references revision.id
+
+    A row either contains all of the project's attributes or it is a state row (see
+    "insert_state_row") that only changes the state (active or inactive) and leaves all of the
+    other attributes ("NULL") unchanged. The attributes of a project in a revision are taken from
+    the latest row that contains them ("short_name" is not "NULL").
     """
 
-    def __init__(self):
+    def __init__(self, text_content: TextContentTableSqlite):
         """
         Constructor
+
+        :param text_content:    Table that stores the descriptions
         """
         ProjectInformationTable.__init__(self)
 
+        self.__text_content = text_content
+
     def create(self, connection: ConnectionSqlite) -> None:
         """
         Creates the table
 
         :param connection:  Database connection
         """
-        connection.native_connection.execute(
+        connection.execute(
             "CREATE TABLE project_information (\n"
-            "    id          INTEGER PRIMARY KEY AUTOINCREMENT\n"
-            "                        NOT NULL,\n"
-            "    project_id  INTEGER REFERENCES project (id)\n"
-            "                        NOT NULL,\n"
-            "    short_name  TEXT    NOT NULL\n"
-            "                        CHECK (length(short_name) > 0),\n"
-            "    full_name   TEXT    NOT NULL\n"
-            "                        CHECK (length(full_name) > 0),\n"
-            "    description TEXT,\n"
-            "    active      BOOLEAN NOT NULL\n"
-            "                        CHECK ( (active = 0) OR\n"
-            "                                (active = 1) ),\n"
-            "    revision_id INTEGER REFERENCES revision (id) \n"
-            "                        NOT NULL\n"
+            "    id             INTEGER PRIMARY KEY AUTOINCREMENT\n"
+            "                           NOT NULL,\n"
+            "    project_id     INTEGER REFERENCES project (id)\n"
+            "                           NOT NULL,\n"
+            "    short_name     TEXT    CHECK (length(short_name) > 0),\n"
+            "    full_name      TEXT    CHECK (length(full_name) > 0),\n"
+            "    description_id INTEGER REFERENCES text_content (id),\n"
+            "    active         BOOLEAN NOT NULL\n"
+            "                           CHECK ( (active = 0) OR\n"
+            "                                   (active = 1) ),\n"
+            "    revision_id    INTEGER REFERENCES revision (id) \n"
+            "                           NOT NULL,\n"
+            "    CHECK ( ((short_name IS NOT NULL) AND\n"
+            "             (full_name IS NOT NULL)) OR\n"
+            "            ((short_name IS NULL) AND\n"
+            "             (full_name IS NULL) AND\n"
+            "             (description_id IS NULL)) )\n"
             ")")
 
-        connection.native_connection.execute(
-            "CREATE INDEX project_information_ix_project_id ON project_information (\n"
-            "    project_id\n"
+        # Composite index allows the latest revision of a project to be found with an index seek
+        connection.execute(
+            "CREATE INDEX project_information_ix_project_id_revision_id\n"
+            "ON project_information (\n"
+            "    project_id,\n"
+            "    revision_id\n"
             ")")
 
-        connection.native_connection.execute(
+        # Partial index allows the latest attributes of a project to be found with an index seek
+        connection.execute(
+            "CREATE INDEX project_information_ix_project_id_revision_id_attributes\n"
+            "ON project_information (\n"
+            "    project_id,\n"
+            "    revision_id\n"
+            ")\n"
+            "WHERE (short_name IS NOT NULL)")
+
+        connection.execute(
             "CREATE INDEX project_information_ix_short_name ON project_information (\n"
             "    short_name\n"
             ")")
 
-        connection.native_connection.execute(
+        connection.execute(
             "CREATE INDEX project_information_ix_full_name ON project_information (\n"
             "    full_name\n"
             ")")
@@ -98,11 +123,7 @@ class ProjectInformationTableSqlite(ProjectInformationTable):
             "       active\n"
             "FROM (\n"
             "    SELECT PI1.project_id,\n"
-            "           PI1.short_name,\n"
-            "           PI1.full_name,\n"
-            "           PI1.description,\n"
-            "           PI1.active,\n"
-            "           PI1.revision_id\n"
+            "           PI1.active\n"
             "    FROM project_information AS PI1\n"
             "    WHERE (PI1.revision_id = (\n"
             "                SELECT MAX(PI2.revision_id)\n"
@@ -121,7 +142,7 @@ class ProjectInformationTableSqlite(ProjectInformationTable):
             # Nothing needed for selecting all users
             pass
 
-        cursor = connection.native_connection.execute(query, {"max_revision_id": max_revision_id})
+        cursor = connection.execute(query, {"max_revision_id": max_revision_id})
 
         # Process result
         projects = list()
@@ -168,44 +189,58 @@ class ProjectInformationTableSqlite(ProjectInformationTable):
         if attribute_name not in ["project_id", "short_name", "full_name"]:
             raise AttributeError("Unsupported attribute name")
 
-        # Read the users that match the search attribute
+        # ID of the row with the latest attributes of the project (index seek on the partial index)
+        attributes_row_id = (
+            "(\n"
+            "            SELECT PA2.id\n"
+            "            FROM project_information AS PA2\n"
+            "            WHERE ((PA2.project_id = PA.project_id) AND\n"
+            "                   (PA2.short_name IS NOT NULL) AND\n"
+            "                   (PA2.revision_id <= :max_revision_id))\n"
+            "            ORDER BY PA2.revision_id DESC\n"
+            "            LIMIT 1\n"
+            "       )"
+        )
+
+        # Read the projects that match the search attribute: the latest attributes of each project
+        # are matched (index seek on the search attribute) and joined with the latest state of the
+        # project (index seek on "project_id" and "revision_id")
         query = (
-            "SELECT project_id,\n"
-            "       short_name,\n"
-            "       full_name,\n"
-            "       description,\n"
-            "       active,\n"
-            "       revision_id\n"
-            "FROM (\n"
-            "    SELECT PI1.id,\n"
-            "           PI1.project_id,\n"
-            "           PI1.short_name,\n"
-            "           PI1.full_name,\n"
-            "           PI1.description,\n"
-            "           PI1.active,\n"
-            "           PI1.revision_id\n"
-            "    FROM project_information AS PI1\n"
-            "    WHERE (PI1.revision_id = (\n"
-            "                SELECT MAX(PI2.revision_id)\n"
-            "                FROM project_information AS PI2\n"
-            "                WHERE ((PI2.project_id = PI1.project_id) AND\n"
-            "                       (PI2.revision_id <= :max_revision_id))\n"
-            "           ))\n"
-            ")\n"
+            "SELECT PA.project_id,\n"
+            "       PA.short_name,\n"
+            "       PA.full_name,\n"
+            "       text_content_decode(TC.content) AS description,\n"
+            "       PI.active,\n"
+            "       PI.revision_id\n"
+            "FROM project_information AS PA\n"
+            "INNER JOIN project_information AS PI\n"
+            "    ON (PI.id = (\n"
+            "            SELECT PI2.id\n"
+            "            FROM project_information AS PI2\n"
+            "            WHERE ((PI2.project_id = PA.project_id) AND\n"
+            "                   (PI2.revision_id <= :max_revision_id))\n"
+            "            ORDER BY PI2.revision_id DESC\n"
+            "            LIMIT 1\n"
+            "       ))\n"
+            "LEFT OUTER JOIN text_content AS TC\n"
+            "    ON (TC.id = PA.description_id)\n"
         )
 
         if project_selection == ProjectSelection.Active:
-            query += ("WHERE (({0} = :attribute_value) AND\n"
-                      "       (active = 1))")
+            query += ("WHERE ((PA.{0} = :attribute_value) AND\n"
+                      "       (PA.id = {1}) AND\n"
+                      "       (PI.active = 1))")
         elif project_selection == ProjectSelection.Inactive:
-            query += ("WHERE (({0} = :attribute_value) AND\n"
-                      "       (active = 0))")
+            query += ("WHERE ((PA.{0} = :attribute_value) AND\n"
+                      "       (PA.id = {1}) AND\n"
+                      "       (PI.active = 0))")
         else:
-            query += "WHERE ({0} = :attribute_value)"
+            query += ("WHERE ((PA.{0} = :attribute_value) AND\n"
+                      "       (PA.id = {1}))")
 
-        cursor = connection.native_connection.execute(query.format(attribute_name),
-                                                      {"attribute_value": attribute_value,
-                                                       "max_revision_id": max_revision_id})
+        cursor = connection.execute(query.format(attribute_name, attributes_row_id),
+                                    {"attribute_value": attribute_value,
+                                     "max_revision_id": max_revision_id})
 
         # Process result
         projects = list()
@@ -229,47 +264,254 @@ class ProjectInformationTableSqlite(ProjectInformationTable):
                    full_name: str,
                    description: str,
                    active: bool,
-                   revision_id: int) -> Optional[int]:
+                   revision_id: int,
+                   expected_revision_id: Optional[int] = None) -> Optional[int]:
         """
         Inserts a new row in the table
 
+        :param connection:           Database connection
+        :param project_id:           ID of the project
+        :param short_name:           Project short name
+        :param full_name:            Project full name
+        :param description:          Project description
+        :param active:               State of the project (active or inactive)
+        :param revision_id:          Revision ID
+        :param expected_revision_id: Expected revision ID of the latest row (optional)
+
+        :return:    ID of the newly created row
+
+        NOTE:   If the expected revision ID is specified the row is inserted only if the latest
+                row of the project is still from the expected revision!
+        """
+        description_id = None
+
+        if description is not None:
+            description_id = self.__text_content.insert_text(connection, description)
+
+            if description_id is None:
+                # Error, failed to store the description
+                return None
+
+        query = (
+            "INSERT INTO project_information\n"
+            "   (id,\n"
+            "    project_id,\n"
+            "    short_name,\n"
+            "    full_name,\n"
+            "    description_id,\n"
+            "    active,\n"
+            "    revision_id)\n"
+            "SELECT NULL,\n"
+            "       :project_id,\n"
+            "       :short_name,\n"
+            "       :full_name,\n"
+            "       :description_id,\n"
+            "       :active,\n"
+            "       :revision_id"
+        )
+        parameters = {"project_id": project_id,
+                      "short_name": short_name,
+                      "full_name": full_name,
+                      "description_id": description_id,
+                      "active": active,
+                      "revision_id": revision_id}
+
+        if expected_revision_id is not None:
+            # Insert the row only if the latest row of the project is from the expected revision
+            # (index seek on "project_id" and "revision_id")
+            query += ("\n"
+                      "WHERE ((\n"
+                      "    SELECT PI.revision_id\n"
+                      "    FROM project_information AS PI\n"
+                      "    WHERE (PI.project_id = :project_id)\n"
+                      "    ORDER BY PI.revision_id DESC\n"
+                      "    LIMIT 1\n"
+                      ") = :expected_revision_id)")
+            parameters["expected_revision_id"] = expected_revision_id
+
+        try:
+            cursor = connection.execute(query, parameters)
+
+            if cursor.rowcount == 1:
+                row_id = cursor.lastrowid
+            else:
+                # Error, the project was modified after the expected revision
+                row_id = None
+        except sqlite3.IntegrityError:
+            # Error occurred
+            row_id = None
+
+        return row_id
+
+    def insert_state_row(self,
+                         connection: ConnectionSqlite,
+                         project_id: int,
+                         active: bool,
+                         revision_id: int) -> Optional[int]:
+        """
+        Inserts a new row in the table that only changes the state of the project (all of the other
+        attributes of the project are unchanged)
+
         :param connection:  Database connection
         :param project_id:  ID of the project
-        :param short_name:  Project short name
-        :param full_name:   Project full name
-        :param description: Project description
-        :param active:      State of the project (active or inactive)
+        :param active:      New state of the project (active or inactive)
         :param revision_id: Revision ID
 
         :return:    ID of the newly created row
+
+        NOTE:   The row is inserted only if the project exists and its latest state is different
+                from the new state!
         """
         try:
-            cursor = connection.native_connection.execute(
+            cursor = connection.execute(
                 "INSERT INTO project_information\n"
                 "   (id,\n"
                 "    project_id,\n"
                 "    short_name,\n"
                 "    full_name,\n"
-                "    description,\n"
+                "    description_id,\n"
                 "    active,\n"
                 "    revision_id)\n"
-                "VALUES (NULL,\n"
-                "        :project_id,\n"
-                "        :short_name,\n"
-                "        :full_name,\n"
-                "        :description,\n"
-                "        :active,\n"
-                "        :revision_id)",
+                "SELECT NULL,\n"
+                "       PI.project_id,\n"
+                "       NULL,\n"
+                "       NULL,\n"
+                "       NULL,\n"
+                "       :active,\n"
+                "       :revision_id\n"
+                "FROM project_information AS PI\n"
+                "WHERE ((PI.id = (\n"
+                "            SELECT PI2.id\n"
+                "            FROM project_information AS PI2\n"
+                "            WHERE (PI2.project_id = :project_id)\n"
+                "            ORDER BY PI2.revision_id DESC\n"
+                "            LIMIT 1\n"
+                "       )) AND\n"
+                "       (PI.active != :active))",
                 {"project_id": project_id,
-                 "short_name": short_name,
-                 "full_name": full_name,
-                 "description": description,
                  "active": active,
                  "revision_id": revision_id})
 
-            row_id = cursor.lastrowid
+            if cursor.rowcount == 1:
+                row_id = cursor.lastrowid
+            else:
+                # Error, the project does not exist or it is already in the requested state
+                row_id = None
         except sqlite3.IntegrityError:
             # Error occurred
             row_id = None
 
         return row_id
+
+    def read_states(self,
+                    connection: ConnectionSqlite,
+                    project_ids: List[int],
+                    max_revision_id: int) -> Dict[int, bool]:
+        """
+        Reads the latest state of all of the specified projects for the max revision
+
+        :param connection:      Database connection
+        :param project_ids:     List of project IDs
+        :param max_revision_id: Maximum revision ID for the search
+
+        :return:    State (active or inactive) of each of the projects that were found (key is the
+                    project ID)
+        """
+        states = dict()
+
+        # Read the states in chunks to stay below the limit of SQL parameters
+        for values, parameters in id_list_chunks(project_ids,
+                                                 "project_id",
+                                                 {"max_revision_id": max_revision_id}):
+            # For each of the requested projects the latest row is found with an index seek on
+            # "project_id" and "revision_id"
+            query = (
+                "SELECT ID.project_id,\n"
+                "       PI.active\n"
+                "FROM (\n"
+                "    SELECT column1 AS project_id\n"
+                "    FROM (VALUES {0})\n"
+                ") AS ID\n"
+                "INNER JOIN project_information AS PI\n"
+                "    ON (PI.id = (\n"
+                "            SELECT PI2.id\n"
+                "            FROM project_information AS PI2\n"
+                "            WHERE ((PI2.project_id = ID.project_id) AND\n"
+                "                   (PI2.revision_id <= :max_revision_id))\n"
+                "            ORDER BY PI2.revision_id DESC\n"
+                "            LIMIT 1\n"
+                "       ))"
+            ).format(values)
+
+            cursor = connection.execute(query, parameters)
+
+            for row in cursor.fetchall():
+                states[row["project_id"]] = bool(row["active"])
+
+        return states
+
+    def insert_state_rows(self,
+                          connection: ConnectionSqlite,
+                          project_ids: List[int],
+                          active: bool,
+                          revision_id: int) -> List[int]:
+        """
+        Inserts new rows in the table that only change the state of the projects (all of the other
+        attributes of the projects are unchanged)
+
+        :param connection:      Database connection
+        :param project_ids:     List of project IDs
+        :param active:          New state of the projects (active or inactive)
+        :param revision_id:     Revision ID
+
+        :return:    IDs of the projects whose rows were inserted
+
+        NOTE:   Unlike "insert_state_row" this does not check the existence or the latest state of
+                the projects!
+
+        NOTE:   Rows that violate a constraint (for example names that are already used by an
+                active project) are not inserted, the other rows are still inserted!
+        """
+        if len(project_ids) == 0:
+            # Nothing to insert
+            return list()
+
+        query = ("INSERT INTO project_information\n"
+                 "   (id,\n"
+                 "    project_id,\n"
+                 "    active,\n"
+                 "    revision_id)\n"
+                 "VALUES (NULL,\n"
+                 "        :project_id,\n"
+                 "        :active,\n"
+                 "        :revision_id)")
+
+        value_array = list()
+
+        for project_id in project_ids:
+            value_item = {"project_id": project_id,
+                          "active": active,
+                          "revision_id": revision_id}
+            value_array.append(value_item)
+
+        # Rows of a failed batch are undone with the savepoint
+        connection.execute("SAVEPOINT project_information_state_rows")
+
+        try:
+            connection.executemany(query, value_array)
+            inserted_project_ids = list(project_ids)
+        except sqlite3.IntegrityError:
+            # Retry row by row so that only the violating rows are left out
+            connection.execute("ROLLBACK TO project_information_state_rows")
+            inserted_project_ids = list()
+
+            for value_item in value_array:
+                try:
+                    connection.execute(query, value_item)
+                    inserted_project_ids.append(value_item["project_id"])
+                except sqlite3.IntegrityError:
+                    # Error occurred, the row violates a constraint
+                    pass
+
+        connection.execute("RELEASE project_information_state_rows")
+        return inserted_project_ids
@@ -45,7 +45,7 @@ class RevisionTableSqlite(RevisionTable):
 
         :param connection:  Database connection
         """
-        connection.native_connection.execute(
+        connection.execute(
             "CREATE TABLE revision (\n"
             "    id        INTEGER PRIMARY KEY AUTOINCREMENT\n"
             "                      NOT NULL,\n"
@@ -63,7 +63,7 @@ class RevisionTableSqlite(RevisionTable):
 
         :return:    ID of the current revision
         """
-        cursor = connection.native_connection.execute("SELECT MAX(id) FROM revision")
+        cursor = connection.execute("SELECT MAX(id) FROM revision")
         row = cursor.fetchone()
 
         revision_id = None
@@ -88,7 +88,7 @@ class RevisionTableSqlite(RevisionTable):
         - timestamp
         - user_id
         """
-        cursor = connection.native_connection.execute(
+        cursor = connection.execute(
             "SELECT id,\n"
             "       timestamp,\n"
             "       user_id\n"
@@ -128,7 +128,7 @@ class RevisionTableSqlite(RevisionTable):
         revisions = list()
 
         if min_revision_id <= max_revision_id:
-            cursor = connection.native_connection.execute(
+            cursor = connection.execute(
                 "SELECT id,\n"
                 "       timestamp,\n"
                 "       user_id\n"
@@ -168,7 +168,7 @@ class RevisionTableSqlite(RevisionTable):
         revisions = list()
 
         if min_timestamp <= max_timestamp:
-            cursor = connection.native_connection.execute(
+            cursor = connection.execute(
                 "SELECT id,\n"
                 "       timestamp,\n"
                 "       user_id\n"
@@ -200,7 +200,7 @@ class RevisionTableSqlite(RevisionTable):
         :return:    ID of the newly created row
         """
         try:
-            cursor = connection.native_connection.execute(
+            cursor = connection.execute(
                 "INSERT INTO revision\n"
                 "   (id,\n"
                 "    timestamp,\n"
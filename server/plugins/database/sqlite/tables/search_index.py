@@ -0,0 +1,278 @@
+"""
+Salamander ALM
+Copyright (c) 2016  Djuro Drljaca
+
+This Python module is free software; you can redistribute it and/or modify it under the terms of the
+GNU General Public License as published by the Free Software Foundation; either version 2 of the
+License, or (at your option) any later version.
+
+This Python module is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License along with this library. If
+not, see <http://www.gnu.org/licenses/>.
+"""
+
+from plugins.database.sqlite.connection import ConnectionSqlite
+from database.tables.search_index import SearchIndexTable, SearchObjectType
+from typing import List, Optional
+
+
+class SearchIndexTableSqlite(SearchIndexTable):
+    """
+    Implementation of "search_index" table for SQLite database (FTS5 virtual table)
+
+    Table's columns:
+
+    - rowid:    int, encoded object type and object ID (see below)
+    - title:    str
+    - body:     str
+
+    Each indexed object has exactly one row in the table. Row ID is calculated from the object ID
+    and the object type code ("object_id * 4 + object_type_code") so that the row of an object can
+    be replaced with a row ID lookup.
+
+    The table is maintained with triggers on the "*_information" tables: when a new revision of an
+    object is inserted its row is replaced with the latest attributes of the object (or just removed
+    if the object is not active anymore).
+    Text field values of an artifact are appended to its row when they are inserted.
+    """
+
+    def __init__(self):
+        """
+        Constructor
+        """
+        SearchIndexTable.__init__(self)
+
+        self.__object_type_codes = {SearchObjectType.Project: 0,
+                                    SearchObjectType.Tracker: 1,
+                                    SearchObjectType.TrackerField: 2,
+                                    SearchObjectType.Artifact: 3}
+        self.__object_type_count = len(self.__object_type_codes)
+
+        # Weights of the "title" and "body" columns for the ranking of the results
+        self.__title_weight = 10.0
+        self.__body_weight = 1.0
+
+    def create(self, connection: ConnectionSqlite) -> None:
+        """
+        Creates the table
+
+        :param connection:  Database connection
+
+        NOTE:   This table must be created after all of the tables that it indexes!
+        """
+        connection.execute(
+            "CREATE VIRTUAL TABLE search_index USING fts5 (\n"
+            "    title,\n"
+            "    body,\n"
+            "    tokenize = 'unicode61 remove_diacritics 2',\n"
+            "    prefix = '2 3'\n"
+            ")")
+
+        self.create_triggers(connection)
+
+    def create_triggers(self, connection: ConnectionSqlite) -> None:
+        """
+        Creates the triggers that maintain the search index
+
+        :param connection:  Database connection
+
+        NOTE:   This is also used by the migrations of the database schema that change the indexed
+                tables (the old triggers need to be dropped first)!
+        """
+        # Descriptions are stored in the "text_content" table
+        description_expression = ("(SELECT text_content_decode(TC.content)\n"
+                                  "            FROM text_content AS TC\n"
+                                  "            WHERE (TC.id = A.description_id))")
+
+        self.__create_information_trigger(connection,
+                                          "project_information",
+                                          "project_id",
+                                          "short_name",
+                                          SearchObjectType.Project,
+                                          "A.short_name || ' ' || A.full_name",
+                                          description_expression)
+
+        self.__create_information_trigger(connection,
+                                          "tracker_information",
+                                          "tracker_id",
+                                          "short_name",
+                                          SearchObjectType.Tracker,
+                                          "A.short_name || ' ' || A.full_name",
+                                          description_expression)
+
+        self.__create_information_trigger(connection,
+                                          "tracker_field_information",
+                                          "tracker_field_id",
+                                          "name",
+                                          SearchObjectType.TrackerField,
+                                          "A.name || ' ' || A.display_name",
+                                          description_expression)
+
+        # Artifact's text is made of its text field values which are inserted after the artifact
+        # information so they are appended to the (initially empty) row of the artifact
+        self.__create_information_trigger(connection,
+                                          "artifact_information",
+                                          "artifact_id",
+                                          None,
+                                          SearchObjectType.Artifact,
+                                          "''",
+                                          "''")
+
+        connection.execute(
+            "CREATE TRIGGER search_index_tr_artifact_field_value\n"
+            "AFTER INSERT ON artifact_field_value\n"
+            "WHEN (typeof(NEW.value) = 'text')\n"
+            "BEGIN\n"
+            "    UPDATE search_index\n"
+            "    SET body = ltrim(body || ' ' || NEW.value)\n"
+            "    WHERE (rowid = (\n"
+            "        SELECT (AI.artifact_id * {0} + {1})\n"
+            "        FROM artifact_information AS AI\n"
+            "        WHERE (AI.id = NEW.artifact_information_id)\n"
+            "    ));\n"
+            "END".format(self.__object_type_count,
+                         self.__object_type_codes[SearchObjectType.Artifact]))
+
+    def search(self,
+               connection: ConnectionSqlite,
+               keywords: List[str],
+               object_types: Optional[List[SearchObjectType]],
+               limit: int,
+               offset: int) -> List[dict]:
+        """
+        Searches the index for objects that contain all of the keywords
+
+        :param connection:      Database connection
+        :param keywords:        Keywords to search for (each keyword matches as a prefix of a word)
+        :param object_types:    Object types to search for ("None" for all object types)
+        :param limit:           Max number of returned results
+        :param offset:          Number of results to skip
+
+        :return:    Search results ordered by relevance (best match first)
+
+        Each dictionary in the returned list contains items:
+
+        - object_type
+        - object_id
+        - title
+        - snippet
+        - rank (higher value means a better match)
+        """
+        if len(keywords) == 0:
+            return list()
+
+        # Each keyword is quoted (so that it can't be interpreted as FTS5 query syntax) and made
+        # into a prefix query, all of the keywords must match
+        match_expression = " ".join(
+            ["\"{0}\"*".format(keyword.replace("\"", "\"\"")) for keyword in keywords])
+
+        query = (
+            "SELECT rowid,\n"
+            "       title,\n"
+            "       snippet(search_index, -1, '[', ']', '...', 16) AS snippet,\n"
+            "       bm25(search_index, :title_weight, :body_weight) AS rank\n"
+            "FROM search_index\n"
+            "WHERE (search_index MATCH :match_expression)\n"
+        )
+
+        if object_types is not None:
+            codes = [str(self.__object_type_codes[x]) for x in object_types]
+
+            if len(codes) == 0:
+                return list()
+
+            query += "    AND ((rowid % {0}) IN ({1}))\n".format(self.__object_type_count,
+                                                                 ", ".join(codes))
+
+        query += ("ORDER BY rank\n"
+                  "LIMIT :limit OFFSET :offset")
+
+        cursor = connection.execute(query,
+                                    {"match_expression": match_expression,
+                                     "title_weight": self.__title_weight,
+                                     "body_weight": self.__body_weight,
+                                     "limit": limit,
+                                     "offset": offset})
+
+        # Process result
+        object_types_by_code = {code: object_type
+                                for object_type, code in self.__object_type_codes.items()}
+        results = list()
+
+        for row in cursor.fetchall():
+            results.append(
+                {"object_type": object_types_by_code[row["rowid"] % self.__object_type_count],
+                 "object_id": row["rowid"] // self.__object_type_count,
+                 "title": row["title"],
+                 "snippet": row["snippet"],
+                 "rank": -row["rank"]})
+
+        return results
+
+    def __create_information_trigger(self,
+                                     connection: ConnectionSqlite,
+                                     table_name: str,
+                                     object_id_column: str,
+                                     attributes_column: Optional[str],
+                                     object_type: SearchObjectType,
+                                     title_expression: str,
+                                     body_expression: str) -> None:
+        """
+        Creates a trigger that replaces the object's row in the search index when a new row is
+        inserted in the information table of the object
+
+        :param connection:          Database connection
+        :param table_name:          Name of the information table
+        :param object_id_column:    Name of the column in the information table with the object ID
+        :param attributes_column:   Name of the column that is "NULL" in the rows of the information
+                                    table that only change the state of the object ("None" if all
+                                    of the rows contain all of the attributes)
+        :param object_type:         Object type
+        :param title_expression:    SQL expression for the title (can reference the "A" row)
+        :param body_expression:     SQL expression for the body (can reference the "A" row)
+
+        The "A" row is the latest row of the object in the information table that contains all of
+        the attributes of the object.
+        """
+        row_id_expression = "(NEW.{0} * {1} + {2})".format(object_id_column,
+                                                           self.__object_type_count,
+                                                           self.__object_type_codes[object_type])
+
+        if attributes_column is None:
+            attributes_row_id_expression = "NEW.id"
+        else:
+            attributes_row_id_expression = (
+                "(\n"
+                "        SELECT A2.id\n"
+                "        FROM {0} AS A2\n"
+                "        WHERE ((A2.{1} = NEW.{1}) AND\n"
+                "               (A2.{2} IS NOT NULL))\n"
+                "        ORDER BY A2.revision_id DESC\n"
+                "        LIMIT 1\n"
+                "    )".format(table_name, object_id_column, attributes_column))
+
+        connection.execute(
+            "CREATE TRIGGER search_index_tr_{0}\n"
+            "AFTER INSERT ON {0}\n"
+            "BEGIN\n"
+            "    DELETE FROM search_index\n"
+            "    WHERE (rowid = {1});\n"
+            "\n"
+            "    INSERT INTO search_index\n"
+            "       (rowid,\n"
+            "        title,\n"
+            "        body)\n"
+            "    SELECT {1},\n"
+            "           {2},\n"
+            "           {3}\n"
+            "    FROM {0} AS A\n"
+            "    WHERE ((A.id = {4}) AND\n"
+            "           (NEW.active = 1));\n"
+            "END".format(table_name,
+                         row_id_expression,
+                         title_expression,
+                         body_expression,
+                         attributes_row_id_expression))
@@ -31,6 +31,8 @@ class SessionTokenTableSqlite(SessionTokenTable):
     - id:           int
     - user_id:      int, references user.id
     - created_on:   datetime
+    - expires_on:   datetime
+    - last_used_on: datetime
     - token:        str
     """
 
@@ -46,32 +48,44 @@ class SessionTokenTableSqlite(SessionTokenTable):
 
         :param connection:  Database connection
         """
-        connection.native_connection.execute(
+        # NOTE: "token" column doesn't need an extra index, its UNIQUE constraint already creates
+        #       one (it is also used for the lookup of the token)
+        connection.execute(
             "CREATE TABLE session_token (\n"
-            "    id          INTEGER PRIMARY KEY AUTOINCREMENT\n"
-            "                        NOT NULL,\n"
-            "    user_id     INTEGER REFERENCES user (id)\n"
-            "                        NOT NULL,\n"
-            "    created_on  TEXT    NOT NULL\n"
-            "                        CHECK (length(created_on) >= 23),\n"
-            "    token       TEXT    NOT NULL\n"
-            "                        UNIQUE\n"
-            "                        CHECK (length(token) = 32)\n"
+            "    id           INTEGER PRIMARY KEY AUTOINCREMENT\n"
+            "                         NOT NULL,\n"
+            "    user_id      INTEGER REFERENCES user (id)\n"
+            "                         NOT NULL,\n"
+            "    created_on   TEXT    NOT NULL\n"
+            "                         CHECK (length(created_on) >= 23),\n"
+            "    expires_on   TEXT    NOT NULL\n"
+            "                         CHECK (length(expires_on) >= 23),\n"
+            "    last_used_on TEXT    NOT NULL\n"
+            "                         CHECK (length(last_used_on) >= 23),\n"
+            "    token        TEXT    NOT NULL\n"
+            "                         UNIQUE\n"
+            "                         CHECK (length(token) = 32)\n"
             ")")
 
-        connection.native_connection.execute(
+        connection.execute(
             "CREATE INDEX session_token_ix_user_id ON session_token (\n"
             "    user_id\n"
             ")")
 
-        connection.native_connection.execute(
+        connection.execute(
             "CREATE INDEX session_token_ix_created_on ON session_token (\n"
             "    created_on\n"
             ")")
 
-        connection.native_connection.execute(
-            "CREATE INDEX session_token_ix_token ON session_token (\n"
-            "    token\n"
+        # Indexes used for pruning of the expired tokens
+        connection.execute(
+            "CREATE INDEX session_token_ix_expires_on ON session_token (\n"
+            "    expires_on\n"
+            ")")
+
+        connection.execute(
+            "CREATE INDEX session_token_ix_last_used_on ON session_token (\n"
+            "    last_used_on\n"
             ")")
 
     def read_token(self, connection: ConnectionSqlite, token: str) -> Optional[dict]:
@@ -88,12 +102,16 @@ class SessionTokenTableSqlite(SessionTokenTable):
         - id
         - user_id
         - created_on
+        - expires_on
+        - last_used_on
         - token
         """
-        cursor = connection.native_connection.execute(
+        cursor = connection.execute(
             "SELECT id,\n"
             "       user_id,\n"
             "       created_on,\n"
+            "       expires_on,\n"
+            "       last_used_on,\n"
             "       token\n"
             "FROM session_token\n"
             "WHERE (token = :token)\n",
@@ -104,7 +122,12 @@ class SessionTokenTableSqlite(SessionTokenTable):
         row = cursor.fetchone()
 
         if row is not None:
-            session_token_object = dict(row)
+            session_token_object = {"id": row["id"],
+                                    "user_id": row["user_id"],
+                                    "created_on": datetime_from_string(row["created_on"]),
+                                    "expires_on": datetime_from_string(row["expires_on"]),
+                                    "last_used_on": datetime_from_string(row["last_used_on"]),
+                                    "token": row["token"]}
 
         return session_token_object
 
@@ -112,6 +135,7 @@ class SessionTokenTableSqlite(SessionTokenTable):
                    connection: ConnectionSqlite,
                    user_id: int,
                    created_on: datetime.datetime,
+                   expires_on: datetime.datetime,
                    token: str) -> Optional[int]:
         """
         Inserts a new row in the table
@@ -119,23 +143,31 @@ class SessionTokenTableSqlite(SessionTokenTable):
         :param connection:  Database connection
         :param user_id:     ID of the user
         :param created_on:  Timestamp when the token was created
+        :param expires_on:  Timestamp when the token expires
         :param token:       Session token
 
         :return:    ID of the newly created row
+
+        NOTE:   Token's "last used on" timestamp is initialized to the "created on" timestamp.
         """
         try:
-            cursor = connection.native_connection.execute(
+            cursor = connection.execute(
                 "INSERT INTO session_token\n"
                 "   (id,\n"
                 "    user_id,\n"
                 "    created_on,\n"
+                "    expires_on,\n"
+                "    last_used_on,\n"
                 "    token)\n"
                 "VALUES (NULL,\n"
                 "        :user_id,\n"
                 "        :created_on,\n"
+                "        :expires_on,\n"
+                "        :created_on,\n"
                 "        :token)",
                 {"user_id": user_id,
                  "created_on": datetime_to_string(created_on),
+                 "expires_on": datetime_to_string(expires_on),
                  "token": token})
 
             row_id = cursor.lastrowid
@@ -145,13 +177,44 @@ class SessionTokenTableSqlite(SessionTokenTable):
 
         return row_id
 
+    def update_last_used_on(self, connection: ConnectionSqlite, last_used_on: dict) -> bool:
+        """
+        Updates the "last used on" timestamps of the specified tokens
+
+        :param connection:      Database connection
+        :param last_used_on:    Timestamps of the last use (key is the session token)
+
+        :return:    Success or failure
+
+        NOTE:   Timestamp of a token is updated only if it is newer than the stored one. Nothing is
+                updated if the database is currently locked by another writer!
+        """
+        try:
+            connection.executemany(
+                "UPDATE session_token\n"
+                "SET last_used_on = :last_used_on\n"
+                "WHERE ((token = :token) AND\n"
+                "       (last_used_on < :last_used_on))",
+                [{"token": token,
+                  "last_used_on": datetime_to_string(timestamp)}
+                 for token, timestamp in last_used_on.items()])
+        except sqlite3.OperationalError as e:
+            # A transaction that already reads from the database doesn't wait for the write lock
+            # (that could result in a deadlock), so the update is just skipped
+            if "database is locked" not in str(e):
+                raise
+
+            return False
+
+        return True
+
     def delete_all_rows(self, connection: ConnectionSqlite) -> None:
         """
         Removes all rows from the table
 
         :param connection:  Database connection
         """
-        connection.native_connection.execute("DELETE FROM session_token")
+        connection.execute("DELETE FROM session_token")
 
     def delete_row_by_user_id(self, connection: ConnectionSqlite, user_id: int) -> None:
         """
@@ -160,7 +223,7 @@ class SessionTokenTableSqlite(SessionTokenTable):
         :param connection:  Database connection
         :param user_id:     ID of the user
         """
-        connection.native_connection.execute(
+        connection.execute(
             "DELETE FROM session_token\n"
             "WHERE (user_id = :user_id)",
             {"user_id": user_id})
@@ -172,7 +235,7 @@ class SessionTokenTableSqlite(SessionTokenTable):
         :param connection:  Database connection
         :param token:       Session token
         """
-        connection.native_connection.execute(
+        connection.execute(
             "DELETE FROM session_token\n"
             "WHERE (token = :token)",
             {"token": token})
@@ -186,7 +249,45 @@ class SessionTokenTableSqlite(SessionTokenTable):
         :param connection:  Database connection
         :param timestamp:   Timestamp
         """
-        connection.native_connection.execute(
+        connection.execute(
             "DELETE FROM session_token\n"
             "WHERE (created_on < :timestamp)",
             {"timestamp": datetime_to_string(timestamp)})
+
+    def delete_expired_rows(self,
+                            connection: ConnectionSqlite,
+                            timestamp: datetime.datetime,
+                            idle_timestamp: Optional[datetime.datetime],
+                            max_row_count: int) -> int:
+        """
+        Removes the rows of the tokens that have expired or were idle for too long
+
+        :param connection:      Database connection
+        :param timestamp:       Tokens that expire before this timestamp are removed
+        :param idle_timestamp:  Tokens that were last used before this timestamp are removed
+                                ("None" to disable the idle timeout)
+        :param max_row_count:   Max number of rows to remove
+
+        :return:    Number of removed rows
+        """
+        if idle_timestamp is None:
+            condition = "(expires_on < :timestamp)"
+        else:
+            condition = ("((expires_on < :timestamp) OR\n"
+                         "           (last_used_on < :idle_timestamp))")
+
+        # Both conditions are resolved with an index search
+        cursor = connection.execute(
+            "DELETE FROM session_token\n"
+            "WHERE id IN (\n"
+            "    SELECT id\n"
+            "    FROM session_token\n"
+            "    WHERE {0}\n"
+            "    LIMIT :max_row_count\n"
+            ")".format(condition),
+            {"timestamp": datetime_to_string(timestamp),
+             "idle_timestamp": (datetime_to_string(idle_timestamp)
+                                if idle_timestamp is not None else None),
+             "max_row_count": max_row_count})
+
+        return cursor.rowcount
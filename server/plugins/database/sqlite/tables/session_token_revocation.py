@@ -0,0 +1,207 @@
+"""
+Salamander ALM
+Copyright (c) 2016  Djuro Drljaca
+
+This Python module is free software; you can redistribute it and/or modify it under the terms of the
+GNU General Public License as published by the Free Software Foundation; either version 2 of the
+License, or (at your option) any later version.
+
+This Python module is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License along with this library. If
+not, see <http://www.gnu.org/licenses/>.
+"""
+
+from plugins.database.sqlite.connection import ConnectionSqlite
+from database.tables.session_token_revocation import SessionTokenRevocationTable
+from database.datatypes import datetime_from_string, datetime_to_string
+import datetime
+import sqlite3
+from typing import List, Optional
+
+
+class SessionTokenRevocationTableSqlite(SessionTokenRevocationTable):
+    """
+    Implementation of "session_token_revocation" table for SQLite database
+
+    Table's columns:
+
+    - id:           int
+    - user_id:      int, references user.id
+    - token_id:     Optional[str]
+    - revoked_on:   datetime
+    - expires_on:   datetime
+    """
+
+    def __init__(self):
+        """
+        Constructor
+        """
+        SessionTokenRevocationTable.__init__(self)
+
+    def create(self, connection: ConnectionSqlite) -> None:
+        """
+        Creates the table
+
+        :param connection:  Database connection
+        """
+        connection.execute(
+            "CREATE TABLE session_token_revocation (\n"
+            "    id          INTEGER PRIMARY KEY AUTOINCREMENT\n"
+            "                        NOT NULL,\n"
+            "    user_id     INTEGER REFERENCES user (id)\n"
+            "                        NOT NULL,\n"
+            "    token_id    TEXT    CHECK (length(token_id) > 0),\n"
+            "    revoked_on  TEXT    NOT NULL\n"
+            "                        CHECK (length(revoked_on) >= 23),\n"
+            "    expires_on  TEXT    NOT NULL\n"
+            "                        CHECK (length(expires_on) >= 23)\n"
+            ")")
+
+        connection.execute(
+            "CREATE INDEX session_token_revocation_ix_expires_on ON session_token_revocation (\n"
+            "    expires_on\n"
+            ")")
+
+    def read_rows(self, connection: ConnectionSqlite, timestamp: datetime.datetime) -> List[dict]:
+        """
+        Reads all revocations that have not expired before the specified timestamp
+
+        :param connection:  Database connection
+        :param timestamp:   Timestamp
+
+        :return:    List of revocations
+
+        Each dictionary in the returned list contains items:
+
+        - id
+        - user_id
+        - token_id
+        - revoked_on
+        - expires_on
+        """
+        cursor = connection.execute(
+            "SELECT id,\n"
+            "       user_id,\n"
+            "       token_id,\n"
+            "       revoked_on,\n"
+            "       expires_on\n"
+            "FROM session_token_revocation\n"
+            "WHERE (expires_on >= :timestamp)",
+            {"timestamp": datetime_to_string(timestamp)})
+
+        # Process result
+        revocations = list()
+
+        for row in cursor.fetchall():
+            revocations.append({"id": row["id"],
+                                "user_id": row["user_id"],
+                                "token_id": row["token_id"],
+                                "revoked_on": datetime_from_string(row["revoked_on"]),
+                                "expires_on": datetime_from_string(row["expires_on"])})
+
+        return revocations
+
+    def read_rows_after(self, connection: ConnectionSqlite, row_id: int) -> List[dict]:
+        """
+        Reads all revocations that were added after the specified row
+
+        :param connection:  Database connection
+        :param row_id:      ID of the last row that was already read ("0" to read all rows)
+
+        :return:    List of revocations (ordered by their row IDs)
+
+        Each dictionary in the returned list contains items:
+
+        - id
+        - user_id
+        - token_id
+        - revoked_on
+        - expires_on
+        """
+        # Row IDs are never reused ("AUTOINCREMENT") so the new rows are found with a range seek on
+        # the primary key
+        cursor = connection.execute(
+            "SELECT id,\n"
+            "       user_id,\n"
+            "       token_id,\n"
+            "       revoked_on,\n"
+            "       expires_on\n"
+            "FROM session_token_revocation\n"
+            "WHERE (id > :row_id)\n"
+            "ORDER BY id",
+            {"row_id": row_id})
+
+        # Process result
+        revocations = list()
+
+        for row in cursor.fetchall():
+            revocations.append({"id": row["id"],
+                                "user_id": row["user_id"],
+                                "token_id": row["token_id"],
+                                "revoked_on": datetime_from_string(row["revoked_on"]),
+                                "expires_on": datetime_from_string(row["expires_on"])})
+
+        return revocations
+
+    def insert_row(self,
+                   connection: ConnectionSqlite,
+                   user_id: int,
+                   token_id: Optional[str],
+                   revoked_on: datetime.datetime,
+                   expires_on: datetime.datetime) -> Optional[int]:
+        """
+        Inserts a new row in the table
+
+        :param connection:  Database connection
+        :param user_id:     ID of the user
+        :param token_id:    ID of the revoked token ("None" to revoke all tokens of the user)
+        :param revoked_on:  Timestamp of the revocation
+        :param expires_on:  Timestamp after which the revocation is not needed anymore
+
+        :return:    ID of the newly created row
+        """
+        try:
+            cursor = connection.execute(
+                "INSERT INTO session_token_revocation\n"
+                "   (id,\n"
+                "    user_id,\n"
+                "    token_id,\n"
+                "    revoked_on,\n"
+                "    expires_on)\n"
+                "VALUES (NULL,\n"
+                "        :user_id,\n"
+                "        :token_id,\n"
+                "        :revoked_on,\n"
+                "        :expires_on)",
+                {"user_id": user_id,
+                 "token_id": token_id,
+                 "revoked_on": datetime_to_string(revoked_on),
+                 "expires_on": datetime_to_string(expires_on)})
+
+            row_id = cursor.lastrowid
+        except sqlite3.IntegrityError:
+            # Error occurred
+            row_id = None
+
+        return row_id
+
+    def delete_expired_rows(self,
+                            connection: ConnectionSqlite,
+                            timestamp: datetime.datetime) -> int:
+        """
+        Removes the rows that expire before the specified timestamp
+
+        :param connection:  Database connection
+        :param timestamp:   Timestamp
+
+        :return:    Number of removed rows
+        """
+        cursor = connection.execute(
+            "DELETE FROM session_token_revocation\n"
+            "WHERE (expires_on < :timestamp)",
+            {"timestamp": datetime_to_string(timestamp)})
+
+        return cursor.rowcount
@@ -0,0 +1,180 @@
+"""
+Salamander ALM
+Copyright (c) 2016  Djuro Drljaca
+
+This Python module is free software; you can redistribute it and/or modify it under the terms of the
+GNU General Public License as published by the Free Software Foundation; either version 2 of the
+License, or (at your option) any later version.
+
+This Python module is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License along with this library. If
+not, see <http://www.gnu.org/licenses/>.
+"""
+
+from plugins.database.sqlite.connection import ConnectionSqlite
+from database.tables.text_content import TextContentTable
+import hashlib
+import sqlite3
+from typing import Optional, Union
+import zlib
+
+
+class TextContentTableSqlite(TextContentTable):
+    """
+    Implementation of "text_content" table for SQLite database
+
+    Table's columns:
+
+    - id:       int
+    - hash:     str (SHA-256 of the text, hex encoded)
+    - content:  str or bytes
+
+    Text is stored as TEXT if it is short or if it doesn't compress well, otherwise it is stored as
+    a BLOB with the zlib compressed text (UTF-8 encoded). Stored text is decoded with the
+    "text_content_decode(content)" SQL function so that it can be read by queries and triggers
+    (e.g. for the search index) just like a plain text column.
+    """
+
+    # Min length of the text (in bytes) that is compressed
+    min_compressed_length = 128
+
+    def __init__(self):
+        """
+        Constructor
+        """
+        TextContentTable.__init__(self)
+
+    def create(self, connection: ConnectionSqlite) -> None:
+        """
+        Creates the table
+
+        :param connection:  Database connection
+        """
+        # NOTE: "content" column has no type affinity so that both TEXT and BLOB values are stored
+        #       as they are
+        connection.execute(
+            "CREATE TABLE text_content (\n"
+            "    id      INTEGER PRIMARY KEY AUTOINCREMENT\n"
+            "                    NOT NULL,\n"
+            "    hash    TEXT    NOT NULL\n"
+            "                    UNIQUE\n"
+            "                    CHECK (length(hash) = 64),\n"
+            "    content BLOB    NOT NULL\n"
+            ")")
+
+    def read_text(self, connection: ConnectionSqlite, text_content_id: int) -> Optional[str]:
+        """
+        Reads the text from the database
+
+        :param connection:      Database connection
+        :param text_content_id: ID of the text
+
+        :return:    Text
+        """
+        cursor = connection.execute(
+            "SELECT content\n"
+            "FROM text_content\n"
+            "WHERE (id = :id)",
+            {"id": text_content_id})
+
+        text = None
+        row = cursor.fetchone()
+
+        if row is not None:
+            text = TextContentTableSqlite.decode(row["content"])
+
+        return text
+
+    def insert_text(self, connection: ConnectionSqlite, text: str) -> Optional[int]:
+        """
+        Inserts the text in the table if it is not stored yet
+
+        :param connection:  Database connection
+        :param text:        Text
+
+        :return:    ID of the row with the text (newly created or already existing)
+        """
+        data = text.encode("utf-8")
+        text_hash = hashlib.sha256(data).hexdigest()
+
+        # Check if the text is already stored (index seek on the "hash" column)
+        cursor = connection.execute(
+            "SELECT id\n"
+            "FROM text_content\n"
+            "WHERE (hash = :hash)",
+            {"hash": text_hash})
+
+        row = cursor.fetchone()
+
+        if row is not None:
+            return row["id"]
+
+        try:
+            cursor = connection.execute(
+                "INSERT INTO text_content\n"
+                "   (id,\n"
+                "    hash,\n"
+                "    content)\n"
+                "VALUES (NULL,\n"
+                "        :hash,\n"
+                "        :content)",
+                {"hash": text_hash,
+                 "content": TextContentTableSqlite.encode(text, data)})
+
+            row_id = cursor.lastrowid
+        except sqlite3.IntegrityError:
+            # Error occurred
+            row_id = None
+
+        return row_id
+
+    @staticmethod
+    def encode(text: str, data: bytes) -> Union[str, bytes]:
+        """
+        Encodes the text for storage in the "content" column
+
+        :param text:    Text
+        :param data:    Text encoded with UTF-8
+
+        :return:    Compressed text (bytes) or the text itself if compression doesn't reduce its
+                    size
+        """
+        if len(data) >= TextContentTableSqlite.min_compressed_length:
+            compressed_data = zlib.compress(data)
+
+            if len(compressed_data) < len(data):
+                return compressed_data
+
+        return text
+
+    @staticmethod
+    def decode(content: Union[None, str, bytes]) -> Optional[str]:
+        """
+        Decodes the value of the "content" column
+
+        :param content: Value of the "content" column
+
+        :return:    Text
+        """
+        if isinstance(content, bytes):
+            return zlib.decompress(content).decode("utf-8")
+
+        return content
+
+    @staticmethod
+    def register_functions(native_connection: sqlite3.Connection) -> None:
+        """
+        Registers the SQL functions needed for reading the stored text
+
+        :param native_connection:   Native connection object
+
+        NOTE:   Functions must be registered on each connection that reads the text or inserts rows
+                in the tables that are indexed by the search index!
+        """
+        native_connection.create_function("text_content_decode",
+                                          1,
+                                          TextContentTableSqlite.decode,
+                                          deterministic=True)
@@ -42,7 +42,7 @@ class TrackerTableSqlite(TrackerTable):
 
         :param connection:  Database connection
         """
-        connection.native_connection.execute(
+        connection.execute(
             "CREATE TABLE tracker (\n"
             "    id          INTEGER PRIMARY KEY AUTOINCREMENT\n"
             "                        NOT NULL,\n"
@@ -59,7 +59,7 @@ class TrackerTableSqlite(TrackerTable):
 
         :return:    List of tracker IDs
         """
-        cursor = connection.native_connection.execute(
+        cursor = connection.execute(
             "SELECT id\n"
             "FROM tracker\n"
             "WHERE (project_id = :project_id)",
@@ -82,7 +82,7 @@ class TrackerTableSqlite(TrackerTable):
         :return:    ID of the newly created row
         """
         try:
-            cursor = connection.native_connection.execute(
+            cursor = connection.execute(
                 "INSERT INTO tracker\n"
                 "   (id,"
                 "    project_id)\n"
@@ -0,0 +1,108 @@
+"""
+Salamander ALM
+Copyright (c) 2016  Djuro Drljaca
+
+This Python module is free software; you can redistribute it and/or modify it under the terms of the
+GNU General Public License as published by the Free Software Foundation; either version 2 of the
+License, or (at your option) any later version.
+
+This Python module is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License along with this library. If
+not, see <http://www.gnu.org/licenses/>.
+"""
+
+from plugins.database.sqlite.connection import ConnectionSqlite
+from database.tables.tracker_current import TrackerCurrentTable
+
+
+class TrackerCurrentTableSqlite(TrackerCurrentTable):
+    """
+    Implementation of "tracker_current" table for SQLite database
+
+    Table's columns:
+
+    - tracker_id: int, references tracker.id
+    - short_name: str
+    - full_name:  str
+
+    Table is maintained with triggers: a new tracker information of an active tracker replaces the
+    row of the tracker (attributes are taken from the latest row that contains them) and a new
+    tracker information of an inactive tracker removes it.
+
+    Unique indexes on "short_name" and "full_name" make the trigger fail with an integrity error if
+    an active tracker would get the same short name or full name as another active tracker, so the
+    insert of such tracker information is rejected by the database.
+    """
+
+    def __init__(self):
+        """
+        Constructor
+        """
+        TrackerCurrentTable.__init__(self)
+
+    def create(self, connection: ConnectionSqlite) -> None:
+        """
+        Creates the table
+
+        :param connection:  Database connection
+
+        NOTE:   Table must be created after the "tracker_information" table!
+        """
+        connection.execute(
+            "CREATE TABLE tracker_current (\n"
+            "    tracker_id  INTEGER PRIMARY KEY REFERENCES tracker (id)\n"
+            "                        NOT NULL,\n"
+            "    short_name  TEXT    NOT NULL,\n"
+            "    full_name   TEXT    NOT NULL\n"
+            ")")
+
+        connection.execute(
+            "CREATE UNIQUE INDEX tracker_current_ix_short_name ON tracker_current (\n"
+            "    short_name\n"
+            ")")
+
+        connection.execute(
+            "CREATE UNIQUE INDEX tracker_current_ix_full_name ON tracker_current (\n"
+            "    full_name\n"
+            ")")
+
+        # Attributes of the tracker are read from its latest row that contains them (index seek on
+        # "tracker_id" and "revision_id"). The old row of the tracker is deleted first so that its
+        # own attributes do not conflict with the new ones.
+        connection.execute(
+            "CREATE TRIGGER tracker_current_tr_active\n"
+            "AFTER INSERT ON tracker_information\n"
+            "WHEN (NEW.active = 1)\n"
+            "BEGIN\n"
+            "    DELETE FROM tracker_current\n"
+            "    WHERE (tracker_id = NEW.tracker_id);\n"
+            "\n"
+            "    INSERT INTO tracker_current\n"
+            "       (tracker_id,\n"
+            "        short_name,\n"
+            "        full_name)\n"
+            "    SELECT TI.tracker_id,\n"
+            "           TI.short_name,\n"
+            "           TI.full_name\n"
+            "    FROM tracker_information AS TI\n"
+            "    WHERE (TI.id = (\n"
+            "                SELECT TI2.id\n"
+            "                FROM tracker_information AS TI2\n"
+            "                WHERE ((TI2.tracker_id = NEW.tracker_id) AND\n"
+            "                       (TI2.short_name IS NOT NULL))\n"
+            "                ORDER BY TI2.revision_id DESC\n"
+            "                LIMIT 1\n"
+            "           ));\n"
+            "END")
+
+        connection.execute(
+            "CREATE TRIGGER tracker_current_tr_inactive\n"
+            "AFTER INSERT ON tracker_information\n"
+            "WHEN (NEW.active = 0)\n"
+            "BEGIN\n"
+            "    DELETE FROM tracker_current\n"
+            "    WHERE (tracker_id = NEW.tracker_id);\n"
+            "END")
@@ -42,7 +42,7 @@ class TrackerFieldTableSqlite(TrackerFieldTable):
 
         :param connection:  Database connection
         """
-        connection.native_connection.execute(
+        connection.execute(
             "CREATE TABLE tracker_field (\n"
             "    id          INTEGER PRIMARY KEY AUTOINCREMENT\n"
             "                        NOT NULL,\n"
@@ -59,7 +59,7 @@ class TrackerFieldTableSqlite(TrackerFieldTable):
 
         :return:    List of tracker field IDs
         """
-        cursor = connection.native_connection.execute(
+        cursor = connection.execute(
             "SELECT id\n"
             "FROM tracker_field\n"
             "WHERE (tracker_id = :tracker_id)",
@@ -82,7 +82,7 @@ class TrackerFieldTableSqlite(TrackerFieldTable):
         :return:    ID of the newly created row
         """
         try:
-            cursor = connection.native_connection.execute(
+            cursor = connection.execute(
                 "INSERT INTO tracker_field\n"
                 "   (id,\n"
                 "    tracker_id)\n"
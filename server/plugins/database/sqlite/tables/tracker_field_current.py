@@ -0,0 +1,108 @@
+"""
+Salamander ALM
+Copyright (c) 2016  Djuro Drljaca
+
+This Python module is free software; you can redistribute it and/or modify it under the terms of the
+GNU General Public License as published by the Free Software Foundation; either version 2 of the
+License, or (at your option) any later version.
+
+This Python module is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License along with this library. If
+not, see <http://www.gnu.org/licenses/>.
+"""
+
+from plugins.database.sqlite.connection import ConnectionSqlite
+from database.tables.tracker_field_current import TrackerFieldCurrentTable
+
+
+class TrackerFieldCurrentTableSqlite(TrackerFieldCurrentTable):
+    """
+    Implementation of "tracker_field_current" table for SQLite database
+
+    Table's columns:
+
+    - tracker_field_id: int, references tracker_field.id
+    - name:             str
+    - display_name:     str
+
+    Table is maintained with triggers: a new tracker field information of an active tracker field
+    replaces the row of the tracker field (attributes are taken from the latest row that contains
+    them) and a new tracker field information of an inactive tracker field removes it.
+
+    Unique indexes on "name" and "display_name" make the trigger fail with an integrity error if an
+    active tracker field would get the same name or display name as another active tracker field, so
+    the insert of such tracker field information is rejected by the database.
+    """
+
+    def __init__(self):
+        """
+        Constructor
+        """
+        TrackerFieldCurrentTable.__init__(self)
+
+    def create(self, connection: ConnectionSqlite) -> None:
+        """
+        Creates the table
+
+        :param connection:  Database connection
+
+        NOTE:   Table must be created after the "tracker_field_information" table!
+        """
+        connection.execute(
+            "CREATE TABLE tracker_field_current (\n"
+            "    tracker_field_id  INTEGER PRIMARY KEY REFERENCES tracker_field (id)\n"
+            "                              NOT NULL,\n"
+            "    name              TEXT    NOT NULL,\n"
+            "    display_name      TEXT    NOT NULL\n"
+            ")")
+
+        connection.execute(
+            "CREATE UNIQUE INDEX tracker_field_current_ix_name ON tracker_field_current (\n"
+            "    name\n"
+            ")")
+
+        connection.execute(
+            "CREATE UNIQUE INDEX tracker_field_current_ix_display_name ON tracker_field_current (\n"
+            "    display_name\n"
+            ")")
+
+        # Attributes of the tracker field are read from its latest row that contains them (index
+        # seek on "tracker_field_id" and "revision_id"). The old row of the tracker field is deleted
+        # first so that its own attributes do not conflict with the new ones.
+        connection.execute(
+            "CREATE TRIGGER tracker_field_current_tr_active\n"
+            "AFTER INSERT ON tracker_field_information\n"
+            "WHEN (NEW.active = 1)\n"
+            "BEGIN\n"
+            "    DELETE FROM tracker_field_current\n"
+            "    WHERE (tracker_field_id = NEW.tracker_field_id);\n"
+            "\n"
+            "    INSERT INTO tracker_field_current\n"
+            "       (tracker_field_id,\n"
+            "        name,\n"
+            "        display_name)\n"
+            "    SELECT TFI.tracker_field_id,\n"
+            "           TFI.name,\n"
+            "           TFI.display_name\n"
+            "    FROM tracker_field_information AS TFI\n"
+            "    WHERE (TFI.id = (\n"
+            "                SELECT TFI2.id\n"
+            "                FROM tracker_field_information AS TFI2\n"
+            "                WHERE ((TFI2.tracker_field_id = NEW.tracker_field_id) AND\n"
+            "                       (TFI2.name IS NOT NULL))\n"
+            "                ORDER BY TFI2.revision_id DESC\n"
+            "                LIMIT 1\n"
+            "           ));\n"
+            "END")
+
+        connection.execute(
+            "CREATE TRIGGER tracker_field_current_tr_inactive\n"
+            "AFTER INSERT ON tracker_field_information\n"
+            "WHEN (NEW.active = 0)\n"
+            "BEGIN\n"
+            "    DELETE FROM tracker_field_current\n"
+            "    WHERE (tracker_field_id = NEW.tracker_field_id);\n"
+            "END")
@@ -14,12 +14,13 @@ You should have received a copy of the GNU Lesser General Public License along w
 not, see <http://www.gnu.org/licenses/>.
 """
 
-from plugins.database.sqlite.connection import ConnectionSqlite
+from plugins.database.sqlite.connection import ConnectionSqlite, id_list_chunks
+from plugins.database.sqlite.tables.text_content import TextContentTableSqlite
 from database.tables.tracker_field_information import \
     TrackerFieldInformationTable,\
     TrackerFieldSelection
 import sqlite3
-from typing import Any, List, Optional
+from typing import Any, Dict, List, Optional
 
 
 class TrackerFieldInformationTableSqlite(TrackerFieldInformationTable):
@@ -30,64 +31,91 @@ class TrackerFieldInformationTableSqlite(TrackerFieldInformationTable):
 
     - id:               int
     - tracker_field_id: int, references tracker_field.id
-    - name:             str
-    - display_name:     str
-    - description:      Optional[str]
-    - field_type:       str
-    - required:         bool
+    - name:             Optional[str]
+    - display_name:     Optional[str]
+    - description_id:   Optional[int], references text_content.id
+    - field_type:       Optional[str]
+    - required:         Optional[bool]
     - active:           bool
     - revision_id:      int, references revision.id
+
+    A row either contains all of the tracker field's attributes or it is a state row (see
+    "insert_state_row") that only changes the state (active or inactive) and leaves all of the
+    other attributes ("NULL") unchanged. The attributes of a tracker field in a revision are taken
+    from the latest row that contains them ("name" is not "NULL").
     """
 
 # TODO: add "required" field
 
-    def __init__(self):
+    def __init__(self, text_content: TextContentTableSqlite):
         """
         Constructor
+
+        :param text_content:    Table that stores the descriptions
         """
         TrackerFieldInformationTable.__init__(self)
 
+        self.__text_content = text_content
+
     def create(self, connection: ConnectionSqlite) -> None:
         """
         Creates the table
 
         :param connection:  Database connection
         """
-        connection.native_connection.execute(
+        connection.execute(
             "CREATE TABLE tracker_field_information (\n"
             "    id                  INTEGER PRIMARY KEY AUTOINCREMENT\n"
             "                                NOT NULL,\n"
             "    tracker_field_id    INTEGER REFERENCES tracker_field (id)\n"
             "                                NOT NULL,\n"
-            "    name                TEXT    NOT NULL\n"
-            "                                CHECK (length(name) > 0),\n"
-            "    display_name        TEXT    NOT NULL\n"
-            "                                CHECK (length(display_name) > 0),\n"
-            "    description         TEXT,\n"
-            "    field_type          TEXT    NOT NULL\n"
-            "                                CHECK (length(field_type) > 0),\n"
-            "    required            BOOLEAN NOT NULL\n"
-            "                                CHECK ( (required = 0) OR\n"
+            "    name                TEXT    CHECK (length(name) > 0),\n"
+            "    display_name        TEXT    CHECK (length(display_name) > 0),\n"
+            "    description_id      INTEGER REFERENCES text_content (id),\n"
+            "    field_type          TEXT    CHECK (length(field_type) > 0),\n"
+            "    required            BOOLEAN CHECK ( (required = 0) OR\n"
             "                                        (required = 1) ),\n"
             "    active              BOOLEAN NOT NULL\n"
             "                                CHECK ( (active = 0) OR\n"
             "                                        (active = 1) ),\n"
             "    revision_id         INTEGER REFERENCES revision (id) \n"
-            "                                NOT NULL\n"
+            "                                NOT NULL,\n"
+            "    CHECK ( ((name IS NOT NULL) AND\n"
+            "             (display_name IS NOT NULL) AND\n"
+            "             (field_type IS NOT NULL) AND\n"
+            "             (required IS NOT NULL)) OR\n"
+            "            ((name IS NULL) AND\n"
+            "             (display_name IS NULL) AND\n"
+            "             (description_id IS NULL) AND\n"
+            "             (field_type IS NULL) AND\n"
+            "             (required IS NULL)) )\n"
             ")")
 
-        connection.native_connection.execute(
-            "CREATE INDEX tracker_field_information_ix_tracker_field_id\n"
+        # Composite index allows the latest revision of a tracker field to be found with an index
+        # seek
+        connection.execute(
+            "CREATE INDEX tracker_field_information_ix_tracker_field_id_revision_id\n"
             "ON tracker_field_information (\n"
-            "    tracker_field_id\n"
+            "    tracker_field_id,\n"
+            "    revision_id\n"
             ")")
 
-        connection.native_connection.execute(
+        # Partial index allows the latest attributes of a tracker field to be found with an index
+        # seek
+        connection.execute(
+            "CREATE INDEX tracker_field_information_ix_tracker_field_id_revision_id_attributes\n"
+            "ON tracker_field_information (\n"
+            "    tracker_field_id,\n"
+            "    revision_id\n"
+            ")\n"
+            "WHERE (name IS NOT NULL)")
+
+        connection.execute(
             "CREATE INDEX tracker_field_information_ix_name ON tracker_field_information (\n"
             "    name\n"
             ")")
 
-        connection.native_connection.execute(
+        connection.execute(
             "CREATE INDEX tracker_field_information_ix_display_name\n"
             "ON tracker_field_information (\n"
             "    display_name\n"
@@ -134,8 +162,8 @@ class TrackerFieldInformationTableSqlite(TrackerFieldInformationTable):
         else:
             query += "WHERE (TF.tracker_id = :tracker_id)"
 
-        cursor = connection.native_connection.execute(query, {"tracker_id": tracker_id,
-                                                              "max_revision_id": max_revision_id})
+        cursor = connection.execute(query, {"tracker_id": tracker_id,
+                                            "max_revision_id": max_revision_id})
 
         # Process result
         tracker_fields = list()
@@ -185,65 +213,79 @@ class TrackerFieldInformationTableSqlite(TrackerFieldInformationTable):
         if attribute_name not in ["tracker_field_id", "name", "display_name"]:
             raise AttributeError("Unsupported attribute name")
 
-        # Read the users that match the search attribute
+        # ID of the row with the latest attributes of the tracker field (index seek on the partial
+        # index)
+        attributes_row_id = (
+            "(\n"
+            "            SELECT TFA2.id\n"
+            "            FROM tracker_field_information AS TFA2\n"
+            "            WHERE ((TFA2.tracker_field_id = TFA.tracker_field_id) AND\n"
+            "                   (TFA2.name IS NOT NULL) AND\n"
+            "                   (TFA2.revision_id <= :max_revision_id))\n"
+            "            ORDER BY TFA2.revision_id DESC\n"
+            "            LIMIT 1\n"
+            "       )"
+        )
+
+        # Read the tracker fields that match the search attribute: the latest attributes of each
+        # tracker field are matched (index seek on the search attribute) and joined with the latest
+        # state of the tracker field (index seek on "tracker_field_id" and "revision_id")
         query = (
             "SELECT TF.tracker_id,\n"
-            "       TFI.tracker_field_id,\n"
-            "       TFI.name,\n"
-            "       TFI.display_name,\n"
-            "       TFI.description,\n"
-            "       TFI.field_type,\n"
-            "       TFI.required,\n"
+            "       TFA.tracker_field_id,\n"
+            "       TFA.name,\n"
+            "       TFA.display_name,\n"
+            "       text_content_decode(TC.content) AS description,\n"
+            "       TFA.field_type,\n"
+            "       TFA.required,\n"
             "       TFI.active,\n"
             "       TFI.revision_id\n"
-            "FROM tracker_field as TF\n"
-            "INNER JOIN (\n"
-            "    SELECT TFI1.tracker_field_id,\n"
-            "           TFI1.name,\n"
-            "           TFI1.display_name,\n"
-            "           TFI1.description,\n"
-            "           TFI1.field_type,\n"
-            "           TFI1.required,\n"
-            "           TFI1.active,\n"
-            "           TFI1.revision_id\n"
-            "    FROM tracker_field_information AS TFI1\n"
-            "    WHERE (TFI1.revision_id = (\n"
-            "                SELECT MAX(TFI2.revision_id)\n"
-            "                FROM tracker_field_information AS TFI2\n"
-            "                WHERE ((TFI2.tracker_field_id = TFI1.tracker_field_id) AND\n"
-            "                       (TFI2.revision_id <= :max_revision_id))\n"
-            "           ))\n"
-            ") AS TFI\n"
-            "ON (TF.id = TFI.tracker_field_id)"
+            "FROM tracker_field_information AS TFA\n"
+            "INNER JOIN tracker_field AS TF\n"
+            "    ON (TF.id = TFA.tracker_field_id)\n"
+            "INNER JOIN tracker_field_information AS TFI\n"
+            "    ON (TFI.id = (\n"
+            "            SELECT TFI2.id\n"
+            "            FROM tracker_field_information AS TFI2\n"
+            "            WHERE ((TFI2.tracker_field_id = TFA.tracker_field_id) AND\n"
+            "                   (TFI2.revision_id <= :max_revision_id))\n"
+            "            ORDER BY TFI2.revision_id DESC\n"
+            "            LIMIT 1\n"
+            "       ))\n"
+            "LEFT OUTER JOIN text_content AS TC\n"
+            "    ON (TC.id = TFA.description_id)\n"
         )
 
         if tracker_field_selection == TrackerFieldSelection.Active:
-            query += ("WHERE ((TFI.{0} = :attribute_value) AND\n"
+            query += ("WHERE ((TFA.{0} = :attribute_value) AND\n"
+                      "       (TFA.id = {1}) AND\n"
                       "       (TFI.active = 1))")
         elif tracker_field_selection == TrackerFieldSelection.Inactive:
-            query += ("WHERE ((TFI.{0} = :attribute_value) AND\n"
+            query += ("WHERE ((TFA.{0} = :attribute_value) AND\n"
+                      "       (TFA.id = {1}) AND\n"
                       "       (TFI.active = 0))")
         else:
-            query += "WHERE (TFI.{0} = :attribute_value)"
+            query += ("WHERE ((TFA.{0} = :attribute_value) AND\n"
+                      "       (TFA.id = {1}))")
 
-        cursor = connection.native_connection.execute(query.format(attribute_name),
-                                                      {"attribute_value": attribute_value,
-                                                       "max_revision_id": max_revision_id})
+        cursor = connection.execute(query.format(attribute_name, attributes_row_id),
+                                    {"attribute_value": attribute_value,
+                                     "max_revision_id": max_revision_id})
 
         # Process result
         tracker_fields = list()
 
         for row in cursor.fetchall():
             if row is not None:
-                tracker_field = {"tracker_id": row["TF.tracker_id"],
-                                 "tracker_field_id": row["TFI.tracker_field_id"],
-                                 "name": row["TFI.name"],
-                                 "display_name": row["TFI.display_name"],
-                                 "description": row["TFI.description"],
-                                 "field_type": row["TFI.field_type"],
-                                 "required": bool(row["TFI.required"]),
-                                 "active": bool(row["TFI.active"]),
-                                 "revision_id": row["TFI.revision_id"]}
+                tracker_field = {"tracker_id": row["tracker_id"],
+                                 "tracker_field_id": row["tracker_field_id"],
+                                 "name": row["name"],
+                                 "display_name": row["display_name"],
+                                 "description": row["description"],
+                                 "field_type": row["field_type"],
+                                 "required": bool(row["required"]),
+                                 "active": bool(row["active"]),
+                                 "revision_id": row["revision_id"]}
                 tracker_fields.append(tracker_field)
 
         return tracker_fields
@@ -257,55 +299,266 @@ class TrackerFieldInformationTableSqlite(TrackerFieldInformationTable):
                    field_type: str,
                    required: bool,
                    active: bool,
-                   revision_id: int) -> Optional[int]:
+                   revision_id: int,
+                   expected_revision_id: Optional[int] = None) -> Optional[int]:
         """
         Inserts a new row in the table
 
+        :param connection:           Database connection
+        :param tracker_field_id:     ID of the tracker field
+        :param name:                 Tracker field name
+        :param display_name:         Tracker field display name
+        :param description:          Tracker field description
+        :param field_type:           Tracker field type
+        :param required:             Necessity of the tracker field (required or not)
+        :param active:               State of the tracker field (active or inactive)
+        :param revision_id:          Revision ID
+        :param expected_revision_id: Expected revision ID of the latest row (optional)
+
+        :return:    ID of the newly created row
+
+        NOTE:   If the expected revision ID is specified the row is inserted only if the latest
+                row of the tracker field is still from the expected revision!
+        """
+        description_id = None
+
+        if description is not None:
+            description_id = self.__text_content.insert_text(connection, description)
+
+            if description_id is None:
+                # Error, failed to store the description
+                return None
+
+        query = (
+            "INSERT INTO tracker_field_information\n"
+            "   (id,\n"
+            "    tracker_field_id,\n"
+            "    name,\n"
+            "    display_name,\n"
+            "    description_id,\n"
+            "    field_type,\n"
+            "    required,\n"
+            "    active,\n"
+            "    revision_id)\n"
+            "SELECT NULL,\n"
+            "       :tracker_field_id,\n"
+            "       :name,\n"
+            "       :display_name,\n"
+            "       :description_id,\n"
+            "       :field_type,\n"
+            "       :required,\n"
+            "       :active,\n"
+            "       :revision_id"
+        )
+        parameters = {"tracker_field_id": tracker_field_id,
+                      "name": name,
+                      "display_name": display_name,
+                      "description_id": description_id,
+                      "field_type": field_type,
+                      "required": required,
+                      "active": active,
+                      "revision_id": revision_id}
+
+        if expected_revision_id is not None:
+            # Insert the row only if the latest row of the tracker field is from the expected
+            # revision (index seek on "tracker_field_id" and "revision_id")
+            query += ("\n"
+                      "WHERE ((\n"
+                      "    SELECT TFI.revision_id\n"
+                      "    FROM tracker_field_information AS TFI\n"
+                      "    WHERE (TFI.tracker_field_id = :tracker_field_id)\n"
+                      "    ORDER BY TFI.revision_id DESC\n"
+                      "    LIMIT 1\n"
+                      ") = :expected_revision_id)")
+            parameters["expected_revision_id"] = expected_revision_id
+
+        try:
+            cursor = connection.execute(query, parameters)
+
+            if cursor.rowcount == 1:
+                row_id = cursor.lastrowid
+            else:
+                # Error, the tracker field was modified after the expected revision
+                row_id = None
+        except sqlite3.IntegrityError:
+            # Error occurred
+            row_id = None
+
+        return row_id
+
+    def insert_state_row(self,
+                         connection: ConnectionSqlite,
+                         tracker_field_id: int,
+                         active: bool,
+                         revision_id: int) -> Optional[int]:
+        """
+        Inserts a new row in the table that only changes the state of the tracker field (all of the
+        other attributes of the tracker field are unchanged)
+
         :param connection:          Database connection
         :param tracker_field_id:    ID of the tracker field
-        :param name:                Tracker field name
-        :param display_name:        Tracker field display name
-        :param description:         Tracker field description
-        :param field_type:          Tracker field type
-        :param required:            Necessity of the tracker field (required or not)
-        :param active:              State of the tracker field (active or inactive)
+        :param active:              New state of the tracker field (active or inactive)
         :param revision_id:         Revision ID
 
         :return:    ID of the newly created row
+
+        NOTE:   The row is inserted only if the tracker field exists and its latest state is
+                different from the new state!
         """
         try:
-            cursor = connection.native_connection.execute(
+            cursor = connection.execute(
                 "INSERT INTO tracker_field_information\n"
                 "   (id,\n"
                 "    tracker_field_id,\n"
                 "    name,\n"
                 "    display_name,\n"
-                "    description,\n"
+                "    description_id,\n"
                 "    field_type,\n"
                 "    required,\n"
                 "    active,\n"
                 "    revision_id)\n"
-                "VALUES (NULL,\n"
-                "        :tracker_field_id,\n"
-                "        :name,\n"
-                "        :display_name,\n"
-                "        :description,\n"
-                "        :field_type,\n"
-                "        :required,\n"
-                "        :active,\n"
-                "        :revision_id)",
+                "SELECT NULL,\n"
+                "       TFI.tracker_field_id,\n"
+                "       NULL,\n"
+                "       NULL,\n"
+                "       NULL,\n"
+                "       NULL,\n"
+                "       NULL,\n"
+                "       :active,\n"
+                "       :revision_id\n"
+                "FROM tracker_field_information AS TFI\n"
+                "WHERE ((TFI.id = (\n"
+                "            SELECT TFI2.id\n"
+                "            FROM tracker_field_information AS TFI2\n"
+                "            WHERE (TFI2.tracker_field_id = :tracker_field_id)\n"
+                "            ORDER BY TFI2.revision_id DESC\n"
+                "            LIMIT 1\n"
+                "       )) AND\n"
+                "       (TFI.active != :active))",
                 {"tracker_field_id": tracker_field_id,
-                 "name": name,
-                 "display_name": display_name,
-                 "description": description,
-                 "field_type": field_type,
-                 "required": required,
                  "active": active,
                  "revision_id": revision_id})
 
-            row_id = cursor.lastrowid
+            if cursor.rowcount == 1:
+                row_id = cursor.lastrowid
+            else:
+                # Error, the tracker field does not exist or it is already in the requested state
+                row_id = None
         except sqlite3.IntegrityError:
             # Error occurred
             row_id = None
 
         return row_id
+
+    def read_states(self,
+                    connection: ConnectionSqlite,
+                    tracker_field_ids: List[int],
+                    max_revision_id: int) -> Dict[int, bool]:
+        """
+        Reads the latest state of all of the specified tracker fields for the max revision
+
+        :param connection:          Database connection
+        :param tracker_field_ids:   List of tracker field IDs
+        :param max_revision_id:     Maximum revision ID for the search
+
+        :return:    State (active or inactive) of each of the tracker fields that were found (key is
+                    the tracker field ID)
+        """
+        states = dict()
+
+        # Read the states in chunks to stay below the limit of SQL parameters
+        for values, parameters in id_list_chunks(tracker_field_ids,
+                                                 "tracker_field_id",
+                                                 {"max_revision_id": max_revision_id}):
+            # For each of the requested tracker fields the latest row is found with an index seek on
+            # "tracker_field_id" and "revision_id"
+            query = (
+                "SELECT ID.tracker_field_id,\n"
+                "       TFI.active\n"
+                "FROM (\n"
+                "    SELECT column1 AS tracker_field_id\n"
+                "    FROM (VALUES {0})\n"
+                ") AS ID\n"
+                "INNER JOIN tracker_field_information AS TFI\n"
+                "    ON (TFI.id = (\n"
+                "            SELECT TFI2.id\n"
+                "            FROM tracker_field_information AS TFI2\n"
+                "            WHERE ((TFI2.tracker_field_id = ID.tracker_field_id) AND\n"
+                "                   (TFI2.revision_id <= :max_revision_id))\n"
+                "            ORDER BY TFI2.revision_id DESC\n"
+                "            LIMIT 1\n"
+                "       ))"
+            ).format(values)
+
+            cursor = connection.execute(query, parameters)
+
+            for row in cursor.fetchall():
+                states[row["tracker_field_id"]] = bool(row["active"])
+
+        return states
+
+    def insert_state_rows(self,
+                          connection: ConnectionSqlite,
+                          tracker_field_ids: List[int],
+                          active: bool,
+                          revision_id: int) -> List[int]:
+        """
+        Inserts new rows in the table that only change the state of the tracker fields (all of the
+        other attributes of the tracker fields are unchanged)
+
+        :param connection:          Database connection
+        :param tracker_field_ids:   List of tracker field IDs
+        :param active:              New state of the tracker fields (active or inactive)
+        :param revision_id:         Revision ID
+
+        :return:    IDs of the tracker fields whose rows were inserted
+
+        NOTE:   Unlike "insert_state_row" this does not check the existence or the latest state of
+                the tracker fields!
+
+        NOTE:   Rows that violate a constraint (for example names that are already used by an
+                active tracker field) are not inserted, the other rows are still inserted!
+        """
+        if len(tracker_field_ids) == 0:
+            # Nothing to insert
+            return list()
+
+        query = ("INSERT INTO tracker_field_information\n"
+                 "   (id,\n"
+                 "    tracker_field_id,\n"
+                 "    active,\n"
+                 "    revision_id)\n"
+                 "VALUES (NULL,\n"
+                 "        :tracker_field_id,\n"
+                 "        :active,\n"
+                 "        :revision_id)")
+
+        value_array = list()
+
+        for tracker_field_id in tracker_field_ids:
+            value_item = {"tracker_field_id": tracker_field_id,
+                          "active": active,
+                          "revision_id": revision_id}
+            value_array.append(value_item)
+
+        # Rows of a failed batch are undone with the savepoint
+        connection.execute("SAVEPOINT tracker_field_information_state_rows")
+
+        try:
+            connection.executemany(query, value_array)
+            inserted_tracker_field_ids = list(tracker_field_ids)
+        except sqlite3.IntegrityError:
+            # Retry row by row so that only the violating rows are left out
+            connection.execute("ROLLBACK TO tracker_field_information_state_rows")
+            inserted_tracker_field_ids = list()
+
+            for value_item in value_array:
+                try:
+                    connection.execute(query, value_item)
+                    inserted_tracker_field_ids.append(value_item["tracker_field_id"])
+                except sqlite3.IntegrityError:
+                    # Error occurred, the row violates a constraint
+                    pass
+
+        connection.execute("RELEASE tracker_field_information_state_rows")
+        return inserted_tracker_field_ids
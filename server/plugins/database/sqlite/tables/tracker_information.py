@@ -14,10 +14,11 @@ You should have received a copy of the GNU Lesser General Public License along w
 not, see <http://www.gnu.org/licenses/>.
 """
 
-from plugins.database.sqlite.connection import ConnectionSqlite
+from plugins.database.sqlite.connection import ConnectionSqlite, id_list_chunks
+from plugins.database.sqlite.tables.text_content import TextContentTableSqlite
 from database.tables.tracker_information import TrackerInformationTable, TrackerSelection
 import sqlite3
-from typing import Any, List, Optional
+from typing import Any, Dict, List, Optional
 
 
 class TrackerInformationTableSqlite(TrackerInformationTable):
@@ -26,56 +27,80 @@ class TrackerInformationTableSqlite(TrackerInformationTable):
 
     Table's columns:
 
-    - id:           int
-    - tracker_id:   int, references tracker.id
-    - short_name:   str
-    - full_name:    str
-    - description:  Optional[str]
-    - active:       bool
-    - revision_id:  int, references revision.id
+    - id:               int
+    - tracker_id:       int, references tracker.id
+    - short_name:       Optional[str]
+    - full_name:        Optional[str]
+    - description_id:   Optional[int], references text_content.id
+    - active:           bool
+    - revision_id:      int, references revision.id
+
+    A row either contains all of the tracker's attributes or it is a state row (see
+    "insert_state_row") that only changes the state (active or inactive) and leaves all of the
+    other attributes ("NULL") unchanged. The attributes of a tracker in a revision are taken from
+    the latest row that contains them ("short_name" is not "NULL").
     """
 
-    def __init__(self):
+    def __init__(self, text_content: TextContentTableSqlite):
         """
         Constructor
+
+        :param text_content:    Table that stores the descriptions
         """
         TrackerInformationTable.__init__(self)
 
+        self.__text_content = text_content
+
     def create(self, connection: ConnectionSqlite) -> None:
         """
         Creates the table
 
         :param connection:  Database connection
         """
-        connection.native_connection.execute(
+        connection.execute(
             "CREATE TABLE tracker_information (\n"
-            "    id          INTEGER PRIMARY KEY AUTOINCREMENT\n"
-            "                        NOT NULL,\n"
-            "    tracker_id  INTEGER REFERENCES tracker (id)\n"
-            "                        NOT NULL,\n"
-            "    short_name  TEXT    NOT NULL\n"
-            "                        CHECK (length(short_name) > 0),\n"
-            "    full_name   TEXT    NOT NULL\n"
-            "                        CHECK (length(full_name) > 0),\n"
-            "    description TEXT,\n"
-            "    active      BOOLEAN NOT NULL\n"
-            "                        CHECK ( (active = 0) OR\n"
-            "                                (active = 1) ),\n"
-            "    revision_id INTEGER REFERENCES revision (id) \n"
-            "                        NOT NULL\n"
+            "    id             INTEGER PRIMARY KEY AUTOINCREMENT\n"
+            "                           NOT NULL,\n"
+            "    tracker_id     INTEGER REFERENCES tracker (id)\n"
+            "                           NOT NULL,\n"
+            "    short_name     TEXT    CHECK (length(short_name) > 0),\n"
+            "    full_name      TEXT    CHECK (length(full_name) > 0),\n"
+            "    description_id INTEGER REFERENCES text_content (id),\n"
+            "    active         BOOLEAN NOT NULL\n"
+            "                           CHECK ( (active = 0) OR\n"
+            "                                   (active = 1) ),\n"
+            "    revision_id    INTEGER REFERENCES revision (id) \n"
+            "                           NOT NULL,\n"
+            "    CHECK ( ((short_name IS NOT NULL) AND\n"
+            "             (full_name IS NOT NULL)) OR\n"
+            "            ((short_name IS NULL) AND\n"
+            "             (full_name IS NULL) AND\n"
+            "             (description_id IS NULL)) )\n"
             ")")
 
-        connection.native_connection.execute(
-            "CREATE INDEX tracker_information_ix_tracker_id ON tracker_information (\n"
-            "    tracker_id\n"
+        # Composite index allows the latest revision of a tracker to be found with an index seek
+        connection.execute(
+            "CREATE INDEX tracker_information_ix_tracker_id_revision_id\n"
+            "ON tracker_information (\n"
+            "    tracker_id,\n"
+            "    revision_id\n"
             ")")
 
-        connection.native_connection.execute(
+        # Partial index allows the latest attributes of a tracker to be found with an index seek
+        connection.execute(
+            "CREATE INDEX tracker_information_ix_tracker_id_revision_id_attributes\n"
+            "ON tracker_information (\n"
+            "    tracker_id,\n"
+            "    revision_id\n"
+            ")\n"
+            "WHERE (short_name IS NOT NULL)")
+
+        connection.execute(
             "CREATE INDEX tracker_information_ix_short_name ON tracker_information (\n"
             "    short_name\n"
             ")")
 
-        connection.native_connection.execute(
+        connection.execute(
             "CREATE INDEX tracker_information_ix_full_name ON tracker_information (\n"
             "    full_name\n"
             ")")
@@ -121,15 +146,15 @@ class TrackerInformationTableSqlite(TrackerInformationTable):
         else:
             query += "WHERE (T.project_id = :project_id)"
 
-        cursor = connection.native_connection.execute(query, {"project_id": project_id,
-                                                              "max_revision_id": max_revision_id})
+        cursor = connection.execute(query, {"project_id": project_id,
+                                            "max_revision_id": max_revision_id})
 
         # Process result
         trackers = list()
 
         for row in cursor.fetchall():
             if row is not None:
-                trackers.append(row["TI.tracker_id"])
+                trackers.append(row["tracker_id"])
 
         return trackers
 
@@ -170,59 +195,74 @@ class TrackerInformationTableSqlite(TrackerInformationTable):
         if attribute_name not in ["tracker_id", "short_name", "full_name"]:
             raise AttributeError("Unsupported attribute name")
 
-        # Read the users that match the search attribute
+        # ID of the row with the latest attributes of the tracker (index seek on the partial index)
+        attributes_row_id = (
+            "(\n"
+            "            SELECT TA2.id\n"
+            "            FROM tracker_information AS TA2\n"
+            "            WHERE ((TA2.tracker_id = TA.tracker_id) AND\n"
+            "                   (TA2.short_name IS NOT NULL) AND\n"
+            "                   (TA2.revision_id <= :max_revision_id))\n"
+            "            ORDER BY TA2.revision_id DESC\n"
+            "            LIMIT 1\n"
+            "       )"
+        )
+
+        # Read the trackers that match the search attribute: the latest attributes of each tracker
+        # are matched (index seek on the search attribute) and joined with the latest state of the
+        # tracker (index seek on "tracker_id" and "revision_id")
         query = (
             "SELECT T.project_id,\n"
-            "       TI.tracker_id,\n"
-            "       TI.short_name,\n"
-            "       TI.full_name,\n"
-            "       TI.description,\n"
+            "       TA.tracker_id,\n"
+            "       TA.short_name,\n"
+            "       TA.full_name,\n"
+            "       text_content_decode(TC.content) AS description,\n"
             "       TI.active,\n"
             "       TI.revision_id\n"
-            "FROM tracker as T\n"
-            "INNER JOIN (\n"
-            "    SELECT TI1.tracker_id,\n"
-            "           TI1.short_name,\n"
-            "           TI1.full_name,\n"
-            "           TI1.description,\n"
-            "           TI1.active,\n"
-            "           TI1.revision_id\n"
-            "    FROM tracker_information AS TI1\n"
-            "    WHERE (TI1.revision_id = (\n"
-            "                SELECT MAX(TI2.revision_id)\n"
-            "                FROM tracker_information AS TI2\n"
-            "                WHERE ((TI2.tracker_id = TI1.tracker_id) AND\n"
-            "                       (TI2.revision_id <= :max_revision_id))\n"
-            "           ))\n"
-            ") AS TI\n"
-            "ON (T.id = TI.tracker_id)"
+            "FROM tracker_information AS TA\n"
+            "INNER JOIN tracker AS T\n"
+            "    ON (T.id = TA.tracker_id)\n"
+            "INNER JOIN tracker_information AS TI\n"
+            "    ON (TI.id = (\n"
+            "            SELECT TI2.id\n"
+            "            FROM tracker_information AS TI2\n"
+            "            WHERE ((TI2.tracker_id = TA.tracker_id) AND\n"
+            "                   (TI2.revision_id <= :max_revision_id))\n"
+            "            ORDER BY TI2.revision_id DESC\n"
+            "            LIMIT 1\n"
+            "       ))\n"
+            "LEFT OUTER JOIN text_content AS TC\n"
+            "    ON (TC.id = TA.description_id)\n"
         )
 
         if tracker_selection == TrackerSelection.Active:
-            query += ("WHERE ((TI.{0} = :attribute_value) AND\n"
+            query += ("WHERE ((TA.{0} = :attribute_value) AND\n"
+                      "       (TA.id = {1}) AND\n"
                       "       (TI.active = 1))")
         elif tracker_selection == TrackerSelection.Inactive:
-            query += ("WHERE ((TI.{0} = :attribute_value) AND\n"
+            query += ("WHERE ((TA.{0} = :attribute_value) AND\n"
+                      "       (TA.id = {1}) AND\n"
                       "       (TI.active = 0))")
         else:
-            query += "WHERE (TI.{0} = :attribute_value)"
+            query += ("WHERE ((TA.{0} = :attribute_value) AND\n"
+                      "       (TA.id = {1}))")
 
-        cursor = connection.native_connection.execute(query.format(attribute_name),
-                                                      {"attribute_value": attribute_value,
-                                                       "max_revision_id": max_revision_id})
+        cursor = connection.execute(query.format(attribute_name, attributes_row_id),
+                                    {"attribute_value": attribute_value,
+                                     "max_revision_id": max_revision_id})
 
         # Process result
         trackers = list()
 
         for row in cursor.fetchall():
             if row is not None:
-                tracker = {"project_id": row["T.project_id"],
-                           "tracker_id": row["TI.tracker_id"],
-                           "short_name": row["TI.short_name"],
-                           "full_name": row["TI.full_name"],
-                           "description": row["TI.description"],
-                           "active": bool(row["TI.active"]),
-                           "revision_id": row["TI.revision_id"]}
+                tracker = {"project_id": row["project_id"],
+                           "tracker_id": row["tracker_id"],
+                           "short_name": row["short_name"],
+                           "full_name": row["full_name"],
+                           "description": row["description"],
+                           "active": bool(row["active"]),
+                           "revision_id": row["revision_id"]}
                 trackers.append(tracker)
 
         return trackers
@@ -234,47 +274,254 @@ class TrackerInformationTableSqlite(TrackerInformationTable):
                    full_name: str,
                    description: str,
                    active: bool,
-                   revision_id: int) -> Optional[int]:
+                   revision_id: int,
+                   expected_revision_id: Optional[int] = None) -> Optional[int]:
         """
         Inserts a new row in the table
 
+        :param connection:           Database connection
+        :param tracker_id:           ID of the tracker
+        :param short_name:           Tracker short name
+        :param full_name:            Tracker full name
+        :param description:          Tracker description
+        :param active:               State of the tracker (active or inactive)
+        :param revision_id:          Revision ID
+        :param expected_revision_id: Expected revision ID of the latest row (optional)
+
+        :return:    ID of the newly created row
+
+        NOTE:   If the expected revision ID is specified the row is inserted only if the latest
+                row of the tracker is still from the expected revision!
+        """
+        description_id = None
+
+        if description is not None:
+            description_id = self.__text_content.insert_text(connection, description)
+
+            if description_id is None:
+                # Error, failed to store the description
+                return None
+
+        query = (
+            "INSERT INTO tracker_information\n"
+            "   (id,\n"
+            "    tracker_id,\n"
+            "    short_name,\n"
+            "    full_name,\n"
+            "    description_id,\n"
+            "    active,\n"
+            "    revision_id)\n"
+            "SELECT NULL,\n"
+            "       :tracker_id,\n"
+            "       :short_name,\n"
+            "       :full_name,\n"
+            "       :description_id,\n"
+            "       :active,\n"
+            "       :revision_id"
+        )
+        parameters = {"tracker_id": tracker_id,
+                      "short_name": short_name,
+                      "full_name": full_name,
+                      "description_id": description_id,
+                      "active": active,
+                      "revision_id": revision_id}
+
+        if expected_revision_id is not None:
+            # Insert the row only if the latest row of the tracker is from the expected revision
+            # (index seek on "tracker_id" and "revision_id")
+            query += ("\n"
+                      "WHERE ((\n"
+                      "    SELECT TI.revision_id\n"
+                      "    FROM tracker_information AS TI\n"
+                      "    WHERE (TI.tracker_id = :tracker_id)\n"
+                      "    ORDER BY TI.revision_id DESC\n"
+                      "    LIMIT 1\n"
+                      ") = :expected_revision_id)")
+            parameters["expected_revision_id"] = expected_revision_id
+
+        try:
+            cursor = connection.execute(query, parameters)
+
+            if cursor.rowcount == 1:
+                row_id = cursor.lastrowid
+            else:
+                # Error, the tracker was modified after the expected revision
+                row_id = None
+        except sqlite3.IntegrityError:
+            # Error occurred
+            row_id = None
+
+        return row_id
+
+    def insert_state_row(self,
+                         connection: ConnectionSqlite,
+                         tracker_id: int,
+                         active: bool,
+                         revision_id: int) -> Optional[int]:
+        """
+        Inserts a new row in the table that only changes the state of the tracker (all of the other
+        attributes of the tracker are unchanged)
+
         :param connection:  Database connection
         :param tracker_id:  ID of the tracker
-        :param short_name:  Tracker short name
-        :param full_name:   Tracker full name
-        :param description: Tracker description
-        :param active:      State of the tracker (active or inactive)
+        :param active:      New state of the tracker (active or inactive)
         :param revision_id: Revision ID
 
         :return:    ID of the newly created row
+
+        NOTE:   The row is inserted only if the tracker exists and its latest state is different
+                from the new state!
         """
         try:
-            cursor = connection.native_connection.execute(
+            cursor = connection.execute(
                 "INSERT INTO tracker_information\n"
                 "   (id,\n"
                 "    tracker_id,\n"
                 "    short_name,\n"
                 "    full_name,\n"
-                "    description,\n"
+                "    description_id,\n"
                 "    active,\n"
                 "    revision_id)\n"
-                "VALUES (NULL,\n"
-                "        :tracker_id,\n"
-                "        :short_name,\n"
-                "        :full_name,\n"
-                "        :description,\n"
-                "        :active,\n"
-                "        :revision_id)",
+                "SELECT NULL,\n"
+                "       TI.tracker_id,\n"
+                "       NULL,\n"
+                "       NULL,\n"
+                "       NULL,\n"
+                "       :active,\n"
+                "       :revision_id\n"
+                "FROM tracker_information AS TI\n"
+                "WHERE ((TI.id = (\n"
+                "            SELECT TI2.id\n"
+                "            FROM tracker_information AS TI2\n"
+                "            WHERE (TI2.tracker_id = :tracker_id)\n"
+                "            ORDER BY TI2.revision_id DESC\n"
+                "            LIMIT 1\n"
+                "       )) AND\n"
+                "       (TI.active != :active))",
                 {"tracker_id": tracker_id,
-                 "short_name": short_name,
-                 "full_name": full_name,
-                 "description": description,
                  "active": active,
                  "revision_id": revision_id})
 
-            row_id = cursor.lastrowid
+            if cursor.rowcount == 1:
+                row_id = cursor.lastrowid
+            else:
+                # Error, the tracker does not exist or it is already in the requested state
+                row_id = None
         except sqlite3.IntegrityError:
             # Error occurred
             row_id = None
 
         return row_id
+
+    def read_states(self,
+                    connection: ConnectionSqlite,
+                    tracker_ids: List[int],
+                    max_revision_id: int) -> Dict[int, bool]:
+        """
+        Reads the latest state of all of the specified trackers for the max revision
+
+        :param connection:      Database connection
+        :param tracker_ids:     List of tracker IDs
+        :param max_revision_id: Maximum revision ID for the search
+
+        :return:    State (active or inactive) of each of the trackers that were found (key is the
+                    tracker ID)
+        """
+        states = dict()
+
+        # Read the states in chunks to stay below the limit of SQL parameters
+        for values, parameters in id_list_chunks(tracker_ids,
+                                                 "tracker_id",
+                                                 {"max_revision_id": max_revision_id}):
+            # For each of the requested trackers the latest row is found with an index seek on
+            # "tracker_id" and "revision_id"
+            query = (
+                "SELECT ID.tracker_id,\n"
+                "       TI.active\n"
+                "FROM (\n"
+                "    SELECT column1 AS tracker_id\n"
+                "    FROM (VALUES {0})\n"
+                ") AS ID\n"
+                "INNER JOIN tracker_information AS TI\n"
+                "    ON (TI.id = (\n"
+                "            SELECT TI2.id\n"
+                "            FROM tracker_information AS TI2\n"
+                "            WHERE ((TI2.tracker_id = ID.tracker_id) AND\n"
+                "                   (TI2.revision_id <= :max_revision_id))\n"
+                "            ORDER BY TI2.revision_id DESC\n"
+                "            LIMIT 1\n"
+                "       ))"
+            ).format(values)
+
+            cursor = connection.execute(query, parameters)
+
+            for row in cursor.fetchall():
+                states[row["tracker_id"]] = bool(row["active"])
+
+        return states
+
+    def insert_state_rows(self,
+                          connection: ConnectionSqlite,
+                          tracker_ids: List[int],
+                          active: bool,
+                          revision_id: int) -> List[int]:
+        """
+        Inserts new rows in the table that only change the state of the trackers (all of the other
+        attributes of the trackers are unchanged)
+
+        :param connection:      Database connection
+        :param tracker_ids:     List of tracker IDs
+        :param active:          New state of the trackers (active or inactive)
+        :param revision_id:     Revision ID
+
+        :return:    IDs of the trackers whose rows were inserted
+
+        NOTE:   Unlike "insert_state_row" this does not check the existence or the latest state of
+                the trackers!
+
+        NOTE:   Rows that violate a constraint (for example names that are already used by an
+                active tracker) are not inserted, the other rows are still inserted!
+        """
+        if len(tracker_ids) == 0:
+            # Nothing to insert
+            return list()
+
+        query = ("INSERT INTO tracker_information\n"
+                 "   (id,\n"
+                 "    tracker_id,\n"
+                 "    active,\n"
+                 "    revision_id)\n"
+                 "VALUES (NULL,\n"
+                 "        :tracker_id,\n"
+                 "        :active,\n"
+                 "        :revision_id)")
+
+        value_array = list()
+
+        for tracker_id in tracker_ids:
+            value_item = {"tracker_id": tracker_id,
+                          "active": active,
+                          "revision_id": revision_id}
+            value_array.append(value_item)
+
+        # Rows of a failed batch are undone with the savepoint
+        connection.execute("SAVEPOINT tracker_information_state_rows")
+
+        try:
+            connection.executemany(query, value_array)
+            inserted_tracker_ids = list(tracker_ids)
+        except sqlite3.IntegrityError:
+            # Retry row by row so that only the violating rows are left out
+            connection.execute("ROLLBACK TO tracker_information_state_rows")
+            inserted_tracker_ids = list()
+
+            for value_item in value_array:
+                try:
+                    connection.execute(query, value_item)
+                    inserted_tracker_ids.append(value_item["tracker_id"])
+                except sqlite3.IntegrityError:
+                    # Error occurred, the row violates a constraint
+                    pass
+
+        connection.execute("RELEASE tracker_information_state_rows")
+        return inserted_tracker_ids
@@ -14,9 +14,9 @@ You should have received a copy of the GNU Lesser General Public License along w
 not, see <http://www.gnu.org/licenses/>.
 """
 
-from plugins.database.sqlite.connection import ConnectionSqlite
+from plugins.database.sqlite.connection import ConnectionSqlite, id_list_chunks
 from database.tables.user import UserTable, UserSelection
-from typing import Any, List, Optional
+from typing import Any, Dict, List, Optional
 import sqlite3
 
 
@@ -45,7 +45,7 @@ class UserTableSqlite(UserTable):
 
         :param connection:  Database connection
         """
-        connection.native_connection.execute(
+        connection.execute(
             "CREATE TABLE user (\n"
             "    id           INTEGER PRIMARY KEY AUTOINCREMENT\n"
             "                         NOT NULL,\n"
@@ -59,16 +59,37 @@ class UserTableSqlite(UserTable):
             "                                 (active = 1) )\n"
             ")")
 
-        connection.native_connection.execute(
+        connection.execute(
             "CREATE INDEX user_ix_user_name ON user (\n"
             "    user_name\n"
             ")")
 
-        connection.native_connection.execute(
+        connection.execute(
             "CREATE INDEX user_ix_display_name ON user (\n"
             "    display_name\n"
             ")")
 
+        connection.execute(
+            "CREATE INDEX user_ix_email ON user (\n"
+            "    email\n"
+            ")")
+
+        # Case-insensitive indexes for the prefix search in the user directory
+        connection.execute(
+            "CREATE INDEX user_ix_user_name_nocase ON user (\n"
+            "    user_name COLLATE NOCASE\n"
+            ")")
+
+        connection.execute(
+            "CREATE INDEX user_ix_display_name_nocase ON user (\n"
+            "    display_name COLLATE NOCASE\n"
+            ")")
+
+        connection.execute(
+            "CREATE INDEX user_ix_email_nocase ON user (\n"
+            "    email COLLATE NOCASE\n"
+            ")")
+
     def read_all_ids(self,
                      connection: ConnectionSqlite,
                      user_selection: UserSelection) -> List[int]:
@@ -93,7 +114,7 @@ class UserTableSqlite(UserTable):
             # Nothing needed for selecting all users
             pass
 
-        cursor = connection.native_connection.execute(query)
+        cursor = connection.execute(query)
 
         users = list()
 
@@ -154,8 +175,8 @@ class UserTableSqlite(UserTable):
         else:
             query += "WHERE ({0} = :attribute_value)"
 
-        cursor = connection.native_connection.execute(query.format(attribute_name),
-                                                      {"attribute_value": attribute_value})
+        cursor = connection.execute(query.format(attribute_name),
+                                    {"attribute_value": attribute_value})
 
         # Process result
         users = list()
@@ -171,6 +192,93 @@ class UserTableSqlite(UserTable):
 
         return users
 
+    def search_users(self,
+                     connection: ConnectionSqlite,
+                     text: str,
+                     user_selection: UserSelection,
+                     limit: int) -> List[dict]:
+        """
+        Searches for users whose user name, display name or email starts with the specified text
+
+        :param connection:      Database connection
+        :param text:            Text to search for (case-insensitive prefix)
+        :param user_selection:  Search for active, inactive or all users
+        :param limit:           Max number of returned users
+
+        :return:    User information of the matching users (ordered by user name)
+
+        Each dictionary in the returned list contains items:
+
+        - id
+        - user_name
+        - display_name
+        - email
+        - active
+
+        NOTE:   First "limit" matches are taken from each of the searched columns (in the order of
+                that column) and then the combined result is ordered by user name.
+        """
+        if user_selection == UserSelection.Active:
+            selection_condition = " AND\n               (active = 1)"
+        elif user_selection == UserSelection.Inactive:
+            selection_condition = " AND\n               (active = 0)"
+        else:
+            selection_condition = ""
+
+        # Prefix match is done as a range scan of a case-insensitive index for each of the searched
+        # columns, only the first "limit" matches are needed from each of them
+        column_query = (
+            "    SELECT id\n"
+            "    FROM (\n"
+            "        SELECT id\n"
+            "        FROM user\n"
+            "        WHERE (({0} >= :range_start COLLATE NOCASE) AND\n"
+            "               ({0} < :range_end COLLATE NOCASE){1})\n"
+            "        ORDER BY {0} COLLATE NOCASE\n"
+            "        LIMIT :limit\n"
+            "    )\n"
+        )
+
+        query = (
+            "SELECT id,\n"
+            "       user_name,\n"
+            "       display_name,\n"
+            "       email,\n"
+            "       active\n"
+            "FROM user\n"
+            "WHERE id IN (\n"
+            "{0}"
+            "    UNION\n"
+            "{1}"
+            "    UNION\n"
+            "{2}"
+            ")\n"
+            "ORDER BY user_name COLLATE NOCASE,\n"
+            "         id\n"
+            "LIMIT :limit"
+        ).format(column_query.format("user_name", selection_condition),
+                 column_query.format("display_name", selection_condition),
+                 column_query.format("email", selection_condition))
+
+        # The range ends with the highest possible character appended to the searched text
+        cursor = connection.execute(query,
+                                    {"range_start": text,
+                                     "range_end": text + "\U0010ffff",
+                                     "limit": limit})
+
+        # Process result
+        users = list()
+
+        for row in cursor.fetchall():
+            user = {"id": row["id"],
+                    "user_name": row["user_name"],
+                    "display_name": row["display_name"],
+                    "email": row["email"],
+                    "active": bool(row["active"])}
+            users.append(user)
+
+        return users
+
     def insert_row(self,
                    connection: ConnectionSqlite,
                    user_name: str,
@@ -189,7 +297,7 @@ class UserTableSqlite(UserTable):
         :return:    ID of the newly created row
         """
         try:
-            cursor = connection.native_connection.execute(
+            cursor = connection.execute(
                 "INSERT INTO user\n"
                 "   (id,\n"
                 "    user_name,\n"
@@ -233,7 +341,7 @@ class UserTableSqlite(UserTable):
         :return:    Success or failure
         """
         try:
-            cursor = connection.native_connection.execute(
+            cursor = connection.execute(
                 "UPDATE user\n"
                 "SET user_name = :user_name,\n"
                 "    display_name = :display_name,\n"
@@ -255,3 +363,71 @@ class UserTableSqlite(UserTable):
             success = False
 
         return success
+
+    def read_states(self,
+                    connection: ConnectionSqlite,
+                    user_ids: List[int]) -> Dict[int, bool]:
+        """
+        Reads the state of all of the specified users
+
+        :param connection:  Database connection
+        :param user_ids:    List of user IDs
+
+        :return:    State (active or inactive) of each of the users that were found (key is the
+                    user ID)
+        """
+        states = dict()
+
+        # Read the states in chunks to stay below the limit of SQL parameters
+        for values, parameters in id_list_chunks(user_ids, "user_id", row_values=False):
+            cursor = connection.execute(
+                "SELECT id,\n"
+                "       active\n"
+                "FROM user\n"
+                "WHERE (id IN ({0}))".format(values),
+                parameters)
+
+            for row in cursor.fetchall():
+                states[row["id"]] = bool(row["active"])
+
+        return states
+
+    def update_states(self,
+                      connection: ConnectionSqlite,
+                      user_ids: List[int],
+                      active: bool) -> bool:
+        """
+        Updates the state of all of the specified users
+
+        :param connection:  Database connection
+        :param user_ids:    List of user IDs
+        :param active:      Users' new state (active or inactive)
+
+        :return:    Success or failure
+        """
+        if len(user_ids) == 0:
+            # Nothing to update
+            return True
+
+        success = False
+        value_array = list()
+
+        for user_id in user_ids:
+            value_item = {"id": user_id,
+                          "active": active}
+            value_array.append(value_item)
+
+        try:
+            cursor = connection.executemany(
+                "UPDATE user\n"
+                "SET active = :active\n"
+                "WHERE (id = :id)",
+                value_array)
+
+            if cursor.rowcount == len(value_array):
+                success = True
+        except sqlite3.IntegrityError:
+            # Error occurred
+            success = False
+
+        return success
@@ -42,7 +42,7 @@ class UserAuthenticationTableSqlite(UserAuthenticationTable):
 
         :param connection:  Database connection
         """
-        connection.native_connection.execute(
+        connection.execute(
             "CREATE TABLE user_authentication (\n"
             "    user_id               INTEGER REFERENCES user (id)\n"
             "                                  NOT NULL\n"
@@ -65,7 +65,7 @@ class UserAuthenticationTableSqlite(UserAuthenticationTable):
         - user_id
         - authentication_type
         """
-        cursor = connection.native_connection.execute(
+        cursor = connection.execute(
             "SELECT user_id,\n"
             "       authentication_type\n"
             "FROM user_authentication\n"
@@ -95,7 +95,7 @@ class UserAuthenticationTableSqlite(UserAuthenticationTable):
         :return:    ID of the newly created row
         """
         try:
-            cursor = connection.native_connection.execute(
+            cursor = connection.execute(
                 "INSERT INTO user_authentication\n"
                 "   (user_id,\n"
                 "    authentication_type)\n"
@@ -125,7 +125,7 @@ class UserAuthenticationTableSqlite(UserAuthenticationTable):
         :return:    Success or failure
         """
         try:
-            cursor = connection.native_connection.execute(
+            cursor = connection.execute(
                 "UPDATE user_authentication\n"
                 "SET authentication_type = :authentication_type\n"
                 "WHERE (user_id = :user_id)",
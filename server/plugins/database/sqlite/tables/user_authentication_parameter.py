@@ -43,7 +43,7 @@ class UserAuthenticationParameterTableSqlite(UserAuthenticationParameterTable):
 
         :param connection:  Database connection
         """
-        connection.native_connection.execute(
+        connection.execute(
             "CREATE TABLE user_authentication_parameter (\n"
             "    user_id     INTEGER REFERENCES user (id)\n"
             "                        NOT NULL\n"
@@ -71,7 +71,7 @@ class UserAuthenticationParameterTableSqlite(UserAuthenticationParameterTable):
         {"password_hash": "4252397432974634",
          "domain_name": "EXAMPLE"}
         """
-        cursor = connection.native_connection.execute(
+        cursor = connection.execute(
             "SELECT name,\n"
             "       value\n"
             "FROM user_authentication_parameter\n"
@@ -113,7 +113,7 @@ class UserAuthenticationParameterTableSqlite(UserAuthenticationParameterTable):
             value_array.append(value_item)
 
         try:
-            cursor = connection.native_connection.executemany(
+            cursor = connection.executemany(
                 "INSERT INTO user_authentication_parameter"
                 "   (user_id,\n"
                 "    name,\n"
@@ -138,7 +138,7 @@ class UserAuthenticationParameterTableSqlite(UserAuthenticationParameterTable):
         :param connection:  Database connection
         :param user_id:     ID of the user authentication
         """
-        connection.native_connection.execute(
+        connection.execute(
             "DELETE FROM user_authentication_parameter\n"
             "WHERE (user_id = :user_id)",
             {"user_id": user_id})
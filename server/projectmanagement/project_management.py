@@ -18,7 +18,7 @@ from database.connection import Connection
 from database.database import DatabaseInterface
 from database.tables.project_information import ProjectSelection
 import datetime
-from typing import List, Optional
+from typing import Dict, List, Optional
 
 
 class ProjectManagementInterface(object):
@@ -274,7 +274,7 @@ class ProjectManagementInterface(object):
         connection = DatabaseInterface.create_connection()
 
         try:
-            success = connection.begin_transaction()
+            success = connection.begin_transaction(write=True)
 
             # Start a new revision
             revision_id = None
@@ -315,23 +315,39 @@ class ProjectManagementInterface(object):
                                    short_name: str,
                                    full_name: str,
                                    description: str,
-                                   active: bool) -> bool:
+                                   active: bool,
+                                   expected_revision_id=None) -> bool:
         """
         Updates project's information
 
-        :param requested_by_user:   ID of the user that requested modification of the user
-        :param project_to_modify:   ID of the project that should be modified
-        :param short_name:          Project's new short name
-        :param full_name:           Project's new full name
-        :param description:         Project's new description
-        :param active:              Project's new state (active or inactive)
+        :param requested_by_user:       ID of the user that requested modification of the user
+        :param project_to_modify:       ID of the project that should be modified
+        :param short_name:              Project's new short name
+        :param full_name:               Project's new full name
+        :param description:             Project's new description
+        :param active:                  Project's new state (active or inactive)
+        :param expected_revision_id:    Revision ID of the project that the modification is based
+                                        on (optional)
 
         :return:    Success or failure
+
+        NOTE:   If the expected revision ID is specified the update fails in case the project was
+                modified in a later revision!
         """
         connection = DatabaseInterface.create_connection()
 
         try:
-            success = connection.begin_transaction()
+            # Fail fast (before the write transaction is started) if the project was already
+            # modified after the expected revision
+            success = True
+
+            if expected_revision_id is not None:
+                success = ProjectManagementInterface.__is_latest_revision(connection,
+                                                                          project_to_modify,
+                                                                          expected_revision_id)
+
+            if success:
+                success = connection.begin_transaction(write=True)
 
             # Start a new revision
             revision_id = None
@@ -345,27 +361,8 @@ class ProjectManagementInterface(object):
                 if revision_id is None:
                     success = False
 
-            # Check if there is already an existing project with the same short name
-            if success:
-                project = ProjectManagementInterface.__read_project_by_short_name(connection,
-                                                                                  short_name,
-                                                                                  revision_id)
-
-                if project is not None:
-                    if project["id"] != project_to_modify:
-                        success = False
-
-            # Check if there is already an existing project with the same full name
-            if success:
-                project = ProjectManagementInterface.__read_project_by_full_name(connection,
-                                                                                 full_name,
-                                                                                 revision_id)
-
-                if project is not None:
-                    if project["id"] != project_to_modify:
-                        success = False
-
-            # Update project's information in the new revision
+            # Update project's information in the new revision (the database rejects it if the
+            # project was modified after the expected revision or if its names are already used)
             if success:
                 row_id = DatabaseInterface.tables().project_information.insert_row(
                     connection,
@@ -374,7 +371,8 @@ class ProjectManagementInterface(object):
                     full_name,
                     description,
                     active,
-                    revision_id)
+                    revision_id,
+                    expected_revision_id)
 
                 if row_id is None:
                     success = False
@@ -398,11 +396,13 @@ class ProjectManagementInterface(object):
         :param project_id:  ID of the project that should be activated
 
         :return:    Success or failure
+
+        Activation fails if the project's short or full name is used by another active project.
         """
         connection = DatabaseInterface.create_connection()
 
         try:
-            success = connection.begin_transaction()
+            success = connection.begin_transaction(write=True)
 
             # Start a new revision
             revision_id = None
@@ -416,30 +416,16 @@ class ProjectManagementInterface(object):
                 if revision_id is None:
                     success = False
 
-            # Read project
-            project = None
-
-            if success:
-                project = ProjectManagementInterface.__read_project_by_id(connection,
-                                                                          project_id,
-                                                                          revision_id)
-
-                if project is None:
-                    success = False
-                elif project["active"]:
-                    # Error, project is already active
-                    success = False
-
-            # Activate project
+            # Activate project (only its state is changed and only if it is inactive)
             if success:
-                success = DatabaseInterface.tables().project_information.insert_row(
+                row_id = DatabaseInterface.tables().project_information.insert_state_row(
                     connection,
                     project_id,
-                    project["short_name"],
-                    project["full_name"],
-                    project["description"],
                     True,
                     revision_id)
+                
+                if row_id is None:
+                    success = False
 
             if success:
                 connection.commit_transaction()
@@ -464,7 +450,7 @@ class ProjectManagementInterface(object):
         connection = DatabaseInterface.create_connection()
 
         try:
-            success = connection.begin_transaction()
+            success = connection.begin_transaction(write=True)
 
             # Start a new revision
             revision_id = None
@@ -478,40 +464,132 @@ class ProjectManagementInterface(object):
                 if revision_id is None:
                     success = False
 
-            # Read project
-            project = None
+            # Deactivate project (only its state is changed and only if it is active)
+            if success:
+                row_id = DatabaseInterface.tables().project_information.insert_state_row(
+                    connection,
+                    project_id,
+                    False,
+                    revision_id)
+                
+                if row_id is None:
+                    success = False
 
             if success:
-                project = ProjectManagementInterface.__read_project_by_id(connection,
-                                                                          project_id,
-                                                                          revision_id)
+                connection.commit_transaction()
+            else:
+                connection.rollback_transaction()
+        except:
+            connection.rollback_transaction()
+            raise
 
-                if project is None:
-                    success = False
-                elif not project["active"]:
-                    # Error, project is already inactive
+        return success
+
+    @staticmethod
+    def activate_projects(requested_by_user: int, project_ids: List[int]) -> Dict[int, bool]:
+        """
+        Activates inactive projects (all of them in a single revision)
+
+        :param requested_by_user:   ID of the user that requested modification of the projects
+        :param project_ids:         IDs of the projects that should be activated
+
+        :return:    Success or failure for each of the projects (key is the project ID)
+
+        Projects that do not exist or that are already active are not changed.
+        """
+        return ProjectManagementInterface.__change_projects_state(requested_by_user,
+                                                                  project_ids,
+                                                                  True)
+
+    @staticmethod
+    def deactivate_projects(requested_by_user: int, project_ids: List[int]) -> Dict[int, bool]:
+        """
+        Deactivates active projects (all of them in a single revision)
+
+        :param requested_by_user:   ID of the user that requested modification of the projects
+        :param project_ids:         IDs of the projects that should be deactivated
+
+        :return:    Success or failure for each of the projects (key is the project ID)
+
+        Projects that do not exist or that are already inactive are not changed.
+        """
+        return ProjectManagementInterface.__change_projects_state(requested_by_user,
+                                                                  project_ids,
+                                                                  False)
+
+    @staticmethod
+    def __change_projects_state(requested_by_user: int,
+                                project_ids: List[int],
+                                active: bool) -> Dict[int, bool]:
+        """
+        Changes the state of the projects (all of them in a single revision)
+
+        :param requested_by_user:   ID of the user that requested modification of the projects
+        :param project_ids:         IDs of the projects
+        :param active:              New state of the projects (active or inactive)
+
+        :return:    Success or failure for each of the projects (key is the project ID)
+        """
+        results = {project_id: False for project_id in project_ids}
+        connection = DatabaseInterface.create_connection()
+
+        try:
+            success = connection.begin_transaction(write=True)
+
+            # Start a new revision
+            revision_id = None
+
+            if success:
+                revision_id = DatabaseInterface.tables().revision.insert_row(
+                    connection,
+                    datetime.datetime.utcnow(),
+                    requested_by_user)
+
+                if revision_id is None:
                     success = False
 
-            # Deactivate project
+            # Find the projects that exist and are not already in the requested state (all of them
+            # with a single query)
+            changed_project_ids = list()
+
             if success:
-                success = DatabaseInterface.tables().project_information.insert_row(
+                states = DatabaseInterface.tables().project_information.read_states(
                     connection,
-                    project_id,
-                    project["short_name"],
-                    project["full_name"],
-                    project["description"],
-                    False,
+                    list(results.keys()),
                     revision_id)
 
+                changed_project_ids = [x for x in results.keys()
+                                       if (x in states) and (states[x] != active)]
+
+                if len(changed_project_ids) == 0:
+                    # Nothing to change
+                    success = False
+
+            # Change the state of the projects (only their state is changed). Projects whose names
+            # are already used by other active projects are left unchanged.
+            if success:
+                changed_project_ids = \
+                    DatabaseInterface.tables().project_information.insert_state_rows(
+                        connection,
+                        changed_project_ids,
+                        active,
+                        revision_id)
+
+                if len(changed_project_ids) == 0:
+                    success = False
+
             if success:
                 connection.commit_transaction()
+
+                for project_id in changed_project_ids:
+                    results[project_id] = True
             else:
                 connection.rollback_transaction()
         except:
             connection.rollback_transaction()
             raise
 
-        return success
+        return results
 
     @staticmethod
     def __read_project_by_id(connection: Connection,
@@ -645,6 +723,29 @@ class ProjectManagementInterface(object):
 
         return project
 
+    @staticmethod
+    def __is_latest_revision(connection: Connection, project_id: int, revision_id: int) -> bool:
+        """
+        Checks if the project was not modified after the specified revision
+
+        :param connection:  Database connection
+        :param project_id:  ID of the project
+        :param revision_id: Revision ID
+
+        :return:    True if the revision is the latest revision of the project
+        """
+        current_revision_id = DatabaseInterface.tables().revision.read_current_revision_id(
+            connection)
+
+        if current_revision_id is None:
+            return False
+
+        project = ProjectManagementInterface.__read_project_by_id(connection,
+                                                                  project_id,
+                                                                  current_revision_id)
+
+        return (project is not None) and (project["revision_id"] == revision_id)
+
     @staticmethod
     def __create_project(connection: Connection,
                          short_name: str,
@@ -662,29 +763,14 @@ class ProjectManagementInterface(object):
 
         :return:    Project ID of the newly created project
         """
-        # Check if a project with the same short name already exists
-        project = ProjectManagementInterface.__read_project_by_short_name(connection,
-                                                                          short_name,
-                                                                          revision_id)
-
-        if project is not None:
-            return None
-
-        # Check if a project with the same full name already exists
-        project = ProjectManagementInterface.__read_project_by_full_name(connection,
-                                                                         full_name,
-                                                                         revision_id)
-
-        if project is not None:
-            return None
-
         # Create the project in the new revision
         project_id = DatabaseInterface.tables().project.insert_row(connection)
 
         if project_id is None:
             return None
 
-        # Add project information to the project
+        # Add project information to the project (the database rejects it if the names are already
+        # used by another active project)
         project_information_id = DatabaseInterface.tables().project_information.insert_row(
             connection,
             project_id,
@@ -0,0 +1,281 @@
+"""
+Salamander ALM
+Copyright (c) 2016  Djuro Drljaca
+
+This Python module is free software; you can redistribute it and/or modify it under the terms of the
+GNU General Public License as published by the Free Software Foundation; either version 2 of the
+License, or (at your option) any later version.
+
+This Python module is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License along with this library. If
+not, see <http://www.gnu.org/licenses/>.
+"""
+
+from database.tables.artifact_report import ComparisonOperator, ReportFilter, ReportFilterAnd, \
+    ReportFilterComparison, ReportFilterNot, ReportFilterOr
+import re
+from typing import Any, List, Optional, Tuple
+
+
+class ReportFilterError(ValueError):
+    """
+    Error in a report filter expression
+    """
+    pass
+
+
+class ReportFilterParser(object):
+    """
+    Parser for report filter expressions
+
+    Grammar of a filter expression:
+
+        expression := and_expression ("OR" and_expression)*
+        and_expression := not_expression ("AND" not_expression)*
+        not_expression := "NOT" not_expression | "(" expression ")" | comparison
+        comparison := field_name operator value
+        operator := "=" | "!=" | "<>" | "<" | "<=" | ">" | ">="
+        value := number | string | "TRUE" | "FALSE"
+
+    Keywords are case insensitive, strings are enclosed in single or double quotes (the quote
+    character is escaped by doubling it) and field names are names of the tracker fields.
+
+    Example:
+
+        priority >= 2 AND NOT (status = "closed" OR title = 'Won''t fix')
+    """
+
+    __token_pattern = re.compile(
+        r"\s*(?:"
+        r"(?P<number>-?\d+(?:\.\d+)?(?:[eE][+-]?\d+)?)|"
+        r"(?P<string>\"(?:[^\"]|\"\")*\"|'(?:[^']|'')*')|"
+        r"(?P<name>[A-Za-z_]\w*)|"
+        r"(?P<operator><=|>=|!=|<>|=|<|>)|"
+        r"(?P<parenthesis>[()])"
+        r")")
+
+    __operators = {"=": ComparisonOperator.Equal,
+                   "!=": ComparisonOperator.NotEqual,
+                   "<>": ComparisonOperator.NotEqual,
+                   "<": ComparisonOperator.Less,
+                   "<=": ComparisonOperator.LessOrEqual,
+                   ">": ComparisonOperator.Greater,
+                   ">=": ComparisonOperator.GreaterOrEqual}
+
+    def __init__(self, text: str, tracker_field_ids: dict):
+        """
+        Constructor
+
+        :param text:                Filter expression
+        :param tracker_field_ids:   Tracker field IDs (key is the tracker field name)
+        """
+        self.__tokens = ReportFilterParser.__tokenize(text)
+        self.__position = 0
+        self.__tracker_field_ids = tracker_field_ids
+
+    @staticmethod
+    def parse(text: str, tracker_field_ids: dict) -> Optional[ReportFilter]:
+        """
+        Parses the filter expression
+
+        :param text:                Filter expression
+        :param tracker_field_ids:   Tracker field IDs (key is the tracker field name)
+
+        :return:    Report filter ("None" if the expression is empty and all artifacts match)
+
+        :raises ReportFilterError:  If the expression is not valid
+        """
+        parser = ReportFilterParser(text, tracker_field_ids)
+
+        if len(parser.__tokens) == 0:
+            return None
+
+        report_filter = parser.__parse_expression()
+
+        if parser.__position < len(parser.__tokens):
+            raise ReportFilterError("Unexpected token: {0}".format(
+                parser.__tokens[parser.__position][1]))
+
+        return report_filter
+
+    @staticmethod
+    def __tokenize(text: str) -> List[Tuple[str, str]]:
+        """
+        Splits the filter expression to tokens
+
+        :param text:    Filter expression
+
+        :return:    List of tokens (token type and token text)
+        """
+        tokens = list()
+        position = 0
+        text = text.rstrip()
+
+        while position < len(text):
+            match = ReportFilterParser.__token_pattern.match(text, position)
+
+            if (match is None) or (match.lastgroup is None):
+                raise ReportFilterError("Invalid character at position {0}".format(position))
+
+            token_type = match.lastgroup
+            token_text = match.group(token_type)
+
+            if (token_type == "name") and (token_text.upper() in ["AND", "OR", "NOT"]):
+                token_type = "keyword"
+                token_text = token_text.upper()
+
+            tokens.append((token_type, token_text))
+            position = match.end()
+
+        return tokens
+
+    def __peek(self) -> Optional[Tuple[str, str]]:
+        """
+        Reads the current token without consuming it
+
+        :return:    Current token ("None" at the end of the expression)
+        """
+        if self.__position < len(self.__tokens):
+            return self.__tokens[self.__position]
+
+        return None
+
+    def __next(self) -> Tuple[str, str]:
+        """
+        Consumes the current token
+
+        :return:    Current token
+
+        :raises ReportFilterError:  At the end of the expression
+        """
+        token = self.__peek()
+
+        if token is None:
+            raise ReportFilterError("Unexpected end of the expression")
+
+        self.__position += 1
+        return token
+
+    def __accept(self, token_type: str, token_text: str) -> bool:
+        """
+        Consumes the current token if it matches the specified token
+
+        :param token_type:  Token type
+        :param token_text:  Token text
+
+        :return:    True if the token was consumed
+        """
+        if self.__peek() == (token_type, token_text):
+            self.__position += 1
+            return True
+
+        return False
+
+    def __parse_expression(self) -> ReportFilter:
+        """
+        Parses a disjunction of "AND" expressions
+
+        :return:    Report filter
+        """
+        operands = [self.__parse_and_expression()]
+
+        while self.__accept("keyword", "OR"):
+            operands.append(self.__parse_and_expression())
+
+        if len(operands) == 1:
+            return operands[0]
+
+        return ReportFilterOr(operands)
+
+    def __parse_and_expression(self) -> ReportFilter:
+        """
+        Parses a conjunction of "NOT" expressions
+
+        :return:    Report filter
+        """
+        operands = [self.__parse_not_expression()]
+
+        while self.__accept("keyword", "AND"):
+            operands.append(self.__parse_not_expression())
+
+        if len(operands) == 1:
+            return operands[0]
+
+        return ReportFilterAnd(operands)
+
+    def __parse_not_expression(self) -> ReportFilter:
+        """
+        Parses a negation, an expression in parentheses or a comparison
+
+        :return:    Report filter
+        """
+        if self.__accept("keyword", "NOT"):
+            operand = self.__parse_not_expression()
+
+            # Double negation is removed
+            if isinstance(operand, ReportFilterNot):
+                return operand.operand
+
+            return ReportFilterNot(operand)
+
+        if self.__accept("parenthesis", "("):
+            report_filter = self.__parse_expression()
+
+            if not self.__accept("parenthesis", ")"):
+                raise ReportFilterError("Missing closing parenthesis")
+
+            return report_filter
+
+        return self.__parse_comparison()
+
+    def __parse_comparison(self) -> ReportFilter:
+        """
+        Parses a comparison of a tracker field with a value
+
+        :return:    Report filter
+        """
+        token_type, token_text = self.__next()
+
+        if token_type != "name":
+            raise ReportFilterError("Expected a field name: {0}".format(token_text))
+
+        tracker_field_id = self.__tracker_field_ids.get(token_text)
+
+        if tracker_field_id is None:
+            raise ReportFilterError("Unknown field: {0}".format(token_text))
+
+        token_type, token_text = self.__next()
+
+        if token_type != "operator":
+            raise ReportFilterError("Expected a comparison operator: {0}".format(token_text))
+
+        operator = ReportFilterParser.__operators[token_text]
+        value = self.__parse_value()
+
+        return ReportFilterComparison(tracker_field_id, operator, value)
+
+    def __parse_value(self) -> Any:
+        """
+        Parses a value
+
+        :return:    Value (int, float, bool or str)
+        """
+        token_type, token_text = self.__next()
+
+        if token_type == "number":
+            if re.fullmatch(r"-?\d+", token_text) is not None:
+                return int(token_text)
+
+            return float(token_text)
+
+        if token_type == "string":
+            quote = token_text[0]
+            return token_text[1:-1].replace(quote * 2, quote)
+
+        if (token_type == "name") and (token_text.upper() in ["TRUE", "FALSE"]):
+            return token_text.upper() == "TRUE"
+
+        raise ReportFilterError("Expected a value: {0}".format(token_text))
@@ -0,0 +1,254 @@
+"""
+Salamander ALM
+Copyright (c) 2016  Djuro Drljaca
+
+This Python module is free software; you can redistribute it and/or modify it under the terms of the
+GNU General Public License as published by the Free Software Foundation; either version 2 of the
+License, or (at your option) any later version.
+
+This Python module is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License along with this library. If
+not, see <http://www.gnu.org/licenses/>.
+"""
+
+from database.connection import Connection
+from database.database import DatabaseInterface
+from database.tables.artifact_report import ReportFilter
+from database.tables.tracker_field_information import TrackerFieldSelection
+from reportmanagement.report_filter import ReportFilterError, ReportFilterParser
+from typing import Iterator, List, Optional
+
+
+class ReportManagementInterface(object):
+    """
+    Report management
+
+    Dependencies:
+
+    - DatabaseInterface
+    """
+
+    max_limit = 1000  # Max number of artifacts that can be returned with a single page
+    id_chunk_size = 100000  # Number of artifact IDs that are read at once when iterating a report
+
+    def __init__(self):
+        """
+        Constructor is disabled!
+        """
+        raise RuntimeError()
+
+    @staticmethod
+    def read_report(tracker_id: int,
+                    filter_expression: str,
+                    after_artifact_id=0,
+                    limit=100) -> Optional[List[dict]]:
+        """
+        Reads a page of the current revision of active artifacts of the tracker that match the
+        filter expression
+
+        :param tracker_id:          ID of the tracker
+        :param filter_expression:   Filter expression (see "ReportFilterParser" for its syntax, an
+                                    empty expression matches all artifacts)
+        :param after_artifact_id:   Only artifacts with a greater ID are returned (ID of the last
+                                    artifact from the previous page)
+        :param limit:               Max number of returned artifacts (1 to "max_limit")
+
+        :return:    Artifacts ordered by their ID ("None" if the filter expression is not valid)
+
+        Each dictionary in the returned list contains items:
+
+        - id
+        - tracker_id
+        - locked
+        - active
+        - revision_id
+        - fields
+
+        Item "fields" contains a dictionary with field values of the artifact (key is the tracker
+        field ID).
+        """
+        # Check parameters
+        if (limit < 1) or (limit > ReportManagementInterface.max_limit):
+            return None
+
+        connection = DatabaseInterface.create_connection()
+        report_filter = ReportManagementInterface.__parse_filter(connection,
+                                                                 tracker_id,
+                                                                 filter_expression)
+
+        if report_filter is False:
+            return None
+
+        return ReportManagementInterface.__read_page(connection,
+                                                     tracker_id,
+                                                     report_filter,
+                                                     after_artifact_id,
+                                                     limit)
+
+    @staticmethod
+    def iterate_report(tracker_id: int,
+                       filter_expression: str,
+                       page_size=100) -> Optional[Iterator[dict]]:
+        """
+        Iterates over all of the current revision of active artifacts of the tracker that match the
+        filter expression, one page of artifacts is read from the database at a time
+
+        :param tracker_id:          ID of the tracker
+        :param filter_expression:   Filter expression (see "ReportFilterParser" for its syntax, an
+                                    empty expression matches all artifacts)
+        :param page_size:           Number of artifacts that are read at once (1 to "max_limit")
+
+        :return:    Iterator over artifacts ordered by their ID ("None" if the filter expression is
+                    not valid)
+
+        See "read_report" for the items of the returned artifacts.
+        """
+        # Check parameters
+        if (page_size < 1) or (page_size > ReportManagementInterface.max_limit):
+            return None
+
+        connection = DatabaseInterface.create_connection()
+        report_filter = ReportManagementInterface.__parse_filter(connection,
+                                                                 tracker_id,
+                                                                 filter_expression)
+
+        if report_filter is False:
+            return None
+
+        return ReportManagementInterface.__iterate_pages(connection,
+                                                         tracker_id,
+                                                         report_filter,
+                                                         page_size)
+
+    @staticmethod
+    def __parse_filter(connection: Connection, tracker_id: int, filter_expression: str):
+        """
+        Parses the filter expression with the names of the active fields of the tracker
+
+        :param connection:          Database connection
+        :param tracker_id:          ID of the tracker
+        :param filter_expression:   Filter expression
+
+        :return:    Report filter, "None" if all artifacts match or "False" if the expression is not
+                    valid
+        """
+        max_revision_id = DatabaseInterface.tables().revision.read_current_revision_id(connection)
+
+        if max_revision_id is None:
+            return False
+
+        tracker_field_information = DatabaseInterface.tables().tracker_field_information
+        tracker_field_ids = dict()
+
+        for tracker_field_id in tracker_field_information.read_all_tracker_field_ids(
+                connection,
+                tracker_id,
+                TrackerFieldSelection.Active,
+                max_revision_id):
+            tracker_fields = tracker_field_information.read_information(
+                connection,
+                "tracker_field_id",
+                tracker_field_id,
+                TrackerFieldSelection.Active,
+                max_revision_id)
+
+            for tracker_field in tracker_fields:
+                tracker_field_ids[tracker_field["name"]] = tracker_field["tracker_field_id"]
+
+        try:
+            return ReportFilterParser.parse(filter_expression, tracker_field_ids)
+        except ReportFilterError:
+            return False
+
+    @staticmethod
+    def __iterate_pages(connection: Connection,
+                        tracker_id: int,
+                        report_filter: Optional[ReportFilter],
+                        page_size: int) -> Iterator[dict]:
+        """
+        Reads the report page by page
+
+        :param connection:      Database connection
+        :param tracker_id:      ID of the tracker
+        :param report_filter:   Report filter ("None" to match all artifacts)
+        :param page_size:       Number of artifacts that are read at once
+
+        :return:    Iterator over artifacts
+
+        IDs of the matching artifacts are read in chunks that are much larger than a page because
+        the cost of evaluating a compound filter barely depends on the number of returned IDs.
+        """
+        artifact_report = DatabaseInterface.tables().artifact_report
+        chunk_size = ReportManagementInterface.id_chunk_size
+        after_artifact_id = 0
+
+        while True:
+            artifact_ids = artifact_report.read_artifact_ids(connection,
+                                                             tracker_id,
+                                                             report_filter,
+                                                             after_artifact_id,
+                                                             chunk_size)
+
+            for page_start in range(0, len(artifact_ids), page_size):
+                page = artifact_ids[page_start:(page_start + page_size)]
+
+                for artifact in ReportManagementInterface.__read_artifacts(connection, page):
+                    yield artifact
+
+            if len(artifact_ids) < chunk_size:
+                break
+
+            after_artifact_id = artifact_ids[-1]
+
+    @staticmethod
+    def __read_page(connection: Connection,
+                    tracker_id: int,
+                    report_filter: Optional[ReportFilter],
+                    after_artifact_id: int,
+                    limit: int) -> List[dict]:
+        """
+        Reads a page of the report
+
+        :param connection:          Database connection
+        :param tracker_id:          ID of the tracker
+        :param report_filter:       Report filter ("None" to match all artifacts)
+        :param after_artifact_id:   Only artifacts with a greater ID are returned
+        :param limit:               Max number of returned artifacts
+
+        :return:    Artifacts ordered by their ID
+        """
+        artifact_ids = DatabaseInterface.tables().artifact_report.read_artifact_ids(
+            connection,
+            tracker_id,
+            report_filter,
+            after_artifact_id,
+            limit)
+
+        return ReportManagementInterface.__read_artifacts(connection, artifact_ids)
+
+    @staticmethod
+    def __read_artifacts(connection: Connection, artifact_ids: List[int]) -> List[dict]:
+        """
+        Reads the current state of the specified artifacts
+
+        :param connection:      Database connection
+        :param artifact_ids:    List of artifact IDs
+
+        :return:    Artifacts (in the same order as in the list of artifact IDs)
+        """
+        artifacts = list()
+
+        for raw_artifact in DatabaseInterface.tables().artifact_report.read_artifacts(
+                connection,
+                artifact_ids):
+            artifacts.append({"id": raw_artifact["artifact_id"],
+                              "tracker_id": raw_artifact["tracker_id"],
+                              "locked": raw_artifact["locked"],
+                              "active": raw_artifact["active"],
+                              "revision_id": raw_artifact["revision_id"],
+                              "fields": raw_artifact["fields"]})
+
+        return artifacts
@@ -15,10 +15,26 @@ not, see <http://www.gnu.org/licenses/>.
 """
 
 import rest_api.application
+from rest_api.conditional_response import ConditionalResponse
+from rest_api.profiling import ProfilingMiddleware
+from rest_api.response_encoding import ResponseEncoding
 
 # Make a (global) reference to the Flask application instance
 app = rest_api.application.app
 
+# Collect performance metrics of all requests
+profiling = None
+
 # Load individual parts of the REST API
 if app is not None:
+    profiling = ProfilingMiddleware(app)
+
+    # Note: "after request" handlers are called in the reverse order so the ETag is created from the
+    # uncompressed response
+    ResponseEncoding.install(app)
+    ConditionalResponse.install(app)
+
     import rest_api.usermanagement
+    import rest_api.searchmanagement
+    import rest_api.artifactmanagement
+    import rest_api.attachmentmanagement
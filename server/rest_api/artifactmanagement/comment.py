@@ -0,0 +1,284 @@
+"""
+Salamander ALM
+Copyright (c) 2016  Djuro Drljaca
+
+This Python module is free software; you can redistribute it and/or modify it under the terms of the
+GNU General Public License as published by the Free Software Foundation; either version 2 of the
+License, or (at your option) any later version.
+
+This Python module is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License along with this library. If
+not, see <http://www.gnu.org/licenses/>.
+"""
+
+from artifactmanagement.artifact_comment_management import ArtifactCommentManagementInterface
+from flask import jsonify
+from flask_restful import request, abort
+from rest_api.conditional_response import ConditionalResponse
+from rest_api.restricted_resource import RestrictedResource
+from typing import Optional
+
+
+class Comment(RestrictedResource):
+    """
+    REST API for the comments of artifacts
+    """
+
+    def __init__(self):
+        """
+        Constructor
+        """
+        RestrictedResource.__init__(self)
+
+    def get(self):
+        """
+        Reads the comment or a page of the comment thread of an artifact
+
+        :return:    Comment information object or a page of comments
+
+        Allowed parameters (either "comment_id" or "artifact_id" must be specified):
+
+        - comment_id:           int, optional
+        - revision_id:          int, optional (only with "comment_id", default: current revision)
+        - artifact_id:          int, optional
+        - before_comment_id:    int, optional (only with "artifact_id", default: first page)
+        - page_size:            int, optional (only with "artifact_id", default: default page size)
+
+        Returned dictionary contains items:
+
+        - id
+        - artifact_id
+        - created_on
+        - created_by
+        - text
+        - active
+        - revision_id
+        - modified_on
+        - modified_by
+
+        For "artifact_id" a dictionary with items "comments" (list of active comments ordered from
+        the newest to the oldest one, without the "active" item) and "next_before_comment_id"
+        (value of "before_comment_id" for the next page, "None" if this is the last page) is
+        returned.
+
+        Response for "comment_id" has an ETag that can be used in the If-Match header of requests
+        that modify or delete the comment.
+        """
+        RestrictedResource._read_session_user_id()
+
+        comment_id = RestrictedResource._read_integer_argument("comment_id")
+        artifact_id = RestrictedResource._read_integer_argument("artifact_id")
+
+        if comment_id is not None:
+            revision_id = RestrictedResource._read_integer_argument("revision_id")
+
+            comment = ArtifactCommentManagementInterface.read_comment_by_id(comment_id,
+                                                                            revision_id)
+
+            if comment is None:
+                abort(404, message="Comment was not found")
+
+            etag = ConditionalResponse.create_revision_etag(comment["revision_id"],
+                                                            "comment",
+                                                            comment_id)
+
+            if ConditionalResponse.is_not_modified(etag):
+                return ConditionalResponse.not_modified(etag)
+
+            return ConditionalResponse.with_etag(jsonify(Comment.__format_comment(comment)), etag)
+        elif artifact_id is not None:
+            before_comment_id = RestrictedResource._read_integer_argument("before_comment_id")
+            page_size = RestrictedResource._read_integer_argument("page_size")
+
+            if page_size is None:
+                page_size = ArtifactCommentManagementInterface.default_page_size
+
+            if ((page_size < 1) or
+                    (page_size > ArtifactCommentManagementInterface.max_page_size)):
+                abort(400, message="Invalid parameters")
+
+            comments = ArtifactCommentManagementInterface.read_comments(artifact_id,
+                                                                        before_comment_id,
+                                                                        page_size)
+
+            next_before_comment_id = None
+
+            if len(comments) == page_size:
+                next_before_comment_id = comments[-1]["id"]
+
+            return jsonify({"comments": [Comment.__format_comment(x) for x in comments],
+                            "next_before_comment_id": next_before_comment_id})
+        else:
+            abort(400, message="Parameter is missing")
+
+    def post(self):
+        """
+        Creates a new comment of an artifact
+
+        :return:    ID of the new comment
+
+        Request body must contain a JSON object with items:
+
+        - artifact_id:  int
+        - text:         str
+        """
+        user_id = RestrictedResource._read_session_user_id()
+
+        request_data = request.get_json(silent=True)
+
+        if ((not isinstance(request_data, dict)) or
+                ("artifact_id" not in request_data) or
+                ("text" not in request_data)):
+            abort(400, message="Missing parameters")
+
+        comment_id = ArtifactCommentManagementInterface.create_comment(
+            user_id,
+            request_data["artifact_id"],
+            request_data["text"])
+
+        if comment_id is None:
+            abort(400, message="Invalid parameters")
+
+        return jsonify({"comment_id": comment_id})
+
+    def put(self):
+        """
+        Updates the text of a comment
+
+        :return:    Nothing
+
+        Request body must contain a JSON object with items:
+
+        - comment_id:   int
+        - text:         str
+
+        Optional If-Match header with the ETag of the comment (see "get") makes the request fail
+        with "412 Precondition Failed" if the comment was modified in the meantime.
+        """
+        user_id = RestrictedResource._read_session_user_id()
+        expected_revision_id = ConditionalResponse.read_expected_revision_id()
+
+        request_data = request.get_json(silent=True)
+
+        if ((not isinstance(request_data, dict)) or
+                ("comment_id" not in request_data) or
+                ("text" not in request_data)):
+            abort(400, message="Missing parameters")
+
+        if not ArtifactCommentManagementInterface.update_comment(user_id,
+                                                                 request_data["comment_id"],
+                                                                 request_data["text"],
+                                                                 expected_revision_id):
+            Comment.__check_precondition(request_data["comment_id"], expected_revision_id)
+            abort(400, message="Invalid parameters")
+
+        return None
+
+    def delete(self):
+        """
+        Deletes a comment
+
+        :return:    Nothing
+
+        Allowed parameters:
+
+        - comment_id:   int
+
+        Optional If-Match header with the ETag of the comment (see "get") makes the request fail
+        with "412 Precondition Failed" if the comment was modified in the meantime.
+        """
+        user_id = RestrictedResource._read_session_user_id()
+        expected_revision_id = ConditionalResponse.read_expected_revision_id()
+
+        comment_id = RestrictedResource._read_integer_argument("comment_id")
+
+        if comment_id is None:
+            abort(400, message="Parameter is missing")
+
+        if not ArtifactCommentManagementInterface.delete_comment(user_id,
+                                                                 comment_id,
+                                                                 expected_revision_id):
+            Comment.__check_precondition(comment_id, expected_revision_id)
+            abort(400, message="Invalid parameters")
+
+        return None
+
+    @staticmethod
+    def __check_precondition(comment_id: int, expected_revision_id: Optional[int]) -> None:
+        """
+        Checks if a failed modification of the comment was caused by its precondition and in that
+        case answers the request with "412 Precondition Failed"
+
+        :param comment_id:              ID of the comment
+        :param expected_revision_id:    Expected revision ID of the comment from the If-Match header
+        """
+        if expected_revision_id is None:
+            return
+
+        comment = ArtifactCommentManagementInterface.read_comment_by_id(comment_id)
+
+        if (comment is not None) and (comment["revision_id"] != expected_revision_id):
+            abort(412, message="Comment was modified")
+
+    @staticmethod
+    def __format_comment(comment: dict) -> dict:
+        """
+        Converts the timestamps of the comment to strings
+
+        :param comment: Comment information object
+
+        :return:    Comment information object
+        """
+        comment["created_on"] = comment["created_on"].isoformat()
+        comment["modified_on"] = comment["modified_on"].isoformat()
+        return comment
+
+
+class CommentHistory(RestrictedResource):
+    """
+    REST API for the history of the comments of artifacts
+    """
+
+    def __init__(self):
+        """
+        Constructor
+        """
+        RestrictedResource.__init__(self)
+
+    def get(self):
+        """
+        Reads all versions of the comment
+
+        :return:    Versions of the comment ordered from the original to the latest version
+
+        Allowed parameters:
+
+        - comment_id:   int
+
+        Each dictionary in the returned list contains items:
+
+        - text
+        - active
+        - revision_id
+        - modified_on
+        - modified_by
+        """
+        RestrictedResource._read_session_user_id()
+
+        comment_id = RestrictedResource._read_integer_argument("comment_id")
+
+        if comment_id is None:
+            abort(400, message="Parameter is missing")
+
+        history = ArtifactCommentManagementInterface.read_comment_history(comment_id)
+
+        if len(history) == 0:
+            abort(404, message="Comment was not found")
+
+        for version in history:
+            version["modified_on"] = version["modified_on"].isoformat()
+
+        return jsonify(history)
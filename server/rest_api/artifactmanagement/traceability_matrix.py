@@ -0,0 +1,232 @@
+"""
+Salamander ALM
+Copyright (c) 2016  Djuro Drljaca
+
+This Python module is free software; you can redistribute it and/or modify it under the terms of the
+GNU General Public License as published by the Free Software Foundation; either version 2 of the
+License, or (at your option) any later version.
+
+This Python module is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License along with this library. If
+not, see <http://www.gnu.org/licenses/>.
+"""
+
+from artifactmanagement.artifact_link_management import ArtifactLinkManagementInterface
+from database.database import DatabaseInterface
+from database.tables.artifact_link import LinkDirection
+import csv
+import flask
+from flask_restful import request, abort
+import io
+import json
+from rest_api.restricted_resource import RestrictedResource
+from typing import Iterator
+
+
+class TraceabilityMatrix(RestrictedResource):
+    """
+    REST API for exporting the traceability matrix between two trackers
+    """
+
+    # Number of matrix cells that are encoded into a single chunk of the response
+    cells_per_chunk = 1000
+
+    # Supported export formats (key is the format name, value is the MIME type)
+    formats = {"csv": "text/csv",
+               "ndjson": "application/x-ndjson"}
+
+    def __init__(self):
+        """
+        Constructor
+        """
+        RestrictedResource.__init__(self)
+
+    def get(self):
+        """
+        Exports the traceability matrix (direct links) between the active artifacts of a tracker
+        and the active artifacts of the linked tracker
+
+        :return:    Streamed traceability matrix
+
+        Allowed parameters:
+
+        - tracker_id:           int
+        - linked_tracker_id:    int
+        - direction:            str, optional ("downstream" or "upstream", default: "downstream")
+        - revision_id:          int, optional (default: current revision)
+        - format:               str, optional ("csv" or "ndjson", default: from the Accept header)
+
+        Each row of the matrix contains items:
+
+        - artifact_id
+        - linked_artifact_id (empty if the artifact has no links)
+        - link_id (empty if the artifact has no links)
+
+        Response is streamed and its "SALM-Revision-Id" header contains the revision from which the
+        matrix was read (export can be repeated for the same revision).
+        """
+        # Extract session token from the request
+        token = RestrictedResource._read_session_token()
+
+        # Extract arguments
+        args = request.args
+
+        if ((args is None) or
+                ("tracker_id" not in args) or
+                ("linked_tracker_id" not in args)):
+            abort(400, message="Parameter is missing")
+
+        revision_id = None
+        directions = {"downstream": LinkDirection.Downstream,
+                      "upstream": LinkDirection.Upstream}
+
+        try:
+            tracker_id = int(args["tracker_id"])
+            linked_tracker_id = int(args["linked_tracker_id"])
+
+            if "revision_id" in args:
+                revision_id = int(args["revision_id"])
+        except ValueError:
+            abort(400, message="Invalid parameters")
+
+        direction = directions.get(args.get("direction", "downstream"))
+        export_format = TraceabilityMatrix.__select_format(args.get("format"))
+
+        if (direction is None) or (export_format is None):
+            abort(400, message="Invalid parameters")
+
+        # Check session
+        success = False
+        error_code = None
+        error_message = None
+
+        connection = DatabaseInterface.create_connection()
+
+        try:
+            success = connection.begin_transaction()
+
+            # Extract session user
+            if success:
+                session_user = RestrictedResource._read_session_user(connection, token)
+
+                if session_user is None:
+                    success = False
+                    error_code = 400
+                    error_message = "Invalid session token"
+
+            # All chunks of the matrix are read from the same revision
+            if success and (revision_id is None):
+                revision_id = DatabaseInterface.tables().revision.read_current_revision_id(
+                    connection)
+
+                if revision_id is None:
+                    success = False
+
+            # Commit the last use of the session token
+            connection.commit_transaction()
+        except:
+            connection.rollback_transaction()
+            abort(500, message="Internal error, please try again")
+
+        if not success:
+            if (error_code is not None) and (error_message is not None):
+                abort(error_code, message=error_message)
+            else:
+                abort(500, message="Internal error")
+
+        cells = ArtifactLinkManagementInterface.iterate_traceability_matrix(tracker_id,
+                                                                           linked_tracker_id,
+                                                                           direction,
+                                                                           revision_id)
+
+        if cells is None:
+            abort(404, message="Tracker or revision was not found")
+
+        if export_format == "csv":
+            chunks = TraceabilityMatrix.__encode_csv(cells)
+        else:
+            chunks = TraceabilityMatrix.__encode_ndjson(cells)
+
+        file_name = "traceability_matrix_{0}_{1}_r{2}.{3}".format(tracker_id,
+                                                                  linked_tracker_id,
+                                                                  revision_id,
+                                                                  export_format)
+
+        response = flask.Response(chunks, mimetype=TraceabilityMatrix.formats[export_format])
+        response.headers["SALM-Revision-Id"] = str(revision_id)
+        response.headers["Content-Disposition"] = "attachment; filename=" + file_name
+        return response
+
+    @staticmethod
+    def __select_format(requested_format):
+        """
+        Selects the export format from the "format" parameter or from the Accept header
+
+        :param requested_format:    Requested format ("None" if the parameter was not specified)
+
+        :return:    Format name or "None" if the requested format is not supported
+        """
+        if requested_format is not None:
+            if requested_format in TraceabilityMatrix.formats:
+                return requested_format
+
+            return None
+
+        mime_type = request.accept_mimetypes.best_match(
+            [TraceabilityMatrix.formats["csv"], TraceabilityMatrix.formats["ndjson"]])
+
+        if mime_type == TraceabilityMatrix.formats["ndjson"]:
+            return "ndjson"
+
+        return "csv"
+
+    @staticmethod
+    def __encode_csv(cells: Iterator[dict]) -> Iterator[str]:
+        """
+        Encodes the matrix cells as CSV (with a header row)
+
+        :param cells:   Iterator over the matrix cells
+
+        :return:    Iterator over the chunks of the response
+        """
+        buffer = io.StringIO()
+        writer = csv.writer(buffer, lineterminator="\n")
+        writer.writerow(["artifact_id", "linked_artifact_id", "link_id"])
+        count = 0
+
+        for cell in cells:
+            writer.writerow([cell["artifact_id"], cell["linked_artifact_id"], cell["link_id"]])
+            count += 1
+
+            if count == TraceabilityMatrix.cells_per_chunk:
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+                count = 0
+
+        if buffer.tell() > 0:
+            yield buffer.getvalue()
+
+    @staticmethod
+    def __encode_ndjson(cells: Iterator[dict]) -> Iterator[str]:
+        """
+        Encodes the matrix cells as newline delimited JSON (one object per line)
+
+        :param cells:   Iterator over the matrix cells
+
+        :return:    Iterator over the chunks of the response
+        """
+        lines = list()
+
+        for cell in cells:
+            lines.append(json.dumps(cell, separators=(",", ":")))
+
+            if len(lines) == TraceabilityMatrix.cells_per_chunk:
+                yield "\n".join(lines) + "\n"
+                lines = list()
+
+        if len(lines) > 0:
+            yield "\n".join(lines) + "\n"
@@ -0,0 +1,245 @@
+"""
+Salamander ALM
+Copyright (c) 2016  Djuro Drljaca
+
+This Python module is free software; you can redistribute it and/or modify it under the terms of the
+GNU General Public License as published by the Free Software Foundation; either version 2 of the
+License, or (at your option) any later version.
+
+This Python module is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License along with this library. If
+not, see <http://www.gnu.org/licenses/>.
+"""
+
+from attachmentmanagement.attachment_management import AttachmentManagementInterface
+import flask
+from flask import jsonify
+from flask_restful import request, abort
+import mimetypes
+from rest_api.restricted_resource import RestrictedResource
+
+
+class Attachment(RestrictedResource):
+    """
+    REST API for the attachments of artifacts
+    """
+
+    def __init__(self):
+        """
+        Constructor
+        """
+        RestrictedResource.__init__(self)
+
+    def get(self):
+        """
+        Reads the attachment or all active attachments of an artifact
+
+        :return:    Attachment information object or a list of them
+
+        Allowed parameters (either "attachment_id" or "artifact_id" must be specified):
+
+        - attachment_id:    int, optional
+        - artifact_id:      int, optional
+        - revision_id:      int, optional (default: current revision)
+
+        Returned dictionary contains items:
+
+        - id
+        - artifact_id
+        - created_on
+        - created_by
+        - file_name
+        - content_hash
+        - size
+        - active
+        - revision_id
+
+        For "artifact_id" a list of dictionaries with items "id", "file_name", "content_hash",
+        "size" and "revision_id" is returned.
+        """
+        RestrictedResource._read_session_user_id()
+
+        attachment_id = RestrictedResource._read_integer_argument("attachment_id")
+        artifact_id = RestrictedResource._read_integer_argument("artifact_id")
+        revision_id = RestrictedResource._read_integer_argument("revision_id")
+
+        if attachment_id is not None:
+            attachment = AttachmentManagementInterface.read_attachment_by_id(attachment_id,
+                                                                             revision_id)
+
+            if attachment is None:
+                abort(404, message="Attachment was not found")
+
+            attachment["created_on"] = attachment["created_on"].isoformat()
+            return jsonify(attachment)
+        elif artifact_id is not None:
+            return jsonify(AttachmentManagementInterface.read_attachments(artifact_id,
+                                                                          revision_id))
+        else:
+            abort(400, message="Parameter is missing")
+
+    def post(self):
+        """
+        Creates a new attachment of an artifact, request body contains the content of the file
+
+        :return:    ID of the new attachment
+
+        Allowed parameters:
+
+        - artifact_id:  int
+        - file_name:    str
+
+        Content is streamed to the file store, so it is never held in memory as a whole.
+        """
+        user_id = RestrictedResource._read_session_user_id()
+
+        artifact_id = RestrictedResource._read_integer_argument("artifact_id")
+        file_name = request.args.get("file_name")
+
+        if (artifact_id is None) or (file_name is None):
+            abort(400, message="Parameter is missing")
+
+        Attachment.__check_content_length()
+
+        attachment_id = AttachmentManagementInterface.create_attachment(user_id,
+                                                                        artifact_id,
+                                                                        file_name,
+                                                                        request.stream)
+
+        if attachment_id is None:
+            abort(400, message="Invalid parameters")
+
+        return jsonify({"attachment_id": attachment_id})
+
+    def put(self):
+        """
+        Updates an attachment, request body contains the new content of the file (an empty body
+        keeps the current content)
+
+        :return:    Nothing
+
+        Allowed parameters:
+
+        - attachment_id:    int
+        - file_name:        str
+        """
+        user_id = RestrictedResource._read_session_user_id()
+
+        attachment_id = RestrictedResource._read_integer_argument("attachment_id")
+        file_name = request.args.get("file_name")
+
+        if (attachment_id is None) or (file_name is None):
+            abort(400, message="Parameter is missing")
+
+        Attachment.__check_content_length()
+
+        stream = None
+
+        if request.content_length:
+            stream = request.stream
+
+        if not AttachmentManagementInterface.update_attachment(user_id,
+                                                               attachment_id,
+                                                               file_name,
+                                                               stream):
+            abort(400, message="Invalid parameters")
+
+        return None
+
+    def delete(self):
+        """
+        Deletes an attachment
+
+        :return:    Nothing
+
+        Allowed parameters:
+
+        - attachment_id:    int
+        """
+        user_id = RestrictedResource._read_session_user_id()
+
+        attachment_id = RestrictedResource._read_integer_argument("attachment_id")
+
+        if attachment_id is None:
+            abort(400, message="Parameter is missing")
+
+        if not AttachmentManagementInterface.delete_attachment(user_id, attachment_id):
+            abort(400, message="Invalid parameters")
+
+        return None
+
+    @staticmethod
+    def __check_content_length() -> None:
+        """
+        Checks the size of the content in the request
+
+        NOTE:   Request is aborted if the content is too large!
+        """
+        content_length = request.content_length
+
+        if ((content_length is not None) and
+                (content_length > AttachmentManagementInterface.max_file_size)):
+            abort(413, message="Attachment is too large")
+
+
+class AttachmentContent(RestrictedResource):
+    """
+    REST API for downloading the content of attachments
+    """
+
+    def __init__(self):
+        """
+        Constructor
+        """
+        RestrictedResource.__init__(self)
+
+    def get(self):
+        """
+        Downloads the content of the attachment
+
+        :return:    Content of the attachment
+
+        Allowed parameters:
+
+        - attachment_id:    int
+        - revision_id:      int, optional (default: current revision)
+
+        File is sent by the WSGI server directly from the file store (with "sendfile" if the server
+        supports it). Range requests are supported and the ETag is the content hash, so a request
+        with a matching If-None-Match header is answered with "304 Not Modified".
+        """
+        RestrictedResource._read_session_user_id()
+
+        attachment_id = RestrictedResource._read_integer_argument("attachment_id")
+        revision_id = RestrictedResource._read_integer_argument("revision_id")
+
+        if attachment_id is None:
+            abort(400, message="Parameter is missing")
+
+        attachment = AttachmentManagementInterface.read_attachment_by_id(attachment_id,
+                                                                         revision_id)
+
+        if (attachment is None) or (not attachment["active"]):
+            abort(404, message="Attachment was not found")
+
+        file_path = AttachmentManagementInterface.read_content_file_path(
+            attachment["content_hash"])
+
+        if file_path is None:
+            abort(500, message="Internal error")
+
+        mime_type = mimetypes.guess_type(attachment["file_name"])[0]
+
+        if mime_type is None:
+            mime_type = "application/octet-stream"
+
+        return flask.send_file(file_path,
+                               mimetype=mime_type,
+                               as_attachment=True,
+                               download_name=attachment["file_name"],
+                               conditional=True,
+                               etag=attachment["content_hash"],
+                               max_age=None)
@@ -0,0 +1,157 @@
+"""
+Salamander ALM
+Copyright (c) 2016  Djuro Drljaca
+
+This Python module is free software; you can redistribute it and/or modify it under the terms of the
+GNU General Public License as published by the Free Software Foundation; either version 2 of the
+License, or (at your option) any later version.
+
+This Python module is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License along with this library. If
+not, see <http://www.gnu.org/licenses/>.
+"""
+
+import flask
+from flask_restful import abort
+import hashlib
+import re
+from typing import Optional
+
+
+class ConditionalResponse(object):
+    """
+    Support for conditional GET requests (ETag and If-None-Match headers)
+
+    All successful GET responses get an ETag that is derived from their content. If the client sends
+    the same ETag in the If-None-Match header the response is replaced with a "304 Not Modified"
+    response without content.
+
+    Resources which return data of a specific revision can derive the ETag from the revision ID
+    instead and check it before the data is read. As the data of a revision never changes the whole
+    request can then be answered with "304 Not Modified" without reading the data.
+
+    Requests that modify a resource can send such an ETag in the If-Match header. The revision ID
+    from the ETag is then used as the expected revision of the resource and the modification fails
+    if the resource was modified after that revision.
+    """
+
+    def __init__(self):
+        """
+        Constructor is disabled!
+        """
+        raise RuntimeError()
+
+    @staticmethod
+    def install(app: flask.Flask) -> None:
+        """
+        Installs handling of conditional requests for all responses of the application
+
+        :param app: Flask application
+        """
+        app.after_request(ConditionalResponse.__after_request)
+
+    @staticmethod
+    def create_revision_etag(revision_id: int, *keys) -> str:
+        """
+        Creates an ETag for a response that depends only on the revision and request parameters
+
+        :param revision_id: Revision ID
+        :param keys:        Request parameters that affect the content of the response
+
+        :return:    ETag (without quotes)
+
+        Note: The ETag also depends on the requested response format (Accept header).
+        """
+        keys += (flask.request.headers.get("Accept"),)
+        digest = hashlib.sha1(repr(keys).encode("utf-8")).hexdigest()[:16]
+        return "r{0}-{1}".format(revision_id, digest)
+
+    @staticmethod
+    def is_not_modified(etag: str) -> bool:
+        """
+        Checks if the client already has the response with the specified ETag (weak comparison, so
+        it also matches ETag of a compressed response)
+
+        :param etag:    ETag (without quotes)
+
+        :return:    True if the client's copy is still valid
+        """
+        return flask.request.if_none_match.contains_weak(etag)
+
+    @staticmethod
+    def not_modified(etag: str) -> flask.Response:
+        """
+        Creates a "304 Not Modified" response
+
+        :param etag:    ETag (without quotes)
+
+        :return:    Response
+        """
+        response = flask.Response(status=304)
+        response.set_etag(etag)
+
+        return response
+
+    @staticmethod
+    def with_etag(response: flask.Response, etag: str) -> flask.Response:
+        """
+        Sets the ETag of a response
+
+        :param response:    Response
+        :param etag:        ETag (without quotes)
+
+        :return:    Response
+        """
+        response.set_etag(etag)
+        return response
+
+    @staticmethod
+    def read_expected_revision_id() -> Optional[int]:
+        """
+        Reads the expected revision ID from the If-Match header of the request
+
+        :return:    Revision ID from the ETag or "None" if the request does not have a precondition
+
+        NOTE:   Only the revision ID part of the ETag (see "create_revision_etag") is used so the
+                precondition does not depend on the response format of the request that returned
+                the ETag. A request without a valid ETag is answered with "412 Precondition Failed".
+        """
+        if_match = flask.request.if_match
+
+        if (not if_match) or if_match.star_tag:
+            return None
+
+        for etag in if_match:
+            match = re.fullmatch(r"r(\d+)-[0-9a-f]+", etag)
+
+            if match is not None:
+                return int(match.group(1))
+
+        abort(412, message="Precondition failed")
+
+    @staticmethod
+    def __after_request(response: flask.Response) -> flask.Response:
+        """
+        Adds an ETag to successful GET responses and answers conditional requests
+
+        :param response:    Response
+
+        :return:    Response (or "304 Not Modified" response)
+        """
+        if (flask.request.method != "GET") or (response.status_code not in [200, 304]):
+            return response
+
+        # Clients must always revalidate their copy of the response
+        response.headers["Cache-Control"] = "private, no-cache"
+
+        # Content of a streamed response is not known in advance
+        if (response.status_code == 304) or response.is_streamed:
+            return response
+
+        if response.get_etag()[0] is None:
+            response.add_etag()
+
+        return response.make_conditional(flask.request)
@@ -0,0 +1,372 @@
+"""
+Salamander ALM
+Copyright (c) 2016  Djuro Drljaca
+
+This Python module is free software; you can redistribute it and/or modify it under the terms of the
+GNU General Public License as published by the Free Software Foundation; either version 2 of the
+License, or (at your option) any later version.
+
+This Python module is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License along with this library. If
+not, see <http://www.gnu.org/licenses/>.
+"""
+
+import cProfile
+import collections
+import datetime
+from database.database import DatabaseInterface
+import flask
+import hmac
+from metrics.metrics_registry import MetricsInterface
+from metrics.request_statistics import RequestStatistics
+import os
+from rest_api.restricted_resource import RestrictedResource
+import sys
+import threading
+import time
+from typing import Optional
+
+
+class SamplingProfiler(object):
+    """
+    Statistical profiler that periodically samples the call stack of a single thread
+
+    Samples are aggregated in the "folded stacks" format (one line per unique stack with the number
+    of samples) which can be directly used to generate a flame graph.
+    """
+
+    def __init__(self, thread_id: int, interval=0.001):
+        """
+        Constructor
+
+        :param thread_id:   ID of the thread that shall be profiled
+        :param interval:    Sampling interval (in seconds)
+        """
+        self.__thread_id = thread_id
+        self.__interval = interval
+        self.__stacks = collections.Counter()
+        self.__stop_event = threading.Event()
+        self.__thread = None
+
+    def start(self) -> None:
+        """
+        Starts sampling
+        """
+        self.__stop_event.clear()
+        self.__thread = threading.Thread(target=self.__run,
+                                         name="SamplingProfiler",
+                                         daemon=True)
+        self.__thread.start()
+
+    def stop(self) -> None:
+        """
+        Stops sampling
+        """
+        self.__stop_event.set()
+
+        if self.__thread is not None:
+            self.__thread.join()
+            self.__thread = None
+
+    def sample_count(self) -> int:
+        """
+        Reads the number of collected samples
+
+        :return:    Number of samples
+        """
+        return sum(self.__stacks.values())
+
+    def write_folded_stacks(self, file_path: str) -> None:
+        """
+        Writes the collected samples to a file in the "folded stacks" format
+
+        :param file_path:   Path to the output file
+        """
+        with open(file_path, "w") as output_file:
+            for stack, count in sorted(self.__stacks.items()):
+                output_file.write("{0} {1}\n".format(stack, count))
+
+    def __run(self) -> None:
+        """
+        Sampling loop
+        """
+        while not self.__stop_event.wait(self.__interval):
+            frame = sys._current_frames().get(self.__thread_id)
+
+            if frame is not None:
+                self.__stacks[SamplingProfiler.__fold_stack(frame)] += 1
+
+    @staticmethod
+    def __fold_stack(frame) -> str:
+        """
+        Converts a call stack to a single line (from the outermost to the innermost frame)
+
+        :param frame:   Innermost frame of the call stack
+
+        :return:    Call stack with function names separated with semicolons
+        """
+        names = list()
+
+        while frame is not None:
+            code = frame.f_code
+            names.append("{0} ({1}:{2})".format(code.co_qualname,
+                                                os.path.basename(code.co_filename),
+                                                code.co_firstlineno))
+            frame = frame.f_back
+
+        names.reverse()
+        return ";".join(names)
+
+
+class ProfilingMiddleware(object):
+    """
+    Collects performance metrics of the requests handled by a Flask application
+
+    For each request the following is recorded:
+
+    - total duration per endpoint, HTTP method and status code
+    - time spent in the database and the number of executed database queries
+    - time spent for authentication
+
+    The timings are also returned to the client in the "Server-Timing" header.
+
+    When a profiling key is set a single request can also be profiled by setting the
+    "SALM-Profile" header ("cprofile" or "sample") together with the "SALM-Profile-Key" header
+    (must match the profiling key) and the "SALM-Session-Token" header (must be a valid session of
+    the administrator). The results are written to the profile directory as a "pstats"
+    file (cProfile) or as a "folded stacks" file (statistical profiler) for flame graphs.
+    """
+
+    # Histogram buckets for the number of database queries per request
+    query_count_buckets = [0, 1, 2, 5, 10, 20, 50, 100, 200, 500]
+
+    def __init__(self,
+                 app: flask.Flask,
+                 profile_directory: Optional[str] = None,
+                 profiling_key: Optional[str] = None):
+        """
+        Constructor
+
+        :param app:                 Flask application
+        :param profile_directory:   Directory for the profiling results ("None" for the current
+                                    working directory)
+        :param profiling_key:       Key that allows profiling of a request ("None" to disable
+                                    profiling)
+        """
+        self.__profile_directory = profile_directory
+        self.__profiling_key = profiling_key
+
+        # cProfile supports only one active profiler at a time
+        self.__profiler_lock = threading.Lock()
+
+        app.before_request(self.__before_request)
+        app.after_request(self.__after_request)
+        app.teardown_request(self.__teardown_request)
+
+    def set_profiling_key(self, profiling_key: Optional[str]) -> None:
+        """
+        Sets the key that allows profiling of a request
+
+        :param profiling_key:   Profiling key ("None" to disable profiling)
+        """
+        self.__profiling_key = profiling_key
+
+    def set_profile_directory(self, profile_directory: Optional[str]) -> None:
+        """
+        Sets the directory for the profiling results
+
+        :param profile_directory:   Directory ("None" for the current working directory)
+        """
+        self.__profile_directory = profile_directory
+
+    def __before_request(self) -> None:
+        """
+        Starts collecting statistics (and profiling) of the request
+        """
+        flask.g.profiling_start = time.perf_counter()
+        flask.g.profiling_profiler = None
+
+        # NOTE: profiling access is checked before the statistics are started so that the queries
+        # needed for the session check are not counted as queries of the request
+        profiler_type = flask.request.headers.get("SALM-Profile")
+        profiling_allowed = (profiler_type is not None) and self.__is_profiling_allowed()
+
+        RequestStatistics.begin()
+
+        if profiling_allowed:
+            if profiler_type == "cprofile":
+                if self.__profiler_lock.acquire(blocking=False):
+                    profiler = cProfile.Profile()
+
+                    try:
+                        profiler.enable()
+                        flask.g.profiling_profiler = profiler
+                    except ValueError:
+                        # Another profiler is already active
+                        self.__profiler_lock.release()
+            elif profiler_type == "sample":
+                profiler = SamplingProfiler(threading.get_ident())
+                profiler.start()
+                flask.g.profiling_profiler = profiler
+
+    def __after_request(self, response: flask.Response) -> flask.Response:
+        """
+        Records metrics of the request and adds the "Server-Timing" header to the response
+
+        :param response:    Response
+
+        :return:    Response
+        """
+        profiler = flask.g.get("profiling_profiler")
+
+        if profiler is not None:
+            flask.g.profiling_profiler = None
+            file_path = self.__stop_profiler(profiler)
+            response.headers["SALM-Profile-File"] = os.path.basename(file_path)
+
+        statistics = RequestStatistics.end()
+        start = flask.g.get("profiling_start")
+
+        if (statistics is None) or (start is None):
+            return response
+
+        duration = time.perf_counter() - start
+        authentication_duration = statistics["timings"].get("authentication", 0.0)
+
+        # Record metrics
+        if flask.request.url_rule is not None:
+            endpoint = flask.request.url_rule.rule
+        else:
+            endpoint = "unknown"
+
+        labels = {"endpoint": endpoint, "method": flask.request.method}
+        registry = MetricsInterface.registry()
+        registry.observe_histogram("salm_http_request_duration_seconds",
+                                   dict(labels, status=str(response.status_code)),
+                                   duration)
+        registry.observe_histogram("salm_http_request_db_duration_seconds",
+                                   labels,
+                                   statistics["database_duration"])
+        registry.observe_histogram("salm_http_request_db_queries",
+                                   labels,
+                                   statistics["database_query_count"],
+                                   ProfilingMiddleware.query_count_buckets)
+        registry.observe_histogram("salm_http_request_auth_duration_seconds",
+                                   labels,
+                                   authentication_duration)
+
+        # Add timings to the response (durations in milliseconds)
+        response.headers["Server-Timing"] = (
+            'total;dur={0:.3f}, '
+            'db;dur={1:.3f};desc="{2} queries", '
+            'auth;dur={3:.3f}').format(duration * 1000.0,
+                                       statistics["database_duration"] * 1000.0,
+                                       statistics["database_query_count"],
+                                       authentication_duration * 1000.0)
+
+        return response
+
+    def __teardown_request(self, exception) -> None:
+        """
+        Cleans up after the request (also in case of an unhandled exception)
+
+        :param exception:   Unhandled exception (if any)
+        """
+        profiler = flask.g.get("profiling_profiler")
+
+        if profiler is not None:
+            flask.g.profiling_profiler = None
+            self.__stop_profiler(profiler)
+
+        RequestStatistics.end()
+
+    def __is_profiling_allowed(self) -> bool:
+        """
+        Checks if the current request is allowed to be profiled
+
+        :return:    Success or failure
+        """
+        profiling_key = self.__profiling_key
+
+        if profiling_key is None:
+            return False
+
+        # Compare the keys in constant time so that the key cannot be guessed from the timing
+        request_key = flask.request.headers.get("SALM-Profile-Key", "")
+
+        if not hmac.compare_digest(request_key.encode("utf-8"), profiling_key.encode("utf-8")):
+            return False
+
+        return ProfilingMiddleware.__is_administrator_session()
+
+    @staticmethod
+    def __is_administrator_session() -> bool:
+        """
+        Checks if the current request belongs to a valid session of the administrator
+
+        :return:    Success or failure
+
+        NOTE:   The administrator is identified by its user ID: it is the user that created the
+                first revision of the database (the user's name is not checked since it can be
+                changed)!
+        """
+        token = flask.request.headers.get("SALM-Session-Token")
+
+        if token is None:
+            return False
+
+        session_user = None
+        first_revision = None
+        connection = DatabaseInterface.create_connection()
+
+        try:
+            success = connection.begin_transaction()
+
+            if success:
+                session_user = RestrictedResource._read_session_user(connection, token)
+
+            if session_user is not None:
+                first_revision = DatabaseInterface.tables().revision.read_revision(connection, 1)
+
+            # Commit the last use of the session token
+            connection.commit_transaction()
+        except:
+            connection.rollback_transaction()
+            return False
+
+        if (session_user is None) or (first_revision is None):
+            return False
+
+        return session_user["id"] == first_revision["user_id"]
+
+    def __stop_profiler(self, profiler) -> str:
+        """
+        Stops the profiler and writes its results to a file
+
+        :param profiler:    cProfile or statistical profiler
+
+        :return:    Path to the file with the profiling results
+        """
+        file_name = "profile_{0}_{1}".format(
+            datetime.datetime.now(datetime.timezone.utc).strftime("%Y%m%dT%H%M%S%f"),
+            flask.request.endpoint or "unknown")
+
+        if self.__profile_directory is not None:
+            file_name = os.path.join(self.__profile_directory, file_name)
+
+        if isinstance(profiler, cProfile.Profile):
+            profiler.disable()
+            self.__profiler_lock.release()
+
+            file_path = file_name + ".pstats"
+            profiler.dump_stats(file_path)
+        else:
+            profiler.stop()
+
+            file_path = file_name + ".folded"
+            profiler.write_folded_stacks(file_path)
+
+        return file_path
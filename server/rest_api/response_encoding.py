@@ -0,0 +1,262 @@
+"""
+Salamander ALM
+Copyright (c) 2016  Djuro Drljaca
+
+This Python module is free software; you can redistribute it and/or modify it under the terms of the
+GNU General Public License as published by the Free Software Foundation; either version 2 of the
+License, or (at your option) any later version.
+
+This Python module is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License along with this library. If
+not, see <http://www.gnu.org/licenses/>.
+"""
+
+import flask
+from flask.json.provider import DefaultJSONProvider
+import gzip
+from typing import Any, List, Optional
+
+# Optional encoders, each of them is used only if it is installed
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    import cbor2
+except ImportError:
+    cbor2 = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+class JsonProvider(DefaultJSONProvider):
+    """
+    JSON provider of the Flask application
+
+    Responses created with "jsonify" are encoded in the format that is preferred by the client
+    (Accept header): JSON, MessagePack ("application/msgpack") or CBOR ("application/cbor").
+    MessagePack and CBOR are only offered if the needed packages are installed. JSON is encoded
+    with "orjson" (if installed) which is considerably faster than the standard "json" module.
+    """
+
+    def __init__(self, app: flask.Flask):
+        """
+        Constructor
+
+        :param app: Flask application
+        """
+        DefaultJSONProvider.__init__(self, app)
+
+    def dumps(self, obj: Any, **kwargs) -> str:
+        """
+        Serializes the data as JSON
+
+        :param obj:     Data
+        :param kwargs:  Arguments for "json.dumps" (fast encoder is used only without arguments)
+
+        :return:    JSON string
+        """
+        if (orjson is None) or (len(kwargs) > 0):
+            return DefaultJSONProvider.dumps(self, obj, **kwargs)
+
+        return self.__dumps_fast(obj).decode("utf-8")
+
+    def response(self, *args, **kwargs) -> flask.Response:
+        """
+        Serializes the data in the format preferred by the client and creates a response
+
+        :param args:    A single value or multiple values (serialized as a list)
+        :param kwargs:  Values (serialized as a dictionary)
+
+        :return:    Response
+        """
+        obj = self._prepare_response_obj(args, kwargs)
+        mimetype = ResponseEncoding.negotiate_mimetype()
+
+        if mimetype == "application/msgpack":
+            return self._app.response_class(msgpack.packb(obj, default=self.default),
+                                            mimetype=mimetype)
+
+        if mimetype == "application/cbor":
+            return self._app.response_class(
+                cbor2.dumps(obj, default=lambda encoder, value: encoder.encode(
+                    self.default(value))),
+                mimetype=mimetype)
+
+        # Human readable JSON (e.g. in debug mode) is created by the default encoder
+        if ((orjson is None) or
+                (self.compact is False) or
+                ((self.compact is None) and self._app.debug)):
+            return DefaultJSONProvider.response(self, obj)
+
+        return self._app.response_class(self.__dumps_fast(obj) + b"\n", mimetype=self.mimetype)
+
+    def __dumps_fast(self, obj: Any) -> bytes:
+        """
+        Serializes the data as JSON with the fast encoder
+
+        :param obj: Data
+
+        :return:    JSON (UTF-8)
+
+        Note: Dates and times are still serialized by the default method (HTTP date format).
+        """
+        option = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+
+        if self.sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+
+        return orjson.dumps(obj, default=self.default, option=option)
+
+
+class ResponseEncoding(object):
+    """
+    Negotiation of the response format (Accept header) and compression (Accept-Encoding header)
+    """
+
+    # Responses smaller than this (in bytes) are not compressed
+    __min_compressed_size = 1024
+
+    # Compression levels
+    __gzip_level = 6
+    __brotli_quality = 5
+
+    def __init__(self):
+        """
+        Constructor is disabled!
+        """
+        raise RuntimeError()
+
+    @staticmethod
+    def install(app: flask.Flask) -> None:
+        """
+        Installs the JSON provider and response compression in the application
+
+        :param app: Flask application
+        """
+        app.json = JsonProvider(app)
+        app.after_request(ResponseEncoding.__after_request)
+
+    @staticmethod
+    def available_mimetypes() -> List[str]:
+        """
+        Returns the supported response formats
+
+        :return:    MIME types (the first one is the default)
+        """
+        mimetypes = ["application/json"]
+
+        if msgpack is not None:
+            mimetypes.append("application/msgpack")
+
+        if cbor2 is not None:
+            mimetypes.append("application/cbor")
+
+        return mimetypes
+
+    @staticmethod
+    def available_encodings() -> List[str]:
+        """
+        Returns the supported compression methods
+
+        :return:    Content encodings (in the order of preference)
+        """
+        if brotli is not None:
+            return ["br", "gzip"]
+        else:
+            return ["gzip"]
+
+    @staticmethod
+    def negotiate_mimetype() -> str:
+        """
+        Selects the response format for the current request
+
+        :return:    MIME type
+        """
+        mimetypes = ResponseEncoding.available_mimetypes()
+
+        if not flask.has_request_context():
+            return mimetypes[0]
+
+        mimetype = flask.request.accept_mimetypes.best_match(mimetypes)
+
+        if mimetype is None:
+            mimetype = mimetypes[0]
+
+        return mimetype
+
+    @staticmethod
+    def set_min_compressed_size(size: int) -> None:
+        """
+        Sets min size of a response that is compressed
+
+        :param size:    Size (in bytes)
+        """
+        ResponseEncoding.__min_compressed_size = size
+
+    @staticmethod
+    def compress(data: bytes, encoding: str) -> bytes:
+        """
+        Compresses data
+
+        :param data:        Data
+        :param encoding:    Content encoding ("gzip" or "br")
+
+        :return:    Compressed data
+        """
+        if encoding == "br":
+            return brotli.compress(data, quality=ResponseEncoding.__brotli_quality)
+
+        return gzip.compress(data, compresslevel=ResponseEncoding.__gzip_level, mtime=0)
+
+    @staticmethod
+    def __after_request(response: flask.Response) -> flask.Response:
+        """
+        Compresses the response if the client supports it
+
+        :param response:    Response
+
+        :return:    Response
+        """
+        response.vary.add("Accept")
+        response.vary.add("Accept-Encoding")
+
+        # Streamed responses, empty responses and already encoded responses are not compressed
+        if ((response.status_code != 200) or
+                response.is_streamed or
+                ("Content-Encoding" in response.headers)):
+            return response
+
+        encoding = flask.request.accept_encodings.best_match(
+            ResponseEncoding.available_encodings())
+
+        if encoding is None:
+            return response
+
+        data = response.get_data()
+
+        if len(data) < ResponseEncoding.__min_compressed_size:
+            return response
+
+        response.set_data(ResponseEncoding.compress(data, encoding))
+        response.headers["Content-Encoding"] = encoding
+
+        # Compressed representation has a different content, so the ETag is weakened
+        etag, weak = response.get_etag()
+
+        if (etag is not None) and (not weak):
+            response.set_etag(etag, weak=True)
+
+        return response
@@ -14,6 +14,7 @@ You should have received a copy of the GNU Lesser General Public License along w
 not, see <http://www.gnu.org/licenses/>.
 """
 
+from database.database import DatabaseInterface
 from flask import request
 from flask_restful import Resource, abort
 from usermanagement.user_management import UserManagementInterface, Connection
@@ -84,3 +85,57 @@ class RestrictedResource(Resource):
             return None
 
         return user
+
+    @staticmethod
+    def _read_session_user_id() -> int:
+        """
+        Reads the ID of the user that belongs to the session of the request
+
+        :return:    User ID
+
+        NOTE:   Request is aborted if the session is not valid!
+        """
+        # Extract session token from the request
+        token = RestrictedResource._read_session_token()
+
+        # Check session
+        session_user = None
+        connection = DatabaseInterface.create_connection()
+
+        try:
+            success = connection.begin_transaction()
+
+            if success:
+                session_user = RestrictedResource._read_session_user(connection, token)
+
+            # Commit the last use of the session token
+            connection.commit_transaction()
+        except:
+            connection.rollback_transaction()
+            abort(500, message="Internal error, please try again")
+
+        if session_user is None:
+            abort(400, message="Invalid session token")
+
+        return session_user["id"]
+
+    @staticmethod
+    def _read_integer_argument(name: str) -> Optional[int]:
+        """
+        Reads an optional integer argument from the request
+
+        :param name:    Name of the argument
+
+        :return:    Value of the argument ("None" if the argument was not specified)
+
+        NOTE:   Request is aborted if the value is not an integer!
+        """
+        value = request.args.get(name)
+
+        if value is None:
+            return None
+
+        try:
+            return int(value)
+        except ValueError:
+            abort(400, message="Invalid parameters")
@@ -0,0 +1,144 @@
+"""
+Salamander ALM
+Copyright (c) 2016  Djuro Drljaca
+
+This Python module is free software; you can redistribute it and/or modify it under the terms of the
+GNU General Public License as published by the Free Software Foundation; either version 2 of the
+License, or (at your option) any later version.
+
+This Python module is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License along with this library. If
+not, see <http://www.gnu.org/licenses/>.
+"""
+
+from database.database import DatabaseInterface
+from database.tables.search_index import SearchObjectType
+from flask import jsonify
+from flask_restful import request, abort
+from rest_api.conditional_response import ConditionalResponse
+from rest_api.restricted_resource import RestrictedResource
+from searchmanagement.search_management import SearchManagementInterface
+
+
+class Search(RestrictedResource):
+    """
+    REST API for searching projects, trackers, tracker fields and artifacts
+    """
+
+    def __init__(self):
+        """
+        Constructor
+        """
+        RestrictedResource.__init__(self)
+
+    def get(self):
+        """
+        Search for objects that contain the specified text
+
+        :return:    List of search results
+
+        Allowed parameters:
+
+        - text:         str
+        - object_type:  str, optional (comma separated list of: "project", "tracker",
+                        "tracker_field" and "artifact")
+        - limit:        int, optional
+        - offset:       int, optional
+
+        Each dictionary in the returned list contains items:
+
+        - object_type
+        - object_id
+        - title
+        - snippet
+        - rank
+
+        Response contains an ETag derived from the current revision, so a request with a matching
+        If-None-Match header is answered with "304 Not Modified" without executing the search.
+        """
+        # Extract session token from the request
+        token = RestrictedResource._read_session_token()
+
+        # Extract arguments
+        args = request.args
+
+        if (args is None) or ("text" not in args):
+            abort(400, message="Parameter is missing")
+
+        object_types = None
+
+        try:
+            if "object_type" in args:
+                object_types = [SearchObjectType(x.strip())
+                                for x in args["object_type"].split(",")]
+
+            limit = int(args.get("limit", 20))
+            offset = int(args.get("offset", 0))
+        except ValueError:
+            abort(400, message="Invalid parameters")
+
+        if ((limit < 1) or
+                (limit > SearchManagementInterface.max_limit) or
+                (offset < 0)):
+            abort(400, message="Invalid parameters")
+
+        # Check session
+        success = False
+        error_code = None
+        error_message = None
+
+        connection = DatabaseInterface.create_connection()
+
+        try:
+            success = connection.begin_transaction()
+
+            # Extract session user
+            if success:
+                session_user = RestrictedResource._read_session_user(connection, token)
+
+                if session_user is None:
+                    success = False
+                    error_code = 400
+                    error_message = "Invalid session token"
+
+            # Search results change only with a new revision
+            revision_id = None
+
+            if success:
+                revision_id = DatabaseInterface.tables().revision.read_current_revision_id(
+                    connection)
+
+                if revision_id is None:
+                    success = False
+
+            # Commit the last use of the session token
+            connection.commit_transaction()
+        except:
+            connection.rollback_transaction()
+            abort(500, message="Internal error, please try again")
+
+        if not success:
+            if (error_code is not None) and (error_message is not None):
+                abort(error_code, message=error_message)
+            else:
+                abort(500, message="Internal error")
+
+        etag = ConditionalResponse.create_revision_etag(revision_id,
+                                                        args["text"],
+                                                        args.get("object_type"),
+                                                        limit,
+                                                        offset)
+
+        if ConditionalResponse.is_not_modified(etag):
+            return ConditionalResponse.not_modified(etag)
+
+        # Search
+        results = SearchManagementInterface.search(args["text"], object_types, limit, offset)
+
+        for result in results:
+            result["object_type"] = result["object_type"].value
+
+        return ConditionalResponse.with_etag(jsonify(results), etag)
@@ -38,7 +38,8 @@ class Login(Resource):
         try:
             success = connection.begin_transaction()
 
-            # Authenticate the user
+            # Authenticate the user (only reads from the database so the write lock is not held
+            # while the authentication parameters are verified)
             user_id = None
 
             if success:
@@ -52,6 +53,11 @@ class Login(Resource):
                     error_code = 400
                     error_message = "Invalid user name or authentication parameters"
 
+            connection.rollback_transaction()
+
+            if success:
+                success = connection.begin_transaction(write=True)
+
             # Create session token
             if success:
                 token = UserManagementInterface.create_session_token(connection, user_id)
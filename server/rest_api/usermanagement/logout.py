@@ -30,7 +30,7 @@ class Logout(RestrictedResource):
         connection = DatabaseInterface.create_connection()
 
         try:
-            success = connection.begin_transaction()
+            success = connection.begin_transaction(write=True)
 
             # Get the session token
             session_token = None
@@ -44,10 +44,13 @@ class Logout(RestrictedResource):
                     error_message = "Invalid session token"
 
             # Delete session token
+            revocations = None
+
             if success:
-                success = UserManagementInterface.delete_session_token(connection, token)
+                revocations = UserManagementInterface.delete_session_token(connection, token)
 
-                if not success:
+                if revocations is None:
+                    success = False
                     error_code = 500
                     error_message = "Failed to log out, please try again"
 
@@ -59,6 +62,10 @@ class Logout(RestrictedResource):
             connection.rollback_transaction()
             abort(500, message="Internal error, please try again")
 
+        # Revoke the signed session token only after the revocation is stored in the database
+        if success:
+            UserManagementInterface.apply_session_token_revocations(revocations)
+
         # Return response
         if success:
             return None
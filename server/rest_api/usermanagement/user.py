@@ -27,8 +27,9 @@ class User(RestrictedResource):
         - user_id:      int
         - user_name:    str
         - display_name: str
+        - search:       str (optionally together with "limit": int)
 
-        Returned dictionary contains items:
+        Returned dictionary contains items (for "search" a list of such dictionaries is returned):
 
         - id
         - user_name
@@ -45,8 +46,20 @@ class User(RestrictedResource):
         if args is None:
             abort(400, message="Parameter is missing")
 
+        # Search the user directory
+        if (("search" in args) and
+                ("user_id" not in args) and
+                ("user_name" not in args) and
+                ("display_name" not in args)):
+            try:
+                limit = int(args.get("limit", 10))
+            except ValueError:
+                abort(400, message="Invalid parameters")
+
+            return User.__search_users(token, args["search"], limit)
+
         # Read current user
-        if (("user_id" not in args) and
+        elif (("user_id" not in args) and
                 ("user_name" not in args) and
                 ("display_name" not in args)):
             return User.__read_current_user(token)
@@ -109,7 +122,8 @@ class User(RestrictedResource):
                     error_code = 400
                     error_message = "Invalid session token"
 
-            connection.rollback_transaction()
+            # Commit the last use of the session token
+            connection.commit_transaction()
         except:
             connection.rollback_transaction()
             abort(500, message="Internal error, please try again")
@@ -123,6 +137,67 @@ class User(RestrictedResource):
             else:
                 abort(500, message="Internal error")
 
+    @staticmethod
+    def __search_users(token: str, text: str, limit: int) -> list:
+        """
+        Searches the user directory for active users whose user name, display name or email starts
+        with the specified text (case-insensitive)
+
+        :param token:   Session token which contains the current user's information
+        :param text:    Text to search for
+        :param limit:   Max number of returned users
+
+        :return:    List of user information objects
+
+        Each dictionary in the returned list contains items:
+
+        - id
+        - user_name
+        - display_name
+        - email
+        - active
+        """
+        users = None
+        success = False
+        error_code = None
+        error_message = None
+
+        if (limit < 1) or (limit > UserManagementInterface.max_search_limit):
+            abort(400, message="Invalid parameters")
+
+        connection = DatabaseInterface.create_connection()
+
+        try:
+            success = connection.begin_transaction()
+
+            # Extract session user
+            if success:
+                session_user = RestrictedResource._read_session_user(connection, token)
+
+                if session_user is None:
+                    success = False
+                    error_code = 400
+                    error_message = "Invalid session token"
+
+            # Search for users
+            if success:
+                users = UserManagementInterface.search_users(connection, text, limit)
+
+            # Commit the last use of the session token
+            connection.commit_transaction()
+        except:
+            connection.rollback_transaction()
+            abort(500, message="Internal error, please try again")
+
+        # Return users
+        if success:
+            return jsonify(users)
+        else:
+            if (error_code is not None) and (error_message is not None):
+                abort(error_code, message=error_message)
+            else:
+                abort(500, message="Internal error")
+
     @staticmethod
     def __read_user_by_user_id(token: str, user_id: int) -> dict:
         """
@@ -169,7 +244,8 @@ class User(RestrictedResource):
                     error_code = 400
                     error_message = "Invalid user ID"
 
-            connection.rollback_transaction()
+            # Commit the last use of the session token
+            connection.commit_transaction()
         except:
             connection.rollback_transaction()
             abort(500, message="Internal error, please try again")
@@ -229,7 +305,8 @@ class User(RestrictedResource):
                     error_code = 400
                     error_message = "Invalid user name"
 
-            connection.rollback_transaction()
+            # Commit the last use of the session token
+            connection.commit_transaction()
         except:
             connection.rollback_transaction()
             abort(500, message="Internal error, please try again")
@@ -289,7 +366,8 @@ class User(RestrictedResource):
                     error_code = 400
                     error_message = "Invalid user name"
 
-            connection.rollback_transaction()
+            # Commit the last use of the session token
+            connection.commit_transaction()
         except:
             connection.rollback_transaction()
             abort(500, message="Internal error, please try again")
@@ -1,8 +1,11 @@
+from attachmentmanagement.attachment_file_store import AttachmentFileStore
+from attachmentmanagement.attachment_management import AttachmentManagementInterface
 from authentication.authentication import AuthenticationInterface
 from authentication.basic_authentication_method import AuthenticationMethodBasic
 from database.database import DatabaseInterface
 from plugins.database.sqlite.database import DatabaseSqlite
 import rest_api
+from usermanagement.session_token_sweeper import SessionTokenSweeper
 
 if __name__ == '__main__':
     # Authentication
@@ -13,5 +16,12 @@ if __name__ == '__main__':
     DatabaseInterface.load_database_plugin(DatabaseSqlite("database.db"))
     DatabaseInterface.create_new_database()
 
+    # Content of the attachments is stored next to the database
+    AttachmentManagementInterface.load_file_store(AttachmentFileStore("attachments"))
+
+    # Periodically delete expired session tokens
+    session_token_sweeper = SessionTokenSweeper()
+    session_token_sweeper.start()
+
     # Start server
     rest_api.app.run(debug=True)
@@ -0,0 +1,84 @@
+"""
+Salamander ALM
+Copyright (c) 2016  Djuro Drljaca
+
+This Python module is free software; you can redistribute it and/or modify it under the terms of the
+GNU General Public License as published by the Free Software Foundation; either version 2 of the
+License, or (at your option) any later version.
+
+This Python module is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License along with this library. If
+not, see <http://www.gnu.org/licenses/>.
+"""
+
+from database.database import DatabaseInterface
+from database.tables.search_index import SearchObjectType
+import re
+from typing import List, Optional
+
+
+class SearchManagementInterface(object):
+    """
+    Search management
+
+    Dependencies:
+
+    - DatabaseInterface
+    """
+
+    max_limit = 100  # Max number of results that can be returned with a single search
+
+    def __init__(self):
+        """
+        Constructor is disabled!
+        """
+        raise RuntimeError()
+
+    @staticmethod
+    def search(text: str,
+               object_types: Optional[List[SearchObjectType]] = None,
+               limit=20,
+               offset=0) -> List[dict]:
+        """
+        Searches the current revision of all active projects, trackers, tracker fields and
+        artifacts for the specified text
+
+        :param text:            Text to search for (objects that contain all of the words in the
+                                text are returned, each word also matches as a prefix)
+        :param object_types:    Object types to search for ("None" for all object types)
+        :param limit:           Max number of returned results (1 to "max_limit")
+        :param offset:          Number of results to skip (for pagination)
+
+        :return:    Search results ordered by relevance (best match first)
+
+        Each dictionary in the returned list contains items:
+
+        - object_type
+        - object_id
+        - title
+        - snippet
+        - rank (higher value means a better match)
+        """
+        # Check parameters
+        if (limit < 1) or (limit > SearchManagementInterface.max_limit):
+            return list()
+
+        if offset < 0:
+            return list()
+
+        keywords = re.findall(r"\w+", text)
+
+        if len(keywords) == 0:
+            return list()
+
+        # Search the index
+        connection = DatabaseInterface.create_connection()
+
+        return DatabaseInterface.tables().search_index.search(connection,
+                                                              keywords,
+                                                              object_types,
+                                                              limit,
+                                                              offset)
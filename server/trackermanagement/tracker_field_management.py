@@ -18,7 +18,7 @@ from database.connection import Connection
 from database.database import DatabaseInterface
 from database.tables.tracker_field_information import TrackerFieldSelection
 import datetime
-from typing import List, Optional
+from typing import Dict, List, Optional
 
 
 class TrackerFieldManagementInterface(object):
@@ -308,7 +308,7 @@ class TrackerFieldManagementInterface(object):
         connection = DatabaseInterface.create_connection()
         
         try:
-            success = connection.begin_transaction()
+            success = connection.begin_transaction(write=True)
             
             # Start a new revision
             revision_id = None
@@ -371,7 +371,7 @@ class TrackerFieldManagementInterface(object):
         connection = DatabaseInterface.create_connection()
 
         try:
-            success = connection.begin_transaction()
+            success = connection.begin_transaction(write=True)
 
             # Start a new revision
             revision_id = None
@@ -420,7 +420,8 @@ class TrackerFieldManagementInterface(object):
                                          description: str,
                                          field_type: str,
                                          required: bool,
-                                         active: bool) -> bool:
+                                         active: bool,
+                                         expected_revision_id=None) -> bool:
         """
         Updates tracker's information
 
@@ -432,48 +433,45 @@ class TrackerFieldManagementInterface(object):
         :param field_type:              Tracker field's new type
         :param required:                Necessity of the tracker field (required or not)
         :param active:                  Tracker field's new state (active or inactive)
+        :param expected_revision_id:    Revision ID of the tracker field that the modification is
+                                        based on (optional)
 
         :return:    Success or failure
+
+        NOTE:   If the expected revision ID is specified the update fails in case the tracker field
+                was modified in a later revision!
         """
         connection = DatabaseInterface.create_connection()
-        
+
         try:
-            success = connection.begin_transaction()
-            
+            # Fail fast (before the write transaction is started) if the tracker field was already
+            # modified after the expected revision
+            success = True
+
+            if expected_revision_id is not None:
+                success = TrackerFieldManagementInterface.__is_latest_revision(
+                    connection,
+                    tracker_field_to_modify,
+                    expected_revision_id)
+
+            if success:
+                success = connection.begin_transaction(write=True)
+
             # Start a new revision
             revision_id = None
-            
+
             if success:
                 revision_id = DatabaseInterface.tables().revision.insert_row(
                     connection,
                     datetime.datetime.utcnow(),
                     requested_by_user)
-                
+
                 if revision_id is None:
                     success = False
-            
-            # Check if there is already an existing tracker field with the same name
-            if success:
-                tracker = TrackerFieldManagementInterface.__read_tracker_field_by_name(connection,
-                                                                                       name,
-                                                                                       revision_id)
-                
-                if tracker is not None:
-                    if tracker["id"] != tracker_field_to_modify:
-                        success = False
-            
-            # Check if there is already an existing tracker field with the same display name
-            if success:
-                tracker = TrackerFieldManagementInterface.__read_tracker_field_by_display_name(
-                    connection,
-                    display_name,
-                    revision_id)
-                
-                if tracker is not None:
-                    if tracker["id"] != tracker_field_to_modify:
-                        success = False
-            
-            # Update tracker field's information in the new revision
+
+            # Update tracker field's information in the new revision (the database rejects it if
+            # the tracker field was modified after the expected revision or if its names are
+            # already used)
             if success:
                 row_id = DatabaseInterface.tables().tracker_field_information.insert_row(
                     connection,
@@ -484,11 +482,12 @@ class TrackerFieldManagementInterface(object):
                     field_type,
                     required,
                     active,
-                    revision_id)
-                
+                    revision_id,
+                    expected_revision_id)
+
                 if row_id is None:
                     success = False
-            
+
             if success:
                 connection.commit_transaction()
             else:
@@ -496,9 +495,9 @@ class TrackerFieldManagementInterface(object):
         except:
             connection.rollback_transaction()
             raise
-        
+
         return success
-    
+
     @staticmethod
     def activate_tracker_field(requested_by_user: int, tracker_field_id: int) -> bool:
         """
@@ -508,11 +507,13 @@ class TrackerFieldManagementInterface(object):
         :param tracker_field_id:    ID of the tracker field that should be activated
 
         :return:    Success or failure
+
+        Activation fails if the field's name or display name is used by another active field.
         """
         connection = DatabaseInterface.create_connection()
         
         try:
-            success = connection.begin_transaction()
+            success = connection.begin_transaction(write=True)
             
             # Start a new revision
             revision_id = None
@@ -526,34 +527,17 @@ class TrackerFieldManagementInterface(object):
                 if revision_id is None:
                     success = False
             
-            # Read tracker field
-            tracker_field = None
-            
+            # Activate tracker field (only its state is changed and only if it is inactive)
             if success:
-                tracker_field = TrackerFieldManagementInterface.__read_tracker_field_by_id(
+                row_id = DatabaseInterface.tables().tracker_field_information.insert_state_row(
                     connection,
                     tracker_field_id,
+                    True,
                     revision_id)
                 
-                if tracker_field is None:
-                    success = False
-                elif tracker_field["active"]:
-                    # Error, tracker field is already active
+                if row_id is None:
                     success = False
             
-            # Activate tracker field
-            if success:
-                success = DatabaseInterface.tables().tracker_field_information.insert_row(
-                    connection,
-                    tracker_field_id,
-                    tracker_field["name"],
-                    tracker_field["display_name"],
-                    tracker_field["description"],
-                    tracker_field["field_type"],
-                    tracker_field["required"],
-                    True,
-                    revision_id)
-            
             if success:
                 connection.commit_transaction()
             else:
@@ -577,7 +561,7 @@ class TrackerFieldManagementInterface(object):
         connection = DatabaseInterface.create_connection()
         
         try:
-            success = connection.begin_transaction()
+            success = connection.begin_transaction(write=True)
             
             # Start a new revision
             revision_id = None
@@ -591,34 +575,17 @@ class TrackerFieldManagementInterface(object):
                 if revision_id is None:
                     success = False
             
-            # Read tracker field
-            tracker_field = None
-            
+            # Deactivate tracker field (only its state is changed and only if it is active)
             if success:
-                tracker_field = TrackerFieldManagementInterface.__read_tracker_field_by_id(
+                row_id = DatabaseInterface.tables().tracker_field_information.insert_state_row(
                     connection,
                     tracker_field_id,
+                    False,
                     revision_id)
                 
-                if tracker_field is None:
-                    success = False
-                elif not tracker_field["active"]:
-                    # Error, tracker field is already inactive
+                if row_id is None:
                     success = False
             
-            # Deactivate tracker field
-            if success:
-                success = DatabaseInterface.tables().tracker_field_information.insert_row(
-                    connection,
-                    tracker_field_id,
-                    tracker_field["name"],
-                    tracker_field["display_name"],
-                    tracker_field["description"],
-                    tracker_field["field_type"],
-                    tracker_field["required"],
-                    False,
-                    revision_id)
-            
             if success:
                 connection.commit_transaction()
             else:
@@ -629,6 +596,114 @@ class TrackerFieldManagementInterface(object):
         
         return success
     
+    @staticmethod
+    def activate_tracker_fields(requested_by_user: int,
+                                tracker_field_ids: List[int]) -> Dict[int, bool]:
+        """
+        Activates inactive tracker fields (all of them in a single revision)
+
+        :param requested_by_user:   ID of the user that requested modification of the tracker fields
+        :param tracker_field_ids:   IDs of the tracker fields that should be activated
+
+        :return:    Success or failure for each of the tracker fields (key is the tracker field ID)
+
+        Tracker fields that do not exist or that are already active are not changed.
+        """
+        return TrackerFieldManagementInterface.__change_tracker_fields_state(requested_by_user,
+                                                                             tracker_field_ids,
+                                                                             True)
+
+    @staticmethod
+    def deactivate_tracker_fields(requested_by_user: int,
+                                  tracker_field_ids: List[int]) -> Dict[int, bool]:
+        """
+        Deactivates active tracker fields (all of them in a single revision)
+
+        :param requested_by_user:   ID of the user that requested modification of the tracker fields
+        :param tracker_field_ids:   IDs of the tracker fields that should be deactivated
+
+        :return:    Success or failure for each of the tracker fields (key is the tracker field ID)
+
+        Tracker fields that do not exist or that are already inactive are not changed.
+        """
+        return TrackerFieldManagementInterface.__change_tracker_fields_state(requested_by_user,
+                                                                             tracker_field_ids,
+                                                                             False)
+
+    @staticmethod
+    def __change_tracker_fields_state(requested_by_user: int,
+                                      tracker_field_ids: List[int],
+                                      active: bool) -> Dict[int, bool]:
+        """
+        Changes the state of the tracker fields (all of them in a single revision)
+
+        :param requested_by_user:   ID of the user that requested modification of the tracker fields
+        :param tracker_field_ids:   IDs of the tracker fields
+        :param active:              New state of the tracker fields (active or inactive)
+
+        :return:    Success or failure for each of the tracker fields (key is the tracker field ID)
+        """
+        results = {tracker_field_id: False for tracker_field_id in tracker_field_ids}
+        connection = DatabaseInterface.create_connection()
+
+        try:
+            success = connection.begin_transaction(write=True)
+
+            # Start a new revision
+            revision_id = None
+
+            if success:
+                revision_id = DatabaseInterface.tables().revision.insert_row(
+                    connection,
+                    datetime.datetime.utcnow(),
+                    requested_by_user)
+
+                if revision_id is None:
+                    success = False
+
+            # Find the tracker fields that exist and are not already in the requested state (all of
+            # them with a single query)
+            changed_tracker_field_ids = list()
+
+            if success:
+                states = DatabaseInterface.tables().tracker_field_information.read_states(
+                    connection,
+                    list(results.keys()),
+                    revision_id)
+
+                changed_tracker_field_ids = [x for x in results.keys()
+                                             if (x in states) and (states[x] != active)]
+
+                if len(changed_tracker_field_ids) == 0:
+                    # Nothing to change
+                    success = False
+
+            # Change the state of the tracker fields (only their state is changed). Tracker fields
+            # whose names are already used by other active tracker fields are left unchanged.
+            if success:
+                changed_tracker_field_ids = \
+                    DatabaseInterface.tables().tracker_field_information.insert_state_rows(
+                        connection,
+                        changed_tracker_field_ids,
+                        active,
+                        revision_id)
+
+                if len(changed_tracker_field_ids) == 0:
+                    success = False
+
+            if success:
+                connection.commit_transaction()
+
+                for tracker_field_id in changed_tracker_field_ids:
+                    results[tracker_field_id] = True
+            else:
+                connection.rollback_transaction()
+        except:
+            connection.rollback_transaction()
+            raise
+
+        return results
+
     @staticmethod
     def __read_tracker_field_by_id(connection: Connection,
                                    tracker_field_id: int,
@@ -779,6 +854,32 @@ class TrackerFieldManagementInterface(object):
 
         return tracker_field
     
+    @staticmethod
+    def __is_latest_revision(connection: Connection,
+                             tracker_field_id: int,
+                             revision_id: int) -> bool:
+        """
+        Checks if the tracker field was not modified after the specified revision
+
+        :param connection:          Database connection
+        :param tracker_field_id:    ID of the tracker field
+        :param revision_id:         Revision ID
+
+        :return:    True if the revision is the latest revision of the tracker field
+        """
+        current_revision_id = DatabaseInterface.tables().revision.read_current_revision_id(
+            connection)
+
+        if current_revision_id is None:
+            return False
+
+        tracker_field = TrackerFieldManagementInterface.__read_tracker_field_by_id(
+            connection,
+            tracker_field_id,
+            current_revision_id)
+
+        return (tracker_field is not None) and (tracker_field["revision_id"] == revision_id)
+
     @staticmethod
     def __create_tracker_field(connection: Connection,
                                tracker_id: int,
@@ -802,23 +903,6 @@ class TrackerFieldManagementInterface(object):
 
         :return:    Tracker field ID of the newly created tracker field
         """
-        # Check if a tracker field with the same name already exists
-        tracker_field = TrackerFieldManagementInterface.__read_tracker_field_by_name(connection,
-                                                                                     name,
-                                                                                     revision_id)
-        
-        if tracker_field is not None:
-            return None
-        
-        # Check if a tracker field with the same display name already exists
-        tracker_field = TrackerFieldManagementInterface.__read_tracker_field_by_display_name(
-            connection,
-            display_name,
-            revision_id)
-        
-        if tracker_field is not None:
-            return None
-        
         # Create the tracker field in the new revision
         tracker_field_id = DatabaseInterface.tables().tracker_field.insert_row(connection,
                                                                                tracker_id)
@@ -826,7 +910,8 @@ class TrackerFieldManagementInterface(object):
         if tracker_field_id is None:
             return None
         
-        # Add tracker field information to the tracker field
+        # Add tracker field information to the tracker field (the database rejects it if the names
+        # are already used by another active tracker field)
         tracker_field_information_id = \
             DatabaseInterface.tables().tracker_field_information.insert_row(
                 connection,
@@ -18,7 +18,7 @@ from database.connection import Connection
 from database.database import DatabaseInterface
 from database.tables.tracker_information import TrackerSelection
 import datetime
-from typing import List, Optional
+from typing import Dict, List, Optional
 
 
 class TrackerManagementInterface(object):
@@ -287,7 +287,7 @@ class TrackerManagementInterface(object):
         connection = DatabaseInterface.create_connection()
         
         try:
-            success = connection.begin_transaction()
+            success = connection.begin_transaction(write=True)
             
             # Start a new revision
             revision_id = None
@@ -329,57 +329,54 @@ class TrackerManagementInterface(object):
                                    short_name: str,
                                    full_name: str,
                                    description: str,
-                                   active: bool) -> bool:
+                                   active: bool,
+                                   expected_revision_id=None) -> bool:
         """
         Updates tracker's information
 
-        :param requested_by_user:   ID of the user that requested modification of the user
-        :param tracker_to_modify:   ID of the tracker that should be modified
-        :param short_name:          Tracker's new short name
-        :param full_name:           Tracker's new full name
-        :param description:         Tracker's new description
-        :param active:              Tracker's new state (active or inactive)
+        :param requested_by_user:       ID of the user that requested modification of the user
+        :param tracker_to_modify:       ID of the tracker that should be modified
+        :param short_name:              Tracker's new short name
+        :param full_name:               Tracker's new full name
+        :param description:             Tracker's new description
+        :param active:                  Tracker's new state (active or inactive)
+        :param expected_revision_id:    Revision ID of the tracker that the modification is based
+                                        on (optional)
 
         :return:    Success or failure
+
+        NOTE:   If the expected revision ID is specified the update fails in case the tracker was
+                modified in a later revision!
         """
         connection = DatabaseInterface.create_connection()
-        
+
         try:
-            success = connection.begin_transaction()
-            
+            # Fail fast (before the write transaction is started) if the tracker was already
+            # modified after the expected revision
+            success = True
+
+            if expected_revision_id is not None:
+                success = TrackerManagementInterface.__is_latest_revision(connection,
+                                                                          tracker_to_modify,
+                                                                          expected_revision_id)
+
+            if success:
+                success = connection.begin_transaction(write=True)
+
             # Start a new revision
             revision_id = None
-            
+
             if success:
                 revision_id = DatabaseInterface.tables().revision.insert_row(
                     connection,
                     datetime.datetime.utcnow(),
                     requested_by_user)
-                
+
                 if revision_id is None:
                     success = False
-            
-            # Check if there is already an existing tracker with the same short name
-            if success:
-                tracker = TrackerManagementInterface.__read_tracker_by_short_name(connection,
-                                                                                  short_name,
-                                                                                  revision_id)
-                
-                if tracker is not None:
-                    if tracker["id"] != tracker_to_modify:
-                        success = False
-            
-            # Check if there is already an existing tracker with the same full name
-            if success:
-                tracker = TrackerManagementInterface.__read_tracker_by_full_name(connection,
-                                                                                 full_name,
-                                                                                 revision_id)
-                
-                if tracker is not None:
-                    if tracker["id"] != tracker_to_modify:
-                        success = False
-            
-            # Update tracker's information in the new revision
+
+            # Update tracker's information in the new revision (the database rejects it if the
+            # tracker was modified after the expected revision or if its names are already used)
             if success:
                 row_id = DatabaseInterface.tables().tracker_information.insert_row(
                     connection,
@@ -388,11 +385,12 @@ class TrackerManagementInterface(object):
                     full_name,
                     description,
                     active,
-                    revision_id)
-                
+                    revision_id,
+                    expected_revision_id)
+
                 if row_id is None:
                     success = False
-            
+
             if success:
                 connection.commit_transaction()
             else:
@@ -400,9 +398,9 @@ class TrackerManagementInterface(object):
         except:
             connection.rollback_transaction()
             raise
-        
+
         return success
-    
+
     @staticmethod
     def activate_tracker(requested_by_user: int, tracker_id: int) -> bool:
         """
@@ -412,11 +410,13 @@ class TrackerManagementInterface(object):
         :param tracker_id:          ID of the tracker that should be activated
 
         :return:    Success or failure
+
+        Activation fails if the tracker's short or full name is used by another active tracker.
         """
         connection = DatabaseInterface.create_connection()
         
         try:
-            success = connection.begin_transaction()
+            success = connection.begin_transaction(write=True)
             
             # Start a new revision
             revision_id = None
@@ -430,30 +430,16 @@ class TrackerManagementInterface(object):
                 if revision_id is None:
                     success = False
             
-            # Read tracker
-            tracker = None
-            
-            if success:
-                tracker = TrackerManagementInterface.__read_tracker_by_id(connection,
-                                                                          tracker_id,
-                                                                          revision_id)
-                
-                if tracker is None:
-                    success = False
-                elif tracker["active"]:
-                    # Error, tracker is already active
-                    success = False
-            
-            # Activate tracker
+            # Activate tracker (only its state is changed and only if it is inactive)
             if success:
-                success = DatabaseInterface.tables().tracker_information.insert_row(
+                row_id = DatabaseInterface.tables().tracker_information.insert_state_row(
                     connection,
                     tracker_id,
-                    tracker["short_name"],
-                    tracker["full_name"],
-                    tracker["description"],
                     True,
                     revision_id)
+                
+                if row_id is None:
+                    success = False
             
             if success:
                 connection.commit_transaction()
@@ -478,7 +464,7 @@ class TrackerManagementInterface(object):
         connection = DatabaseInterface.create_connection()
         
         try:
-            success = connection.begin_transaction()
+            success = connection.begin_transaction(write=True)
             
             # Start a new revision
             revision_id = None
@@ -492,30 +478,16 @@ class TrackerManagementInterface(object):
                 if revision_id is None:
                     success = False
             
-            # Read tracker
-            tracker = None
-            
-            if success:
-                tracker = TrackerManagementInterface.__read_tracker_by_id(connection,
-                                                                          tracker_id,
-                                                                          revision_id)
-                
-                if tracker is None:
-                    success = False
-                elif not tracker["active"]:
-                    # Error, tracker is already inactive
-                    success = False
-            
-            # Deactivate tracker
+            # Deactivate tracker (only its state is changed and only if it is active)
             if success:
-                success = DatabaseInterface.tables().tracker_information.insert_row(
+                row_id = DatabaseInterface.tables().tracker_information.insert_state_row(
                     connection,
                     tracker_id,
-                    tracker["short_name"],
-                    tracker["full_name"],
-                    tracker["description"],
                     False,
                     revision_id)
+                
+                if row_id is None:
+                    success = False
             
             if success:
                 connection.commit_transaction()
@@ -527,6 +499,112 @@ class TrackerManagementInterface(object):
         
         return success
     
+    @staticmethod
+    def activate_trackers(requested_by_user: int, tracker_ids: List[int]) -> Dict[int, bool]:
+        """
+        Activates inactive trackers (all of them in a single revision)
+
+        :param requested_by_user:   ID of the user that requested modification of the trackers
+        :param tracker_ids:         IDs of the trackers that should be activated
+
+        :return:    Success or failure for each of the trackers (key is the tracker ID)
+
+        Trackers that do not exist or that are already active are not changed.
+        """
+        return TrackerManagementInterface.__change_trackers_state(requested_by_user,
+                                                                  tracker_ids,
+                                                                  True)
+
+    @staticmethod
+    def deactivate_trackers(requested_by_user: int, tracker_ids: List[int]) -> Dict[int, bool]:
+        """
+        Deactivates active trackers (all of them in a single revision)
+
+        :param requested_by_user:   ID of the user that requested modification of the trackers
+        :param tracker_ids:         IDs of the trackers that should be deactivated
+
+        :return:    Success or failure for each of the trackers (key is the tracker ID)
+
+        Trackers that do not exist or that are already inactive are not changed.
+        """
+        return TrackerManagementInterface.__change_trackers_state(requested_by_user,
+                                                                  tracker_ids,
+                                                                  False)
+
+    @staticmethod
+    def __change_trackers_state(requested_by_user: int,
+                                tracker_ids: List[int],
+                                active: bool) -> Dict[int, bool]:
+        """
+        Changes the state of the trackers (all of them in a single revision)
+
+        :param requested_by_user:   ID of the user that requested modification of the trackers
+        :param tracker_ids:         IDs of the trackers
+        :param active:              New state of the trackers (active or inactive)
+
+        :return:    Success or failure for each of the trackers (key is the tracker ID)
+        """
+        results = {tracker_id: False for tracker_id in tracker_ids}
+        connection = DatabaseInterface.create_connection()
+
+        try:
+            success = connection.begin_transaction(write=True)
+
+            # Start a new revision
+            revision_id = None
+
+            if success:
+                revision_id = DatabaseInterface.tables().revision.insert_row(
+                    connection,
+                    datetime.datetime.utcnow(),
+                    requested_by_user)
+
+                if revision_id is None:
+                    success = False
+
+            # Find the trackers that exist and are not already in the requested state (all of them
+            # with a single query)
+            changed_tracker_ids = list()
+
+            if success:
+                states = DatabaseInterface.tables().tracker_information.read_states(
+                    connection,
+                    list(results.keys()),
+                    revision_id)
+
+                changed_tracker_ids = [x for x in results.keys()
+                                       if (x in states) and (states[x] != active)]
+
+                if len(changed_tracker_ids) == 0:
+                    # Nothing to change
+                    success = False
+
+            # Change the state of the trackers (only their state is changed). Trackers whose names
+            # are already used by other active trackers are left unchanged.
+            if success:
+                changed_tracker_ids = \
+                    DatabaseInterface.tables().tracker_information.insert_state_rows(
+                        connection,
+                        changed_tracker_ids,
+                        active,
+                        revision_id)
+
+                if len(changed_tracker_ids) == 0:
+                    success = False
+
+            if success:
+                connection.commit_transaction()
+
+                for tracker_id in changed_tracker_ids:
+                    results[tracker_id] = True
+            else:
+                connection.rollback_transaction()
+        except:
+            connection.rollback_transaction()
+            raise
+
+        return results
+
     @staticmethod
     def __read_tracker_by_id(connection: Connection,
                              tracker_id: int,
@@ -665,6 +743,29 @@ class TrackerManagementInterface(object):
         
         return tracker
     
+    @staticmethod
+    def __is_latest_revision(connection: Connection, tracker_id: int, revision_id: int) -> bool:
+        """
+        Checks if the tracker was not modified after the specified revision
+
+        :param connection:  Database connection
+        :param tracker_id:  ID of the tracker
+        :param revision_id: Revision ID
+
+        :return:    True if the revision is the latest revision of the tracker
+        """
+        current_revision_id = DatabaseInterface.tables().revision.read_current_revision_id(
+            connection)
+
+        if current_revision_id is None:
+            return False
+
+        tracker = TrackerManagementInterface.__read_tracker_by_id(connection,
+                                                                  tracker_id,
+                                                                  current_revision_id)
+
+        return (tracker is not None) and (tracker["revision_id"] == revision_id)
+
     @staticmethod
     def __create_tracker(connection: Connection,
                          project_id: int,
@@ -684,29 +785,14 @@ class TrackerManagementInterface(object):
 
         :return:    Tracker ID of the newly created tracker
         """
-        # Check if a tracker with the same short name already exists
-        tracker = TrackerManagementInterface.__read_tracker_by_short_name(connection,
-                                                                          short_name,
-                                                                          revision_id)
-        
-        if tracker is not None:
-            return None
-        
-        # Check if a tracker with the same full name already exists
-        tracker = TrackerManagementInterface.__read_tracker_by_full_name(connection,
-                                                                         full_name,
-                                                                         revision_id)
-        
-        if tracker is not None:
-            return None
-        
         # Create the tracker in the new revision
         tracker_id = DatabaseInterface.tables().tracker.insert_row(connection, project_id)
         
         if tracker_id is None:
             return None
         
-        # Add tracker information to the tracker
+        # Add tracker information to the tracker (the database rejects it if the names are already
+        # used by another active tracker)
         tracker_information_id = DatabaseInterface.tables().tracker_information.insert_row(
             connection,
             tracker_id,
@@ -0,0 +1,383 @@
+"""
+Salamander ALM
+Copyright (c) 2016  Djuro Drljaca
+
+This Python module is free software; you can redistribute it and/or modify it under the terms of the
+GNU General Public License as published by the Free Software Foundation; either version 2 of the
+License, or (at your option) any later version.
+
+This Python module is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License along with this library. If
+not, see <http://www.gnu.org/licenses/>.
+"""
+
+from artifactmanagement.artifact_comment_management import ArtifactCommentManagementInterface
+from artifactmanagement.artifact_management import ArtifactManagementInterface
+from authentication.authentication import AuthenticationInterface
+from authentication.basic_authentication_method import AuthenticationMethodBasic
+from database.database import DatabaseInterface
+from plugins.database.sqlite.database import DatabaseSqlite
+from projectmanagement.project_management import ProjectManagementInterface
+import rest_api
+from trackermanagement.tracker_management import TrackerManagementInterface
+import unittest
+
+
+class ArtifactCommentManagement(unittest.TestCase):
+    def setUp(self):
+        # Authentication
+        AuthenticationInterface.remove_all_authentication_methods()
+        AuthenticationInterface.add_authentication_method(AuthenticationMethodBasic())
+
+        # Database
+        DatabaseInterface.load_database_plugin(DatabaseSqlite("database.db"))
+        DatabaseInterface.create_new_database()
+
+        # Data members
+        self.__admin_user_id = 1
+        self.__client = rest_api.app.test_client()
+
+        project_id = ProjectManagementInterface.create_project(self.__admin_user_id,
+                                                               "test1",
+                                                               "Test 1",
+                                                               "Test project 1")
+        self.assertIsNotNone(project_id)
+
+        tracker_id = TrackerManagementInterface.create_tracker(self.__admin_user_id,
+                                                               project_id,
+                                                               "test1",
+                                                               "Test 1",
+                                                               "Test tracker 1")
+        self.assertIsNotNone(tracker_id)
+
+        self.__artifact_id1 = ArtifactManagementInterface.create_artifact(self.__admin_user_id,
+                                                                          tracker_id,
+                                                                          dict())
+        self.assertIsNotNone(self.__artifact_id1)
+
+        self.__artifact_id2 = ArtifactManagementInterface.create_artifact(self.__admin_user_id,
+                                                                          tracker_id,
+                                                                          dict())
+        self.assertIsNotNone(self.__artifact_id2)
+
+    def create_comment(self, artifact_id: int, text: str):
+        return ArtifactCommentManagementInterface.create_comment(self.__admin_user_id,
+                                                                 artifact_id,
+                                                                 text)
+
+    def login(self) -> dict:
+        response = self.__client.post("/api/usermanagement/login",
+                                      json={"user_name": "administrator",
+                                            "authentication_parameters": {
+                                                "password": "administrator"}})
+        self.assertEqual(response.status_code, 200)
+        return {"SALM-Session-Token": response.get_json()["session_token"]}
+
+    def test_create_comment(self):
+        # Positive tests ---------------------------------------------------------------------------
+        comment_id = self.create_comment(self.__artifact_id1, "Comment 1")
+        self.assertIsNotNone(comment_id)
+
+        comment = ArtifactCommentManagementInterface.read_comment_by_id(comment_id)
+        self.assertEqual(comment["id"], comment_id)
+        self.assertEqual(comment["artifact_id"], self.__artifact_id1)
+        self.assertEqual(comment["created_by"], self.__admin_user_id)
+        self.assertEqual(comment["text"], "Comment 1")
+        self.assertTrue(comment["active"])
+        self.assertEqual(comment["modified_on"], comment["created_on"])
+        self.assertEqual(comment["modified_by"], self.__admin_user_id)
+
+        self.assertIsNone(ArtifactCommentManagementInterface.read_comment_by_id(
+            comment_id,
+            comment["revision_id"] - 1))
+
+        # Negative tests ---------------------------------------------------------------------------
+        self.assertIsNone(self.create_comment(self.__artifact_id1, ""))
+        self.assertIsNone(self.create_comment(999, "Comment"))
+
+        self.assertTrue(ArtifactManagementInterface.deactivate_artifact(self.__admin_user_id,
+                                                                        self.__artifact_id2))
+        self.assertIsNone(self.create_comment(self.__artifact_id2, "Comment"))
+
+        self.assertIsNone(ArtifactCommentManagementInterface.read_comment_by_id(999))
+
+    def test_update_delete_comment(self):
+        comment_id = self.create_comment(self.__artifact_id1, "Original")
+        self.assertIsNotNone(comment_id)
+
+        original = ArtifactCommentManagementInterface.read_comment_by_id(comment_id)
+
+        # Positive tests ---------------------------------------------------------------------------
+        self.assertTrue(ArtifactCommentManagementInterface.update_comment(self.__admin_user_id,
+                                                                          comment_id,
+                                                                          "Edited"))
+
+        comment = ArtifactCommentManagementInterface.read_comment_by_id(comment_id)
+        self.assertEqual(comment["text"], "Edited")
+        self.assertEqual(comment["created_on"], original["created_on"])
+        self.assertGreater(comment["revision_id"], original["revision_id"])
+
+        # Previous version stays available
+        self.assertEqual(
+            ArtifactCommentManagementInterface.read_comment_by_id(
+                comment_id,
+                original["revision_id"])["text"],
+            "Original")
+
+        self.assertListEqual(
+            [x["text"] for x in ArtifactCommentManagementInterface.read_comments(
+                self.__artifact_id1)],
+            ["Edited"])
+
+        self.assertTrue(ArtifactCommentManagementInterface.delete_comment(self.__admin_user_id,
+                                                                          comment_id))
+
+        self.assertFalse(ArtifactCommentManagementInterface.read_comment_by_id(
+            comment_id)["active"])
+        self.assertListEqual(ArtifactCommentManagementInterface.read_comments(
+            self.__artifact_id1), [])
+        self.assertEqual(ArtifactCommentManagementInterface.read_comment_count(
+            self.__artifact_id1), 0)
+
+        history = ArtifactCommentManagementInterface.read_comment_history(comment_id)
+        self.assertListEqual([(x["text"], x["active"]) for x in history],
+                             [("Original", True), ("Edited", True), ("Edited", False)])
+        self.assertEqual(history[0]["revision_id"], original["revision_id"])
+        self.assertEqual(history[1]["modified_by"], self.__admin_user_id)
+
+        # Negative tests ---------------------------------------------------------------------------
+        self.assertFalse(ArtifactCommentManagementInterface.update_comment(self.__admin_user_id,
+                                                                           comment_id,
+                                                                           "Deleted"))
+        self.assertFalse(ArtifactCommentManagementInterface.delete_comment(self.__admin_user_id,
+                                                                           comment_id))
+
+        comment_id = self.create_comment(self.__artifact_id1, "Comment")
+        self.assertFalse(ArtifactCommentManagementInterface.update_comment(self.__admin_user_id,
+                                                                           comment_id,
+                                                                           ""))
+        self.assertFalse(ArtifactCommentManagementInterface.update_comment(self.__admin_user_id,
+                                                                           999,
+                                                                           "Comment"))
+        self.assertListEqual(ArtifactCommentManagementInterface.read_comment_history(999), [])
+
+    def test_read_comments(self):
+        comment_ids1 = list()
+
+        for index in range(7):
+            comment_ids1.append(self.create_comment(self.__artifact_id1,
+                                                    "Comment {0}".format(index)))
+            self.assertIsNotNone(comment_ids1[-1])
+
+        comment_id2 = self.create_comment(self.__artifact_id2, "Other")
+        self.assertIsNotNone(comment_id2)
+
+        self.assertTrue(ArtifactCommentManagementInterface.delete_comment(self.__admin_user_id,
+                                                                          comment_ids1[3]))
+        self.assertTrue(ArtifactCommentManagementInterface.update_comment(self.__admin_user_id,
+                                                                          comment_ids1[5],
+                                                                          "Edited"))
+
+        # Positive tests ---------------------------------------------------------------------------
+        self.assertEqual(ArtifactCommentManagementInterface.read_comment_count(
+            self.__artifact_id1), 6)
+
+        expected_ids = [x for x in reversed(comment_ids1) if x != comment_ids1[3]]
+
+        # Read all pages, newest comment first
+        page_ids = list()
+        pages = list()
+        before_comment_id = None
+
+        while True:
+            page = ArtifactCommentManagementInterface.read_comments(self.__artifact_id1,
+                                                                    before_comment_id,
+                                                                    4)
+
+            if len(page) == 0:
+                break
+
+            pages.append(len(page))
+            page_ids.extend([x["id"] for x in page])
+            before_comment_id = page[-1]["id"]
+
+        self.assertListEqual(pages, [4, 2])
+        self.assertListEqual(page_ids, expected_ids)
+
+        comments = ArtifactCommentManagementInterface.read_comments(self.__artifact_id1)
+        self.assertEqual(comments[0]["text"], "Comment 6")
+        self.assertEqual(comments[1]["text"], "Edited")
+        self.assertGreater(comments[1]["revision_id"], comments[0]["revision_id"])
+
+        # New comment does not shift the following pages
+        self.assertIsNotNone(self.create_comment(self.__artifact_id1, "Newest"))
+        self.assertListEqual(
+            [x["id"] for x in ArtifactCommentManagementInterface.read_comments(
+                self.__artifact_id1,
+                expected_ids[3],
+                4)],
+            expected_ids[4:])
+
+        self.assertListEqual(
+            [x["id"] for x in ArtifactCommentManagementInterface.read_comments(
+                self.__artifact_id2)],
+            [comment_id2])
+
+        # Negative tests ---------------------------------------------------------------------------
+        self.assertListEqual(ArtifactCommentManagementInterface.read_comments(999), [])
+        self.assertListEqual(ArtifactCommentManagementInterface.read_comments(self.__artifact_id1,
+                                                                              None,
+                                                                              0), [])
+        self.assertListEqual(
+            ArtifactCommentManagementInterface.read_comments(
+                self.__artifact_id1,
+                None,
+                ArtifactCommentManagementInterface.max_page_size + 1),
+            [])
+
+    def test_rest_api(self):
+        headers = self.login()
+
+        # Positive tests ---------------------------------------------------------------------------
+        comment_ids = list()
+
+        for text in ["First", "Second", "Third"]:
+            response = self.__client.post("/api/artifactmanagement/comment",
+                                          json={"artifact_id": self.__artifact_id1,
+                                                "text": text},
+                                          headers=headers)
+            self.assertEqual(response.status_code, 200)
+            comment_ids.append(response.get_json()["comment_id"])
+
+        response = self.__client.get("/api/artifactmanagement/comment",
+                                     query_string={"artifact_id": self.__artifact_id1,
+                                                   "page_size": 2},
+                                     headers=headers)
+        self.assertEqual(response.status_code, 200)
+        page = response.get_json()
+        self.assertListEqual([x["text"] for x in page["comments"]], ["Third", "Second"])
+        self.assertEqual(page["next_before_comment_id"], comment_ids[1])
+
+        response = self.__client.get("/api/artifactmanagement/comment",
+                                     query_string={"artifact_id": self.__artifact_id1,
+                                                   "before_comment_id": comment_ids[1],
+                                                   "page_size": 2},
+                                     headers=headers)
+        page = response.get_json()
+        self.assertListEqual([x["text"] for x in page["comments"]], ["First"])
+        self.assertIsNone(page["next_before_comment_id"])
+
+        response = self.__client.put("/api/artifactmanagement/comment",
+                                     json={"comment_id": comment_ids[0], "text": "Edited"},
+                                     headers=headers)
+        self.assertEqual(response.status_code, 200)
+
+        response = self.__client.get("/api/artifactmanagement/comment",
+                                     query_string={"comment_id": comment_ids[0]},
+                                     headers=headers)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.get_json()["text"], "Edited")
+
+        response = self.__client.delete("/api/artifactmanagement/comment",
+                                        query_string={"comment_id": comment_ids[0]},
+                                        headers=headers)
+        self.assertEqual(response.status_code, 200)
+
+        response = self.__client.get("/api/artifactmanagement/comment_history",
+                                     query_string={"comment_id": comment_ids[0]},
+                                     headers=headers)
+        self.assertEqual(response.status_code, 200)
+        self.assertListEqual([x["text"] for x in response.get_json()],
+                             ["First", "Edited", "Edited"])
+
+        # Negative tests ---------------------------------------------------------------------------
+        response = self.__client.get("/api/artifactmanagement/comment",
+                                     query_string={"artifact_id": self.__artifact_id1})
+        self.assertEqual(response.status_code, 400)
+
+        response = self.__client.get("/api/artifactmanagement/comment",
+                                     query_string={"artifact_id": self.__artifact_id1,
+                                                   "page_size": 0},
+                                     headers=headers)
+        self.assertEqual(response.status_code, 400)
+
+        response = self.__client.get("/api/artifactmanagement/comment",
+                                     query_string={"comment_id": 999},
+                                     headers=headers)
+        self.assertEqual(response.status_code, 404)
+
+        response = self.__client.post("/api/artifactmanagement/comment",
+                                      json={"artifact_id": 999, "text": "Comment"},
+                                      headers=headers)
+        self.assertEqual(response.status_code, 400)
+
+        response = self.__client.put("/api/artifactmanagement/comment",
+                                     json={"comment_id": comment_ids[0], "text": "Deleted"},
+                                     headers=headers)
+        self.assertEqual(response.status_code, 400)
+
+        response = self.__client.get("/api/artifactmanagement/comment_history",
+                                     query_string={"comment_id": 999},
+                                     headers=headers)
+        self.assertEqual(response.status_code, 404)
+
+    def test_rest_api_precondition(self):
+        headers = self.login()
+
+        comment_id = self.create_comment(self.__artifact_id1, "First")
+        self.assertIsNotNone(comment_id)
+
+        response = self.__client.get("/api/artifactmanagement/comment",
+                                     query_string={"comment_id": comment_id},
+                                     headers=headers)
+        self.assertEqual(response.status_code, 200)
+        etag = response.get_etag()[0]
+        self.assertTrue(etag.startswith("r{0}-".format(response.get_json()["revision_id"])))
+
+        # Positive tests ---------------------------------------------------------------------------
+        response = self.__client.put("/api/artifactmanagement/comment",
+                                     json={"comment_id": comment_id, "text": "Edited"},
+                                     headers=dict(headers, **{"If-Match": '"{0}"'.format(etag)}))
+        self.assertEqual(response.status_code, 200)
+
+        response = self.__client.get("/api/artifactmanagement/comment",
+                                     query_string={"comment_id": comment_id},
+                                     headers=headers)
+        new_etag = response.get_etag()[0]
+        self.assertNotEqual(new_etag, etag)
+
+        # Negative tests ---------------------------------------------------------------------------
+        # Modification based on an outdated version of the comment
+        response = self.__client.put("/api/artifactmanagement/comment",
+                                     json={"comment_id": comment_id, "text": "Overwritten"},
+                                     headers=dict(headers, **{"If-Match": '"{0}"'.format(etag)}))
+        self.assertEqual(response.status_code, 412)
+
+        response = self.__client.delete("/api/artifactmanagement/comment",
+                                        query_string={"comment_id": comment_id},
+                                        headers=dict(headers,
+                                                     **{"If-Match": '"{0}"'.format(etag)}))
+        self.assertEqual(response.status_code, 412)
+
+        response = self.__client.delete("/api/artifactmanagement/comment",
+                                        query_string={"comment_id": comment_id},
+                                        headers=dict(headers, **{"If-Match": '"invalid"'}))
+        self.assertEqual(response.status_code, 412)
+
+        self.assertListEqual(
+            [x["text"] for x in ArtifactCommentManagementInterface.read_comment_history(comment_id)],
+            ["First", "Edited"])
+
+        # Deletion based on the current version of the comment
+        response = self.__client.delete("/api/artifactmanagement/comment",
+                                        query_string={"comment_id": comment_id},
+                                        headers=dict(headers,
+                                                     **{"If-Match": '"{0}"'.format(new_etag)}))
+        self.assertEqual(response.status_code, 200)
+
+
+if __name__ == '__main__':
+    unittest.main()
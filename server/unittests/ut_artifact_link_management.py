@@ -0,0 +1,369 @@
+"""
+Salamander ALM
+Copyright (c) 2016  Djuro Drljaca
+
+This Python module is free software; you can redistribute it and/or modify it under the terms of the
+GNU General Public License as published by the Free Software Foundation; either version 2 of the
+License, or (at your option) any later version.
+
+This Python module is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License along with this library. If
+not, see <http://www.gnu.org/licenses/>.
+"""
+
+from artifactmanagement.artifact_link_management import ArtifactLinkManagementInterface
+from artifactmanagement.artifact_management import ArtifactManagementInterface
+from authentication.authentication import AuthenticationInterface
+from authentication.basic_authentication_method import AuthenticationMethodBasic
+from database.database import DatabaseInterface
+from database.tables.artifact_link import LinkDirection
+from plugins.database.sqlite.database import DatabaseSqlite
+from projectmanagement.project_management import ProjectManagementInterface
+from trackermanagement.tracker_management import TrackerManagementInterface
+import random
+import unittest
+
+
+class ArtifactLinkManagement(unittest.TestCase):
+    def setUp(self):
+        # Authentication
+        AuthenticationInterface.remove_all_authentication_methods()
+        AuthenticationInterface.add_authentication_method(AuthenticationMethodBasic())
+
+        # Database
+        DatabaseInterface.load_database_plugin(DatabaseSqlite("database.db"))
+        DatabaseInterface.create_new_database()
+
+        # Data members
+        self.__admin_user_id = 1
+
+        # Create a tracker for requirements and a tracker for test cases
+        project_id = ProjectManagementInterface.create_project(self.__admin_user_id,
+                                                               "test1",
+                                                               "Test 1",
+                                                               "Test project 1")
+        self.assertIsNotNone(project_id)
+
+        self.__requirements_id = TrackerManagementInterface.create_tracker(self.__admin_user_id,
+                                                                           project_id,
+                                                                           "req",
+                                                                           "Requirements",
+                                                                           "")
+        self.assertIsNotNone(self.__requirements_id)
+
+        self.__tests_id = TrackerManagementInterface.create_tracker(self.__admin_user_id,
+                                                                    project_id,
+                                                                    "test",
+                                                                    "Tests",
+                                                                    "")
+        self.assertIsNotNone(self.__tests_id)
+
+        # Requirements "r1" and "r2", specification "s1" (also in the requirements tracker) and
+        # test cases "t1", "t2" and "t3"
+        self.__artifact_ids = dict()
+
+        for name, tracker_id in [("r1", self.__requirements_id),
+                                 ("r2", self.__requirements_id),
+                                 ("s1", self.__requirements_id),
+                                 ("t1", self.__tests_id),
+                                 ("t2", self.__tests_id),
+                                 ("t3", self.__tests_id)]:
+            artifact_id = ArtifactManagementInterface.create_artifact(self.__admin_user_id,
+                                                                      tracker_id,
+                                                                      dict())
+            self.assertIsNotNone(artifact_id)
+            self.__artifact_ids[name] = artifact_id
+
+    def __create_link(self, source: str, target: str):
+        return ArtifactLinkManagementInterface.create_link(self.__admin_user_id,
+                                                           self.__artifact_ids[source],
+                                                           self.__artifact_ids[target])
+
+    def __create_graph(self) -> dict:
+        # Graph: r1 -> s1 -> t1, s1 -> t2, r1 -> t2 (two paths from r1 to t2), r2 -> t3
+        links = dict()
+
+        for source, target in [("r1", "s1"),
+                               ("s1", "t1"),
+                               ("s1", "t2"),
+                               ("r1", "t2"),
+                               ("r2", "t3")]:
+            link_id = self.__create_link(source, target)
+            self.assertIsNotNone(link_id)
+            links[(source, target)] = link_id
+
+        return links
+
+    def __traced(self, name: str, direction=LinkDirection.Downstream, tracker_id=None) -> list:
+        artifact_ids = ArtifactLinkManagementInterface.read_traced_artifact_ids(
+            self.__artifact_ids[name],
+            direction,
+            tracker_id)
+
+        names = [x for x in sorted(self.__artifact_ids.keys())
+                 if self.__artifact_ids[x] in artifact_ids]
+        self.assertEqual(len(names), len(artifact_ids))
+
+        return names
+
+    def test_create_link(self):
+        # Positive tests ---------------------------------------------------------------------------
+        link_id = self.__create_link("r1", "s1")
+        self.assertIsNotNone(link_id)
+        self.assertIsNotNone(self.__create_link("s1", "t1"))
+
+        # Negative tests ---------------------------------------------------------------------------
+        self.assertIsNone(self.__create_link("r1", "s1"))
+        self.assertIsNone(self.__create_link("r1", "r1"))
+        self.assertIsNone(self.__create_link("s1", "r1"))
+        self.assertIsNone(self.__create_link("t1", "r1"))
+        self.assertIsNone(ArtifactLinkManagementInterface.create_link(self.__admin_user_id,
+                                                                      self.__artifact_ids["r1"],
+                                                                      999))
+
+        self.assertTrue(ArtifactManagementInterface.deactivate_artifact(self.__admin_user_id,
+                                                                        self.__artifact_ids["t2"]))
+        self.assertIsNone(self.__create_link("s1", "t2"))
+
+    def test_delete_link(self):
+        link_id = self.__create_link("r1", "s1")
+        self.assertIsNotNone(link_id)
+
+        # Positive tests ---------------------------------------------------------------------------
+        self.assertTrue(ArtifactLinkManagementInterface.delete_link(self.__admin_user_id, link_id))
+        self.assertListEqual(self.__traced("r1"), [])
+
+        # Deleted link is activated again
+        self.assertEqual(self.__create_link("r1", "s1"), link_id)
+        self.assertListEqual(self.__traced("r1"), ["s1"])
+
+        # Negative tests ---------------------------------------------------------------------------
+        self.assertTrue(ArtifactLinkManagementInterface.delete_link(self.__admin_user_id, link_id))
+        self.assertFalse(ArtifactLinkManagementInterface.delete_link(self.__admin_user_id,
+                                                                     link_id))
+        self.assertFalse(ArtifactLinkManagementInterface.delete_link(self.__admin_user_id, 999))
+
+    def test_read_links(self):
+        links = self.__create_graph()
+
+        # Positive tests ---------------------------------------------------------------------------
+        downstream = ArtifactLinkManagementInterface.read_links(self.__artifact_ids["r1"])
+        self.assertListEqual([x["id"] for x in downstream],
+                             [links[("r1", "s1")], links[("r1", "t2")]])
+        self.assertEqual(downstream[0]["source_artifact_id"], self.__artifact_ids["r1"])
+        self.assertEqual(downstream[0]["target_artifact_id"], self.__artifact_ids["s1"])
+
+        upstream = ArtifactLinkManagementInterface.read_links(self.__artifact_ids["t2"],
+                                                              LinkDirection.Upstream)
+        self.assertListEqual([x["id"] for x in upstream],
+                             [links[("r1", "t2")], links[("s1", "t2")]])
+
+        # Links in an older revision
+        self.assertTrue(ArtifactLinkManagementInterface.delete_link(self.__admin_user_id,
+                                                                    links[("r1", "t2")]))
+
+        upstream_new = ArtifactLinkManagementInterface.read_links(self.__artifact_ids["t2"],
+                                                                  LinkDirection.Upstream)
+        self.assertListEqual([x["id"] for x in upstream_new], [links[("s1", "t2")]])
+
+        upstream_old = ArtifactLinkManagementInterface.read_links(self.__artifact_ids["t2"],
+                                                                  LinkDirection.Upstream,
+                                                                  max([x["revision_id"]
+                                                                       for x in upstream]))
+        self.assertListEqual(upstream_old, upstream)
+
+        # Negative tests ---------------------------------------------------------------------------
+        self.assertListEqual(ArtifactLinkManagementInterface.read_links(999), [])
+
+    def test_read_traced_artifact_ids(self):
+        links = self.__create_graph()
+
+        # Positive tests ---------------------------------------------------------------------------
+        self.assertListEqual(self.__traced("r1"), ["s1", "t1", "t2"])
+        self.assertListEqual(self.__traced("r1", tracker_id=self.__tests_id), ["t1", "t2"])
+        self.assertListEqual(self.__traced("t2", LinkDirection.Upstream), ["r1", "s1"])
+        self.assertListEqual(self.__traced("t1"), [])
+
+        # Artifact "t2" is still reachable from "r1" through "s1"
+        self.assertTrue(ArtifactLinkManagementInterface.delete_link(self.__admin_user_id,
+                                                                    links[("r1", "t2")]))
+        self.assertListEqual(self.__traced("r1"), ["s1", "t1", "t2"])
+
+        self.assertTrue(ArtifactLinkManagementInterface.delete_link(self.__admin_user_id,
+                                                                    links[("s1", "t2")]))
+        self.assertListEqual(self.__traced("r1"), ["s1", "t1"])
+        self.assertListEqual(self.__traced("t2", LinkDirection.Upstream), [])
+
+        # Inactive artifacts are not returned
+        self.assertTrue(ArtifactManagementInterface.deactivate_artifact(self.__admin_user_id,
+                                                                        self.__artifact_ids["s1"]))
+        self.assertListEqual(self.__traced("r1"), ["t1"])
+
+        # Negative tests ---------------------------------------------------------------------------
+        self.assertListEqual(ArtifactLinkManagementInterface.read_traced_artifact_ids(999), [])
+
+    def test_read_path(self):
+        self.__create_graph()
+
+        # Positive tests ---------------------------------------------------------------------------
+        self.assertListEqual(
+            ArtifactLinkManagementInterface.read_path(self.__artifact_ids["r1"],
+                                                      self.__artifact_ids["t1"]),
+            [self.__artifact_ids["r1"], self.__artifact_ids["s1"], self.__artifact_ids["t1"]])
+
+        self.assertListEqual(
+            ArtifactLinkManagementInterface.read_path(self.__artifact_ids["r1"],
+                                                      self.__artifact_ids["t2"]),
+            [self.__artifact_ids["r1"], self.__artifact_ids["t2"]])
+
+        # Negative tests ---------------------------------------------------------------------------
+        self.assertIsNone(ArtifactLinkManagementInterface.read_path(self.__artifact_ids["r2"],
+                                                                    self.__artifact_ids["t1"]))
+        self.assertIsNone(ArtifactLinkManagementInterface.read_path(self.__artifact_ids["t1"],
+                                                                    self.__artifact_ids["r1"]))
+
+    def test_read_coverage_matrix(self):
+        self.__create_graph()
+
+        uncovered_id = ArtifactManagementInterface.create_artifact(self.__admin_user_id,
+                                                                   self.__requirements_id,
+                                                                   dict())
+        self.assertIsNotNone(uncovered_id)
+
+        # Positive tests ---------------------------------------------------------------------------
+        matrix = ArtifactLinkManagementInterface.read_coverage_matrix(self.__requirements_id,
+                                                                      self.__tests_id)
+        ids = self.__artifact_ids
+        self.assertDictEqual(matrix, {ids["r1"]: [ids["t1"], ids["t2"]],
+                                      ids["r2"]: [ids["t3"]],
+                                      ids["s1"]: [ids["t1"], ids["t2"]],
+                                      uncovered_id: []})
+
+        matrix = ArtifactLinkManagementInterface.read_coverage_matrix(self.__tests_id,
+                                                                      self.__requirements_id,
+                                                                      LinkDirection.Upstream)
+        self.assertDictEqual(matrix, {ids["t1"]: [ids["r1"], ids["s1"]],
+                                      ids["t2"]: [ids["r1"], ids["s1"]],
+                                      ids["t3"]: [ids["r2"]]})
+
+        # Negative tests ---------------------------------------------------------------------------
+        self.assertDictEqual(ArtifactLinkManagementInterface.read_coverage_matrix(999,
+                                                                                  self.__tests_id),
+                             dict())
+
+    def test_iterate_traceability_matrix(self):
+        links = self.__create_graph()
+        ids = self.__artifact_ids
+
+        def read_matrix(*args):
+            cells = ArtifactLinkManagementInterface.iterate_traceability_matrix(*args)
+            self.assertIsNotNone(cells)
+            return [(x["artifact_id"], x["linked_artifact_id"], x["link_id"]) for x in cells]
+
+        matrix = [(ids["r1"], ids["t2"], links[("r1", "t2")]),
+                  (ids["r2"], ids["t3"], links[("r2", "t3")]),
+                  (ids["s1"], ids["t1"], links[("s1", "t1")]),
+                  (ids["s1"], ids["t2"], links[("s1", "t2")])]
+
+        # Link "r2 -> t3" is the last one that was created
+        revision_id = ArtifactLinkManagementInterface.read_links(ids["r2"])[0]["revision_id"]
+
+        # Positive tests ---------------------------------------------------------------------------
+        self.assertListEqual(read_matrix(self.__requirements_id, self.__tests_id), matrix)
+
+        self.assertListEqual(read_matrix(self.__tests_id,
+                                         self.__requirements_id,
+                                         LinkDirection.Upstream),
+                             [(ids["t1"], ids["s1"], links[("s1", "t1")]),
+                              (ids["t2"], ids["r1"], links[("r1", "t2")]),
+                              (ids["t2"], ids["s1"], links[("s1", "t2")]),
+                              (ids["t3"], ids["r2"], links[("r2", "t3")])])
+
+        # Matrix is read in chunks of artifacts
+        chunk_size = ArtifactLinkManagementInterface.matrix_chunk_size
+
+        try:
+            ArtifactLinkManagementInterface.matrix_chunk_size = 1
+            self.assertListEqual(read_matrix(self.__requirements_id, self.__tests_id), matrix)
+        finally:
+            ArtifactLinkManagementInterface.matrix_chunk_size = chunk_size
+
+        # Deleted links and inactive artifacts are left out, older revisions remain unchanged
+        self.assertTrue(ArtifactLinkManagementInterface.delete_link(self.__admin_user_id,
+                                                                    links[("s1", "t1")]))
+        self.assertTrue(ArtifactManagementInterface.deactivate_artifact(self.__admin_user_id,
+                                                                        ids["t3"]))
+
+        self.assertListEqual(read_matrix(self.__requirements_id, self.__tests_id),
+                             [(ids["r1"], ids["t2"], links[("r1", "t2")]),
+                              (ids["r2"], None, None),
+                              (ids["s1"], ids["t2"], links[("s1", "t2")])])
+
+        self.assertListEqual(read_matrix(self.__requirements_id,
+                                         self.__tests_id,
+                                         LinkDirection.Downstream,
+                                         revision_id),
+                             matrix)
+
+        # Negative tests ---------------------------------------------------------------------------
+        self.assertIsNone(ArtifactLinkManagementInterface.iterate_traceability_matrix(
+            999,
+            self.__tests_id))
+        self.assertIsNone(ArtifactLinkManagementInterface.iterate_traceability_matrix(
+            self.__requirements_id,
+            999))
+        self.assertIsNone(ArtifactLinkManagementInterface.iterate_traceability_matrix(
+            self.__requirements_id,
+            self.__tests_id,
+            LinkDirection.Downstream,
+            999))
+
+    def test_transitive_closure(self):
+        # Random links are created and deleted, the transitive closure must always match the
+        # artifacts that are found by following the links one by one
+        random_generator = random.Random(0)
+        artifact_ids = list(self.__artifact_ids.values())
+
+        for i in range(10):
+            artifact_id = ArtifactManagementInterface.create_artifact(self.__admin_user_id,
+                                                                      self.__requirements_id,
+                                                                      dict())
+            self.assertIsNotNone(artifact_id)
+            artifact_ids.append(artifact_id)
+
+        active_links = list()
+
+        for i in range(60):
+            if (len(active_links) > 0) and (random_generator.random() < 0.3):
+                link_id = active_links.pop(random_generator.randrange(len(active_links)))
+                self.assertTrue(ArtifactLinkManagementInterface.delete_link(self.__admin_user_id,
+                                                                            link_id))
+            else:
+                source, target = random_generator.sample(artifact_ids, 2)
+                link_id = ArtifactLinkManagementInterface.create_link(self.__admin_user_id,
+                                                                      source,
+                                                                      target)
+
+                if link_id is not None:
+                    active_links.append(link_id)
+
+        for artifact_id in artifact_ids:
+            reachable = set()
+            pending = [artifact_id]
+
+            while len(pending) > 0:
+                for link in ArtifactLinkManagementInterface.read_links(pending.pop()):
+                    if link["target_artifact_id"] not in reachable:
+                        reachable.add(link["target_artifact_id"])
+                        pending.append(link["target_artifact_id"])
+
+            self.assertListEqual(
+                ArtifactLinkManagementInterface.read_traced_artifact_ids(artifact_id),
+                sorted(reachable))
+
+
+if __name__ == '__main__':
+    unittest.main()
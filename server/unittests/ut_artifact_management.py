@@ -0,0 +1,337 @@
+"""
+Salamander ALM
+Copyright (c) 2016  Djuro Drljaca
+
+This Python module is free software; you can redistribute it and/or modify it under the terms of the
+GNU General Public License as published by the Free Software Foundation; either version 2 of the
+License, or (at your option) any later version.
+
+This Python module is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License along with this library. If
+not, see <http://www.gnu.org/licenses/>.
+"""
+
+from artifactmanagement.artifact_management import ArtifactManagementInterface, ArtifactSelection
+from authentication.authentication import AuthenticationInterface
+from authentication.basic_authentication_method import AuthenticationMethodBasic
+from database.database import DatabaseInterface
+from plugins.database.sqlite.database import DatabaseSqlite
+from projectmanagement.project_management import ProjectManagementInterface
+from trackermanagement.tracker_management import TrackerManagementInterface
+from trackermanagement.tracker_field_management import TrackerFieldManagementInterface
+import unittest
+
+
+class ArtifactInformation(unittest.TestCase):
+    def setUp(self):
+        # Authentication
+        AuthenticationInterface.remove_all_authentication_methods()
+        AuthenticationInterface.add_authentication_method(AuthenticationMethodBasic())
+
+        # Database
+        DatabaseInterface.load_database_plugin(DatabaseSqlite("database.db"))
+        DatabaseInterface.create_new_database()
+
+        # Data members
+        self.__admin_user_id = 1
+
+        # Create a tracker with two fields
+        project_id = ProjectManagementInterface.create_project(self.__admin_user_id,
+                                                               "test1",
+                                                               "Test 1",
+                                                               "Test project 1")
+        self.assertIsNotNone(project_id)
+
+        self.__tracker_id = TrackerManagementInterface.create_tracker(self.__admin_user_id,
+                                                                      project_id,
+                                                                      "test1",
+                                                                      "Test 1",
+                                                                      "Test tracker 1")
+        self.assertIsNotNone(self.__tracker_id)
+
+        self.__field_id1 = TrackerFieldManagementInterface.create_tracker_field(
+            self.__admin_user_id,
+            self.__tracker_id,
+            "title",
+            "Title",
+            "Title of the artifact",
+            "text",
+            True)
+        self.assertIsNotNone(self.__field_id1)
+
+        self.__field_id2 = TrackerFieldManagementInterface.create_tracker_field(
+            self.__admin_user_id,
+            self.__tracker_id,
+            "priority",
+            "Priority",
+            "Priority of the artifact",
+            "integer",
+            False)
+        self.assertIsNotNone(self.__field_id2)
+
+    def create_artifact_test1(self):
+        artifact_id = ArtifactManagementInterface.create_artifact(
+            self.__admin_user_id,
+            self.__tracker_id,
+            {self.__field_id1: "Artifact 1",
+             self.__field_id2: 1})
+        return artifact_id
+
+    def create_artifact_test2(self):
+        artifact_id = ArtifactManagementInterface.create_artifact(
+            self.__admin_user_id,
+            self.__tracker_id,
+            {self.__field_id1: "Artifact 2"})
+        return artifact_id
+
+    def test_read_all_artifact_ids(self):
+        # Create artifacts
+        artifact_id1 = self.create_artifact_test1()
+        self.assertIsNotNone(artifact_id1)
+
+        artifact1 = ArtifactManagementInterface.read_artifact_by_id(artifact_id1)
+        self.assertIsNotNone(artifact1)
+
+        artifact_id2 = self.create_artifact_test2()
+        self.assertIsNotNone(artifact_id2)
+
+        # Check active artifacts (latest revision)
+        artifact_ids = ArtifactManagementInterface.read_all_artifact_ids(self.__tracker_id,
+                                                                         ArtifactSelection.Active)
+        self.assertListEqual(artifact_ids, [artifact_id1, artifact_id2])
+
+        # Check active artifacts (revision from artifact1)
+        artifact_ids = ArtifactManagementInterface.read_all_artifact_ids(
+            self.__tracker_id,
+            ArtifactSelection.Active,
+            artifact1["revision_id"])
+        self.assertListEqual(artifact_ids, [artifact_id1])
+
+        # Deactivate artifact
+        self.assertTrue(ArtifactManagementInterface.deactivate_artifact(self.__admin_user_id,
+                                                                        artifact_id1))
+
+        artifact_ids = ArtifactManagementInterface.read_all_artifact_ids(self.__tracker_id,
+                                                                         ArtifactSelection.Active)
+        self.assertListEqual(artifact_ids, [artifact_id2])
+
+        artifact_ids = ArtifactManagementInterface.read_all_artifact_ids(
+            self.__tracker_id,
+            ArtifactSelection.Inactive)
+        self.assertListEqual(artifact_ids, [artifact_id1])
+
+        artifact_ids = ArtifactManagementInterface.read_all_artifact_ids(self.__tracker_id,
+                                                                         ArtifactSelection.All)
+        self.assertListEqual(artifact_ids, [artifact_id1, artifact_id2])
+
+    def test_read_artifact_by_id(self):
+        artifact_id1 = self.create_artifact_test1()
+        self.assertIsNotNone(artifact_id1)
+
+        # Positive tests ---------------------------------------------------------------------------
+        artifact1 = ArtifactManagementInterface.read_artifact_by_id(artifact_id1)
+
+        self.assertEqual(artifact1["id"], artifact_id1)
+        self.assertEqual(artifact1["tracker_id"], self.__tracker_id)
+        self.assertIsNotNone(artifact1["created_on"])
+        self.assertEqual(artifact1["created_by"], self.__admin_user_id)
+        self.assertEqual(artifact1["locked"], False)
+        self.assertEqual(artifact1["active"], True)
+        self.assertIsNotNone(artifact1["revision_id"])
+        self.assertDictEqual(artifact1["fields"], {self.__field_id1: "Artifact 1",
+                                                   self.__field_id2: 1})
+
+        self.assertIsNone(
+            ArtifactManagementInterface.read_artifact_by_id(artifact_id1,
+                                                            artifact1["revision_id"] - 1))
+
+        # Negative tests ---------------------------------------------------------------------------
+        self.assertIsNone(ArtifactManagementInterface.read_artifact_by_id(999))
+
+    def test_read_artifacts_information(self):
+        artifact_id1 = self.create_artifact_test1()
+        self.assertIsNotNone(artifact_id1)
+
+        artifact_id2 = self.create_artifact_test2()
+        self.assertIsNotNone(artifact_id2)
+
+        artifact2 = ArtifactManagementInterface.read_artifact_by_id(artifact_id2)
+
+        # Create multiple revisions of the first artifact
+        self.assertTrue(ArtifactManagementInterface.deactivate_artifact(self.__admin_user_id,
+                                                                        artifact_id1))
+        self.assertTrue(ArtifactManagementInterface.activate_artifact(self.__admin_user_id,
+                                                                      artifact_id1))
+        self.assertTrue(ArtifactManagementInterface.deactivate_artifact(self.__admin_user_id,
+                                                                        artifact_id1))
+
+        artifact1 = ArtifactManagementInterface.read_artifact_by_id(artifact_id1)
+
+        # Positive tests ---------------------------------------------------------------------------
+        artifacts = ArtifactManagementInterface.read_artifacts_information([artifact_id2,
+                                                                            artifact_id1])
+
+        self.assertEqual(len(artifacts), 2)
+        self.assertEqual(artifacts[0]["id"], artifact_id2)
+        self.assertEqual(artifacts[0]["revision_id"], artifact2["revision_id"])
+        self.assertTrue(artifacts[0]["active"])
+        self.assertEqual(artifacts[1]["id"], artifact_id1)
+        self.assertEqual(artifacts[1]["revision_id"], artifact1["revision_id"])
+        self.assertFalse(artifacts[1]["active"])
+
+        # Latest information in an older revision
+        artifacts = ArtifactManagementInterface.read_artifacts_information(
+            [artifact_id1],
+            artifact1["revision_id"] - 1)
+
+        self.assertEqual(len(artifacts), 1)
+        self.assertEqual(artifacts[0]["revision_id"], artifact1["revision_id"] - 1)
+        self.assertTrue(artifacts[0]["active"])
+
+        # Negative tests ---------------------------------------------------------------------------
+        self.assertListEqual(ArtifactManagementInterface.read_artifacts_information([999]), [])
+        self.assertListEqual(ArtifactManagementInterface.read_artifacts_information([]), [])
+
+    def test_create_artifact(self):
+        # Positive tests ---------------------------------------------------------------------------
+        self.assertIsNotNone(self.create_artifact_test1())
+
+        artifact_id = ArtifactManagementInterface.create_artifact(self.__admin_user_id,
+                                                                  self.__tracker_id,
+                                                                  dict())
+        self.assertIsNotNone(artifact_id)
+        self.assertDictEqual(ArtifactManagementInterface.read_artifact_by_id(artifact_id)["fields"],
+                             dict())
+
+        # Negative tests ---------------------------------------------------------------------------
+        self.assertIsNone(ArtifactManagementInterface.create_artifact(self.__admin_user_id,
+                                                                      self.__tracker_id,
+                                                                      {999: "Invalid field"}))
+
+        self.assertIsNone(ArtifactManagementInterface.create_artifact(self.__admin_user_id,
+                                                                      999,
+                                                                      {self.__field_id1: "Test"}))
+
+    def test_update_artifact_information(self):
+        artifact_id1 = self.create_artifact_test1()
+        self.assertIsNotNone(artifact_id1)
+
+        artifact1 = ArtifactManagementInterface.read_artifact_by_id(artifact_id1)
+
+        # Positive tests ---------------------------------------------------------------------------
+        self.assertTrue(ArtifactManagementInterface.update_artifact_information(
+            self.__admin_user_id,
+            artifact_id1,
+            {self.__field_id1: "Artifact 1 (updated)"},
+            False,
+            True))
+
+        artifact1_updated = ArtifactManagementInterface.read_artifact_by_id(artifact_id1)
+
+        self.assertGreater(artifact1_updated["revision_id"], artifact1["revision_id"])
+        self.assertDictEqual(artifact1_updated["fields"],
+                             {self.__field_id1: "Artifact 1 (updated)"})
+
+        # Previous revision must remain unchanged
+        artifact1_old = ArtifactManagementInterface.read_artifact_by_id(artifact_id1,
+                                                                        artifact1["revision_id"])
+        self.assertDictEqual(artifact1_old["fields"], artifact1["fields"])
+
+        # Lock the artifact
+        self.assertTrue(ArtifactManagementInterface.update_artifact_information(
+            self.__admin_user_id,
+            artifact_id1,
+            artifact1_updated["fields"],
+            True,
+            True))
+
+        # Negative tests ---------------------------------------------------------------------------
+        self.assertFalse(ArtifactManagementInterface.update_artifact_information(
+            self.__admin_user_id,
+            artifact_id1,
+            {self.__field_id1: "Locked"},
+            True,
+            True))
+
+        self.assertFalse(ArtifactManagementInterface.deactivate_artifact(self.__admin_user_id,
+                                                                         artifact_id1))
+
+        self.assertFalse(ArtifactManagementInterface.update_artifact_information(
+            self.__admin_user_id,
+            999,
+            dict(),
+            False,
+            True))
+
+    def test_unlock_artifact(self):
+        artifact_id1 = self.create_artifact_test1()
+        self.assertIsNotNone(artifact_id1)
+
+        artifact1 = ArtifactManagementInterface.read_artifact_by_id(artifact_id1)
+
+        self.assertTrue(ArtifactManagementInterface.update_artifact_information(
+            self.__admin_user_id,
+            artifact_id1,
+            artifact1["fields"],
+            True,
+            True))
+
+        # Negative tests ---------------------------------------------------------------------------
+        # Unlocking must not be combined with other modifications
+        self.assertFalse(ArtifactManagementInterface.update_artifact_information(
+            self.__admin_user_id,
+            artifact_id1,
+            {self.__field_id1: "Unlocked and modified"},
+            False,
+            True))
+
+        self.assertFalse(ArtifactManagementInterface.update_artifact_information(
+            self.__admin_user_id,
+            artifact_id1,
+            artifact1["fields"],
+            False,
+            False))
+
+        artifact1_locked = ArtifactManagementInterface.read_artifact_by_id(artifact_id1)
+        self.assertTrue(artifact1_locked["locked"])
+        self.assertTrue(artifact1_locked["active"])
+        self.assertDictEqual(artifact1_locked["fields"], artifact1["fields"])
+
+        # Positive tests ---------------------------------------------------------------------------
+        self.assertTrue(ArtifactManagementInterface.update_artifact_information(
+            self.__admin_user_id,
+            artifact_id1,
+            artifact1["fields"],
+            False,
+            True))
+
+        self.assertFalse(ArtifactManagementInterface.read_artifact_by_id(artifact_id1)["locked"])
+
+    def test_deactivate_activate_artifact(self):
+        artifact_id1 = self.create_artifact_test1()
+        self.assertIsNotNone(artifact_id1)
+
+        # Positive tests ---------------------------------------------------------------------------
+        self.assertTrue(ArtifactManagementInterface.deactivate_artifact(self.__admin_user_id,
+                                                                        artifact_id1))
+
+        artifact1 = ArtifactManagementInterface.read_artifact_by_id(artifact_id1)
+        self.assertFalse(artifact1["active"])
+        self.assertDictEqual(artifact1["fields"], {self.__field_id1: "Artifact 1",
+                                                   self.__field_id2: 1})
+
+        self.assertTrue(ArtifactManagementInterface.activate_artifact(self.__admin_user_id,
+                                                                      artifact_id1))
+        self.assertTrue(ArtifactManagementInterface.read_artifact_by_id(artifact_id1)["active"])
+
+        # Negative tests ---------------------------------------------------------------------------
+        self.assertFalse(ArtifactManagementInterface.activate_artifact(self.__admin_user_id,
+                                                                       artifact_id1))
+        self.assertFalse(ArtifactManagementInterface.activate_artifact(self.__admin_user_id, 999))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,309 @@
+"""
+Salamander ALM
+Copyright (c) 2016  Djuro Drljaca
+
+This Python module is free software; you can redistribute it and/or modify it under the terms of the
+GNU General Public License as published by the Free Software Foundation; either version 2 of the
+License, or (at your option) any later version.
+
+This Python module is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License along with this library. If
+not, see <http://www.gnu.org/licenses/>.
+"""
+
+from artifactmanagement.artifact_management import ArtifactManagementInterface
+from attachmentmanagement.attachment_file_store import AttachmentFileStore
+from attachmentmanagement.attachment_management import AttachmentManagementInterface
+from authentication.authentication import AuthenticationInterface
+from authentication.basic_authentication_method import AuthenticationMethodBasic
+from database.database import DatabaseInterface
+import hashlib
+import io
+import os
+from plugins.database.sqlite.database import DatabaseSqlite
+from projectmanagement.project_management import ProjectManagementInterface
+import rest_api
+import shutil
+import tempfile
+from trackermanagement.tracker_management import TrackerManagementInterface
+import unittest
+
+
+class AttachmentFileStorage(unittest.TestCase):
+    def setUp(self):
+        self.__directory = tempfile.mkdtemp()
+        self.__file_store = AttachmentFileStore(self.__directory)
+
+    def tearDown(self):
+        shutil.rmtree(self.__directory)
+
+    def test_store(self):
+        content = os.urandom(3 * AttachmentFileStore.chunk_size + 10)
+        content_hash = hashlib.sha256(content).hexdigest()
+
+        # Positive tests ---------------------------------------------------------------------------
+        stored = self.__file_store.store(io.BytesIO(content))
+        self.assertDictEqual(stored, {"content_hash": content_hash, "size": len(content)})
+        self.assertTrue(self.__file_store.exists(content_hash))
+
+        with open(self.__file_store.file_path(content_hash), "rb") as file:
+            self.assertEqual(file.read(), content)
+
+        # Same content is stored only once
+        self.assertDictEqual(self.__file_store.store(io.BytesIO(content)), stored)
+        self.assertEqual(len(os.listdir(os.path.dirname(
+            self.__file_store.file_path(content_hash)))), 1)
+
+        self.assertEqual(self.__file_store.store(io.BytesIO(b""))["size"], 0)
+
+        # Negative tests ---------------------------------------------------------------------------
+        self.assertIsNone(self.__file_store.store(io.BytesIO(content), len(content) - 1))
+        self.assertListEqual(os.listdir(os.path.join(self.__directory, "tmp")), [])
+
+        self.assertIsNone(self.__file_store.file_path("../" + content_hash[3:]))
+        self.assertFalse(self.__file_store.exists("0" * 64))
+
+
+class AttachmentManagement(unittest.TestCase):
+    def setUp(self):
+        # Authentication
+        AuthenticationInterface.remove_all_authentication_methods()
+        AuthenticationInterface.add_authentication_method(AuthenticationMethodBasic())
+
+        # Database
+        DatabaseInterface.load_database_plugin(DatabaseSqlite("database.db"))
+        DatabaseInterface.create_new_database()
+
+        # File store
+        self.__directory = tempfile.mkdtemp()
+        AttachmentManagementInterface.load_file_store(AttachmentFileStore(self.__directory))
+
+        # Data members
+        self.__admin_user_id = 1
+        self.__client = rest_api.app.test_client()
+
+        project_id = ProjectManagementInterface.create_project(self.__admin_user_id,
+                                                               "test1",
+                                                               "Test 1",
+                                                               "Test project 1")
+        self.assertIsNotNone(project_id)
+
+        tracker_id = TrackerManagementInterface.create_tracker(self.__admin_user_id,
+                                                               project_id,
+                                                               "test1",
+                                                               "Test 1",
+                                                               "Test tracker 1")
+        self.assertIsNotNone(tracker_id)
+
+        self.__artifact_id = ArtifactManagementInterface.create_artifact(self.__admin_user_id,
+                                                                         tracker_id,
+                                                                         dict())
+        self.assertIsNotNone(self.__artifact_id)
+
+    def tearDown(self):
+        shutil.rmtree(self.__directory)
+
+    def create_attachment(self, file_name: str, content: bytes):
+        return AttachmentManagementInterface.create_attachment(self.__admin_user_id,
+                                                               self.__artifact_id,
+                                                               file_name,
+                                                               io.BytesIO(content))
+
+    def login(self) -> dict:
+        response = self.__client.post("/api/usermanagement/login",
+                                      json={"user_name": "administrator",
+                                            "authentication_parameters": {
+                                                "password": "administrator"}})
+        self.assertEqual(response.status_code, 200)
+        return {"SALM-Session-Token": response.get_json()["session_token"]}
+
+    def test_create_attachment(self):
+        # Positive tests ---------------------------------------------------------------------------
+        attachment_id = self.create_attachment("test.txt", b"Test content")
+        self.assertIsNotNone(attachment_id)
+
+        attachment = AttachmentManagementInterface.read_attachment_by_id(attachment_id)
+        self.assertEqual(attachment["artifact_id"], self.__artifact_id)
+        self.assertEqual(attachment["created_by"], self.__admin_user_id)
+        self.assertEqual(attachment["file_name"], "test.txt")
+        self.assertEqual(attachment["content_hash"], hashlib.sha256(b"Test content").hexdigest())
+        self.assertEqual(attachment["size"], 12)
+        self.assertTrue(attachment["active"])
+
+        file_path = AttachmentManagementInterface.read_content_file_path(
+            attachment["content_hash"])
+
+        with open(file_path, "rb") as file:
+            self.assertEqual(file.read(), b"Test content")
+
+        # Attachments with the same content share the stored file
+        attachment_id2 = self.create_attachment("copy.txt", b"Test content")
+        self.assertIsNotNone(attachment_id2)
+
+        self.assertListEqual(
+            [x["id"] for x in AttachmentManagementInterface.read_attachments(self.__artifact_id)],
+            [attachment_id, attachment_id2])
+        self.assertEqual(
+            AttachmentManagementInterface.read_attachment_by_id(attachment_id2)["content_hash"],
+            attachment["content_hash"])
+
+        # Negative tests ---------------------------------------------------------------------------
+        self.assertIsNone(self.create_attachment("", b"Test"))
+        self.assertIsNone(self.create_attachment("../test.txt", b"Test"))
+        self.assertIsNone(AttachmentManagementInterface.create_attachment(self.__admin_user_id,
+                                                                          999,
+                                                                          "test.txt",
+                                                                          io.BytesIO(b"Test")))
+
+        max_file_size = AttachmentManagementInterface.max_file_size
+
+        try:
+            AttachmentManagementInterface.max_file_size = 3
+            self.assertIsNone(self.create_attachment("test.txt", b"Test"))
+        finally:
+            AttachmentManagementInterface.max_file_size = max_file_size
+
+        self.assertTrue(ArtifactManagementInterface.deactivate_artifact(self.__admin_user_id,
+                                                                        self.__artifact_id))
+        self.assertIsNone(self.create_attachment("test.txt", b"Test"))
+
+        self.assertIsNone(AttachmentManagementInterface.read_attachment_by_id(999))
+
+    def test_update_delete_attachment(self):
+        attachment_id = self.create_attachment("test.txt", b"Version 1")
+        self.assertIsNotNone(attachment_id)
+
+        version1 = AttachmentManagementInterface.read_attachment_by_id(attachment_id)
+
+        # Positive tests ---------------------------------------------------------------------------
+        self.assertTrue(AttachmentManagementInterface.update_attachment(self.__admin_user_id,
+                                                                        attachment_id,
+                                                                        "renamed.txt"))
+        renamed = AttachmentManagementInterface.read_attachment_by_id(attachment_id)
+        self.assertEqual(renamed["file_name"], "renamed.txt")
+        self.assertEqual(renamed["content_hash"], version1["content_hash"])
+
+        self.assertTrue(AttachmentManagementInterface.update_attachment(
+            self.__admin_user_id,
+            attachment_id,
+            "renamed.txt",
+            io.BytesIO(b"Version 2")))
+        version2 = AttachmentManagementInterface.read_attachment_by_id(attachment_id)
+        self.assertEqual(version2["content_hash"], hashlib.sha256(b"Version 2").hexdigest())
+
+        # Previous revision still refers to the previous content
+        self.assertDictEqual(
+            AttachmentManagementInterface.read_attachment_by_id(attachment_id,
+                                                                version1["revision_id"]),
+            version1)
+        self.assertIsNotNone(
+            AttachmentManagementInterface.read_content_file_path(version1["content_hash"]))
+
+        self.assertTrue(AttachmentManagementInterface.delete_attachment(self.__admin_user_id,
+                                                                        attachment_id))
+        self.assertFalse(AttachmentManagementInterface.read_attachment_by_id(attachment_id)[
+            "active"])
+        self.assertListEqual(AttachmentManagementInterface.read_attachments(self.__artifact_id),
+                             [])
+        self.assertEqual(
+            len(AttachmentManagementInterface.read_attachments(self.__artifact_id,
+                                                               version2["revision_id"])),
+            1)
+
+        # Negative tests ---------------------------------------------------------------------------
+        self.assertFalse(AttachmentManagementInterface.delete_attachment(self.__admin_user_id,
+                                                                         attachment_id))
+        self.assertFalse(AttachmentManagementInterface.update_attachment(self.__admin_user_id,
+                                                                         attachment_id,
+                                                                         "test.txt"))
+        self.assertFalse(AttachmentManagementInterface.delete_attachment(self.__admin_user_id,
+                                                                         999))
+
+    def test_rest_api(self):
+        headers = self.login()
+        content = os.urandom(100000)
+
+        # Positive tests ---------------------------------------------------------------------------
+        response = self.__client.post("/api/attachmentmanagement/attachment",
+                                      query_string={"artifact_id": self.__artifact_id,
+                                                    "file_name": "data.bin"},
+                                      data=content,
+                                      headers=headers)
+        self.assertEqual(response.status_code, 200)
+        attachment_id = response.get_json()["attachment_id"]
+
+        response = self.__client.get("/api/attachmentmanagement/attachment",
+                                     query_string={"artifact_id": self.__artifact_id},
+                                     headers=headers)
+        self.assertEqual(response.status_code, 200)
+        self.assertListEqual([x["id"] for x in response.get_json()], [attachment_id])
+
+        url = "/api/attachmentmanagement/attachment_content?attachment_id={0}".format(
+            attachment_id)
+        response = self.__client.get(url, headers=headers)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data, content)
+        self.assertEqual(response.get_etag()[0], hashlib.sha256(content).hexdigest())
+        self.assertIn("data.bin", response.headers["Content-Disposition"])
+
+        # Range request
+        response = self.__client.get(url, headers=dict(headers, Range="bytes=1000-1999"))
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(response.data, content[1000:2000])
+        self.assertEqual(response.headers["Content-Range"], "bytes 1000-1999/100000")
+
+        # Conditional request
+        response = self.__client.get(
+            url,
+            headers=dict(headers, **{"If-None-Match": '"{0}"'.format(
+                hashlib.sha256(content).hexdigest())}))
+        self.assertEqual(response.status_code, 304)
+
+        # Update and delete
+        response = self.__client.put("/api/attachmentmanagement/attachment",
+                                     query_string={"attachment_id": attachment_id,
+                                                   "file_name": "renamed.bin"},
+                                     headers=headers)
+        self.assertEqual(response.status_code, 200)
+
+        response = self.__client.get("/api/attachmentmanagement/attachment",
+                                     query_string={"attachment_id": attachment_id},
+                                     headers=headers)
+        self.assertEqual(response.get_json()["file_name"], "renamed.bin")
+        self.assertEqual(response.get_json()["size"], len(content))
+
+        response = self.__client.delete("/api/attachmentmanagement/attachment",
+                                        query_string={"attachment_id": attachment_id},
+                                        headers=headers)
+        self.assertEqual(response.status_code, 200)
+
+        # Negative tests ---------------------------------------------------------------------------
+        self.assertEqual(self.__client.get(url, headers=headers).status_code, 404)
+        self.assertEqual(self.__client.get(url).status_code, 400)
+
+        response = self.__client.post("/api/attachmentmanagement/attachment",
+                                      query_string={"artifact_id": 999,
+                                                    "file_name": "data.bin"},
+                                      data=content,
+                                      headers=headers)
+        self.assertEqual(response.status_code, 400)
+
+        max_file_size = AttachmentManagementInterface.max_file_size
+
+        try:
+            AttachmentManagementInterface.max_file_size = 10
+            response = self.__client.post("/api/attachmentmanagement/attachment",
+                                          query_string={"artifact_id": self.__artifact_id,
+                                                        "file_name": "data.bin"},
+                                          data=content,
+                                          headers=headers)
+            self.assertEqual(response.status_code, 413)
+        finally:
+            AttachmentManagementInterface.max_file_size = max_file_size
+
+
+if __name__ == '__main__':
+    unittest.main()
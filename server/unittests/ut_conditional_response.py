@@ -0,0 +1,110 @@
+"""
+Salamander ALM
+Copyright (c) 2016  Djuro Drljaca
+
+This Python module is free software; you can redistribute it and/or modify it under the terms of the
+GNU General Public License as published by the Free Software Foundation; either version 2 of the
+License, or (at your option) any later version.
+
+This Python module is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License along with this library. If
+not, see <http://www.gnu.org/licenses/>.
+"""
+
+from authentication.authentication import AuthenticationInterface
+from authentication.basic_authentication_method import AuthenticationMethodBasic
+from database.database import DatabaseInterface
+from plugins.database.sqlite.database import DatabaseSqlite
+from projectmanagement.project_management import ProjectManagementInterface
+import rest_api
+import unittest
+
+
+class ConditionalResponse(unittest.TestCase):
+    def setUp(self):
+        # Authentication
+        AuthenticationInterface.remove_all_authentication_methods()
+        AuthenticationInterface.add_authentication_method(AuthenticationMethodBasic())
+
+        # Database
+        DatabaseInterface.load_database_plugin(DatabaseSqlite("database.db"))
+        DatabaseInterface.create_new_database()
+
+        # Data members
+        self.__admin_user_id = 1
+        self.__client = rest_api.app.test_client()
+
+        response = self.__client.post("/api/usermanagement/login",
+                                      json={"user_name": "administrator",
+                                            "authentication_parameters": {
+                                                "password": "administrator"}})
+        self.assertEqual(response.status_code, 200)
+        self.__token = response.get_json()["session_token"]
+
+    def get(self, url: str, etag=None):
+        headers = {"SALM-Session-Token": self.__token}
+
+        if etag is not None:
+            headers["If-None-Match"] = '"{0}"'.format(etag)
+
+        return self.__client.get(url, headers=headers)
+
+    def test_content_etag(self):
+        response = self.get("/api/usermanagement/user")
+        self.assertEqual(response.status_code, 200)
+
+        etag = response.get_etag()[0]
+        self.assertIsNotNone(etag)
+        self.assertEqual(response.headers["Cache-Control"], "private, no-cache")
+
+        # Positive tests ---------------------------------------------------------------------------
+        response = self.get("/api/usermanagement/user", etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.data, b"")
+        self.assertEqual(response.get_etag()[0], etag)
+
+        # Negative tests ---------------------------------------------------------------------------
+        response = self.get("/api/usermanagement/user", "invalid")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.get_etag()[0], etag)
+
+        # Errors must not be answered with "304 Not Modified"
+        self.__client.post("/api/usermanagement/logout",
+                           headers={"SALM-Session-Token": self.__token})
+        response = self.get("/api/usermanagement/user", etag)
+        self.assertNotEqual(response.status_code, 304)
+
+    def test_revision_etag(self):
+        response = self.get("/api/searchmanagement/search?text=project")
+        self.assertEqual(response.status_code, 200)
+
+        etag = response.get_etag()[0]
+        self.assertTrue(etag.startswith("r"))
+
+        # Positive tests ---------------------------------------------------------------------------
+        response = self.get("/api/searchmanagement/search?text=project", etag)
+        self.assertEqual(response.status_code, 304)
+
+        # Negative tests ---------------------------------------------------------------------------
+        # Different parameters
+        response = self.get("/api/searchmanagement/search?text=project&limit=5", etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response.get_etag()[0], etag)
+
+        # New revision
+        self.assertIsNotNone(ProjectManagementInterface.create_project(self.__admin_user_id,
+                                                                       "test1",
+                                                                       "Test 1",
+                                                                       "Test project 1"))
+
+        response = self.get("/api/searchmanagement/search?text=project", etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response.get_etag()[0], etag)
+        self.assertEqual(len(response.get_json()), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,449 @@
+"""
+Salamander ALM
+Copyright (c) 2016  Djuro Drljaca
+
+This Python module is free software; you can redistribute it and/or modify it under the terms of the
+GNU General Public License as published by the Free Software Foundation; either version 2 of the
+License, or (at your option) any later version.
+
+This Python module is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License along with this library. If
+not, see <http://www.gnu.org/licenses/>.
+"""
+
+from artifactmanagement.artifact_management import ArtifactManagementInterface
+from authentication.authentication import AuthenticationInterface
+from authentication.basic_authentication_method import AuthenticationMethodBasic
+from database.database import DatabaseInterface
+import datetime
+import os
+from plugins.database.sqlite.database import DatabaseSqlite
+from plugins.database.sqlite.tables.text_content import TextContentTableSqlite
+import sqlite3
+import threading
+import time
+import unittest
+from usermanagement.user_management import UserManagementInterface
+import zlib
+
+
+# Schema of the first version of the database file
+DATABASE_VERSION_1_SCHEMA = [
+    ("CREATE TABLE user (\n"
+     "    id           INTEGER PRIMARY KEY AUTOINCREMENT\n"
+     "                         NOT NULL,\n"
+     "    user_name    TEXT    NOT NULL\n"
+     "                         CHECK (length(user_name) > 0),\n"
+     "    display_name TEXT    NOT NULL\n"
+     "                         CHECK (length(display_name) > 0),\n"
+     "    email        TEXT,\n"
+     "    active       BOOLEAN NOT NULL\n"
+     "                         CHECK ( (active = 0) OR\n"
+     "                                 (active = 1) )\n"
+     ")"),
+    ("CREATE INDEX user_ix_user_name ON user (\n"
+     "    user_name\n"
+     ")"),
+    ("CREATE INDEX user_ix_display_name ON user (\n"
+     "    display_name\n"
+     ")"),
+    ("CREATE TABLE user_authentication (\n"
+     "    user_id               INTEGER REFERENCES user (id)\n"
+     "                                  NOT NULL\n"
+     "                                  UNIQUE,\n"
+     "    authentication_type   TEXT    NOT NULL\n"
+     "                                  CHECK (length(authentication_type) > 0)\n"
+     ")"),
+    ("CREATE TABLE user_authentication_parameter (\n"
+     "    user_id     INTEGER REFERENCES user (id)\n"
+     "                        NOT NULL\n"
+     "                        UNIQUE,\n"
+     "    name        TEXT    NOT NULL,\n"
+     "    value       TEXT    NOT NULL\n"
+     ")"),
+    ("CREATE TABLE session_token (\n"
+     "    id          INTEGER PRIMARY KEY AUTOINCREMENT\n"
+     "                        NOT NULL,\n"
+     "    user_id     INTEGER REFERENCES user (id)\n"
+     "                        NOT NULL,\n"
+     "    created_on  TEXT    NOT NULL\n"
+     "                        CHECK (length(created_on) >= 23),\n"
+     "    token       TEXT    NOT NULL\n"
+     "                        UNIQUE\n"
+     "                        CHECK (length(token) = 32)\n"
+     ")"),
+    ("CREATE INDEX session_token_ix_user_id ON session_token (\n"
+     "    user_id\n"
+     ")"),
+    ("CREATE INDEX session_token_ix_created_on ON session_token (\n"
+     "    created_on\n"
+     ")"),
+    ("CREATE INDEX session_token_ix_token ON session_token (\n"
+     "    token\n"
+     ")"),
+    ("CREATE TABLE revision (\n"
+     "    id        INTEGER PRIMARY KEY AUTOINCREMENT\n"
+     "                      NOT NULL,\n"
+     "    timestamp TEXT    NOT NULL\n"
+     "                      CHECK (length(timestamp) >= 23),\n"
+     "    user_id   INTEGER REFERENCES user (id)\n"
+     "                      NOT NULL\n"
+     ")"),
+    ("CREATE TABLE project (\n"
+     "    id INTEGER PRIMARY KEY AUTOINCREMENT\n"
+     "               NOT NULL\n"
+     ")"),
+    ("CREATE TABLE project_information (\n"
+     "    id          INTEGER PRIMARY KEY AUTOINCREMENT\n"
+     "                        NOT NULL,\n"
+     "    project_id  INTEGER REFERENCES project (id)\n"
+     "                        NOT NULL,\n"
+     "    short_name  TEXT    NOT NULL\n"
+     "                        CHECK (length(short_name) > 0),\n"
+     "    full_name   TEXT    NOT NULL\n"
+     "                        CHECK (length(full_name) > 0),\n"
+     "    description TEXT,\n"
+     "    active      BOOLEAN NOT NULL\n"
+     "                        CHECK ( (active = 0) OR\n"
+     "                                (active = 1) ),\n"
+     "    revision_id INTEGER REFERENCES revision (id)\n"
+     "                        NOT NULL\n"
+     ")"),
+    ("CREATE INDEX project_information_ix_project_id ON project_information (\n"
+     "    project_id\n"
+     ")"),
+    ("CREATE INDEX project_information_ix_short_name ON project_information (\n"
+     "    short_name\n"
+     ")"),
+    ("CREATE INDEX project_information_ix_full_name ON project_information (\n"
+     "    full_name\n"
+     ")"),
+    ("CREATE TABLE tracker (\n"
+     "    id          INTEGER PRIMARY KEY AUTOINCREMENT\n"
+     "                        NOT NULL,\n"
+     "    project_id  INTEGER REFERENCES project (id)\n"
+     "                        NOT NULL\n"
+     ")"),
+    ("CREATE TABLE tracker_information (\n"
+     "    id          INTEGER PRIMARY KEY AUTOINCREMENT\n"
+     "                        NOT NULL,\n"
+     "    tracker_id  INTEGER REFERENCES tracker (id)\n"
+     "                        NOT NULL,\n"
+     "    short_name  TEXT    NOT NULL\n"
+     "                        CHECK (length(short_name) > 0),\n"
+     "    full_name   TEXT    NOT NULL\n"
+     "                        CHECK (length(full_name) > 0),\n"
+     "    description TEXT,\n"
+     "    active      BOOLEAN NOT NULL\n"
+     "                        CHECK ( (active = 0) OR\n"
+     "                                (active = 1) ),\n"
+     "    revision_id INTEGER REFERENCES revision (id)\n"
+     "                        NOT NULL\n"
+     ")"),
+    ("CREATE INDEX tracker_information_ix_tracker_id ON tracker_information (\n"
+     "    tracker_id\n"
+     ")"),
+    ("CREATE INDEX tracker_information_ix_short_name ON tracker_information (\n"
+     "    short_name\n"
+     ")"),
+    ("CREATE INDEX tracker_information_ix_full_name ON tracker_information (\n"
+     "    full_name\n"
+     ")"),
+    ("CREATE TABLE tracker_field (\n"
+     "    id          INTEGER PRIMARY KEY AUTOINCREMENT\n"
+     "                        NOT NULL,\n"
+     "    tracker_id  INTEGER REFERENCES tracker (id)\n"
+     "                        NOT NULL\n"
+     ")"),
+    ("CREATE TABLE tracker_field_information (\n"
+     "    id                  INTEGER PRIMARY KEY AUTOINCREMENT\n"
+     "                                NOT NULL,\n"
+     "    tracker_field_id    INTEGER REFERENCES tracker_field (id)\n"
+     "                                NOT NULL,\n"
+     "    name                TEXT    NOT NULL\n"
+     "                                CHECK (length(name) > 0),\n"
+     "    display_name        TEXT    NOT NULL\n"
+     "                                CHECK (length(display_name) > 0),\n"
+     "    description         TEXT,\n"
+     "    field_type          TEXT    NOT NULL\n"
+     "                                CHECK (length(field_type) > 0),\n"
+     "    required            BOOLEAN NOT NULL\n"
+     "                                CHECK ( (required = 0) OR\n"
+     "                                        (required = 1) ),\n"
+     "    active              BOOLEAN NOT NULL\n"
+     "                                CHECK ( (active = 0) OR\n"
+     "                                        (active = 1) ),\n"
+     "    revision_id         INTEGER REFERENCES revision (id)\n"
+     "                                NOT NULL\n"
+     ")"),
+    ("CREATE INDEX tracker_field_information_ix_tracker_field_id\n"
+     "ON tracker_field_information (\n"
+     "    tracker_field_id\n"
+     ")"),
+    ("CREATE INDEX tracker_field_information_ix_name ON tracker_field_information (\n"
+     "    name\n"
+     ")"),
+    ("CREATE INDEX tracker_field_information_ix_display_name\n"
+     "ON tracker_field_information (\n"
+     "    display_name\n"
+     ")"),
+]
+
+
+class DatabaseUpgrade(unittest.TestCase):
+    def setUp(self):
+        # Authentication
+        AuthenticationInterface.remove_all_authentication_methods()
+        AuthenticationInterface.add_authentication_method(AuthenticationMethodBasic())
+
+        # Database
+        DatabaseInterface.load_database_plugin(DatabaseSqlite("database.db"))
+        DatabaseInterface.create_new_database()
+
+    def create_database_version_1(self, database_file_path: str) -> sqlite3.Connection:
+        # Database file with the schema of the first version and a few objects
+        if os.path.exists(database_file_path):
+            os.remove(database_file_path)
+
+        connection = sqlite3.connect(database_file_path)
+
+        for statement in DATABASE_VERSION_1_SCHEMA:
+            connection.execute(statement)
+
+        timestamp = "2016-01-01T00:00:00.000000"
+
+        connection.execute("INSERT INTO user VALUES (1, 'administrator', 'Administrator', '', 1)")
+        connection.execute("INSERT INTO user_authentication VALUES (1, 'basic')")
+        connection.executemany("INSERT INTO revision VALUES (?, ?, 1)",
+                               [(revision_id, timestamp) for revision_id in range(1, 7)])
+        connection.execute("INSERT INTO session_token VALUES (1, 1, ?, ?)",
+                           (timestamp, "a" * 32))
+
+        connection.executemany("INSERT INTO project VALUES (?)", [(1,), (2,), (3,)])
+
+        long_description = "Long description of the project " * 100
+        connection.executemany(
+            "INSERT INTO project_information\n"
+            "   (project_id, short_name, full_name, description, active, revision_id)\n"
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            [(1, "p1", "Project 1", long_description, 1, 1),
+             (1, "p1", "Project 1", long_description, 0, 2),
+             (2, "p2", "Project 2", "Short description", 1, 3),
+             (3, "p3", "Project 3", None, 1, 4)])
+
+        connection.execute("INSERT INTO tracker VALUES (1, 2)")
+        connection.execute("INSERT INTO tracker_information\n"
+                           "   (tracker_id, short_name, full_name, description, active,\n"
+                           "    revision_id)\n"
+                           "VALUES (1, 't1', 'Tracker 1', NULL, 1, 5)")
+
+        connection.execute("INSERT INTO tracker_field VALUES (1, 1)")
+        connection.execute("INSERT INTO tracker_field_information\n"
+                           "   (tracker_field_id, name, display_name, description, field_type,\n"
+                           "    required, active, revision_id)\n"
+                           "VALUES (1, 'title', 'Title', NULL, 'text', 1, 1, 6)")
+
+        connection.execute("PRAGMA user_version = 1")
+        connection.commit()
+
+        return connection
+
+    @staticmethod
+    def read_schema(connection: sqlite3.Connection) -> dict:
+        # Columns of the tables and definitions of the indexes and triggers (SQL of the tables is
+        # not compared since it is changed by "ALTER TABLE")
+        schema = dict()
+
+        for row in connection.execute("SELECT type, name, tbl_name, sql\n"
+                                      "FROM sqlite_master").fetchall():
+            if row[0] == "table":
+                schema[row[1]] = [tuple(column) for column in connection.execute(
+                    "PRAGMA table_info({0})".format(row[1])).fetchall()]
+            else:
+                schema[row[1]] = (row[0], row[2], row[3])
+
+        return schema
+
+    def test_upgrade_database(self):
+        # Positive tests ---------------------------------------------------------------------------
+        # Latest version
+        self.assertTrue(DatabaseInterface.upgrade_database())
+
+        # Version 1
+        connection = self.create_database_version_1("database_v1.db")
+        descriptions = [row[0] for row in connection.execute(
+            "SELECT description FROM project_information ORDER BY id").fetchall()]
+
+        self.assertTrue(DatabaseSqlite("database_v1.db").upgrade_database())
+
+        self.assertEqual(connection.execute("PRAGMA user_version").fetchone()[0], 5)
+        self.assertIsNone(connection.execute(
+            "SELECT name\n"
+            "FROM sqlite_master\n"
+            "WHERE ((type = 'index') AND\n"
+            "       (name = 'session_token_ix_token'))").fetchone())
+
+        # Session tokens are discarded and the active objects are added to the search index
+        self.assertEqual(connection.execute("SELECT COUNT(*) FROM session_token").fetchone()[0], 0)
+        self.assertListEqual(
+            [tuple(row) for row in connection.execute(
+                "SELECT rowid, title FROM search_index ORDER BY rowid").fetchall()],
+            [(5, "t1 Tracker 1"),
+             (6, "title Title"),
+             (8, "p2 Project 2"),
+             (12, "p3 Project 3")])
+
+        # Descriptions are moved to the "text_content" table (each distinct text is stored once)
+        self.assertEqual(connection.execute("SELECT COUNT(*) FROM text_content").fetchone()[0], 2)
+
+        rows = connection.execute(
+            "SELECT PI.description_id, TC.content\n"
+            "FROM project_information AS PI\n"
+            "LEFT OUTER JOIN text_content AS TC\n"
+            "    ON (TC.id = PI.description_id)\n"
+            "ORDER BY PI.id").fetchall()
+
+        self.assertEqual(rows[0][0], rows[1][0])
+        self.assertIsInstance(rows[0][1], bytes)
+        self.assertEqual(zlib.decompress(rows[0][1]).decode("utf-8"), descriptions[0])
+        self.assertEqual(rows[2][1], descriptions[2])
+        self.assertIsNone(rows[3][0])
+
+        # Tables are recreated with the existing rows and they accept rows that only change the
+        # state
+        self.assertListEqual(
+            [tuple(row) for row in connection.execute(
+                "SELECT project_id, short_name, full_name, active, revision_id\n"
+                "FROM project_information\n"
+                "ORDER BY id").fetchall()],
+            [(1, "p1", "Project 1", 1, 1),
+             (1, "p1", "Project 1", 0, 2),
+             (2, "p2", "Project 2", 1, 3),
+             (3, "p3", "Project 3", 1, 4)])
+
+        self.assertIsNotNone(connection.execute(
+            "SELECT name\n"
+            "FROM sqlite_master\n"
+            "WHERE ((type = 'index') AND\n"
+            "       (name = 'project_information_ix_project_id_revision_id_attributes'))"
+        ).fetchone())
+
+        # Current names of the active projects are filled in
+        self.assertListEqual(
+            [tuple(row) for row in connection.execute(
+                "SELECT project_id, short_name, full_name\n"
+                "FROM project_current\n"
+                "ORDER BY project_id").fetchall()],
+            [(2, "p2", "Project 2"),
+             (3, "p3", "Project 3")])
+
+        # Search index trigger is recreated (foreign keys are not enforced on this connection)
+        TextContentTableSqlite.register_functions(connection)
+        connection.execute("INSERT INTO project_information\n"
+                           "   (project_id, short_name, full_name, description_id, active,\n"
+                           "    revision_id)\n"
+                           "VALUES (4, 'p4', 'Project 4', ?, 0, 5)", (rows[0][0],))
+        self.assertIsNone(
+            connection.execute("SELECT body FROM search_index WHERE (rowid = 16)").fetchone())
+
+        connection.execute("INSERT INTO project_information (project_id, active, revision_id)\n"
+                           "VALUES (4, 1, 6)")
+        self.assertEqual(
+            connection.execute("SELECT body FROM search_index WHERE (rowid = 16)").fetchone()[0],
+            descriptions[0])
+        self.assertTupleEqual(
+            tuple(connection.execute(
+                "SELECT short_name, full_name FROM project_current WHERE (project_id = 4)"
+            ).fetchone()),
+            ("p4", "Project 4"))
+
+        # Names of the active projects are unique
+        with self.assertRaises(sqlite3.IntegrityError):
+            connection.execute("INSERT INTO project_information\n"
+                               "   (project_id, short_name, full_name, active, revision_id)\n"
+                               "VALUES (5, 'p2', 'Project 5', 1, 7)")
+
+        # Upgraded database has the same schema as a new database
+        connection.commit()
+
+        new_connection = sqlite3.connect("database.db")
+        self.assertDictEqual(self.read_schema(connection), self.read_schema(new_connection))
+        new_connection.close()
+
+        # Upgraded database can be used
+        DatabaseInterface.load_database_plugin(DatabaseSqlite("database_v1.db"))
+
+        artifact_id = ArtifactManagementInterface.create_artifact(1, 1, {1: "Artifact 1"})
+        self.assertIsNotNone(artifact_id)
+        self.assertDictEqual(ArtifactManagementInterface.read_artifact_by_id(artifact_id)["fields"],
+                             {1: "Artifact 1"})
+
+        user_connection = DatabaseInterface.create_connection()
+        token = UserManagementInterface.create_session_token(user_connection, 1)
+        self.assertIsNotNone(UserManagementInterface.read_session_token(user_connection, token))
+
+        # Negative tests ---------------------------------------------------------------------------
+        # Unknown versions
+        connection.execute("PRAGMA user_version = 999")
+        connection.commit()
+        self.assertFalse(DatabaseSqlite("database_v1.db").upgrade_database())
+
+        connection.execute("PRAGMA user_version = 0")
+        connection.commit()
+        self.assertFalse(DatabaseSqlite("database_v1.db").upgrade_database())
+
+        connection.close()
+        os.remove("database_v1.db")
+
+
+
+class ConcurrentTransactions(unittest.TestCase):
+    def setUp(self):
+        # Authentication
+        AuthenticationInterface.remove_all_authentication_methods()
+        AuthenticationInterface.add_authentication_method(AuthenticationMethodBasic())
+
+        # Database
+        DatabaseInterface.load_database_plugin(DatabaseSqlite("database.db"))
+        DatabaseInterface.create_new_database()
+
+    def test_write_transactions(self):
+        connection1 = DatabaseInterface.create_connection()
+        results = list()
+
+        def write_revision():
+            # Waits for the write lock of the other connection
+            connection2 = DatabaseInterface.create_connection()
+
+            try:
+                connection2.begin_transaction(write=True)
+                results.append(
+                    DatabaseInterface.tables().revision.read_current_revision_id(connection2))
+                connection2.commit_transaction()
+            except sqlite3.OperationalError as e:
+                results.append(e)
+
+        # Positive tests ---------------------------------------------------------------------------
+        # Both connections first read and then write, the second one waits for the first one
+        self.assertTrue(connection1.begin_transaction(write=True))
+        revision_id = DatabaseInterface.tables().revision.read_current_revision_id(connection1)
+
+        thread = threading.Thread(target=write_revision)
+        thread.start()
+        time.sleep(0.2)
+        self.assertListEqual(results, [])
+
+        self.assertIsNotNone(DatabaseInterface.tables().revision.insert_row(
+            connection1,
+            datetime.datetime.utcnow(),
+            1))
+        self.assertTrue(connection1.commit_transaction())
+
+        thread.join()
+        self.assertListEqual(results, [revision_id + 1])
+
+if __name__ == '__main__':
+    unittest.main()
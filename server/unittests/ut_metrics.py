@@ -0,0 +1,213 @@
+"""
+Salamander ALM
+Copyright (c) 2016  Djuro Drljaca
+
+This Python module is free software; you can redistribute it and/or modify it under the terms of the
+GNU General Public License as published by the Free Software Foundation; either version 2 of the
+License, or (at your option) any later version.
+
+This Python module is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License along with this library. If
+not, see <http://www.gnu.org/licenses/>.
+"""
+
+from authentication.authentication import AuthenticationInterface
+from authentication.basic_authentication_method import AuthenticationMethodBasic
+from database.database import DatabaseInterface
+from metrics.metrics_registry import MetricsInterface, MetricsRegistry
+from plugins.database.sqlite.connection import ConnectionSqlite
+from plugins.database.sqlite.database import DatabaseSqlite
+from projectmanagement.project_management import ProjectManagementInterface
+import json
+import sqlite3
+import unittest
+
+
+class Registry(unittest.TestCase):
+    def test_export(self):
+        registry = MetricsRegistry()
+        registry.describe("requests_total", "Number of requests")
+        registry.increment_counter("requests_total", {"endpoint": "login"})
+        registry.increment_counter("requests_total", {"endpoint": "login"}, 2)
+        registry.set_gauge("info", {"text": "a \"quoted\" value"}, 1)
+        registry.observe_histogram("duration_seconds", {"endpoint": "login"}, 0.5, [0.1, 1.0])
+        registry.observe_histogram("duration_seconds", {"endpoint": "login"}, 0.1)
+        registry.observe_histogram("duration_seconds", {"endpoint": "login"}, 5.0)
+
+        # JSON
+        metrics = json.loads(registry.to_json())
+
+        self.assertListEqual(metrics["counters"], [{"name": "requests_total",
+                                                    "labels": {"endpoint": "login"},
+                                                    "value": 3.0}])
+        self.assertEqual(metrics["histograms"][0]["count"], 3)
+        self.assertAlmostEqual(metrics["histograms"][0]["sum"], 5.6)
+        self.assertListEqual(metrics["histograms"][0]["buckets"], [[0.1, 1], [1.0, 2], ["+Inf", 3]])
+
+        # Prometheus
+        lines = registry.to_prometheus().splitlines()
+
+        self.assertIn("# HELP requests_total Number of requests", lines)
+        self.assertIn("# TYPE requests_total counter", lines)
+        self.assertIn("requests_total{endpoint=\"login\"} 3.0", lines)
+        self.assertIn("info{text=\"a \\\"quoted\\\" value\"} 1.0", lines)
+        self.assertIn("# TYPE duration_seconds histogram", lines)
+        self.assertIn("duration_seconds_bucket{endpoint=\"login\",le=\"0.1\"} 1", lines)
+        self.assertIn("duration_seconds_bucket{endpoint=\"login\",le=\"+Inf\"} 3", lines)
+        self.assertIn("duration_seconds_count{endpoint=\"login\"} 3", lines)
+
+        # Reset
+        registry.reset()
+        self.assertDictEqual(registry.to_dict(), {"counters": [], "gauges": [], "histograms": []})
+
+    def test_series_limit(self):
+        registry = MetricsRegistry(max_series_per_metric=2)
+
+        for endpoint in ["login", "logout", "user", "login"]:
+            registry.increment_counter("requests_total", {"endpoint": endpoint})
+            registry.observe_histogram("duration_seconds", {"endpoint": endpoint}, 0.1)
+
+        # Updates of new series over the limit are dropped and counted
+        metrics = registry.to_dict()
+
+        self.assertListEqual([x["labels"] for x in metrics["counters"]
+                              if x["name"] == "requests_total"],
+                             [{"endpoint": "login"}, {"endpoint": "logout"}])
+        self.assertEqual(len(metrics["histograms"]), 2)
+
+        dropped = {x["labels"]["metric"]: x["value"]
+                   for x in metrics["counters"] if x["name"] == "metrics_dropped_updates_total"}
+
+        self.assertDictEqual(dropped, {"requests_total": 1.0, "duration_seconds": 1.0})
+
+
+class QueryMetrics(unittest.TestCase):
+    def setUp(self):
+        # Authentication
+        AuthenticationInterface.remove_all_authentication_methods()
+        AuthenticationInterface.add_authentication_method(AuthenticationMethodBasic())
+
+        # Database
+        DatabaseInterface.load_database_plugin(DatabaseSqlite("database.db"))
+        DatabaseInterface.create_new_database()
+
+        MetricsInterface.registry().reset()
+
+    def tearDown(self):
+        ConnectionSqlite.set_slow_query_threshold(0.1)
+        ConnectionSqlite.enable_instrumentation(True)
+
+    def test_query_metrics(self):
+        self.assertIsNotNone(ProjectManagementInterface.create_project(1, "test1", "Test 1", ""))
+        self.assertIsNotNone(ProjectManagementInterface.read_project_by_short_name("test1"))
+
+        metrics = MetricsInterface.registry().to_dict()
+
+        # Query counts are labeled by the table method
+        counts = {x["labels"]["method"]: x["value"]
+                  for x in metrics["counters"] if x["name"] == "salm_db_queries_total"}
+
+        self.assertEqual(counts["ProjectInformationTableSqlite.insert_row"], 1)
+        self.assertGreaterEqual(counts["ProjectInformationTableSqlite.read_information"], 1)
+        self.assertEqual(counts["ConnectionSqlite.begin_transaction"], 1)
+        self.assertEqual(counts["ConnectionSqlite.commit_transaction"], 1)
+
+        rows = {x["labels"]["method"]: x["value"]
+                for x in metrics["counters"] if x["name"] == "salm_db_query_rows_total"}
+
+        self.assertEqual(rows["ProjectInformationTableSqlite.insert_row"], 1)
+
+        # Statement shapes
+        statements = [x["labels"]["sql"]
+                      for x in metrics["gauges"] if x["name"] == "salm_db_statement_info"]
+        self.assertIn("BEGIN IMMEDIATE", statements)
+
+    def test_id_list_shape(self):
+        connection = DatabaseInterface.create_connection()
+
+        # Lists of IDs of different lengths have the same statement shape
+        for length in [2, 3, 10]:
+            user_ids = list(range(1, length + 1))
+            DatabaseInterface.tables().user.read_states(connection, user_ids)
+            DatabaseInterface.tables().project_information.read_states(connection, user_ids, 1)
+
+        metrics = MetricsInterface.registry().to_dict()
+
+        counts = [x for x in metrics["counters"]
+                  if (x["name"] == "salm_db_queries_total") and
+                  (x["labels"]["method"].endswith("TableSqlite.read_states"))]
+
+        self.assertEqual(len(counts), 2)
+        self.assertTrue(all([x["value"] == 3 for x in counts]))
+
+        statements = [x["labels"]["sql"]
+                      for x in metrics["gauges"] if x["name"] == "salm_db_statement_info"]
+
+        self.assertTrue(any(["IN (:user_id_N, ...)" in x for x in statements]))
+        self.assertTrue(any(["VALUES (:project_id_N), ...)" in x for x in statements]))
+
+    def test_row_count(self):
+        connection = DatabaseInterface.create_connection()
+
+        def read_rows(limit: int):
+            return connection.execute("SELECT id FROM revision LIMIT {0}".format(limit))
+
+        def row_count():
+            metrics = MetricsInterface.registry().to_dict()
+            return sum([x["value"] for x in metrics["counters"]
+                        if (x["name"] == "salm_db_query_rows_total") and
+                        (x["labels"]["method"].endswith("read_rows"))])
+
+        self.assertIsNotNone(ProjectManagementInterface.create_project(1, "test1", "Test 1", ""))
+        self.assertIsNotNone(ProjectManagementInterface.create_project(1, "test2", "Test 2", ""))
+
+        # Rows are counted while they are fetched
+        cursor = read_rows(3)
+        self.assertNotIsInstance(cursor, sqlite3.Cursor)
+        self.assertEqual(row_count(), 0)
+
+        self.assertIsNotNone(cursor.fetchone())
+        self.assertEqual(len(cursor.fetchall()), 2)
+        self.assertEqual(row_count(), 3)
+
+        # Partially fetched rows are recorded when the cursor is released
+        cursor = read_rows(2)
+        self.assertIsNotNone(cursor.fetchone())
+        del cursor
+        self.assertEqual(row_count(), 4)
+
+        # Iteration
+        self.assertEqual(len([row for row in read_rows(2)]), 2)
+        self.assertEqual(row_count(), 6)
+
+        # Native cursor is returned without instrumentation
+        ConnectionSqlite.enable_instrumentation(False)
+
+        cursor = read_rows(2)
+        self.assertIsInstance(cursor, sqlite3.Cursor)
+        self.assertEqual(len(cursor.fetchall()), 2)
+        self.assertEqual(row_count(), 6)
+
+    def test_slow_query_log(self):
+        ConnectionSqlite.set_slow_query_threshold(0.0)
+
+        with self.assertLogs("plugins.database.sqlite.connection", "WARNING") as logs:
+            ProjectManagementInterface.read_all_project_ids()
+
+        self.assertTrue(any(["ProjectInformationTableSqlite.read_all_project_ids" in x
+                             for x in logs.output]))
+
+    def test_disabled_instrumentation(self):
+        ConnectionSqlite.enable_instrumentation(False)
+
+        ProjectManagementInterface.read_all_project_ids()
+
+        self.assertDictEqual(MetricsInterface.registry().to_dict(),
+                             {"counters": [], "gauges": [], "histograms": []})
+
+
+if __name__ == '__main__':
+    unittest.main()
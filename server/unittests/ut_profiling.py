@@ -0,0 +1,206 @@
+"""
+Salamander ALM
+Copyright (c) 2016  Djuro Drljaca
+
+This Python module is free software; you can redistribute it and/or modify it under the terms of the
+GNU General Public License as published by the Free Software Foundation; either version 2 of the
+License, or (at your option) any later version.
+
+This Python module is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License along with this library. If
+not, see <http://www.gnu.org/licenses/>.
+"""
+
+from authentication.authentication import AuthenticationInterface
+from authentication.basic_authentication_method import AuthenticationMethodBasic
+from database.database import DatabaseInterface
+from metrics.metrics_registry import MetricsInterface
+from plugins.database.sqlite.database import DatabaseSqlite
+import os
+import rest_api
+import tempfile
+import unittest
+from usermanagement.user_management import UserManagementInterface
+
+
+class ProfilingMiddleware(unittest.TestCase):
+    def setUp(self):
+        # Authentication
+        AuthenticationInterface.remove_all_authentication_methods()
+        AuthenticationInterface.add_authentication_method(AuthenticationMethodBasic())
+
+        # Database
+        DatabaseInterface.load_database_plugin(DatabaseSqlite("database.db"))
+        DatabaseInterface.create_new_database()
+
+        # Metrics
+        MetricsInterface.registry().reset()
+
+        self.__client = rest_api.app.test_client()
+
+    def tearDown(self):
+        rest_api.profiling.set_profiling_key(None)
+        rest_api.profiling.set_profile_directory(None)
+
+    def login(self, headers=None, user_name="administrator", password="administrator"):
+        return self.__client.post("/api/usermanagement/login",
+                                  json={"user_name": user_name,
+                                        "authentication_parameters": {
+                                            "password": password}},
+                                  headers=headers)
+
+    def read_user(self, token: str, headers: dict):
+        request_headers = {"SALM-Session-Token": token}
+        request_headers.update(headers)
+
+        return self.__client.get("/api/usermanagement/user",
+                                 query_string={"user_id": 1},
+                                 headers=request_headers)
+
+    def test_server_timing(self):
+        # Positive tests ---------------------------------------------------------------------------
+        response = self.login()
+        self.assertEqual(response.status_code, 200)
+
+        server_timing = response.headers.get("Server-Timing")
+        self.assertIsNotNone(server_timing)
+        self.assertIn("total;dur=", server_timing)
+        self.assertIn("db;dur=", server_timing)
+        self.assertIn("auth;dur=", server_timing)
+        self.assertNotIn('desc="0 queries"', server_timing)
+
+        histograms = MetricsInterface.registry().to_dict()["histograms"]
+
+        durations = [x for x in histograms
+                     if (x["name"] == "salm_http_request_duration_seconds") and
+                     (x["labels"]["endpoint"] == "/api/usermanagement/login")]
+        self.assertEqual(len(durations), 1)
+        self.assertEqual(durations[0]["labels"]["method"], "POST")
+        self.assertEqual(durations[0]["labels"]["status"], "200")
+        self.assertEqual(durations[0]["count"], 1)
+
+        query_counts = [x for x in histograms if x["name"] == "salm_http_request_db_queries"]
+        self.assertEqual(len(query_counts), 1)
+        self.assertGreater(query_counts[0]["sum"], 0)
+
+        authentication_durations = [
+            x for x in histograms if x["name"] == "salm_http_request_auth_duration_seconds"]
+        self.assertEqual(len(authentication_durations), 1)
+        self.assertGreater(authentication_durations[0]["sum"], 0.0)
+
+    def test_profiling(self):
+        user_id = UserManagementInterface.create_user("jdoe",
+                                                      "John Doe",
+                                                      "john.doe@example.com",
+                                                      "basic",
+                                                      {"password": "test789"})
+        self.assertIsNotNone(user_id)
+
+        response = self.login()
+        self.assertEqual(response.status_code, 200)
+        token = response.get_json()["session_token"]
+
+        response = self.login(user_name="jdoe", password="test789")
+        self.assertEqual(response.status_code, 200)
+        user_token = response.get_json()["session_token"]
+
+        with tempfile.TemporaryDirectory() as profile_directory:
+            rest_api.profiling.set_profile_directory(profile_directory)
+
+            # Negative tests -----------------------------------------------------------------------
+            # Profiling is disabled by default
+            response = self.read_user(token, {"SALM-Profile": "cprofile",
+                                              "SALM-Profile-Key": "secret"})
+            self.assertEqual(response.status_code, 200)
+            self.assertNotIn("SALM-Profile-File", response.headers)
+
+            rest_api.profiling.set_profiling_key("secret")
+
+            # Invalid key
+            response = self.read_user(token, {"SALM-Profile": "cprofile",
+                                              "SALM-Profile-Key": "invalid"})
+            self.assertNotIn("SALM-Profile-File", response.headers)
+
+            # Missing key
+            response = self.read_user(token, {"SALM-Profile": "cprofile"})
+            self.assertNotIn("SALM-Profile-File", response.headers)
+
+            # Valid key without a session
+            response = self.login({"SALM-Profile": "cprofile",
+                                   "SALM-Profile-Key": "secret"})
+            self.assertEqual(response.status_code, 200)
+            self.assertNotIn("SALM-Profile-File", response.headers)
+
+            # Valid key with an invalid session
+            response = self.read_user("invalid", {"SALM-Profile": "cprofile",
+                                                  "SALM-Profile-Key": "secret"})
+            self.assertNotIn("SALM-Profile-File", response.headers)
+
+            # Valid key with a session of a user that is not the administrator
+            response = self.read_user(user_token, {"SALM-Profile": "cprofile",
+                                                   "SALM-Profile-Key": "secret"})
+            self.assertEqual(response.status_code, 200)
+            self.assertNotIn("SALM-Profile-File", response.headers)
+            self.assertListEqual(os.listdir(profile_directory), [])
+
+            # Positive tests -----------------------------------------------------------------------
+            response = self.read_user(token, {"SALM-Profile": "cprofile",
+                                              "SALM-Profile-Key": "secret"})
+            self.assertEqual(response.status_code, 200)
+
+            file_name = response.headers.get("SALM-Profile-File")
+            self.assertTrue(file_name.endswith(".pstats"))
+            self.assertTrue(os.path.isfile(os.path.join(profile_directory, file_name)))
+
+            response = self.read_user(token, {"SALM-Profile": "sample",
+                                              "SALM-Profile-Key": "secret"})
+            self.assertEqual(response.status_code, 200)
+
+            file_name = response.headers.get("SALM-Profile-File")
+            self.assertTrue(file_name.endswith(".folded"))
+            self.assertTrue(os.path.isfile(os.path.join(profile_directory, file_name)))
+
+    def test_profiling_administrator_identity(self):
+        rest_api.profiling.set_profiling_key("secret")
+
+        # Administrator is renamed and another user takes over its user name
+        self.assertTrue(UserManagementInterface.update_user_information(1,
+                                                                        "root",
+                                                                        "Administrator",
+                                                                        "",
+                                                                        True))
+        user_id = UserManagementInterface.create_user("administrator",
+                                                      "Impostor",
+                                                      "",
+                                                      "basic",
+                                                      {"password": "test789"})
+        self.assertIsNotNone(user_id)
+
+        with tempfile.TemporaryDirectory() as profile_directory:
+            rest_api.profiling.set_profile_directory(profile_directory)
+
+            # Negative tests -----------------------------------------------------------------------
+            response = self.login(user_name="administrator", password="test789")
+            self.assertEqual(response.status_code, 200)
+            token = response.get_json()["session_token"]
+
+            response = self.read_user(token, {"SALM-Profile": "cprofile",
+                                              "SALM-Profile-Key": "secret"})
+            self.assertEqual(response.status_code, 200)
+            self.assertNotIn("SALM-Profile-File", response.headers)
+
+            # Positive tests -----------------------------------------------------------------------
+            response = self.login(user_name="root")
+            self.assertEqual(response.status_code, 200)
+            token = response.get_json()["session_token"]
+
+            response = self.read_user(token, {"SALM-Profile": "cprofile",
+                                              "SALM-Profile-Key": "secret"})
+            self.assertEqual(response.status_code, 200)
+            self.assertIn("SALM-Profile-File", response.headers)
+
+if __name__ == '__main__':
+    unittest.main()
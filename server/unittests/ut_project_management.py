@@ -496,6 +496,123 @@ class ProjectInformation(unittest.TestCase):
         # Negative tests ---------------------------------------------------------------------------
         # There are no negative tests
 
+    def test_update_project_expected_revision(self):
+        project_id1 = self.create_project_test1()
+        self.assertIsNotNone(project_id1)
+
+        project1 = ProjectManagementInterface.read_project_by_id(project_id1)
+        self.assertIsNotNone(project1)
+
+        # Positive tests ---------------------------------------------------------------------------
+        self.assertTrue(ProjectManagementInterface.update_project_information(
+            self.__admin_user_id,
+            project_id1,
+            project1["short_name"],
+            project1["full_name"],
+            "Test project first",
+            project1["active"],
+            project1["revision_id"]))
+
+        project1_updated = ProjectManagementInterface.read_project_by_id(project_id1)
+        self.assertEqual(project1_updated["description"], "Test project first")
+
+        # Negative tests ---------------------------------------------------------------------------
+        # Update based on an outdated revision must not overwrite the previous update
+        self.assertFalse(ProjectManagementInterface.update_project_information(
+            self.__admin_user_id,
+            project_id1,
+            project1["short_name"],
+            project1["full_name"],
+            "Test project second",
+            project1["active"],
+            project1["revision_id"]))
+
+        # Change of the state is also a modification of the project
+        self.assertTrue(ProjectManagementInterface.deactivate_project(self.__admin_user_id,
+                                                                      project_id1))
+
+        self.assertFalse(ProjectManagementInterface.update_project_information(
+            self.__admin_user_id,
+            project_id1,
+            project1["short_name"],
+            project1["full_name"],
+            "Test project second",
+            True,
+            project1_updated["revision_id"]))
+
+        self.assertFalse(ProjectManagementInterface.update_project_information(
+            self.__admin_user_id,
+            999,
+            "test999",
+            "Test 999",
+            "Test project 999",
+            True,
+            project1["revision_id"]))
+
+        self.assertEqual(ProjectManagementInterface.read_project_by_id(project_id1)["description"],
+                         "Test project first")
+
+    def test_unique_names_of_active_projects(self):
+        project_id1 = self.create_project_test1()
+        self.assertIsNotNone(project_id1)
+
+        # Positive tests ---------------------------------------------------------------------------
+        # Names of an inactive project can be used by another project
+        self.assertTrue(ProjectManagementInterface.deactivate_project(self.__admin_user_id,
+                                                                      project_id1))
+
+        project_id2 = ProjectManagementInterface.create_project(self.__admin_user_id,
+                                                                "test1",
+                                                                "Test 1",
+                                                                "Test project 2")
+        self.assertIsNotNone(project_id2)
+
+        # Negative tests ---------------------------------------------------------------------------
+        # Inactive project can't be activated while its names are used by an active project
+        self.assertFalse(ProjectManagementInterface.activate_project(self.__admin_user_id,
+                                                                     project_id1))
+        self.assertDictEqual(ProjectManagementInterface.activate_projects(self.__admin_user_id,
+                                                                          [project_id1]),
+                             {project_id1: False})
+        self.assertFalse(ProjectManagementInterface.read_project_by_id(project_id1)["active"])
+
+        self.assertIsNone(ProjectManagementInterface.create_project(self.__admin_user_id,
+                                                                    "test3",
+                                                                    "Test 1",
+                                                                    "Test project 3"))
+
+        # Name conflict of a project doesn't prevent activation of the other projects in the batch
+        project_id3 = ProjectManagementInterface.create_project(self.__admin_user_id,
+                                                                "test3",
+                                                                "Test 3",
+                                                                "Test project 3")
+        self.assertIsNotNone(project_id3)
+        self.assertTrue(ProjectManagementInterface.deactivate_project(self.__admin_user_id,
+                                                                      project_id3))
+
+        self.assertDictEqual(ProjectManagementInterface.activate_projects(self.__admin_user_id,
+                                                                          [project_id1,
+                                                                           project_id3]),
+                             {project_id1: False,
+                              project_id3: True})
+        self.assertFalse(ProjectManagementInterface.read_project_by_id(project_id1)["active"])
+        self.assertTrue(ProjectManagementInterface.read_project_by_id(project_id3)["active"])
+
+        # Positive tests ---------------------------------------------------------------------------
+        # Project can be activated after its names are released
+        self.assertTrue(ProjectManagementInterface.update_project_information(
+            self.__admin_user_id,
+            project_id2,
+            "test2",
+            "Test 2",
+            "Test project 2",
+            True))
+
+        self.assertTrue(ProjectManagementInterface.activate_project(self.__admin_user_id,
+                                                                    project_id1))
+        self.assertEqual(ProjectManagementInterface.read_project_by_short_name("test1")["id"],
+                         project_id1)
+
     def test_deactivate_activate_project(self):
         project_id2 = self.create_project_test2()
         self.assertIsNotNone(project_id2)
@@ -539,5 +656,196 @@ class ProjectInformation(unittest.TestCase):
         # Negative tests ---------------------------------------------------------------------------
         # There are no negative tests
 
+    def test_deactivate_activate_projects(self):
+        project_id1 = self.create_project_test1()
+        self.assertIsNotNone(project_id1)
+
+        project_id2 = self.create_project_test2()
+        self.assertIsNotNone(project_id2)
+
+        project2 = ProjectManagementInterface.read_project_by_id(project_id2)
+
+        # Positive tests ---------------------------------------------------------------------------
+        # Deactivate all projects in a single revision (unknown projects are reported but not
+        # changed)
+        self.assertDictEqual(
+            ProjectManagementInterface.deactivate_projects(self.__admin_user_id,
+                                                           [project_id1, project_id2, 999]),
+            {project_id1: True, project_id2: True, 999: False})
+
+        self.assertListEqual(ProjectManagementInterface.read_all_project_ids(), [])
+
+        project1 = ProjectManagementInterface.read_project_by_id(project_id1)
+        self.assertEqual(project1["short_name"], "test1")
+        self.assertEqual(project1["full_name"], "Test 1")
+        self.assertEqual(project1["description"], "Test project 1")
+        self.assertFalse(project1["active"])
+        self.assertEqual(project1["revision_id"], project2["revision_id"] + 1)
+        self.assertEqual(ProjectManagementInterface.read_project_by_id(project_id2)["revision_id"],
+                         project1["revision_id"])
+
+        # Activate only the inactive and existing projects
+        self.assertTrue(ProjectManagementInterface.activate_project(self.__admin_user_id,
+                                                                    project_id1))
+
+        self.assertDictEqual(
+            ProjectManagementInterface.activate_projects(self.__admin_user_id,
+                                                         [project_id1, project_id2, 999]),
+            {project_id1: False, project_id2: True, 999: False})
+
+        self.assertListEqual(ProjectManagementInterface.read_all_project_ids(),
+                             [project_id1, project_id2])
+
+        # Deactivate only the active and existing projects
+        self.assertTrue(ProjectManagementInterface.deactivate_project(self.__admin_user_id,
+                                                                      project_id2))
+
+        self.assertDictEqual(
+            ProjectManagementInterface.deactivate_projects(self.__admin_user_id,
+                                                           [project_id1, project_id2, 999]),
+            {project_id1: True, project_id2: False, 999: False})
+
+        self.assertListEqual(ProjectManagementInterface.read_all_project_ids(), [])
+
+        # Negative tests ---------------------------------------------------------------------------
+        # Nothing to change (no revision is created)
+        revision_id = ProjectManagementInterface.read_project_by_id(project_id1)["revision_id"]
+
+        self.assertDictEqual(
+            ProjectManagementInterface.deactivate_projects(self.__admin_user_id,
+                                                           [project_id1, project_id2, 999]),
+            {project_id1: False, project_id2: False, 999: False})
+
+        connection = DatabaseInterface.create_connection()
+        self.assertEqual(
+            DatabaseInterface.tables().revision.read_current_revision_id(connection),
+            revision_id)
+
+    def test_description_storage(self):
+        description1 = "Long description of the project (\u00e4\u00f6\u00fc) " * 100
+        description2 = "Other description"
+
+        project_id = ProjectManagementInterface.create_project(self.__admin_user_id,
+                                                               "test1",
+                                                               "Test 1",
+                                                               description1)
+        self.assertIsNotNone(project_id)
+
+        project1 = ProjectManagementInterface.read_project_by_id(project_id)
+
+        # Positive tests ---------------------------------------------------------------------------
+        # New revisions with unchanged description reference the already stored text
+        self.assertTrue(ProjectManagementInterface.deactivate_project(self.__admin_user_id,
+                                                                      project_id))
+        self.assertTrue(ProjectManagementInterface.activate_project(self.__admin_user_id,
+                                                                    project_id))
+        self.assertTrue(ProjectManagementInterface.update_project_information(
+            self.__admin_user_id,
+            project_id,
+            "test1",
+            "Test 1",
+            description2,
+            True))
+        self.assertTrue(ProjectManagementInterface.update_project_information(
+            self.__admin_user_id,
+            project_id,
+            "test1",
+            "Test 1",
+            description1,
+            True))
+
+        connection = DatabaseInterface.create_connection()
+        rows = connection.execute("SELECT content FROM text_content ORDER BY id").fetchall()
+
+        self.assertEqual(len(rows), 2)
+        self.assertIsInstance(rows[0]["content"], bytes)
+        self.assertLess(len(rows[0]["content"]), len(description1))
+        self.assertEqual(rows[1]["content"], description2)
+
+        # Descriptions are read back in all revisions
+        self.assertEqual(ProjectManagementInterface.read_project_by_id(project_id)["description"],
+                         description1)
+        project = ProjectManagementInterface.read_project_by_id(project_id,
+                                                                project1["revision_id"] + 2)
+        self.assertEqual(project["description"], description1)
+        project = ProjectManagementInterface.read_project_by_id(project_id,
+                                                                project1["revision_id"] + 3)
+        self.assertEqual(project["description"], description2)
+
+        self.assertEqual(DatabaseInterface.tables().text_content.read_text(connection, 2),
+                         description2)
+
+        # Negative tests ---------------------------------------------------------------------------
+        self.assertIsNone(DatabaseInterface.tables().text_content.read_text(connection, 999))
+
+
+    def test_state_rows(self):
+        project_id = ProjectManagementInterface.create_project(self.__admin_user_id,
+                                                               "test1",
+                                                               "Test 1",
+                                                               "Test project 1")
+        self.assertIsNotNone(project_id)
+
+        # Positive tests ---------------------------------------------------------------------------
+        # Changes of the state only write the state of the project
+        self.assertTrue(ProjectManagementInterface.deactivate_project(self.__admin_user_id,
+                                                                      project_id))
+        self.assertTrue(ProjectManagementInterface.activate_project(self.__admin_user_id,
+                                                                    project_id))
+        self.assertTrue(ProjectManagementInterface.update_project_information(
+            self.__admin_user_id,
+            project_id,
+            "test1_updated",
+            "Test 1 (updated)",
+            None,
+            True))
+        self.assertTrue(ProjectManagementInterface.deactivate_project(self.__admin_user_id,
+                                                                      project_id))
+
+        connection = DatabaseInterface.create_connection()
+        rows = connection.execute("SELECT short_name, full_name, description_id, active\n"
+                                  "FROM project_information\n"
+                                  "ORDER BY id").fetchall()
+
+        self.assertListEqual([tuple(row) for row in rows],
+                             [("test1", "Test 1", 1, 1),
+                              (None, None, None, 0),
+                              (None, None, None, 1),
+                              ("test1_updated", "Test 1 (updated)", None, 1),
+                              (None, None, None, 0)])
+
+        # Attributes of the project are reconstructed in all revisions
+        project = ProjectManagementInterface.read_project_by_id(project_id)
+        self.assertEqual(project["short_name"], "test1_updated")
+        self.assertIsNone(project["description"])
+        self.assertFalse(project["active"])
+
+        created_revision_id = project["revision_id"] - 4
+
+        for revision_offset, active in [(0, True), (1, False), (2, True)]:
+            project = ProjectManagementInterface.read_project_by_id(
+                project_id,
+                created_revision_id + revision_offset)
+
+            self.assertEqual(project["short_name"], "test1")
+            self.assertEqual(project["description"], "Test project 1")
+            self.assertEqual(project["active"], active)
+
+        self.assertIsNone(ProjectManagementInterface.read_project_by_short_name("test1_updated"))
+        self.assertEqual(
+            len(ProjectManagementInterface.read_projects_by_short_name("test1_updated")), 1)
+        self.assertListEqual(ProjectManagementInterface.read_projects_by_short_name("test1"), [])
+
+        # Negative tests ---------------------------------------------------------------------------
+        row_count = len(rows)
+
+        self.assertFalse(ProjectManagementInterface.deactivate_project(self.__admin_user_id,
+                                                                       project_id))
+        self.assertFalse(ProjectManagementInterface.activate_project(self.__admin_user_id, 999))
+        self.assertEqual(
+            connection.execute("SELECT COUNT(*) FROM project_information").fetchone()[0],
+            row_count)
+
+
 if __name__ == '__main__':
     unittest.main()
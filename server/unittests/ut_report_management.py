@@ -0,0 +1,282 @@
+"""
+Salamander ALM
+Copyright (c) 2016  Djuro Drljaca
+
+This Python module is free software; you can redistribute it and/or modify it under the terms of the
+GNU General Public License as published by the Free Software Foundation; either version 2 of the
+License, or (at your option) any later version.
+
+This Python module is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License along with this library. If
+not, see <http://www.gnu.org/licenses/>.
+"""
+
+from artifactmanagement.artifact_management import ArtifactManagementInterface
+from authentication.authentication import AuthenticationInterface
+from authentication.basic_authentication_method import AuthenticationMethodBasic
+from database.database import DatabaseInterface
+from database.tables.artifact_report import ComparisonOperator, ReportFilterAnd, \
+    ReportFilterComparison, ReportFilterNot, ReportFilterOr
+from plugins.database.sqlite.database import DatabaseSqlite
+from projectmanagement.project_management import ProjectManagementInterface
+from reportmanagement.report_filter import ReportFilterError, ReportFilterParser
+from reportmanagement.report_management import ReportManagementInterface
+from trackermanagement.tracker_management import TrackerManagementInterface
+from trackermanagement.tracker_field_management import TrackerFieldManagementInterface
+import unittest
+
+
+class ReportFilterParsing(unittest.TestCase):
+    def setUp(self):
+        self.__tracker_field_ids = {"title": 1, "priority": 2}
+
+    def test_parse(self):
+        # Positive tests ---------------------------------------------------------------------------
+        self.assertIsNone(ReportFilterParser.parse("  ", self.__tracker_field_ids))
+
+        report_filter = ReportFilterParser.parse("priority >= -2.5", self.__tracker_field_ids)
+        self.assertIsInstance(report_filter, ReportFilterComparison)
+        self.assertEqual(report_filter.tracker_field_id, 2)
+        self.assertEqual(report_filter.operator, ComparisonOperator.GreaterOrEqual)
+        self.assertEqual(report_filter.value, -2.5)
+
+        # "AND" has a higher precedence than "OR"
+        report_filter = ReportFilterParser.parse(
+            "title = 'Won''t fix' or priority < 3 AND NOT not priority <> true",
+            self.__tracker_field_ids)
+        self.assertIsInstance(report_filter, ReportFilterOr)
+        self.assertEqual(report_filter.operands[0].value, "Won't fix")
+        self.assertIsInstance(report_filter.operands[1], ReportFilterAnd)
+        self.assertEqual(report_filter.operands[1].operands[0].value, 3)
+        self.assertEqual(report_filter.operands[1].operands[1].operator,
+                         ComparisonOperator.NotEqual)
+        self.assertIs(report_filter.operands[1].operands[1].value, True)
+
+        report_filter = ReportFilterParser.parse("NOT (title = \"a\" AND priority = 1)",
+                                                 self.__tracker_field_ids)
+        self.assertIsInstance(report_filter, ReportFilterNot)
+        self.assertIsInstance(report_filter.operand, ReportFilterAnd)
+
+        # Negative tests ---------------------------------------------------------------------------
+        for text in ["status = 1",
+                     "priority",
+                     "priority = ",
+                     "priority == 1",
+                     "priority = abc",
+                     "(priority = 1",
+                     "priority = 1)",
+                     "priority = 1 AND",
+                     "title = 'abc",
+                     "priority = 1 ; DROP TABLE artifact"]:
+            with self.assertRaises(ReportFilterError):
+                ReportFilterParser.parse(text, self.__tracker_field_ids)
+
+
+class ReportManagement(unittest.TestCase):
+    def setUp(self):
+        # Authentication
+        AuthenticationInterface.remove_all_authentication_methods()
+        AuthenticationInterface.add_authentication_method(AuthenticationMethodBasic())
+
+        # Database
+        DatabaseInterface.load_database_plugin(DatabaseSqlite("database.db"))
+        DatabaseInterface.create_new_database()
+
+        # Data members
+        self.__admin_user_id = 1
+
+        # Create a tracker with three fields and artifacts with all combinations of their values
+        project_id = ProjectManagementInterface.create_project(self.__admin_user_id,
+                                                               "test1",
+                                                               "Test 1",
+                                                               "Test project 1")
+        self.assertIsNotNone(project_id)
+
+        self.__tracker_id = TrackerManagementInterface.create_tracker(self.__admin_user_id,
+                                                                      project_id,
+                                                                      "test1",
+                                                                      "Test 1",
+                                                                      "Test tracker 1")
+        self.assertIsNotNone(self.__tracker_id)
+
+        self.__title_id = TrackerFieldManagementInterface.create_tracker_field(
+            self.__admin_user_id,
+            self.__tracker_id,
+            "title",
+            "Title",
+            "Title of the artifact",
+            "text",
+            True)
+        self.assertIsNotNone(self.__title_id)
+
+        self.__priority_id = TrackerFieldManagementInterface.create_tracker_field(
+            self.__admin_user_id,
+            self.__tracker_id,
+            "priority",
+            "Priority",
+            "Priority of the artifact",
+            "integer",
+            False)
+        self.assertIsNotNone(self.__priority_id)
+
+        self.__estimate_id = TrackerFieldManagementInterface.create_tracker_field(
+            self.__admin_user_id,
+            self.__tracker_id,
+            "estimate",
+            "Estimate",
+            "Estimated effort in days",
+            "real",
+            False)
+        self.assertIsNotNone(self.__estimate_id)
+
+        # Artifact "i" has title "Artifact i", priority "i % 3" and estimate "i / 2" (artifacts
+        # 1 and 2 don't have an estimate)
+        self.__artifact_ids = dict()
+
+        for i in range(1, 11):
+            fields = {self.__title_id: "Artifact {0}".format(i),
+                      self.__priority_id: i % 3}
+
+            if i > 2:
+                fields[self.__estimate_id] = i / 2
+
+            artifact_id = ArtifactManagementInterface.create_artifact(self.__admin_user_id,
+                                                                      self.__tracker_id,
+                                                                      fields)
+            self.assertIsNotNone(artifact_id)
+            self.__artifact_ids[i] = artifact_id
+
+    def __read_report(self, filter_expression: str) -> list:
+        artifacts = ReportManagementInterface.read_report(self.__tracker_id, filter_expression)
+        self.assertIsNotNone(artifacts)
+
+        ids = [artifact["id"] for artifact in artifacts]
+        self.assertListEqual(ids, sorted(ids))
+
+        return [x for x in range(1, 11) if self.__artifact_ids[x] in ids]
+
+    def test_read_report(self):
+        # Positive tests ---------------------------------------------------------------------------
+        self.assertListEqual(self.__read_report(""), list(range(1, 11)))
+        self.assertListEqual(self.__read_report("title = 'Artifact 4'"), [4])
+        self.assertListEqual(self.__read_report("priority = 0"), [3, 6, 9])
+        self.assertListEqual(self.__read_report("priority != 0"), [1, 2, 4, 5, 7, 8, 10])
+        self.assertListEqual(self.__read_report("estimate > 3"), [7, 8, 9, 10])
+        self.assertListEqual(self.__read_report("estimate >= 3"), [6, 7, 8, 9, 10])
+        self.assertListEqual(self.__read_report("estimate < 2"), [3])
+        self.assertListEqual(self.__read_report("estimate <= 2"), [3, 4])
+        self.assertListEqual(self.__read_report("title < 'Artifact 2'"), [1, 10])
+
+        # Integer and real values are comparable
+        self.assertListEqual(self.__read_report("priority < 0.5"), [3, 6, 9])
+        self.assertListEqual(self.__read_report("estimate = 4"), [8])
+
+        # Values of a different type don't match
+        self.assertListEqual(self.__read_report("priority = '1'"), [])
+
+        self.assertListEqual(self.__read_report("priority = 1 AND estimate > 2"), [7, 10])
+        self.assertListEqual(self.__read_report("priority = 1 OR estimate > 4"), [1, 4, 7, 9, 10])
+        self.assertListEqual(self.__read_report("priority = 1 AND NOT estimate > 4"), [1, 4, 7])
+        self.assertListEqual(self.__read_report("NOT priority = 1 AND NOT priority = 2"), [3, 6, 9])
+        self.assertListEqual(self.__read_report("NOT (priority = 1 OR priority = 2)"), [3, 6, 9])
+        self.assertListEqual(self.__read_report("(priority = 1 OR priority = 2) AND "
+                                                "NOT (estimate > 1 AND estimate < 5)"),
+                             [1, 2, 10])
+
+        # Negated filter also matches artifacts without the value
+        self.assertListEqual(self.__read_report("NOT estimate > 2"), [1, 2, 3, 4])
+        self.assertListEqual(self.__read_report("NOT estimate > 2 OR title = 'Artifact 9'"),
+                             [1, 2, 3, 4, 9])
+
+        # Negative tests ---------------------------------------------------------------------------
+        self.assertIsNone(ReportManagementInterface.read_report(self.__tracker_id, "status = 1"))
+        self.assertIsNone(ReportManagementInterface.read_report(self.__tracker_id, "priority ="))
+        self.assertIsNone(ReportManagementInterface.read_report(self.__tracker_id, "", limit=0))
+        self.assertIsNone(ReportManagementInterface.read_report(
+            self.__tracker_id,
+            "",
+            limit=ReportManagementInterface.max_limit + 1))
+
+        self.assertListEqual(ReportManagementInterface.read_report(999, ""), [])
+
+    def test_read_report_fields(self):
+        artifacts = ReportManagementInterface.read_report(self.__tracker_id, "title = 'Artifact 5'")
+        self.assertEqual(len(artifacts), 1)
+
+        artifact = ArtifactManagementInterface.read_artifact_by_id(self.__artifact_ids[5])
+
+        self.assertEqual(artifacts[0]["id"], artifact["id"])
+        self.assertEqual(artifacts[0]["tracker_id"], self.__tracker_id)
+        self.assertEqual(artifacts[0]["revision_id"], artifact["revision_id"])
+        self.assertFalse(artifacts[0]["locked"])
+        self.assertTrue(artifacts[0]["active"])
+        self.assertDictEqual(artifacts[0]["fields"], artifact["fields"])
+
+    def test_read_report_pagination(self):
+        # Positive tests ---------------------------------------------------------------------------
+        artifacts = ReportManagementInterface.read_report(self.__tracker_id, "priority != 0", 0, 3)
+        self.assertEqual([x["id"] for x in artifacts],
+                         [self.__artifact_ids[x] for x in [1, 2, 4]])
+
+        artifacts = ReportManagementInterface.read_report(self.__tracker_id,
+                                                          "priority != 0",
+                                                          artifacts[-1]["id"],
+                                                          3)
+        self.assertEqual([x["id"] for x in artifacts],
+                         [self.__artifact_ids[x] for x in [5, 7, 8]])
+
+        artifacts = ReportManagementInterface.iterate_report(self.__tracker_id,
+                                                             "NOT priority = 0",
+                                                             2)
+        self.assertEqual([x["id"] for x in artifacts],
+                         [self.__artifact_ids[x] for x in [1, 2, 4, 5, 7, 8, 10]])
+
+        artifacts = ReportManagementInterface.iterate_report(self.__tracker_id, "", 5)
+        self.assertEqual(len(list(artifacts)), 10)
+
+        # Artifact IDs are read in multiple chunks
+        id_chunk_size = ReportManagementInterface.id_chunk_size
+        ReportManagementInterface.id_chunk_size = 3
+
+        artifacts = ReportManagementInterface.iterate_report(self.__tracker_id, "priority != 0", 2)
+        self.assertEqual([x["id"] for x in artifacts],
+                         [self.__artifact_ids[x] for x in [1, 2, 4, 5, 7, 8, 10]])
+
+        ReportManagementInterface.id_chunk_size = id_chunk_size
+
+        # Negative tests ---------------------------------------------------------------------------
+        self.assertIsNone(ReportManagementInterface.iterate_report(self.__tracker_id, "x = 1"))
+        self.assertIsNone(ReportManagementInterface.iterate_report(self.__tracker_id, "", 0))
+
+    def test_read_report_current_revision(self):
+        # Update an artifact: only its latest field values must be matched
+        self.assertTrue(ArtifactManagementInterface.update_artifact_information(
+            self.__admin_user_id,
+            self.__artifact_ids[3],
+            {self.__title_id: "Artifact 3 (updated)", self.__priority_id: 2},
+            False,
+            True))
+
+        self.assertListEqual(self.__read_report("priority = 0"), [6, 9])
+        self.assertListEqual(self.__read_report("priority = 2"), [2, 3, 5, 8])
+        self.assertListEqual(self.__read_report("estimate < 2"), [])
+        self.assertListEqual(self.__read_report("title = 'Artifact 3 (updated)'"), [3])
+
+        # Inactive artifacts are not included in the report
+        self.assertTrue(ArtifactManagementInterface.deactivate_artifact(self.__admin_user_id,
+                                                                        self.__artifact_ids[6]))
+
+        self.assertListEqual(self.__read_report("priority = 0"), [9])
+        self.assertListEqual(self.__read_report("NOT priority = 2"), [1, 4, 7, 9, 10])
+
+        self.assertTrue(ArtifactManagementInterface.activate_artifact(self.__admin_user_id,
+                                                                      self.__artifact_ids[6]))
+
+        self.assertListEqual(self.__read_report("priority = 0"), [6, 9])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,126 @@
+"""
+Salamander ALM
+Copyright (c) 2016  Djuro Drljaca
+
+This Python module is free software; you can redistribute it and/or modify it under the terms of the
+GNU General Public License as published by the Free Software Foundation; either version 2 of the
+License, or (at your option) any later version.
+
+This Python module is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License along with this library. If
+not, see <http://www.gnu.org/licenses/>.
+"""
+
+from authentication.authentication import AuthenticationInterface
+from authentication.basic_authentication_method import AuthenticationMethodBasic
+from database.database import DatabaseInterface
+import datetime
+import flask.json.provider
+import gzip
+import json
+from plugins.database.sqlite.database import DatabaseSqlite
+import rest_api
+from rest_api import response_encoding
+from rest_api.response_encoding import ResponseEncoding
+import unittest
+
+
+class ResponseEncodings(unittest.TestCase):
+    def setUp(self):
+        # Authentication
+        AuthenticationInterface.remove_all_authentication_methods()
+        AuthenticationInterface.add_authentication_method(AuthenticationMethodBasic())
+
+        # Database
+        DatabaseInterface.load_database_plugin(DatabaseSqlite("database.db"))
+        DatabaseInterface.create_new_database()
+
+        # Compress all responses
+        ResponseEncoding.set_min_compressed_size(0)
+
+        self.__client = rest_api.app.test_client()
+
+        response = self.__client.post("/api/usermanagement/login",
+                                      json={"user_name": "administrator",
+                                            "authentication_parameters": {
+                                                "password": "administrator"}})
+        self.assertEqual(response.status_code, 200)
+        self.__token = response.get_json()["session_token"]
+
+    def tearDown(self):
+        ResponseEncoding.set_min_compressed_size(1024)
+
+    def get(self, url: str, headers: dict):
+        headers = dict(headers)
+        headers["SALM-Session-Token"] = self.__token
+
+        return self.__client.get(url, headers=headers)
+
+    def test_compression(self):
+        response = self.get("/api/usermanagement/user", {})
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn("Content-Encoding", response.headers)
+        self.assertIn("Accept-Encoding", response.headers["Vary"])
+
+        expected_user = response.get_json()
+        etag = response.get_etag()[0]
+
+        # Positive tests ---------------------------------------------------------------------------
+        response = self.get("/api/usermanagement/user", {"Accept-Encoding": "gzip"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.headers["Content-Encoding"], "gzip")
+        self.assertDictEqual(json.loads(gzip.decompress(response.data)), expected_user)
+        self.assertEqual(response.get_etag(), (etag, True))
+
+        # Weak ETag of the compressed response can be used for revalidation
+        response = self.get("/api/usermanagement/user", {"Accept-Encoding": "gzip",
+                                                         "If-None-Match": 'W/"{0}"'.format(etag)})
+        self.assertEqual(response.status_code, 304)
+
+        # Negative tests ---------------------------------------------------------------------------
+        response = self.get("/api/usermanagement/user", {"Accept-Encoding": "gzip;q=0"})
+        self.assertNotIn("Content-Encoding", response.headers)
+
+        response = self.get("/api/usermanagement/user", {"Accept-Encoding": "compress"})
+        self.assertNotIn("Content-Encoding", response.headers)
+
+    def test_binary_formats(self):
+        # Positive tests ---------------------------------------------------------------------------
+        if response_encoding.msgpack is not None:
+            response = self.get("/api/usermanagement/user", {"Accept": "application/msgpack"})
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.mimetype, "application/msgpack")
+            self.assertEqual(response_encoding.msgpack.unpackb(response.data)["id"], 1)
+
+        if response_encoding.cbor2 is not None:
+            response = self.get("/api/usermanagement/user", {"Accept": "application/cbor"})
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.mimetype, "application/cbor")
+            self.assertEqual(response_encoding.cbor2.loads(response.data)["id"], 1)
+
+        # Negative tests ---------------------------------------------------------------------------
+        # Unsupported format falls back to JSON
+        response = self.get("/api/usermanagement/user", {"Accept": "application/xml"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.mimetype, "application/json")
+        self.assertEqual(response.get_json()["id"], 1)
+
+    def test_json_provider(self):
+        data = {"b": [1, 2.5, None, True],
+                "a": "šđč",
+                "date": datetime.datetime(2016, 1, 2, 3, 4, 5)}
+
+        default_provider = flask.json.provider.DefaultJSONProvider(rest_api.app)
+
+        self.assertEqual(json.loads(rest_api.app.json.dumps(data)),
+                         json.loads(default_provider.dumps(data)))
+
+        with self.assertRaises(TypeError):
+            rest_api.app.json.dumps({"value": object()})
+
+
+if __name__ == '__main__':
+    unittest.main()
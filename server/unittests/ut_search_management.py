@@ -0,0 +1,151 @@
+"""
+Salamander ALM
+Copyright (c) 2016  Djuro Drljaca
+
+This Python module is free software; you can redistribute it and/or modify it under the terms of the
+GNU General Public License as published by the Free Software Foundation; either version 2 of the
+License, or (at your option) any later version.
+
+This Python module is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License along with this library. If
+not, see <http://www.gnu.org/licenses/>.
+"""
+
+from artifactmanagement.artifact_management import ArtifactManagementInterface
+from authentication.authentication import AuthenticationInterface
+from authentication.basic_authentication_method import AuthenticationMethodBasic
+from database.database import DatabaseInterface
+from database.tables.search_index import SearchObjectType
+from plugins.database.sqlite.database import DatabaseSqlite
+from projectmanagement.project_management import ProjectManagementInterface
+from searchmanagement.search_management import SearchManagementInterface
+from trackermanagement.tracker_management import TrackerManagementInterface
+from trackermanagement.tracker_field_management import TrackerFieldManagementInterface
+import unittest
+
+
+class Search(unittest.TestCase):
+    def setUp(self):
+        # Authentication
+        AuthenticationInterface.remove_all_authentication_methods()
+        AuthenticationInterface.add_authentication_method(AuthenticationMethodBasic())
+
+        # Database
+        DatabaseInterface.load_database_plugin(DatabaseSqlite("database.db"))
+        DatabaseInterface.create_new_database()
+
+        # Data members
+        self.__admin_user_id = 1
+
+        # Create a project with a tracker, a field and an artifact
+        self.__project_id = ProjectManagementInterface.create_project(
+            self.__admin_user_id,
+            "apollo",
+            "Apollo Program",
+            "Project for landing on the moon")
+        self.assertIsNotNone(self.__project_id)
+
+        self.__tracker_id = TrackerManagementInterface.create_tracker(
+            self.__admin_user_id,
+            self.__project_id,
+            "requirements",
+            "System Requirements",
+            "Requirements of the lunar module")
+        self.assertIsNotNone(self.__tracker_id)
+
+        self.__field_id = TrackerFieldManagementInterface.create_tracker_field(
+            self.__admin_user_id,
+            self.__tracker_id,
+            "title",
+            "Title",
+            "Title of the requirement",
+            "text",
+            True)
+        self.assertIsNotNone(self.__field_id)
+
+        self.__artifact_id = ArtifactManagementInterface.create_artifact(
+            self.__admin_user_id,
+            self.__tracker_id,
+            {self.__field_id: "Descent engine must be throttleable"})
+        self.assertIsNotNone(self.__artifact_id)
+
+    def test_search(self):
+        # Positive tests ---------------------------------------------------------------------------
+        results = SearchManagementInterface.search("apollo")
+        self.assertEqual(len(results), 1)
+        self.assertEqual(results[0]["object_type"], SearchObjectType.Project)
+        self.assertEqual(results[0]["object_id"], self.__project_id)
+        self.assertEqual(results[0]["title"], "apollo Apollo Program")
+
+        # Prefix and multiple keywords
+        results = SearchManagementInterface.search("throttle desc")
+        self.assertEqual(len(results), 1)
+        self.assertEqual(results[0]["object_type"], SearchObjectType.Artifact)
+        self.assertEqual(results[0]["object_id"], self.__artifact_id)
+
+        # Match in the title is ranked above the match in the description
+        results = SearchManagementInterface.search("requirement")
+        self.assertListEqual([(x["object_type"], x["object_id"]) for x in results],
+                             [(SearchObjectType.Tracker, self.__tracker_id),
+                              (SearchObjectType.TrackerField, self.__field_id)])
+
+        # Object type filter
+        results = SearchManagementInterface.search("lunar moon requirements",
+                                                   [SearchObjectType.Project])
+        self.assertListEqual(results, [])
+
+        results = SearchManagementInterface.search("lunar", [SearchObjectType.Project,
+                                                             SearchObjectType.Tracker])
+        self.assertEqual(len(results), 1)
+        self.assertEqual(results[0]["object_type"], SearchObjectType.Tracker)
+
+        # Pagination
+        results = SearchManagementInterface.search("requirement", limit=1, offset=1)
+        self.assertEqual(len(results), 1)
+        self.assertEqual(results[0]["object_type"], SearchObjectType.TrackerField)
+
+        # Negative tests ---------------------------------------------------------------------------
+        self.assertListEqual(SearchManagementInterface.search("gemini"), [])
+        self.assertListEqual(SearchManagementInterface.search(" \"* "), [])
+        self.assertListEqual(SearchManagementInterface.search("apollo", limit=0), [])
+        self.assertListEqual(SearchManagementInterface.search("apollo", offset=-1), [])
+
+    def test_search_after_update(self):
+        # Update project
+        self.assertTrue(ProjectManagementInterface.update_project_information(
+            self.__admin_user_id,
+            self.__project_id,
+            "artemis",
+            "Artemis Program",
+            None,
+            True))
+
+        self.assertListEqual(SearchManagementInterface.search("apollo"), [])
+        self.assertEqual(len(SearchManagementInterface.search("artemis")), 1)
+
+        # Update artifact
+        self.assertTrue(ArtifactManagementInterface.update_artifact_information(
+            self.__admin_user_id,
+            self.__artifact_id,
+            {self.__field_id: "Ascent engine"},
+            False,
+            True))
+
+        self.assertListEqual(SearchManagementInterface.search("descent"), [])
+        self.assertEqual(len(SearchManagementInterface.search("ascent")), 1)
+
+        # Inactive objects are not searchable
+        self.assertTrue(ArtifactManagementInterface.deactivate_artifact(self.__admin_user_id,
+                                                                        self.__artifact_id))
+        self.assertListEqual(SearchManagementInterface.search("ascent"), [])
+
+        self.assertTrue(ArtifactManagementInterface.activate_artifact(self.__admin_user_id,
+                                                                      self.__artifact_id))
+        self.assertEqual(len(SearchManagementInterface.search("ascent")), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,192 @@
+"""
+Salamander ALM
+Copyright (c) 2016  Djuro Drljaca
+
+This Python module is free software; you can redistribute it and/or modify it under the terms of the
+GNU General Public License as published by the Free Software Foundation; either version 2 of the
+License, or (at your option) any later version.
+
+This Python module is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License along with this library. If
+not, see <http://www.gnu.org/licenses/>.
+"""
+
+from artifactmanagement.artifact_link_management import ArtifactLinkManagementInterface
+from artifactmanagement.artifact_management import ArtifactManagementInterface
+from authentication.authentication import AuthenticationInterface
+from authentication.basic_authentication_method import AuthenticationMethodBasic
+from database.database import DatabaseInterface
+from plugins.database.sqlite.database import DatabaseSqlite
+from projectmanagement.project_management import ProjectManagementInterface
+from trackermanagement.tracker_management import TrackerManagementInterface
+import json
+import rest_api
+from rest_api.artifactmanagement.traceability_matrix import TraceabilityMatrix
+import unittest
+
+
+class TraceabilityMatrixExport(unittest.TestCase):
+    def setUp(self):
+        # Authentication
+        AuthenticationInterface.remove_all_authentication_methods()
+        AuthenticationInterface.add_authentication_method(AuthenticationMethodBasic())
+
+        # Database
+        DatabaseInterface.load_database_plugin(DatabaseSqlite("database.db"))
+        DatabaseInterface.create_new_database()
+
+        # Data members
+        self.__admin_user_id = 1
+        self.__client = rest_api.app.test_client()
+
+        response = self.__client.post("/api/usermanagement/login",
+                                      json={"user_name": "administrator",
+                                            "authentication_parameters": {
+                                                "password": "administrator"}})
+        self.assertEqual(response.status_code, 200)
+        self.__token = response.get_json()["session_token"]
+
+        # Requirements "r1" and "r2" and test cases "t1" and "t2" with links "r1 -> t1" and
+        # "r1 -> t2"
+        project_id = ProjectManagementInterface.create_project(self.__admin_user_id,
+                                                               "test1",
+                                                               "Test 1",
+                                                               "Test project 1")
+        self.assertIsNotNone(project_id)
+
+        self.__requirements_id = TrackerManagementInterface.create_tracker(self.__admin_user_id,
+                                                                           project_id,
+                                                                           "req",
+                                                                           "Requirements",
+                                                                           "")
+        self.assertIsNotNone(self.__requirements_id)
+
+        self.__tests_id = TrackerManagementInterface.create_tracker(self.__admin_user_id,
+                                                                    project_id,
+                                                                    "test",
+                                                                    "Tests",
+                                                                    "")
+        self.assertIsNotNone(self.__tests_id)
+
+        self.__ids = dict()
+
+        for name, tracker_id in [("r1", self.__requirements_id),
+                                 ("r2", self.__requirements_id),
+                                 ("t1", self.__tests_id),
+                                 ("t2", self.__tests_id)]:
+            self.__ids[name] = ArtifactManagementInterface.create_artifact(self.__admin_user_id,
+                                                                           tracker_id,
+                                                                           dict())
+            self.assertIsNotNone(self.__ids[name])
+
+        self.__link_ids = list()
+
+        for target in ["t1", "t2"]:
+            link_id = ArtifactLinkManagementInterface.create_link(self.__admin_user_id,
+                                                                  self.__ids["r1"],
+                                                                  self.__ids[target])
+            self.assertIsNotNone(link_id)
+            self.__link_ids.append(link_id)
+
+    def get(self, parameters: dict, headers=None):
+        request_headers = {"SALM-Session-Token": self.__token}
+
+        if headers is not None:
+            request_headers.update(headers)
+
+        return self.__client.get("/api/artifactmanagement/traceability_matrix",
+                                 query_string=parameters,
+                                 headers=request_headers)
+
+    def test_export_csv(self):
+        parameters = {"tracker_id": self.__requirements_id,
+                      "linked_tracker_id": self.__tests_id}
+
+        # Positive tests ---------------------------------------------------------------------------
+        response = self.get(parameters)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.is_streamed)
+        self.assertEqual(response.mimetype, "text/csv")
+        self.assertIn("attachment", response.headers["Content-Disposition"])
+        revision_id = int(response.headers["SALM-Revision-Id"])
+
+        expected = ("artifact_id,linked_artifact_id,link_id\n"
+                    "{0},{1},{2}\n"
+                    "{0},{3},{4}\n"
+                    "{5},,\n").format(self.__ids["r1"],
+                                      self.__ids["t1"],
+                                      self.__link_ids[0],
+                                      self.__ids["t2"],
+                                      self.__link_ids[1],
+                                      self.__ids["r2"])
+        self.assertEqual(response.get_data(as_text=True), expected)
+
+        # Response is split into chunks
+        cells_per_chunk = TraceabilityMatrix.cells_per_chunk
+
+        try:
+            TraceabilityMatrix.cells_per_chunk = 1
+            response = self.get(parameters)
+            self.assertEqual(len(list(response.response)), 3)
+        finally:
+            TraceabilityMatrix.cells_per_chunk = cells_per_chunk
+
+        # Export of a revision stays the same after the links are modified
+        self.assertTrue(ArtifactLinkManagementInterface.delete_link(self.__admin_user_id,
+                                                                    self.__link_ids[0]))
+
+        response = self.get(parameters)
+        self.assertGreater(int(response.headers["SALM-Revision-Id"]), revision_id)
+        self.assertNotEqual(response.get_data(as_text=True), expected)
+
+        response = self.get(dict(parameters, revision_id=revision_id))
+        self.assertEqual(int(response.headers["SALM-Revision-Id"]), revision_id)
+        self.assertEqual(response.get_data(as_text=True), expected)
+
+        # Negative tests ---------------------------------------------------------------------------
+        self.assertEqual(self.get({"tracker_id": self.__requirements_id}).status_code, 400)
+        self.assertEqual(self.get(dict(parameters, direction="sideways")).status_code, 400)
+        self.assertEqual(self.get(dict(parameters, format="xml")).status_code, 400)
+        self.assertEqual(self.get(dict(parameters, tracker_id=999)).status_code, 404)
+        self.assertEqual(self.get(dict(parameters, revision_id=999)).status_code, 404)
+
+        response = self.__client.get("/api/artifactmanagement/traceability_matrix",
+                                     query_string=parameters,
+                                     headers={"SALM-Session-Token": "invalid"})
+        self.assertEqual(response.status_code, 400)
+
+    def test_export_ndjson(self):
+        parameters = {"tracker_id": self.__tests_id,
+                      "linked_tracker_id": self.__requirements_id,
+                      "direction": "upstream"}
+
+        expected = [{"artifact_id": self.__ids["t1"],
+                     "linked_artifact_id": self.__ids["r1"],
+                     "link_id": self.__link_ids[0]},
+                    {"artifact_id": self.__ids["t2"],
+                     "linked_artifact_id": self.__ids["r1"],
+                     "link_id": self.__link_ids[1]}]
+
+        # Positive tests ---------------------------------------------------------------------------
+        response = self.get(dict(parameters, format="ndjson"))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.mimetype, "application/x-ndjson")
+        rows = [json.loads(x) for x in response.get_data(as_text=True).splitlines()]
+        self.assertListEqual(rows, expected)
+
+        # Format is negotiated with the Accept header
+        response = self.get(parameters, {"Accept": "application/x-ndjson"})
+        self.assertEqual(response.mimetype, "application/x-ndjson")
+
+        response = self.get(parameters, {"Accept": "text/csv"})
+        self.assertEqual(response.mimetype, "text/csv")
+
+        # Negative tests ---------------------------------------------------------------------------
+        self.assertEqual(self.get(dict(parameters, tracker_id="abc")).status_code, 400)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -926,5 +926,98 @@ class TrackerFieldInformation(unittest.TestCase):
         # Negative tests ---------------------------------------------------------------------------
         # There are no negative tests
 
+    def test_deactivate_activate_tracker_fields(self):
+        project_id1 = self.create_project_test1()
+        self.assertIsNotNone(project_id1)
+
+        tracker_id1 = self.create_tracker_test1(project_id1)
+        self.assertIsNotNone(tracker_id1)
+
+        tracker_field_id1 = self.create_tracker_field_test1(tracker_id1)
+        self.assertIsNotNone(tracker_field_id1)
+
+        tracker_field_id2 = self.create_tracker_field_test2(tracker_id1)
+        self.assertIsNotNone(tracker_field_id2)
+
+        tracker_field2 = TrackerFieldManagementInterface.read_tracker_field_by_id(tracker_field_id2)
+
+        # Positive tests ---------------------------------------------------------------------------
+        # Deactivate all tracker fields of the tracker in a single revision (unknown tracker fields
+        # are reported but not changed)
+        tracker_field_ids = TrackerFieldManagementInterface.read_all_tracker_field_ids(tracker_id1)
+
+        self.assertDictEqual(
+            TrackerFieldManagementInterface.deactivate_tracker_fields(self.__admin_user_id,
+                                                                      tracker_field_ids + [999]),
+            {tracker_field_id1: True, tracker_field_id2: True, 999: False})
+
+        self.assertListEqual(
+            TrackerFieldManagementInterface.read_all_tracker_field_ids(tracker_id1),
+            [])
+
+        tracker_field1 = TrackerFieldManagementInterface.read_tracker_field_by_id(tracker_field_id1)
+        self.assertEqual(tracker_field1["name"], "test1")
+        self.assertEqual(tracker_field1["display_name"], "Test 1")
+        self.assertEqual(tracker_field1["description"], "Test tracker field 1")
+        self.assertEqual(tracker_field1["field_type"], "artifact_id")
+        self.assertEqual(tracker_field1["required"], True)
+        self.assertFalse(tracker_field1["active"])
+        self.assertEqual(tracker_field1["revision_id"], tracker_field2["revision_id"] + 1)
+        self.assertEqual(
+            TrackerFieldManagementInterface.read_tracker_field_by_id(
+                tracker_field_id2)["revision_id"],
+            tracker_field1["revision_id"])
+
+        # Activate only the inactive and existing tracker fields
+        self.assertTrue(TrackerFieldManagementInterface.activate_tracker_field(
+            self.__admin_user_id,
+            tracker_field_id1))
+
+        self.assertDictEqual(
+            TrackerFieldManagementInterface.activate_tracker_fields(
+                self.__admin_user_id,
+                [tracker_field_id1, tracker_field_id2, 999]),
+            {tracker_field_id1: False, tracker_field_id2: True, 999: False})
+
+        self.assertListEqual(
+            TrackerFieldManagementInterface.read_all_tracker_field_ids(tracker_id1),
+            [tracker_field_id1, tracker_field_id2])
+
+        # Deactivate only the active and existing tracker fields
+        self.assertTrue(TrackerFieldManagementInterface.deactivate_tracker_field(
+            self.__admin_user_id,
+            tracker_field_id2))
+
+        self.assertDictEqual(
+            TrackerFieldManagementInterface.deactivate_tracker_fields(
+                self.__admin_user_id,
+                [tracker_field_id1, tracker_field_id2, 999]),
+            {tracker_field_id1: True, tracker_field_id2: False, 999: False})
+
+        self.assertListEqual(
+            TrackerFieldManagementInterface.read_all_tracker_field_ids(tracker_id1),
+            [])
+
+        # Negative tests ---------------------------------------------------------------------------
+        # Nothing to change (no revision is created)
+        revision_id = TrackerFieldManagementInterface.read_tracker_field_by_id(
+            tracker_field_id1)["revision_id"]
+
+        self.assertDictEqual(
+            TrackerFieldManagementInterface.activate_tracker_fields(self.__admin_user_id,
+                                                                    [999]),
+            {999: False})
+        self.assertDictEqual(
+            TrackerFieldManagementInterface.deactivate_tracker_fields(
+                self.__admin_user_id,
+                [tracker_field_id1, tracker_field_id2]),
+            {tracker_field_id1: False, tracker_field_id2: False})
+
+        connection = DatabaseInterface.create_connection()
+        self.assertEqual(
+            DatabaseInterface.tables().revision.read_current_revision_id(connection),
+            revision_id)
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -625,5 +625,64 @@ class TrackerInformation(unittest.TestCase):
         # Negative tests ---------------------------------------------------------------------------
         # There are no negative tests
 
+    def test_deactivate_activate_trackers(self):
+        project_id1 = self.create_project_test1()
+        self.assertIsNotNone(project_id1)
+
+        tracker_id1 = self.create_tracker_test1(project_id1)
+        self.assertIsNotNone(tracker_id1)
+
+        tracker_id2 = self.create_tracker_test2(project_id1)
+        self.assertIsNotNone(tracker_id2)
+
+        tracker2 = TrackerManagementInterface.read_tracker_by_id(tracker_id2)
+
+        # Positive tests ---------------------------------------------------------------------------
+        # Deactivate all trackers of the project in a single revision (unknown trackers are reported
+        # but not changed)
+        tracker_ids = TrackerManagementInterface.read_all_tracker_ids(project_id1)
+
+        self.assertDictEqual(
+            TrackerManagementInterface.deactivate_trackers(self.__admin_user_id,
+                                                           tracker_ids + [999]),
+            {tracker_id1: True, tracker_id2: True, 999: False})
+
+        self.assertListEqual(TrackerManagementInterface.read_all_tracker_ids(project_id1), [])
+
+        tracker1 = TrackerManagementInterface.read_tracker_by_id(tracker_id1)
+        self.assertEqual(tracker1["short_name"], "test1")
+        self.assertEqual(tracker1["description"], "Test tracker 1")
+        self.assertFalse(tracker1["active"])
+        self.assertEqual(tracker1["revision_id"], tracker2["revision_id"] + 1)
+        self.assertEqual(TrackerManagementInterface.read_tracker_by_id(tracker_id2)["revision_id"],
+                         tracker1["revision_id"])
+
+        # Activate only the inactive trackers
+        self.assertTrue(TrackerManagementInterface.activate_tracker(self.__admin_user_id,
+                                                                    tracker_id1))
+
+        self.assertDictEqual(
+            TrackerManagementInterface.activate_trackers(self.__admin_user_id,
+                                                         [tracker_id1, tracker_id2]),
+            {tracker_id1: False, tracker_id2: True})
+
+        self.assertListEqual(TrackerManagementInterface.read_all_tracker_ids(project_id1),
+                             [tracker_id1, tracker_id2])
+
+        # Negative tests ---------------------------------------------------------------------------
+        # Nothing to change (no revision is created)
+        revision_id = TrackerManagementInterface.read_tracker_by_id(tracker_id2)["revision_id"]
+
+        self.assertDictEqual(
+            TrackerManagementInterface.activate_trackers(self.__admin_user_id,
+                                                         [tracker_id1, 999]),
+            {tracker_id1: False, 999: False})
+
+        connection = DatabaseInterface.create_connection()
+        self.assertEqual(
+            DatabaseInterface.tables().revision.read_current_revision_id(connection),
+            revision_id)
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -18,7 +18,13 @@ from authentication.authentication import AuthenticationInterface
 from authentication.basic_authentication_method import AuthenticationMethodBasic
 from database.database import DatabaseInterface
 from plugins.database.sqlite.database import DatabaseSqlite
+import datetime
+import rest_api
+import time
 import unittest
+import unittest.mock
+from usermanagement.session_token_sweeper import SessionTokenSweeper
+from usermanagement.signed_session_token import SignedSessionToken
 from usermanagement.user_management import UserManagementInterface, UserSelection
 
 
@@ -228,6 +234,59 @@ class UserInformation(unittest.TestCase):
         users = UserManagementInterface.read_users_by_display_name("Test XYZ")
         self.assertEqual(len(users), 0)
 
+    def test_search_users(self):
+        # Create users
+        user_id1 = self.create_user_test1()
+        self.assertIsNotNone(user_id1)
+
+        user_id2 = self.create_user_test2()
+        self.assertIsNotNone(user_id2)
+
+        user_id3 = UserManagementInterface.create_user("jdoe",
+                                                       "John Doe",
+                                                       "john.doe@example.com",
+                                                       "basic",
+                                                       {"password": "test789"})
+        self.assertIsNotNone(user_id3)
+
+        connection = DatabaseInterface.create_connection()
+
+        # Positive tests ---------------------------------------------------------------------------
+        # Prefix of user name, display name and email (case-insensitive)
+        users = UserManagementInterface.search_users(connection, "TEST")
+        self.assertListEqual([x["id"] for x in users], [user_id1, user_id2])
+
+        users = UserManagementInterface.search_users(connection, "john")
+        self.assertListEqual([x["id"] for x in users], [user_id3])
+        self.assertEqual(users[0]["user_name"], "jdoe")
+        self.assertEqual(users[0]["display_name"], "John Doe")
+        self.assertEqual(users[0]["email"], "john.doe@example.com")
+        self.assertTrue(users[0]["active"])
+
+        users = UserManagementInterface.search_users(connection, "jDo")
+        self.assertListEqual([x["id"] for x in users], [user_id3])
+
+        # Limit
+        users = UserManagementInterface.search_users(connection, "t", 1)
+        self.assertListEqual([x["id"] for x in users], [user_id1])
+
+        # Inactive users
+        self.assertTrue(UserManagementInterface.deactivate_user(user_id1))
+
+        users = UserManagementInterface.search_users(connection, "test")
+        self.assertListEqual([x["id"] for x in users], [user_id2])
+
+        users = UserManagementInterface.search_users(connection,
+                                                     "test",
+                                                     user_selection=UserSelection.Inactive)
+        self.assertListEqual([x["id"] for x in users], [user_id1])
+
+        # Negative tests ---------------------------------------------------------------------------
+        self.assertListEqual(UserManagementInterface.search_users(connection, "x"), [])
+        self.assertListEqual(UserManagementInterface.search_users(connection, "test%"), [])
+        self.assertListEqual(UserManagementInterface.search_users(connection, ""), [])
+        self.assertListEqual(UserManagementInterface.search_users(connection, "test", 0), [])
+
     def test_create_user(self):
         # Positive tests ---------------------------------------------------------------------------
         self.assertIsNotNone(self.create_user_test1())
@@ -467,6 +526,33 @@ class UserInformation(unittest.TestCase):
         # There are no negative tests
 
 
+    def test_deactivate_activate_users(self):
+        user_id1 = self.create_user_test1()
+        self.assertIsNotNone(user_id1)
+
+        user_id2 = self.create_user_test2()
+        self.assertIsNotNone(user_id2)
+
+        # Positive tests ---------------------------------------------------------------------------
+        # Deactivate users (already inactive and unknown users are reported but not changed)
+        self.assertTrue(UserManagementInterface.deactivate_user(user_id2))
+
+        self.assertDictEqual(UserManagementInterface.deactivate_users([user_id1, user_id2, 999]),
+                             {user_id1: True, user_id2: False, 999: False})
+        self.assertListEqual(UserManagementInterface.read_all_user_ids(UserSelection.Inactive),
+                             [user_id1, user_id2])
+
+        # Activate users
+        self.assertDictEqual(UserManagementInterface.activate_users([user_id1, user_id2]),
+                             {user_id1: True, user_id2: True})
+        self.assertListEqual(UserManagementInterface.read_all_user_ids(UserSelection.Inactive),
+                             [])
+
+        # Negative tests ---------------------------------------------------------------------------
+        self.assertDictEqual(UserManagementInterface.activate_users([user_id1, 999]),
+                             {user_id1: False, 999: False})
+        self.assertDictEqual(UserManagementInterface.activate_users([]), dict())
+
 class UserAuthentication(unittest.TestCase):
     def setUp(self):
         _initialize_system()
@@ -574,5 +660,288 @@ class UserAuthentication(unittest.TestCase):
         self.assertFalse(UserManagementInterface.authenticate_user("test1",
                                                                    {"password": "test123"}))
 
+
+class SessionToken(unittest.TestCase):
+    def setUp(self):
+        _initialize_system()
+        DatabaseInterface.create_new_database()
+        self.__admin_user_id = 1
+
+    def tearDown(self):
+        # Restore default timeouts
+        UserManagementInterface.set_session_token_timeouts(datetime.timedelta(hours=12),
+                                                           datetime.timedelta(hours=1))
+        UserManagementInterface.enable_signed_session_tokens(None)
+
+    def create_session_token(self) -> str:
+        connection = DatabaseInterface.create_connection()
+        connection.begin_transaction()
+        token = UserManagementInterface.create_session_token(connection, self.__admin_user_id)
+        connection.commit_transaction()
+        return token
+
+    def test_read_session_token(self):
+        token = self.create_session_token()
+        self.assertIsNotNone(token)
+
+        connection = DatabaseInterface.create_connection()
+
+        # Positive tests ---------------------------------------------------------------------------
+        session_token = UserManagementInterface.read_session_token(connection, token)
+
+        self.assertIsNotNone(session_token)
+        self.assertEqual(session_token["user_id"], self.__admin_user_id)
+        self.assertEqual(session_token["token"], token)
+        self.assertEqual(session_token["expires_on"] - session_token["created_on"],
+                         datetime.timedelta(hours=12))
+
+        # Use of the token is written only once per write interval
+        self.assertEqual(
+            DatabaseInterface.tables().session_token.read_token(connection, token)["last_used_on"],
+            session_token["created_on"])
+
+        UserManagementInterface.set_session_token_timeouts(datetime.timedelta(hours=12),
+                                                           datetime.timedelta(hours=1),
+                                                           datetime.timedelta(0))
+        session_token = UserManagementInterface.read_session_token(connection, token)
+        self.assertIsNotNone(session_token)
+
+        self.assertGreater(
+            DatabaseInterface.tables().session_token.read_token(connection, token)["last_used_on"],
+            session_token["created_on"])
+
+        # Negative tests ---------------------------------------------------------------------------
+        self.assertIsNone(UserManagementInterface.read_session_token(connection, "x" * 32))
+
+        # Expired token
+        UserManagementInterface.set_session_token_timeouts(datetime.timedelta(0), None)
+        expired_token = self.create_session_token()
+        self.assertIsNotNone(expired_token)
+        self.assertIsNone(UserManagementInterface.read_session_token(connection, expired_token))
+
+        # Idle token
+        UserManagementInterface.set_session_token_timeouts(datetime.timedelta(hours=12),
+                                                           datetime.timedelta(0))
+        self.assertIsNone(UserManagementInterface.read_session_token(connection, token))
+
+    def test_idle_timeout_of_rest_requests(self):
+        client = rest_api.app.test_client()
+
+        response = client.post("/api/usermanagement/login",
+                               json={"user_name": "administrator",
+                                     "authentication_parameters": {"password": "administrator"}})
+        self.assertEqual(response.status_code, 200)
+        token = response.get_json()["session_token"]
+
+        UserManagementInterface.set_session_token_timeouts(datetime.timedelta(hours=12),
+                                                           datetime.timedelta(seconds=1),
+                                                           datetime.timedelta(seconds=0.2))
+
+        def read_user():
+            return client.get("/api/usermanagement/user",
+                              query_string={"user_id": self.__admin_user_id},
+                              headers={"SALM-Session-Token": token})
+
+        # Positive tests ---------------------------------------------------------------------------
+        # Read-only requests keep the session alive past the idle timeout
+        for i in range(6):
+            self.assertEqual(read_user().status_code, 200)
+            time.sleep(0.4)
+
+        # Negative tests ---------------------------------------------------------------------------
+        # Idle session
+        time.sleep(1.0)
+        self.assertEqual(read_user().status_code, 400)
+
+    def test_create_session_token(self):
+        token = self.create_session_token()
+        self.assertIsNotNone(token)
+        self.assertEqual(len(token), 32)
+
+        connection = DatabaseInterface.create_connection()
+
+        # Positive tests ---------------------------------------------------------------------------
+        # Collision with an existing token is retried with a new token
+        connection.begin_transaction()
+
+        with unittest.mock.patch("secrets.token_hex", side_effect=[token, "a" * 32]):
+            self.assertEqual(
+                UserManagementInterface.create_session_token(connection, self.__admin_user_id),
+                "a" * 32)
+
+        # Negative tests ---------------------------------------------------------------------------
+        with unittest.mock.patch("secrets.token_hex", return_value=token):
+            self.assertIsNone(
+                UserManagementInterface.create_session_token(connection, self.__admin_user_id))
+
+        connection.rollback_transaction()
+
+    def test_prune_expired_session_tokens(self):
+        token = self.create_session_token()
+        self.assertIsNotNone(token)
+
+        UserManagementInterface.set_session_token_timeouts(datetime.timedelta(0), None)
+
+        for i in range(5):
+            self.assertIsNotNone(self.create_session_token())
+
+        UserManagementInterface.set_session_token_timeouts(datetime.timedelta(hours=12),
+                                                           datetime.timedelta(hours=1))
+
+        # Positive tests ---------------------------------------------------------------------------
+        sweeper = SessionTokenSweeper(max_row_count_per_transaction=2)
+
+        self.assertEqual(sweeper.sweep(), 5)
+        self.assertEqual(sweeper.sweep(), 0)
+
+        metrics = sweeper.metrics()
+        self.assertEqual(metrics["sweep_count"], 2)
+        self.assertEqual(metrics["failed_sweep_count"], 0)
+        self.assertEqual(metrics["pruned_row_count"], 5)
+        self.assertEqual(metrics["last_pruned_row_count"], 0)
+        self.assertGreater(metrics["total_duration"], 0.0)
+
+        # Valid token was not deleted
+        connection = DatabaseInterface.create_connection()
+        session_token = UserManagementInterface.read_session_token(connection, token)
+        self.assertIsNotNone(session_token)
+
+        # Idle token is deleted
+        UserManagementInterface.set_session_token_timeouts(datetime.timedelta(hours=12),
+                                                           datetime.timedelta(0))
+        self.assertEqual(sweeper.sweep(), 1)
+        self.assertIsNone(DatabaseInterface.tables().session_token.read_token(connection, token))
+
+        # Background sweeper can be started and stopped
+        sweeper = SessionTokenSweeper(interval=0.01)
+        sweeper.start()
+        sweeper.stop()
+
+    def test_signed_session_token(self):
+        UserManagementInterface.enable_signed_session_tokens(b"secret")
+
+        user_id = UserManagementInterface.create_user("test1",
+                                                      "Test 1",
+                                                      "test1@test.com",
+                                                      "basic",
+                                                      {"password": "test123"})
+        self.assertIsNotNone(user_id)
+
+        connection = DatabaseInterface.create_connection()
+
+        # Positive tests ---------------------------------------------------------------------------
+        token = UserManagementInterface.create_session_token(connection, self.__admin_user_id)
+        self.assertIsNotNone(token)
+
+        # Token is not stored in the database
+        self.assertEqual(connection.native_connection.execute(
+            "SELECT COUNT(*) FROM session_token").fetchone()[0], 0)
+
+        session_token = UserManagementInterface.read_session_token(connection, token)
+        self.assertIsNotNone(session_token)
+        self.assertIsNone(session_token["id"])
+        self.assertEqual(session_token["user_id"], self.__admin_user_id)
+        self.assertEqual(session_token["token"], token)
+
+        # Log out is applied only after the transaction is committed
+        connection.begin_transaction()
+        revocations = UserManagementInterface.delete_session_token(connection, token)
+        self.assertIsNotNone(revocations)
+        connection.rollback_transaction()
+
+        self.assertIsNotNone(UserManagementInterface.read_session_token(connection, token))
+
+        connection.begin_transaction()
+        revocations = UserManagementInterface.delete_session_token(connection, token)
+        self.assertEqual(len(revocations), 1)
+        self.assertIsNotNone(UserManagementInterface.read_session_token(connection, token))
+        connection.commit_transaction()
+
+        UserManagementInterface.apply_session_token_revocations(revocations)
+        self.assertIsNone(UserManagementInterface.read_session_token(connection, token))
+
+        # Revocation is also loaded from the database
+
+        UserManagementInterface.enable_signed_session_tokens(b"secret")
+        self.assertIsNone(UserManagementInterface.read_session_token(connection, token))
+
+        # Deactivated user
+        token1 = UserManagementInterface.create_session_token(connection, user_id)
+        self.assertIsNotNone(UserManagementInterface.read_session_token(connection, token1))
+
+        self.assertTrue(UserManagementInterface.deactivate_user(user_id))
+        self.assertIsNone(UserManagementInterface.read_session_token(connection, token1))
+
+        self.assertTrue(UserManagementInterface.activate_user(user_id))
+        self.assertIsNone(UserManagementInterface.read_session_token(connection, token1))
+
+        token2 = UserManagementInterface.create_session_token(connection, user_id)
+        self.assertIsNotNone(UserManagementInterface.read_session_token(connection, token2))
+
+        # Negative tests ---------------------------------------------------------------------------
+        token = UserManagementInterface.create_session_token(connection, self.__admin_user_id)
+        items = token.split(".")
+
+        # Modified user ID
+        self.assertIsNone(UserManagementInterface.read_session_token(
+            connection,
+            ".".join([str(user_id)] + items[1:])))
+
+        # Different key
+        UserManagementInterface.enable_signed_session_tokens(b"other secret")
+        self.assertIsNone(UserManagementInterface.read_session_token(connection, token))
+
+        # Expired token
+        UserManagementInterface.set_session_token_timeouts(datetime.timedelta(0), None)
+        token = UserManagementInterface.create_session_token(connection, self.__admin_user_id)
+        self.assertIsNone(UserManagementInterface.read_session_token(connection, token))
+
+
+    def test_signed_session_token_revocations_of_other_processes(self):
+        UserManagementInterface.enable_signed_session_tokens(b"secret", datetime.timedelta(0))
+
+        connection = DatabaseInterface.create_connection()
+        other_connection = DatabaseInterface.create_connection()
+        revocation_table = DatabaseInterface.tables().session_token_revocation
+
+        # Positive tests ---------------------------------------------------------------------------
+        token = UserManagementInterface.create_session_token(connection, self.__admin_user_id)
+        signed_session_token = SignedSessionToken.parse(b"secret", token)
+        self.assertIsNotNone(UserManagementInterface.read_session_token(connection, token))
+
+        # Revocation stored by another process is applied only after it is committed
+        other_connection.begin_transaction(write=True)
+        self.assertIsNotNone(revocation_table.insert_row(other_connection,
+                                                         self.__admin_user_id,
+                                                         signed_session_token["token_id"],
+                                                         datetime.datetime.utcnow(),
+                                                         signed_session_token["expires_on"]))
+        self.assertIsNotNone(UserManagementInterface.read_session_token(connection, token))
+
+        other_connection.commit_transaction()
+        self.assertIsNone(UserManagementInterface.read_session_token(connection, token))
+
+        # Revocations are read from the database at most once per refresh interval
+        UserManagementInterface.enable_signed_session_tokens(b"secret", datetime.timedelta(hours=1))
+
+        token = UserManagementInterface.create_session_token(connection, self.__admin_user_id)
+        self.assertIsNotNone(UserManagementInterface.read_session_token(connection, token))
+
+        other_connection.begin_transaction(write=True)
+        revoked_on = datetime.datetime.utcnow()
+        self.assertIsNotNone(revocation_table.insert_row(other_connection,
+                                                         self.__admin_user_id,
+                                                         None,
+                                                         revoked_on,
+                                                         revoked_on + datetime.timedelta(hours=12)))
+        other_connection.commit_transaction()
+
+        self.assertIsNotNone(UserManagementInterface.read_session_token(connection, token))
+
+        # Restart of the process
+        UserManagementInterface.enable_signed_session_tokens(b"secret")
+        self.assertIsNone(UserManagementInterface.read_session_token(connection, token))
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,131 @@
+"""
+Salamander ALM
+Copyright (c) 2016  Djuro Drljaca
+
+This Python module is free software; you can redistribute it and/or modify it under the terms of the
+GNU General Public License as published by the Free Software Foundation; either version 2 of the
+License, or (at your option) any later version.
+
+This Python module is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License along with this library. If
+not, see <http://www.gnu.org/licenses/>.
+"""
+
+import threading
+import time
+from usermanagement.user_management import UserManagementInterface
+
+
+class SessionTokenSweeper(object):
+    """
+    Background sweeper that periodically deletes expired session tokens from the database
+
+    Dependencies:
+
+    - UserManagementInterface
+    """
+
+    def __init__(self, interval=60.0, max_row_count_per_transaction=500):
+        """
+        Constructor
+
+        :param interval:                        Time between two sweeps (in seconds)
+        :param max_row_count_per_transaction:   Max number of tokens deleted in a single
+                                                transaction
+        """
+        self.__interval = interval
+        self.__max_row_count_per_transaction = max_row_count_per_transaction
+
+        self.__thread = None
+        self.__stop_event = threading.Event()
+
+        self.__metrics_lock = threading.Lock()
+        self.__metrics = {"sweep_count": 0,
+                          "failed_sweep_count": 0,
+                          "pruned_row_count": 0,
+                          "last_pruned_row_count": 0,
+                          "total_duration": 0.0,
+                          "last_duration": 0.0}
+
+    def start(self) -> None:
+        """
+        Starts the sweeper in a background thread
+        """
+        if self.__thread is not None:
+            return
+
+        self.__stop_event.clear()
+        self.__thread = threading.Thread(target=self.__run,
+                                         name="SessionTokenSweeper",
+                                         daemon=True)
+        self.__thread.start()
+
+    def stop(self) -> None:
+        """
+        Stops the sweeper and waits for the background thread to finish
+        """
+        if self.__thread is None:
+            return
+
+        self.__stop_event.set()
+        self.__thread.join()
+        self.__thread = None
+
+    def sweep(self) -> int:
+        """
+        Deletes the expired session tokens
+
+        :return:    Number of deleted tokens
+        """
+        start = time.perf_counter()
+
+        try:
+            pruned_row_count = UserManagementInterface.prune_expired_session_tokens(
+                self.__max_row_count_per_transaction)
+        except:
+            with self.__metrics_lock:
+                self.__metrics["failed_sweep_count"] += 1
+            raise
+
+        duration = time.perf_counter() - start
+
+        with self.__metrics_lock:
+            self.__metrics["sweep_count"] += 1
+            self.__metrics["pruned_row_count"] += pruned_row_count
+            self.__metrics["last_pruned_row_count"] = pruned_row_count
+            self.__metrics["total_duration"] += duration
+            self.__metrics["last_duration"] = duration
+
+        return pruned_row_count
+
+    def metrics(self) -> dict:
+        """
+        Reads the sweeper's metrics
+
+        :return:    Metrics
+
+        Returned dictionary contains items:
+
+        - sweep_count
+        - failed_sweep_count
+        - pruned_row_count
+        - last_pruned_row_count
+        - total_duration (in seconds)
+        - last_duration (in seconds)
+        """
+        with self.__metrics_lock:
+            return dict(self.__metrics)
+
+    def __run(self) -> None:
+        """
+        Background thread's main loop
+        """
+        while not self.__stop_event.wait(self.__interval):
+            try:
+                self.sweep()
+            except Exception:
+                # Failure is recorded in the metrics, try again in the next sweep
+                pass
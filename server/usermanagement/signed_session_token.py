@@ -0,0 +1,278 @@
+"""
+Salamander ALM
+Copyright (c) 2016  Djuro Drljaca
+
+This Python module is free software; you can redistribute it and/or modify it under the terms of the
+GNU General Public License as published by the Free Software Foundation; either version 2 of the
+License, or (at your option) any later version.
+
+This Python module is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License along with this library. If
+not, see <http://www.gnu.org/licenses/>.
+"""
+
+import base64
+import datetime
+import hashlib
+import hmac
+import secrets
+import threading
+from typing import List, Optional
+
+
+class SignedSessionToken(object):
+    """
+    Stateless session token signed with HMAC-SHA256
+
+    Format of the token:
+
+        <user_id>.<created_on>.<expires_on>.<token_id>.<signature>
+
+    - created_on and expires_on are UTC timestamps in milliseconds since the epoch
+    - token_id is a random value that identifies the token (used for revocation)
+    - signature is base64url encoded (without padding) HMAC of everything before it
+    """
+
+    __epoch = datetime.datetime(1970, 1, 1)
+
+    def __init__(self):
+        """
+        Constructor is disabled!
+        """
+        raise RuntimeError()
+
+    @staticmethod
+    def is_signed_token(token: str) -> bool:
+        """
+        Checks if the token has the format of a signed session token
+
+        :param token:   Session token
+
+        :return:    True if token is a signed session token
+        """
+        return token.count(".") == 4
+
+    @staticmethod
+    def generate(secret_key: bytes,
+                 user_id: int,
+                 created_on: datetime.datetime,
+                 expires_on: datetime.datetime) -> str:
+        """
+        Generates a new signed session token
+
+        :param secret_key:  Key used for signing
+        :param user_id:     ID of the user
+        :param created_on:  Timestamp when the token was created
+        :param expires_on:  Timestamp when the token expires
+
+        :return:    Session token
+        """
+        payload = "{0}.{1}.{2}.{3}".format(user_id,
+                                           SignedSessionToken.__to_milliseconds(created_on),
+                                           SignedSessionToken.__to_milliseconds(expires_on),
+                                           secrets.token_hex(8))
+
+        return payload + "." + SignedSessionToken.__sign(secret_key, payload)
+
+    @staticmethod
+    def parse(secret_key: bytes, token: str) -> Optional[dict]:
+        """
+        Parses the signed session token and verifies its signature
+
+        :param secret_key:  Key used for signing
+        :param token:       Session token
+
+        :return:    Session token object (only if signature is valid)
+
+        Returned dictionary contains items:
+
+        - user_id
+        - created_on
+        - expires_on
+        - token_id
+        """
+        items = token.split(".")
+
+        if len(items) != 5:
+            return None
+
+        payload = token[:token.rindex(".")]
+
+        if not hmac.compare_digest(SignedSessionToken.__sign(secret_key, payload), items[4]):
+            return None
+
+        try:
+            session_token = {"user_id": int(items[0]),
+                             "created_on": SignedSessionToken.__from_milliseconds(int(items[1])),
+                             "expires_on": SignedSessionToken.__from_milliseconds(int(items[2])),
+                             "token_id": items[3]}
+        except ValueError:
+            session_token = None
+
+        return session_token
+
+    @staticmethod
+    def __sign(secret_key: bytes, payload: str) -> str:
+        """
+        Calculates the signature of the payload
+
+        :param secret_key:  Key used for signing
+        :param payload:     Payload
+
+        :return:    Signature
+        """
+        digest = hmac.new(secret_key, payload.encode("utf-8"), hashlib.sha256).digest()
+        return base64.urlsafe_b64encode(digest).decode("ascii").rstrip("=")
+
+    @staticmethod
+    def __to_milliseconds(timestamp: datetime.datetime) -> int:
+        """
+        Converts the UTC timestamp to milliseconds since the epoch
+
+        :param timestamp:   Timestamp
+
+        :return:    Milliseconds since the epoch
+        """
+        return (timestamp - SignedSessionToken.__epoch) // datetime.timedelta(milliseconds=1)
+
+    @staticmethod
+    def __from_milliseconds(milliseconds: int) -> datetime.datetime:
+        """
+        Converts milliseconds since the epoch to a UTC timestamp
+
+        :param milliseconds:    Milliseconds since the epoch
+
+        :return:    Timestamp
+        """
+        return SignedSessionToken.__epoch + datetime.timedelta(milliseconds=milliseconds)
+
+
+class SessionTokenRevocationList(object):
+    """
+    In-memory list of revoked signed session tokens
+
+    Revocations are kept only until all of the tokens that they revoke expire. The list also keeps
+    the ID of the last database row that was added to it, so that only the new rows need to be read
+    from the database to bring the list up to date.
+    """
+
+    def __init__(self):
+        """
+        Constructor
+        """
+        self.__lock = threading.Lock()
+        self.__revoked_tokens = dict()  # Key: token ID, value: expiration timestamp
+        self.__revoked_users = dict()   # Key: user ID, value: (revoked on, expires on)
+        self.__last_row_id = 0          # ID of the last database row that was added to the list
+
+    @property
+    def last_row_id(self) -> int:
+        """
+        Gets the ID of the last database row that was added to the list
+
+        :return:    Row ID ("0" if no rows were added)
+        """
+        with self.__lock:
+            return self.__last_row_id
+
+    def load(self, revocations: List[dict]) -> None:
+        """
+        Replaces the content of the revocation list
+
+        :param revocations: List of revocations
+
+        Each dictionary in the list must contain items:
+
+        - user_id
+        - token_id
+        - revoked_on
+        - expires_on
+
+        Item "id" (ID of the database row) is optional.
+        """
+        with self.__lock:
+            self.__revoked_tokens = dict()
+            self.__revoked_users = dict()
+            self.__last_row_id = 0
+
+        self.add(revocations)
+
+    def add(self, revocations: List[dict]) -> None:
+        """
+        Adds the revocations to the revocation list
+
+        :param revocations: List of revocations (see load())
+        """
+        for revocation in revocations:
+            if revocation["token_id"] is not None:
+                self.revoke_token(revocation["token_id"], revocation["expires_on"])
+            else:
+                self.revoke_user(revocation["user_id"],
+                                 revocation["revoked_on"],
+                                 revocation["expires_on"])
+
+            row_id = revocation.get("id")
+
+            if row_id is not None:
+                with self.__lock:
+                    self.__last_row_id = max(self.__last_row_id, row_id)
+
+    def revoke_token(self, token_id: str, expires_on: datetime.datetime) -> None:
+        """
+        Revokes a single session token
+
+        :param token_id:    ID of the token
+        :param expires_on:  Timestamp when the token expires
+        """
+        with self.__lock:
+            self.__revoked_tokens[token_id] = expires_on
+
+    def revoke_user(self,
+                    user_id: int,
+                    revoked_on: datetime.datetime,
+                    expires_on: datetime.datetime) -> None:
+        """
+        Revokes all session tokens of the user that were created up to the specified timestamp
+
+        :param user_id:     ID of the user
+        :param revoked_on:  Timestamp of the revocation
+        :param expires_on:  Timestamp when all of the revoked tokens expire
+        """
+        with self.__lock:
+            existing_revocation = self.__revoked_users.get(user_id)
+
+            if (existing_revocation is None) or (existing_revocation[0] < revoked_on):
+                self.__revoked_users[user_id] = (revoked_on, expires_on)
+
+    def is_revoked(self, session_token: dict) -> bool:
+        """
+        Checks if the session token is revoked
+
+        :param session_token:   Session token object (see SignedSessionToken.parse())
+
+        :return:    True if the token is revoked
+        """
+        with self.__lock:
+            if session_token["token_id"] in self.__revoked_tokens:
+                return True
+
+            revocation = self.__revoked_users.get(session_token["user_id"])
+
+        return (revocation is not None) and (session_token["created_on"] <= revocation[0])
+
+    def prune(self, timestamp: datetime.datetime) -> None:
+        """
+        Removes the revocations that expire before the specified timestamp
+
+        :param timestamp:   Timestamp
+        """
+        with self.__lock:
+            self.__revoked_tokens = {token_id: expires_on
+                                     for token_id, expires_on in self.__revoked_tokens.items()
+                                     if expires_on >= timestamp}
+            self.__revoked_users = {user_id: revocation
+                                    for user_id, revocation in self.__revoked_users.items()
+                                    if revocation[1] >= timestamp}
@@ -19,8 +19,10 @@ from database.connection import Connection
 from database.database import DatabaseInterface
 from database.tables.user import UserSelection
 import datetime
-from typing import List, Optional
-import uuid
+import secrets
+from typing import Dict, List, Optional
+from usermanagement.signed_session_token import SignedSessionToken, \
+    SessionTokenRevocationList
 
 
 class UserManagementInterface(object):
@@ -33,6 +35,23 @@ class UserManagementInterface(object):
     - DatabaseInterface
     """
 
+    max_search_limit = 100  # Max number of users that can be returned with a single search
+
+    __session_token_ttl = datetime.timedelta(hours=12)          # Max lifetime of a session token
+    __session_token_idle_timeout = datetime.timedelta(hours=1)  # Max time between two requests
+
+    # Min time between two writes of the "last used on" timestamp of a session token
+    __session_token_last_use_write_interval = datetime.timedelta(minutes=1)
+
+    # Key for signing of the stateless session tokens ("None" when they are disabled)
+    __signed_session_token_key = None
+    __session_token_revocation_list = SessionTokenRevocationList()
+
+    # Min time between two reads of the new revocations from the database and the time of the last
+    # read of the revocations
+    __session_token_revocation_refresh_interval = datetime.timedelta(seconds=1)
+    __session_token_revocations_read_on = None
+
     def __init__(self):
         """
         Constructor is disabled!
@@ -170,6 +189,38 @@ class UserManagementInterface(object):
                                                                        display_name,
                                                                        UserSelection.All)
 
+    @staticmethod
+    def search_users(connection: Connection,
+                     text: str,
+                     limit=10,
+                     user_selection=UserSelection.Active) -> List[dict]:
+        """
+        Searches the user directory for users whose user name, display name or email starts with
+        the specified text (case-insensitive)
+
+        :param connection:      Database connection
+        :param text:            Text to search for
+        :param limit:           Max number of returned users (1 to "max_search_limit")
+        :param user_selection:  Search for active, inactive or all users
+
+        :return:    User information of the matching users (ordered by user name)
+
+        Each dictionary in the returned list contains items:
+
+        - id
+        - user_name
+        - display_name
+        - email
+        - active
+        """
+        if (len(text) == 0) or (limit < 1) or (limit > UserManagementInterface.max_search_limit):
+            return list()
+
+        return DatabaseInterface.tables().user.search_users(connection,
+                                                            text,
+                                                            user_selection,
+                                                            limit)
+
     @staticmethod
     def create_user(user_name: str,
                     display_name: str,
@@ -191,7 +242,7 @@ class UserManagementInterface(object):
         connection = DatabaseInterface.create_connection()
 
         try:
-            success = connection.begin_transaction()
+            success = connection.begin_transaction(write=True)
 
             # Create the user
             if success:
@@ -235,7 +286,7 @@ class UserManagementInterface(object):
         connection = DatabaseInterface.create_connection()
 
         try:
-            success = connection.begin_transaction()
+            success = connection.begin_transaction(write=True)
 
             # Check if there is already an existing user with the same user name
             if success:
@@ -285,7 +336,7 @@ class UserManagementInterface(object):
         connection = DatabaseInterface.create_connection()
 
         try:
-            success = connection.begin_transaction()
+            success = connection.begin_transaction(write=True)
 
             # Read user
             user = None
@@ -330,7 +381,7 @@ class UserManagementInterface(object):
         connection = DatabaseInterface.create_connection()
 
         try:
-            success = connection.begin_transaction()
+            success = connection.begin_transaction(write=True)
 
             # Read user
             user = None
@@ -353,6 +404,21 @@ class UserManagementInterface(object):
                                                                      user["email"],
                                                                      False)
 
+            # Revoke all signed session tokens of the user
+            revoked_on = None
+
+            if success and (UserManagementInterface.__signed_session_token_key is not None):
+                revoked_on = datetime.datetime.utcnow()
+                row_id = DatabaseInterface.tables().session_token_revocation.insert_row(
+                    connection,
+                    user_id,
+                    None,
+                    revoked_on,
+                    revoked_on + UserManagementInterface.__session_token_ttl)
+
+                if row_id is None:
+                    success = False
+
             if success:
                 connection.commit_transaction()
             else:
@@ -361,8 +427,40 @@ class UserManagementInterface(object):
             connection.rollback_transaction()
             raise
 
+        if success and (revoked_on is not None):
+            UserManagementInterface.__session_token_revocation_list.revoke_user(
+                user_id,
+                revoked_on,
+                revoked_on + UserManagementInterface.__session_token_ttl)
+
         return success
 
+    @staticmethod
+    def activate_users(user_ids: List[int]) -> Dict[int, bool]:
+        """
+        Activates inactive users
+
+        :param user_ids:    IDs of the users that should be activated
+
+        :return:    Success or failure for each of the users (key is the user ID)
+
+        Users that do not exist or that are already active are not changed.
+        """
+        return UserManagementInterface.__change_users_state(user_ids, True)
+
+    @staticmethod
+    def deactivate_users(user_ids: List[int]) -> Dict[int, bool]:
+        """
+        Deactivates active users
+
+        :param user_ids:    IDs of the users that should be deactivated
+
+        :return:    Success or failure for each of the users (key is the user ID)
+
+        Users that do not exist or that are already inactive are not changed.
+        """
+        return UserManagementInterface.__change_users_state(user_ids, False)
+
     @staticmethod
     def read_user_authentication(user_id: int) -> Optional[dict]:
         """
@@ -456,7 +554,7 @@ class UserManagementInterface(object):
         connection = DatabaseInterface.create_connection()
 
         try:
-            success = connection.begin_transaction()
+            success = connection.begin_transaction(write=True)
 
             # Update user's authentication
             user_authentication = None
@@ -510,10 +608,74 @@ class UserManagementInterface(object):
 
         return success
 
+    @staticmethod
+    def set_session_token_timeouts(
+            ttl: datetime.timedelta,
+            idle_timeout: Optional[datetime.timedelta],
+            last_use_write_interval=datetime.timedelta(minutes=1)) -> None:
+        """
+        Sets the timeouts of the session tokens
+
+        :param ttl:                     Max lifetime of a session token (applies to new session
+                                        tokens)
+        :param idle_timeout:            Max time between two uses of a session token ("None" to
+                                        disable)
+        :param last_use_write_interval: Min time between two writes of the "last used on"
+                                        timestamp of a session token
+
+        NOTE:   The "last used on" timestamp is written to the database at most once per write
+                interval, so an idle session token can expire up to one write interval early.
+        """
+        UserManagementInterface.__session_token_ttl = ttl
+        UserManagementInterface.__session_token_idle_timeout = idle_timeout
+        UserManagementInterface.__session_token_last_use_write_interval = last_use_write_interval
+
+    @staticmethod
+    def enable_signed_session_tokens(
+            secret_key: Optional[bytes],
+            revocation_refresh_interval=datetime.timedelta(seconds=1)) -> None:
+        """
+        Enables or disables stateless (signed) session tokens
+
+        :param secret_key:                  Key for signing of the session tokens ("None" to
+                                            disable)
+        :param revocation_refresh_interval: Min time between two reads of the new revocations
+                                            from the database
+
+        When enabled, new session tokens are not stored in the database. They are HMAC signed and
+        contain the user ID and their expiration, so they are verified without reading them from
+        the database. Logged out tokens and tokens of deactivated users are rejected with a
+        revocation list. Revocations are stored in the database and the revocation list is loaded
+        from it when the signed session tokens are enabled.
+
+        NOTE:   Revocations that are stored by other processes that use the same database (e.g.
+                multiple server processes) are read from the database when a signed session token
+                is verified, at most once per refresh interval. A token that was revoked by another
+                process can therefore be accepted for up to the refresh interval after the
+                revocation.
+
+        NOTE:   Idle timeout doesn't apply to the signed session tokens. Session tokens that are
+                stored in the database stay valid until they expire.
+        """
+        UserManagementInterface.__signed_session_token_key = secret_key
+        UserManagementInterface.__session_token_revocation_refresh_interval = \
+            revocation_refresh_interval
+
+        if secret_key is not None:
+            # Load the revocation list
+            connection = DatabaseInterface.create_connection()
+            now = datetime.datetime.utcnow()
+            revocations = DatabaseInterface.tables().session_token_revocation.read_rows(
+                connection,
+                now)
+
+            UserManagementInterface.__session_token_revocation_list.load(revocations)
+            UserManagementInterface.__session_token_revocations_read_on = now
+
     @staticmethod
     def read_session_token(connection: Connection, token: str) -> Optional[dict]:
         """
-        Reads a session token from the database
+        Reads a valid (not expired) session token from the database
 
         :param connection:  Database connection
         :param token:       Session's token value
@@ -525,10 +687,45 @@ class UserManagementInterface(object):
         - id
         - user_id
         - created_on
+        - expires_on
+        - last_used_on
         - token
+
+        NOTE:   Reading the session token counts as its use (for the idle timeout) and its
+                "last used on" timestamp is updated in the database if it is older than the write
+                interval! The update is stored only if the caller commits the transaction.
         """
+        if ((UserManagementInterface.__signed_session_token_key is not None) and
+                SignedSessionToken.is_signed_token(token)):
+            return UserManagementInterface.__read_signed_session_token(token)
+
         session_token = DatabaseInterface.tables().session_token.read_token(connection, token)
 
+        if session_token is None:
+            # Error, invalid token
+            return None
+
+        # Check if the token has expired (the timestamps are already in the token's row)
+        now = datetime.datetime.utcnow()
+
+        if session_token["expires_on"] <= now:
+            return None
+
+        idle_timeout = UserManagementInterface.__session_token_idle_timeout
+
+        if ((idle_timeout is not None) and
+                ((session_token["last_used_on"] + idle_timeout) <= now)):
+            return None
+
+        # Write the use of the token (throttled so that most of the reads don't write anything)
+        if ((session_token["last_used_on"] +
+                UserManagementInterface.__session_token_last_use_write_interval) <= now):
+            # NOTE: the write is skipped if the database is locked by another writer (the use will
+            # be written by one of the next reads)
+            if DatabaseInterface.tables().session_token.update_last_used_on(connection,
+                                                                            {token: now}):
+                session_token["last_used_on"] = now
+
         return session_token
 
     @staticmethod
@@ -541,54 +738,333 @@ class UserManagementInterface(object):
 
         :return:    Token value
         """
-        # Generate a token
+        # Signed session tokens are not stored in the database
+        if UserManagementInterface.__signed_session_token_key is not None:
+            created_on = datetime.datetime.utcnow()
+
+            return SignedSessionToken.generate(
+                UserManagementInterface.__signed_session_token_key,
+                user_id,
+                created_on,
+                created_on + UserManagementInterface.__session_token_ttl)
+
+        # Generate a random token and store it in the database (up to 10 tries). Uniqueness of the
+        # token is enforced by the database so a collision just fails the insert.
         token = None
+        created_on = datetime.datetime.utcnow()
+        expires_on = created_on + UserManagementInterface.__session_token_ttl
 
         for i in range(10):
-            # Generate a random UUID (up to 10 tries)
-            random_uuid = uuid.uuid4()
+            random_token = secrets.token_hex(16)
 
-            # Check if this token already exists in the database
-            existing_session_token = UserManagementInterface.read_session_token(connection,
-                                                                                random_uuid.hex)
-
-            if existing_session_token is None:
-                token = random_uuid.hex
-                break
-
-        # Store the token in the database
-        if token is not None:
             row_id = DatabaseInterface.tables().session_token.insert_row(connection,
                                                                          user_id,
-                                                                         datetime.datetime.utcnow(),
-                                                                         token)
+                                                                         created_on,
+                                                                         expires_on,
+                                                                         random_token)
 
-            # In case of an error invalidate the generated token
-            if row_id is None:
-                token = None
+            if row_id is not None:
+                token = random_token
+                break
 
         return token
 
     @staticmethod
-    def delete_session_token(connection: Connection, token: str) -> bool:
+    def delete_session_token(connection: Connection, token: str) -> Optional[List[dict]]:
         """
         Deletes the specified session token
 
         :param connection:  Database connection
         :param token:       Session's token value
 
-        :return:    Success or failure
+        :return:    Pending revocations of signed session tokens (empty list if there are none) or
+                    "None" in case of a failure
+
+        NOTE:   Pending revocations must be applied with apply_session_token_revocations() after
+                the transaction is committed!
         """
         # Check if the specified token is valid
         existing_session_token = UserManagementInterface.read_session_token(connection, token)
 
         if existing_session_token is None:
             # Error, invalid token
-            return False
+            return None
+
+        # Signed session tokens are revoked
+        if existing_session_token["id"] is None:
+            revocation = UserManagementInterface.__revoke_signed_session_token(connection, token)
+
+            if revocation is None:
+                return None
+
+            return [revocation]
 
         # Delete the token from the database
         DatabaseInterface.tables().session_token.delete_row_by_token(connection, token)
-        return True
+        return list()
+
+    @staticmethod
+    def apply_session_token_revocations(revocations: List[dict]) -> None:
+        """
+        Applies the pending revocations of signed session tokens
+
+        :param revocations: Pending revocations (see delete_session_token())
+
+        NOTE:   Revocations must be applied only after the transaction that stored them in the
+                database is committed!
+        """
+        UserManagementInterface.__session_token_revocation_list.add(revocations)
+
+    @staticmethod
+    def prune_expired_session_tokens(max_row_count_per_transaction=500) -> int:
+        """
+        Deletes all expired and idle session tokens from the database
+
+        :param max_row_count_per_transaction:   Max number of tokens deleted in a single transaction
+
+        :return:    Number of deleted tokens
+
+        Tokens are deleted in batches (each in its own transaction) so that the database is not
+        locked for writing for a long time.
+        """
+        connection = DatabaseInterface.create_connection()
+
+        # Delete the expired revocations of the signed session tokens
+        now = datetime.datetime.utcnow()
+
+        try:
+            connection.begin_transaction(write=True)
+            DatabaseInterface.tables().session_token_revocation.delete_expired_rows(connection,
+                                                                                    now)
+            connection.commit_transaction()
+        except:
+            connection.rollback_transaction()
+            raise
+
+        UserManagementInterface.__session_token_revocation_list.prune(now)
+
+        # Delete the expired tokens
+        idle_timestamp = None
+
+        if UserManagementInterface.__session_token_idle_timeout is not None:
+            idle_timestamp = now - UserManagementInterface.__session_token_idle_timeout
+
+        deleted_row_count = 0
+
+        while True:
+            try:
+                connection.begin_transaction(write=True)
+                row_count = DatabaseInterface.tables().session_token.delete_expired_rows(
+                    connection,
+                    now,
+                    idle_timestamp,
+                    max_row_count_per_transaction)
+                connection.commit_transaction()
+            except:
+                connection.rollback_transaction()
+                raise
+
+            deleted_row_count += row_count
+
+            if row_count < max_row_count_per_transaction:
+                break
+
+        return deleted_row_count
+
+    @staticmethod
+    def __read_signed_session_token(token: str) -> Optional[dict]:
+        """
+        Reads a valid (not expired and not revoked) signed session token
+
+        :param token:   Session's token value
+
+        :return:    Session token object
+
+        Returned dictionary contains items:
+
+        - id (always "None")
+        - user_id
+        - created_on
+        - expires_on
+        - last_used_on (same as "created_on")
+        - token
+        """
+        signed_session_token = SignedSessionToken.parse(
+            UserManagementInterface.__signed_session_token_key,
+            token)
+
+        if signed_session_token is None:
+            # Error, invalid token
+            return None
+
+        now = datetime.datetime.utcnow()
+
+        if signed_session_token["expires_on"] <= now:
+            # Error, token has expired
+            return None
+
+        UserManagementInterface.__read_new_session_token_revocations(now)
+
+        if UserManagementInterface.__session_token_revocation_list.is_revoked(
+                signed_session_token):
+            # Error, token was revoked
+            return None
+
+        return {"id": None,
+                "user_id": signed_session_token["user_id"],
+                "created_on": signed_session_token["created_on"],
+                "expires_on": signed_session_token["expires_on"],
+                "last_used_on": signed_session_token["created_on"],
+                "token": token}
+
+    @staticmethod
+    def __read_new_session_token_revocations(now: datetime.datetime) -> None:
+        """
+        Adds the revocations that were stored in the database since the last read to the revocation
+        list (at most once per refresh interval)
+
+        :param now: Current timestamp
+
+        NOTE:   Revocations are read with a separate connection so that only the committed ones are
+                added to the revocation list!
+        """
+        read_on = UserManagementInterface.__session_token_revocations_read_on
+        refresh_interval = UserManagementInterface.__session_token_revocation_refresh_interval
+
+        if (read_on is not None) and (now < (read_on + refresh_interval)):
+            # Revocation list is up to date
+            return
+
+        UserManagementInterface.__session_token_revocations_read_on = now
+
+        revocation_list = UserManagementInterface.__session_token_revocation_list
+        connection = DatabaseInterface.create_connection()
+        revocations = DatabaseInterface.tables().session_token_revocation.read_rows_after(
+            connection,
+            revocation_list.last_row_id)
+
+        revocation_list.add(revocations)
+
+    @staticmethod
+    def __revoke_signed_session_token(connection: Connection, token: str) -> Optional[dict]:
+        """
+        Revokes the signed session token in the database
+
+        :param connection:  Database connection
+        :param token:       Session's token value
+
+        :return:    Pending revocation
+
+        Returned dictionary contains items:
+
+        - user_id
+        - token_id
+        - revoked_on
+        - expires_on
+
+        NOTE:   Revocation list is not changed, the returned revocation must be added to it after
+                the transaction is committed!
+        """
+        signed_session_token = SignedSessionToken.parse(
+            UserManagementInterface.__signed_session_token_key,
+            token)
+
+        if signed_session_token is None:
+            # Error, invalid token
+            return None
+
+        revocation = {"user_id": signed_session_token["user_id"],
+                      "token_id": signed_session_token["token_id"],
+                      "revoked_on": datetime.datetime.utcnow(),
+                      "expires_on": signed_session_token["expires_on"]}
+
+        row_id = DatabaseInterface.tables().session_token_revocation.insert_row(
+            connection,
+            revocation["user_id"],
+            revocation["token_id"],
+            revocation["revoked_on"],
+            revocation["expires_on"])
+
+        if row_id is None:
+            return None
+
+        return revocation
+
+    @staticmethod
+    def __change_users_state(user_ids: List[int], active: bool) -> Dict[int, bool]:
+        """
+        Changes the state of the users (all of them in a single transaction)
+
+        :param user_ids:    IDs of the users
+        :param active:      New state of the users (active or inactive)
+
+        :return:    Success or failure for each of the users (key is the user ID)
+        """
+        results = {user_id: False for user_id in user_ids}
+        connection = DatabaseInterface.create_connection()
+
+        try:
+            success = connection.begin_transaction(write=True)
+
+            # Find the users that exist and are not already in the requested state (all of them
+            # with a single query)
+            changed_user_ids = list()
+
+            if success:
+                states = DatabaseInterface.tables().user.read_states(connection,
+                                                                     list(results.keys()))
+
+                changed_user_ids = [x for x in results.keys()
+                                    if (x in states) and (states[x] != active)]
+
+                if len(changed_user_ids) == 0:
+                    # Nothing to change
+                    success = False
+
+            # Change the state of the users
+            if success:
+                success = DatabaseInterface.tables().user.update_states(connection,
+                                                                        changed_user_ids,
+                                                                        active)
+
+            # Revoke all signed session tokens of the deactivated users
+            revoked_on = None
+
+            if (success and (not active) and
+                    (UserManagementInterface.__signed_session_token_key is not None)):
+                revoked_on = datetime.datetime.utcnow()
+
+                for user_id in changed_user_ids:
+                    row_id = DatabaseInterface.tables().session_token_revocation.insert_row(
+                        connection,
+                        user_id,
+                        None,
+                        revoked_on,
+                        revoked_on + UserManagementInterface.__session_token_ttl)
+
+                    if row_id is None:
+                        success = False
+                        break
+
+            if success:
+                connection.commit_transaction()
+
+                for user_id in changed_user_ids:
+                    results[user_id] = True
+            else:
+                connection.rollback_transaction()
+        except:
+            connection.rollback_transaction()
+            raise
+
+        if success and (revoked_on is not None):
+            for user_id in changed_user_ids:
+                UserManagementInterface.__session_token_revocation_list.revoke_user(
+                    user_id,
+                    revoked_on,
+                    revoked_on + UserManagementInterface.__session_token_ttl)
+
+        return results
 
     @staticmethod
     def __read_user_by_user_name(connection: Connection, user_name: str) -> Optional[dict]: